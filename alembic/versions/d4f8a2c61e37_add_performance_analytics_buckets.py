@@ -0,0 +1,68 @@
+"""add performance analytics buckets
+
+Revision ID: d4f8a2c61e37
+Revises: 0a3e0bd24598
+Create Date: 2026-10-18
+
+Creates the precomputed performance analytics tables used by the performance page:
+performance_daily_bucket holds additive closed-transaction statistics per
+(close day, scope, scope_key), and performance_folded_transaction marks which closed
+transactions are already folded so the sync only reads new closes. Both tables are
+derived data -- populate them with
+``python -m ba2_trade_platform.core.PerformanceAnalytics --rebuild``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd4f8a2c61e37'
+down_revision: Union[str, Sequence[str], None] = '0a3e0bd24598'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "performance_daily_bucket",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("scope", sa.String(), nullable=False),
+        sa.Column("scope_key", sa.String(), nullable=False),
+        sa.Column("trades", sa.Integer(), nullable=False),
+        sa.Column("pnl_count", sa.Integer(), nullable=False),
+        sa.Column("wins", sa.Integer(), nullable=False),
+        sa.Column("losses", sa.Integer(), nullable=False),
+        sa.Column("total_pnl", sa.Float(), nullable=False),
+        sa.Column("gross_profit", sa.Float(), nullable=False),
+        sa.Column("gross_loss", sa.Float(), nullable=False),
+        sa.Column("largest_win", sa.Float(), nullable=True),
+        sa.Column("largest_loss", sa.Float(), nullable=True),
+        sa.Column("duration_sum_days", sa.Float(), nullable=False),
+        sa.Column("duration_count", sa.Integer(), nullable=False),
+        sa.Column("return_count", sa.Integer(), nullable=False),
+        sa.Column("return_sum", sa.Float(), nullable=False),
+        sa.Column("return_sumsq", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("day", "scope", "scope_key", name="uix_perfbucket_day_scope_key"),
+    )
+    op.create_index("ix_performance_daily_bucket_day", "performance_daily_bucket", ["day"])
+    op.create_index("ix_performance_daily_bucket_scope", "performance_daily_bucket", ["scope"])
+
+    op.create_table(
+        "performance_folded_transaction",
+        sa.Column("transaction_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("folded_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("transaction_id"),
+    )
+    op.create_index("ix_performance_folded_transaction_day", "performance_folded_transaction", ["day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_performance_folded_transaction_day", table_name="performance_folded_transaction")
+    op.drop_table("performance_folded_transaction")
+    op.drop_index("ix_performance_daily_bucket_scope", table_name="performance_daily_bucket")
+    op.drop_index("ix_performance_daily_bucket_day", table_name="performance_daily_bucket")
+    op.drop_table("performance_daily_bucket")
@@ -0,0 +1,42 @@
+"""record folded transaction fields
+
+Stores, on each performance_folded_transaction marker, the transaction fields the fold
+read (expert, prices, quantity, close date). The performance analytics sync compares
+them with the transaction to find closed transactions edited or deleted after they were
+folded, and refolds their close days. Existing markers read as NULL, so their days are
+refolded once on the first sync after the upgrade.
+
+Revision ID: e5a9b3d71f42
+Revises: d4f8a2c61e37
+Create Date: 2026-10-19
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e5a9b3d71f42'
+down_revision: Union[str, Sequence[str], None] = 'd4f8a2c61e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = (
+    ("expert_id", sa.Integer()),
+    ("quantity", sa.Float()),
+    ("open_price", sa.Float()),
+    ("close_price", sa.Float()),
+    ("close_date", sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("performance_folded_transaction") as batch:
+        for name, type_ in _COLUMNS:
+            batch.add_column(sa.Column(name, type_, nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("performance_folded_transaction") as batch:
+        for name, _ in reversed(_COLUMNS):
+            batch.drop_column(name)
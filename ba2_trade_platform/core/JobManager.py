@@ -629,6 +629,13 @@ class JobManager:
             trade_manager = get_trade_manager()
             trade_manager.refresh_accounts()
 
+            # Fold transactions closed by this refresh into the performance buckets
+            try:
+                from .PerformanceAnalytics import sync_performance_analytics
+                sync_performance_analytics()
+            except Exception as e:
+                logger.error(f"Error syncing performance analytics after account refresh: {e}", exc_info=True)
+
             # Liveness marker for _account_refresh_watchdog_loop.
             self._last_account_refresh_completed = datetime.now()
 
@@ -0,0 +1,459 @@
+"""
+Performance Analytics - precomputed daily aggregates for the performance page.
+
+Closed transactions are folded once into ``PerformanceDailyBucket`` rows, one per
+(close day, scope, key) for the ``expert``, ``account`` and ``symbol`` scopes. Every
+bucket column is additive, so a date-range query combines the buckets in that range
+instead of recomputing win rates, P&L, Sharpe and drawdowns from every transaction.
+
+Folding is incremental: ``sync_performance_analytics()`` only touches closed
+transactions that have no ``PerformanceFoldedTransaction`` marker yet, which makes it
+cheap enough to run after every account refresh and before every page render. The
+marker keeps the fields the fold read; a folded transaction that is later edited
+(close price/date corrections), reopened or deleted no longer matches its marker, and
+the sync clears and refolds the close days involved (extrema cannot be subtracted).
+``rebuild_performance_analytics()`` drops and refolds everything, and
+``check_performance_parity()`` compares the buckets with the on-the-fly calculation.
+
+Usage (rebuild + parity check against the live DB):
+    python -m ba2_trade_platform.core.PerformanceAnalytics --rebuild --check
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlmodel import select, delete
+
+from ..logger import logger
+from .db import get_db
+from .models import (
+    ExpertInstance, PerformanceDailyBucket, PerformanceFoldedTransaction, Transaction,
+)
+from .types import TransactionStatus
+from .utils import calculate_transaction_pnl
+
+SCOPE_EXPERT = "expert"
+SCOPE_ACCOUNT = "account"
+SCOPE_SYMBOL = "symbol"
+SCOPES = (SCOPE_EXPERT, SCOPE_ACCOUNT, SCOPE_SYMBOL)
+
+# Same thresholds as ui/components/performance_charts.calculate_sharpe_ratio
+SHARPE_MIN_RETURNS = 30
+SHARPE_RISK_FREE_RATE = 0.02
+
+# Transactions folded per commit during sync/rebuild
+_FOLD_BATCH_SIZE = 500
+
+# Transaction fields copied onto the fold marker; a mismatch means the transaction changed
+_FOLDED_FIELDS = ("expert_id", "quantity", "open_price", "close_price", "close_date")
+
+
+@dataclass
+class PerformanceStats:
+    """Additive closed-transaction statistics (one bucket, or a combination of buckets)."""
+    trades: int = 0
+    pnl_count: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_pnl: float = 0.0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+    largest_win: Optional[float] = None
+    largest_loss: Optional[float] = None
+    duration_sum_days: float = 0.0
+    duration_count: int = 0
+    return_count: int = 0
+    return_sum: float = 0.0
+    return_sumsq: float = 0.0
+
+    def add_transaction(self, txn: Transaction) -> None:
+        """Fold a single closed transaction into these statistics."""
+        self.trades += 1
+
+        if txn.open_date and txn.close_date:
+            self.duration_sum_days += (txn.close_date - txn.open_date).total_seconds() / 86400
+            self.duration_count += 1
+
+        pnl = calculate_transaction_pnl(txn)
+        if pnl is None:
+            return
+        self.pnl_count += 1
+        self.total_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+            self.gross_profit += pnl
+            self.largest_win = pnl if self.largest_win is None else max(self.largest_win, pnl)
+        elif pnl < 0:
+            self.losses += 1
+            self.gross_loss += pnl
+            self.largest_loss = pnl if self.largest_loss is None else min(self.largest_loss, pnl)
+
+        # Scale by the contract multiplier (100 for options) to match the
+        # multiplier-aware P&L, so the return ratio stays correct.
+        position_value = txn.open_price * txn.quantity * (getattr(txn, "multiplier", None) or 1)
+        if position_value != 0:
+            ret = pnl / position_value
+            self.return_count += 1
+            self.return_sum += ret
+            self.return_sumsq += ret * ret
+
+    def merge(self, other: "PerformanceStats | PerformanceDailyBucket") -> None:
+        """Add another stats object (or a stored bucket row) into this one."""
+        for name in ("trades", "pnl_count", "wins", "losses", "total_pnl", "gross_profit",
+                     "gross_loss", "duration_sum_days", "duration_count", "return_count",
+                     "return_sum", "return_sumsq"):
+            setattr(self, name, getattr(self, name) + (getattr(other, name) or 0))
+        if other.largest_win is not None:
+            self.largest_win = other.largest_win if self.largest_win is None else max(self.largest_win, other.largest_win)
+        if other.largest_loss is not None:
+            self.largest_loss = other.largest_loss if self.largest_loss is None else min(self.largest_loss, other.largest_loss)
+
+    @property
+    def win_rate(self) -> float:
+        decided = self.wins + self.losses
+        return (self.wins / decided * 100) if decided > 0 else 0.0
+
+    @property
+    def profit_factor(self) -> Optional[float]:
+        gross_loss = abs(self.gross_loss)
+        if gross_loss == 0:
+            return None if self.gross_profit == 0 else float('inf')
+        return self.gross_profit / gross_loss
+
+    @property
+    def sharpe_ratio(self) -> Optional[float]:
+        """Annualized Sharpe from the stored return moments (ddof=1, 252 periods)."""
+        n = self.return_count
+        if n < SHARPE_MIN_RETURNS:
+            return None
+        mean = self.return_sum / n
+        variance = max((self.return_sumsq - n * mean * mean) / (n - 1), 0.0)
+        std = math.sqrt(variance)
+        # Moment-based variance leaves rounding noise where the direct std is exactly 0
+        if std <= 1e-12 * max(1.0, abs(mean)):
+            return 0.0
+        daily_rf = SHARPE_RISK_FREE_RATE / 252
+        return (mean - daily_rf) / std * math.sqrt(252)
+
+    def to_metrics(self) -> Dict[str, Any]:
+        """Metrics dict in the shape the performance page renders."""
+        return {
+            'total_transactions': self.trades,
+            'avg_duration_days': (self.duration_sum_days / self.duration_count) if self.duration_count else 0,
+            'total_pnl': self.total_pnl,
+            'avg_pnl': (self.total_pnl / self.pnl_count) if self.pnl_count else 0,
+            'win_rate': self.win_rate,
+            'wins': self.wins,
+            'losses': self.losses,
+            'profit_factor': self.profit_factor,
+            'largest_win': self.largest_win,
+            'largest_loss': self.largest_loss,
+            'sharpe_ratio': self.sharpe_ratio,
+        }
+
+
+_STAT_FIELDS = [f.name for f in fields(PerformanceStats)]
+
+
+def _scope_keys(txn: Transaction, expert_accounts: Dict[int, int]) -> Dict[str, str]:
+    """Bucket keys of a transaction for every scope ("" when unknown)."""
+    account_id = expert_accounts.get(txn.expert_id) if txn.expert_id is not None else None
+    return {
+        SCOPE_EXPERT: "" if txn.expert_id is None else str(txn.expert_id),
+        SCOPE_ACCOUNT: "" if account_id is None else str(account_id),
+        SCOPE_SYMBOL: txn.symbol or "",
+    }
+
+
+def _bucket_day(txn: Transaction) -> date:
+    return txn.close_date.date()
+
+
+def _fold_transactions(session, transactions: List[Transaction]) -> None:
+    """Fold transactions into their daily buckets and mark them as folded (no commit)."""
+    if not transactions:
+        return
+
+    expert_accounts = dict(session.exec(select(ExpertInstance.id, ExpertInstance.account_id)).all())
+
+    deltas: Dict[Tuple[date, str, str], PerformanceStats] = defaultdict(PerformanceStats)
+    for txn in transactions:
+        day = _bucket_day(txn)
+        for scope, key in _scope_keys(txn, expert_accounts).items():
+            deltas[(day, scope, key)].add_transaction(txn)
+        session.add(PerformanceFoldedTransaction(
+            transaction_id=txn.id, day=day, **{name: getattr(txn, name) for name in _FOLDED_FIELDS}))
+
+    days = {day for day, _, _ in deltas}
+    existing = {
+        (b.day, b.scope, b.scope_key): b
+        for b in session.exec(
+            select(PerformanceDailyBucket).where(PerformanceDailyBucket.day.in_(days))
+        ).all()
+    }
+    for (day, scope, key), delta in deltas.items():
+        bucket = existing.get((day, scope, key))
+        if bucket is None:
+            session.add(PerformanceDailyBucket(day=day, scope=scope, scope_key=key,
+                                               **{name: getattr(delta, name) for name in _STAT_FIELDS}))
+            continue
+        merged = _bucket_stats(bucket)
+        merged.merge(delta)
+        for name in _STAT_FIELDS:
+            setattr(bucket, name, getattr(merged, name))
+        session.add(bucket)
+
+
+def _bucket_stats(bucket: PerformanceDailyBucket) -> PerformanceStats:
+    return PerformanceStats(**{name: getattr(bucket, name) for name in _STAT_FIELDS})
+
+
+def _clear_changed_days(session) -> set:
+    """
+    Drop the buckets and markers of every close day holding a folded transaction that
+    was edited, reopened or deleted since it was folded (no commit).
+
+    The transactions of those days then have no marker, so the sync refolds them.
+
+    Returns:
+        The days cleared.
+    """
+    marker = PerformanceFoldedTransaction
+    changed = or_(
+        Transaction.id.is_(None),
+        Transaction.status != TransactionStatus.CLOSED,
+        *(getattr(marker, name).is_distinct_from(getattr(Transaction, name)) for name in _FOLDED_FIELDS),
+    )
+    days = set(session.exec(
+        select(marker.day).distinct()
+        .outerjoin(Transaction, Transaction.id == marker.transaction_id)
+        .where(changed)
+    ).all())
+    if days:
+        session.exec(delete(PerformanceDailyBucket).where(PerformanceDailyBucket.day.in_(days)))
+        session.exec(delete(marker).where(marker.day.in_(days)))
+    return days
+
+
+def sync_performance_analytics() -> int:
+    """
+    Fold every closed transaction that is not yet in the daily buckets.
+
+    Safe to call repeatedly; only new closes are read (plus the days of folded
+    transactions that changed or disappeared, which are refolded), so the cost scales
+    with the number of transactions closed or edited since the previous call.
+
+    Returns:
+        Number of transactions folded (refolds included).
+    """
+    folded = 0
+    with get_db() as session:
+        cleared = _clear_changed_days(session)
+        if cleared:
+            session.commit()
+            logger.debug(f"Performance analytics: refolding {len(cleared)} day(s) with changed transactions")
+        while True:
+            pending = session.exec(
+                select(Transaction)
+                .where(
+                    Transaction.status == TransactionStatus.CLOSED,
+                    Transaction.close_date.isnot(None),
+                    Transaction.id.notin_(select(PerformanceFoldedTransaction.transaction_id)),
+                )
+                .order_by(Transaction.id)
+                .limit(_FOLD_BATCH_SIZE)
+            ).all()
+            if not pending:
+                break
+            _fold_transactions(session, pending)
+            session.commit()
+            folded += len(pending)
+
+    if folded:
+        logger.debug(f"Performance analytics: folded {folded} newly closed transactions")
+    return folded
+
+
+def rebuild_performance_analytics() -> int:
+    """
+    Drop all daily buckets and refold every closed transaction.
+
+    Returns:
+        Number of transactions folded.
+    """
+    with get_db() as session:
+        session.exec(delete(PerformanceDailyBucket))
+        session.exec(delete(PerformanceFoldedTransaction))
+        session.commit()
+    folded = sync_performance_analytics()
+    logger.info(f"Performance analytics rebuilt from {folded} closed transactions")
+    return folded
+
+
+def _get_buckets(scope: str, start: Optional[date], end: Optional[date],
+                 keys: Optional[Iterable[str]]) -> List[PerformanceDailyBucket]:
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown performance scope '{scope}', expected one of {SCOPES}")
+    with get_db() as session:
+        stmt = select(PerformanceDailyBucket).where(PerformanceDailyBucket.scope == scope)
+        if start is not None:
+            stmt = stmt.where(PerformanceDailyBucket.day >= start)
+        if end is not None:
+            stmt = stmt.where(PerformanceDailyBucket.day <= end)
+        if keys is not None:
+            stmt = stmt.where(PerformanceDailyBucket.scope_key.in_(list(keys)))
+        return list(session.exec(stmt.order_by(PerformanceDailyBucket.day)).all())
+
+
+def get_range_stats(scope: str, start: Optional[date] = None, end: Optional[date] = None,
+                    keys: Optional[Iterable[str]] = None) -> Dict[str, PerformanceStats]:
+    """
+    Combine daily buckets into one ``PerformanceStats`` per scope key.
+
+    Args:
+        scope: ``expert``, ``account`` or ``symbol``
+        start: First close day included (None = unbounded)
+        end: Last close day included (None = unbounded)
+        keys: Restrict to these scope keys (None = all keys)
+    """
+    stats: Dict[str, PerformanceStats] = defaultdict(PerformanceStats)
+    for bucket in _get_buckets(scope, start, end, keys):
+        stats[bucket.scope_key].merge(bucket)
+    return dict(stats)
+
+
+def get_total_stats(scope: str, start: Optional[date] = None, end: Optional[date] = None,
+                    keys: Optional[Iterable[str]] = None) -> PerformanceStats:
+    """Combine all matching daily buckets of one scope into a single ``PerformanceStats``."""
+    total = PerformanceStats()
+    for bucket in _get_buckets(scope, start, end, keys):
+        total.merge(bucket)
+    return total
+
+
+def get_monthly_pnl(scope: str, start: Optional[date] = None, end: Optional[date] = None,
+                    keys: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    P&L and closed-transaction count per month and scope key.
+
+    Returns:
+        {"YYYY-MM": {scope_key: {"pnl": float, "count": int}}}
+    """
+    monthly: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(lambda: defaultdict(lambda: {'pnl': 0, 'count': 0}))
+    for bucket in _get_buckets(scope, start, end, keys):
+        entry = monthly[bucket.day.strftime('%Y-%m')][bucket.scope_key]
+        entry['pnl'] += bucket.total_pnl
+        entry['count'] += bucket.pnl_count
+    return monthly
+
+
+def get_equity_series(scope: str, start: Optional[date] = None, end: Optional[date] = None,
+                      keys: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Cumulative realized P&L curve and its drawdown over a date range.
+
+    The keys selected are summed into one curve; the curve starts at 0 on ``start``.
+
+    Returns:
+        Dict with ``points`` ([(datetime, cumulative_pnl), ...]), ``max_drawdown``
+        (largest peak-to-trough drop in currency) and ``final_pnl``.
+    """
+    daily: Dict[date, float] = defaultdict(float)
+    for bucket in _get_buckets(scope, start, end, keys):
+        daily[bucket.day] += bucket.total_pnl
+
+    points: List[Tuple[datetime, float]] = []
+    cumulative = peak = 0.0
+    max_drawdown = 0.0
+    for day in sorted(daily):
+        cumulative += daily[day]
+        peak = max(peak, cumulative)
+        max_drawdown = max(max_drawdown, peak - cumulative)
+        points.append((datetime.combine(day, datetime.min.time()), cumulative))
+
+    return {'points': points, 'max_drawdown': max_drawdown, 'final_pnl': cumulative}
+
+
+def _compute_stats_on_the_fly(start: Optional[date], end: Optional[date]) -> Dict[Tuple[str, str], PerformanceStats]:
+    """Recompute per-scope statistics straight from the transactions (parity reference)."""
+    with get_db() as session:
+        stmt = select(Transaction).where(
+            Transaction.status == TransactionStatus.CLOSED,
+            Transaction.close_date.isnot(None),
+        )
+        transactions = session.exec(stmt).all()
+        expert_accounts = dict(session.exec(select(ExpertInstance.id, ExpertInstance.account_id)).all())
+
+    stats: Dict[Tuple[str, str], PerformanceStats] = defaultdict(PerformanceStats)
+    for txn in transactions:
+        day = _bucket_day(txn)
+        if (start is not None and day < start) or (end is not None and day > end):
+            continue
+        for scope, key in _scope_keys(txn, expert_accounts).items():
+            stats[(scope, key)].add_transaction(txn)
+    return stats
+
+
+def check_performance_parity(start: Optional[date] = None, end: Optional[date] = None,
+                             rel_tol: float = 1e-6, abs_tol: float = 1e-6) -> List[str]:
+    """
+    Compare the precomputed buckets with an on-the-fly calculation from transactions.
+
+    Returns:
+        Human-readable mismatch descriptions (empty when the buckets are in parity).
+    """
+    expected = _compute_stats_on_the_fly(start, end)
+    actual: Dict[Tuple[str, str], PerformanceStats] = {}
+    for scope in SCOPES:
+        for key, stats in get_range_stats(scope, start, end).items():
+            actual[(scope, key)] = stats
+
+    mismatches = []
+    for scope_key in sorted(set(expected) | set(actual)):
+        exp_metrics = expected.get(scope_key, PerformanceStats()).to_metrics()
+        act_metrics = actual.get(scope_key, PerformanceStats()).to_metrics()
+        for name, exp_value in exp_metrics.items():
+            act_value = act_metrics[name]
+            if exp_value is None or act_value is None:
+                same = exp_value is act_value
+            else:
+                same = math.isclose(exp_value, act_value, rel_tol=rel_tol, abs_tol=abs_tol)
+            if not same:
+                mismatches.append(f"{scope_key[0]}={scope_key[1]!r} {name}: expected {exp_value}, got {act_value}")
+    return mismatches
+
+
+def main():
+    import argparse
+    from .. import config
+    from .db import configure_db, init_db
+
+    parser = argparse.ArgumentParser(description="Maintain the precomputed performance analytics buckets")
+    parser.add_argument("--rebuild", action="store_true", help="Drop and refold every closed transaction")
+    parser.add_argument("--check", action="store_true", help="Run a parity check against the on-the-fly calculation")
+    args = parser.parse_args()
+
+    configure_db(config.DB_FILE)
+    init_db()
+
+    if args.rebuild:
+        print(f"Rebuilt performance analytics from {rebuild_performance_analytics()} closed transactions")
+    else:
+        print(f"Folded {sync_performance_analytics()} newly closed transactions")
+
+    if args.check:
+        mismatches = check_performance_parity()
+        for mismatch in mismatches:
+            print(f"MISMATCH {mismatch}")
+        print("Parity OK" if not mismatches else f"{len(mismatches)} mismatches")
+        return 1 if mismatches else 0
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -3,22 +3,24 @@ Trade Performance Analytics Page
 
 This page provides comprehensive analytics and visualizations for trading performance,
 including metrics per expert, time-based analysis, and statistical measures.
+Metrics are served from the precomputed daily buckets in core/PerformanceAnalytics.py
+rather than recomputed from every closed transaction on each view.
 """
 
 from nicegui import ui
 from ba2_trade_platform.core.db import get_db
-from ba2_trade_platform.core.models import Transaction, TradingOrder, ExpertInstance, AccountDefinition
-from ba2_trade_platform.core.types import TransactionStatus
-from ba2_trade_platform.core.utils import calculate_transaction_pnl
+from ba2_trade_platform.core.models import ExpertInstance
+from ba2_trade_platform.core.PerformanceAnalytics import (
+    SCOPE_EXPERT, get_equity_series, get_monthly_pnl, get_range_stats, get_total_stats,
+    sync_performance_analytics,
+)
+from ba2_trade_platform.logger import logger
 from ba2_trade_platform.ui.components.performance_charts import (
     MetricCard, PerformanceBarChart, TimeSeriesChart, PieChartComponent,
     PerformanceTable, MultiMetricDashboard,
-    calculate_sharpe_ratio, calculate_win_loss_ratio, calculate_max_drawdown, calculate_profit_factor
 )
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional, Tuple
-import pandas as pd
-import numpy as np
 from collections import defaultdict
 from ba2_trade_platform.ui.utils.perf_logger import PerfLogger
 from ba2_trade_platform.ui.account_filter_context import get_expert_ids_for_account
@@ -53,59 +55,20 @@ class PerformanceTab:
             return get_expert_ids_for_account(self.account_id) or []
         return None
         
-    def _get_closed_transactions(self) -> List[Transaction]:
-        """Get all closed transactions for the account within date range."""
-        session = get_db()
-        try:
-            cutoff_date = datetime.now() - timedelta(days=self.date_range_days)
-            
-            query = session.query(Transaction).filter(
-                Transaction.status == TransactionStatus.CLOSED,
-                Transaction.close_date.isnot(None),
-                Transaction.close_date >= cutoff_date
-            )
-            
-            expert_ids = self._effective_expert_ids()
-            if expert_ids is not None:
-                query = query.filter(Transaction.expert_id.in_(expert_ids))
-
-            return query.all()
-        finally:
-            session.close()
-    
-    def _get_monthly_transactions(self) -> List[Transaction]:
-        """Get closed transactions for up to 12 months for monthly trend charts."""
-        session = get_db()
-        try:
-            # Always get up to 12 months for monthly charts
-            cutoff_date = datetime.now() - timedelta(days=365)
-            
-            query = session.query(Transaction).filter(
-                Transaction.status == TransactionStatus.CLOSED,
-                Transaction.close_date.isnot(None),
-                Transaction.close_date >= cutoff_date
-            )
-            
-            expert_ids = self._effective_expert_ids()
-            if expert_ids is not None:
-                query = query.filter(Transaction.expert_id.in_(expert_ids))
-
-            return query.all()
-        finally:
-            session.close()
-    
-    def _calculate_transaction_metrics(self, transactions: List[Transaction]) -> Dict[str, Any]:
-        """Calculate comprehensive metrics from transactions."""
-        if not transactions:
-            return {}
+    def _range_start(self, days: int) -> date:
+        """First close day included in a rolling window of ``days`` days."""
+        return (datetime.now(timezone.utc) - timedelta(days=days)).date()
 
-        # Group by expert instance ID
-        expert_transactions = defaultdict(list)
-        for txn in transactions:
-            expert_transactions[txn.expert_id].append(txn)
+    def _expert_keys(self) -> Optional[List[str]]:
+        """Bucket keys (stringified expert ids) for the effective expert scope."""
+        expert_ids = self._effective_expert_ids()
+        if expert_ids is None:
+            return None
+        return [str(expert_id) for expert_id in expert_ids]
 
-        # Pre-fetch all expert instances in a single query (fixes N+1 query issue)
-        expert_ids = set(expert_transactions.keys())
+    def _get_expert_names(self, expert_keys: List[str]) -> Dict[str, str]:
+        """Map expert bucket keys to display names (alias, else "ClassName-ID")."""
+        expert_ids = [int(key) for key in expert_keys if key]
         experts_map = {}
         if expert_ids:
             session = get_db()
@@ -113,114 +76,40 @@ class PerformanceTab:
                 from sqlmodel import select
                 stmt = select(ExpertInstance).where(ExpertInstance.id.in_(expert_ids))
                 for expert in session.scalars(stmt):
-                    experts_map[expert.id] = expert
+                    experts_map[str(expert.id)] = expert
             finally:
                 session.close()
 
-        # Calculate metrics per expert instance
-        expert_metrics = {}
-        for expert_id, txns in expert_transactions.items():
-            # Get expert instance display name from pre-fetched map
-            expert = experts_map.get(expert_id)
+        names = {}
+        for key in expert_keys:
+            expert = experts_map.get(key)
             if expert:
                 # Use alias if available, otherwise "ClassName-ID"
-                if expert.alias:
-                    expert_name = expert.alias
-                else:
-                    expert_name = f"{expert.expert}-{expert.id}"
+                names[key] = expert.alias if expert.alias else f"{expert.expert}-{expert.id}"
             else:
-                expert_name = f"Expert-{expert_id}"
-            
-            # Calculate transaction duration
-            durations = []
-            for txn in txns:
-                if txn.open_date and txn.close_date:
-                    duration = (txn.close_date - txn.open_date).total_seconds() / 86400  # days
-                    durations.append(duration)
-            
-            # Calculate P&L (handles both long and short positions)
-            pnls = []
-            for txn in txns:
-                pnl = calculate_transaction_pnl(txn)
-                if pnl is not None:
-                    pnls.append(pnl)
+                names[key] = f"Expert-{key or None}"
+        return names
 
-            winning_pnls = [p for p in pnls if p > 0]
-            losing_pnls = [p for p in pnls if p < 0]
+    def _calculate_transaction_metrics(self) -> Dict[str, Any]:
+        """Per expert instance metrics for the selected period, from the daily buckets."""
+        stats_by_expert = get_range_stats(
+            SCOPE_EXPERT, start=self._range_start(self.date_range_days), keys=self._expert_keys()
+        )
+        names = self._get_expert_names(list(stats_by_expert.keys()))
+        return {names[key]: stats.to_metrics() for key, stats in stats_by_expert.items()}
 
-            # Win/loss ratio
-            win_rate, wins, losses = calculate_win_loss_ratio(
-                [{'pnl': pnl} for pnl in pnls]
-            )
+    def _calculate_monthly_metrics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Monthly metrics per expert instance over the last 12 months (independent of date filter)."""
+        by_key = get_monthly_pnl(SCOPE_EXPERT, start=self._range_start(365), keys=self._expert_keys())
+        keys = {key for month in by_key.values() for key in month}
+        names = self._get_expert_names(list(keys))
 
-            # Calculate returns for Sharpe ratio
-            returns = []
-            for txn in txns:
-                pnl = calculate_transaction_pnl(txn)
-                if pnl is not None:
-                    # Scale by the contract multiplier (100 for options) to match the
-                    # multiplier-aware P&L, so the return ratio stays correct.
-                    position_value = txn.open_price * txn.quantity * (getattr(txn, "multiplier", None) or 1)
-                    if position_value != 0:
-                        returns.append(pnl / position_value)
-            
-            expert_metrics[expert_name] = {
-                'total_transactions': len(txns),
-                'avg_duration_days': np.mean(durations) if durations else 0,
-                'total_pnl': sum(pnls) if pnls else 0,
-                'avg_pnl': np.mean(pnls) if pnls else 0,
-                'win_rate': win_rate,
-                'wins': wins,
-                'losses': losses,
-                'profit_factor': calculate_profit_factor(winning_pnls, losing_pnls),
-                'largest_win': max(winning_pnls) if winning_pnls else None,
-                'largest_loss': min(losing_pnls) if losing_pnls else None,
-                'sharpe_ratio': calculate_sharpe_ratio(returns) if len(returns) >= 30 else None,
-                'transactions': txns,
-                'returns': returns
-            }
-        
-        return expert_metrics
-    
-    def _calculate_monthly_metrics(self, transactions: List[Transaction]) -> Dict[str, Dict[str, float]]:
-        """Calculate monthly metrics per expert instance."""
         monthly_data = defaultdict(lambda: defaultdict(lambda: {'pnl': 0, 'count': 0}))
-
-        if not transactions:
-            return monthly_data
-
-        # Pre-fetch all expert instances in a single query (fixes N+1 query issue)
-        expert_ids = set(txn.expert_id for txn in transactions if txn.expert_id)
-        experts_map = {}
-        if expert_ids:
-            session = get_db()
-            try:
-                from sqlmodel import select
-                stmt = select(ExpertInstance).where(ExpertInstance.id.in_(expert_ids))
-                for expert in session.scalars(stmt):
-                    experts_map[expert.id] = expert
-            finally:
-                session.close()
-
-        for txn in transactions:
-            pnl = calculate_transaction_pnl(txn)
-            if txn.close_date and pnl is not None:
-                month_key = txn.close_date.strftime('%Y-%m')
-
-                # Get expert instance display name from pre-fetched map
-                expert = experts_map.get(txn.expert_id)
-                if expert:
-                    # Use alias if available, otherwise "ClassName-ID"
-                    if expert.alias:
-                        expert_name = expert.alias
-                    else:
-                        expert_name = f"{expert.expert}-{expert.id}"
-                else:
-                    expert_name = f"Expert-{txn.expert_id}"
-
-                monthly_data[month_key][expert_name]['pnl'] += pnl
-                monthly_data[month_key][expert_name]['count'] += 1
-
+        for month_key, experts in by_key.items():
+            for key, data in experts.items():
+                entry = monthly_data[month_key][names[key]]
+                entry['pnl'] += data['pnl']
+                entry['count'] += data['count']
         return monthly_data
     
     def _render_summary_metrics(self, expert_metrics: Dict[str, Any]):
@@ -236,12 +125,10 @@ class PerformanceTab:
         all_losses = sum(m['losses'] for m in expert_metrics.values())
         overall_win_rate = (all_wins / (all_wins + all_losses) * 100) if (all_wins + all_losses) > 0 else 0
         
-        # All returns for Sharpe
-        all_returns = []
-        for metrics in expert_metrics.values():
-            all_returns.extend(metrics['returns'])
-        
-        overall_sharpe = calculate_sharpe_ratio(all_returns) if len(all_returns) >= 30 else None
+        # Sharpe over all returns, combined from the daily buckets' return moments
+        overall_sharpe = get_total_stats(
+            SCOPE_EXPERT, start=self._range_start(self.date_range_days), keys=self._expert_keys()
+        ).sharpe_ratio
         
         # Create metric cards
         metrics_list = [
@@ -330,12 +217,27 @@ class PerformanceTab:
             )
             chart4.render()
     
-    def _render_monthly_trends(self, transactions: List[TradingOrder]):
-        """Render monthly trend charts by expert instance."""
-        if not transactions:
+    def _render_equity_curve(self):
+        """Render the cumulative realized P&L curve and its max drawdown for the selected period."""
+        equity = get_equity_series(
+            SCOPE_EXPERT, start=self._range_start(self.date_range_days), keys=self._expert_keys()
+        )
+        if not equity['points']:
             return
-        
-        monthly_data = self._calculate_monthly_metrics(transactions)
+
+        ui.label("Cumulative P&L").classes('text-xl font-bold mt-8 mb-4').style('color: #e2e8f0;')
+        chart = TimeSeriesChart(
+            title=f"Cumulative Realized P&L (max drawdown ${equity['max_drawdown']:,.2f})",
+            series_data={'Cumulative P&L': equity['points']},
+            ylabel="P&L ($)",
+            height=350,
+            date_format="daily"
+        )
+        chart.render()
+
+    def _render_monthly_trends(self):
+        """Render monthly trend charts by expert instance."""
+        monthly_data = self._calculate_monthly_metrics()
         
         if not monthly_data:
             return
@@ -482,26 +384,28 @@ class PerformanceTab:
             self._load_and_render_content()
     
     def _load_and_render_content(self):
-        """Load transaction data and render all charts."""
-        # Get transactions for main metrics (filtered by date range)
-        transactions = self._get_closed_transactions()
+        """Fold newly closed transactions into the daily buckets and render all charts."""
+        try:
+            sync_performance_analytics()
+        except Exception as e:
+            logger.error(f"Error syncing performance analytics: {e}", exc_info=True)
+
+        # Metrics for the selected date range, combined from precomputed daily buckets
+        expert_metrics = self._calculate_transaction_metrics()
         
-        if not transactions:
+        if not expert_metrics:
             ui.label("No closed transactions found for the selected period").classes(
                 'text-center p-8 text-lg'
             ).style('color: #a0aec0;')
             return
         
-        # Calculate metrics
-        expert_metrics = self._calculate_transaction_metrics(transactions)
-        
         # Render components
         self._render_summary_metrics(expert_metrics)
         self._render_expert_comparison_charts(expert_metrics)
+        self._render_equity_curve()
         
-        # Get up to 12 months of data for monthly trends (independent of date filter)
-        monthly_transactions = self._get_monthly_transactions()
-        self._render_monthly_trends(monthly_transactions)
+        # Up to 12 months of data for monthly trends (independent of date filter)
+        self._render_monthly_trends()
         
         self._render_detailed_table(expert_metrics)
         
@@ -46,6 +46,20 @@ CACHE_FOLDER = os.getenv("CACHE_FOLDER", os.path.join(COMMON_DIR, "cache"))
 SCREENER_STORE_DIR = os.path.join(CACHE_FOLDER, "screener", "metric_store")
 SCREENER_HISTORY_DB = os.path.join(CACHE_FOLDER, "screener", "screener_history.sqlite")
 OPTIONS_CACHE_DB = os.path.join(CACHE_FOLDER, "options", "options_history.sqlite")
+# Columnar (memory-mapped) copy of the options cache; backtests prefer it once built.
+OPTIONS_STORE_DIR = os.path.join(CACHE_FOLDER, "options", "columnar")
+# Fitted IV surfaces (one per underlying) built from the options cache; see iv_surface.py.
+IV_SURFACE_DIR = os.path.join(CACHE_FOLDER, "options", "iv_surface")
+# Point-in-time fundamentals panel built from the fmp_history statement cache; see statement_panel.py.
+FUNDAMENTALS_PANEL_DIR = os.path.join(CACHE_FOLDER, "fundamentals", "panel")
+# Memoised FundamentalsService results keyed by provider data versions; see fundamentals/merged_cache.py.
+FUNDAMENTALS_MERGED_CACHE_DIR = os.path.join(CACHE_FOLDER, "fundamentals", "merged")
+# Aligned daily panel of the FRED series cache (CACHE_FOLDER/fred); see macro/macro_panel.py.
+MACRO_PANEL_DIR = os.path.join(CACHE_FOLDER, "macro", "panel")
+# Persist the shared computed-indicator series cache under CACHE_FOLDER/indicator_series so a
+# restarted process resumes it (see indicators/series_cache.py). Opt-in: set
+# BA2_INDICATOR_SERIES_PERSIST=1; by default the shared cache is memory-only.
+INDICATOR_SERIES_PERSIST = os.getenv("BA2_INDICATOR_SERIES_PERSIST", "0") == "1"
 
 # Default HTTP port for the web interface
 HTTP_PORT = 8080
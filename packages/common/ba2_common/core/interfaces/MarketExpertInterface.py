@@ -481,6 +481,24 @@ class MarketExpertInterface(ExtendableSettingsInterface):
                                "Filters out basing (Stage 1), topping (Stage 3) and declining (Stage 4) names. "
                                "Adds an OHLCV history fetch (~250 days) for the candidates."
                 },
+                "screener_pipeline": {
+                    "type": "bool", "required": False, "default": False,
+                    "description": "Pipelined screening (concurrent quote/history chunks)",
+                    "tooltip": "Fetch live quotes and price-drop history in concurrent chunks, filtering each "
+                               "chunk as it arrives; the price-drop check stops fetching once the top N are "
+                               "found. Same results as the default mode."
+                },
+                "screener_pipeline_concurrency": {
+                    "type": "int", "required": False, "default": 8,
+                    "description": "Pipelined screening: chunks in flight",
+                    "tooltip": "Maximum concurrent FMP requests (and pooled connections) in pipelined mode."
+                },
+                "screener_pipeline_rate_per_minute": {
+                    "type": "int", "required": False, "default": 0,
+                    "description": "Pipelined screening: FMP calls/minute (0 = plan limit)",
+                    "tooltip": "Per-endpoint request budget for the pipelined screener, applied on top of the "
+                               "FMP plan limit. 0 = only the plan limit."
+                },
 
             }
 
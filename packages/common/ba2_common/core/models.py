@@ -799,3 +799,55 @@ class OptionActivity(SQLModel, table=True):
     price: float | None = Field(default=None)
     processed_at: DateTime = Field(default_factory=lambda: DateTime.now(timezone.utc), index=True)
     result: str | None = Field(default=None, description="What reconciliation did")
+
+
+class PerformanceDailyBucket(SQLModel, table=True):
+    """Pre-aggregated closed-transaction statistics for one (day, scope, scope_key).
+
+    Maintained incrementally by ``ba2_trade_platform.core.PerformanceAnalytics`` as
+    transactions close. Every column is additive (sums, counts, extrema), so any date
+    range is answered by combining its daily buckets instead of re-reading every
+    transaction. ``scope`` is one of ``expert`` / ``account`` / ``symbol`` and
+    ``scope_key`` the stringified id or symbol ("" when the transaction has no expert).
+    """
+    __tablename__ = "performance_daily_bucket"
+    __table_args__ = (UniqueConstraint('day', 'scope', 'scope_key', name='uix_perfbucket_day_scope_key'),)
+    id: int | None = Field(default=None, primary_key=True)
+    day: date = Field(index=True, description="Close date (UTC) of the folded transactions")
+    scope: str = Field(index=True)
+    scope_key: str = Field(default="")
+    trades: int = Field(default=0, description="Closed transactions (including ones without a computable P&L)")
+    pnl_count: int = Field(default=0, description="Transactions with a computable P&L")
+    wins: int = Field(default=0)
+    losses: int = Field(default=0)
+    total_pnl: float = Field(default=0.0)
+    gross_profit: float = Field(default=0.0)
+    gross_loss: float = Field(default=0.0, description="Sum of losing P&Ls (negative or zero)")
+    largest_win: float | None = Field(default=None)
+    largest_loss: float | None = Field(default=None)
+    duration_sum_days: float = Field(default=0.0)
+    duration_count: int = Field(default=0)
+    return_count: int = Field(default=0)
+    return_sum: float = Field(default=0.0)
+    return_sumsq: float = Field(default=0.0)
+
+
+class PerformanceFoldedTransaction(SQLModel, table=True):
+    """Marks a closed transaction as already folded into ``performance_daily_bucket``.
+
+    The incremental sync folds only closed transactions that have no row here, so it
+    picks up closes from every code path (broker refresh, manual close, SRM) without
+    hooking each one. ``day`` records the bucket the transaction landed in, and the
+    remaining columns the transaction fields the fold read: when they no longer match
+    the transaction (a later close-price/date correction, a reopen) or the transaction
+    is gone, the sync refolds that day.
+    """
+    __tablename__ = "performance_folded_transaction"
+    transaction_id: int = Field(primary_key=True)
+    day: date = Field(index=True)
+    folded_at: DateTime = Field(default_factory=lambda: DateTime.now(timezone.utc))
+    expert_id: int | None = Field(default=None)
+    quantity: float | None = Field(default=None)
+    open_price: float | None = Field(default=None)
+    close_price: float | None = Field(default=None)
+    close_date: DateTime | None = Field(default=None)
@@ -27,7 +27,7 @@ from ba2_experts.FactorRanker import data
 from ba2_experts.FactorRanker.construction import long_only_top_n
 from ba2_experts.FactorRanker.factors import (
     composite_score, cross_sectional_zscore, earnings_surprise, momentum_12_1,
-    quality_score, rank_symbols, value_score,
+    quality_score, quality_score_frame, rank_symbols, value_score, value_score_frame,
 )
 from ba2_experts.FactorRanker.portfolio import FactorPortfolioManager
 
@@ -42,6 +42,9 @@ _FACTOR_PIPELINE = {
     "pead": ("fetch_pead_inputs", earnings_surprise),
 }
 
+# Factors whose inputs are read from the point-in-time fundamentals panel when configured.
+_PANEL_FACTORS = ("value", "quality")
+
 
 def _accepts_kwarg(fn, name: str) -> bool:
     """True iff ``fn`` accepts ``name`` as a keyword argument (declared param or **kwargs).
@@ -194,6 +197,10 @@ class FactorRanker(ExpertDataExportInterface, MarketExpertInterface):
                 "type": "str", "required": False, "default": "",
                 "description": "Path to a prebuilt screener metric store (parquet dir, built via ba2-test build-screener-metrics). When set with universe_source=screener, FactorRanker resolves its candidate universe from the fast metric_store (survivorship-biased: current tradable names) instead of the slower survivorship-free StockScreener.",
             },
+            "fundamentals_panel": {
+                "type": "str", "required": False, "default": "",
+                "description": "Path to a prebuilt point-in-time fundamentals panel (parquet dir, built via tools/build_fundamentals_panel.py from the FMP statement cache). Backtests only: when set, the value and quality factors are computed column-wise from the panel for every symbol it covers freshly, and uncovered symbols fall back to the per-symbol statement fetch (results identical). Live analysis ignores it and fetches per symbol, since the panel's cache files can be up to 7 days old.",
+            },
         }
 
     def __init__(self, id: int):
@@ -612,6 +619,49 @@ class FactorRanker(ExpertDataExportInterface, MarketExpertInterface):
             price_as_of = {s: _num(rows[s].get("close")) for s in universe}
         return momentum, price_as_of
 
+    def _panel_factor_inputs(self, universe: List[str], as_of: Optional[datetime], weights,
+                             ohlcv_provider=None, price_as_of=None):
+        """``({factor: {symbol: score}}, uncovered_symbols)`` for the statement-based factors
+        (value / quality) read from the ``fundamentals_panel``, or ``({}, universe)`` to fall back
+        to the per-symbol fetchers.
+
+        Used only in frozen (backtest) mode, where the provider reads the same statement cache
+        files: live, it fetches fresh while the panel may be up to ``PANEL_MAX_AGE_DAYS`` stale.
+        A symbol is covered when the panel holds all three of its statements, fetched no more than
+        ``PANEL_MAX_AGE_DAYS`` before ``as_of`` (the same freshness the statement disk cache itself
+        honours); its as_of slice is then exactly the row ``fetch_value_inputs`` /
+        ``fetch_quality_inputs`` would pick, and the vectorised transforms apply the same drop
+        rules, so the scores are identical. Any panel issue -> full fallback (results unchanged)."""
+        from ba2_providers.fmp_common import _is_ttl_frozen
+
+        names = [n for n in _PANEL_FACTORS if float(weights.get(n, 0.0)) != 0.0]
+        path = (self.get_setting_with_interface_default("fundamentals_panel") or "").strip()
+        if not names or not path or not universe or not _is_ttl_frozen():
+            return {}, universe
+        when = as_of or datetime.now(timezone.utc)
+        try:
+            from ba2_providers.fundamentals.statement_panel import FundamentalsPanel
+            panel = FundamentalsPanel.load(path)
+            by_key = {s.upper(): s for s in universe}
+            covered = panel.covered(list(by_key), when)
+            if not covered:
+                return {}, universe
+            wide = panel.as_of(when, covered).rename(index=by_key)
+            out: Dict[str, Dict[str, float]] = {}
+            if "value" in names:
+                prices = data.as_of_prices(wide.index, when, ohlcv_provider, price_as_of)
+                out["value"] = value_score_frame(data.value_inputs_frame(wide, prices)).to_dict()
+            if "quality" in names:
+                out["quality"] = quality_score_frame(data.quality_inputs_frame(wide)).to_dict()
+        except Exception as e:  # noqa: BLE001 — any panel issue -> safe per-symbol fallback
+            self.logger.warning(f"FactorRanker: fundamentals panel unavailable ({e}); fetching per symbol")
+            return {}, universe
+        covered_set = {by_key[k] for k in covered}
+        rest = [s for s in universe if s not in covered_set]
+        self.logger.info(f"FactorRanker: {len(covered_set)} symbols from the fundamentals panel, "
+                         f"{len(rest)} fetched per symbol")
+        return out, rest
+
     def _gather(self, providers: ProviderBundle, as_of: Optional[datetime]) -> Dict[str, Any]:
         """Resolve the universe, fetch + compute each enabled factor (threading
         as_of), read current holdings, and fetch as_of closes. Returns the
@@ -636,6 +686,11 @@ class FactorRanker(ExpertDataExportInterface, MarketExpertInterface):
         # momentum_12_1 and the as_of close, so the momentum + value factors need NO OHLCV history.
         precomputed_momentum, price_as_of = self._store_factor_inputs(universe, as_of)
 
+        # Value / quality read column-wise from the fundamentals panel (when configured) for the
+        # symbols it covers; only the remainder goes through the per-symbol statement fetchers.
+        panel_factors, panel_rest = self._panel_factor_inputs(
+            universe, as_of, weights, ohlcv_provider, price_as_of)
+
         factors: Dict[str, Dict[str, float]] = {}
         for name, (fetch_name, calc) in _FACTOR_PIPELINE.items():
             if float(weights.get(name, 0.0)) == 0.0:
@@ -643,6 +698,16 @@ class FactorRanker(ExpertDataExportInterface, MarketExpertInterface):
             if name == "momentum" and precomputed_momentum is not None:
                 factors[name] = {s: precomputed_momentum.get(s, 0.0) for s in universe}
                 continue
+            if name in panel_factors:
+                computed = dict(panel_factors[name])
+                if panel_rest:
+                    computed.update(self._compute_factor(
+                        name, fetch_name, calc, panel_rest, as_of=as_of,
+                        ohlcv_provider=ohlcv_provider,
+                        price_as_of=(price_as_of if name == "value" else None)))
+                # Universe order, as the fetchers return it (the z-score mean sums in this order).
+                factors[name] = {s: computed[s] for s in universe if s in computed}
+                continue
             factors[name] = self._compute_factor(
                 name, fetch_name, calc, universe, as_of=as_of,
                 pead_drift_window_days=pead_window, ohlcv_provider=ohlcv_provider,
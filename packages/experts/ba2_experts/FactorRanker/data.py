@@ -11,6 +11,10 @@ Two layers:
   existing FMP providers, applying the pure transforms. Network I/O; not unit
   tested (the expert mocks these). Per-symbol failures are logged and skipped so
   one bad symbol never kills the batch.
+* **Panel transforms** (``value_inputs_frame``, ``quality_inputs_frame``) — the value /
+  quality fetchers' transforms and drop rules, vectorised over an as-of slice of the
+  point-in-time fundamentals panel (``ba2_providers.fundamentals.statement_panel``), one
+  column per input instead of one dict per symbol.
 
 v1 uses the most recent *annual* statements for value/quality (simpler and robust);
 momentum uses ~400 calendar days of daily closes.
@@ -96,6 +100,75 @@ def build_quality_inputs(net_income: Optional[float], equity: Optional[float],
     }
 
 
+# --------------------------------------------------------------------------- #
+# Panel transforms (vectorised; unit tested against the per-symbol fetchers)
+# --------------------------------------------------------------------------- #
+
+def _has_statements(panel: pd.DataFrame) -> pd.Series:
+    """All three statements filed as of the slice (``_require_statement`` on each)."""
+    return panel["has_income"] & panel["has_balance"] & panel["has_cashflow"]
+
+
+def value_inputs_frame(panel: pd.DataFrame, prices: pd.Series) -> pd.DataFrame:
+    """``fetch_value_inputs`` over a fundamentals-panel as-of slice (index = symbol).
+
+    ``prices`` are the as_of closes by symbol. Same drop rules as the fetcher: every statement
+    filed, a positive as_of close and positive dated shares (market cap = close x shares).
+    Columns: ``eps_ttm``, ``price``, ``fcf_ttm``, ``enterprise_value``.
+    """
+    df = panel[_has_statements(panel)]
+    price = pd.to_numeric(prices.reindex(df.index), errors="coerce").astype(float)
+    shares = df["weighted_average_shares_outstanding"]
+    keep = (price > 0) & (shares > 0)
+    df, price, shares = df[keep], price[keep], shares[keep]
+    total_debt = df["short_term_debt"].fillna(0.0) + df["long_term_debt"].fillna(0.0)
+    return pd.DataFrame({
+        "eps_ttm": df["eps"],
+        "price": price,
+        "fcf_ttm": df["free_cash_flow"],
+        "enterprise_value": price * shares + total_debt - df["cash_and_cash_equivalents"].fillna(0.0),
+    })
+
+
+def quality_inputs_frame(panel: pd.DataFrame) -> pd.DataFrame:
+    """``fetch_quality_inputs`` over a fundamentals-panel as-of slice (index = symbol).
+
+    Same drop rules as the fetcher: every statement filed and at least one quality signal (ROE,
+    or both gross profit and total assets). Columns: ``roe``, ``gross_profit``,
+    ``total_assets``, ``accruals_ratio`` (NaN where not computable).
+    """
+    df = panel[_has_statements(panel)]
+    ni, equity = df["net_income"], df["total_shareholder_equity"]
+    assets, ocf = df["total_assets"], df["operating_cash_flow"]
+    roe = (ni / equity).where(ni.notna() & equity.notna() & (equity != 0))
+    accruals = ((ni - ocf) / assets).where(ni.notna() & ocf.notna() & assets.notna() & (assets != 0))
+    out = pd.DataFrame({"roe": roe, "gross_profit": df["gross_profit"],
+                        "total_assets": assets, "accruals_ratio": accruals})
+    return out[roe.notna() | (out["gross_profit"].notna() & assets.notna())]
+
+
+def as_of_prices(symbols, as_of: datetime, ohlcv_provider=None,
+                 price_as_of: Optional[Dict[str, float]] = None) -> pd.Series:
+    """The value fetcher's price lookup for many symbols: ``price_as_of`` when given, else the
+    OHLCV close at ``as_of`` (``ohlcv_provider`` or a fresh ``FMPOHLCVProvider``). Symbols whose
+    close cannot be read are NaN (dropped by ``value_inputs_frame``)."""
+    symbols = list(symbols)
+    if price_as_of is not None:
+        return pd.Series([price_as_of.get(s) for s in symbols], index=symbols, dtype=float)
+    provider = ohlcv_provider
+    if provider is None and symbols:
+        from ba2_providers.ohlcv.FMPOHLCVProvider import FMPOHLCVProvider
+        provider = FMPOHLCVProvider()
+    out = {}
+    for sym in symbols:
+        try:
+            out[sym] = _as_of_close(provider, sym, as_of)
+        except Exception as e:
+            logger.warning(f"FactorRanker: as_of close unavailable for {sym}: {e}")
+            out[sym] = None
+    return pd.Series(out, index=symbols, dtype=float)
+
+
 # --------------------------------------------------------------------------- #
 # Thin fetchers (network I/O — not unit tested; the expert mocks these)
 # --------------------------------------------------------------------------- #
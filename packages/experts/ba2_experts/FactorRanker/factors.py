@@ -74,6 +74,26 @@ def quality_score(data: Dict[str, dict]) -> Dict[str, float]:
     return out
 
 
+def _truthy(s: pd.Series) -> pd.Series:
+    """Vectorised ``bool(x)`` for numeric inputs: present (not NaN) and non-zero."""
+    return s.notna() & (s != 0)
+
+
+def value_score_frame(df: pd.DataFrame) -> pd.Series:
+    """``value_score`` over a frame of value inputs (index = symbol), column-wise."""
+    ey = (df["eps_ttm"] / df["price"]).where(_truthy(df["eps_ttm"]) & _truthy(df["price"]), 0.0)
+    fcfy = (df["fcf_ttm"] / df["enterprise_value"]).where(
+        _truthy(df["fcf_ttm"]) & _truthy(df["enterprise_value"]), 0.0)
+    return 0.5 * ey + 0.5 * fcfy
+
+
+def quality_score_frame(df: pd.DataFrame) -> pd.Series:
+    """``quality_score`` over a frame of quality inputs (index = symbol), column-wise."""
+    gp = (df["gross_profit"] / df["total_assets"]).where(
+        _truthy(df["gross_profit"]) & _truthy(df["total_assets"]), 0.0)
+    return df["roe"].fillna(0.0) + gp - df["accruals_ratio"].fillna(0.0)
+
+
 def cross_sectional_zscore(values: Dict[str, float], winsorize_pct: float = 0.0) -> Dict[str, float]:
     """Z-score raw factor values across the universe (mean 0, std 1).
 
@@ -104,15 +124,19 @@ def composite_score(factor_values: Dict[str, Dict[str, float]], weights: Dict[st
     # ``rank_symbols``' stable-sort tie-break, making equal-score symbols rank in a
     # non-deterministic order across runs. Sorting here pins the key order.
     symbols = sorted(set().union(*[set(v) for v in factor_values.values()])) if factor_values else []
-    out = {s: 0.0 for s in symbols}
+    # Accumulated as one array over the sorted universe: the same per-symbol float ops, in the
+    # same factor order, as a dict loop (a symbol missing from a factor adds w * 0.0).
+    pos = {s: i for i, s in enumerate(symbols)}
+    out = np.zeros(len(symbols))
     for fname, vals in factor_values.items():
         w = weights.get(fname, 0.0)
         if w == 0.0:
             continue
         z = cross_sectional_zscore(vals, winsorize_pct)
-        for s in symbols:
-            out[s] += w * z.get(s, 0.0)
-    return out
+        col = np.zeros(len(symbols))
+        col[[pos[s] for s in z]] = list(z.values())
+        out += w * col
+    return dict(zip(symbols, out.tolist()))
 
 
 def rank_symbols(composite: Dict[str, float]) -> List[str]:
@@ -124,4 +148,8 @@ def rank_symbols(composite: Dict[str, float]) -> List[str]:
     flip places run-to-run and change the top-N cut. Sorting by ``(-score, symbol)``
     makes the ranking — and therefore the held book — bit-stable.
     """
-    return sorted(composite, key=lambda s: (-composite[s], s))
+    syms = list(composite)
+    if not syms:
+        return []
+    order = np.lexsort((np.array(syms), -np.fromiter(composite.values(), float, len(syms))))
+    return [syms[i] for i in order]
@@ -527,6 +527,7 @@ class PennyMomentumTrader(
         reason: str,
     ):
         """Append a trade event to executed_trades in market_analysis state."""
+        self._note_tick_to_order(symbol)
         with get_db() as session:
             ma = session.get(MarketAnalysis, market_analysis.id)
             if ma:
@@ -346,6 +346,12 @@ class ConditionEvaluator:
         """Clear the indicator cache between evaluation cycles."""
         self._indicator_cache.clear()
 
+    def set_current_price(self, symbol: str, price: Optional[float]) -> None:
+        """Seed this cycle's current price (e.g. a streamed tick) so price conditions
+        use it instead of fetching the latest 1m close. Cleared by ``clear_cache``."""
+        if price is not None:
+            self._indicator_cache[f"price:{symbol}"] = float(price)
+
     # -------------------------------------------------------------------
     # Public evaluation methods
     # -------------------------------------------------------------------
@@ -18,6 +18,7 @@ from ba2_common.core.types import MarketAnalysisStatus
 from ba2_common.core.interfaces.LLMServiceInterface import get_llm_service
 
 from ba2_experts.PennyMomentumTrader.conditions import ConditionEvaluator, get_condition_types_for_llm, validate_condition_set
+from ba2_experts.PennyMomentumTrader.price_events import LatencyTracker, TriggerBook
 from ba2_experts.PennyMomentumTrader.tier_tracking import merge_tier_update, migrate_triggered_state
 from ba2_experts.PennyMomentumTrader.trailing import apply_trailing_ratchet, update_high_watermark
 from ba2_experts.PennyMomentumTrader.prompts import (
@@ -26,8 +27,15 @@ from ba2_experts.PennyMomentumTrader.prompts import (
     build_exit_update_prompt,
 )
 
+# Times a dead price stream is reopened in one session before the monitor falls back to polling.
+_MAX_FEED_RECONNECTS = 3
+
 
 class MonitoringPhasesMixin:
+    # Event mode: (ticks of the batch being evaluated, tracker) while orders may be placed,
+    # so _record_trade can stamp tick-to-order latency at placement.
+    _order_ticks = None
+
     def _phase_0_review(self, market_analysis: MarketAnalysis):
         """Review existing open positions and record current state."""
         self.logger.info("Phase 0: Reviewing existing positions")
@@ -266,12 +274,68 @@ class MonitoringPhasesMixin:
                     current_monitored_init.update(synthesized)
                     self._update_state(market_analysis, {"monitored_symbols": current_monitored_init})
 
+        # Event-driven mode (monitoring_mode="event"): the loop wakes on streamed ticks instead
+        # of the interval and evaluates only the symbols whose price left their trigger band
+        # (price_events.py), using the tick as the live price. A full sweep -- the polling tick --
+        # still runs on start and every event_heartbeat_seconds for time-based conditions and
+        # housekeeping (external closes, stale orders, EOD exits, LLM exit updates).
+        feed = None
+        if self.get_setting_with_interface_default("monitoring_mode", log_warning=False) == "event":
+            feed = self._open_price_feed()
+        if feed is not None:
+            heartbeat = float(self.get_setting_with_interface_default(
+                "event_heartbeat_seconds", log_warning=False
+            ))
+            book = TriggerBook(float(self.get_setting_with_interface_default(
+                "event_trigger_band_pct", log_warning=False
+            )))
+            latency = LatencyTracker()
+            event_stats = {"ticks": 0, "evaluations": 0, "sweeps": 0, "reconnects": 0}
+            next_sweep = 0.0
+            self.logger.info(
+                f"Phase 5: event-driven monitoring (band {book.band_pct:.1f}%, "
+                f"heartbeat {heartbeat:.0f}s)"
+            )
+        sweep, due = True, {}
+
         while not self._stop_event.is_set():
             # Check if market is still open
             if not self._is_market_open():
                 self.logger.info("Market closed, exiting monitor loop")
                 break
 
+            if feed is not None and not feed.alive:
+                # The stream thread died after start-up: reopen it (a sweep right after
+                # catches up on moves missed meanwhile), or give up and poll.
+                feed.close()
+                event_stats["reconnects"] += 1
+                feed = (self._open_price_feed()
+                        if event_stats["reconnects"] <= _MAX_FEED_RECONNECTS else None)
+                if feed is None:
+                    self.logger.warning("Event monitor: price stream died, falling back to polling")
+                    self._update_state(market_analysis, {"event_monitor": {
+                        **event_stats, "tick_to_order": latency.summary(), "fallback": "polling"}})
+                    sweep, due = True, {}
+                else:
+                    self.logger.warning(
+                        f"Event monitor: price stream died, reconnected "
+                        f"({event_stats['reconnects']}/{_MAX_FEED_RECONNECTS})"
+                    )
+                    next_sweep = 0.0
+
+            if feed is not None:
+                sweep = time.monotonic() >= next_sweep
+                if sweep:
+                    due = {}
+                    next_sweep = time.monotonic() + heartbeat
+                    event_stats["sweeps"] += 1
+                else:
+                    ticks = feed.poll(timeout=min(1.0, max(0.0, next_sweep - time.monotonic())))
+                    event_stats["ticks"] += len(ticks)
+                    due = book.due(ticks)
+                    if not due:
+                        continue
+
             # Reload monitored symbols (and trailing directives from phase 0) from state
             with get_db() as session:
                 ma = session.get(MarketAnalysis, market_analysis.id)
@@ -291,15 +355,21 @@ class MonitoringPhasesMixin:
 
             active_symbols = [s for s, i in monitored.items() if i.get("status") in ("watching", "triggered")]
             # Log a summary every 10 ticks to avoid spam
-            monitor_tick += 1
+            if sweep:
+                monitor_tick += 1
             if monitor_tick % 10 == 1:
                 self.logger.debug(
                     f"Monitor tick {monitor_tick}: {len(active_symbols)} active symbol(s): "
                     f"{active_symbols} | open positions: {list(open_position_symbols)}"
                 )
 
-            # Batch-fetch live prices for all active symbols in one call
-            live_prices = self._get_live_prices(active_symbols) if active_symbols else {}
+            if sweep:
+                # Batch-fetch live prices for all active symbols in one call
+                live_prices = self._get_live_prices(active_symbols) if active_symbols else {}
+            else:
+                # Event batch: the streamed tick IS the live price
+                live_prices = {s: t.price for s, t in due.items()}
+            self._order_ticks = (due, latency) if feed is not None and due else None
 
             for symbol, info in list(monitored.items()):
                 if self._stop_event.is_set():
@@ -308,8 +378,12 @@ class MonitoringPhasesMixin:
                 status = info.get("status", "")
                 if status not in ("watching", "triggered"):
                     continue
+                if not sweep and symbol not in due:
+                    continue
 
                 evaluator.clear_cache()
+                if symbol in due:
+                    evaluator.set_current_price(symbol, due[symbol].price)
 
                 try:
                     # Use batch-fetched price
@@ -803,12 +877,23 @@ class MonitoringPhasesMixin:
                         f"Error monitoring {symbol}: {e}", exc_info=True
                     )
 
+            if feed is not None:
+                evaluated = active_symbols if sweep else [s for s in due if s in active_symbols]
+                event_stats["evaluations"] += len(evaluated)
+                feed.subscribe(active_symbols)
+                for symbol in evaluated:
+                    book.update(symbol, monitored[symbol])
+                for symbol in [s for s in book.bands if s not in active_symbols]:
+                    book.bands.pop(symbol, None)
+            self._order_ticks = None
+
             # Periodically re-evaluate exit conditions for open positions via LLM
             exit_update_interval = int(self.get_setting_with_interface_default(
                 "exit_update_interval_ticks", log_warning=False
             ))
             if (
                 exit_update_interval > 0
+                and sweep
                 and monitor_tick % exit_update_interval == 0
                 and open_positions
             ):
@@ -817,12 +902,39 @@ class MonitoringPhasesMixin:
                 )
 
             # Persist updated monitored state
-            self._update_state(market_analysis, {"monitored_symbols": monitored})
+            updates = {"monitored_symbols": monitored}
+            if feed is not None:
+                updates["event_monitor"] = {**event_stats, "tick_to_order": latency.summary()}
+            self._update_state(market_analysis, updates)
 
-            # Wait for next interval
-            if self._stop_event.wait(timeout=interval):
+            # Wait for next interval (event mode waits on the feed instead)
+            if feed is None and self._stop_event.wait(timeout=interval):
                 break
 
+        if feed is not None:
+            feed.close()
+            self.logger.info(
+                f"Event monitor: {event_stats['ticks']} ticks, {event_stats['evaluations']} "
+                f"evaluations, {event_stats['sweeps']} sweeps, tick-to-order {latency.summary()}"
+            )
+
+    def _note_tick_to_order(self, symbol: str) -> None:
+        """Record tick-to-order latency for an order just placed on a streamed tick."""
+        if self._order_ticks is not None:
+            due, latency = self._order_ticks
+            tick = due.get(symbol)
+            if tick is not None:
+                latency.record(time.monotonic() - tick.received)
+
+    def _open_price_feed(self):
+        """The streaming price feed for ``monitoring_mode="event"``, or None to poll."""
+        try:
+            from ba2_experts.PennyMomentumTrader.price_events import AlpacaTradeStream
+            return AlpacaTradeStream()
+        except Exception as e:
+            self.logger.warning(f"Event monitor: price stream unavailable ({e}), falling back to polling")
+            return None
+
     def _phase_6_eod(self, market_analysis: MarketAnalysis):
         """End-of-day wrap-up: mark analysis complete, update state."""
         self.logger.info("Phase 6: EOD wrap-up")
@@ -0,0 +1,284 @@
+"""
+Price-event plumbing for PennyMomentumTrader's event-driven monitor (``monitoring_mode="event"``).
+
+The polling monitor (phase 5) re-fetches quotes, positions and OHLCV for every
+monitored symbol every ``monitoring_interval_seconds`` whether or not anything
+moved. The event-driven monitor instead subscribes to a price feed and only
+re-evaluates a symbol when its price leaves a precomputed TRIGGER BAND:
+
+  * the band's edges are the nearest price levels on either side of the last
+    evaluated price at which a stop / take-profit / entry condition can change
+    outcome (``price_above`` / ``price_below`` values, ``percent_*_entry``
+    targets, the trailing high-watermark);
+  * signal conditions (EMA, VWAP, RSI, volume, ...) have no fixed level, so
+    they contribute edges at ``band_pct`` either side of the last evaluated
+    price; a periodic heartbeat sweep covers time-based conditions and
+    housekeeping (external closes, stale orders, EOD exits).
+
+Upstream calls then scale with market activity instead of the polling
+frequency. Ticks are stamped on receipt so the tick-to-order latency can be
+reported (``LatencyTracker``). A feed reports ``alive`` so the monitor notices a
+stream that died after it started, instead of waiting on an empty queue.
+
+Pure helpers + feeds with no platform dependencies so they can be unit-tested
+in isolation (like trailing.py). ``ReplayPriceFeed`` is the local feed for
+tests and dry runs; ``AlpacaTradeStream`` is the live streaming adapter.
+"""
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Time-based conditions change with the clock, not the price: the heartbeat covers them.
+_TIME_TYPES = ("time_after", "time_before")
+
+
+class PriceTick(NamedTuple):
+    symbol: str
+    price: float
+    received: float  # time.monotonic() when the feed received it
+
+
+# ---------------------------------------------------------------------------
+# Trigger bands
+# ---------------------------------------------------------------------------
+
+def condition_price_levels(
+    conditions: Any, entry_price: Optional[float]
+) -> Tuple[List[float], bool]:
+    """Walk a condition tree: ``(price levels, has_signal_conditions)``.
+
+    Levels are the thresholds of price-only conditions (``percent_*_entry``
+    only when ``entry_price`` is known). Any other non-time condition marks the
+    tree as signal-driven.
+    """
+    levels: List[float] = []
+    signals = False
+
+    def _walk(node: Any) -> None:
+        nonlocal signals
+        if isinstance(node, list):
+            for child in node:
+                _walk(child)
+            return
+        if not isinstance(node, dict):
+            return
+        if "all" in node or "any" in node:
+            _walk(node.get("all", node.get("any", [])))
+            return
+        ctype = node.get("type")
+        if ctype in ("price_above", "price_below"):
+            if node.get("value") is not None:
+                levels.append(float(node["value"]))
+        elif ctype in ("percent_above_entry", "percent_below_entry"):
+            if entry_price and node.get("percent") is not None:
+                sign = 1.0 if ctype == "percent_above_entry" else -1.0
+                levels.append(entry_price * (1.0 + sign * float(node["percent"]) / 100.0))
+        elif ctype not in _TIME_TYPES:
+            signals = True
+
+    _walk(conditions)
+    return levels, signals
+
+
+def trigger_band(
+    info: Dict[str, Any],
+    entry_price: Optional[float],
+    last_price: Optional[float],
+    band_pct: float,
+) -> Optional[Tuple[float, float]]:
+    """``(low, high)`` quiet zone around ``last_price`` for one monitored symbol.
+
+    A tick at or beyond either edge may change an outcome and needs an
+    evaluation; inside the band none can. None (no last price yet, or nothing
+    to watch) means "evaluate on the next tick".
+    """
+    if not last_price or last_price <= 0:
+        return None
+    exit_conds = info.get("exit_conditions") or {}
+    if info.get("status") == "triggered":
+        trees: List[Any] = [exit_conds.get("stop_loss")]
+        fired = set(info.get("triggered_tp_tier_ids") or [])
+        trees += [t.get("condition") for t in exit_conds.get("take_profit", [])
+                  if isinstance(t, dict) and t.get("id") not in fired]
+    else:
+        trees = [info.get("entry_conditions")]
+    levels, signals = condition_price_levels(trees, entry_price)
+    if info.get("trail_active") and info.get("high_watermark"):
+        levels.append(float(info["high_watermark"]))  # a new high ratchets the stop
+    if signals and band_pct > 0:
+        levels += [last_price * (1 - band_pct / 100.0), last_price * (1 + band_pct / 100.0)]
+    below = [lv for lv in levels if lv <= last_price]
+    above = [lv for lv in levels if lv >= last_price]
+    if not below and not above:
+        return None
+    return (max(below) if below else 0.0, min(above) if above else float("inf"))
+
+
+def crosses_band(band: Optional[Tuple[float, float]], price: Optional[float]) -> bool:
+    """True when ``price`` is at or beyond an edge of ``band`` (or there is no band)."""
+    if price is None:
+        return False
+    if band is None:
+        return True
+    low, high = band
+    return price <= low or price >= high
+
+
+class TriggerBook:
+    """Per-symbol trigger bands, rebuilt after every evaluation of the symbol."""
+
+    def __init__(self, band_pct: float):
+        self.band_pct = float(band_pct)
+        self.bands: Dict[str, Optional[Tuple[float, float]]] = {}
+
+    def update(self, symbol: str, info: Dict[str, Any], entry_price: Optional[float] = None) -> None:
+        if info.get("status") not in ("watching", "triggered"):
+            self.bands.pop(symbol, None)
+            return
+        self.bands[symbol] = trigger_band(
+            info, entry_price if entry_price is not None else info.get("entry_price"),
+            info.get("last_price"), self.band_pct)
+
+    def due(self, ticks: Iterable[PriceTick]) -> Dict[str, PriceTick]:
+        """Coalesce ``ticks`` to the latest per watched symbol and keep those outside their band."""
+        latest: Dict[str, PriceTick] = {}
+        for tick in ticks:
+            if tick.symbol in self.bands:
+                latest[tick.symbol] = tick
+        return {s: t for s, t in latest.items() if crosses_band(self.bands[s], t.price)}
+
+
+class LatencyTracker:
+    """Tick-to-order latencies (seconds) with a small summary for state / logs."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(max(0.0, float(seconds)))
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+
+        def _pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000.0, 1)
+
+        return {"count": len(ordered), "p50_ms": _pct(0.50), "p95_ms": _pct(0.95),
+                "max_ms": round(ordered[-1] * 1000.0, 1)}
+
+
+# ---------------------------------------------------------------------------
+# Price feeds
+# ---------------------------------------------------------------------------
+
+class PriceFeed:
+    """Thread-safe tick queue. Adapters ``publish`` from their own thread; the
+    monitor ``poll``s from the expert thread."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[PriceTick]" = queue.Queue()
+        self.symbols: set = set()
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        self.symbols.update(symbols)
+
+    def publish(self, symbol: str, price: float) -> None:
+        if symbol in self.symbols and price is not None and price > 0:
+            self._queue.put(PriceTick(symbol, float(price), time.monotonic()))
+
+    def poll(self, timeout: float) -> List[PriceTick]:
+        """Wait up to ``timeout`` seconds for a tick, then drain everything queued."""
+        try:
+            ticks = [self._queue.get(timeout=max(0.0, timeout))]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                ticks.append(self._queue.get_nowait())
+            except queue.Empty:
+                return ticks
+
+    @property
+    def alive(self) -> bool:
+        """False once the feed has stopped delivering ticks for good (a dead stream)."""
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayPriceFeed(PriceFeed):
+    """Local feed replaying ``(symbol, price)`` events in order (tests, dry runs).
+
+    Events for a symbol are released when it is subscribed; ``poll`` returns at
+    most ``batch`` ticks per call so a replay advances like a live stream.
+    """
+
+    def __init__(self, events: Iterable[Tuple[str, float]], batch: int = 1):
+        super().__init__()
+        self._pending = list(events)
+        self._batch = max(1, int(batch))
+
+    def poll(self, timeout: float) -> List[PriceTick]:
+        out: List[PriceTick] = []
+        while self._pending and len(out) < self._batch:
+            symbol, price = self._pending.pop(0)
+            if symbol in self.symbols and price is not None and price > 0:
+                out.append(PriceTick(symbol, float(price), time.monotonic()))
+        return out
+
+    @property
+    def exhausted(self) -> bool:
+        return not self._pending
+
+
+class AlpacaTradeStream(PriceFeed):
+    """Streaming adapter: Alpaca market-data trades via ``alpaca-py``'s
+    ``StockDataStream`` on a daemon thread. Credentials follow the options
+    provider's precedence (``ALPACA_MARKET_API_KEY``/``_SECRET``, then the
+    generic names)."""
+
+    def __init__(self, feed: str = "iex", api_key: Optional[str] = None,
+                 api_secret: Optional[str] = None):
+        super().__init__()
+        from alpaca.data.enums import DataFeed
+        from alpaca.data.live import StockDataStream
+
+        key = (api_key or os.getenv("ALPACA_MARKET_API_KEY")
+               or os.getenv("ALPACA_API_KEY") or os.getenv("APCA_API_KEY_ID"))
+        secret = (api_secret or os.getenv("ALPACA_MARKET_API_SECRET")
+                  or os.getenv("ALPACA_SECRET_KEY") or os.getenv("ALPACA_API_SECRET")
+                  or os.getenv("APCA_API_SECRET_KEY"))
+        if not key or not secret:
+            raise ValueError("Alpaca trade stream needs ALPACA_MARKET_API_KEY/ALPACA_MARKET_API_SECRET "
+                             "(or ALPACA_API_KEY/ALPACA_SECRET_KEY)")
+        self._stream = StockDataStream(key, secret, feed=DataFeed(feed))
+        self._thread: Optional[threading.Thread] = None
+
+    async def _on_trade(self, trade) -> None:
+        self.publish(trade.symbol, trade.price)
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        new = [s for s in symbols if s not in self.symbols]
+        super().subscribe(new)
+        if new:
+            self._stream.subscribe_trades(self._on_trade, *new)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._stream.run, name="penny-trade-stream",
+                                            daemon=True)
+            self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        # The stream thread only returns when the connection is given up (or on close).
+        return self._thread is None or self._thread.is_alive()
+
+    def close(self) -> None:
+        try:
+            self._stream.stop()
+        except Exception:
+            pass
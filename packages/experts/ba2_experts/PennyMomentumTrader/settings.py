@@ -233,6 +233,42 @@ SETTINGS_DEFINITIONS: Dict[str, Any] = {
                 "description": "Minimum confidence score (1-100) for deep triage finalists",
                 "tooltip": "Candidates below this confidence threshold are dropped after deep triage. Higher = more selective.",
             },
+            "monitoring_mode": {
+                "type": "str",
+                "required": False,
+                "default": "poll",
+                "description": "Phase 5 monitoring loop: poll every interval, or react to streamed prices",
+                "valid_values": ["poll", "event"],
+                "tooltip": (
+                    "'poll' re-fetches quotes for every monitored symbol every monitoring interval. "
+                    "'event' subscribes to the Alpaca trade stream and evaluates a symbol only when "
+                    "its price leaves the band in which none of its conditions can change outcome; "
+                    "a heartbeat sweep still runs every event_heartbeat_seconds. Falls back to "
+                    "'poll' when the stream cannot be opened."
+                ),
+            },
+            "event_trigger_band_pct": {
+                "type": "float",
+                "required": False,
+                "default": 1.0,
+                "description": "Re-evaluation band (%) for signal conditions in event mode",
+                "tooltip": (
+                    "Price-only conditions (price/percent thresholds) have exact trigger levels. "
+                    "Signal conditions (EMA, VWAP, RSI, volume) are re-evaluated when the price "
+                    "moves this % from where they were last evaluated. 1.0 = every 1% move."
+                ),
+            },
+            "event_heartbeat_seconds": {
+                "type": "int",
+                "required": False,
+                "default": 300,
+                "description": "Seconds between full monitoring sweeps in event mode",
+                "tooltip": (
+                    "Covers what price ticks cannot: time-based conditions, externally closed "
+                    "positions, stale entry orders, intraday EOD exits and the LLM exit update. "
+                    "Keep it below 15 minutes so the intraday EOD hard-exit is not missed."
+                ),
+            },
             "exit_update_interval_ticks": {
                 "type": "int",
                 "required": True,
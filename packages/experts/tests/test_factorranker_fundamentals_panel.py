@@ -0,0 +1,135 @@
+"""FactorRanker fundamentals-panel path: value / quality read column-wise from the point-in-time
+statement panel (``ba2_providers.fundamentals.statement_panel``) must score every covered symbol
+EXACTLY as the per-symbol fetchers (``fetch_value_inputs`` / ``fetch_quality_inputs`` over
+``FMPCompanyDetailsProvider``) do from the same cached statement histories -- including the
+as_of filing filter and every drop rule (missing shares, non-positive price, zero equity, no
+statement filed yet). Uncovered symbols are left to the fetchers.
+"""
+import json
+import logging
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from ba2_experts.FactorRanker import FactorRanker, data
+from ba2_experts.FactorRanker.factors import (
+    quality_score, quality_score_frame, value_score, value_score_frame,
+)
+from ba2_providers.fmp_common import frozen_ttl_cache
+from ba2_providers.fundamentals import statement_panel as sp
+
+_PROVIDER_MODULE = __import__(
+    "ba2_providers.fundamentals.details.FMPCompanyDetailsProvider",
+    fromlist=["FMPCompanyDetailsProvider"])
+
+AS_OFS = [datetime(2021, 3, 1, tzinfo=timezone.utc), datetime(2022, 2, 20, tzinfo=timezone.utc),
+          datetime(2022, 2, 26, tzinfo=timezone.utc), datetime(2023, 6, 30, tzinfo=timezone.utc)]
+
+
+def _income(date, filed, eps, ni, gp, shares):
+    return {"date": date, "fillingDate": filed, "eps": eps, "netIncome": ni,
+            "grossProfit": gp, "weightedAverageShsOut": shares}
+
+
+def _balance(date, filed, std, ltd, cash, equity, assets):
+    return {"date": date, "fillingDate": filed, "shortTermDebt": std, "longTermDebt": ltd,
+            "cashAndCashEquivalents": cash, "totalStockholdersEquity": equity,
+            "totalAssets": assets}
+
+
+def _cashflow(date, filed, fcf, ocf):
+    return {"date": date, "fillingDate": filed, "freeCashFlow": fcf, "operatingCashFlow": ocf}
+
+
+# Newest-fiscal-first, as FMP returns them. FY2021 filed 2022-02-25 (between two as_of dates).
+HISTORIES = {
+    "AAA": ([_income("2021-12-31", "2022-02-25", 5.1, 510.0, 900.0, 100.0),
+             _income("2020-12-31", "2021-02-20", 4.0, 400.0, 800.0, 100.0)],
+            [_balance("2021-12-31", "2022-02-25", 10.0, 90.0, 50.0, 2000.0, 5000.0),
+             _balance("2020-12-31", "2021-02-20", None, 80.0, 40.0, 1800.0, 4500.0)],
+            [_cashflow("2021-12-31", "2022-02-25", 300.0, 650.0),
+             _cashflow("2020-12-31", "2021-02-20", 250.0, 500.0)]),
+    "BBB": ([_income("2021-12-31", "2022-01-30", -1.2, -120.0, 300.0, 50.0)],
+            [_balance("2021-12-31", "2022-01-30", 0.0, 0.0, 0.0, 0.0, 1000.0)],
+            [_cashflow("2021-12-31", "2022-01-30", None, -80.0)]),
+    "NOSH": ([_income("2021-12-31", "2022-01-15", 2.0, 200.0, None, None)],
+             [_balance("2021-12-31", "2022-01-15", 1.0, 1.0, 1.0, 100.0, None)],
+             [_cashflow("2021-12-31", "2022-01-15", 10.0, 20.0)]),
+    "NEG": ([_income("2021-12-31", "2022-01-15", 1.0, 10.0, 20.0, 10.0)],
+            [_balance("2021-12-31", "2022-01-15", 1.0, 1.0, 1.0, 100.0, 400.0)],
+            [_cashflow("2021-12-31", "2022-01-15", 5.0, 8.0)]),
+    "NOCF": ([_income("2021-12-31", "2022-01-15", 1.0, 10.0, 20.0, 10.0)],
+             [_balance("2021-12-31", "2022-01-15", 1.0, 1.0, 1.0, 100.0, 400.0)],
+             None),  # no cashflow cache file -> not covered
+}
+PRICES = {"AAA": 120.0, "BBB": 30.0, "NOSH": 10.0, "NEG": 0.0, "NOCF": 5.0}
+UNIVERSE = list(HISTORIES)
+
+
+@pytest.fixture
+def cached(tmp_path, monkeypatch):
+    """Write the histories as fmp_history cache files, build the panel, and point the real
+    provider's disk cache at the same files."""
+    cache = tmp_path / "fmp_history"
+    cache.mkdir()
+    for sym, payloads in HISTORIES.items():
+        for (ns, _cols), payload in zip(sp.PANEL_STATEMENTS.values(), payloads):
+            if payload is not None:
+                (cache / f"{ns}__{sym}.json").write_text(json.dumps(payload))
+
+    def _disk_cached(namespace, symbol, fetch, *a, **k):
+        path = cache / f"{namespace}__{symbol}.json"
+        return json.loads(path.read_text()) if path.exists() else []
+
+    details = object.__new__(_PROVIDER_MODULE.FMPCompanyDetailsProvider)
+    monkeypatch.setattr(_PROVIDER_MODULE, "fmp_history_disk_cached", _disk_cached)
+    monkeypatch.setattr(_PROVIDER_MODULE, "FMPCompanyDetailsProvider", lambda *a, **k: details)
+    panel_dir = str(tmp_path / "panel")
+    sp.build_panel(panel_dir, cache_dir=str(cache))
+    yield panel_dir
+    sp.clear_panel_memo()
+
+
+@pytest.mark.parametrize("as_of", AS_OFS)
+def test_panel_scores_match_the_per_symbol_fetchers(cached, as_of):
+    panel = sp.FundamentalsPanel.load(cached)
+    covered = panel.covered(UNIVERSE, as_of)
+    assert covered == ["AAA", "BBB", "NOSH", "NEG"]
+    wide = panel.as_of(as_of, covered)
+    prices = data.as_of_prices(wide.index, as_of, price_as_of=PRICES)
+
+    expected_value = value_score(data.fetch_value_inputs(covered, as_of=as_of, price_as_of=PRICES))
+    expected_quality = quality_score(data.fetch_quality_inputs(covered, as_of=as_of))
+    got_value = value_score_frame(data.value_inputs_frame(wide, prices)).to_dict()
+    got_quality = quality_score_frame(data.quality_inputs_frame(wide)).to_dict()
+
+    assert got_value == expected_value
+    assert got_quality == expected_quality
+
+
+def test_expert_reads_covered_symbols_from_panel_and_leaves_the_rest(cached):
+    as_of = AS_OFS[2]
+    settings = {"fundamentals_panel": cached}
+    me = SimpleNamespace(get_setting_with_interface_default=lambda k: settings.get(k),
+                         logger=logging.getLogger("t"))
+    weights = {"value": 1.0, "quality": 1.0, "momentum": 1.0}
+    # Live: the provider fetches fresh statements, the panel may be days old -> not used.
+    assert FactorRanker._panel_factor_inputs(me, UNIVERSE, as_of, weights, price_as_of=PRICES) \
+        == ({}, UNIVERSE)
+    with frozen_ttl_cache():
+        out, rest = FactorRanker._panel_factor_inputs(me, UNIVERSE, as_of, weights, price_as_of=PRICES)
+
+    assert rest == ["NOCF"]
+    assert set(out) == {"value", "quality"}
+    assert out["value"] == value_score(
+        data.fetch_value_inputs(UNIVERSE[:4], as_of=as_of, price_as_of=PRICES))
+    assert out["quality"] == quality_score(data.fetch_quality_inputs(UNIVERSE[:4], as_of=as_of))
+
+
+def test_expert_falls_back_when_panel_missing_or_disabled(tmp_path):
+    for settings in ({"fundamentals_panel": str(tmp_path / "missing")}, {}):
+        me = SimpleNamespace(get_setting_with_interface_default=lambda k: settings.get(k),
+                             logger=logging.getLogger("t"))
+        out, rest = FactorRanker._panel_factor_inputs(me, UNIVERSE, AS_OFS[0], {"value": 1.0})
+        assert out == {} and rest == UNIVERSE
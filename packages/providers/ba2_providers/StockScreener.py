@@ -10,6 +10,12 @@ Pipeline stages:
     2. Enrich  – batch-fetch FMP quotes for RVOL + client-side filters
     3. Rank    – sort by chosen metric
     4. Filter  – bulk price-drop check on ranked list, stop at N
+
+With ``screener_pipeline`` on, stages 2 and 4 run as chunk pipelines
+(``screener_pipeline.py``): the same cached quote chunks as the batch path go out
+concurrently under the configured concurrency/rate budget and are filtered as they
+arrive, and the ranked price-drop check stops fetching history once the top N are
+settled. Every screen returns per-stage ``timings``.
 """
 
 from datetime import datetime, timedelta, timezone
@@ -18,6 +24,8 @@ from typing import Any, Dict, List, Optional
 from ba2_common.config import get_app_setting
 from ba2_common.logger import logger
 
+from ba2_providers.screener_pipeline import StageTimer
+
 
 class StockScreener:
     """
@@ -38,6 +46,9 @@ class StockScreener:
         screener_price_drop_days   int   1
         screener_max_stocks        int   10
         screener_sort_metric       str   "market_cap"
+        screener_pipeline          int   0  (1 = pipelined quote/price-drop stages)
+        screener_pipeline_concurrency      int   8
+        screener_pipeline_rate_per_minute  int   0  (0 = FMP plan budget only)
     """
 
     # Default values for every setting key
@@ -63,6 +74,12 @@ class StockScreener:
         # 'broad' = available-traded UNION delisted, 'sp500' / 'nasdaq' = dated
         # index constituents. Ignored entirely on the live (as_of=None) path.
         "universe_mode": "broad",
+        # Pipelined mode (0 = off): concurrent chunked quote/history fetches, filtered per
+        # chunk as they arrive, with early termination of the ranked price-drop stage. The
+        # rate budget is a per-endpoint sub-budget on top of the FMP plan limit.
+        "screener_pipeline": 0,
+        "screener_pipeline_concurrency": 8,
+        "screener_pipeline_rate_per_minute": 0,
     }
 
     # Metrics that can be used for ranking
@@ -75,6 +92,10 @@ class StockScreener:
         "price_drop_pct",
     }
 
+    # Symbols per FMP /quote call, in both the batch and the pipelined mode (so they share
+    # the quote cache's chunk keys).
+    _QUOTE_CHUNK_SIZE = 50
+
     def __init__(
         self,
         settings: Dict[str, Any],
@@ -100,6 +121,7 @@ class StockScreener:
                 LOGIC never forks — only its data inputs swap live<->as-of.
         """
         self._progress_callback = progress_callback
+        self._timer = StageTimer()
         # None => live; <date> => reconstructed historical screen.
         self._as_of = as_of
         self._settings: Dict[str, Any] = {}
@@ -146,10 +168,14 @@ class StockScreener:
             Dict with keys:
                 results: Sorted list of stock dicts, length <= screener_max_stocks.
                 stats: Dict of per-filter drop counts and totals.
+                timings: Seconds per stage (``screen_s``, ``enrich_s``, ...,
+                    ``total_s``), plus the pipeline's own fetch timings when pipelined.
         """
         from ba2_providers import get_provider
 
         stats: Dict[str, int] = {}
+        timer = self._timer = StageTimer()
+        pipelined = self._pipelined()
 
         # --- Provider selection: the ONE fork (fetch source, not filter logic) ---
         # as_of=None -> the configured live provider (unchanged); as_of=<date> ->
@@ -171,7 +197,8 @@ class StockScreener:
             f"(as_of={self._as_of}) with filters: {filters}"
         )
         self._report_progress("Fetching candidates from screener...", 0.05)
-        candidates = screener.screen_stocks(filters, as_of=self._as_of)
+        with timer.stage("screen_s"):
+            candidates = screener.screen_stocks(filters, as_of=self._as_of)
         stats["screener_candidates"] = len(candidates)
         logger.info(
             f"StockScreener: stage 1 done — {len(candidates)} candidates returned"
@@ -179,7 +206,7 @@ class StockScreener:
 
         if not candidates:
             self._report_progress("No candidates found.", 1.0)
-            return {"results": [], "stats": stats}
+            return self._finish([], stats)
 
         # --- Stage 2: RVOL enrichment + client-side filters ---
         rvol_min = self._settings["screener_relative_volume_min"]
@@ -191,7 +218,9 @@ class StockScreener:
             self._report_progress(
                 f"Fetching live prices for {len(candidates)} candidates (RVOL)...", 0.2
             )
-            candidates, enrich_stats = self._enrich_with_rvol(candidates, rvol_min)
+            enrich = self._enrich_with_rvol_pipelined if pipelined else self._enrich_with_rvol
+            with timer.stage("enrich_s"):
+                candidates, enrich_stats = enrich(candidates, rvol_min)
             stats.update(enrich_stats)
             logger.info(
                 f"StockScreener: stage 2 done — {len(candidates)} candidates after RVOL filter"
@@ -199,7 +228,7 @@ class StockScreener:
 
         if not candidates:
             self._report_progress("No candidates after RVOL filter.", 1.0)
-            return {"results": [], "stats": stats}
+            return self._finish([], stats)
 
         # --- Stage 2.5: Weinstein Stage 2 filter (optional) ---
         if self._settings.get("screener_weinstein_stage2_only"):
@@ -210,19 +239,21 @@ class StockScreener:
             self._report_progress(
                 f"Checking Weinstein stage for {len(candidates)} candidates...", 0.55
             )
-            candidates, w_stats = self._filter_by_weinstein_stage2(candidates)
+            with timer.stage("weinstein_s"):
+                candidates, w_stats = self._filter_by_weinstein_stage2(candidates)
             stats.update(w_stats)
             logger.info(
                 f"StockScreener: Weinstein filter done — {len(candidates)} in Stage 2"
             )
             if not candidates:
                 self._report_progress("No candidates in Weinstein Stage 2.", 1.0)
-                return {"results": [], "stats": stats}
+                return self._finish([], stats)
 
         metric = self._settings["screener_sort_metric"]
         max_stocks = self._settings["screener_max_stocks"]
         drop_pct = self._settings["screener_price_drop_pct"]
         drop_days = self._settings["screener_price_drop_days"]
+        price_drop = self._filter_by_price_drop_pipelined if pipelined else self._filter_by_price_drop
 
         if metric == "price_drop_pct":
             # Ranking by price drop: fetch history for ALL candidates, sort by drop descending.
@@ -232,11 +263,12 @@ class StockScreener:
             self._report_progress(
                 f"Fetching price history for {len(candidates)} candidates (sort by drop)...", 0.7
             )
-            result, drop_stats = self._filter_by_price_drop(
-                candidates,
-                min_drop_pct=drop_pct if drop_pct > 0 else 0,
-                max_results=len(candidates),  # fetch all — trim after sorting
-            )
+            with timer.stage("price_drop_s"):
+                result, drop_stats = price_drop(
+                    candidates,
+                    min_drop_pct=drop_pct if drop_pct > 0 else 0,
+                    max_results=len(candidates),  # fetch all — trim after sorting
+                )
             stats.update(drop_stats)
             result = sorted(result, key=lambda c: c.get("price_drop_pct") or 0, reverse=True)
             result = result[:max_stocks]
@@ -249,7 +281,8 @@ class StockScreener:
                 f"StockScreener: stage 3 — ranking {len(candidates)} candidates by {metric}"
             )
             self._report_progress("Ranking candidates...", 0.7)
-            ranked = self._rank(candidates)
+            with timer.stage("rank_s"):
+                ranked = self._rank(candidates)
             logger.info(f"StockScreener: stage 3 done")
 
             # --- Stage 4: price-drop filter ---
@@ -261,7 +294,8 @@ class StockScreener:
                 self._report_progress(
                     f"Checking price history (>={drop_pct}% drop over {drop_days}d)...", 0.8
                 )
-                result, drop_stats = self._filter_by_price_drop(ranked, drop_pct, max_stocks)
+                with timer.stage("price_drop_s"):
+                    result, drop_stats = price_drop(ranked, drop_pct, max_stocks)
                 stats.update(drop_stats)
                 logger.info(
                     f"StockScreener: stage 4 done — {len(result)} stocks passed price-drop filter"
@@ -276,7 +310,16 @@ class StockScreener:
             f"(sorted by {self._settings['screener_sort_metric']})"
         )
         self._log_live_selection(result)
-        return {"results": result, "stats": stats}
+        return self._finish(result, stats)
+
+    def _finish(self, result: List[Dict[str, Any]], stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Close the stage timer and assemble ``screen()``'s return value."""
+        timings = self._timer.finish()
+        logger.info(
+            "StockScreener: stage timings — "
+            + ", ".join(f"{k}={v:.3f}" for k, v in timings.items() if v is not None)
+        )
+        return {"results": result, "stats": stats, "timings": timings}
 
     def _log_live_selection(self, result: List[Dict[str, Any]]) -> None:
         """LIVE-ONLY audit trail of WHICH symbols were selected, and under which thresholds.
@@ -309,7 +352,7 @@ class StockScreener:
 
     @staticmethod
     def _fetch_quotes_chunked(
-        symbols: List[str], chunk_size: int = 50, max_workers: int = 5
+        symbols: List[str], chunk_size: int = _QUOTE_CHUNK_SIZE, max_workers: int = 5
     ) -> Dict[str, Dict[str, Any]]:
         """
         Batch-fetch FMP full quotes in parallel chunks with backoff retry.
@@ -324,7 +367,6 @@ class StockScreener:
         """
         import threading
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        from ba2_providers.fmp_common import fmp_http_get, FMPError
 
         api_key = get_app_setting("FMP_API_KEY")
         if not api_key:
@@ -340,38 +382,12 @@ class StockScreener:
         result_lock = threading.Lock()
         completed_count = 0
 
-        from ba2_providers.fmp_common import fmp_live_cached, _FMP_LIVE_QUOTE_TTL_S
-
-        def fetch_chunk(chunk_idx: int, chunk: List[str]):
-            joined = ",".join(chunk)
-            try:
-                # Shared across screener instances: the quote payload depends only on the
-                # symbols, never on this instance's thresholds (those filter it afterwards).
-                resp = fmp_live_cached(
-                    f"screener:quote:{joined}",
-                    lambda: fmp_http_get(
-                        f"https://financialmodelingprep.com/api/v3/quote/{joined}",
-                        params={"apikey": api_key},
-                        endpoint="quote",
-                        timeout=15,
-                    ),
-                    ttl_seconds=_FMP_LIVE_QUOTE_TTL_S,
-                )
-                data = resp.json()
-                if isinstance(data, list):
-                    return {
-                        (item.get("symbol") or "").upper(): item
-                        for item in data
-                        if (item.get("symbol") or "").upper()
-                    }
-            except FMPError as e:
-                logger.warning(f"StockScreener: quote chunk {chunk_idx + 1}/{total_chunks} failed after retries: {e}")
-            except Exception as e:
-                logger.warning(f"StockScreener: quote chunk {chunk_idx + 1}/{total_chunks} failed: {e}")
-            return {}
-
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(fetch_chunk, i, chunk): i for i, chunk in enumerate(chunks)}
+            futures = {
+                executor.submit(StockScreener._fetch_quote_chunk, chunk, api_key,
+                                f"{i + 1}/{total_chunks}"): i
+                for i, chunk in enumerate(chunks)
+            }
             for future in as_completed(futures):
                 items = future.result()
                 with result_lock:
@@ -387,6 +403,39 @@ class StockScreener:
         logger.debug(f"StockScreener: fetched FMP quotes for {len(result)}/{total} symbols")
         return result
 
+    @staticmethod
+    def _fetch_quote_chunk(chunk: List[str], api_key: str, label: str = "") -> Dict[str, Dict[str, Any]]:
+        """One ``/quote`` call for a chunk of symbols -> {SYMBOL: quote}.
+        A failed chunk is logged and returns {}."""
+        from ba2_providers.fmp_common import fmp_http_get, fmp_live_cached, FMPError, _FMP_LIVE_QUOTE_TTL_S
+
+        joined = ",".join(chunk)
+        try:
+            # Shared across screener instances: the quote payload depends only on the
+            # symbols, never on this instance's thresholds (those filter it afterwards).
+            resp = fmp_live_cached(
+                f"screener:quote:{joined}",
+                lambda: fmp_http_get(
+                    f"https://financialmodelingprep.com/api/v3/quote/{joined}",
+                    params={"apikey": api_key},
+                    endpoint="quote",
+                    timeout=15,
+                ),
+                ttl_seconds=_FMP_LIVE_QUOTE_TTL_S,
+            )
+            data = resp.json()
+            if isinstance(data, list):
+                return {
+                    (item.get("symbol") or "").upper(): item
+                    for item in data
+                    if (item.get("symbol") or "").upper()
+                }
+        except FMPError as e:
+            logger.warning(f"StockScreener: quote chunk {label} failed after retries: {e}")
+        except Exception as e:
+            logger.warning(f"StockScreener: quote chunk {label} failed: {e}")
+        return {}
+
     def _fetch_history_bulk(
         self,
         symbols: List[str],
@@ -413,19 +462,13 @@ class StockScreener:
         """
         import threading
         from concurrent.futures import ThreadPoolExecutor, as_completed
-        from ba2_providers.fmp_common import fmp_http_get, FMPError
 
         api_key = get_app_setting("FMP_API_KEY")
         if not api_key:
             logger.warning("StockScreener: FMP_API_KEY not configured")
             return {}
 
-        # Re-anchor the window on as_of for the reconstructed path; live path uses now.
-        anchor = self._as_of or datetime.now(timezone.utc)
-        from_date = (anchor - timedelta(days=lookback_days + 5)).strftime("%Y-%m-%d")
-        to_date = anchor.strftime("%Y-%m-%d")
-        params_base = {"apikey": api_key, "from": from_date, "to": to_date}
-
+        from_date, to_date = self._history_window(lookback_days)
         chunks = [symbols[i: i + chunk_size] for i in range(0, len(symbols), chunk_size)]
         total_chunks = len(chunks)
         log_every = max(1, total_chunks // 5)  # log ~5 times across the run
@@ -434,39 +477,8 @@ class StockScreener:
         result_lock = threading.Lock()
         completed_count = 0
 
-        from ba2_providers.fmp_common import fmp_live_cached
-
         def fetch_chunk(chunk: List[str]):
-            joined = ",".join(chunk)
-            url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{joined}"
-            try:
-                # The bars depend only on (symbols, from, to) -- all three are in the key, so a
-                # different as_of or lookback never reuses the wrong window. The thresholds that
-                # differ per instance (RVOL / Weinstein / price-drop) are computed FROM this
-                # payload afterwards, so every screener instance wants the identical response.
-                resp = fmp_live_cached(
-                    f"screener:ohlcv:{joined}:{from_date}:{to_date}",
-                    lambda: fmp_http_get(url, params=params_base,
-                                         endpoint="historical-price-full", timeout=15),
-                )
-                data = resp.json()
-            except FMPError as e:
-                logger.warning(f"StockScreener: OHLCV chunk failed after retries: {e}")
-                return {}
-            except Exception as e:
-                logger.warning(f"StockScreener: OHLCV chunk failed: {e}")
-                return {}
-
-            # Single symbol → {"symbol": ..., "historical": [...]}
-            # Multi symbol → {"historicalStockList": [{...}, ...]}
-            stock_list = data.get("historicalStockList", [data] if "historical" in data else [])
-            chunk_result = {}
-            for entry in stock_list:
-                sym = (entry.get("symbol") or "").upper()
-                bars = entry.get("historical", [])
-                # FMP returns newest-first; reverse to oldest-first
-                chunk_result[sym] = list(reversed(bars))
-            return chunk_result
+            return self._fetch_history_chunk(chunk, api_key, from_date, to_date)
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = {executor.submit(fetch_chunk, chunk): i for i, chunk in enumerate(chunks)}
@@ -488,6 +500,53 @@ class StockScreener:
         )
         return result
 
+    def _history_window(self, lookback_days: int) -> tuple:
+        """(from, to) dates of a history fetch: re-anchored on as_of for the reconstructed
+        path, on now for the live path."""
+        anchor = self._as_of or datetime.now(timezone.utc)
+        from_date = (anchor - timedelta(days=lookback_days + 5)).strftime("%Y-%m-%d")
+        return from_date, anchor.strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _fetch_history_chunk(
+        chunk: List[str], api_key: str, from_date: str, to_date: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """One ``/historical-price-full`` call for up to 5 symbols -> {SYMBOL: oldest-first bars}.
+        A failed chunk is logged and returns {}."""
+        from ba2_providers.fmp_common import fmp_http_get, fmp_live_cached, FMPError
+
+        joined = ",".join(chunk)
+        url = f"https://financialmodelingprep.com/api/v3/historical-price-full/{joined}"
+        params = {"apikey": api_key, "from": from_date, "to": to_date}
+        try:
+            # The bars depend only on (symbols, from, to) -- all three are in the key, so a
+            # different as_of or lookback never reuses the wrong window. The thresholds that
+            # differ per instance (RVOL / Weinstein / price-drop) are computed FROM this
+            # payload afterwards, so every screener instance wants the identical response.
+            resp = fmp_live_cached(
+                f"screener:ohlcv:{joined}:{from_date}:{to_date}",
+                lambda: fmp_http_get(url, params=params,
+                                     endpoint="historical-price-full", timeout=15),
+            )
+            data = resp.json()
+        except FMPError as e:
+            logger.warning(f"StockScreener: OHLCV chunk failed after retries: {e}")
+            return {}
+        except Exception as e:
+            logger.warning(f"StockScreener: OHLCV chunk failed: {e}")
+            return {}
+
+        # Single symbol → {"symbol": ..., "historical": [...]}
+        # Multi symbol → {"historicalStockList": [{...}, ...]}
+        stock_list = data.get("historicalStockList", [data] if "historical" in data else [])
+        chunk_result = {}
+        for entry in stock_list:
+            sym = (entry.get("symbol") or "").upper()
+            bars = entry.get("historical", [])
+            # FMP returns newest-first; reverse to oldest-first
+            chunk_result[sym] = list(reversed(bars))
+        return chunk_result
+
     def _quotes_from_bars(
         self, symbols: List[str], window: int = 20
     ) -> Dict[str, Dict[str, Any]]:
@@ -645,32 +704,8 @@ class StockScreener:
         enriched: List[Dict[str, Any]] = []
         for c in candidates:
             sym = (c.get("symbol") or "").upper()
-            quote = quotes_map.get(sym, {})
-            live_quote = live_quotes_map.get(sym, {})
-
-            # Update volume from the daily-bar-derived quote
-            volume = quote.get("volume") or c.get("volume") or 0
-            avg_vol = quote.get("avgVolume", 0) or 0
-            rvol = round(volume / avg_vol, 2) if avg_vol > 0 else 0.0
-
-            c["volume"] = volume
-            c["avg_volume"] = avg_vol
-            c["relative_volume"] = rvol
-
-            # Update price from the LIVE quote when available (else the bar-derived close)
-            q_price = live_quote.get("price") or quote.get("price")
-            if q_price and q_price > 0:
-                c["price"] = q_price
-
-            # Update market_cap from the live quote if available
-            q_mcap = live_quote.get("marketCap")
-            if q_mcap and q_mcap > 0:
-                c["market_cap"] = q_mcap
-
-            # Update float_shares from the live quote if available
-            q_float = live_quote.get("sharesFloat")
-            if q_float and q_float > 0:
-                c["float_shares"] = q_float
+            rvol = self._apply_bar_quote(c, quotes_map.get(sym, {}))
+            self._apply_live_quote(c, live_quotes_map.get(sym, {}))
 
             # --- Client-side filters ---
 
@@ -679,23 +714,13 @@ class StockScreener:
                 dropped_rvol += 1
                 continue
 
-            # float_min: 0 means data unavailable, don't filter those out
-            if float_min > 0:
-                stock_float = c.get("float_shares") or 0
-                if stock_float > 0 and stock_float < float_min:
-                    logger.debug(
-                        f"StockScreener: dropping {sym} — float {stock_float:,} < {float_min:,}"
-                    )
-                    dropped_float += 1
-                    continue
-
-            if volume_max > 0:
-                if volume > volume_max:
-                    logger.debug(
-                        f"StockScreener: dropping {sym} — volume {volume:,} > {volume_max:,}"
-                    )
-                    dropped_volume_max += 1
-                    continue
+            reason = self._client_side_drop(c, float_min, volume_max)
+            if reason == "float":
+                dropped_float += 1
+                continue
+            if reason == "volume_max":
+                dropped_volume_max += 1
+                continue
 
             enriched.append(c)
 
@@ -706,6 +731,169 @@ class StockScreener:
         }
         return enriched, stats
 
+    @staticmethod
+    def _apply_bar_quote(c: Dict[str, Any], quote: Dict[str, Any]) -> float:
+        """Set volume / avg_volume / relative_volume (and the bar close as price) from the
+        bar-derived quote; returns the RVOL."""
+        # Update volume from the daily-bar-derived quote
+        volume = quote.get("volume") or c.get("volume") or 0
+        avg_vol = quote.get("avgVolume", 0) or 0
+        rvol = round(volume / avg_vol, 2) if avg_vol > 0 else 0.0
+
+        c["volume"] = volume
+        c["avg_volume"] = avg_vol
+        c["relative_volume"] = rvol
+
+        q_price = quote.get("price")
+        if q_price and q_price > 0:
+            c["price"] = q_price
+        return rvol
+
+    @staticmethod
+    def _apply_live_quote(c: Dict[str, Any], live_quote: Dict[str, Any]) -> None:
+        """Refresh price / market_cap / float_shares from a live quote when it has them."""
+        # Update price from the LIVE quote when available (else the bar-derived close)
+        q_price = live_quote.get("price")
+        if q_price and q_price > 0:
+            c["price"] = q_price
+
+        # Update market_cap from the live quote if available
+        q_mcap = live_quote.get("marketCap")
+        if q_mcap and q_mcap > 0:
+            c["market_cap"] = q_mcap
+
+        # Update float_shares from the live quote if available
+        q_float = live_quote.get("sharesFloat")
+        if q_float and q_float > 0:
+            c["float_shares"] = q_float
+
+    @staticmethod
+    def _client_side_drop(c: Dict[str, Any], float_min: float, volume_max: float) -> Optional[str]:
+        """The filters the screener API lacks: "float", "volume_max", or None to keep."""
+        sym = (c.get("symbol") or "").upper()
+        # float_min: 0 means data unavailable, don't filter those out
+        if float_min > 0:
+            stock_float = c.get("float_shares") or 0
+            if stock_float > 0 and stock_float < float_min:
+                logger.debug(
+                    f"StockScreener: dropping {sym} — float {stock_float:,} < {float_min:,}"
+                )
+                return "float"
+
+        if volume_max > 0:
+            volume = c.get("volume") or 0
+            if volume > volume_max:
+                logger.debug(
+                    f"StockScreener: dropping {sym} — volume {volume:,} > {volume_max:,}"
+                )
+                return "volume_max"
+        return None
+
+    def _enrich_with_rvol_pipelined(
+        self,
+        candidates: List[Dict[str, Any]],
+        min_rvol: float,
+    ) -> tuple:
+        """Pipelined ``_enrich_with_rvol``: same filters, same survivors in the same order.
+
+        RVOL comes from bars alone, so it is applied first and only the RVOL survivors need a
+        live quote. Their quote chunks go out concurrently (``_run_quote_pipeline``) and each
+        chunk's candidates get their live refresh and the float/volume_max filters as soon as
+        it arrives.
+        """
+        all_symbols = [c["symbol"].upper() for c in candidates if c.get("symbol")]
+        if not all_symbols:
+            return [], {"dropped_rvol": 0, "dropped_float": 0, "dropped_volume_max": 0}
+
+        with self._timer.stage("bars_s"):
+            quotes_map = self._quotes_from_bars(all_symbols)
+        float_min = self._settings["screener_float_min"]
+        volume_max = self._settings["screener_volume_max"]
+        counts = {"dropped_rvol": 0, "dropped_float": 0, "dropped_volume_max": 0}
+
+        survivors: List[Dict[str, Any]] = []
+        for c in candidates:
+            sym = (c.get("symbol") or "").upper()
+            rvol = self._apply_bar_quote(c, quotes_map.get(sym, {}))
+            if rvol < min_rvol:
+                logger.debug(f"StockScreener: dropping {sym} — RVOL {rvol} < {min_rvol}")
+                counts["dropped_rvol"] += 1
+            else:
+                survivors.append(c)
+
+        kept = set()
+        by_symbol: Dict[str, List[int]] = {}
+        for i, c in enumerate(survivors):
+            by_symbol.setdefault((c.get("symbol") or "").upper(), []).append(i)
+
+        def filter_chunk(chunk: List[str], live: Dict[str, Dict[str, Any]]) -> None:
+            for sym in chunk:
+                for i in by_symbol.get(sym, []):
+                    c = survivors[i]
+                    self._apply_live_quote(c, live.get(sym, {}))
+                    reason = self._client_side_drop(c, float_min, volume_max)
+                    if reason is None:
+                        kept.add(i)
+                    else:
+                        counts[f"dropped_{reason}"] += 1
+
+        symbols = list(by_symbol)
+        if self._as_of is None and symbols:
+            self._run_quote_pipeline(symbols, filter_chunk)
+        else:
+            filter_chunk(symbols, {})
+
+        return [c for i, c in enumerate(survivors) if i in kept], counts
+
+    def _pipelined(self) -> bool:
+        """Pipelined mode is on, and usable here (it needs its own event loop)."""
+        if not self._settings["screener_pipeline"]:
+            return False
+        import asyncio
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        logger.warning("StockScreener: pipelined mode unavailable inside a running event loop; "
+                       "using the batch stages")
+        return False
+
+    def _pipeline_limits(self) -> tuple:
+        concurrency = max(1, self._settings["screener_pipeline_concurrency"])
+        return concurrency, max(0, self._settings["screener_pipeline_rate_per_minute"])
+
+    def _run_quote_pipeline(self, symbols: List[str], on_chunk) -> None:
+        """Fetch live FMP quotes for ``symbols`` in the batch path's chunks (and through its
+        quote cache), ``concurrency`` chunks in flight, and hand each chunk's
+        ``{SYMBOL: quote}`` to ``on_chunk`` as it arrives."""
+        import asyncio
+        from ba2_providers import fmp_async
+        from ba2_providers.screener_pipeline import run_chunk_pipeline
+
+        api_key = get_app_setting("FMP_API_KEY")
+        if not api_key:
+            logger.warning("StockScreener: FMP_API_KEY not configured, skipping quote fetch")
+            on_chunk(symbols, {})
+            return
+
+        concurrency, rate = self._pipeline_limits()
+        size = self._QUOTE_CHUNK_SIZE
+        chunks = [symbols[i: i + size] for i in range(0, len(symbols), size)]
+
+        async def fetch(chunk: List[str]) -> Dict[str, Any]:
+            if rate:
+                await fmp_async.wait_endpoint_budget("quote", rate)
+            return await asyncio.to_thread(self._fetch_quote_chunk, chunk, api_key)
+
+        stats = asyncio.run(run_chunk_pipeline(chunks, fetch, on_chunk, concurrency=concurrency))
+        self._timer.add("quote_first_chunk_s", stats["first_chunk_s"] or 0.0)
+        self._timer.add("quote_fetch_s", stats["wall_s"])
+        logger.info(
+            f"StockScreener: quote pipeline — {stats['chunks_fetched']}/{stats['chunks_total']} "
+            f"chunks for {len(symbols)} symbols in {stats['wall_s']:.2f}s "
+            f"(first chunk {stats['first_chunk_s'] or 0:.2f}s, concurrency {concurrency})"
+        )
+
     def _filter_by_price_drop(
         self,
         candidates: List[Dict[str, Any]],
@@ -749,30 +937,11 @@ class StockScreener:
                 continue
 
             checked += 1
-
-            # Find peak price over the lookback window
-            lookback_bars = bars[-lookback_days:] if lookback_days < len(bars) else bars
-            peak_price = max(
-                max(b.get("high") or 0, b.get("low") or 0)
-                for b in lookback_bars
-            )
-
-            # Use live price from quote enrichment, fall back to last bar's close
-            current_price = c.get("price") or bars[-1].get("close")
-
-            if peak_price <= 0 or current_price is None:
-                continue
-
-            drop_pct = round(((peak_price - current_price) / peak_price) * 100, 2)
-            c["price_drop_pct"] = drop_pct
-
-            if drop_pct >= min_drop_pct:
+            ok = self._price_drop_check(c, bars, lookback_days, min_drop_pct)
+            if ok:
                 passed.append(c)
-            else:
+            elif ok is False:
                 dropped_price_drop += 1
-                logger.debug(
-                    f"StockScreener: dropping {symbol} — price drop {drop_pct}% < {min_drop_pct}%"
-                )
 
         logger.info(
             f"StockScreener: price-drop filter checked {checked}/{total} symbols, "
@@ -784,6 +953,103 @@ class StockScreener:
         }
         return passed, stats
 
+    @staticmethod
+    def _price_drop_check(
+        c: Dict[str, Any], bars: List[Dict[str, Any]], lookback_days: int, min_drop_pct: float
+    ) -> Optional[bool]:
+        """Annotate ``c["price_drop_pct"]`` from its bars: True = passes, False = dropped,
+        None = no usable prices."""
+        # Find peak price over the lookback window
+        lookback_bars = bars[-lookback_days:] if lookback_days < len(bars) else bars
+        peak_price = max(
+            max(b.get("high") or 0, b.get("low") or 0)
+            for b in lookback_bars
+        )
+
+        # Use live price from quote enrichment, fall back to last bar's close
+        current_price = c.get("price") or bars[-1].get("close")
+
+        if peak_price <= 0 or current_price is None:
+            return None
+
+        drop_pct = round(((peak_price - current_price) / peak_price) * 100, 2)
+        c["price_drop_pct"] = drop_pct
+
+        if drop_pct >= min_drop_pct:
+            return True
+        logger.debug(
+            f"StockScreener: dropping {c.get('symbol')} — price drop {drop_pct}% < {min_drop_pct}%"
+        )
+        return False
+
+    def _filter_by_price_drop_pipelined(
+        self,
+        candidates: List[Dict[str, Any]],
+        min_drop_pct: float,
+        max_results: int,
+    ) -> tuple:
+        """Pipelined ``_filter_by_price_drop``: same result, fetched only as far as needed.
+
+        History chunks (5 symbols, FMP's multi-symbol cap) are fetched ``concurrency`` at a
+        time but checked strictly in rank order, so the first ``max_results`` passes are the
+        batch path's. Once they are settled no further chunk is issued (``price_drop_skipped``
+        counts the symbols never fetched).
+        """
+        import asyncio
+        from ba2_providers import fmp_async
+        from ba2_providers.screener_pipeline import run_chunk_pipeline
+
+        lookback_days = self._settings["screener_price_drop_days"]
+        total = len(candidates)
+        api_key = get_app_setting("FMP_API_KEY")
+        if not api_key:
+            logger.warning("StockScreener: FMP_API_KEY not configured")
+            return [], {"price_drop_checked": 0, "dropped_price_drop": 0}
+
+        concurrency, rate = self._pipeline_limits()
+        from_date, to_date = self._history_window(lookback_days)
+        ranked = [c for c in candidates if c.get("symbol")]
+        chunks = [[c["symbol"].upper() for c in ranked[i: i + 5]] for i in range(0, len(ranked), 5)]
+        owners = {id(chunk): ranked[i * 5: i * 5 + 5] for i, chunk in enumerate(chunks)}
+
+        passed: List[Dict[str, Any]] = []
+        counts = {"price_drop_checked": 0, "dropped_price_drop": 0}
+
+        def check_chunk(chunk: List[str], history: Dict[str, List[Dict[str, Any]]]) -> None:
+            for c in owners[id(chunk)]:
+                if len(passed) >= max_results:
+                    return
+                bars = history.get(c["symbol"].upper(), [])
+                if not bars:
+                    logger.debug(f"StockScreener: no bars for {c['symbol']}")
+                    continue
+                counts["price_drop_checked"] += 1
+                ok = self._price_drop_check(c, bars, lookback_days, min_drop_pct)
+                if ok:
+                    passed.append(c)
+                elif ok is False:
+                    counts["dropped_price_drop"] += 1
+
+        async def fetch(chunk: List[str]) -> Dict[str, Any]:
+            if rate:
+                await fmp_async.wait_endpoint_budget("historical-price-full", rate)
+            return await asyncio.to_thread(self._fetch_history_chunk, chunk, api_key, from_date, to_date)
+
+        stats = asyncio.run(run_chunk_pipeline(
+            chunks, fetch, check_chunk, concurrency=concurrency, ordered=True,
+            stop=lambda: len(passed) >= max_results,
+        ))
+        skipped = sum(len(chunk) for chunk in chunks[stats["chunks_handled"]:])
+        counts["price_drop_skipped"] = skipped
+        self._timer.add("history_first_chunk_s", stats["first_chunk_s"] or 0.0)
+        self._timer.add("history_fetch_s", stats["wall_s"])
+        logger.info(
+            f"StockScreener: price-drop pipeline checked {counts['price_drop_checked']}/{total} "
+            f"symbols, {len(passed)} passed; {stats['chunks_handled']}/{stats['chunks_total']} "
+            f"chunks used, {skipped} symbols never fetched"
+        )
+        return passed, counts
+
     def _filter_by_weinstein_stage2(self, candidates: List[Dict[str, Any]]) -> tuple:
         """Keep only candidates in Weinstein Stage 2 (price above a rising 30-week SMA).
 
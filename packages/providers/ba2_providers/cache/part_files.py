@@ -0,0 +1,56 @@
+"""Append-only directories of parquet part files shared by several processes.
+
+Writers add uniquely named parts (two processes writing at once never clobber each other),
+readers load every part, and many small parts are compacted into one. Compactions may run in
+several processes at once: each removes only the parts it has already merged, and a part
+that vanishes under it (another process compacted it first) is skipped, so no rows are lost
+and no writer fails. Used by the news text-score cache and the merged-fundamentals memo.
+"""
+from __future__ import annotations
+
+import contextlib
+import glob
+import os
+import threading
+import time
+from typing import Callable, List
+
+import pandas as pd
+
+
+def part_paths(folder: str) -> List[str]:
+    """Every part under ``folder``, oldest first (names start with the write time)."""
+    return sorted(glob.glob(os.path.join(folder, "*.parquet")))
+
+
+def write_part(folder: str, df: pd.DataFrame, **to_parquet) -> str:
+    """Write ``df`` as a new part (atomic tmp+replace); returns the part's file name."""
+    os.makedirs(folder, exist_ok=True)
+    name = f"part-{time.time_ns()}-{os.getpid()}-{threading.get_ident()}.parquet"
+    tmp = os.path.join(folder, name + ".tmp")
+    df.to_parquet(tmp, index=False, **to_parquet)
+    os.replace(tmp, os.path.join(folder, name))
+    return name
+
+
+def compact_parts(folder: str, reduce: Callable[[pd.DataFrame], pd.DataFrame],
+                  **to_parquet) -> int:
+    """Rewrite ``folder`` as one part holding ``reduce(all parts, oldest first)``.
+
+    Returns the merged row count (0 when there was nothing left to merge).
+    """
+    frames, merged_paths = [], []
+    for path in part_paths(folder):
+        try:
+            frames.append(pd.read_parquet(path))
+        except FileNotFoundError:                    # another process compacted it already
+            continue
+        merged_paths.append(path)
+    if not frames:
+        return 0
+    merged = reduce(pd.concat(frames, ignore_index=True))
+    write_part(folder, merged, **to_parquet)
+    for path in merged_paths:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+    return len(merged)
@@ -0,0 +1,343 @@
+"""Connection-pooled async client for Financial Modeling Prep (FMP).
+
+``fmp_http_get`` issues one blocking ``requests.get`` per call, and callers fan out with
+thread pools (StockScreener, the fundamentals providers). Every call opens its own
+connection, the only rate control is the reactive 429 gate, and identical requests from
+concurrent callers all go to the network.
+
+``FMPAsyncClient`` runs the same calls over ONE ``aiohttp`` session:
+
+* **keep-alive pool** -- a bounded ``TCPConnector`` reuses connections across requests;
+* **token-bucket budgeting** -- a process-wide plan bucket (``FMP_RATE_LIMIT_PER_MINUTE``,
+  default 300 = the Starter plan) plus optional per-endpoint sub-budgets, so a batch is paced
+  BELOW the plan limit instead of discovering it via 429s. The buckets are shared by every
+  client in the process (thread-safe, loop-agnostic);
+* **the shared 429 gate** -- a 429/5xx arms ``fmp_common``'s global cooldown, and every request
+  (sync or async) waits it out, so both paths back off together;
+* **in-flight coalescing** -- identical concurrent URLs share one request;
+* **batch helpers** -- ``fetch_many(endpoint, symbols)`` uses FMP's comma-joined multi-symbol
+  paths where they exist (quote, profile, historical-price-full) and bounded per-symbol
+  concurrency elsewhere.
+
+The hermetic backtest contract holds here too: every request passes ``_assert_not_hermetic``.
+Sync callers use ``fmp_fetch_many`` (runs the batch on a private event loop).
+"""
+
+import asyncio
+import os as _os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from ba2_common.logger import logger
+
+from ba2_providers import fmp_common
+from ba2_providers.fmp_common import FMPError, _assert_not_hermetic, _fmp_error_message, _parse_retry_after
+
+FMP_BASE_URL = "https://financialmodelingprep.com"
+
+# Plan limit (calls/minute): Starter 300, Premium 750, Ultimate 3000. Read once per process.
+FMP_RATE_LIMIT_PER_MINUTE = float(_os.environ.get("FMP_RATE_LIMIT_PER_MINUTE") or 300)
+
+
+class EndpointSpec(NamedTuple):
+    path: str        # "{symbols}" placeholder: comma-joined chunk (or the single symbol)
+    batch_size: int  # max symbols per request; 1 = per-symbol endpoint
+
+
+# Multi-symbol paths accept "SYM1,SYM2,...". historical-price-full caps at 5 (the chunk size
+# StockScreener._fetch_history_bulk already uses); quote/profile take 100.
+ENDPOINTS: Dict[str, EndpointSpec] = {
+    "quote": EndpointSpec("/api/v3/quote/{symbols}", 100),
+    "quote-short": EndpointSpec("/api/v3/quote-short/{symbols}", 100),
+    "profile": EndpointSpec("/api/v3/profile/{symbols}", 100),
+    "historical-price-full": EndpointSpec("/api/v3/historical-price-full/{symbols}", 5),
+}
+
+
+def endpoint_spec(endpoint: str) -> EndpointSpec:
+    """Known spec, else the generic per-symbol ``/api/v3/<endpoint>/<SYMBOL>`` shape."""
+    return ENDPOINTS.get(endpoint) or EndpointSpec(f"/api/v3/{endpoint}/{{symbols}}", 1)
+
+
+# ---- Token buckets ----------------------------------------------------------------------------
+
+class TokenBucket:
+    """Thread-safe token bucket. ``reserve()`` books a token and returns how long to wait for it.
+
+    Reservations may run the balance negative (each caller queues behind the previous ones), so
+    N concurrent callers are spaced ``1/rate`` apart instead of all polling for the next token.
+    Waiting is left to the caller, which keeps the bucket usable from any thread or event loop.
+    """
+
+    def __init__(self, rate_per_second: float, burst: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = float(rate_per_second)
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._tokens = self.burst
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _bucket(name: str, per_minute: float) -> TokenBucket:
+    """Process-wide bucket for ``name`` (created on first use; later rates are ignored)."""
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            rate = per_minute / 60.0
+            # A burst of ~1s of budget: enough to start a batch promptly, never a minute's worth.
+            bucket = _BUCKETS[name] = TokenBucket(rate, burst=max(1.0, rate))
+        return bucket
+
+
+async def wait_endpoint_budget(endpoint: str, per_minute: float) -> None:
+    """Wait for a token of the process-wide ``endpoint`` sub-budget -- the bucket
+    ``FMPAsyncClient(endpoint_budgets={endpoint: per_minute})`` draws from -- for requests
+    made outside the client (e.g. a blocking fetch run in a thread)."""
+    wait = _bucket(f"endpoint:{endpoint}", per_minute).reserve()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+def reset_rate_buckets() -> None:
+    """Drop the shared buckets (tests / after changing ``FMP_RATE_LIMIT_PER_MINUTE``)."""
+    with _BUCKETS_LOCK:
+        _BUCKETS.clear()
+
+
+async def _gate_wait_async() -> None:
+    """Async twin of ``fmp_common._gate_wait``: honour the shared 429 cooldown."""
+    while True:
+        with fmp_common._GATE_LOCK:
+            remaining = fmp_common._GATE_UNTIL - fmp_common._now()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, 2.0) + random.uniform(0.0, 0.4))
+
+
+# ---- Client -----------------------------------------------------------------------------------
+
+class FMPAsyncClient:
+    """Pooled FMP client. Use as ``async with FMPAsyncClient() as client: ...``.
+
+    Args:
+        api_key: FMP key (default: the ``FMP_API_KEY`` app setting).
+        base_url: Override for tests (a local stub server).
+        rate_per_minute: Plan budget shared by every client in the process.
+        endpoint_budgets: Optional ``{endpoint: calls_per_minute}`` sub-budgets, e.g. to keep a
+            history backfill from starving live quotes. Applied on top of the plan budget.
+        max_connections: Keep-alive pool size (also the cap on concurrent requests).
+        timeout: Per-request timeout (seconds).
+        delays: Backoff delays between retries on 429/5xx/transport errors and FMP error dicts.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        *,
+        base_url: str = FMP_BASE_URL,
+        rate_per_minute: float = FMP_RATE_LIMIT_PER_MINUTE,
+        endpoint_budgets: Optional[Dict[str, float]] = None,
+        max_connections: int = 16,
+        timeout: float = 15,
+        delays: tuple = (5, 15, 30),
+        retry_statuses: tuple = (429, 500, 502, 503, 504),
+    ):
+        if api_key is None:
+            from ba2_common.config import get_app_setting
+            api_key = get_app_setting("FMP_API_KEY")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.rate_per_minute = float(rate_per_minute)
+        self.endpoint_budgets = dict(endpoint_budgets or {})
+        self.max_connections = max(1, int(max_connections))
+        self.timeout = timeout
+        self.delays = tuple(delays)
+        self.retry_statuses = tuple(retry_statuses)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[Tuple[str, tuple], "asyncio.Future"] = {}
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0}
+
+    async def __aenter__(self) -> "FMPAsyncClient":
+        connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=30)
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get_json(self, path: str, params: Optional[dict] = None, *,
+                       endpoint: str = "", symbol: str = "") -> Any:
+        """GET ``base_url + path`` and return the decoded JSON payload.
+
+        Concurrent calls for the same path+params share one request. Raises ``FMPError`` once
+        retries are exhausted, ``aiohttp.ClientResponseError`` on a non-retryable HTTP error.
+        """
+        _assert_not_hermetic("FMPAsyncClient", endpoint or path, symbol)
+        key = (path, tuple(sorted((params or {}).items())))
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+        task = asyncio.ensure_future(self._request(path, params, endpoint, symbol))
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._inflight.pop(key, None)
+            else:  # the awaiting caller was cancelled: drop the entry once the request settles
+                task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+
+    async def _acquire(self, endpoint: str) -> None:
+        wait = _bucket("plan", self.rate_per_minute).reserve()
+        if endpoint in self.endpoint_budgets:
+            wait = max(wait, _bucket(f"endpoint:{endpoint}", self.endpoint_budgets[endpoint]).reserve())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _request(self, path: str, params: Optional[dict], endpoint: str, symbol: str) -> Any:
+        if self._session is None:
+            raise RuntimeError("FMPAsyncClient used outside 'async with'")
+        query = {**(params or {}), "apikey": self.api_key}
+        url = f"{self.base_url}{path}"
+        total_attempts = len(self.delays) + 1
+        last_reason: Any = None
+
+        for attempt in range(total_attempts):
+            if attempt > 0:
+                self.stats["retries"] += 1
+            await _gate_wait_async()
+            await self._acquire(endpoint)
+            delay = self.delays[min(attempt, len(self.delays) - 1)] if self.delays else 0
+            self.stats["requests"] += 1
+            try:
+                async with self._session.get(url, params=query) as resp:
+                    if resp.status in self.retry_statuses:
+                        retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+                        if retry_after is not None:
+                            delay = max(delay, retry_after)
+                        fmp_common._gate_arm(delay)  # every FMP request, sync or async, backs off
+                        last_reason = f"HTTP {resp.status}"
+                        logger.warning(
+                            f"FMP {endpoint or 'call'} {resp.status} for {symbol or '?'} "
+                            f"(attempt {attempt + 1}/{total_attempts}); global backoff {delay:.0f}s"
+                        )
+                        continue
+                    resp.raise_for_status()
+                    payload = await resp.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                last_reason = e
+                fmp_common._gate_arm(delay)
+                logger.warning(
+                    f"FMP {endpoint or 'call'} request error for {symbol or '?'} "
+                    f"(attempt {attempt + 1}/{total_attempts}): {e}"
+                )
+                continue
+
+            if isinstance(payload, dict):
+                err = _fmp_error_message(payload)
+                if err is not None:  # FMP's HTTP-200 error dict (e.g. "Limit Reach.")
+                    last_reason = err
+                    logger.warning(
+                        f"FMP {endpoint or 'call'} error for {symbol or '?'} "
+                        f"(attempt {attempt + 1}/{total_attempts}): {err}"
+                    )
+                    if attempt + 1 < total_attempts:
+                        await asyncio.sleep(delay)
+                    continue
+            return payload
+
+        logger.error(
+            f"FMP {endpoint or 'call'} failed for {symbol or '?'} after "
+            f"{total_attempts} attempts (last: {last_reason})"
+        )
+        raise FMPError(
+            f"FMP {endpoint or 'call'} failed for {symbol or '?'} after "
+            f"{total_attempts} attempts (last: {last_reason})"
+        )
+
+    async def fetch_many(self, endpoint: str, symbols: Iterable[str],
+                         params: Optional[dict] = None) -> Dict[str, Any]:
+        """Fetch ``endpoint`` for every symbol: ``{SYMBOL: payload}``.
+
+        Multi-symbol endpoints are requested in comma-joined chunks and split back per symbol
+        (``historical-price-full`` maps to the ``historical`` row list; quote/profile to the
+        record dict). Per-symbol endpoints map to the raw payload. A failed chunk is logged and
+        its symbols are left out, like the threaded fetchers it replaces.
+        """
+        spec = endpoint_spec(endpoint)
+        ordered = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        chunks = [ordered[i: i + spec.batch_size] for i in range(0, len(ordered), spec.batch_size)]
+
+        async def _chunk(chunk: List[str]) -> Dict[str, Any]:
+            joined = ",".join(chunk)
+            try:
+                payload = await self.get_json(spec.path.format(symbols=joined), params,
+                                              endpoint=endpoint, symbol=joined)
+            except (FMPError, aiohttp.ClientError) as e:
+                logger.warning(f"FMP {endpoint} fetch failed for {joined}: {e}")
+                return {}
+            if spec.batch_size == 1:
+                return {chunk[0]: payload}
+            return _split_multi_symbol(payload)
+
+        out: Dict[str, Any] = {}
+        for part in await asyncio.gather(*(_chunk(c) for c in chunks)):
+            out.update(part)
+        return out
+
+
+def _split_multi_symbol(payload: Any) -> Dict[str, Any]:
+    """Map a multi-symbol response to ``{SYMBOL: record}``.
+
+    ``/quote``, ``/profile``: a list of records with a ``symbol`` key.
+    ``/historical-price-full``: ``{"historicalStockList": [{"symbol", "historical"}]}`` for several
+    symbols, but a bare ``{"symbol", "historical"}`` for one.
+    """
+    if isinstance(payload, dict):
+        if "historicalStockList" in payload:
+            return {(item.get("symbol") or "").upper(): item.get("historical") or []
+                    for item in payload["historicalStockList"] if item.get("symbol")}
+        if payload.get("symbol") and "historical" in payload:
+            return {payload["symbol"].upper(): payload.get("historical") or []}
+        return {}
+    if isinstance(payload, list):
+        return {(item.get("symbol") or "").upper(): item
+                for item in payload if isinstance(item, dict) and item.get("symbol")}
+    return {}
+
+
+def fmp_fetch_many(endpoint: str, symbols: Iterable[str], params: Optional[dict] = None,
+                   **client_kwargs) -> Dict[str, Any]:
+    """Blocking ``FMPAsyncClient.fetch_many`` for sync callers (one pooled session per batch).
+
+    Must not be called from a running event loop -- use the client directly there.
+    """
+    async def _run() -> Dict[str, Any]:
+        async with FMPAsyncClient(**client_kwargs) as client:
+            return await client.fetch_many(endpoint, symbols, params)
+
+    return asyncio.run(_run())
@@ -253,6 +253,29 @@ def _fmp_history_cache_dir() -> str:
     return _os.path.join(_cfg.CACHE_FOLDER, "fmp_history")
 
 
+def fmp_history_cache_path(namespace: str, symbol: str) -> str:
+    """Disk location of one ``(namespace, symbol)`` history entry."""
+    import os as _os
+    return _os.path.join(_fmp_history_cache_dir(), f"{namespace}__{symbol.upper()}.json")
+
+
+def fmp_history_cache_version(namespace: str, symbol: str) -> Optional[str]:
+    """Version stamp (``mtime_ns:size``) of a history's disk entry, for caches DERIVED from it.
+
+    None when there is nothing to version: the live path (never disk-cached, every call is
+    fresh) or an entry not written yet. A re-fetch rewrites the file via tmp+replace, so any
+    change to the payload changes the stamp.
+    """
+    import os as _os
+    if not _is_ttl_frozen():
+        return None
+    try:
+        st = _os.stat(fmp_history_cache_path(namespace, symbol))
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
 def fmp_history_disk_cached(namespace: str, symbol: str, fetch_fn: Callable[[], Any],
                             max_age_days: float = _FMP_HISTORY_DISK_MAX_AGE_DAYS) -> Any:
     """Disk-persist a per-symbol FMP *history* payload so spawned backtest workers read it from
@@ -289,7 +312,7 @@ def _fmp_history_disk_read_or_fetch(namespace: str, symbol: str, fetch_fn: Calla
     import time as _time
 
     d = _fmp_history_cache_dir()
-    path = _os.path.join(d, f"{namespace}__{symbol.upper()}.json")
+    path = fmp_history_cache_path(namespace, symbol)
 
     # 1. Disk read (best-effort). A corrupt/unreadable/stale file falls through to a fresh fetch
     #    rather than being served — EXCEPT in hermetic mode, where age is ignored (historical data
@@ -6,7 +6,8 @@ This provider uses the FMP API to retrieve detailed financial statements.
 API Documentation: https://site.financialmodelingprep.com/developer/docs#financial-statements
 """
 
-from typing import Dict, Any, Literal, Optional
+import json
+from typing import Dict, Any, List, Literal, Optional
 from datetime import datetime
 
 import fmpsdk
@@ -16,7 +17,10 @@ from ba2_common.core.interfaces import CompanyFundamentalsDetailsInterface
 from ba2_common.core.provider_utils import validate_date_range, statement_effective_date
 from ba2_common.config import get_app_setting
 from ba2_common.logger import logger
-from ba2_providers.fmp_common import fmp_list_call, fmp_http_get, fmp_history_disk_cached, FMPError
+from ba2_providers.fmp_common import (
+    fmp_list_call, fmp_http_get, fmp_history_disk_cached, fmp_history_cache_path,
+    fmp_history_cache_version, FMPError,
+)
 
 # Depth of the CACHED statement history, deliberately independent of any caller's
 # ``lookback_periods``.
@@ -40,6 +44,14 @@ STATEMENT_HISTORY_DEPTH = 20
 # lookback_periods filtering in get_past_earnings works for arbitrarily old backtest windows.
 _PAST_EARNINGS_FETCH_LIMIT = 1000
 
+# FundamentalsService statement type -> fmp_history namespace of the payload it is built from.
+_HISTORY_NAMESPACES = {
+    "balance_sheet": "balance_sheet_{period}",
+    "income_statement": "income_statement_{period}",
+    "cash_flow": "cashflow_statement_{period}",
+    "earnings": "past_earnings_{frequency}",
+}
+
 
 class FMPCompanyDetailsProvider(CompanyFundamentalsDetailsInterface):
     """
@@ -80,6 +92,36 @@ class FMPCompanyDetailsProvider(CompanyFundamentalsDetailsInterface):
         """Validate provider configuration."""
         return bool(self.api_key)
     
+    def _history_namespace(self, statement: str, frequency: str) -> Optional[str]:
+        template = _HISTORY_NAMESPACES.get(statement)
+        if template is None:
+            return None
+        period = "annual" if frequency == "annual" else "quarter"
+        return template.format(period=period, frequency=frequency)
+
+    def data_version(self, symbol: str, statement: str, frequency: str) -> Optional[str]:
+        """Version of the cached history ``statement`` is built from (None on the live path).
+
+        Lets FundamentalsService memoise its merged results and drop them exactly when this
+        payload changes.
+        """
+        namespace = self._history_namespace(statement, frequency)
+        return fmp_history_cache_version(namespace, symbol) if namespace else None
+
+    def period_dates(self, symbol: str, statement: str, frequency: str) -> Optional[List[str]]:
+        """Sorted ``date`` values of the cached history (the field the ``end_date`` filters
+        compare), or None when it is not on disk. Read straight from the file so that a stale
+        or missing entry never goes through ``fmp_history_disk_cached``'s fetch path."""
+        namespace = self._history_namespace(statement, frequency)
+        if namespace is None or self.data_version(symbol, statement, frequency) is None:
+            return None
+        try:
+            with open(fmp_history_cache_path(namespace, symbol), "r") as fh:
+                rows = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        return sorted({str(r.get("date"))[:10] for r in rows if isinstance(r, dict) and r.get("date")})
+
     def _format_as_dict(self, data: Any) -> Dict[str, Any]:
         """Format fundamentals data as dictionary."""
         if isinstance(data, dict):
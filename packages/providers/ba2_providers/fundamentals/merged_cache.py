@@ -0,0 +1,267 @@
+"""Process-wide memo of ``FundamentalsService`` results (first-provider and merged).
+
+A backtest asks for the same (symbol, statement, frequency) at every rebalance with a moving
+``end_date``; each call used to re-read every provider's cached payload and redo the
+normalisation and the cross-provider merge. Between two filings the answer cannot change, so
+entries are keyed by:
+
+  * ``base``      -- symbol, statement, first/merged, frequency, active providers, start_date,
+                     lookback_periods (a JSON string);
+  * ``versions``  -- each provider's data version (``data_version(symbol, statement,
+                     frequency)``, e.g. the fmp_history file stamp); None when any provider
+                     cannot version its data (yfinance, AlphaVantage, or FMP on the live path);
+  * ``effective`` -- per provider, the latest period date on/before ``end_date`` when the
+                     provider can list its periods (``period_dates``), else ``end_date``'s day.
+
+Versioned entries are exact: a lookup under new versions drops every entry of that ``base``
+(counted as an invalidation), and they persist as zstd parquet part files under
+``FUNDAMENTALS_MERGED_CACHE_DIR`` so backtest workers share them. Unversioned entries live in
+memory only, for ``UNVERSIONED_TTL_S`` (no expiry in frozen/backtest mode, like fmp_common's
+TTL caches).
+"""
+from __future__ import annotations
+
+import atexit
+import bisect
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ba2_common.logger import logger
+
+from ba2_providers.cache.part_files import compact_parts, part_paths, write_part
+
+UNVERSIONED_TTL_S = 900.0
+_MAX_ENTRIES = 20_000
+_FLUSH_EVERY = 256
+_COMPACT_PARTS = 32
+PERSIST_COLUMNS = ["base", "versions", "effective", "payload"]
+
+
+def cache_dir() -> str:
+    import ba2_common.config as _cfg
+    return getattr(_cfg, "FUNDAMENTALS_MERGED_CACHE_DIR",
+                   os.path.join(_cfg.CACHE_FOLDER, "fundamentals", "merged"))
+
+
+def _frozen() -> bool:
+    from ba2_providers.fmp_common import _is_ttl_frozen
+    return _is_ttl_frozen()
+
+
+class MergedResultCache:
+    """LRU of serialised responses keyed by ``(base, versions, effective)``."""
+
+    def __init__(self, max_entries: int = _MAX_ENTRIES, ttl_seconds: float = UNVERSIONED_TTL_S,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (base, versions, effective) -> (payload JSON, expires_at or None)
+        self._entries: "OrderedDict[Tuple[str, Optional[str], str], Tuple[str, Optional[float]]]" = OrderedDict()
+        self._versions: Dict[str, str] = {}        # base -> versions of its live entries
+        self._unsaved: List[Tuple[str, str, str, str]] = []
+        self._loaded_parts: set = set()
+        self.hits = self.misses = self.invalidations = 0
+
+    # -- lookups ---------------------------------------------------------------------------
+
+    def get(self, base: str, versions: Optional[str], effective: str) -> Optional[str]:
+        if versions is not None and _frozen():
+            self._load_persisted()
+        with self._lock:
+            if versions is not None:
+                self._check_versions(base, versions)
+            key = (base, versions, effective)
+            item = self._entries.get(key)
+            if item is not None and (item[1] is None or _frozen() or self._clock() < item[1]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            if item is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, base: str, versions: Optional[str], effective: str, payload: str) -> None:
+        flush = False
+        with self._lock:
+            if versions is not None:
+                self._check_versions(base, versions)
+                self._versions[base] = versions
+            expires = None if versions is not None else self._clock() + self.ttl_seconds
+            self._entries[(base, versions, effective)] = (payload, expires)
+            self._entries.move_to_end((base, versions, effective))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if versions is not None and _frozen():
+                self._unsaved.append((base, versions, effective, payload))
+                flush = len(self._unsaved) >= _FLUSH_EVERY
+        if flush:
+            self._flush_quietly()
+
+    def _check_versions(self, base: str, versions: str) -> None:
+        """Drop every entry of ``base`` cached under other data versions (lock held)."""
+        seen = self._versions.get(base)
+        if seen is None or seen == versions:
+            return
+        stale = [k for k in self._entries if k[0] == base and k[1] is not None]
+        for k in stale:
+            del self._entries[k]
+        self.invalidations += len(stale)
+        self._versions[base] = versions
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "invalidations": self.invalidations, "entries": len(self._entries)}
+
+    def clear(self, persisted: bool = False) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._unsaved.clear()
+            self._loaded_parts.clear()
+            self.hits = self.misses = self.invalidations = 0
+        if persisted:
+            for p in part_paths(cache_dir()):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(p)
+
+    # -- persistence -----------------------------------------------------------------------
+
+    def _load_persisted(self) -> None:
+        folder = cache_dir()
+        names = set(os.path.basename(p) for p in part_paths(folder))
+        with self._lock:
+            new = sorted(names - self._loaded_parts)
+            self._loaded_parts |= names
+        for name in new:
+            try:
+                df = pd.read_parquet(os.path.join(folder, name), columns=PERSIST_COLUMNS)
+            except FileNotFoundError:                # compacted away under us
+                continue
+            except Exception as e:
+                logger.warning(f"Skipping unreadable merged-fundamentals part {name}: {e}")
+                continue
+            # Rows under superseded versions are harmless (their key can no longer match) and
+            # are dropped by the next compaction.
+            with self._lock:
+                for base, versions, effective, payload in df.itertuples(index=False, name=None):
+                    key = (base, versions, effective)
+                    if key not in self._entries:
+                        self._entries[key] = (payload, None)
+                        self._entries.move_to_end(key, last=False)  # disk entries evict first
+
+    def flush(self) -> int:
+        """Write versioned entries added since the last flush as one part file."""
+        with self._lock:
+            rows, self._unsaved = self._unsaved, []
+        if not rows:
+            return 0
+        folder = cache_dir()
+        name = write_part(folder, pd.DataFrame(rows, columns=PERSIST_COLUMNS), compression="zstd")
+        with self._lock:
+            self._loaded_parts.add(name)
+        if len(part_paths(folder)) > _COMPACT_PARTS:
+            compact()
+        return len(rows)
+
+    def _flush_quietly(self) -> None:
+        # Persistence only shares entries with other workers; the memo (and the getter
+        # behind it) must keep working when a write or compaction fails.
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Merged-fundamentals cache flush failed: {e}")
+
+
+def _latest_versions(merged: pd.DataFrame) -> pd.DataFrame:
+    latest = merged.groupby("base")["versions"].transform("last")
+    merged = merged[merged["versions"] == latest]
+    return merged.drop_duplicates(["base", "versions", "effective"], keep="last")
+
+
+def compact() -> int:
+    """Rewrite the persisted cache as a single part, keeping for every ``base`` only the rows
+    of its most recently written versions. Returns the row count."""
+    return compact_parts(cache_dir(), _latest_versions, compression="zstd")
+
+
+# (provider, symbol, statement, frequency, version) -> sorted period dates
+_calendars: Dict[Tuple[str, str, str, str, str], Optional[List[str]]] = {}
+
+
+def effective_key(providers: Dict[str, Any], names: List[str], symbol: str, statement: str,
+                  frequency: str, end_day: str, versions: Optional[Dict[str, str]]) -> str:
+    """Per provider, the latest period date on/before ``end_day`` (``YYYY-MM-DD``): two
+    end_dates between the same filings give the same key. Falls back to ``end_day`` when the
+    data is unversioned or the provider cannot list its periods."""
+    if versions is None:
+        return end_day
+    parts = []
+    for name in names:
+        cal_key = (name, symbol, statement, frequency, versions[name])
+        if cal_key not in _calendars:
+            lister = getattr(providers[name], "period_dates", None)
+            try:
+                _calendars[cal_key] = lister(symbol, statement, frequency) if lister else None
+            except Exception as e:
+                logger.debug(f"period_dates failed for {name}/{symbol}: {e}")
+                _calendars[cal_key] = None
+        dates = _calendars[cal_key]
+        if dates is None:
+            parts.append(end_day)
+        else:
+            i = bisect.bisect_right(dates, end_day)
+            parts.append(dates[i - 1] if i else "")
+    return json.dumps(parts)
+
+
+def data_versions(providers: Dict[str, Any], names: List[str], symbol: str, statement: str,
+                  frequency: str) -> Optional[Dict[str, str]]:
+    """Every active provider's data version, or None as soon as one has none."""
+    out = {}
+    for name in names:
+        fn = getattr(providers[name], "data_version", None)
+        try:
+            version = fn(symbol, statement, frequency) if fn else None
+        except Exception:
+            version = None
+        if version is None:
+            return None
+        out[name] = version
+    return out
+
+
+MERGED_CACHE = MergedResultCache()
+
+
+def merged_cache_stats() -> Dict[str, Any]:
+    """Hit-rate metrics of the process-wide fundamentals result memo."""
+    return MERGED_CACHE.stats()
+
+
+def clear_merged_cache(persisted: bool = False) -> None:
+    """Forget every memoised result (and, with ``persisted``, the on-disk parts)."""
+    MERGED_CACHE.clear(persisted)
+    _calendars.clear()
+
+
+def _flush_at_exit() -> None:
+    try:
+        MERGED_CACHE.flush()
+    except Exception as e:
+        logger.debug(f"Merged-fundamentals cache flush at exit failed: {e}")
+
+
+atexit.register(_flush_at_exit)
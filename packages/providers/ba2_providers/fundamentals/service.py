@@ -5,11 +5,17 @@ Provides a single interface for fetching financial statements from multiple
 providers with fallback support and data normalization.
 """
 
+import functools
+import inspect
+import json
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Literal
 
 from ba2_common.logger import logger
 
+from . import merged_cache
+from .merged_cache import MERGED_CACHE, merged_cache_stats
 from .models import (
     FinancialStatementResponse,
     BalanceSheetPeriod,
@@ -215,6 +221,57 @@ def merge_periods(
     return result
 
 
+def _memoised(statement: str, merged: bool):
+    """Serve a public getter from ``merged_cache.MERGED_CACHE``.
+
+    The key covers everything the result depends on: the call's arguments, each active
+    provider's data version and the effective filing period of ``end_date``. A hit rebuilds
+    the response (fresh period dicts) with the caller's own ``end_date``.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            if not self.memoise:
+                return fn(*bound.args, **bound.kwargs)
+            a = bound.arguments
+            a["end_date"] = end_date = a["end_date"] or datetime.now()
+            symbol, frequency = a["symbol"].upper(), a["frequency"]
+            names = [n for n in self.provider_priority if n in self._providers]
+            start_date = a.get("start_date")
+            base = json.dumps([symbol, statement, "merged" if merged else "first", frequency, names,
+                               start_date.isoformat() if start_date else None, a["lookback_periods"]])
+            end_day = end_date.strftime("%Y-%m-%d")
+
+            def key():
+                versions = merged_cache.data_versions(self._providers, names, symbol, statement, frequency)
+                effective = merged_cache.effective_key(self._providers, names, symbol, statement,
+                                                       frequency, end_day, versions)
+                return (json.dumps(versions, sort_keys=True) if versions is not None else None), effective
+
+            versions, effective = key()
+            payload = MERGED_CACHE.get(base, versions, effective)
+            if payload is not None:
+                fields = json.loads(payload)
+                fields["end_date"] = end_date.isoformat()
+                return FinancialStatementResponse(**fields)
+
+            response = fn(*bound.args, **bound.kwargs)
+            if response.provider != "none":      # a total failure may be transient: re-ask
+                if versions is None:             # first read may just have written the caches
+                    versions, effective = key()
+                fields = asdict(response)
+                fields.pop("end_date", None)
+                MERGED_CACHE.put(base, versions, effective, json.dumps(fields, default=str))
+            return response
+
+        return wrapper
+    return decorator
+
+
 class FundamentalsService:
     """
     Unified service for fetching financial statements from multiple providers.
@@ -223,15 +280,18 @@ class FundamentalsService:
     the first successful result. Can also merge data from multiple providers.
     """
 
-    def __init__(self, providers: List[str] = None):
+    def __init__(self, providers: List[str] = None, memoise: bool = True):
         """
         Initialize the fundamentals service.
 
         Args:
             providers: List of provider names in priority order.
                       Default: ['yfinance', 'fmp', 'alphavantage']
+            memoise: Serve repeated requests from the process-wide result memo
+                     (``merged_cache``); shared by every instance.
         """
         self.provider_priority = providers or ['yfinance', 'fmp', 'alphavantage']
+        self.memoise = memoise
         self._providers = {}
         self._initialize_providers()
 
@@ -265,6 +325,7 @@ class FundamentalsService:
             except Exception as e:
                 logger.warning(f"Failed to initialize provider {provider_name}: {e}")
 
+    @_memoised("balance_sheet", merged=False)
     def get_balance_sheet(
         self,
         symbol: str,
@@ -325,6 +386,7 @@ class FundamentalsService:
             period_count=0
         )
 
+    @_memoised("income_statement", merged=False)
     def get_income_statement(
         self,
         symbol: str,
@@ -372,6 +434,7 @@ class FundamentalsService:
             period_count=0
         )
 
+    @_memoised("cash_flow", merged=False)
     def get_cash_flow(
         self,
         symbol: str,
@@ -419,6 +482,7 @@ class FundamentalsService:
             period_count=0
         )
 
+    @_memoised("earnings", merged=False)
     def get_earnings(
         self,
         symbol: str,
@@ -694,6 +758,7 @@ class FundamentalsService:
         )
 
 
+    @_memoised("balance_sheet", merged=True)
     def get_balance_sheet_merged(
         self,
         symbol: str,
@@ -752,6 +817,7 @@ class FundamentalsService:
             period_count=len(merged)
         )
 
+    @_memoised("income_statement", merged=True)
     def get_income_statement_merged(
         self,
         symbol: str,
@@ -803,6 +869,7 @@ class FundamentalsService:
             period_count=len(merged)
         )
 
+    @_memoised("cash_flow", merged=True)
     def get_cash_flow_merged(
         self,
         symbol: str,
@@ -855,6 +922,7 @@ class FundamentalsService:
         )
 
 
+    @_memoised("earnings", merged=True)
     def get_earnings_merged(
         self,
         symbol: str,
@@ -919,6 +987,12 @@ class FundamentalsService:
         )
 
 
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """Hit-rate metrics of the shared result memo (see ``merged_cache``)."""
+        return merged_cache_stats()
+
+
 def get_fundamentals_service(providers: List[str] = None) -> FundamentalsService:
     """Factory function to create a FundamentalsService instance."""
     return FundamentalsService(providers=providers)
@@ -0,0 +1,260 @@
+"""Point-in-time fundamentals PANEL: the annual statement fields a cross-sectional ranker needs,
+for a whole universe, as one columnar table.
+
+Cross-sectional experts (FactorRanker) used to ask ``FMPCompanyDetailsProvider`` for three
+statements per symbol per rebalance -- ~4,500 calls for a 1,500-name universe, each parsing and
+re-filtering the same per-symbol history. The panel holds that history once:
+
+  * one row per (symbol, statement, position in the cached history) with the statement's
+    filing-effective date (``statement_effective_date`` -- the date it became knowable) and the
+    fields in ``PANEL_STATEMENTS`` (named as in the provider's ``format_type="dict"`` output);
+  * built from the FMP statement history cache (``fmp_history_disk_cached``'s JSON files under
+    ``CACHE_FOLDER/fmp_history`` -- the very payloads the provider reads), INCREMENTALLY: a
+    re-build re-parses only the cache files whose mtime changed and drops rows of deleted ones;
+  * stored as ``panel.parquet`` + ``manifest.json`` in the panel dir (exportable, like the
+    screener metric store).
+
+``FundamentalsPanel.as_of`` reproduces ``FMPCompanyDetailsProvider._filter_statements_by_date(...,
+lookback_periods=1, as_of=as_of)`` for every symbol at once: among a statement's rows filed
+on/before ``as_of``, the first in cached (newest-fiscal-first) order.
+
+Freshness: a symbol is served only for ``as_of`` up to its cache files' fetch time plus the
+history cache's own max age (``covered``). That matches the provider exactly only where the
+provider itself reads the disk cache -- the frozen/backtest path (``fmp_common._is_ttl_frozen``).
+Live, the provider fetches every statement fresh, while a panel built from files up to
+``PANEL_MAX_AGE_DAYS`` old can miss a filing made since; consumers therefore read the panel
+only when frozen (FactorRanker does) and otherwise use the per-symbol provider path.
+"""
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from ba2_common.core.provider_utils import statement_effective_date
+from ba2_common.logger import logger
+
+# statement kind -> (fmp_history namespace, {panel column: FMP raw key}). Column names follow
+# FMPCompanyDetailsProvider's dict output so consumers read the same names from either source.
+PANEL_STATEMENTS: Dict[str, Any] = {
+    "income": ("income_statement_annual", {
+        "eps": "eps",
+        "net_income": "netIncome",
+        "gross_profit": "grossProfit",
+        "weighted_average_shares_outstanding": "weightedAverageShsOut",
+    }),
+    "balance": ("balance_sheet_annual", {
+        "short_term_debt": "shortTermDebt",
+        "long_term_debt": "longTermDebt",
+        "cash_and_cash_equivalents": "cashAndCashEquivalents",
+        "total_shareholder_equity": "totalStockholdersEquity",
+        "total_assets": "totalAssets",
+    }),
+    "cashflow": ("cashflow_statement_annual", {
+        "free_cash_flow": "freeCashFlow",
+        "operating_cash_flow": "operatingCashFlow",
+    }),
+}
+FIELDS: List[str] = [c for _ns, cols in PANEL_STATEMENTS.values() for c in cols]
+
+PANEL_FILE = "panel.parquet"
+_MANIFEST_NAME = "manifest.json"
+_MANIFEST_VERSION = 1
+# A statement cache file is trusted this long after it was fetched -- the history cache's own
+# reuse window (fmp_common._FMP_HISTORY_DISK_MAX_AGE_DAYS).
+PANEL_MAX_AGE_DAYS = 7.0
+
+_PANEL_MEMO: Dict[str, "FundamentalsPanel"] = {}
+
+
+def _naive(dt: datetime) -> datetime:
+    # Same comparison as the provider's as_of filter: the wall-clock value, tz dropped.
+    return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def _parse_source(path: str, symbol: str, kind: str) -> pd.DataFrame:
+    """Panel rows of one cached statement history (empty for the ``[]`` prewarm sentinel or an
+    unreadable file -- the provider treats both as "no statements" too)."""
+    _ns, cols = PANEL_STATEMENTS[kind]
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+    except Exception as e:  # noqa: BLE001 — a corrupt cache file costs this symbol, not the build
+        logger.warning(f"statement-panel: unreadable {path} ({e})")
+        payload = None
+    records = []
+    for pos, row in enumerate(payload if isinstance(payload, list) else []):
+        if not isinstance(row, dict):
+            continue
+        eff = statement_effective_date(row)
+        if eff is None:
+            continue  # never knowable -> never selected by the provider's as_of filter
+        rec = {"symbol": symbol, "statement": kind, "pos": pos,
+               "effective_date": _naive(eff), "fiscal_date": str(row.get("date") or "")}
+        for col, key in cols.items():
+            rec[col] = row.get(key)
+        records.append(rec)
+    return _frame(records)
+
+
+def _frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    df = pd.DataFrame.from_records(
+        records, columns=["symbol", "statement", "pos", "effective_date", "fiscal_date", *FIELDS])
+    for col in FIELDS:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    df["pos"] = df["pos"].astype("int32")
+    df["effective_date"] = pd.to_datetime(df["effective_date"])
+    return df
+
+
+def load_manifest(panel_dir: str) -> Dict[str, Any]:
+    """The build manifest (empty when missing, unreadable or from another version -- every source
+    is then re-parsed, never trusted blindly)."""
+    try:
+        with open(os.path.join(panel_dir, _MANIFEST_NAME)) as f:
+            man = json.load(f)
+        if man.get("version") == _MANIFEST_VERSION and isinstance(man.get("sources"), dict):
+            return man
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # noqa: BLE001 — a corrupt manifest costs a full re-parse
+        logger.warning(f"statement-panel: ignoring unreadable manifest in {panel_dir} ({e})")
+    return {"version": _MANIFEST_VERSION, "sources": {}}
+
+
+def build_panel(panel_dir: str, symbols: Optional[Iterable[str]] = None,
+                cache_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Build or refresh the panel in ``panel_dir`` from the statement history cache.
+
+    ``symbols`` restricts the build to those names (their rows are replaced, every other symbol's
+    rows are kept); ``None`` takes every cached symbol and drops rows whose cache file is gone.
+    ``cache_dir`` defaults to the live ``fmp_history`` dir. Returns build stats.
+    """
+    from ba2_providers.fmp_common import _fmp_history_cache_dir
+
+    cache_dir = cache_dir or _fmp_history_cache_dir()
+    os.makedirs(panel_dir, exist_ok=True)
+    manifest = load_manifest(panel_dir)
+    old_sources: Dict[str, float] = manifest["sources"]
+    panel_path = os.path.join(panel_dir, PANEL_FILE)
+    old = pd.read_parquet(panel_path) if os.path.exists(panel_path) and old_sources else _frame([])
+
+    wanted = None if symbols is None else {s.upper() for s in symbols}
+    try:
+        names = sorted(os.listdir(cache_dir))
+    except FileNotFoundError:
+        names = []
+    sources: Dict[str, Any] = {}  # file name -> (symbol, kind, mtime)
+    for kind, (ns, _cols) in PANEL_STATEMENTS.items():
+        prefix = f"{ns}__"
+        for name in names:
+            if not (name.startswith(prefix) and name.endswith(".json")):
+                continue
+            sym = name[len(prefix):-len(".json")]
+            if wanted is not None and sym not in wanted:
+                continue
+            sources[name] = (sym, kind, os.path.getmtime(os.path.join(cache_dir, name)))
+
+    # Partial build: other symbols' manifest entries (and rows, below) stay as they are.
+    new_sources = {} if wanted is None else {
+        n: m for n, m in old_sources.items() if n.split("__", 1)[1][:-len(".json")] not in wanted}
+    frames, reused = [], set()
+    for name, (sym, kind, mtime) in sources.items():
+        new_sources[name] = mtime
+        if old_sources.get(name) == mtime:
+            reused.add((sym, kind))
+        else:
+            frames.append(_parse_source(os.path.join(cache_dir, name), sym, kind))
+    # Old rows survive when their source is unchanged, or when a partial build did not touch the
+    # symbol; changed sources are re-parsed above and deleted ones drop out.
+    keep = pd.Series([(k in reused) or (wanted is not None and k[0] not in wanted)
+                      for k in zip(old["symbol"], old["statement"])], index=old.index, dtype=bool)
+    rows = pd.concat([old[keep], *frames], ignore_index=True) if frames else old[keep]
+    rows = rows.sort_values(["symbol", "statement", "pos"], kind="stable").reset_index(drop=True)
+
+    tmp = f"{panel_path}.{os.getpid()}.tmp"
+    rows.to_parquet(tmp, index=False)
+    os.replace(tmp, panel_path)
+    manifest = {"version": _MANIFEST_VERSION, "built_at": datetime.now().isoformat(timespec="seconds"),
+                "sources": new_sources}
+    mtmp = os.path.join(panel_dir, f"{_MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(mtmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(mtmp, os.path.join(panel_dir, _MANIFEST_NAME))
+    _PANEL_MEMO.pop(os.path.abspath(panel_dir), None)
+    stats = {"symbols": int(rows["symbol"].nunique()), "rows": int(len(rows)),
+             "parsed": len(frames), "reused": len(reused)}
+    logger.info(f"statement-panel: built {panel_dir}: {stats}")
+    return stats
+
+
+class FundamentalsPanel:
+    """A loaded panel: vectorised as-of slices over every symbol at once."""
+
+    def __init__(self, rows: pd.DataFrame, sources: Dict[str, float]):
+        self.rows = rows
+        # symbol -> fetch time (epoch s) of its OLDEST statement file; only symbols with all three.
+        seen: Dict[str, Dict[str, float]] = {}
+        ns_kind = {ns: kind for kind, (ns, _c) in PANEL_STATEMENTS.items()}
+        for name, mtime in sources.items():
+            ns, _, rest = name.partition("__")
+            if ns in ns_kind:
+                seen.setdefault(rest[:-len(".json")], {})[ns_kind[ns]] = float(mtime)
+        self.fetched_at = {sym: min(kinds.values()) for sym, kinds in seen.items()
+                           if len(kinds) == len(PANEL_STATEMENTS)}
+
+    @classmethod
+    def load(cls, panel_dir: str) -> "FundamentalsPanel":
+        """Load ``panel_dir``, memoised per process (rebuilt panels are reloaded by ``build_panel``
+        in the same process; other processes see them after ``clear_panel_memo``)."""
+        key = os.path.abspath(panel_dir)
+        hit = _PANEL_MEMO.get(key)
+        if hit is None:
+            path = os.path.join(panel_dir, PANEL_FILE)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"no fundamentals panel in {panel_dir}")
+            hit = cls(pd.read_parquet(path), load_manifest(panel_dir)["sources"])
+            _PANEL_MEMO[key] = hit
+        return hit
+
+    def covered(self, symbols: Iterable[str], as_of: datetime) -> List[str]:
+        """The ``symbols`` (in order) the panel can answer for at ``as_of``: all three statement
+        histories cached, fetched no more than ``PANEL_MAX_AGE_DAYS`` before ``as_of``'s horizon
+        -- the window in which the frozen provider path reuses the same files. For a live "now"
+        this bounds, but does not rule out, a filing missed since the fetch."""
+        horizon = _naive(as_of) - timedelta(days=PANEL_MAX_AGE_DAYS)
+        out = []
+        for sym in symbols:
+            ts = self.fetched_at.get(sym.upper())
+            if ts is not None and _naive(datetime.fromtimestamp(ts, timezone.utc)) >= horizon:
+                out.append(sym)
+        return out
+
+    def as_of(self, as_of: datetime, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """One row per symbol (index) with each statement's fields as known at ``as_of``.
+
+        ``has_<kind>`` is False where no statement of that kind was filed on/before as_of (its
+        fields are NaN); a symbol with none at all has no row.
+        """
+        rows = self.rows
+        if symbols is not None:
+            rows = rows[rows["symbol"].isin([s.upper() for s in symbols])]
+        rows = rows[rows["effective_date"] <= pd.Timestamp(_naive(as_of))]
+        # Rows are sorted (symbol, statement, pos): the first survivor is the provider's pick.
+        first = rows.drop_duplicates(["symbol", "statement"], keep="first")
+        parts = []
+        for kind, (_ns, cols) in PANEL_STATEMENTS.items():
+            part = first[first["statement"] == kind].set_index("symbol")[list(cols)]
+            part[f"has_{kind}"] = True
+            parts.append(part)
+        wide = pd.concat(parts, axis=1, join="outer")
+        for kind in PANEL_STATEMENTS:
+            wide[f"has_{kind}"] = wide[f"has_{kind}"].notna()
+        return wide.sort_index()
+
+
+def clear_panel_memo() -> None:
+    _PANEL_MEMO.clear()
@@ -5,7 +5,7 @@ Technical indicators provider using any OHLCV data provider via stockstats libra
 Calculates indicators from historical price data.
 """
 
-from typing import Dict, Any, Literal, Optional, Annotated
+from typing import Dict, Any, Literal, Optional, Annotated, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 from stockstats import wrap
@@ -15,6 +15,10 @@ from ba2_common.core.interfaces.MarketDataProviderInterface import MarketDataPro
 from ba2_common.core.provider_utils import validate_date_range, log_provider_call
 from ba2_common.logger import logger
 
+from .series_cache import IndicatorSeriesCache, get_default_series_cache
+
+_DEFAULT_CACHE = object()
+
 
 class PandasIndicatorCalc(MarketIndicatorsInterface):
     """
@@ -45,14 +49,18 @@ class PandasIndicatorCalc(MarketIndicatorsInterface):
         "mfi"
     ]
     
-    def __init__(self, ohlcv_provider: MarketDataProviderInterface):
+    def __init__(self, ohlcv_provider: MarketDataProviderInterface,
+                 series_cache: Optional[IndicatorSeriesCache] = _DEFAULT_CACHE):
         """
         Initialize Pandas indicator calculator.
         
         Args:
             ohlcv_provider: Any OHLCV data provider implementing MarketDataProviderInterface
+            series_cache: Computed-series cache; defaults to the process-wide shared cache,
+                None disables caching
         """
         self._data_provider = ohlcv_provider
+        self._series_cache = get_default_series_cache() if series_cache is _DEFAULT_CACHE else series_cache
         logger.debug(f"Initialized PandasIndicatorCalc with provider: {ohlcv_provider.__class__.__name__}")
     
     def get_provider_name(self) -> str:
@@ -82,6 +90,9 @@ class PandasIndicatorCalc(MarketIndicatorsInterface):
         """
         Calculate technical indicator for a date range using stockstats.
         
+        Served from the shared indicator series cache when enabled: a repeat request is
+        answered without refetching, and a later end date only processes the new bars.
+        
         Args:
             symbol: Stock ticker symbol
             indicator: Indicator name (e.g., 'rsi', 'macd', 'close_50_sma')
@@ -92,6 +103,49 @@ class PandasIndicatorCalc(MarketIndicatorsInterface):
         Returns:
             DataFrame with Date and indicator value columns
         """
+        if self._series_cache is not None:
+            df = self._series_cache.get_series(
+                self._data_provider, symbol, indicator, interval, start_date, end_date,
+                compute_fn=lambda s, e: self._compute_series(symbol, indicator, s, e, interval),
+                fetch_fn=lambda since, e: self._fetch_bars(symbol, since, e, interval),
+            )
+        else:
+            df = self._compute_series(symbol, indicator, start_date, end_date, interval)[1]
+        return self._filter_range(df, start_date, end_date)
+    
+    def _fetch_bars(self, symbol: str, start_date: datetime, end_date: datetime, interval: str) -> pd.DataFrame:
+        """Fetch OHLCV bars with the Date column normalised the way the indicator frame expects."""
+        data = self._data_provider.get_ohlcv_data(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval
+        )
+        return self._normalise_dates(data)
+    
+    @staticmethod
+    def _normalise_dates(data: pd.DataFrame) -> pd.DataFrame:
+        """Parse the Date column, keeping it UTC-aware only if the provider's dates were aware."""
+        if 'Date' not in data.columns:
+            return data
+        if hasattr(data['Date'], 'dt') and data['Date'].dt.tz is not None:
+            return data.assign(Date=pd.to_datetime(data['Date'], utc=True))
+        return data.assign(Date=pd.to_datetime(data['Date']))
+    
+    def _compute_series(
+        self,
+        symbol: str,
+        indicator: str,
+        start_date: datetime,
+        end_date: datetime,
+        interval: str
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Fetch the warm-up window and compute the indicator over all of it.
+        
+        Returns:
+            (OHLCV bars used, DataFrame with Date and value columns for every bar)
+        """
         # Add buffer for technical indicator calculation
         # Most technical indicators need 200-day history for calculations
         buffer_days = 365  # 1 year buffer
@@ -134,6 +188,12 @@ class PandasIndicatorCalc(MarketIndicatorsInterface):
         # Calculate indicator for all dates (triggers stockstats calculation)
         df[indicator]
         
+        series = pd.DataFrame({"Date": df["Date"].reset_index(drop=True),
+                               "value": df[indicator].to_numpy()})
+        return self._normalise_dates(data), series
+    
+    def _filter_range(self, df: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        """Slice a Date/value indicator frame to the requested range and format its dates."""
         # Filter to requested date range
         start_dt = pd.to_datetime(start_date)
         end_dt = pd.to_datetime(end_date)
@@ -172,14 +232,11 @@ class PandasIndicatorCalc(MarketIndicatorsInterface):
                 end_dt = end_dt.tz_convert('UTC').tz_localize(None)
 
         mask = (df["Date"] >= start_dt) & (df["Date"] <= end_dt)
-        filtered_df = df.loc[mask, ["Date", indicator]].copy()
+        filtered_df = df.loc[mask, ["Date", "value"]].copy()
         
         # Format date to preserve time component for intraday data
         filtered_df["Date"] = filtered_df["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
         
-        # Rename indicator column to 'value' for consistency
-        filtered_df = filtered_df.rename(columns={indicator: "value"})
-        
         return filtered_df
     
     @log_provider_call
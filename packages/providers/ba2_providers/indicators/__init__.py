@@ -6,13 +6,20 @@ Providers for technical indicators (RSI, MACD, SMA, EMA, etc.)
 Available Providers:
     - AlphaVantage: Technical indicators from Alpha Vantage API
     - PandasIndicatorCalc: Technical indicators calculated from any OHLCV data provider
+
+Streaming:
+    - IncrementalIndicatorEngine: O(1)-per-bar indicators with checkpointable state
 """
 
 # Import provider implementations
 from .PandasIndicatorCalc import PandasIndicatorCalc
 from .AlphaVantageIndicatorsProvider import AlphaVantageIndicatorsProvider
+from .incremental import IncrementalIndicatorEngine, IndicatorStateStore, create_indicator
 
 __all__ = [
     "PandasIndicatorCalc",
-    "AlphaVantageIndicatorsProvider"
+    "AlphaVantageIndicatorsProvider",
+    "IncrementalIndicatorEngine",
+    "IndicatorStateStore",
+    "create_indicator",
 ]
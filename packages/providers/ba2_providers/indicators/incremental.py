@@ -0,0 +1,683 @@
+"""Streaming (incremental) technical indicators with checkpointable state.
+
+WHY THIS EXISTS. ``PandasIndicatorCalc`` recomputes every indicator from scratch over a
+~365-day warm-up window on each call, so a backtest stepping bar by bar (and a live job
+polling each new bar) pays O(lookback) per bar per indicator. The indicators here keep
+their recurrence state and advance in O(1) per bar via ``update(bar)``.
+
+SEMANTICS. Each indicator reproduces the stockstats definition ``PandasIndicatorCalc``
+serves under the same key (``close_50_sma``, ``close_10_ema``, ``rsi``, ``macd``,
+``boll``, ``atr``, ``adx``, ``vwma``, ``mfi`` ...), including the warm-up behaviour:
+rolling windows are partial (``min_periods=1``) at the start and the exponential
+averages are pandas ``ewm(adjust=True)``. Values agree with the batch computation to
+floating-point rounding, not bit for bit (pandas' rolling kernels order their sums
+differently).
+
+CHECKPOINTS. ``IncrementalIndicatorEngine`` groups the indicators for one
+(symbol, interval, indicator set). ``checkpoint()`` returns a JSON-serialisable dict and
+``IncrementalIndicatorEngine.from_checkpoint`` restores it, so a backtest can park and
+resume state, and ``IndicatorStateStore`` persists checkpoints under
+``CACHE_FOLDER/indicator_state`` for live jobs. Bars at or before the engine's last bar
+timestamp are skipped, which makes replaying an overlapping history after a restore safe.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from ba2_common.logger import logger
+
+# Bump when the persisted state layout of any indicator changes; older checkpoints are
+# then ignored (rebuilt from history) instead of being restored into the wrong fields.
+STATE_VERSION = 1
+
+# stockstats defaults (StockDataFrame._dft_windows / DX_SMMA / ADX_EMA / BOLL_STD_TIMES)
+_DEFAULT_WINDOWS: Dict[str, Any] = {
+    "rsi": 14, "atr": 14, "boll": 20, "vwma": 14, "mfi": 14, "adx": 14, "macd": (12, 26, 9),
+}
+_ADX_EMA = 6
+_BOLL_STD_TIMES = 2
+
+
+def _field(bar: Any, name: str) -> float:
+    """Read an OHLCV field from a mapping / pandas row / object, accepting 'close' or 'Close'."""
+    for key in (name, name.capitalize()):
+        if isinstance(bar, Mapping) or isinstance(bar, pd.Series):
+            if key in bar:
+                return float(bar[key])
+        elif hasattr(bar, key):
+            return float(getattr(bar, key))
+    raise KeyError(f"bar has no '{name}' field")
+
+
+def _timestamp(bar: Any) -> Optional[pd.Timestamp]:
+    """Bar timestamp from a 'Date'/'date'/'timestamp' field or a pandas row's name, if any."""
+    for key in ("Date", "date", "timestamp", "Datetime"):
+        value = bar.get(key) if isinstance(bar, (Mapping, pd.Series)) else getattr(bar, key, None)
+        if value is not None:
+            return pd.Timestamp(value)
+    if isinstance(bar, pd.Series) and isinstance(bar.name, (pd.Timestamp, datetime)):
+        return pd.Timestamp(bar.name)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Building blocks
+# ---------------------------------------------------------------------------
+
+class _EWM:
+    """pandas ``ewm(alpha=..., adjust=True, ignore_na=False).mean()`` one observation at a time."""
+
+    __slots__ = ("alpha", "weighted", "old_wt", "nobs", "min_periods")
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = max(min_periods, 1)
+        self.weighted = math.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def update(self, x: float) -> float:
+        is_obs = not math.isnan(x)
+        if math.isnan(self.weighted):
+            if is_obs:
+                self.weighted = x
+                self.nobs = 1
+        else:
+            # Missing observations still decay the old weights (ignore_na=False)
+            self.old_wt *= 1.0 - self.alpha
+            if is_obs:
+                self.nobs += 1
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + x) / (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        return self.weighted if self.nobs >= self.min_periods else math.nan
+
+    @property
+    def value(self) -> float:
+        return self.weighted if self.nobs >= self.min_periods else math.nan
+
+    def get_state(self) -> List[float]:
+        return [self.weighted, self.old_wt, self.nobs]
+
+    def set_state(self, state: Sequence[float]) -> None:
+        self.weighted, self.old_wt, self.nobs = float(state[0]), float(state[1]), int(state[2])
+
+
+class _RollingWindow:
+    """
+    Sliding window (partial at the start) with O(1) sum and sample variance.
+
+    The running sums are recomputed exactly from the window every ``_RESUM_EVERY``
+    windows' worth of removals, so rounding drift stays bounded on state that lives for
+    years of bars (amortised O(1)).
+    """
+
+    __slots__ = ("size", "values", "total", "mean", "ssqdm", "removed")
+
+    _RESUM_EVERY = 16
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values: deque = deque()
+        self.total = 0.0
+        self.mean = 0.0
+        self.ssqdm = 0.0  # sum of squared deviations from the mean (Welford)
+        self.removed = 0
+
+    def push(self, x: float) -> None:
+        if len(self.values) == self.size:
+            self._remove(self.values.popleft())
+            self.removed += 1
+            if self.removed >= self._RESUM_EVERY * self.size:
+                self._resum()
+        self.values.append(x)
+        self.total += x
+        n = len(self.values)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.ssqdm += delta * (x - self.mean)
+
+    def _remove(self, x: float) -> None:
+        self.total -= x
+        n = len(self.values)  # count after removal (the caller already popped x)
+        if n == 0:
+            self.mean = self.ssqdm = self.total = 0.0
+            return
+        delta = x - self.mean
+        self.mean -= delta / n
+        self.ssqdm -= delta * (x - self.mean)
+
+    def _resum(self) -> None:
+        n = len(self.values)
+        self.removed = 0
+        self.total = math.fsum(self.values)
+        self.mean = self.total / n if n else 0.0
+        self.ssqdm = math.fsum((v - self.mean) ** 2 for v in self.values)
+
+    @property
+    def std(self) -> float:
+        n = len(self.values)
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(self.ssqdm, 0.0) / (n - 1))
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"values": list(self.values), "total": self.total, "mean": self.mean, "ssqdm": self.ssqdm,
+                "removed": self.removed}
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        self.values = deque(float(v) for v in state["values"])
+        self.total, self.mean, self.ssqdm = float(state["total"]), float(state["mean"]), float(state["ssqdm"])
+        self.removed = int(state.get("removed", 0))
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+class IncrementalIndicator:
+    """
+    Base class for a streaming indicator.
+
+    ``update(bar)`` consumes one OHLCV bar and returns the indicator outputs for it as a
+    dict keyed by the stockstats column names (``macd``/``macds``/``macdh`` for MACD).
+    ``get_state()``/``set_state()`` round-trip the full recurrence state through plain
+    JSON types.
+    """
+
+    name: str = ""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.values: Dict[str, float] = {}
+
+    def update(self, bar: Any) -> Dict[str, float]:
+        self.values = self._update(bar)
+        return self.values
+
+    def _update(self, bar: Any) -> Dict[str, float]:
+        raise NotImplementedError
+
+    def get_state(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def set_state(self, state: Mapping[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class SMA(IncrementalIndicator):
+    """Simple moving average of a column (``<column>_<n>_sma``)."""
+
+    name = "sma"
+
+    def __init__(self, key: str, window: int, column: str = "close"):
+        super().__init__(key)
+        self.column = column
+        self._window = _RollingWindow(window)
+
+    def _update(self, bar):
+        self._window.push(_field(bar, self.column))
+        return {self.key: self._window.total / len(self._window.values)}
+
+    def get_state(self):
+        return {"window": self._window.get_state()}
+
+    def set_state(self, state):
+        self._window.set_state(state["window"])
+
+
+class EMA(IncrementalIndicator):
+    """Exponential moving average of a column (``<column>_<n>_ema``, span ``n``)."""
+
+    name = "ema"
+
+    def __init__(self, key: str, window: int, column: str = "close"):
+        super().__init__(key)
+        self.column = column
+        self._ema = _EWM(2.0 / (window + 1.0))
+
+    def _update(self, bar):
+        return {self.key: self._ema.update(_field(bar, self.column))}
+
+    def get_state(self):
+        return {"ema": self._ema.get_state()}
+
+    def set_state(self, state):
+        self._ema.set_state(state["ema"])
+
+
+class RSI(IncrementalIndicator):
+    """Relative Strength Index on Wilder-smoothed (SMMA) gains and losses."""
+
+    name = "rsi"
+
+    def __init__(self, key: str, window: int = 14):
+        super().__init__(key)
+        self._up = _EWM(1.0 / window)
+        self._down = _EWM(1.0 / window)
+        self._prev_close: Optional[float] = None
+
+    def _update(self, bar):
+        close = _field(bar, "close")
+        first = self._prev_close is None
+        diff = 0.0 if first else close - self._prev_close
+        self._prev_close = close
+        up = self._up.update(diff if diff > 0 else 0.0)
+        down = self._down.update(-diff if diff < 0 else 0.0)
+        total = up + down
+        if first or total == 0 or math.isnan(total):
+            rsi = 50.0 if first or total == 0 else math.nan
+        else:
+            rsi = 100 * (up / total)
+        return {self.key: rsi}
+
+    def get_state(self):
+        return {"up": self._up.get_state(), "down": self._down.get_state(), "prev_close": self._prev_close}
+
+    def set_state(self, state):
+        self._up.set_state(state["up"])
+        self._down.set_state(state["down"])
+        self._prev_close = state["prev_close"]
+
+
+class _TrueRange:
+    """True range with stockstats' first-bar convention (previous close = first close, NaN -> 0)."""
+
+    __slots__ = ("prev_close",)
+
+    def __init__(self):
+        self.prev_close: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev = close if self.prev_close is None else self.prev_close
+        self.prev_close = close
+        tr = max(high - low, abs(high - prev), abs(low - prev))
+        return 0.0 if math.isnan(tr) else tr
+
+
+class ATR(IncrementalIndicator):
+    """Average True Range (SMMA of the true range)."""
+
+    name = "atr"
+
+    def __init__(self, key: str, window: int = 14):
+        super().__init__(key)
+        self._tr = _TrueRange()
+        self._atr = _EWM(1.0 / window)
+
+    def _update(self, bar):
+        tr = self._tr.update(_field(bar, "high"), _field(bar, "low"), _field(bar, "close"))
+        return {self.key: self._atr.update(tr)}
+
+    def get_state(self):
+        return {"prev_close": self._tr.prev_close, "atr": self._atr.get_state()}
+
+    def set_state(self, state):
+        self._tr.prev_close = state["prev_close"]
+        self._atr.set_state(state["atr"])
+
+
+class MACD(IncrementalIndicator):
+    """MACD line, signal line (``<key>s``) and histogram (``<key>h``)."""
+
+    name = "macd"
+
+    def __init__(self, key: str, short: int = 12, long: int = 26, signal: int = 9):
+        super().__init__(key)
+        self._short = _EWM(2.0 / (short + 1.0))
+        self._long = _EWM(2.0 / (long + 1.0))
+        self._signal = _EWM(2.0 / (signal + 1.0))
+
+    def _update(self, bar):
+        close = _field(bar, "close")
+        macd = self._short.update(close) - self._long.update(close)
+        signal = self._signal.update(macd)
+        return {self.key: macd, f"{self.key}s": signal, f"{self.key}h": macd - signal}
+
+    def get_state(self):
+        return {"short": self._short.get_state(), "long": self._long.get_state(),
+                "signal": self._signal.get_state()}
+
+    def set_state(self, state):
+        self._short.set_state(state["short"])
+        self._long.set_state(state["long"])
+        self._signal.set_state(state["signal"])
+
+
+class Bollinger(IncrementalIndicator):
+    """Bollinger middle band plus ``<key>_ub`` / ``<key>_lb`` at two sample standard deviations."""
+
+    name = "boll"
+
+    def __init__(self, key: str, window: int = 20):
+        super().__init__(key)
+        self._window = _RollingWindow(window)
+
+    def _update(self, bar):
+        self._window.push(_field(bar, "close"))
+        mid = self._window.total / len(self._window.values)
+        width = _BOLL_STD_TIMES * self._window.std
+        return {self.key: mid, f"{self.key}_ub": mid + width, f"{self.key}_lb": mid - width}
+
+    def get_state(self):
+        return {"window": self._window.get_state()}
+
+    def set_state(self, state):
+        self._window.set_state(state["window"])
+
+
+class ADX(IncrementalIndicator):
+    """
+    Average Directional Index with +DI/-DI/DX (``pdi``/``ndi``/``dx``/``adx``).
+
+    +DM/-DM and the true range are SMMA-smoothed over ``window`` bars and DX is
+    averaged with a 6-bar EMA, as in stockstats' DMI.
+    """
+
+    name = "adx"
+
+    def __init__(self, key: str, window: int = 14):
+        super().__init__(key)
+        self._tr = _TrueRange()
+        self._pdm = _EWM(1.0 / window)
+        self._ndm = _EWM(1.0 / window)
+        self._atr = _EWM(1.0 / window)
+        self._adx = _EWM(2.0 / (_ADX_EMA + 1.0))
+        self._prev_high: Optional[float] = None
+        self._prev_low: Optional[float] = None
+
+    def _update(self, bar):
+        high, low, close = _field(bar, "high"), _field(bar, "low"), _field(bar, "close")
+        hd = 0.0 if self._prev_high is None else high - self._prev_high
+        ld = 0.0 if self._prev_low is None else self._prev_low - low
+        self._prev_high, self._prev_low = high, low
+
+        pdm = self._pdm.update(hd if hd > 0 and hd > ld else 0.0)
+        ndm = self._ndm.update(ld if ld > 0 and ld > hd else 0.0)
+        atr = self._atr.update(self._tr.update(high, low, close))
+        if atr == 0 or math.isnan(atr):
+            pdi = ndi = dx = math.nan
+        else:
+            pdi = pdm / atr * 100
+            ndi = ndm / atr * 100
+            divisor = pdi + ndi
+            dx = abs(pdi - ndi) / divisor * 100 if divisor != 0 else 0.0
+        suffix = self.key[len("adx"):]  # "" or "_<window>"
+        return {self.key: self._adx.update(dx), f"pdi{suffix}": pdi, f"ndi{suffix}": ndi,
+                f"dx{suffix}": dx}
+
+    def get_state(self):
+        return {"prev_close": self._tr.prev_close, "prev_high": self._prev_high,
+                "prev_low": self._prev_low, "pdm": self._pdm.get_state(), "ndm": self._ndm.get_state(),
+                "atr": self._atr.get_state(), "adx": self._adx.get_state()}
+
+    def set_state(self, state):
+        self._tr.prev_close = state["prev_close"]
+        self._prev_high, self._prev_low = state["prev_high"], state["prev_low"]
+        for name in ("pdm", "ndm", "atr", "adx"):
+            getattr(self, f"_{name}").set_state(state[name])
+
+
+class VWMA(IncrementalIndicator):
+    """Volume-weighted moving average of the typical price."""
+
+    name = "vwma"
+
+    def __init__(self, key: str, window: int = 14):
+        super().__init__(key)
+        self._tpv = _RollingWindow(window)
+        self._vol = _RollingWindow(window)
+
+    def _update(self, bar):
+        volume = _field(bar, "volume")
+        tp = (_field(bar, "close") + _field(bar, "high") + _field(bar, "low")) / 3.0
+        self._tpv.push(volume * tp)
+        self._vol.push(volume)
+        vol = self._vol.total
+        return {self.key: self._tpv.total / vol if vol != 0 else 0.0}
+
+    def get_state(self):
+        return {"tpv": self._tpv.get_state(), "vol": self._vol.get_state()}
+
+    def set_state(self, state):
+        self._tpv.set_state(state["tpv"])
+        self._vol.set_state(state["vol"])
+
+
+class MFI(IncrementalIndicator):
+    """Money Flow Index as a 0..1 ratio (stockstats scale), 0.5 for the first ``window`` bars."""
+
+    name = "mfi"
+
+    def __init__(self, key: str, window: int = 14):
+        super().__init__(key)
+        self.window = window
+        self._pos = _RollingWindow(window)
+        self._neg = _RollingWindow(window)
+        self._prev_tp: Optional[float] = None
+        self._count = 0
+
+    def _update(self, bar):
+        tp = (_field(bar, "close") + _field(bar, "high") + _field(bar, "low")) / 3.0
+        flow = tp * _field(bar, "volume")
+        diff = 0.0 if self._prev_tp is None else tp - self._prev_tp
+        self._prev_tp = tp
+        self._pos.push(flow if diff > 0 else 0.0)
+        self._neg.push(flow if diff < 0 else 0.0)
+        self._count += 1
+        total = self._pos.total + self._neg.total
+        if self._count <= self.window or not total > 0:
+            return {self.key: 0.5}
+        return {self.key: self._pos.total / total}
+
+    def get_state(self):
+        return {"pos": self._pos.get_state(), "neg": self._neg.get_state(),
+                "prev_tp": self._prev_tp, "count": self._count}
+
+    def set_state(self, state):
+        self._pos.set_state(state["pos"])
+        self._neg.set_state(state["neg"])
+        self._prev_tp, self._count = state["prev_tp"], int(state["count"])
+
+
+_COLUMN_MA = re.compile(r"^(?P<column>[a-z]+)_(?P<window>\d+)_(?P<kind>sma|ema)$")
+_WINDOWED = re.compile(r"^(?P<name>rsi|atr|boll|vwma|mfi|adx)(?:_(?P<window>\d+))?$")
+_MACD = re.compile(r"^macd(?:_(?P<short>\d+)_(?P<long>\d+)_(?P<signal>\d+))?$")
+
+# Output columns that are produced by another key's indicator
+_ALIASES = {"macds": "macd", "macdh": "macd", "boll_ub": "boll", "boll_lb": "boll",
+            "pdi": "adx", "ndi": "adx", "dx": "adx"}
+
+
+def create_indicator(key: str) -> IncrementalIndicator:
+    """
+    Build the streaming indicator for a stockstats-style key.
+
+    Accepts ``<column>_<n>_sma``, ``<column>_<n>_ema``, ``rsi``/``atr``/``boll``/
+    ``vwma``/``mfi``/``adx`` with an optional ``_<n>`` window, and ``macd`` with an
+    optional ``_<short>_<long>_<signal>``. Derived columns (``macds``, ``boll_ub``,
+    ``pdi``...) map to the indicator that produces them.
+
+    Raises:
+        ValueError: if the key is not supported
+    """
+    key = _ALIASES.get(key, key)
+    match = _COLUMN_MA.match(key)
+    if match:
+        cls = SMA if match["kind"] == "sma" else EMA
+        return cls(key, int(match["window"]), column=match["column"])
+    match = _WINDOWED.match(key)
+    if match:
+        window = int(match["window"]) if match["window"] else _DEFAULT_WINDOWS[match["name"]]
+        cls = {"rsi": RSI, "atr": ATR, "boll": Bollinger, "vwma": VWMA, "mfi": MFI, "adx": ADX}[match["name"]]
+        return cls(key, window)
+    match = _MACD.match(key)
+    if match:
+        if match["short"]:
+            return MACD(key, int(match["short"]), int(match["long"]), int(match["signal"]))
+        return MACD(key, *_DEFAULT_WINDOWS["macd"])
+    raise ValueError(f"Indicator '{key}' has no incremental implementation")
+
+
+# ---------------------------------------------------------------------------
+# Engine + persistence
+# ---------------------------------------------------------------------------
+
+class IncrementalIndicatorEngine:
+    """
+    Streaming state for a set of indicators on one (symbol, interval).
+
+    Example:
+        engine = IncrementalIndicatorEngine("AAPL", "1d", ["rsi", "macd", "close_50_sma"])
+        engine.update_many(history_df)          # warm up once
+        values = engine.update(new_bar)         # O(1) per new bar
+        store.save(engine)                      # resume later with store.load(...)
+    """
+
+    def __init__(self, symbol: str, interval: str, indicators: Iterable[str]):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self._indicators: Dict[str, IncrementalIndicator] = {}
+        for key in indicators:
+            indicator = create_indicator(key)
+            self._indicators.setdefault(indicator.key, indicator)
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.bars_seen = 0
+
+    @property
+    def indicator_keys(self) -> List[str]:
+        return sorted(self._indicators)
+
+    @property
+    def params_key(self) -> str:
+        """Short stable hash of the indicator set, used to key persisted state."""
+        return hashlib.sha1(",".join(self.indicator_keys).encode()).hexdigest()[:12]
+
+    @property
+    def values(self) -> Dict[str, float]:
+        """Latest outputs of every indicator."""
+        out: Dict[str, float] = {}
+        for indicator in self._indicators.values():
+            out.update(indicator.values)
+        return out
+
+    def update(self, bar: Any) -> Dict[str, float]:
+        """
+        Advance every indicator by one bar and return the latest outputs.
+
+        A bar whose timestamp is at or before the last consumed bar is ignored (the
+        current values are returned unchanged), so overlapping replays are idempotent.
+        """
+        ts = _timestamp(bar)
+        if ts is not None:
+            if self.last_timestamp is not None and ts <= self.last_timestamp:
+                return self.values
+            self.last_timestamp = ts
+        for indicator in self._indicators.values():
+            indicator.update(bar)
+        self.bars_seen += 1
+        return self.values
+
+    def update_many(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed a frame of bars in order and return the per-bar outputs.
+
+        Rows already covered by the state (see ``update``) are dropped from the result.
+        """
+        rows = []
+        index = []
+        frame = bars
+        if isinstance(bars.index, pd.DatetimeIndex) and not {"Date", "date"} & set(bars.columns):
+            frame = bars.assign(Date=bars.index)
+        for record in frame.to_dict("records"):
+            before = self.bars_seen
+            values = self.update(record)
+            if self.bars_seen != before:
+                rows.append(values)
+                index.append(_timestamp(record))
+        return pd.DataFrame(rows, index=index)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of the full engine state."""
+        return {
+            "version": STATE_VERSION,
+            "symbol": self.symbol,
+            "interval": self.interval,
+            "indicators": {key: ind.get_state() for key, ind in self._indicators.items()},
+            "values": {key: ind.values for key, ind in self._indicators.items()},
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            "bars_seen": self.bars_seen,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, state: Mapping[str, Any]) -> "IncrementalIndicatorEngine":
+        """
+        Rebuild an engine from ``checkpoint()`` output.
+
+        Raises:
+            ValueError: if the checkpoint was written by an incompatible state version
+        """
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported indicator state version {state.get('version')!r}")
+        engine = cls(state["symbol"], state["interval"], state["indicators"].keys())
+        for key, ind_state in state["indicators"].items():
+            indicator = engine._indicators[key]
+            indicator.set_state(ind_state)
+            indicator.values = dict(state.get("values", {}).get(key, {}))
+        last = state.get("last_timestamp")
+        engine.last_timestamp = pd.Timestamp(last) if last else None
+        engine.bars_seen = int(state.get("bars_seen", 0))
+        return engine
+
+
+class IndicatorStateStore:
+    """
+    Disk persistence for engine checkpoints, one JSON file per
+    (symbol, interval, indicator set) under ``CACHE_FOLDER/indicator_state``.
+
+    Writes are atomic (tmp + replace) so a concurrent reader never sees a half-written
+    file; unreadable or incompatible files load as ``None`` and get rebuilt.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        if root is None:
+            import ba2_common.config as _cfg  # read at call time so tests that rebind CACHE_FOLDER win
+            root = os.path.join(_cfg.CACHE_FOLDER, "indicator_state")
+        self.root = root
+
+    def path_for(self, symbol: str, interval: str, params_key: str) -> str:
+        return os.path.join(self.root, interval, f"{symbol.upper()}__{params_key}.json")
+
+    def save(self, engine: IncrementalIndicatorEngine) -> str:
+        path = self.path_for(engine.symbol, engine.interval, engine.params_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump(engine.checkpoint(), fh)
+        os.replace(tmp, path)
+        return path
+
+    def load(self, symbol: str, interval: str, indicators: Iterable[str]) -> Optional[IncrementalIndicatorEngine]:
+        params_key = IncrementalIndicatorEngine(symbol, interval, indicators).params_key
+        path = self.path_for(symbol, interval, params_key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as fh:
+                return IncrementalIndicatorEngine.from_checkpoint(json.load(fh))
+        except Exception as e:  # corrupt / partial / old version -> caller rebuilds from history
+            logger.warning(f"Ignoring unreadable indicator state {path}: {e}")
+            return None
+
+    def load_or_create(self, symbol: str, interval: str, indicators: Iterable[str]) -> IncrementalIndicatorEngine:
+        indicators = list(indicators)
+        return self.load(symbol, interval, indicators) or IncrementalIndicatorEngine(symbol, interval, indicators)
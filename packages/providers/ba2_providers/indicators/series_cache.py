@@ -0,0 +1,434 @@
+"""Computed-indicator series cache for ``PandasIndicatorCalc``.
+
+WHY THIS EXISTS. Every ``get_indicator`` call fetched ~a year of warm-up OHLCV and rebuilt
+the stockstats frame from scratch, even when another expert had computed the same
+symbol/indicator seconds earlier, and a backtest stepping one bar forward recomputed the
+whole window for the one new bar.
+
+WHAT IS CACHED. One entry per (symbol, interval, indicator, data-version): the computed
+series (dates + values) from the first request's start date, plus the streaming state of
+``incremental.IncrementalIndicatorEngine`` at its last bar. The data-version is the OHLCV
+provider's name (``get_provider_name()``, or a ``data_version`` attribute when the
+provider declares one), so series computed from different price sources never mix.
+
+  * A request inside the cached range is a HIT: no OHLCV fetch, no recompute.
+  * A request ending after the last cached bar fetches ONLY the bars since then and
+    advances the streaming state over them (an EXTENSION, O(new bars)).
+  * A request starting before the cached range, or a provider whose bars no longer agree
+    with the cached overlap (restated history), is a MISS and recomputes from scratch.
+
+The last cached bar may have been a partial (still-forming) bar. Each extension refetches
+from the bar before it, and if the provider's version of that bar changed the state is
+rewound one bar (the entry keeps the checkpoint taken before its final bar) and the bar
+is replayed.
+
+NO-LOOKAHEAD. A backtest's OHLCV wrapper may cap fetches at its as_of clock. Such a
+provider exposes ``max_end_date()`` and requests are clamped to it before the cache is
+consulted, so a hit never serves bars the provider would not have returned.
+
+BOUNDS. At most ``max_entries`` series (least recently used evicted), each trimmed to
+its newest ``max_bars`` bars. Counters live in ``stats`` (hits / extensions / misses /
+rebuilds / evictions / disk_loads).
+
+PERSISTENCE. ``flush()`` writes changed entries as JSON under
+``CACHE_FOLDER/indicator_series`` (atomic tmp+replace). Evicted entries are flushed, and a
+miss checks disk before recomputing, so a restarted process resumes where it left off.
+The shared default cache persists only when ``config.INDICATOR_SERIES_PERSIST`` is set
+(``BA2_INDICATOR_SERIES_PERSIST=1``), and then also flushes at interpreter exit; otherwise
+it is memory-only, so importers (and test runs) never write to the cache folder.
+"""
+from __future__ import annotations
+
+import atexit
+import bisect
+import hashlib
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ba2_common.logger import logger
+
+from .incremental import IncrementalIndicatorEngine, create_indicator
+
+# Bump when the on-disk entry layout changes; older files are then ignored.
+_DISK_VERSION = 1
+
+_BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def _utc_naive(value: Any) -> pd.Timestamp:
+    """Comparable timestamp: aware values converted to UTC, naive ones taken as UTC."""
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _fingerprint(row: Any) -> List[float]:
+    return [float(row[f]) if f in row else math.nan for f in _BAR_FIELDS]
+
+
+def _same_bar(a: List[float], b: List[float]) -> bool:
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a, b))
+
+
+def provider_data_version(provider: Any) -> str:
+    """Identify the price source behind ``provider`` for cache keying."""
+    version = getattr(provider, "data_version", None)
+    if version is not None:
+        return str(version() if callable(version) else version)
+    get_name = getattr(provider, "get_provider_name", None)
+    if callable(get_name):
+        try:
+            return str(get_name())
+        except Exception:
+            pass
+    return f"{type(provider).__module__}.{type(provider).__qualname__}"
+
+
+@dataclass
+class IndicatorCacheStats:
+    hits: int = 0
+    extensions: int = 0
+    misses: int = 0
+    rebuilds: int = 0
+    evictions: int = 0
+    disk_loads: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of requests served without a full recompute."""
+        total = self.hits + self.extensions + self.misses
+        return (self.hits + self.extensions) / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "extensions": self.extensions, "misses": self.misses,
+                "rebuilds": self.rebuilds, "evictions": self.evictions,
+                "disk_loads": self.disk_loads, "hit_rate": round(self.hit_rate, 4)}
+
+
+@dataclass
+class _Entry:
+    key: Tuple[str, str, str, str]
+    valid_from: pd.Timestamp            # earliest start served (UTC-naive)
+    dates: List[pd.Timestamp]
+    values: List[float]
+    stamps: List[pd.Timestamp]           # dates as UTC-naive, for range lookups
+    engine: IncrementalIndicatorEngine
+    prev_state: Optional[Dict[str, Any]]  # engine checkpoint before the final bar
+    last_bar: List[float]
+    dirty: bool = True
+    frame: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    @property
+    def last_ts(self) -> pd.Timestamp:
+        return self.stamps[-1]
+
+    def to_frame(self, end: pd.Timestamp) -> pd.DataFrame:
+        """The series up to and including ``end`` (UTC-naive)."""
+        if self.frame is None:
+            self.frame = pd.DataFrame({"Date": pd.Series(self.dates), "value": self.values})
+        stop = bisect.bisect_right(self.stamps, end)
+        return self.frame if stop == len(self.stamps) else self.frame.iloc[:stop]
+
+    def append(self, date: Any, value: float) -> None:
+        self.dates.append(date)
+        self.stamps.append(_utc_naive(date))
+        self.values.append(value)
+
+    def pop(self) -> None:
+        self.dates.pop()
+        self.stamps.pop()
+        self.values.pop()
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": _DISK_VERSION,
+            "key": list(self.key),
+            "valid_from": self.valid_from.isoformat(),
+            "dates": [d.isoformat() for d in self.dates],
+            "values": self.values,
+            "engine": self.engine.checkpoint(),
+            "prev_state": self.prev_state,
+            "last_bar": self.last_bar,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "_Entry":
+        if data.get("version") != _DISK_VERSION:
+            raise ValueError(f"unsupported entry version {data.get('version')!r}")
+        dates = list(pd.to_datetime(pd.Series(data["dates"]), format="ISO8601"))
+        return cls(
+            key=tuple(data["key"]),
+            valid_from=pd.Timestamp(data["valid_from"]),
+            dates=dates,
+            values=[float(v) for v in data["values"]],
+            stamps=[_utc_naive(d) for d in dates],
+            engine=IncrementalIndicatorEngine.from_checkpoint(data["engine"]),
+            prev_state=data.get("prev_state"),
+            last_bar=[float(v) for v in data["last_bar"]],
+            dirty=False,
+        )
+
+
+class IndicatorSeriesCache:
+    """
+    Bounded, thread-safe cache of computed indicator series (see module docstring).
+
+    ``get_series`` takes two callbacks so the cache stays independent of how the series
+    is computed:
+
+      * ``compute_fn(start_date, end_date) -> (bars, series)``: full warm-up fetch plus
+        batch computation; ``bars`` is the OHLCV frame used and ``series`` its
+        ``[Date, value]`` indicator frame (same Date dtype as ``bars``).
+      * ``fetch_fn(since, end_date) -> bars``: OHLCV bars from ``since`` to ``end_date``.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bars: int = 10_000,
+                 persist_dir: Optional[str] = None, persist: bool = True):
+        self.max_entries = max_entries
+        self.max_bars = max_bars
+        self.persist = persist
+        self._persist_dir = persist_dir
+        self._entries: "OrderedDict[Tuple[str, str, str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+        self.stats = IndicatorCacheStats()
+
+    # -- public API -------------------------------------------------------------------
+
+    def get_series(self, provider: Any, symbol: str, indicator: str, interval: str,
+                   start_date: datetime, end_date: datetime,
+                   compute_fn: Callable[[datetime, datetime], Tuple[pd.DataFrame, pd.DataFrame]],
+                   fetch_fn: Callable[[datetime, datetime], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Return the ``[Date, value]`` series from (at least) ``start_date`` up to ``end_date``.
+
+        Rows before ``start_date`` may be included; callers slice the start themselves.
+        """
+        try:
+            create_indicator(indicator)
+        except ValueError:
+            # No streaming implementation to extend with: plain recompute, never cached
+            return compute_fn(start_date, end_date)[1]
+
+        cap = getattr(provider, "max_end_date", None)
+        if callable(cap):
+            limit = cap()
+            if limit is not None and _utc_naive(end_date) > _utc_naive(limit):
+                end_date = limit
+
+        key = (symbol.upper(), interval, indicator, provider_data_version(provider))
+        start, end = _utc_naive(start_date), _utc_naive(end_date)
+        with self._key_lock(key):
+            entry = self._get_entry(key)
+            if entry is not None and start >= entry.valid_from:
+                if end <= entry.last_ts:
+                    self.stats.hits += 1
+                    return entry.to_frame(end)
+                if self._extend(entry, fetch_fn, end_date):
+                    self.stats.extensions += 1
+                    self._store(entry)
+                    return entry.to_frame(end)
+                self.stats.rebuilds += 1
+            self.stats.misses += 1
+            entry = self._build(key, start_date, end_date, compute_fn)
+            if entry is None:
+                return compute_fn(start_date, end_date)[1]
+            self._store(entry)
+            return entry.to_frame(end)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (disk files are kept) and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self.stats = IndicatorCacheStats()
+
+    def flush(self) -> int:
+        """Persist changed entries to disk; returns how many were written."""
+        if not self.persist:
+            return 0
+        with self._lock:
+            dirty = [e for e in self._entries.values() if e.dirty]
+        written = 0
+        for entry in dirty:
+            if self._write(entry):
+                written += 1
+        return written
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- internals --------------------------------------------------------------------
+
+    def _key_lock(self, key) -> threading.Lock:
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _get_entry(self, key) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._read(key)
+        if entry is not None:
+            self.stats.disk_loads += 1
+        return entry
+
+    def _store(self, entry: _Entry) -> None:
+        evicted = []
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            while len(self._entries) > self.max_entries:
+                _, old = self._entries.popitem(last=False)
+                self._key_locks.pop(old.key, None)
+                evicted.append(old)
+                self.stats.evictions += 1
+        for old in evicted:
+            if old.dirty and self.persist:
+                self._write(old)
+
+    def _build(self, key, start_date, end_date, compute_fn) -> Optional[_Entry]:
+        bars, series = compute_fn(start_date, end_date)
+        if bars is None or len(bars) == 0 or series is None or len(series) == 0:
+            return None
+        engine = IncrementalIndicatorEngine(key[0], key[1], [key[2]])
+        records = bars.to_dict("records")
+        for record in records[:-1]:
+            engine.update(record)
+        prev_state = engine.checkpoint()
+        engine.update(records[-1])
+        dates = list(series["Date"])
+        entry = _Entry(
+            key=key,
+            valid_from=_utc_naive(start_date),
+            dates=dates,
+            values=[float(v) for v in series["value"]],
+            stamps=[_utc_naive(d) for d in dates],
+            engine=engine,
+            prev_state=prev_state,
+            last_bar=_fingerprint(records[-1]),
+        )
+        self._trim(entry)
+        return entry
+
+    def _extend(self, entry: _Entry, fetch_fn, end_date) -> bool:
+        """Advance ``entry`` to ``end_date``; False when the history no longer lines up."""
+        since = entry.dates[-2] if len(entry.dates) > 1 else entry.dates[-1]
+        bars = fetch_fn(pd.Timestamp(since).to_pydatetime(), end_date)
+        if bars is None or len(bars) == 0:
+            return True  # provider has nothing newer (e.g. capped at its clock)
+        when = pd.to_datetime(bars["Date"])
+        when = when.dt.tz_convert("UTC").dt.tz_localize(None) if when.dt.tz is not None else when
+        last_ts = entry.last_ts
+        overlap = bars[when == last_ts]
+        newer = bars[when > last_ts]
+        if len(newer) == 0 and len(overlap) == 0:
+            return True  # provider's view ends before our last bar (a capped provider)
+        if len(overlap) == 0:
+            return False  # our last bar vanished from the provider: history was restated
+        replay = newer
+        if not _same_bar(_fingerprint(overlap.iloc[-1]), entry.last_bar):
+            # The final bar changed since we consumed it (a partial bar that completed)
+            if entry.prev_state is None:
+                return False
+            entry.engine = IncrementalIndicatorEngine.from_checkpoint(entry.prev_state)
+            entry.pop()
+            replay = pd.concat([overlap.iloc[[-1]], newer])
+        if len(replay) == 0:
+            return True
+
+        indicator = entry.key[2]
+        records = replay.to_dict("records")
+        for i, record in enumerate(records):
+            if i == len(records) - 1:
+                entry.prev_state = entry.engine.checkpoint()
+            values = entry.engine.update(record)
+            entry.append(record["Date"], float(values.get(indicator, math.nan)))
+        entry.last_bar = _fingerprint(records[-1])
+        entry.dirty = True
+        entry.frame = None
+        self._trim(entry)
+        return True
+
+    def _trim(self, entry: _Entry) -> None:
+        excess = len(entry.dates) - self.max_bars
+        if excess > 0:
+            del entry.dates[:excess]
+            del entry.values[:excess]
+            del entry.stamps[:excess]
+            entry.valid_from = max(entry.valid_from, entry.stamps[0])
+            entry.frame = None
+
+    # -- disk -------------------------------------------------------------------------
+
+    def _dir(self) -> str:
+        if self._persist_dir is not None:
+            return self._persist_dir
+        import ba2_common.config as _cfg  # read at call time so tests that rebind CACHE_FOLDER win
+        return os.path.join(_cfg.CACHE_FOLDER, "indicator_series")
+
+    def _path(self, key) -> str:
+        digest = hashlib.sha1(json.dumps(list(key)).encode()).hexdigest()[:12]
+        return os.path.join(self._dir(), f"{key[0]}__{key[1]}__{key[2]}__{digest}.json")
+
+    def _read(self, key) -> Optional[_Entry]:
+        if not self.persist:
+            return None
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as fh:
+                entry = _Entry.from_json(json.load(fh))
+            return entry if entry.key == key else None
+        except Exception as e:  # corrupt / partial / old layout -> recompute
+            logger.warning(f"Ignoring unreadable indicator series cache {path}: {e}")
+            return None
+
+    def _write(self, entry: _Entry) -> bool:
+        path = self._path(entry.key)
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as fh:
+                json.dump(entry.to_json(), fh)
+            os.replace(tmp, path)  # atomic
+            entry.dirty = False
+            return True
+        except Exception as e:  # best-effort: a cache write must never break a request
+            logger.warning(f"Failed to persist indicator series cache {path}: {e}")
+            if tmp and os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            return False
+
+
+# Process-wide cache shared by every PandasIndicatorCalc instance, so experts computing
+# the same symbol/indicator reuse one series.
+_default_cache: Optional[IndicatorSeriesCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_series_cache() -> IndicatorSeriesCache:
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            import ba2_common.config as _cfg
+            _default_cache = IndicatorSeriesCache(persist=_cfg.INDICATOR_SERIES_PERSIST)
+            if _default_cache.persist:
+                atexit.register(_default_cache.flush)
+        return _default_cache
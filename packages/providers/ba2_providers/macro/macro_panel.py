@@ -0,0 +1,299 @@
+"""Point-in-time macro PANEL: every ``fred_series.SERIES_SPEC`` series as one aligned daily table.
+
+``fred_series.get_series_as_of`` re-walks a series' whole cached history on every call. A
+backtest that wants VIX, the curve spread, the credit spread, unemployment, CPI, ... as of each
+bar pays that once per series per bar. The panel pays it once per refresh:
+
+  * one row per calendar day (a "known-on" day), one ``<SID>`` column per series holding the
+    latest observation KNOWN that day, and a ``<SID>__date`` column with that observation's
+    own date. "Known" uses the same cut as ``get_series_as_of``: the first-publication date
+    (``realtime_start``) for vintage series, the observation date for unrevised daily ones, so
+    ``as_of`` on 2024-01-31 still cannot see January's unemployment rate;
+  * built from the FRED JSON cache under ``CACHE_FOLDER/fred`` (the files ``refresh_series``
+    writes -- the panel never touches the network) and stored as ``part-*.parquet`` files plus
+    ``manifest.json`` under ``MACRO_PANEL_DIR``;
+  * refreshed INCREMENTALLY: observations first known after the panel's last day are appended
+    as a new part covering only the new days. A series whose already-panelled history changed
+    (a restated value, a back-filled row, a series added to the spec) forces a full rebuild;
+    the manifest keeps a content digest of each series' panelled observations to tell.
+
+``MacroPanel.as_of`` is a binary search over the day index -- one ``searchsorted`` answers the
+whole row -- and ``MacroPanel.values`` aligns the panel to many bar dates at once.
+
+Nothing reads the panel yet: the prewarm and ``tools/refresh_fred_cache.py`` build it for
+per-bar consumers, while DeterministicScorer needs whole histories (z-scores, trends) for three
+of its four macro inputs and keeps reading ``get_series_as_of``.
+"""
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ba2_common.logger import logger
+from ba2_providers.macro import fred_series
+
+_MANIFEST_NAME = "manifest.json"
+_MANIFEST_VERSION = 2
+# Parts are appended one per incremental refresh; past this many they are merged into one.
+_COMPACT_PARTS = 64
+
+_PANEL_MEMO: Dict[str, "MacroPanel"] = {}
+
+
+def panel_dir() -> str:
+    import ba2_common.config as _cfg
+    return getattr(_cfg, "MACRO_PANEL_DIR", os.path.join(_cfg.CACHE_FOLDER, "macro", "panel"))
+
+
+def _cut(as_of: Any) -> Optional[pd.Timestamp]:
+    # Same normalisation as get_series_as_of: tz-aware as_of compared in UTC wall-clock.
+    if as_of is None:
+        return None
+    cut = pd.Timestamp(as_of)
+    if cut.tz is not None:
+        cut = cut.tz_convert("UTC").tz_localize(None)
+    return cut
+
+
+def _no_observations() -> pd.DataFrame:
+    return pd.DataFrame({"known_on": pd.Series(dtype="datetime64[ns]"),
+                         "date": pd.Series(dtype="datetime64[ns]"),
+                         "value": pd.Series(dtype="float64")})
+
+
+def _observations(series_id: str) -> pd.DataFrame:
+    """The cached observations of one series as ``known_on`` / ``date`` / ``value``, sorted by
+    ``(known_on, date)``. Rows ``get_series_as_of`` would skip (FRED's ``.`` gaps, unparseable
+    dates) are dropped here too."""
+    vintage = fred_series._spec(series_id)["vintage"]
+    rows = pd.DataFrame(fred_series._load(series_id))
+    if rows.empty:
+        return _no_observations()
+    date = pd.to_datetime(rows["date"], errors="coerce")
+    known = pd.to_datetime(rows["realtime_start"], errors="coerce") if vintage else date
+    obs = pd.DataFrame({"known_on": known.dt.normalize(), "date": date,
+                        "value": pd.to_numeric(rows["value"], errors="coerce")}).dropna()
+    return obs.sort_values(["known_on", "date"], kind="stable").reset_index(drop=True)
+
+
+def _digest(obs: pd.DataFrame) -> str:
+    """Content hash of observations (``known_on`` / ``date`` / ``value`` rows, in order)."""
+    hashed = pd.util.hash_pandas_object(obs[["known_on", "date", "value"]], index=False)
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()
+
+
+def _latest_known(obs: pd.DataFrame) -> pd.DataFrame:
+    """Per known-on day, the newest observation known by then (``date``, ``value``). A late
+    release of an OLDER observation never replaces a newer one -- ``get_series_as_of(...)
+    .iloc[-1]`` is the newest observation date, not the most recently published row."""
+    newest = obs["date"].cummax()
+    latest = obs[obs["date"] >= newest]
+    return latest.groupby("known_on")[["date", "value"]].last()
+
+
+def _frame(events: Dict[str, pd.DataFrame], days: pd.DatetimeIndex) -> pd.DataFrame:
+    """Panel rows for ``days``: every series' latest-known observation carried forward. Events
+    before ``days[0]`` seed the first row, so an appended part continues the stored one."""
+    cols: Dict[str, Any] = {"day": days}
+    for sid, ev in events.items():
+        aligned = ev.reindex(ev.index.union(days)).ffill().reindex(days)
+        cols[sid] = aligned["value"].to_numpy(dtype="float64")
+        cols[f"{sid}__date"] = aligned["date"].to_numpy(dtype="datetime64[ns]")
+    return pd.DataFrame(cols)
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """The panel manifest (empty when missing, unreadable or from another version -- the next
+    refresh is then a full rebuild)."""
+    try:
+        with open(os.path.join(path, _MANIFEST_NAME)) as f:
+            man = json.load(f)
+        if man.get("version") == _MANIFEST_VERSION and isinstance(man.get("series"), dict):
+            return man
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # noqa: BLE001 — a corrupt manifest costs a full rebuild
+        logger.warning(f"macro-panel: ignoring unreadable manifest in {path} ({e})")
+    return {"version": _MANIFEST_VERSION, "series": {}, "parts": [], "end": None}
+
+
+def _write_part(path: str, rows: pd.DataFrame) -> str:
+    # Names sort chronologically (first day first); the ns stamp keeps a rebuild from
+    # overwriting a part the current manifest still lists.
+    name = f"part-{rows['day'].iloc[0]:%Y%m%d}-{time.time_ns()}.parquet"
+    tmp = os.path.join(path, f"{name}.{os.getpid()}.tmp")
+    rows.to_parquet(tmp, index=False)
+    os.replace(tmp, os.path.join(path, name))
+    return name
+
+
+def _write_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    tmp = os.path.join(path, f"{_MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(path, _MANIFEST_NAME))
+
+
+def _drop_unlisted(path: str, parts: List[str]) -> None:
+    # Only after the manifest naming the survivors is in place: a crash before this leaves
+    # orphan files, never a manifest pointing at missing ones.
+    for p in glob.glob(os.path.join(path, "part-*.parquet")):
+        if os.path.basename(p) not in parts:
+            os.remove(p)
+
+
+def refresh_panel(path: Optional[str] = None, series: Optional[Iterable[str]] = None,
+                  full: bool = False) -> Dict[str, Any]:
+    """Bring the panel in ``path`` (default ``MACRO_PANEL_DIR``) up to date with the FRED cache.
+
+    ``series`` defaults to every id in ``SERIES_SPEC``; a series whose cache file is missing is
+    left as an all-NaN column (and reported under ``missing``) rather than failing the others.
+    Appends only the days after the stored panel's last day unless ``full`` or the stored
+    history no longer matches the cache. Returns stats (``mode`` is ``"append"``, ``"rebuild"``
+    or ``"unchanged"``).
+    """
+    path = path or panel_dir()
+    os.makedirs(path, exist_ok=True)
+    wanted = sorted(s.upper() for s in (series or fred_series.SERIES_SPEC))
+    manifest = load_manifest(path)
+    stored: Dict[str, Any] = manifest["series"]
+
+    observations: Dict[str, pd.DataFrame] = {}
+    missing: List[str] = []
+    for sid in wanted:
+        try:
+            observations[sid] = _observations(sid)
+        except FileNotFoundError:
+            missing.append(sid)
+            observations[sid] = _no_observations()
+    if missing:
+        logger.warning(f"macro-panel: no FRED cache for {missing}; their columns stay empty")
+
+    end = pd.Timestamp(manifest["end"]) if manifest.get("end") else None
+    reason = "requested" if full else None
+    if reason is None and (end is None or sorted(stored) != wanted
+                           or not all(os.path.exists(os.path.join(path, p)) for p in manifest["parts"])):
+        reason = "no usable panel" if end is None else "series or parts changed"
+    if reason is None:
+        # The already-panelled history must be exactly what was panelled: the same rows (by
+        # content) up to each series' last known-on day, and nothing new known on/before the
+        # panel's end.
+        for sid, obs in observations.items():
+            through = stored[sid].get("known_through")
+            panelled = (obs["known_on"] <= pd.Timestamp(through)) if through \
+                else pd.Series(False, index=obs.index)
+            if int(panelled.sum()) != stored[sid].get("rows", 0) \
+                    or _digest(obs[panelled]) != stored[sid].get("digest") \
+                    or bool(((obs["known_on"] <= end) & ~panelled).any()):
+                reason = f"{sid} history changed"
+                break
+
+    known = [obs["known_on"].max() for obs in observations.values() if len(obs)]
+    new_end = max(known) if known else None
+    events = {sid: _latest_known(obs) for sid, obs in observations.items()}
+    series_meta = {sid: {"rows": int(len(obs)), "digest": _digest(obs),
+                         "vintage": bool(fred_series._spec(sid)["vintage"]),
+                         "known_through": f"{obs['known_on'].max():%Y-%m-%d}" if len(obs) else None}
+                   for sid, obs in observations.items()}
+
+    if new_end is None:
+        mode, parts, added = "unchanged", [], 0
+    elif reason is not None:
+        starts = [obs["known_on"].min() for obs in observations.values() if len(obs)]
+        rows = _frame(events, pd.date_range(min(starts), new_end, freq="D"))
+        parts, mode, added = [_write_part(path, rows)], "rebuild", len(rows)
+        logger.info(f"macro-panel: full rebuild of {path} ({reason})")
+    elif new_end <= end:
+        mode, parts, added = "unchanged", list(manifest["parts"]), 0
+    else:
+        rows = _frame(events, pd.date_range(end + pd.Timedelta(days=1), new_end, freq="D"))
+        parts, mode, added = list(manifest["parts"]) + [_write_part(path, rows)], "append", len(rows)
+
+    if mode == "append" and len(parts) > _COMPACT_PARTS:
+        merged = pd.concat((pd.read_parquet(os.path.join(path, p)) for p in parts), ignore_index=True)
+        parts = [_write_part(path, merged)]
+
+    if mode != "unchanged":
+        _write_manifest(path, {
+            "version": _MANIFEST_VERSION, "built_at": datetime.now().isoformat(timespec="seconds"),
+            "series": series_meta, "parts": parts, "end": f"{new_end:%Y-%m-%d}"})
+        _drop_unlisted(path, parts)
+    _PANEL_MEMO.pop(os.path.abspath(path), None)
+    stats = {"mode": mode, "days_added": added, "parts": len(parts),
+             "end": f"{new_end:%Y-%m-%d}" if new_end is not None else None, "missing": missing}
+    logger.info(f"macro-panel: refreshed {path}: {stats}")
+    return stats
+
+
+class MacroPanel:
+    """A loaded panel: O(log n) as-of rows over every series at once."""
+
+    def __init__(self, rows: pd.DataFrame, series: List[str]):
+        self.series = list(series)
+        self.days = rows["day"].to_numpy(dtype="datetime64[ns]")
+        self._values = rows[self.series].to_numpy(dtype="float64") if self.series \
+            else np.empty((len(rows), 0))
+        self._dates = rows[[f"{sid}__date" for sid in self.series]].to_numpy(dtype="datetime64[ns]") \
+            if self.series else np.empty((len(rows), 0), dtype="datetime64[ns]")
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "MacroPanel":
+        """Load the panel in ``path`` (default ``MACRO_PANEL_DIR``), memoised per process
+        (``refresh_panel`` drops the memo in its own process; others call ``clear_panel_memo``)."""
+        path = path or panel_dir()
+        key = os.path.abspath(path)
+        hit = _PANEL_MEMO.get(key)
+        if hit is None:
+            manifest = load_manifest(path)
+            if not manifest["parts"]:
+                raise FileNotFoundError(
+                    f"no macro panel in {path}. Run tools/refresh_fred_cache.py (it refreshes the "
+                    f"panel after the series) before reading macro rows.")
+            rows = pd.concat((pd.read_parquet(os.path.join(path, p)) for p in manifest["parts"]),
+                             ignore_index=True)
+            hit = cls(rows, sorted(manifest["series"]))
+            _PANEL_MEMO[key] = hit
+        return hit
+
+    def _index(self, cut: Optional[pd.Timestamp]) -> int:
+        """Row of the last day on/before ``cut`` (-1 before the panel starts)."""
+        if cut is None:
+            return len(self.days) - 1
+        return int(np.searchsorted(self.days, cut.to_datetime64(), side="right")) - 1
+
+    def as_of(self, as_of: Any = None, series: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """One row per series (index) with the latest ``value`` known at ``as_of`` and its
+        observation ``date`` -- ``get_series_as_of(sid, as_of)``'s last point, for every series
+        in one lookup. ``as_of=None`` is the latest row; NaN/NaT where nothing was known yet."""
+        cols = list(range(len(self.series))) if series is None \
+            else [self.series.index(s.upper()) for s in series]
+        i = self._index(_cut(as_of))
+        names = [self.series[c] for c in cols]
+        if i < 0:
+            return pd.DataFrame({"value": np.nan, "date": pd.NaT}, index=pd.Index(names, name="series"))
+        return pd.DataFrame({"value": self._values[i, cols], "date": self._dates[i, cols]},
+                            index=pd.Index(names, name="series"))
+
+    def values(self, dates: Iterable[Any], series: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """The panel aligned to many ``dates`` at once (index ``dates``, one column per series):
+        each row is ``as_of(date)``'s values, from one vectorised search."""
+        idx = pd.DatetimeIndex([_cut(d) for d in dates])
+        cols = list(range(len(self.series))) if series is None \
+            else [self.series.index(s.upper()) for s in series]
+        pos = np.searchsorted(self.days, idx.to_numpy(dtype="datetime64[ns]"), side="right") - 1
+        out = np.full((len(pos), len(cols)), np.nan)
+        ok = pos >= 0
+        out[ok] = self._values[np.ix_(pos[ok], cols)]
+        return pd.DataFrame(out, index=idx, columns=[self.series[c] for c in cols])
+
+
+def clear_panel_memo() -> None:
+    _PANEL_MEMO.clear()
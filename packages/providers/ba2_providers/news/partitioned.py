@@ -0,0 +1,385 @@
+"""Date-partitioned layout of the scored news tier, for window and cross-symbol queries.
+
+The per-symbol layout (``store.scored_path``) answers "all news for NVDA" with one file,
+but "all scored news for a 300-symbol universe on 2024-06-03" opens 300 files and filters
+each one in memory. This layout stores the SAME rows (``SCORED_COLUMNS`` + ``symbol``) as
+one parquet per calendar month of ``published_at``:
+
+    <CACHE_FOLDER>/news/_partitions/
+        2024-06.parquet       rows sorted by (symbol, published_at) in small row groups
+        _index.parquet        symbol/date index: symbol, partition, rows, first, last
+        _keys.parquet         dedup key index:   symbol, url_hash, model, partition
+        _covered.parquet      every symbol with a scored file, including ones with no rows
+
+It sits under the scored tier like the text-score cache: a directory, so ``covered_symbols``
+never counts it, and inside ``CACHE_FOLDER``, so it syncs to workers. It holds scores only,
+never article text.
+
+QUERIES. ``read_window`` takes a point-in-time window and a list of symbols. The symbol/date
+index picks the partitions that hold those symbols AND overlap the window. Each partition is
+then read ONCE with the symbol and time predicates pushed down to parquet, so row groups
+outside them are skipped on disk. The contract is ``store.read_sentiment``'s: rows with
+``published_at`` in ``(as_of - window_days, as_of]``, a missing layout or an uncovered symbol
+raises ``NewsStoreError``, and a covered symbol with a quiet window comes back empty.
+Coverage comes from ``_covered.parquet``, not the index: a symbol whose scored file exists
+but is empty has no index rows and must still read as covered-and-quiet.
+
+WRITES. One article can be tagged for several symbols and scored by several models, so the
+dedup key is ``(symbol, url_hash, model)``. ``upsert_rows`` uses the key index to find every
+partition that already holds an incoming key (a vendor may re-stamp ``published_at`` across a
+month boundary), drops the old copies, and rewrites only the touched partitions. Each file is
+replaced via tmp+replace. The index files are written last, and ``rebuild_index`` recovers
+them from the partitions if a crash lands in between. The whole read-modify-write holds a
+file lock (``_partitions/.write.lock``), so concurrent writers serialise instead of
+dropping each other's index rows.
+
+Built once from the per-symbol files by ``migrate_from_per_symbol``
+(``tools/migrate_news_partitions.py``). From then on ``store.write_scored`` mirrors every
+write here, so the two layouts cannot drift. A write rewrites every month the symbol
+touches, so scoring passes go through ``store.upsert_scored_many``, which mirrors a whole
+batch of symbols in one ``upsert_rows``.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from ba2_common.logger import logger
+
+from ba2_providers.news import store as _store
+from ba2_providers.news.store import SCORED_COLUMNS, NewsStoreError
+
+PARTITION_COLUMNS = ["symbol"] + SCORED_COLUMNS
+KEY_COLUMNS = ["symbol", "url_hash", "model"]
+INDEX_COLUMNS = ["symbol", "partition", "rows", "first", "last"]
+KEYS_INDEX_COLUMNS = KEY_COLUMNS + ["partition"]
+_PARTITION_DIR = "_partitions"
+_INDEX_FILE = "_index.parquet"
+_KEYS_FILE = "_keys.parquet"
+_COVERED_FILE = "_covered.parquet"
+_LOCK_FILE = ".write.lock"  # .lock is skipped by cache_sync.build_manifest
+# Small row groups are what make the symbol predicate useful: a group's min/max symbol
+# statistics then span a handful of symbols, so a universe query skips most of a month.
+_ROW_GROUP_SIZE = 4096
+
+_lock = threading.Lock()
+_write_guard = threading.Lock()
+# index file -> (mtime_ns, frame); reloaded when another process rewrites it
+_index_memo: Dict[str, tuple] = {}
+
+
+def partitioned_folder() -> str:
+    """Resolved per call, like the rest of the store (tests rebind CACHE_FOLDER)."""
+    return os.path.join(_store.scored_folder(), _PARTITION_DIR)
+
+
+def exists() -> bool:
+    """True once the layout has been built (by the migration)."""
+    return os.path.exists(os.path.join(partitioned_folder(), _INDEX_FILE))
+
+
+def partition_of(ts) -> str:
+    return pd.Timestamp(ts).strftime("%Y-%m")
+
+
+def _partition_path(partition: str) -> str:
+    return os.path.join(partitioned_folder(), f"{partition}.parquet")
+
+
+def reset_cache() -> None:
+    with _lock:
+        _index_memo.clear()
+
+
+def _naive(ts) -> Optional[pd.Timestamp]:
+    if ts is None:
+        return None
+    cut = pd.Timestamp(ts)
+    return cut.tz_localize(None) if cut.tz is not None else cut
+
+
+# --- index files ----------------------------------------------------------------------
+
+def _load(name: str, columns: Sequence[str]) -> pd.DataFrame:
+    path = os.path.join(partitioned_folder(), name)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return pd.DataFrame(columns=list(columns))
+    with _lock:
+        hit = _index_memo.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    df = pd.read_parquet(path)
+    with _lock:
+        _index_memo[path] = (mtime, df)
+    return df
+
+
+def load_index() -> pd.DataFrame:
+    """Symbol/date index: one row per (symbol, partition) with its row count and time range."""
+    return _load(_INDEX_FILE, INDEX_COLUMNS)
+
+
+def load_key_index() -> pd.DataFrame:
+    """Dedup key index: which partition holds each ``(symbol, url_hash, model)``."""
+    return _load(_KEYS_FILE, KEYS_INDEX_COLUMNS)
+
+
+def load_covered() -> pd.DataFrame:
+    """Every symbol whose scored rows (possibly none) have been written to the layout."""
+    return _load(_COVERED_FILE, ["symbol"])
+
+
+def covered_symbols() -> List[str]:
+    # The index union keeps layouts built before the covered list existed readable.
+    return sorted(set(load_covered()["symbol"]) | set(load_index()["symbol"]))
+
+
+@contextmanager
+def _write_lock():
+    """Serialise layout writers across threads and processes (advisory, on a side file)."""
+    folder = partitioned_folder()
+    os.makedirs(folder, exist_ok=True)
+    with _write_guard, open(os.path.join(folder, _LOCK_FILE), "a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _atomic_parquet(df: pd.DataFrame, path: str, **kw) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    df.to_parquet(tmp, index=False, **kw)
+    os.replace(tmp, path)
+
+
+def _partition_entries(partition: str, df: pd.DataFrame):
+    """(index rows, key rows) describing one partition's content."""
+    if df.empty:
+        return (pd.DataFrame(columns=INDEX_COLUMNS), pd.DataFrame(columns=KEYS_INDEX_COLUMNS))
+    grouped = df.groupby("symbol", sort=True)["published_at"]
+    idx = pd.DataFrame({"rows": grouped.size(), "first": grouped.min(),
+                        "last": grouped.max()}).reset_index()
+    idx.insert(1, "partition", partition)
+    keys = df.loc[:, KEY_COLUMNS].assign(partition=partition)
+    return idx.loc[:, INDEX_COLUMNS], keys.loc[:, KEYS_INDEX_COLUMNS]
+
+
+def _write_indexes(index: pd.DataFrame, keys: pd.DataFrame, covered: Iterable[str]) -> None:
+    folder = partitioned_folder()
+    _atomic_parquet(pd.DataFrame({"symbol": sorted(set(covered))}, dtype=object),
+                    os.path.join(folder, _COVERED_FILE))
+    _atomic_parquet(keys.reset_index(drop=True), os.path.join(folder, _KEYS_FILE))
+    # The index goes last: its presence is what ``exists()`` reports.
+    _atomic_parquet(index.sort_values(["symbol", "partition"]).reset_index(drop=True),
+                    os.path.join(folder, _INDEX_FILE))
+
+
+def rebuild_index() -> int:
+    """Recompute the index files from the partition files; returns the row count. The covered
+    list keeps its symbols (an empty symbol leaves no trace in the partitions)."""
+    with _write_lock():
+        return _rebuild_index()
+
+
+def _rebuild_index() -> int:
+    folder = partitioned_folder()
+    idx_parts, key_parts = [], []
+    if os.path.isdir(folder):
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".parquet") and not name.startswith("_"):
+                part = name[:-8]
+                i, k = _partition_entries(part, pd.read_parquet(_partition_path(part)))
+                idx_parts.append(i)
+                key_parts.append(k)
+    index = pd.concat(idx_parts, ignore_index=True) if idx_parts else pd.DataFrame(columns=INDEX_COLUMNS)
+    keys = pd.concat(key_parts, ignore_index=True) if key_parts else pd.DataFrame(columns=KEYS_INDEX_COLUMNS)
+    _write_indexes(index, keys, set(load_covered()["symbol"]) | set(index["symbol"]))
+    return int(index["rows"].sum()) if len(index) else 0
+
+
+# --- writes ---------------------------------------------------------------------------
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    missing = [c for c in PARTITION_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Refusing to write news partitions: missing columns {missing}")
+    out = df.loc[:, PARTITION_COLUMNS].copy()
+    out["symbol"] = [_store._norm_symbol(s) for s in out["symbol"]]
+    out["published_at"] = pd.to_datetime(out["published_at"], errors="coerce")
+    if out["published_at"].isna().any():
+        n = int(out["published_at"].isna().sum())
+        raise ValueError(f"Refusing to write news partitions: {n} rows have an unparseable published_at")
+    if out["published_at"].dt.tz is not None:
+        out["published_at"] = out["published_at"].dt.tz_localize(None)
+    return out.drop_duplicates(KEY_COLUMNS, keep="last")
+
+
+def upsert_rows(df: pd.DataFrame, replace_symbols: Optional[Iterable[str]] = None) -> int:
+    """Merge scored rows (``SCORED_COLUMNS`` + ``symbol``) into the partitions.
+
+    Rows replace existing rows with the same ``(symbol, url_hash, model)`` key wherever those
+    live. With ``replace_symbols``, every existing row of those symbols is dropped first, which
+    is ``store.write_scored``'s whole-symbol semantics; those symbols are covered even when
+    they end up with no rows. Only the touched partitions are rewritten, under the write lock.
+    Returns the number of rows written.
+    """
+    with _write_lock():
+        return _upsert_rows(df, replace_symbols)
+
+
+def _upsert_rows(df: pd.DataFrame, replace_symbols: Optional[Iterable[str]]) -> int:
+    new = _prepare(df)
+    replace = {_store._norm_symbol(s) for s in (replace_symbols or [])}
+    with _lock:
+        _index_memo.clear()  # re-read the indexes from disk under the write
+    index, keys = load_index(), load_key_index()
+    covered = set(covered_symbols()) | replace | set(new["symbol"])
+
+    new["partition"] = new["published_at"].map(partition_of)
+    touched = set(new["partition"])
+    if replace:
+        touched |= set(index.loc[index["symbol"].isin(replace), "partition"])
+    stale = pd.Series(False, index=keys.index)
+    if len(keys) and len(new):
+        stale = pd.MultiIndex.from_frame(keys[KEY_COLUMNS]).isin(
+            pd.MultiIndex.from_frame(new[KEY_COLUMNS]))
+        touched |= set(keys.loc[stale, "partition"])
+
+    new_keys = pd.MultiIndex.from_frame(new[KEY_COLUMNS]) if len(new) else None
+    idx_parts, key_parts = [], []
+    for part in sorted(touched):
+        path = _partition_path(part)
+        old = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(columns=PARTITION_COLUMNS)
+        keep = pd.Series(True, index=old.index)
+        if len(old) and replace:
+            keep &= ~old["symbol"].isin(replace)
+        if len(old) and new_keys is not None:
+            keep &= ~pd.MultiIndex.from_frame(old[KEY_COLUMNS]).isin(new_keys)
+        add = new.loc[new["partition"] == part, PARTITION_COLUMNS]
+        frames = [f for f in (old.loc[keep.to_numpy(), PARTITION_COLUMNS], add) if len(f)]
+        merged = (pd.concat(frames, ignore_index=True) if frames
+                  else pd.DataFrame(columns=PARTITION_COLUMNS))
+        if merged.empty:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        merged["published_at"] = pd.to_datetime(merged["published_at"])
+        merged = merged.sort_values(["symbol", "published_at"], kind="mergesort").reset_index(drop=True)
+        _atomic_parquet(merged, path, row_group_size=_ROW_GROUP_SIZE)
+        i, k = _partition_entries(part, merged)
+        idx_parts.append(i)
+        key_parts.append(k)
+
+    index = pd.concat([index[~index["partition"].isin(touched)], *idx_parts], ignore_index=True)
+    keys = pd.concat([keys[~keys["partition"].isin(touched)], *key_parts], ignore_index=True)
+    _write_indexes(index.loc[:, INDEX_COLUMNS], keys.loc[:, KEYS_INDEX_COLUMNS], covered)
+    return len(new)
+
+
+# --- reads ----------------------------------------------------------------------------
+
+def read_window(symbols: Iterable[str], as_of: Optional[datetime] = None,
+                window_days: Optional[int] = None, model: Optional[str] = None) -> pd.DataFrame:
+    """Scored rows for ``symbols`` published in ``(as_of - window_days, as_of]``.
+
+    One parquet scan per partition that the symbol/date index says can contribute, with the
+    symbol, model and time predicates pushed down. Returns ``PARTITION_COLUMNS`` sorted by
+    (symbol, published_at). Absence semantics match ``store.read_sentiment``.
+    """
+    syms = sorted({_store._norm_symbol(s) for s in symbols})
+    if not exists():
+        raise NewsStoreError(
+            f"The partitioned news store at {partitioned_folder()} has not been built. "
+            f"Run tools/migrate_news_partitions.py once.")
+    index = load_index()
+    uncovered = sorted(set(syms) - set(covered_symbols()))
+    if uncovered:
+        raise NewsStoreError(
+            f"News is enabled but {', '.join(uncovered[:10])} "
+            f"{'is' if len(uncovered) == 1 else 'are'} not in the news store "
+            f"({len(uncovered)} uncovered). Restrict the universe or disable news.")
+
+    hi = _naive(as_of)
+    lo = hi - timedelta(days=int(window_days)) if hi is not None and window_days is not None else None
+    sel = index[index["symbol"].isin(syms)]
+    if hi is not None:
+        sel = sel[sel["first"] <= hi]
+    if lo is not None:
+        sel = sel[sel["last"] > lo]
+
+    filters = [("symbol", "in", syms)]
+    if model is not None:
+        filters.append(("model", "==", model))
+    if hi is not None:
+        filters.append(("published_at", "<=", hi))
+    if lo is not None:
+        filters.append(("published_at", ">", lo))
+
+    frames = [pd.read_parquet(_partition_path(part), filters=filters)
+              for part in sorted(sel["partition"].unique())]
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "published_at" else object)
+                             for c in PARTITION_COLUMNS})
+    out = pd.concat(frames, ignore_index=True).loc[:, PARTITION_COLUMNS]
+    out["published_at"] = pd.to_datetime(out["published_at"])
+    return out.sort_values(["symbol", "published_at"], kind="mergesort").reset_index(drop=True)
+
+
+def read_symbol(symbol: str, as_of: Optional[datetime] = None,
+                window_days: Optional[int] = None, model: Optional[str] = None) -> pd.DataFrame:
+    """``store.read_sentiment``'s frame (``SCORED_COLUMNS``, by time) from the partitions."""
+    df = read_window([symbol], as_of, window_days, model)
+    return df.loc[:, SCORED_COLUMNS].sort_values("published_at", kind="mergesort").reset_index(drop=True)
+
+
+# --- migration ------------------------------------------------------------------------
+
+def migrate_from_per_symbol(symbols: Optional[Iterable[str]] = None,
+                            batch_symbols: int = 200) -> Dict[str, int]:
+    """Load the per-symbol scored files into the partitions (idempotent, re-runnable).
+
+    Each symbol's partitioned rows are REPLACED by its file's rows, so re-running after a
+    crash or over an already-migrated symbol converges on the per-symbol content. Symbols go
+    in batches to bound memory, and a month file is rewritten once per batch. Returns counts,
+    and raises if the partitioned row count of a migrated symbol disagrees with its file.
+    """
+    todo = sorted({_store._norm_symbol(s) for s in symbols}) if symbols else _store.covered_symbols()
+    expected: Dict[str, int] = {}
+    for i in range(0, len(todo), max(1, int(batch_symbols))):
+        batch = todo[i: i + batch_symbols]
+        frames = []
+        for sym in batch:
+            df = pd.read_parquet(_store.scored_path(sym))
+            expected[sym] = int(len(df.drop_duplicates(["url_hash", "model"])))
+            frames.append(df.assign(symbol=sym))
+        merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PARTITION_COLUMNS)
+        upsert_rows(merged, replace_symbols=batch)
+        logger.info(f"news partitions: migrated {min(i + batch_symbols, len(todo))}/{len(todo)} symbols")
+
+    index = load_index()
+    got = index.groupby("symbol")["rows"].sum()
+    bad = {s: (n, int(got.get(s, 0))) for s, n in expected.items() if int(got.get(s, 0)) != n}
+    if bad:
+        raise NewsStoreError(f"Partition migration row-count mismatch (expected, got): {bad}")
+    return {"symbols": len(todo), "rows": int(sum(expected.values())),
+            "partitions": int(index["partition"].nunique()) if len(index) else 0}
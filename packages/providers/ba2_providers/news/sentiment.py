@@ -24,6 +24,15 @@ both capped low here because this runs alongside a GA grid that is already near
 machine's memory ceiling. The news substrate is headline + summary (~250-650 characters,
 well under 160 tokens), so a 256-token cap truncates almost nothing.
 
+BATCHING AND CACHING. Batches are sized by token budget, not row count (``token_batches``):
+the texts are tokenized once, sorted by length, and packed so every padded batch stays
+within ``batch_size x max_length`` tokens -- the same ceiling as before, but short headlines
+share a forward pass many at a time. ``Scorer`` keeps one model loaded across calls for
+long-lived callers. ``score_texts_cached`` puts a persistent cache in front of it, keyed by
+text hash and ``model_version`` and stored beside the news store's scored tier
+(``store.read_text_scores``), so a text is scored once per model however many dataset
+builds, backtests or store re-scores ask for it.
+
 THE ``score`` COLUMN. For every model scored here, ``score = pos - neg`` -- signed
 sentiment in [-1, +1]. Note this differs from the migrated ``finbert-legacy`` rows, where
 the ML platform stored the winning class's CONFIDENCE instead. Nothing computes on
@@ -122,96 +131,226 @@ def _softmax(x: np.ndarray) -> np.ndarray:
     return e / e.sum(axis=1, keepdims=True)
 
 
+def model_key_for(name: str) -> Optional[str]:
+    """Registry key for a key or Hugging Face id (``ProsusAI/finbert`` -> ``finbert``)."""
+    if name in MODELS:
+        return name
+    for key, spec in MODELS.items():
+        if spec["hf"] == name:
+            return key
+    return None
+
+
+def model_version(model: str, max_length: int = 256) -> str:
+    """Score-cache key for a model: registry key, checkpoint revision and truncation length
+    (a different ``max_length`` can change the score of a long text)."""
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}. Known: {available_models()}")
+    return f"{model}@{MODELS[model].get('revision', 'main')}.L{int(max_length)}"
+
+
+def token_batches(lengths: Sequence[int], max_tokens: int, max_rows: int) -> List[np.ndarray]:
+    """Group row positions into batches by PADDED size rather than by count.
+
+    Rows are ordered by token length, and a batch grows until ``rows x longest row`` would
+    exceed ``max_tokens`` (or it reaches ``max_rows``). Activation memory and compute follow
+    the padded size, so with ``max_tokens = batch_size x max_length`` the peak never exceeds
+    a fixed ``batch_size`` batch of full-length rows -- while 40-token headlines go through
+    several times as many per forward pass.
+    """
+    order = np.argsort(np.asarray(lengths, dtype=np.int64), kind="stable")
+    batches: List[np.ndarray] = []
+    cur: List[int] = []
+    for i in order:
+        width = max(1, int(lengths[i]))                # ascending: this row is the longest
+        if cur and ((len(cur) + 1) * width > max_tokens or len(cur) >= max_rows):
+            batches.append(np.asarray(cur, dtype=np.int64))
+            cur = []
+        cur.append(int(i))
+    if cur:
+        batches.append(np.asarray(cur, dtype=np.int64))
+    return batches
+
+
+class Scorer:
+    """One model loaded for repeated scoring (``score_texts`` is the load/score/free wrapper).
+
+    Long-lived callers (the ML platform's ``SentimentService``) keep one of these resident
+    instead of reloading the weights for every ticker. Batches are sized by token budget
+    (``token_batches``): ``max_batch_tokens`` defaults to ``batch_size x max_length``, so
+    peak memory matches the old fixed-size batches.
+    """
+
+    def __init__(self, model: str = "finbert", batch_size: int = 32, max_length: int = 256,
+                 threads: Optional[int] = None, max_batch_tokens: Optional[int] = None,
+                 max_batch_rows: int = 256, progress_every: int = 20000):
+        if model not in MODELS:
+            raise ValueError(f"Unknown model {model!r}. Known: {available_models()}")
+        self.model = model
+        self.max_length = int(max_length)
+        self.threads = threads
+        self.max_batch_tokens = int(max_batch_tokens or batch_size * max_length)
+        self.max_batch_rows = int(max_batch_rows)
+        self.progress_every = progress_every
+        self._tok = None
+        self._mdl = None
+        self._lab: Dict[str, int] = {}
+
+    @property
+    def version(self) -> str:
+        return model_version(self.model, self.max_length)
+
+    def load(self) -> "Scorer":
+        if self._mdl is not None:
+            return self
+        hf_id = MODELS[self.model]["hf"]
+        # Imported HERE, not at module scope -- see the module docstring.
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        if self.threads:
+            torch.set_num_threads(int(self.threads))
+
+        logger.info("Loading %s (%s)", self.model, hf_id)
+        tok_cls = MODELS[self.model].get("tokenizer")
+        if tok_cls:
+            import transformers
+            tok = getattr(transformers, str(tok_cls)).from_pretrained(hf_id)
+        else:
+            tok = AutoTokenizer.from_pretrained(hf_id)
+        mdl_cls = MODELS[self.model].get("model")
+        if mdl_cls:
+            import transformers
+            mdl = getattr(transformers, str(mdl_cls)).from_pretrained(hf_id)
+        else:
+            mdl = AutoModelForSequenceClassification.from_pretrained(hf_id)
+        mdl.eval()
+        self._tok, self._mdl = tok, mdl
+        self._lab = _resolve_label_map(mdl.config.id2label)
+
+        # Sign probe before any real work, so a bad mapping fails in one batch, not after
+        # scoring 131k rows into a silently inverted column.
+        probe = self._run(self._tok([_PROBE], truncation=True, max_length=self.max_length))[0]
+        lab = self._lab
+        if probe[lab["neg"]] <= probe[lab["pos"]]:
+            self.close()
+            raise ValueError(
+                f"{self.model}: label mapping failed its sign probe "
+                f"(pos={probe[lab['pos']]:.3f} neg={probe[lab['neg']]:.3f} on a clearly "
+                f"negative sentence). Refusing to score with an inverted mapping.")
+        logger.info("%s label map verified: %s", self.model, lab)
+        return self
+
+    def _run(self, features) -> np.ndarray:
+        import torch
+
+        enc = self._tok.pad(features, padding=True, return_tensors="pt")
+        with torch.inference_mode():
+            logits = self._mdl(**enc).logits.detach().cpu().numpy()
+        return _softmax(logits)
+
+    def __call__(self, texts: Sequence[str]) -> pd.DataFrame:
+        """Score ``texts``. Returns columns pos, neu, neg, score aligned 1:1 with the input;
+        empty/blank texts are scored as fully neutral rather than dropped."""
+        self.load()
+        lab = self._lab
+        n = len(texts)
+        pos = np.zeros(n, dtype=np.float32)
+        neu = np.zeros(n, dtype=np.float32)
+        neg = np.zeros(n, dtype=np.float32)
+
+        clean_idx = np.array([i for i, t in enumerate(texts) if isinstance(t, str) and t.strip()],
+                             dtype=np.int64)
+        # Blank/missing text scores as fully neutral, keeping the frame aligned 1:1 with
+        # the input. Marked by difference against the scored indices rather than by scanning.
+        scored_idx = np.zeros(n, dtype=bool)
+        scored_idx[clean_idx] = True
+        neu[~scored_idx] = 1.0
+        blank = int((~scored_idx).sum())
+
+        if len(clean_idx):
+            # Tokenized once, unpadded; each batch is padded only to its own longest row.
+            enc = self._tok([texts[i] for i in clean_idx], truncation=True,
+                            max_length=self.max_length)
+            keys = list(enc.keys())
+            lengths = [len(ids) for ids in enc["input_ids"]]
+            done = 0
+            for batch in token_batches(lengths, self.max_batch_tokens, self.max_batch_rows):
+                probs = self._run({k: [enc[k][j] for j in batch] for k in keys})
+                rows = clean_idx[batch]
+                pos[rows] = probs[:, lab["pos"]]
+                neu[rows] = probs[:, lab["neu"]]
+                neg[rows] = probs[:, lab["neg"]]
+                before, done = done, done + len(batch)
+                if self.progress_every and done // self.progress_every > before // self.progress_every:
+                    logger.info("%s: scored %d/%d", self.model, done, len(clean_idx))
+
+        if blank:
+            logger.info("%s: %d rows had no text, scored as neutral", self.model, blank)
+        return pd.DataFrame({"pos": pos, "neu": neu, "neg": neg, "score": pos - neg})
+
+    def close(self) -> None:
+        """Free the weights (and force a collection) -- one model resident at a time."""
+        self._tok = self._mdl = None
+        gc.collect()
+
+    def __enter__(self) -> "Scorer":
+        return self.load()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def score_texts(texts: Sequence[str], model: str = "finbert",
                 batch_size: int = 32, max_length: int = 256,
                 threads: Optional[int] = None,
-                progress_every: int = 20000) -> pd.DataFrame:
+                progress_every: int = 20000,
+                max_batch_tokens: Optional[int] = None) -> pd.DataFrame:
     """Score ``texts`` with one model. Returns columns pos, neu, neg, score.
 
     Empty/blank texts are scored as fully neutral rather than dropped, so the returned
-    frame aligns 1:1 with the input -- the caller joins it back positionally.
+    frame aligns 1:1 with the input -- the caller joins it back positionally. The model is
+    freed before returning so a caller looping over models never holds two sets of weights.
     """
-    if model not in MODELS:
-        raise ValueError(f"Unknown model {model!r}. Known: {available_models()}")
-    hf_id = MODELS[model]["hf"]
-
-    # Imported HERE, not at module scope -- see the module docstring.
-    import torch
-    from transformers import AutoModelForSequenceClassification, AutoTokenizer
-
-    if threads:
-        torch.set_num_threads(int(threads))
-
-    logger.info("Loading %s (%s)", model, hf_id)
-    tok_cls = MODELS[model].get("tokenizer")
-    if tok_cls:
-        import transformers
-        tok = getattr(transformers, str(tok_cls)).from_pretrained(hf_id)
-    else:
-        tok = AutoTokenizer.from_pretrained(hf_id)
-    mdl_cls = MODELS[model].get("model")
-    if mdl_cls:
-        import transformers
-        mdl = getattr(transformers, str(mdl_cls)).from_pretrained(hf_id)
-    else:
-        mdl = AutoModelForSequenceClassification.from_pretrained(hf_id)
-    mdl.eval()
-    lab = _resolve_label_map(mdl.config.id2label)
-
-    def _run(batch: List[str]) -> np.ndarray:
-        enc = tok(batch, truncation=True, max_length=max_length,
-                  padding=True, return_tensors="pt")
-        with torch.inference_mode():
-            logits = mdl(**enc).logits.detach().cpu().numpy()
-        return _softmax(logits)
+    with Scorer(model, batch_size=batch_size, max_length=max_length, threads=threads,
+                max_batch_tokens=max_batch_tokens, progress_every=progress_every) as scorer:
+        return scorer(texts)
 
-    # Sign probe before any real work, so a bad mapping fails in one batch, not after
-    # scoring 131k rows into a silently inverted column.
-    probe = _run([_PROBE])[0]
-    if probe[lab["neg"]] <= probe[lab["pos"]]:
-        del mdl, tok
-        gc.collect()
-        raise ValueError(
-            f"{model}: label mapping failed its sign probe "
-            f"(pos={probe[lab['pos']]:.3f} neg={probe[lab['neg']]:.3f} on a clearly "
-            f"negative sentence). Refusing to score with an inverted mapping.")
-    logger.info("%s label map verified: %s", model, lab)
 
+def score_texts_cached(texts: Sequence[str], model: str = "finbert", *,
+                       max_length: int = 256, scorer=None, **score_kw) -> pd.DataFrame:
+    """``score_texts`` through the persistent text-score cache (``store.read_text_scores``).
+
+    Each distinct non-blank text is looked up by (``store.text_hash``, ``model_version``);
+    only misses are scored -- once each, however often they repeat -- and then cached.
+    ``scorer`` is a loaded ``Scorer`` (or any callable texts -> pos/neu/neg/score frame) to
+    reuse; by default the model is loaded only if there is a miss. Output matches
+    ``score_texts``: aligned 1:1 with the input, blanks fully neutral.
+    """
+    from ba2_providers.news import store
+
+    version = getattr(scorer, "version", None) or model_version(model, max_length)
     n = len(texts)
-    pos = np.zeros(n, dtype=np.float32)
-    neu = np.zeros(n, dtype=np.float32)
-    neg = np.zeros(n, dtype=np.float32)
-
-    clean = [(i, t) for i, t in enumerate(texts) if isinstance(t, str) and t.strip()]
-    # Sorting by length groups similar-length texts, so dynamic padding wastes far less
-    # compute AND far less activation memory than a random ordering at the same batch size.
-    clean.sort(key=lambda it: len(it[1]))
-
-    # Blank/missing text scores as fully neutral, keeping the frame aligned 1:1 with the
-    # input. Marked by difference against the scored indices rather than by scanning.
-    scored_idx = np.zeros(n, dtype=bool)
-    scored_idx[[i for i, _ in clean]] = True
-    neu[~scored_idx] = 1.0
-    blank = int((~scored_idx).sum())
-
-    done = 0
-    for start in range(0, len(clean), batch_size):
-        chunk = clean[start:start + batch_size]
-        probs = _run([t for _, t in chunk])
-        for (idx, _), p in zip(chunk, probs):
-            pos[idx] = p[lab["pos"]]
-            neu[idx] = p[lab["neu"]]
-            neg[idx] = p[lab["neg"]]
-        done += len(chunk)
-        if progress_every and done % progress_every < batch_size:
-            logger.info("%s: scored %d/%d", model, done, len(clean))
-
-    if blank:
-        logger.info("%s: %d rows had no text, scored as neutral", model, blank)
-
-    # One model resident at a time -- free before returning so a caller looping over
-    # models never holds two sets of weights.
-    del mdl, tok
-    gc.collect()
-
-    return pd.DataFrame({"pos": pos, "neu": neu, "neg": neg, "score": pos - neg})
+    out = pd.DataFrame({"pos": np.zeros(n, dtype=np.float32), "neu": np.ones(n, dtype=np.float32),
+                        "neg": np.zeros(n, dtype=np.float32), "score": np.zeros(n, dtype=np.float32)})
+    keyed = [(i, store.text_hash(t)) for i, t in enumerate(texts) if isinstance(t, str) and t.strip()]
+    if not keyed:
+        return out
+    hashes = pd.Series([h for _, h in keyed], index=[i for i, _ in keyed])
+    known = store.read_text_scores(version, hashes.unique())
+    misses = hashes[~hashes.isin(known.index)].drop_duplicates()
+    if len(misses):
+        if scorer is None:
+            fresh = score_texts([texts[i] for i in misses.index], model=model,
+                                max_length=max_length, **score_kw)
+        else:
+            fresh = scorer([texts[i] for i in misses.index])
+        fresh = fresh.assign(text_hash=misses.to_numpy())
+        store.append_text_scores(version, fresh)
+        fresh = fresh.set_index("text_hash")[["pos", "neu", "neg", "score"]]
+        known = pd.concat([known, fresh]) if len(known) else fresh
+    logger.info("%s: %d texts, %d distinct, %d scored, %d from cache", model, n,
+                hashes.nunique(), len(misses), hashes.nunique() - len(misses))
+    vals = known.loc[hashes.to_numpy(), ["pos", "neu", "neg", "score"]].to_numpy(dtype=np.float32)
+    out.loc[hashes.index, ["pos", "neu", "neg", "score"]] = vals
+    return out
@@ -33,17 +33,21 @@ Collapsing the two is exactly the mistake that let the macro section run inert f
 """
 from __future__ import annotations
 
+import glob
+import hashlib
 import os
 import re
 import threading
 from datetime import datetime, timedelta
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import pandas as pd
 
 import ba2_common.config as _cfg
 from ba2_common.logger import logger
 
+from ba2_providers.cache.part_files import compact_parts, part_paths, write_part
+
 
 # Both roots are resolved PER CALL through the config MODULE, never bound at import.
 # `from ba2_common.config import CACHE_FOLDER` would snapshot the value, and the test
@@ -96,6 +100,9 @@ def reset_cache() -> None:
     """Drop the in-process read cache. For tests and after a migration/rescore."""
     with _lock:
         _read_cache.clear()
+        _text_score_memo.clear()
+    from ba2_providers.news import partitioned
+    partitioned.reset_cache()
 
 
 def covered_symbols() -> List[str]:
@@ -143,21 +150,24 @@ def write_raw(symbol: str, df: pd.DataFrame) -> int:
     return len(df)
 
 
-def write_scored(symbol: str, df: pd.DataFrame) -> int:
+def write_scored(symbol: str, df: pd.DataFrame, mirror: bool = True) -> int:
+    """Replace a symbol's scored file. Once the date-partitioned layout has been built
+    (``news/partitioned.py``), the same rows replace the symbol's partitioned rows too, so
+    the two layouts never disagree. That mirror rewrites every month the symbol has rows in;
+    a pass over many symbols should use ``upsert_scored_many`` (or pass ``mirror=False`` and
+    mirror the batch itself) rather than pay it once per symbol."""
     _atomic_write(df, scored_path(symbol), SCORED_COLUMNS)
     with _lock:
         _read_cache.pop(_norm_symbol(symbol), None)
+    from ba2_providers.news import partitioned
+    if mirror and partitioned.exists():
+        sym = _norm_symbol(symbol)
+        partitioned.upsert_rows(df.assign(symbol=sym), replace_symbols=[sym])
     return len(df)
 
 
-def upsert_scored(symbol: str, df: pd.DataFrame) -> int:
-    """Merge one model's rows into a symbol's scored file, leaving other models intact.
-
-    ``write_scored`` replaces the whole file, which would delete ``finbert-legacy`` the
-    first time a challenger is scored -- and the point of the ``model`` column is that
-    models COEXIST so they can be compared on the same articles. This replaces only the
-    rows whose model matches, so re-scoring is idempotent and never destructive.
-    """
+def _merge_model(symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+    """The symbol's scored rows with ``df``'s one model replaced by ``df``."""
     models = set(df["model"].dropna().unique())
     if len(models) != 1:
         raise ValueError(f"upsert_scored expects exactly one model per call, got {models}")
@@ -166,10 +176,37 @@ def upsert_scored(symbol: str, df: pd.DataFrame) -> int:
     if os.path.exists(scored_path(symbol)):
         existing = pd.read_parquet(scored_path(symbol))
         keep = existing[existing["model"] != model]
-        merged = pd.concat([keep, df], ignore_index=True)
-    else:
-        merged = df
-    return write_scored(symbol, merged)
+        return pd.concat([keep, df], ignore_index=True)
+    return df
+
+
+def upsert_scored(symbol: str, df: pd.DataFrame, mirror: bool = True) -> int:
+    """Merge one model's rows into a symbol's scored file, leaving other models intact.
+
+    ``write_scored`` replaces the whole file, which would delete ``finbert-legacy`` the
+    first time a challenger is scored -- and the point of the ``model`` column is that
+    models COEXIST so they can be compared on the same articles. This replaces only the
+    rows whose model matches, so re-scoring is idempotent and never destructive.
+    """
+    return write_scored(symbol, _merge_model(symbol, df), mirror=mirror)
+
+
+def upsert_scored_many(frames: Dict[str, pd.DataFrame]) -> int:
+    """``upsert_scored`` for a batch of symbols, mirrored into the partitioned layout with ONE
+    ``upsert_rows`` -- each month file is rewritten once per batch, not once per symbol.
+    Returns the number of rows written to the per-symbol files."""
+    from ba2_providers.news import partitioned
+    mirror = partitioned.exists()
+    written, merged = 0, []
+    for symbol, df in frames.items():
+        rows = _merge_model(symbol, df)
+        written += write_scored(symbol, rows, mirror=False)
+        if mirror:
+            merged.append(rows.assign(symbol=_norm_symbol(symbol)))
+    if merged:
+        partitioned.upsert_rows(pd.concat(merged, ignore_index=True),
+                                replace_symbols=[_norm_symbol(s) for s in frames])
+    return written
 
 
 def read_raw(symbol: str) -> pd.DataFrame:
@@ -241,6 +278,27 @@ def read_sentiment(symbol: str, as_of: Optional[datetime] = None,
     return df.reset_index(drop=True)
 
 
+def read_sentiment_many(symbols: Iterable[str], as_of: Optional[datetime] = None,
+                        window_days: Optional[int] = None,
+                        model: Optional[str] = None) -> pd.DataFrame:
+    """``read_sentiment`` for a universe: one frame with a leading ``symbol`` column.
+
+    Served by the date-partitioned layout when it has been built. That costs one scan per
+    month in the window instead of one file per symbol, with the window pushed down. Before
+    the migration it falls back to the per-symbol files. Either way the absence contract is
+    the same: uncovered symbols raise, quiet windows are empty.
+    """
+    from ba2_providers.news import partitioned
+    syms = [_norm_symbol(s) for s in symbols]
+    if partitioned.exists():
+        return partitioned.read_window(syms, as_of, window_days, model)
+    frames = [read_sentiment(s, as_of, window_days, model).assign(symbol=s)
+              for s in sorted(set(syms))]
+    if not frames:
+        return pd.DataFrame(columns=["symbol"] + SCORED_COLUMNS)
+    return pd.concat(frames, ignore_index=True).loc[:, ["symbol"] + SCORED_COLUMNS]
+
+
 def aggregate_sentiment(df: pd.DataFrame, as_of: datetime,
                         half_life_days: float = 3.0) -> Optional[float]:
     """Half-life weighted mean of ``pos - neg`` over ``df``, in [-1, +1].
@@ -282,3 +340,89 @@ def coverage_report() -> pd.DataFrame:
             "models": ",".join(sorted(df["model"].dropna().unique())) if len(df) else "",
         })
     return pd.DataFrame(rows)
+
+
+# --- text-score cache ------------------------------------------------------------------
+#
+# Scores keyed by (hash of the exact text scored, model version), so the same text never
+# goes through a model twice -- not on a store re-score, not in an ML-platform dataset
+# build, not in a backtest re-deriving features. It lives UNDER the scored tier on
+# purpose: it holds hashes and numbers, never text, so it may sync to workers (which can
+# then reuse master's scores), and it is a directory rather than a ``<SYM>.parquet`` file,
+# so ``covered_symbols`` never mistakes it for coverage.
+#
+# Writers append uniquely named part files (``cache.part_files``: two processes scoring at
+# once never clobber each other); readers load every part and remember which they have
+# seen, so a later read picks up only new parts. Many small parts are compacted into one.
+
+TEXT_SCORE_COLUMNS = ["text_hash", "pos", "neu", "neg", "score"]
+_TEXT_SCORE_DIR = "_text_scores"
+_TEXT_SCORE_COMPACT_PARTS = 32
+_MODEL_VERSION_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._@\-]{0,79}$")
+
+# model_version -> (part file names loaded, frame indexed by text_hash)
+_text_score_memo: dict = {}
+
+
+def text_hash(text: str) -> str:
+    """Cache key for a text: SHA-1 of its exact UTF-8 bytes (no normalisation -- two
+    texts that differ at all may tokenize differently)."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def text_scores_folder(model_version: str) -> str:
+    if not _MODEL_VERSION_RE.match(model_version):
+        raise ValueError(f"Refusing to use {model_version!r} as a score-cache directory")
+    return os.path.join(scored_folder(), _TEXT_SCORE_DIR, model_version)
+
+
+def _load_text_scores(model_version: str) -> pd.DataFrame:
+    folder = text_scores_folder(model_version)
+    names = set(os.path.basename(p) for p in glob.glob(os.path.join(folder, "*.parquet")))
+    with _lock:
+        seen, table = _text_score_memo.get(model_version, (set(), None))
+    if table is not None and names == seen:
+        return table
+    if table is None or not seen <= names:           # first read, or parts were compacted
+        seen, table = set(), pd.DataFrame(columns=TEXT_SCORE_COLUMNS).set_index("text_hash")
+    new = sorted(names - seen)
+    frames = [table] if len(table) else []
+    for name in new:
+        try:
+            frames.append(pd.read_parquet(os.path.join(folder, name)).set_index("text_hash"))
+        except FileNotFoundError:                    # compacted away under us: next read
+            names.discard(name)
+    if frames:
+        table = pd.concat(frames) if len(frames) > 1 else frames[0]
+    table = table[~table.index.duplicated(keep="last")]
+    with _lock:
+        _text_score_memo[model_version] = (names, table)
+    return table
+
+
+def read_text_scores(model_version: str, hashes: Iterable[str]) -> pd.DataFrame:
+    """Cached scores for ``hashes`` (indexed by text_hash; misses are simply absent)."""
+    table = _load_text_scores(model_version)
+    if table.empty:
+        return table
+    return table.loc[table.index.intersection(pd.Index(list(hashes)))]
+
+
+def append_text_scores(model_version: str, df: pd.DataFrame) -> int:
+    """Add scores (columns ``TEXT_SCORE_COLUMNS``) to the cache for ``model_version``."""
+    missing = [c for c in TEXT_SCORE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Refusing to cache text scores: missing columns {missing}")
+    if df.empty:
+        return 0
+    folder = text_scores_folder(model_version)
+    write_part(folder, df.loc[:, TEXT_SCORE_COLUMNS])
+    if len(part_paths(folder)) > _TEXT_SCORE_COMPACT_PARTS:
+        compact_text_scores(model_version)
+    return len(df)
+
+
+def compact_text_scores(model_version: str) -> int:
+    """Rewrite a model version's cache as a single part; returns its row count."""
+    return compact_parts(text_scores_folder(model_version),
+                         lambda df: df.drop_duplicates("text_hash", keep="last"))
@@ -4,26 +4,37 @@ Computes (never fetches beyond the OHLCV composition): descriptive return stats,
 annualized realized vol, max drawdown, VaR (95%, 1d), and benchmark-relative
 beta/correlation — all on DAILY bars over the lookback window ending at end_date
 (point-in-time: nothing after end_date is ever requested).
+
+``get_risk_stats_batch`` produces the same report for a whole universe: the benchmark is
+fetched once, every symbol's closes are aligned by date into one returns matrix, and each
+statistic is computed column-wise with numpy. ``get_risk_stats`` is the batch of one, so
+both entry points align a symbol with its benchmark by date (not by position) and agree on
+every report. Reports are cached per (symbol, end_date, window), shared by the two entry
+points; callers get copies of the cached reports.
 """
 
+import copy
+import statistics
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Literal
+from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from ba2_common.core.interfaces.RiskStatsInterface import RiskStatsInterface
-from ba2_common.core.finance_calc.risk import (
-    pct_returns, compute_beta, compute_correlation, compute_var,
-)
-from ba2_common.core.finance_calc.statistics import describe
-from ba2_common.core.finance_calc.portfolio import performance
 from ba2_common.core.finance_calc.format import num, pct
 
 _PERIODS_PER_YEAR = 252  # daily bars
+_STATS_CACHE_MAX = 4096  # cached reports per provider instance (LRU)
+_Z_95 = statistics.NormalDist().inv_cdf(0.05)  # compute_var's one-sided 95% z (negative)
 
 
 class FinanceCalcRiskStatsProvider(RiskStatsInterface):
     def __init__(self, ohlcv_provider, benchmark_symbol: str = "SPY"):
         self._ohlcv = ohlcv_provider
         self._benchmark = benchmark_symbol
+        self._stats_cache: "OrderedDict[Tuple[str, datetime, int], Dict[str, Any]]" = OrderedDict()
 
     def get_provider_name(self) -> str:
         return "finance_calc"
@@ -34,42 +45,111 @@ class FinanceCalcRiskStatsProvider(RiskStatsInterface):
     def validate_config(self) -> bool:
         return True  # no API keys — pure compute over the OHLCV composition
 
-    def _closes(self, symbol: str, start: datetime, end: datetime) -> list[float]:
-        df = self._ohlcv.get_ohlcv_data(symbol, start_date=start, end_date=end, interval="1d")
-        # OHLCV contract: CAPITALIZED columns (Date, Open, High, Low, Close, Volume).
-        return [float(c) for c in df["Close"].tolist()]
-
     def _compute(self, symbol: str, end_date: datetime, lookback_days: int) -> Dict[str, Any]:
-        start = end_date - timedelta(days=lookback_days)
-        closes = self._closes(symbol, start, end_date)
-        bench = self._closes(self._benchmark, start, end_date)
-        if len(closes) < 5:
-            return {"symbol": symbol, "computable": False,
-                    "reason": f"need >=5 daily closes, got {len(closes)}"}
-        rets = pct_returns(closes)
-        bench_rets = pct_returns(bench)
-        # performance() pairs returns/benchmark with zip(strict=True): unequal lengths
-        # raise (IPOs, halt days). Align to the most-recent common window; if the
-        # benchmark history is shorter, skip the benchmark block instead of raising.
-        bench_aligned = bench_rets[-len(rets):] if len(bench_rets) >= len(rets) else None
-        return {
-            "symbol": symbol,
-            "computable": True,
-            "benchmark": self._benchmark,
-            "window_days": lookback_days,
-            "descriptive": describe(rets),
-            "realized_vol_annual": describe(rets)["std_sample"] * (_PERIODS_PER_YEAR ** 0.5),
-            "var_95_1d": compute_var(closes, 0.95, 1),
-            "beta": compute_beta(closes, bench) if len(bench) >= 3 else None,
-            "correlation": compute_correlation({"asset": closes, "benchmark": bench})
-                           if len(bench) >= 3 else None,
-            "performance": performance(rets, periods_per_year=_PERIODS_PER_YEAR,
-                                       benchmark=bench_aligned),
-        }
+        # The batch of one: both entry points align the asset and the benchmark by date and
+        # share the cache, so a report must not depend on which of them computed it.
+        return self._compute_batch([symbol], end_date, lookback_days)[symbol]
 
     def get_risk_stats(self, symbol, end_date, lookback_days: int = 365,
                        format_type: Literal["markdown", "dict", "both"] = "markdown"):
-        data = self._compute(symbol, end_date, lookback_days)
+        data = self._cache_get(symbol, end_date, lookback_days)
+        if data is None:
+            data = self._compute(symbol, end_date, lookback_days)
+            self._cache_put(symbol, end_date, lookback_days, data)
+        return self._render(data, format_type)
+
+    def get_risk_stats_batch(self, symbols: Iterable[str], end_date: datetime,
+                             lookback_days: int = 365,
+                             format_type: Literal["markdown", "dict", "both"] = "dict",
+                             ) -> Dict[str, Any]:
+        """``get_risk_stats`` for many symbols at once: ``{symbol: report}``.
+
+        The benchmark is fetched once for the whole batch and the statistics are computed
+        column-wise over one date-aligned returns matrix; symbols already cached for
+        (end_date, lookback_days) are not refetched. A symbol whose fetch fails is reported
+        not computable instead of failing the batch.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        out: Dict[str, Dict[str, Any]] = {}
+        todo: List[str] = []
+        for sym in symbols:
+            hit = self._cache_get(sym, end_date, lookback_days)
+            if hit is None:
+                todo.append(sym)
+            else:
+                out[sym] = hit
+        if todo:
+            for sym, data in self._compute_batch(todo, end_date, lookback_days).items():
+                self._cache_put(sym, end_date, lookback_days, data)
+                out[sym] = data
+        return {sym: self._render(out[sym], format_type) for sym in symbols}
+
+    # -- cache ------------------------------------------------------------------------
+
+    def _cache_get(self, symbol: str, end_date: datetime, lookback_days: int) -> Optional[Dict[str, Any]]:
+        key = (symbol, end_date, lookback_days)
+        data = self._stats_cache.get(key)
+        if data is not None:
+            self._stats_cache.move_to_end(key)
+        return data
+
+    def _cache_put(self, symbol: str, end_date: datetime, lookback_days: int,
+                   data: Dict[str, Any]) -> None:
+        self._stats_cache[(symbol, end_date, lookback_days)] = data
+        while len(self._stats_cache) > _STATS_CACHE_MAX:
+            self._stats_cache.popitem(last=False)
+
+    # -- batch compute ------------------------------------------------------------------
+
+    def _close_series(self, symbol: str, start: datetime, end: datetime) -> pd.Series:
+        df = self._ohlcv.get_ohlcv_data(symbol, start_date=start, end_date=end, interval="1d")
+        if df is None or len(df) == 0:
+            return pd.Series(dtype=float)
+        closes = pd.Series(df["Close"].astype(float).values,
+                           index=pd.to_datetime(df["Date"]).values)
+        return closes[~closes.index.duplicated(keep="last")].sort_index()
+
+    def _compute_batch(self, symbols: List[str], end_date: datetime,
+                       lookback_days: int) -> Dict[str, Dict[str, Any]]:
+        start = end_date - timedelta(days=lookback_days)
+        bench = self._close_series(self._benchmark, start, end_date)
+        series: Dict[str, pd.Series] = {}
+        out: Dict[str, Dict[str, Any]] = {}
+        for sym in symbols:
+            if sym == self._benchmark:
+                series[sym] = bench
+                continue
+            try:
+                series[sym] = self._close_series(sym, start, end_date)
+            except Exception as e:  # one symbol's fetch must not sink the batch
+                out[sym] = {"symbol": sym, "computable": False, "reason": f"fetch failed: {e}"}
+        for sym, closes in series.items():
+            if int(closes.notna().sum()) < 5:
+                out[sym] = {"symbol": sym, "computable": False,
+                            "reason": f"need >=5 daily closes, got {int(closes.notna().sum())}"}
+        cols = [sym for sym in series if sym not in out]
+        if not cols:
+            return out
+
+        prices = pd.concat([series[sym] for sym in cols] + [bench], axis=1, sort=True)
+        prices = prices.to_numpy(dtype=float)
+        rets = _returns_matrix(prices)
+        asset, bench_rets = rets[:, :-1], rets[:, -1:]
+        n_bench_closes = int(np.isfinite(prices[:, -1]).sum())
+        for j, data in enumerate(_column_stats(asset, bench_rets, n_bench_closes)):
+            sym = cols[j]
+            out[sym] = {
+                "symbol": sym,
+                "computable": True,
+                "benchmark": self._benchmark,
+                "window_days": lookback_days,
+                **data,
+            }
+        return out
+
+    def _render(self, data: Dict[str, Any], format_type: str):
+        if format_type in ("dict", "both"):
+            data = copy.deepcopy(data)   # never hand out the cached report itself
         if format_type == "dict":
             return data
         text = self._format_as_markdown(data)
@@ -102,3 +182,196 @@ class FinanceCalcRiskStatsProvider(RiskStatsInterface):
             lines.append(f"- **Beta vs {data['benchmark']}:** {num(b['beta'])} "
                          f"(correlation {num(b['correlation'])}, R² {num(b['r_squared'])})")
         return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Column-wise statistics (the batch path)
+#
+# Each helper mirrors one finance_calc function -- same conventions, same rounding -- over a
+# (T, N) returns matrix with NaN where a symbol has no return that day, so one pass covers
+# every symbol whatever its history length.
+# ---------------------------------------------------------------------------
+
+
+def _returns_matrix(prices: np.ndarray) -> np.ndarray:
+    """Date-aligned ``pct_returns``: each close over the symbol's previous close (a missing
+    day is skipped, not a zero return); NaN where there is no close or the prior is zero."""
+    prev = pd.DataFrame(prices).ffill().shift(1).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = prices / prev - 1.0
+    rets[~np.isfinite(prices) | ~np.isfinite(prev) | (prev == 0)] = np.nan
+    return rets
+
+
+def _masked_percentile(sorted_x: np.ndarray, n: np.ndarray, q: float) -> np.ndarray:
+    """``series.percentile`` per column of a NaN-last column-sorted matrix with ``n`` values each."""
+    idx = q * (n - 1)
+    lo = np.floor(idx).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    frac = idx - lo
+    cols = np.arange(sorted_x.shape[1])
+    return sorted_x[lo, cols] * (1 - frac) + sorted_x[hi, cols] * frac
+
+
+def _r(x: float, nd: int) -> Optional[float]:
+    return None if x is None or not np.isfinite(x) else round(float(x), nd)
+
+
+def _moments(x: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-column count, mean, centred values (0 off-mask) and sum of squared deviations."""
+    n = mask.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(mask, x, 0.0).sum(axis=0) / n
+    dev = np.where(mask, x - mean, 0.0)
+    return n, mean, dev, (dev ** 2).sum(axis=0)
+
+
+def _column_stats(rets: np.ndarray, bench: np.ndarray, n_bench_closes: int) -> List[Dict[str, Any]]:
+    """The per-symbol report blocks (``describe``, ``compute_var``, ``compute_beta``,
+    ``compute_correlation``, ``performance``) for every column of ``rets`` at once."""
+    m = _PERIODS_PER_YEAR
+    mask = np.isfinite(rets)
+    n, mean, dev, ss = _moments(rets, mask)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var_pop, var_samp = ss / n, ss / (n - 1)
+        std_pop, std_samp = np.sqrt(var_pop), np.sqrt(var_samp)
+        z = dev / std_samp
+        skew = np.where(mask, z ** 3, 0.0).sum(axis=0) / n
+        kurt = np.where(mask, z ** 4, 0.0).sum(axis=0) / n - 3
+    srt = np.sort(rets, axis=0)                     # NaN sort last
+    p05, p25, med, p75 = (_masked_percentile(srt, n, q) for q in (0.05, 0.25, 0.5, 0.75))
+    mad = _masked_percentile(np.sort(np.abs(rets - med), axis=0), n, 0.5) * 1.4826
+    lo_, hi_ = srt[0], srt[n - 1, np.arange(rets.shape[1])]
+
+    # Benchmark pairs: the days both have a return (compute_beta / compute_correlation).
+    b = np.broadcast_to(bench, rets.shape)
+    pair = mask & np.isfinite(b)
+    n_pair, a_mean, a_dev, a_ss = _moments(rets, pair)
+    _, b_mean, b_dev, b_ss = _moments(b, pair)
+    cov_pair = (a_dev * b_dev).sum(axis=0)
+
+    # performance(): wealth path, downside and the benchmark block over the asset's own days.
+    growth = np.where(mask, 1.0 + rets, 1.0)
+    wealth = np.cumprod(growth, axis=0)
+    peak = np.maximum(np.maximum.accumulate(wealth, axis=0), 1.0)
+    mdd = np.minimum((wealth / peak - 1.0).min(axis=0), 0.0)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        ann_return = wealth[-1] ** (m / n) - 1
+        downside = np.sqrt((np.minimum(np.where(mask, rets, 0.0), 0.0) ** 2).sum(axis=0) / n)
+    covered = pair.sum(axis=0) == n                  # benchmark has a return on every asset day
+    bm = np.where(mask, b, np.nan)
+    _, pb_mean, pb_dev, pb_ss = _moments(bm, pair)
+    p_cov = (dev * pb_dev).sum(axis=0) / n
+    active = np.where(mask, rets - bm, np.nan)
+    act_ss = _moments(active, pair)[3]
+    up, dn = pair & (bm > 0), pair & (bm < 0)
+
+    out: List[Dict[str, Any]] = []
+    for j in range(rets.shape[1]):
+        nj = int(n[j])
+        s_samp = round(float(std_samp[j]), 8)
+        mean_j = float(mean[j])
+        descriptive = {
+            "n": nj,
+            "mean": round(mean_j, 8),
+            "median": round(float(med[j]), 8),
+            "std_sample": s_samp,
+            "std_population": round(float(std_pop[j]), 8),
+            "variance_sample": round(float(var_samp[j]), 10),
+            "variance_population": round(float(var_pop[j]), 10),
+            "min": round(float(lo_[j]), 8),
+            "max": round(float(hi_[j]), 8),
+            "range": round(float(hi_[j] - lo_[j]), 8),
+            "p25": round(float(p25[j]), 8),
+            "p75": round(float(p75[j]), 8),
+            "iqr": round(float(p75[j] - p25[j]), 8),
+            "skewness": _r(skew[j], 6) if std_samp[j] > 0 else None,
+            "excess_kurtosis": _r(kurt[j], 6) if std_samp[j] > 0 else None,
+            "skewness_stderr": round((6.0 / nj) ** 0.5, 6),
+            "coefficient_of_variation": round(float(std_samp[j]) / mean_j, 6) if mean_j != 0 else None,
+            "mad_normalized": round(float(mad[j]), 8),
+        }
+        var_95 = {
+            "confidence": 0.95,
+            "horizon_days": 1,
+            "historical_var_pct": round(max(-float(p05[j]), 0.0), 6),
+            "parametric_var_pct": round(max(-(mean_j + _Z_95 * float(std_pop[j])), 0.0), 6),
+            "mean_return": round(mean_j, 6),
+            "volatility": round(float(std_pop[j]), 6),
+            "n_obs": nj,
+        }
+
+        beta = correlation = None
+        npj = int(n_pair[j])
+        if n_bench_closes >= 3 and npj >= 2:
+            vb, va = b_ss[j] / (npj - 1), a_ss[j] / (npj - 1)
+            bj = cov_pair[j] / (npj - 1) / vb if vb else None
+            cj = cov_pair[j] / np.sqrt(a_ss[j] * b_ss[j]) if vb and va else None
+            beta = {
+                "beta": _r(bj, 4),
+                "correlation": _r(cj, 4),
+                "r_squared": _r(cj ** 2, 4) if cj is not None else None,
+                "n_obs": npj,
+            }
+            diag_a, diag_b = (1.0 if va > 0 else None), (1.0 if vb > 0 else None)
+            corr = _r(cj, 4) if (va > 0 and vb > 0) else None
+            correlation = {
+                "names": ["asset", "benchmark"],
+                "matrix": {"asset": {"asset": diag_a, "benchmark": corr},
+                           "benchmark": {"benchmark": diag_b, "asset": corr}},
+                "n_obs": npj,
+            }
+
+        vol = float(std_samp[j])
+        sharpe = mean_j / vol * m ** 0.5 if vol > 0 else None
+        sortino = mean_j / float(downside[j]) * m ** 0.5 if downside[j] > 0 else None
+        mdd_j = float(mdd[j])
+        calmar = float(ann_return[j]) / abs(mdd_j) if mdd_j < 0 else None
+        years = nj / m
+        t_stat = sharpe * years ** 0.5 if sharpe is not None else None
+        perf: Dict[str, Any] = {
+            "n_obs": nj,
+            "periods_per_year": m,
+            "years": round(years, 4),
+            "mean_return": round(mean_j, 8),
+            "volatility": round(vol, 8),
+            "annualized_return": round(float(ann_return[j]), 8),
+            "annualized_volatility": round(vol * m ** 0.5, 8),
+            "sharpe": None if sharpe is None else round(sharpe, 6),
+            "sortino": None if sortino is None else round(sortino, 6),
+            "calmar": None if calmar is None else round(calmar, 6),
+            "max_drawdown": round(mdd_j, 8),
+            "downside_deviation": round(float(downside[j]), 8),
+            "t_stat": None if t_stat is None else round(t_stat, 4),
+            "years_to_significance": round((2.0 / abs(sharpe)) ** 2, 2) if sharpe else None,
+        }
+        if covered[j]:
+            bmean, bvar = float(pb_mean[j]), float(pb_ss[j]) / nj
+            pbeta = float(p_cov[j]) / bvar if bvar > 0 else None
+            te = (float(act_ss[j]) / (nj - 1)) ** 0.5 if nj >= 2 else 0.0
+            ir = (mean_j - bmean) / te * m ** 0.5 if te > 0 else None
+            alpha = mean_j - (pbeta * bmean if pbeta is not None else 0.0)
+            treynor = mean_j * m / pbeta if pbeta not in (None, 0) else None
+            up_cap = (float(rets[up[:, j], j].mean()) / float(bm[up[:, j], j].mean())
+                      if up[:, j].any() else None)
+            dn_cap = (float(rets[dn[:, j], j].mean()) / float(bm[dn[:, j], j].mean())
+                      if dn[:, j].any() else None)
+            perf.update({
+                "beta": None if pbeta is None else round(pbeta, 6),
+                "jensen_alpha_annual": round(alpha * m, 8),
+                "tracking_error": round(te * m ** 0.5, 8),
+                "information_ratio": None if ir is None else round(ir, 6),
+                "information_ratio_t": None if ir is None else round(ir * years ** 0.5, 4),
+                "treynor": None if treynor is None else round(treynor, 6),
+                "up_capture": None if up_cap is None else round(up_cap, 6),
+                "down_capture": None if dn_cap is None else round(dn_cap, 6),
+            })
+        out.append({
+            "descriptive": descriptive,
+            "realized_vol_annual": s_samp * (m ** 0.5),
+            "var_95_1d": var_95,
+            "beta": beta,
+            "correlation": correlation,
+            "performance": perf,
+        })
+    return out
@@ -10,7 +10,7 @@ from __future__ import annotations
 import json
 import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -549,6 +549,21 @@ def scan_date_grid(start: str, end: str, cadence_days: int) -> "pd.DatetimeIndex
     return pd.date_range(start=start, end=end, freq=f"{int(cadence_days)}D")
 
 
+def _sample_scan_rows(daily: "pd.DataFrame", grid: "pd.DatetimeIndex", sym: str,
+                     sector: Optional[str]) -> "pd.DataFrame":
+    """One symbol's daily metrics sampled AS-OF each scan date -> store rows (may be empty)."""
+    m = daily.reindex(grid, method="ffill")                  # value AS-OF each scan date
+    m = m.dropna(subset=["close"]).reset_index().rename(columns={"index": "date"})
+    m["date"] = m["date"].astype(str).str.slice(0, 10)
+    m["symbol"] = sym
+    m["sector"] = sector
+    m["price"] = m["close"]
+    # volume / market_cap / float_shares / weinstein_stage all ride along from
+    # compute_daily_metrics (the reindex carried them as-of each scan date) — point-in-time,
+    # baked into the store so the per-day screen needs no OHLCV/network at read time.
+    return m
+
+
 def build_store(store_dir: str, api_key: str, start: str, end: str, *,
                 market_cap_min: float, price_min: float, volume_min: float,
                 ohlcv_get, mcap_get=None, float_get=None, shares_get=None,
@@ -598,18 +613,8 @@ def build_store(store_dir: str, api_key: str, start: str, end: str, *,
         m = compute_daily_metrics(df, market_cap_series=mcap_s, float_series=flt_s,
                                   shares=shares, rvol_window=rvol_window, drop_days=drop_days,
                                   max_lookback=max_lookback)
-        m = m.reindex(grid_todo, method="ffill")             # value AS-OF each scan date
-        m = m.dropna(subset=["close"]).reset_index().rename(columns={"index": "date"})
-        m["date"] = m["date"].astype(str).str.slice(0, 10)
-        if m.empty:
-            return None
-        m["symbol"] = sym
-        m["sector"] = srow.get("sector")
-        m["price"] = m["close"]
-        # volume / market_cap / float_shares / weinstein_stage all ride along from
-        # compute_daily_metrics (the reindex carried them as-of each scan date) — point-in-time,
-        # baked into the store so the per-day screen needs no OHLCV/network at read time.
-        return m
+        m = _sample_scan_rows(m, grid_todo, sym, srow.get("sector"))
+        return None if m.empty else m
 
     def _build_one(sym: str, srow: Dict[str, Any]):
         # RESILIENT + RETRY: a single symbol's fetch failure (e.g. an FMP response with no
@@ -696,6 +701,327 @@ def build_store(store_dir: str, api_key: str, start: str, end: str, *,
     return summary
 
 
+# --------------------------------------------------------------------------------------------
+# PARTITIONED build: one parquet per SYMBOL under ``<store>/_partitions`` plus a manifest, then
+# the ``ym=`` month files are assembled from the partitions. ``build_store`` above rebuilds every
+# symbol of a missing month in one process and keeps nothing on failure beyond its flush files;
+# this build computes symbols in a PROCESS pool, records each finished partition with a
+# fingerprint of its inputs, and on the next run skips every partition whose inputs are
+# unchanged -- so an interrupted build resumes where it stopped, and a new symbol (or new bars
+# for a few) recomputes only those partitions. ``load_store`` is unchanged: it only globs
+# ``ym=*`` dirs, so the partitions dir is invisible to readers.
+
+PARTITIONS_DIR = "_partitions"
+_MANIFEST_NAME = "manifest.json"
+_MANIFEST_VERSION = 1
+_CODE_VERSION: Optional[str] = None
+
+
+def code_version() -> str:
+    """Short hash of this module's source. Part of every partition fingerprint, so a change to
+    the metric maths invalidates partitions built by the old code (conservatively: ANY edit to
+    this module does)."""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        import hashlib
+        with open(__file__, "rb") as f:
+            _CODE_VERSION = hashlib.sha256(f.read()).hexdigest()[:16]
+    return _CODE_VERSION
+
+
+def _hash_input(h, obj: Any) -> None:
+    if obj is None:
+        h.update(b"\x00none")
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        if isinstance(obj, pd.DataFrame):
+            h.update(",".join(map(str, obj.columns)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    else:
+        h.update(repr(obj).encode())
+    h.update(b"\x00")
+
+
+def partition_fingerprint(inputs: Dict[str, Any], params_key: str) -> str:
+    """Fingerprint of one symbol partition: its input bars/series/scalars + the build params key
+    (which already folds in ``code_version()``)."""
+    import hashlib
+    h = hashlib.sha256(params_key.encode())
+    for name in sorted(inputs):
+        h.update(name.encode())
+        _hash_input(h, inputs[name])
+    return h.hexdigest()
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    import hashlib
+    blob = json.dumps({**params, "code_version": code_version()}, sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _partition_file(symbol: str) -> str:
+    return f"sym={symbol.replace(os.sep, '_')}.parquet"
+
+
+def load_manifest(store_dir: str) -> Dict[str, Any]:
+    """The partition manifest (empty when missing, unreadable or from another manifest version --
+    every partition is then rebuilt, never trusted blindly)."""
+    path = os.path.join(store_dir, PARTITIONS_DIR, _MANIFEST_NAME)
+    try:
+        with open(path) as f:
+            man = json.load(f)
+        if man.get("version") == _MANIFEST_VERSION and isinstance(man.get("partitions"), dict):
+            return man
+    except FileNotFoundError:
+        pass
+    except Exception as e:  # noqa: BLE001 — a corrupt manifest costs a rebuild, not the build
+        logger.warning(f"metric-store: ignoring unreadable manifest {path} ({e})")
+    return {"version": _MANIFEST_VERSION, "partitions": {}}
+
+
+def _write_manifest(store_dir: str, manifest: Dict[str, Any]) -> None:
+    d = os.path.join(store_dir, PARTITIONS_DIR)
+    os.makedirs(d, exist_ok=True)
+    tmp = os.path.join(d, f"{_MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, os.path.join(d, _MANIFEST_NAME))
+
+
+def _build_symbol_partition(part_dir: str, sym: str, sector: Optional[str],
+                            inputs: Dict[str, Any], grid: "pd.DatetimeIndex",
+                            params: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool worker: compute one symbol's store rows and write its partition file.
+
+    Module-level (picklable under ``spawn``); returns rows + compute/write timings. A symbol with
+    no bars or no row inside the grid writes no file (``file`` None) but is still recorded, so an
+    unchanged empty symbol is skipped next time too."""
+    t0 = time.perf_counter()
+    rows = pd.DataFrame()
+    if inputs["ohlcv"] is not None and not inputs["ohlcv"].empty:
+        daily = compute_daily_metrics(inputs["ohlcv"], market_cap_series=inputs["market_cap"],
+                                      float_series=inputs["float"], shares=inputs["shares"],
+                                      rvol_window=params["rvol_window"],
+                                      drop_days=params["drop_days"],
+                                      max_lookback=params["max_lookback"])
+        rows = _sample_scan_rows(daily, grid, sym, sector)
+    t1 = time.perf_counter()
+    name = None
+    if not rows.empty:
+        name = _partition_file(sym)
+        _write_parquet_atomic(rows, os.path.join(part_dir, name))
+    t2 = time.perf_counter()
+    return {"file": name, "rows": int(len(rows)),
+            "compute_s": round(t1 - t0, 4), "write_s": round(t2 - t1, 4)}
+
+
+def _assemble_months(store_dir: str, manifest: Dict[str, Any], symbols: List[str],
+                     params_key: str, want_months: List[str]) -> Tuple[int, Dict[str, Dict[str, float]]]:
+    """Rewrite each wanted ``ym=`` month as one ``part.parquet`` from the current partitions.
+
+    Only partitions of the current universe built with the current params are used. Stale flush
+    files in those months are removed (``load_store`` reads every parquet in a month dir); months
+    outside the build window are never touched. Returns (months written, quality findings)."""
+    import glob
+    part_dir = os.path.join(store_dir, PARTITIONS_DIR)
+    frames = []
+    for sym in symbols:
+        entry = manifest["partitions"].get(sym)
+        if entry and entry.get("params_key") == params_key and entry.get("file"):
+            frames.append(pd.read_parquet(os.path.join(part_dir, entry["file"])))
+    if not frames:
+        return 0, {}
+    df = pd.concat(frames, ignore_index=True)
+    df = df[df["date"].str.slice(0, 7).isin(set(want_months))]
+    quality: Dict[str, Dict[str, float]] = {}
+    for ym, grp in df.groupby(df["date"].str.slice(0, 7)):
+        bad = check_frame_quality(grp)
+        if bad:
+            quality[str(ym)] = bad
+    write_partitions(store_dir, df, part_name="part.parquet")
+    months = sorted(df["date"].str.slice(0, 7).unique())
+    for m in months:
+        for p in glob.glob(os.path.join(store_dir, f"ym={m}", "*.parquet")):
+            if os.path.basename(p) != "part.parquet":
+                os.remove(p)
+    clear_store_memo()
+    return len(months), quality
+
+
+def build_store_partitioned(store_dir: str, api_key: str, start: str, end: str, *,
+                            market_cap_min: float, price_min: float, volume_min: float,
+                            ohlcv_get, mcap_get=None, float_get=None, shares_get=None,
+                            cadence_days: int = 7, rvol_window: int = 20, drop_days: int = 5,
+                            max_lookback: int = 30, processes: int = 4, fetch_workers: int = 8,
+                            symbol_retries: int = 2, manifest_every: int = 50,
+                            fail_on_quality: bool = True) -> Dict[str, Any]:
+    """Resumable, incremental variant of ``build_store`` (same inputs, same store layout).
+
+    Per symbol: the inputs (``ohlcv_get``/``mcap_get``/``float_get``/``shares_get``, exactly as in
+    ``build_store``) are fetched in a thread pool (``fetch_workers``; IO/network), fingerprinted
+    together with the build params (start/end/cadence/windows + ``code_version()``), and compared
+    with the manifest. An unchanged partition is SKIPPED; a changed or missing one is computed in
+    a ``spawn`` process pool (``processes``; <=1 computes in this process) and written as
+    ``_partitions/sym=<SYMBOL>.parquet``. The manifest is saved every ``manifest_every`` finished
+    partitions and on any exit (including an exception / KeyboardInterrupt), so an interrupted run
+    loses at most that many partitions. Finally every month of the window is rewritten from the
+    partitions (skipped when nothing changed and all months exist).
+
+    A symbol whose inputs still fail after ``symbol_retries`` is reported in ``failed`` and keeps
+    its previous partition (if any). Per-partition timings (fetch/compute/write seconds) are stored
+    in the manifest; the returned summary carries totals and the slowest partitions.
+    ``fail_on_quality`` behaves as in ``build_store``.
+    """
+    from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                    ThreadPoolExecutor, wait)
+    import multiprocessing as _mp
+
+    t_start = time.perf_counter()
+    grid = scan_date_grid(start, end, cadence_days)
+    want_months = sorted({d.strftime("%Y-%m") for d in grid})
+    params = {"start": start, "end": end, "cadence_days": int(cadence_days),
+              "rvol_window": int(rvol_window), "drop_days": int(drop_days),
+              "max_lookback": int(max_lookback)}
+    params_key = _params_key(params)
+    part_dir = os.path.join(store_dir, PARTITIONS_DIR)
+    os.makedirs(part_dir, exist_ok=True)
+    manifest = load_manifest(store_dir)
+    parts = manifest["partitions"]
+    universe = enumerate_universe(api_key, market_cap_min, price_min, volume_min)
+    items = [(r["symbol"], r.get("sector")) for r in universe]
+
+    def _fetch(sym: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], float]:
+        t0 = time.perf_counter()
+        last_err = None
+        for attempt in range(symbol_retries + 1):
+            try:
+                inputs = {"ohlcv": ohlcv_get(sym, end),
+                          "market_cap": mcap_get(sym) if mcap_get is not None else None,
+                          "float": float_get(sym) if float_get is not None else None,
+                          "shares": shares_get(sym) if shares_get is not None else None}
+                return inputs, None, time.perf_counter() - t0
+            except Exception as e:  # noqa: BLE001 — one symbol must never kill the build
+                last_err = e
+                if attempt < symbol_retries:
+                    time.sleep(1.5 * (attempt + 1))
+        return None, str(last_err), time.perf_counter() - t0
+
+    built = skipped = 0
+    failed: Dict[str, str] = {}
+    timings: Dict[str, Dict[str, float]] = {}
+    unsaved = 0
+
+    def _finish(sym: str, sector: Optional[str], fp: str, fetch_s: float, res: Dict[str, Any]) -> None:
+        nonlocal built, unsaved
+        t = {"fetch_s": round(fetch_s, 4), "compute_s": res["compute_s"], "write_s": res["write_s"]}
+        old = parts.get(sym)
+        if old and old.get("file") and old["file"] != res["file"]:
+            try:
+                os.remove(os.path.join(part_dir, old["file"]))
+            except FileNotFoundError:
+                pass
+        parts[sym] = {"fingerprint": fp, "params_key": params_key, "file": res["file"],
+                      "rows": res["rows"], "sector": sector, "timings": t,
+                      "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        timings[sym] = t
+        built += 1
+        unsaved += 1
+        if manifest_every > 0 and unsaved >= manifest_every:
+            _write_manifest(store_dir, manifest)
+            unsaved = 0
+
+    n_proc = max(1, int(processes))
+    window = n_proc * 4 + max(1, int(fetch_workers))   # bound the frames held in memory
+    pool = (ProcessPoolExecutor(max_workers=n_proc, mp_context=_mp.get_context("spawn"))
+            if n_proc > 1 else None)
+    fetch_pool = ThreadPoolExecutor(max_workers=max(1, int(fetch_workers)))
+    pending: Dict[Future, Tuple[str, ...]] = {}
+    todo = iter(items)
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                nxt = next(todo, None)
+                if nxt is None:
+                    exhausted = True
+                    break
+                pending[fetch_pool.submit(_fetch, nxt[0])] = ("fetch",) + nxt
+            if not pending:
+                break
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind, sym, sector, *rest = pending.pop(fut)
+                if kind == "build":
+                    fp, fetch_s = rest
+                    try:
+                        res = fut.result()
+                    except Exception as e:  # noqa: BLE001 — keep the previous partition, go on
+                        failed[sym] = str(e)
+                        logger.warning(f"metric-store: building {sym} failed ({e})")
+                        continue
+                    _finish(sym, sector, fp, fetch_s, res)
+                    continue
+                inputs, err, fetch_s = fut.result()
+                if inputs is None:
+                    failed[sym] = err
+                    logger.warning(f"metric-store: skipping {sym} after {symbol_retries + 1} "
+                                   f"attempts ({err})")
+                    continue
+                inputs["sector"] = sector
+                fp = partition_fingerprint(inputs, params_key)
+                old = parts.get(sym)
+                if (old and old.get("fingerprint") == fp
+                        and (old.get("file") is None
+                             or os.path.exists(os.path.join(part_dir, old["file"])))):
+                    skipped += 1
+                    continue
+                if pool is not None:
+                    bf = pool.submit(_build_symbol_partition, part_dir, sym, sector, inputs,
+                                     grid, params)
+                else:                                   # processes<=1: compute in-process
+                    bf = Future()
+                    try:
+                        bf.set_result(_build_symbol_partition(part_dir, sym, sector, inputs,
+                                                              grid, params))
+                    except Exception as e:  # noqa: BLE001 — surfaced like a pool failure
+                        bf.set_exception(e)
+                pending[bf] = ("build", sym, sector, fp, fetch_s)
+    finally:
+        fetch_pool.shutdown(wait=True, cancel_futures=True)
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        # On an early exit, record builds that finished but were not collected yet
+        for fut, (kind, sym, sector, *rest) in pending.items():
+            if kind == "build" and fut.done() and not fut.cancelled() and fut.exception() is None:
+                _finish(sym, sector, rest[0], rest[1], fut.result())
+        manifest["code_version"] = code_version()
+        _write_manifest(store_dir, manifest)
+
+    have = existing_months(store_dir)
+    months_written, quality = 0, {}
+    if built or any(m not in have for m in want_months):
+        months_written, quality = _assemble_months(store_dir, manifest, [s for s, _ in items],
+                                                   params_key, want_months)
+    slowest = sorted(timings.items(), key=lambda kv: -sum(kv[1].values()))[:10]
+    summary = {"symbols": len(items), "partitions_built": built, "partitions_skipped": skipped,
+               "failed": failed, "months_written": months_written,
+               "cadence_days": cadence_days, "quality_failures": quality,
+               "elapsed_s": round(time.perf_counter() - t_start, 3),
+               "timings": {k: round(sum(t[k] for t in timings.values()), 3)
+                           for k in ("fetch_s", "compute_s", "write_s")},
+               "slowest_partitions": [{"symbol": s, **t} for s, t in slowest]}
+    logger.info(f"metric-store: partitioned build of {store_dir}: {built} built, {skipped} "
+                f"unchanged, {len(failed)} failed, {months_written} months written "
+                f"in {summary['elapsed_s']}s")
+    if quality and fail_on_quality:
+        worst = sorted(quality.items())[:8]
+        raise MetricStoreQualityError(
+            f"metric-store build wrote {len(quality)} month(s) failing column-quality thresholds "
+            f"{_BUILD_MAX_NAN} -- partitions are on disk but NOT trustworthy. "
+            f"First failures: {worst}. Pass fail_on_quality=False to record findings without raising."
+        )
+    return summary
+
+
 _STORE_MEMO: Dict[str, "pd.DataFrame"] = {}
 _SCAN_DATES_MEMO: Dict[str, List[str]] = {}
 
@@ -0,0 +1,115 @@
+"""Chunk pipeline for ``StockScreener``'s pipelined mode (``screener_pipeline=1``).
+
+The batch screener fetches a stage's payloads for EVERY candidate, waits for the whole batch,
+then filters in Python. ``run_chunk_pipeline`` overlaps the two: at most ``concurrency`` chunk
+fetches are in flight, each chunk is handed to ``on_chunk`` as soon as it arrives (in chunk
+order when ``ordered`` -- needed where the filter walks a RANKED list), and once ``stop()``
+is satisfied no further chunk is issued and the in-flight ones are cancelled. That is the
+early termination of the ranked price-drop stage: it needs only as many chunks as it takes to
+settle the top N.
+
+``StageTimer`` records per-stage wall time; ``StockScreener.screen`` returns it as
+``timings``.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from ba2_common.logger import logger
+
+
+class StageTimer:
+    """Wall-clock seconds per named stage (repeated stages accumulate)."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = round(self.timings.get(name, 0.0) + seconds, 4)
+
+    def finish(self) -> Dict[str, float]:
+        self.timings["total_s"] = round(time.perf_counter() - self._t0, 4)
+        return dict(self.timings)
+
+
+async def run_chunk_pipeline(
+    chunks: Sequence[List[str]],
+    fetch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+    on_chunk: Callable[[List[str], Dict[str, Any]], None],
+    *,
+    concurrency: int = 8,
+    ordered: bool = False,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Dict[str, Any]:
+    """Fetch ``chunks`` with at most ``concurrency`` in flight and feed each to ``on_chunk``.
+
+    ``fetch`` returns the chunk's ``{SYMBOL: payload}``; a failing fetch is logged and handed
+    on as ``{}`` (the batch fetchers skip a failed chunk the same way). ``stop`` is checked
+    after every handled chunk. Returns counts and timings (``first_chunk_s``, ``wall_s``).
+    """
+    concurrency = max(1, int(concurrency))
+    start = time.perf_counter()
+    stats: Dict[str, Any] = {"chunks_total": len(chunks), "chunks_fetched": 0,
+                             "chunks_handled": 0, "first_chunk_s": None}
+
+    async def _fetch(i: int):
+        try:
+            return i, await fetch(chunks[i])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"screener pipeline: chunk {i + 1}/{len(chunks)} failed: {e}")
+            return i, {}
+
+    pending: Dict[asyncio.Task, int] = {}
+    arrived: Dict[int, Dict[str, Any]] = {}
+    next_issue = next_handle = 0
+    stopped = False
+    try:
+        while (next_issue < len(chunks) and not stopped) or pending:
+            # Chunks waiting in the reorder buffer count against the window, so a slow chunk
+            # at the head of an ordered run cannot let the rest of the list be fetched.
+            while not stopped and next_issue < len(chunks) and len(pending) + len(arrived) < concurrency:
+                pending[asyncio.ensure_future(_fetch(next_issue))] = next_issue
+                next_issue += 1
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.pop(task)
+                i, payload = task.result()
+                stats["chunks_fetched"] += 1
+                if stats["first_chunk_s"] is None:
+                    stats["first_chunk_s"] = round(time.perf_counter() - start, 4)
+                arrived[i] = payload
+            ready = sorted(arrived) if not ordered else []
+            if ordered:
+                while next_handle in arrived:
+                    ready.append(next_handle)
+                    next_handle += 1
+            for i in ready:
+                if stopped:
+                    break
+                on_chunk(chunks[i], arrived.pop(i))
+                stats["chunks_handled"] += 1
+                stopped = bool(stop and stop())
+            if stopped:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    stats["chunks_skipped"] = len(chunks) - stats["chunks_handled"]
+    stats["wall_s"] = round(time.perf_counter() - start, 4)
+    return stats
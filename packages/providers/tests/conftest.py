@@ -34,3 +34,16 @@ def _isolated_db():
     db.configure_db(str(tmp_db))   # defined in Task 3 (db seam)
     db.init_db()                   # create_all registers provider_cache
     yield
+
+
+@pytest.fixture(autouse=True)
+def _fresh_indicator_series_cache(tmp_path, monkeypatch):
+    """PandasIndicatorCalc shares one process-wide series cache; start every test empty so a
+    fake OHLCV provider's series never leaks into the next test's, and keep its disk tier
+    (if persistence is switched on) under the test's tmp_path."""
+    from ba2_providers.indicators.series_cache import get_default_series_cache
+    cache = get_default_series_cache()
+    monkeypatch.setattr(cache, "_persist_dir", str(tmp_path / "indicator_series"))
+    cache.clear()
+    yield
+    cache.clear()
@@ -1,13 +1,24 @@
 """Compute-provider tests with canned stub providers (documented dict contracts)."""
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import pytest
 
+from ba2_common.core.finance_calc.portfolio import performance
+from ba2_common.core.finance_calc.risk import (
+    compute_beta, compute_correlation, compute_var, pct_returns,
+)
+from ba2_common.core.finance_calc.statistics import describe
+
 
 def _ohlcv_df(closes, start="2024-01-01"):
     """Stub frame using the REAL OHLCV contract: capitalized columns
-    (Date, Open, High, Low, Close, Volume) — see MarketDataProviderInterface."""
-    idx = pd.date_range(start, periods=len(closes), freq="B")
+    (Date, Open, High, Low, Close, Volume) — see MarketDataProviderInterface.
+    A ``pd.Series`` of closes keeps its own dates (a symbol's trading calendar)."""
+    if isinstance(closes, pd.Series):
+        idx, closes = closes.index, closes.tolist()
+    else:
+        idx = pd.date_range(start, periods=len(closes), freq="B")
     return pd.DataFrame({
         "Date": idx,
         "Open": closes,
@@ -108,6 +119,86 @@ def test_risk_stats_benchmark_misalignment_does_not_raise():
     assert "Risk statistics" in md
 
 
+def _reference_report(closes, bench):
+    """The per-symbol report straight from finance_calc, for histories on one calendar."""
+    rets = pct_returns(closes)
+    bench_rets = pct_returns(bench)
+    return {
+        "descriptive": describe(rets),
+        "realized_vol_annual": describe(rets)["std_sample"] * (252 ** 0.5),
+        "var_95_1d": compute_var(closes, 0.95, 1),
+        "beta": compute_beta(closes, bench),
+        "correlation": compute_correlation({"asset": closes, "benchmark": bench}),
+        "performance": performance(rets, periods_per_year=252,
+                                   benchmark=bench_rets[-len(rets):]),
+    }
+
+
+def _close(a, b):
+    if isinstance(a, dict):
+        assert set(a) == set(b)
+        for k in a:
+            _close(a[k], b[k])
+    elif isinstance(a, float) and isinstance(b, float):
+        assert a == pytest.approx(b, rel=1e-6, abs=1e-9)
+    else:
+        assert a == b
+
+
+def test_risk_stats_batch_matches_finance_calc_and_caches():
+    """The column-wise batch reproduces the finance_calc report, fetches the benchmark once,
+    and serves repeats (single or batch) from the per-(symbol, end_date, window) cache."""
+    from ba2_providers.riskstats import FinanceCalcRiskStatsProvider
+    rng = np.random.default_rng(7)
+    closes = {f"S{i}": list(100 * np.cumprod(1 + rng.normal(0, 0.02, 60))) for i in range(4)}
+    closes["SPY"] = list(400 * np.cumprod(1 + rng.normal(0, 0.01, 60)))
+    closes["FLAT"] = [50.0] * 60
+    closes["TINY"] = [1.0, 2.0, 3.0]
+    syms = ["S0", "S1", "S2", "S3", "FLAT", "TINY", "SPY"]
+
+    ohlcv = _StubOHLCV(closes)
+    p = FinanceCalcRiskStatsProvider(ohlcv)
+    batch = p.get_risk_stats_batch(syms, AS_OF, lookback_days=90)
+    assert list(batch) == syms
+    assert [c[0] for c in ohlcv.calls].count("SPY") == 1
+
+    for sym in ("S0", "S1", "S2", "S3", "FLAT", "SPY"):
+        report = {k: batch[sym][k] for k in ("descriptive", "realized_vol_annual", "var_95_1d",
+                                              "beta", "correlation", "performance")}
+        _close(report, _reference_report(closes[sym], closes["SPY"]))
+    assert batch["TINY"]["computable"] is False
+
+    n_calls = len(ohlcv.calls)
+    single = p.get_risk_stats("S2", AS_OF, lookback_days=90, format_type="dict")
+    assert single == batch["S2"] and single is not batch["S2"]
+    single["performance"]["sharpe"] = 99.0            # a caller's edit stays out of the cache
+    assert p.get_risk_stats("S2", AS_OF, lookback_days=90, format_type="dict") == batch["S2"]
+    again = p.get_risk_stats_batch(["S0", "S3"], AS_OF, lookback_days=90, format_type="markdown")
+    assert "Risk statistics — S3" in again["S3"]
+    assert len(ohlcv.calls) == n_calls
+
+
+def test_risk_stats_align_mismatched_calendars_by_date():
+    """An asset missing days the benchmark traded (and trading a day the benchmark did not)
+    is paired with the benchmark by date, and the single and batch paths agree."""
+    from ba2_providers.riskstats import FinanceCalcRiskStatsProvider
+    rng = np.random.default_rng(11)
+    days = pd.date_range("2025-10-01", periods=60, freq="B")
+    spy = pd.Series(400 * np.cumprod(1 + rng.normal(0, 0.01, 60)), index=days)
+    asset = 2 * spy.drop(days[[5, 17, 29, 41, 53]])               # local holidays
+    asset[days[30] + pd.Timedelta(days=1)] = asset[days[30]]      # a Saturday session
+    closes = {"AAA": asset.sort_index(), "SPY": spy.drop(days[-1])}
+
+    single = FinanceCalcRiskStatsProvider(_StubOHLCV(closes))
+    one = single.get_risk_stats("AAA", AS_OF, lookback_days=120, format_type="dict")
+    batch = FinanceCalcRiskStatsProvider(_StubOHLCV(closes)).get_risk_stats_batch(
+        ["AAA"], AS_OF, lookback_days=120)
+    assert one == batch["AAA"]
+    # By date, the asset moves with the benchmark; by position it would be noise.
+    assert one["beta"]["correlation"] > 0.9
+    assert one["beta"]["beta"] == pytest.approx(1.0, abs=0.15)
+
+
 def test_valuation_snapshot_contains_assumptions_and_value():
     from ba2_providers.valuation import FinanceCalcValuationProvider
     p = FinanceCalcValuationProvider(_StubOverview(), _StubDetails(),
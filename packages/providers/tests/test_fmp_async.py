@@ -0,0 +1,152 @@
+"""Pooled async FMP client (``ba2_providers.fmp_async``) against a local aiohttp stub server
+that simulates FMP's multi-symbol paths, 429s and latency. No key / network needed.
+"""
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from ba2_providers import fmp_async, fmp_common
+from ba2_providers.fmp_async import FMPAsyncClient, TokenBucket
+from ba2_providers.fmp_common import FMPError, FMPHermeticViolation, hermetic_fmp_history
+
+
+class StubFMP:
+    """Tiny FMP look-alike. ``fail_first`` 429s the first N hits of a path; ``latency`` delays
+    every response; each hit records the path and the client's source port (= connection)."""
+
+    def __init__(self, latency=0.0, fail_first=0, error_dict_first=0):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.error_dict_first = error_dict_first
+        self.hits = []
+        self.ports = set()
+
+    def make_app(self):
+        app = web.Application()  # an aiohttp app binds to one loop: build one per run
+        app.router.add_get("/api/v3/{endpoint}/{symbols}", self.handle)
+        return app
+
+    async def handle(self, request):
+        path = request.path
+        self.hits.append(path)
+        self.ports.add(request.transport.get_extra_info("peername")[1])
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.hits.count(path) <= self.fail_first:
+            return web.json_response({"message": "slow down"}, status=429, headers={"Retry-After": "0"})
+        if self.hits.count(path) <= self.fail_first + self.error_dict_first:
+            return web.json_response({"Error Message": "Limit Reach."})
+        endpoint = request.match_info["endpoint"]
+        symbols = request.match_info["symbols"].split(",")
+        if endpoint == "historical-price-full":
+            rows = [{"symbol": s, "historical": [{"date": "2026-01-02", "close": 1.0}]} for s in symbols]
+            return web.json_response({"historicalStockList": rows} if len(rows) > 1 else rows[0])
+        if endpoint in ("quote", "profile"):
+            return web.json_response([{"symbol": s, "price": float(len(s))} for s in symbols])
+        return web.json_response([{"symbol": symbols[0], "endpoint": endpoint}])
+
+
+def _run(stub, body, **client_kwargs):
+    """Start ``stub``, open a client against it and return ``await body(client)``."""
+    async def _main():
+        server = TestServer(stub.make_app())
+        await server.start_server()
+        try:
+            kwargs = {"api_key": "k", "base_url": str(server.make_url("")), "delays": (0.01, 0.01),
+                      "rate_per_minute": 60_000, **client_kwargs}
+            async with FMPAsyncClient(**kwargs) as client:
+                return await body(client), client
+        finally:
+            await server.close()
+    return asyncio.run(_main())
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limits():
+    fmp_async.reset_rate_buckets()
+    yield
+    fmp_async.reset_rate_buckets()
+    fmp_common._gate_arm(0)
+
+
+def test_fetch_many_batches_multi_symbol_endpoints_over_a_pool():
+    stub = StubFMP(latency=0.01)
+    symbols = [f"S{i:03d}" for i in range(250)] + ["s000"]  # duplicate (case) collapses
+    out, client = _run(stub, lambda c: c.fetch_many("quote", symbols), max_connections=2)
+    assert len(stub.hits) == 3  # 100 + 100 + 50
+    assert set(out) == {s.upper() for s in symbols} and out["S001"]["price"] == 4.0
+    assert len(stub.ports) <= 2  # keep-alive: three requests over at most two connections
+
+
+def test_history_and_per_symbol_endpoints_split_back_per_symbol():
+    stub = StubFMP()
+    hist, _ = _run(stub, lambda c: c.fetch_many("historical-price-full", ["A", "B", "C", "D", "E", "F"]))
+    assert sorted(hist) == list("ABCDEF") and hist["F"][0]["close"] == 1.0  # chunk of 5 + bare 1
+    per, _ = _run(stub, lambda c: c.fetch_many("income-statement", ["AAA", "BBB"]))
+    assert per["BBB"] == [{"symbol": "BBB", "endpoint": "income-statement"}]
+
+
+def test_identical_inflight_requests_are_coalesced():
+    stub = StubFMP(latency=0.1)
+
+    async def body(client):
+        return await asyncio.gather(*(client.get_json("/api/v3/quote/AAA") for _ in range(5)))
+
+    results, client = _run(stub, body)
+    assert len(stub.hits) == 1 and client.stats["coalesced"] == 4
+    assert all(r == results[0] for r in results)
+
+
+def test_429_and_error_dicts_are_retried_then_raise():
+    stub = StubFMP(fail_first=1, error_dict_first=1)
+    out, client = _run(stub, lambda c: c.get_json("/api/v3/quote/AAA", endpoint="quote"))
+    assert out == [{"symbol": "AAA", "price": 3.0}]
+    assert stub.hits.count("/api/v3/quote/AAA") == 3 and client.stats["retries"] == 2
+
+    always = StubFMP(fail_first=99)
+    with pytest.raises(FMPError):
+        _run(always, lambda c: c.get_json("/api/v3/quote/AAA", endpoint="quote"))
+    # fetch_many logs and skips a failed chunk instead of failing the batch.
+    out, _ = _run(StubFMP(fail_first=99), lambda c: c.fetch_many("quote", ["AAA"]))
+    assert out == {}
+
+
+def test_requests_are_paced_by_the_plan_and_endpoint_budgets():
+    loop_time = {}
+
+    async def body(client):
+        start = asyncio.get_running_loop().time()
+        await client.fetch_many("income-statement", [f"S{i}" for i in range(6)])
+        loop_time["elapsed"] = asyncio.get_running_loop().time() - start
+
+    # 600/min plan (burst 10) but a 300/min (5/s, burst 5) income-statement budget: the 6th
+    # request waits ~0.2s for a token.
+    _run(StubFMP(), body, rate_per_minute=600, endpoint_budgets={"income-statement": 300})
+    assert loop_time["elapsed"] >= 0.15
+
+
+def test_requests_outside_the_client_share_the_endpoint_budget():
+    async def body():
+        start = asyncio.get_running_loop().time()
+        for _ in range(6):  # 300/min = 5/s, burst 5: the 6th waits ~0.2s
+            await fmp_async.wait_endpoint_budget("historical-price-full", 300)
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(body()) >= 0.15
+    assert fmp_async._bucket("endpoint:historical-price-full", 300).reserve() > 0
+
+
+def test_token_bucket_spaces_reservations():
+    t = [0.0]
+    bucket = TokenBucket(rate_per_second=2.0, burst=2, clock=lambda: t[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    t[0] = 10.0  # refills, but never beyond the burst
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_hermetic_runs_cannot_reach_fmp():
+    with hermetic_fmp_history():
+        with pytest.raises(FMPHermeticViolation):
+            _run(StubFMP(), lambda c: c.get_json("/api/v3/quote/AAA"))
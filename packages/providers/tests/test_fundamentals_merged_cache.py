@@ -0,0 +1,182 @@
+"""Memoised FundamentalsService results (``ba2_providers.fundamentals.merged_cache``).
+
+Pinned: repeated requests between two filings are served from the memo whatever their
+``end_date``; a request past a new period, or after a provider's data version changes, is
+recomputed; unversioned providers fall back to a TTL; versioned entries survive a process
+restart through the parquet parts; and FMP versions its statements by the fmp_history file.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+import ba2_common.config as cfg
+
+from ba2_providers.fmp_common import frozen_ttl_cache
+from ba2_providers.fundamentals import merged_cache as mc
+from ba2_providers.fundamentals.details.FMPCompanyDetailsProvider import FMPCompanyDetailsProvider
+from ba2_providers.fundamentals.service import FundamentalsService
+
+
+class FakeProvider:
+    """Quarterly balance sheets at ``dates``; counts fetches. ``version`` None = unversioned."""
+
+    def __init__(self, dates, version="v1", value=1.0):
+        self.dates = sorted(dates)
+        self.version = version
+        self.value = value
+        self.calls = 0
+
+    def data_version(self, symbol, statement, frequency):
+        return self.version
+
+    def period_dates(self, symbol, statement, frequency):
+        return list(self.dates)
+
+    def get_balance_sheet(self, symbol, frequency, end_date, start_date, lookback_periods, format_type):
+        self.calls += 1
+        rows = [{"date": d, "totalAssets": self.value} for d in reversed(self.dates)
+                if datetime.strptime(d, "%Y-%m-%d") <= end_date][:lookback_periods]
+        return {"symbol": symbol, "frequency": frequency, "end_date": end_date.isoformat(), "periods": rows}
+
+
+def _service(**providers):
+    svc = FundamentalsService(providers=list(providers))
+    svc._providers = dict(providers)
+    return svc
+
+
+@pytest.fixture(autouse=True)
+def _fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "CACHE_FOLDER", str(tmp_path / "cache"))
+    monkeypatch.setattr(cfg, "FUNDAMENTALS_MERGED_CACHE_DIR", str(tmp_path / "cache" / "merged"))
+    mc.clear_merged_cache()
+    yield
+    mc.clear_merged_cache()
+
+
+DATES = ["2024-03-31", "2024-06-30", "2024-09-30"]
+
+
+def test_requests_between_filings_share_one_computation():
+    a, b = FakeProvider(DATES), FakeProvider(DATES, value=2.0)
+    svc = _service(a=a, b=b)
+    first = svc.get_balance_sheet_merged("aapl", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    for day in (2, 15, 30):
+        again = _service(a=a, b=b).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 7, day),
+                                                              lookback_periods=2)
+        assert again.periods == first.periods and again.end_date == datetime(2024, 7, day).isoformat()
+    assert (a.calls, b.calls) == (1, 1)
+
+    again.periods[0]["totalAssets"] = -1  # callers get their own copies
+    assert svc.get_balance_sheet_merged("AAPL", end_date=datetime(2024, 7, 3), lookback_periods=2).periods \
+        == first.periods
+
+    # A new quarter inside the window is a different effective period; so are other arguments.
+    svc.get_balance_sheet_merged("AAPL", end_date=datetime(2024, 10, 1), lookback_periods=2)
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    assert (a.calls, b.calls) == (3, 2)
+    stats = FundamentalsService.cache_stats()
+    assert stats["hits"] == 4 and stats["misses"] == 3 and stats["hit_rate"] == pytest.approx(4 / 7)
+
+
+def test_a_changed_provider_version_invalidates_exactly_that_key():
+    a = FakeProvider(DATES)
+    svc = _service(a=a)
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 10, 1), lookback_periods=2)
+    svc.get_balance_sheet("MSFT", end_date=datetime(2024, 7, 1), lookback_periods=2)
+
+    a.version, a.value = "v2", 5.0  # AAPL's payload was re-fetched (restated)
+    out = svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    assert out.periods[0]["totalAssets"] == 5.0 and a.calls == 4
+    assert mc.merged_cache_stats()["invalidations"] == 2  # AAPL's two entries, not MSFT's
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 2), lookback_periods=2)
+    assert a.calls == 4
+
+
+def test_unversioned_providers_fall_back_to_a_ttl(monkeypatch):
+    a = FakeProvider(DATES, version=None)
+    svc = _service(a=a)
+    now = [1000.0]
+    monkeypatch.setattr(mc.MERGED_CACHE, "_clock", lambda: now[0])
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1, 9), lookback_periods=2)
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1, 17), lookback_periods=2)  # same day
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 2), lookback_periods=2)
+    assert a.calls == 2
+    now[0] += mc.UNVERSIONED_TTL_S + 1
+    svc.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    assert a.calls == 3
+
+    # No memo at all when asked not to.
+    off = FundamentalsService(providers=["a"], memoise=False)
+    off._providers = {"a": a}
+    off.get_balance_sheet("AAPL", end_date=datetime(2024, 7, 1), lookback_periods=2)
+    assert a.calls == 4
+
+
+def test_versioned_entries_persist_across_processes():
+    a = FakeProvider(DATES)
+    with frozen_ttl_cache():
+        first = _service(a=a).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 7, 1),
+                                                       lookback_periods=2)
+        assert mc.MERGED_CACHE.flush() == 1
+    mc.clear_merged_cache()  # a fresh worker process
+
+    with frozen_ttl_cache():
+        again = _service(a=a).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 8, 1),
+                                                       lookback_periods=2)
+    assert a.calls == 1 and again.periods == first.periods
+
+    a.version = "v2"
+    with frozen_ttl_cache():
+        _service(a=a).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 8, 1), lookback_periods=2)
+        mc.MERGED_CACHE.flush()
+    assert a.calls == 2
+    assert mc.compact() == 1  # only the latest version's row survives
+
+
+def test_persistence_failures_never_reach_the_getter(monkeypatch):
+    monkeypatch.setattr(mc, "_FLUSH_EVERY", 1)
+    monkeypatch.setattr(mc, "_COMPACT_PARTS", 0)
+
+    def _vanished():
+        raise FileNotFoundError("part compacted by another worker")
+
+    monkeypatch.setattr(mc, "compact", _vanished)
+    a = FakeProvider(DATES)
+    with frozen_ttl_cache():
+        got = _service(a=a).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 7, 1),
+                                                     lookback_periods=2)
+        again = _service(a=a).get_balance_sheet_merged("AAPL", end_date=datetime(2024, 7, 2),
+                                                       lookback_periods=2)
+    assert got.periods == again.periods and a.calls == 1
+
+
+def test_concurrent_compactions_keep_every_row():
+    with frozen_ttl_cache():
+        for i in range(6):
+            mc.MERGED_CACHE.put(f"base-{i}", "v1", "e", "{}")
+            mc.MERGED_CACHE.flush()
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: mc.compact(), range(8)))
+    assert mc.compact() == 6
+
+def test_fmp_versions_statements_by_their_history_file():
+    provider = object.__new__(FMPCompanyDetailsProvider)
+    folder = os.path.join(cfg.CACHE_FOLDER, "fmp_history")
+    os.makedirs(folder)
+    path = os.path.join(folder, "balance_sheet_quarter__AAPL.json")
+    with open(path, "w") as f:
+        json.dump([{"date": "2024-06-30"}, {"date": "2024-03-31"}, {"eps": 1.0}], f)
+
+    assert provider.data_version("AAPL", "balance_sheet", "quarterly") is None  # live: unversioned
+    with frozen_ttl_cache():
+        v1 = provider.data_version("aapl", "balance_sheet", "quarterly")
+        assert v1 is not None
+        assert provider.period_dates("AAPL", "balance_sheet", "quarterly") == ["2024-03-31", "2024-06-30"]
+        assert provider.data_version("AAPL", "cash_flow", "quarterly") is None  # not cached yet
+        os.utime(path, ns=(1, 1))
+        assert provider.data_version("AAPL", "balance_sheet", "quarterly") != v1
@@ -0,0 +1,175 @@
+"""Indicator series cache behind PandasIndicatorCalc.
+
+A repeat request must not touch the OHLCV provider, a later end date must only fetch the
+new bars yet give the same values as a fresh computation, and a cached series must never
+serve bars past what the provider would return (partial bars, capped backtest clocks).
+"""
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ba2_providers.indicators.PandasIndicatorCalc import PandasIndicatorCalc
+from ba2_providers.indicators.series_cache import IndicatorSeriesCache
+
+
+class _OHLCV:
+    """Serves a fixed synthetic daily frame sliced to the requested range; records calls."""
+
+    def __init__(self, n=900, seed=0):
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+        spread = np.abs(rng.normal(0, 0.01, n)) * close
+        self.df = pd.DataFrame({
+            "Date": pd.date_range("2022-01-03", periods=n, freq="D", tz="UTC"),
+            "Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+            "Volume": rng.integers(1_000, 9_000, n).astype(float),
+        })
+        self.calls = []
+        self.cap = None
+
+    def get_provider_name(self):
+        return "fake"
+
+    def get_ohlcv_data(self, symbol, start_date=None, end_date=None, interval="1d"):
+        self.calls.append((pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        if self.cap is not None and pd.Timestamp(end_date) > self.cap:
+            end_date = self.cap
+        d = self.df["Date"]
+        return self.df[(d >= pd.Timestamp(start_date)) & (d <= pd.Timestamp(end_date))].reset_index(drop=True)
+
+
+def _day(i):
+    return datetime(2022, 1, 3, tzinfo=timezone.utc) + timedelta(days=i)
+
+
+def _values(calc, indicator, start, end):
+    return calc._calculate_indicator_for_range("AAPL", indicator, start, end, "1d")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return IndicatorSeriesCache(max_entries=8, persist_dir=str(tmp_path))
+
+
+def test_repeat_request_is_a_hit_without_fetching(cache):
+    ohlcv = _OHLCV()
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    first = _values(calc, "rsi", _day(400), _day(500))
+    calls = len(ohlcv.calls)
+
+    second = _values(calc, "rsi", _day(420), _day(480))
+    assert len(ohlcv.calls) == calls
+    assert cache.stats.hits == 1 and cache.stats.misses == 1
+    pd.testing.assert_frame_equal(second.reset_index(drop=True),
+                                  first[first["Date"].between("2023-02-27", "2023-04-28 23:59")]
+                                  .reset_index(drop=True))
+
+    # Another calculator instance (another expert) shares nothing but the cache
+    PandasIndicatorCalc(ohlcv, series_cache=cache)._calculate_indicator_for_range(
+        "aapl", "rsi", _day(450), _day(460), "1d")
+    assert cache.stats.hits == 2 and len(ohlcv.calls) == calls
+
+
+@pytest.mark.parametrize("indicator", ["close_50_sma", "boll_ub", "atr", "macd"])
+def test_extension_fetches_only_new_bars_and_matches_fresh_compute(cache, indicator):
+    ohlcv = _OHLCV()
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    _values(calc, indicator, _day(400), _day(500))
+    for step in range(501, 531):
+        got = _values(calc, indicator, _day(400), _day(step))
+        since, _ = ohlcv.calls[-1]
+        assert (_day(step) - since.to_pydatetime()).days <= 2   # no year-long warm-up refetch
+    assert cache.stats.extensions == 30 and cache.stats.misses == 1
+
+    fresh = PandasIndicatorCalc(_OHLCV(), series_cache=None)
+    expected = _values(fresh, indicator, _day(400), _day(530))
+    assert list(got["Date"]) == list(expected["Date"])
+    # Rolling indicators agree to rounding; Wilder/EMA ones differ only by the decayed
+    # influence of a different warm-up start (fresh compute starts ~30 bars later).
+    rtol = 1e-9 if indicator in ("close_50_sma", "boll_ub") else 1e-4
+    np.testing.assert_allclose(got["value"].values, expected["value"].values, rtol=rtol)
+
+
+def test_revised_last_bar_is_replayed(cache):
+    ohlcv = _OHLCV()
+    final_close = ohlcv.df.loc[500, "Close"]
+    ohlcv.df.loc[500, "Close"] = final_close * 1.05          # partial bar as first seen
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    _values(calc, "close_10_ema", _day(400), _day(500))
+
+    ohlcv.df.loc[500, "Close"] = final_close                 # bar completes, next bar arrives
+    got = _values(calc, "close_10_ema", _day(400), _day(501))
+    assert cache.stats.extensions == 1
+
+    # Same start date -> same warm-up start, so only the replayed bars can differ
+    expected = _values(PandasIndicatorCalc(ohlcv, series_cache=None), "close_10_ema", _day(400), _day(501))
+    np.testing.assert_allclose(got["value"].values, expected["value"].values, rtol=1e-9)
+
+
+def test_capped_provider_never_gets_bars_past_its_clock(cache):
+    ohlcv = _OHLCV()
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    _values(calc, "rsi", _day(400), _day(600))               # cache runs to day 600
+
+    ohlcv.max_end_date = lambda: _day(450)                   # a backtest clock at day 450
+    got = _values(calc, "rsi", _day(400), datetime.now(timezone.utc))
+    assert cache.stats.hits == 1
+    assert pd.Timestamp(got["Date"].iloc[-1]) == pd.Timestamp(_day(450).replace(tzinfo=None))
+
+
+def test_restated_history_rebuilds(cache):
+    ohlcv = _OHLCV()
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    _values(calc, "rsi", _day(400), _day(500))
+    ohlcv.df = ohlcv.df.drop(index=500).reset_index(drop=True)  # the bar we ended on vanished
+    _values(calc, "rsi", _day(400), _day(520))
+    assert cache.stats.rebuilds == 1 and cache.stats.misses == 2
+
+
+def test_bounded_entries_and_disk_persistence(tmp_path):
+    ohlcv = _OHLCV(n=600)
+    cache = IndicatorSeriesCache(max_entries=2, max_bars=300, persist_dir=str(tmp_path))
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    for indicator in ("rsi", "atr", "close_10_ema"):
+        _values(calc, indicator, _day(450), _day(500))
+    assert len(cache) == 2 and cache.stats.evictions == 1   # rsi evicted (and written)
+    assert cache.flush() == 2
+
+    restarted = IndicatorSeriesCache(persist_dir=str(tmp_path))
+    calls = len(ohlcv.calls)
+    got = PandasIndicatorCalc(ohlcv, series_cache=restarted)._calculate_indicator_for_range(
+        "AAPL", "rsi", _day(460), _day(500), "1d")
+    assert restarted.stats.disk_loads == 1 and restarted.stats.hits == 1
+    assert len(ohlcv.calls) == calls and len(got) == 41
+    assert restarted.stats.as_dict()["hit_rate"] == 1.0
+
+
+def test_memory_only_cache_never_writes(tmp_path):
+    ohlcv = _OHLCV(n=600)
+    cache = IndicatorSeriesCache(max_entries=1, persist_dir=str(tmp_path), persist=False)
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    for indicator in ("rsi", "atr"):
+        _values(calc, indicator, _day(450), _day(500))
+    assert cache.stats.evictions == 1 and cache.flush() == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_default_cache_persists_only_when_opted_in(monkeypatch):
+    import ba2_common.config as cfg
+    from ba2_providers.indicators import series_cache as sc
+
+    monkeypatch.setattr(sc, "_default_cache", None)
+    assert not sc.get_default_series_cache().persist
+    monkeypatch.setattr(sc, "_default_cache", None)
+    monkeypatch.setattr(cfg, "INDICATOR_SERIES_PERSIST", True)
+    monkeypatch.setattr(sc.atexit, "register", lambda fn: fn)
+    assert sc.get_default_series_cache().persist
+
+def test_request_before_cached_range_recomputes(cache):
+    ohlcv = _OHLCV()
+    calc = PandasIndicatorCalc(ohlcv, series_cache=cache)
+    _values(calc, "rsi", _day(400), _day(500))
+    _values(calc, "rsi", _day(300), _day(500))
+    assert cache.stats.misses == 2
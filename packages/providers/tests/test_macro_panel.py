@@ -0,0 +1,137 @@
+"""Aligned daily macro panel (``ba2_providers.macro.macro_panel``).
+
+Pinned: every panel row equals the last point of ``fred_series.get_series_as_of`` for each
+series at that as_of (so the vintage no-lookahead cut carries over); a refresh after new
+observations appends only the new days and reads back identical to a full rebuild; a restated
+history forces a rebuild; and a series with no cache file is an empty column, not a failure.
+
+No network: synthetic cache files, as in test_fred_series_point_in_time.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ba2_providers.macro import fred_series as fs
+from ba2_providers.macro import macro_panel as mp
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(fs, "CACHE_FOLDER", str(tmp_path))
+    fs.reset_cache()
+    mp.clear_panel_memo()
+    yield
+    fs.reset_cache()
+    mp.clear_panel_memo()
+
+
+def _write(series_id, observations):
+    os.makedirs(os.path.join(fs.CACHE_FOLDER, "fred"), exist_ok=True)
+    with open(fs.cache_path(series_id), "w", encoding="utf-8") as fh:
+        json.dump({"series_id": series_id, "observations": observations}, fh)
+    fs.reset_cache()
+
+
+def _vix(days):
+    return [{"date": f"{d:%Y-%m-%d}", "value": "." if d.day == 13 else f"{12 + d.day / 10:.2f}"}
+            for d in days if d.weekday() < 5]
+
+
+UNRATE = [
+    {"date": "2023-11-01", "value": "3.7", "realtime_start": "2023-12-08"},
+    {"date": "2023-12-01", "value": "3.7", "realtime_start": "2024-01-05"},
+    {"date": "2024-01-01", "value": "3.9", "realtime_start": "2024-02-02"},
+]
+
+
+def _assert_matches_series(panel, dates, series):
+    for day in dates:
+        row = panel.as_of(day)
+        for sid in series:
+            s = fs.get_series_as_of(sid, day)
+            if len(s):
+                assert row.loc[sid, "value"] == pytest.approx(s.iloc[-1]), (sid, day)
+                assert row.loc[sid, "date"] == s.index[-1], (sid, day)
+            else:
+                assert np.isnan(row.loc[sid, "value"]) and pd.isna(row.loc[sid, "date"]), (sid, day)
+
+
+def test_rows_match_get_series_as_of_without_lookahead(tmp_path):
+    _write("VIXCLS", _vix(pd.date_range("2023-12-01", "2024-02-29")))
+    _write("UNRATE", UNRATE)
+    out = str(tmp_path / "panel")
+    stats = mp.refresh_panel(out, series=["VIXCLS", "UNRATE"])
+    assert stats["mode"] == "rebuild" and stats["end"] == "2024-02-29"
+
+    panel = mp.MacroPanel.load(out)
+    _assert_matches_series(panel, ["2023-11-30", "2023-12-07 23:59", *pd.date_range("2023-12-01", "2024-03-10"),
+                                   pd.Timestamp("2024-02-02 09:30", tz="America/New_York")],
+                           ["VIXCLS", "UNRATE"])
+    # January's rate is not known on the 31st, however close its observation date is.
+    assert panel.as_of("2024-01-31").loc["UNRATE", "date"] == pd.Timestamp("2023-12-01")
+
+    bars = ["2024-01-31", "2024-02-02", "2023-01-01"]
+    wide = panel.values(bars, series=["unrate"])
+    assert list(wide.columns) == ["UNRATE"]
+    assert wide["UNRATE"].tolist()[:2] == [3.7, 3.9] and np.isnan(wide["UNRATE"].iloc[2])
+    assert panel.as_of(None).loc["VIXCLS", "date"] == pd.Timestamp("2024-02-29")
+
+
+def test_refresh_appends_new_days_and_rebuilds_on_restatement(tmp_path):
+    out = str(tmp_path / "panel")
+    _write("VIXCLS", _vix(pd.date_range("2023-12-01", "2024-01-31")))
+    _write("UNRATE", UNRATE[:2])
+    mp.refresh_panel(out, series=["VIXCLS", "UNRATE"])
+    assert mp.refresh_panel(out, series=["VIXCLS", "UNRATE"])["mode"] == "unchanged"
+
+    _write("VIXCLS", _vix(pd.date_range("2023-12-01", "2024-02-29")))
+    _write("UNRATE", UNRATE)
+    stats = mp.refresh_panel(out, series=["VIXCLS", "UNRATE"])
+    assert stats["mode"] == "append" and stats["days_added"] == 29 and stats["parts"] == 2
+    appended = mp.MacroPanel.load(out)
+    assert appended.as_of("2024-02-05").loc["UNRATE", "value"] == pytest.approx(3.9)
+
+    mp.refresh_panel(str(tmp_path / "full"), series=["VIXCLS", "UNRATE"], full=True)
+    full = mp.MacroPanel.load(str(tmp_path / "full"))
+    np.testing.assert_array_equal(appended.days, full.days)
+    pd.testing.assert_frame_equal(appended.values(full.days), full.values(full.days))
+
+    # A back-filled value inside the panelled range cannot be appended.
+    restated = _vix(pd.date_range("2023-12-01", "2024-02-29"))
+    restated[3]["value"] = "99.0"
+    restated.insert(0, {"date": "2023-11-30", "value": "20.0"})
+    _write("VIXCLS", restated)
+    stats = mp.refresh_panel(out, series=["VIXCLS", "UNRATE"])
+    assert stats["mode"] == "rebuild" and stats["parts"] == 1
+    assert len([n for n in os.listdir(out) if n.endswith(".parquet")]) == 1
+    _assert_matches_series(mp.MacroPanel.load(out), pd.date_range("2023-11-29", "2023-12-10"), ["VIXCLS"])
+
+
+def test_a_restated_value_with_a_new_day_still_rebuilds(tmp_path):
+    out = str(tmp_path / "panel")
+    days = pd.date_range("2024-01-01", "2024-01-31")
+    _write("VIXCLS", _vix(days))
+    mp.refresh_panel(out, series=["VIXCLS"])
+
+    # Same row count up to the panel's end, one value rewritten, plus one new day.
+    restated = _vix(days.append(pd.DatetimeIndex(["2024-02-01"])))
+    restated[5]["value"] = "30.0"
+    _write("VIXCLS", restated)
+    assert mp.refresh_panel(out, series=["VIXCLS"])["mode"] == "rebuild"
+    day = restated[5]["date"]
+    assert mp.MacroPanel.load(out).as_of(day).loc["VIXCLS", "value"] == pytest.approx(30.0)
+    _assert_matches_series(mp.MacroPanel.load(out), days, ["VIXCLS"])
+
+def test_missing_series_is_an_empty_column(tmp_path):
+    _write("VIXCLS", _vix(pd.date_range("2024-01-01", "2024-01-10")))
+    out = str(tmp_path / "panel")
+    stats = mp.refresh_panel(out, series=["VIXCLS", "PAYEMS"])
+    assert stats["missing"] == ["PAYEMS"]
+    row = mp.MacroPanel.load(out).as_of("2024-01-10")
+    assert row.loc["VIXCLS", "value"] == pytest.approx(13.0) and np.isnan(row.loc["PAYEMS", "value"])
+
+    with pytest.raises(FileNotFoundError, match="refresh_fred_cache"):
+        mp.MacroPanel.load(str(tmp_path / "nowhere"))
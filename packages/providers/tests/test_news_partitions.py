@@ -0,0 +1,182 @@
+"""Date-partitioned news layout (``ba2_providers.news.partitioned``).
+
+Pinned: after the migration, every point-in-time window query returns exactly what the
+per-symbol files return (``read_sentiment``); a universe query is one pushed-down scan per
+month in the window; writes through ``store.write_scored`` keep both layouts in step (batched
+writes mirror once per batch, concurrent writers serialise); and the absence contract
+(missing/uncovered raises, quiet window or empty file empty) carries over unchanged.
+"""
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import ba2_common.config as cfg
+
+from ba2_providers.news import partitioned as pt
+from ba2_providers.news import store as st
+
+
+@pytest.fixture(autouse=True)
+def _tmp_store(tmp_path, monkeypatch):
+    common = tmp_path / "common"
+    monkeypatch.setattr(cfg, "COMMON_DIR", str(common))
+    monkeypatch.setattr(cfg, "CACHE_FOLDER", str(common / "cache"))
+    st.reset_cache()
+    yield
+    st.reset_cache()
+
+
+def _scored(dates, model="finbert-legacy", prefix="h", pos=0.6):
+    n = len(dates)
+    return pd.DataFrame({
+        "url_hash": [f"{prefix}{i}" for i in range(n)],
+        "published_at": pd.to_datetime(dates),
+        "provider": ["fmp"] * n, "model": [model] * n,
+        "score": [pos] * n, "pos": [pos] * n, "neu": [0.2] * n, "neg": [0.2] * n,
+    })
+
+
+def _seed():
+    days = pd.date_range("2024-04-20", "2024-07-10", freq="2D")
+    st.write_scored("NVDA", pd.concat([_scored(days), _scored(days[::3], model="candidate-v2")],
+                                      ignore_index=True))
+    st.write_scored("MSFT", _scored(days[::2], prefix="m"))
+    st.write_scored("AMD", _scored(["2024-06-03 14:30"], prefix="a"))
+    st.write_scored("QUIET", _scored(["2023-01-05"], prefix="q"))
+
+
+def _same(a: pd.DataFrame, b: pd.DataFrame):
+    # The per-symbol store sorts on published_at alone, so same-instant rows (two models
+    # scoring one article) come back in no particular order: compare on a total order.
+    key = [c for c in ("symbol", "published_at", "model", "url_hash", "partition") if c in a.columns]
+    pd.testing.assert_frame_equal(a.sort_values(key).reset_index(drop=True),
+                                  b.sort_values(key).reset_index(drop=True), check_dtype=False)
+
+
+def test_window_queries_match_the_per_symbol_store():
+    _seed()
+    stats = pt.migrate_from_per_symbol()
+    assert stats["symbols"] == 4 and stats["partitions"] == 5  # 2023-01, 2024-04..07
+
+    cases = [(None, None, None), (datetime(2024, 6, 1), 7, None), (datetime(2024, 6, 3, 15), 3, None),
+             (datetime(2024, 5, 1), None, "candidate-v2"), (datetime(2024, 7, 1), 30, "finbert-legacy"),
+             (datetime(2024, 1, 1), 30, None)]
+    for sym in ("NVDA", "MSFT", "AMD", "QUIET"):
+        for as_of, window, model in cases:
+            _same(pt.read_symbol(sym, as_of, window, model),
+                  st.read_sentiment(sym, as_of, window, model))
+
+    many = st.read_sentiment_many(["nvda", "AMD", "MSFT"], datetime(2024, 6, 5), window_days=10)
+    expected = pd.concat([st.read_sentiment(s, datetime(2024, 6, 5), 10).assign(symbol=s)
+                          for s in ("AMD", "MSFT", "NVDA")], ignore_index=True)
+    _same(many, expected.loc[:, ["symbol"] + st.SCORED_COLUMNS])
+
+
+def test_universe_read_is_one_pushed_down_scan_per_month(monkeypatch):
+    _seed()
+    pt.migrate_from_per_symbol()
+    reads = []
+    real = pd.read_parquet
+
+    def _spy(path, *a, **k):
+        if "_partitions" in str(path) and not str(path).endswith(("_index.parquet", "_keys.parquet", "_covered.parquet")):
+            reads.append((str(path), k.get("filters")))
+        return real(path, *a, **k)
+
+    monkeypatch.setattr(pd, "read_parquet", _spy)
+    out = pt.read_window(["NVDA", "MSFT", "AMD"], datetime(2024, 6, 20), window_days=10)
+    assert [p.rsplit("/", 1)[-1] for p, _ in reads] == ["2024-06.parquet"]
+    assert ("symbol", "in", ["AMD", "MSFT", "NVDA"]) in reads[0][1]
+    assert set(out["symbol"]) == {"NVDA", "MSFT"}  # AMD's one article is outside the window
+
+    reads.clear()
+    pt.read_window(["NVDA", "MSFT"], datetime(2024, 6, 3), window_days=14)  # spans May/June
+    assert sorted(p.rsplit("/", 1)[-1] for p, _ in reads) == ["2024-05.parquet", "2024-06.parquet"]
+
+
+def test_absence_contract_carries_over():
+    st.write_scored("NVDA", _scored(["2024-01-02"]))
+    with pytest.raises(st.NewsStoreError, match="has not been built"):
+        pt.read_window(["NVDA"], datetime(2024, 6, 1))
+    assert len(st.read_sentiment_many(["NVDA"])) == 1  # per-symbol fallback before migration
+
+    pt.migrate_from_per_symbol()
+    with pytest.raises(st.NewsStoreError, match="not in the news store"):
+        st.read_sentiment_many(["NVDA", "TSLA"], datetime(2024, 6, 1))
+    assert st.read_sentiment_many(["NVDA"], datetime(2024, 6, 1), window_days=7).empty
+
+
+def test_a_symbol_with_an_empty_scored_file_stays_covered():
+    st.write_scored("AAA", _scored(["2024-06-03"]))
+    st.write_scored("QUIET", _scored([]))
+    assert st.read_sentiment("QUIET").empty
+    pt.migrate_from_per_symbol()
+
+    out = st.read_sentiment_many(["AAA", "QUIET"], datetime(2024, 6, 5), window_days=7)
+    assert list(out["symbol"]) == ["AAA"]
+    assert pt.covered_symbols() == ["AAA", "QUIET"]
+    pt.rebuild_index()  # QUIET has no partition rows to rebuild from
+    assert st.read_sentiment_many(["QUIET"]).empty
+    # Emptying a symbol through a write keeps it covered too.
+    st.write_scored("AAA", _scored([]))
+    assert st.read_sentiment_many(["AAA", "QUIET"]).empty
+
+
+def test_writes_after_migration_keep_both_layouts_in_step():
+    _seed()
+    pt.migrate_from_per_symbol()
+
+    # A challenger model is upserted next to the legacy rows; a whole-symbol rewrite drops
+    # rows that are gone from the file.
+    st.upsert_scored("MSFT", _scored(["2024-06-10"], model="candidate-v2", prefix="m"))
+    st.write_scored("AMD", _scored(["2024-07-01"], prefix="a"))
+    for sym in ("MSFT", "AMD"):
+        _same(pt.read_symbol(sym), st.read_sentiment(sym))
+    assert "2024-06" not in set(pt.load_index().query("symbol == 'AMD'")["partition"])
+
+    # A vendor re-stamp across a month boundary moves the row instead of duplicating it.
+    moved = _scored(["2024-08-02"], prefix="a").assign(symbol="AMD")
+    pt.upsert_rows(moved)
+    amd = pt.read_symbol("AMD")
+    assert len(amd) == 1 and str(amd["published_at"].iloc[0].date()) == "2024-08-02"
+    assert set(pt.load_key_index().query("symbol == 'AMD'")["partition"]) == {"2024-08"}
+
+
+def test_batched_upserts_mirror_once_per_batch(monkeypatch):
+    _seed()
+    pt.migrate_from_per_symbol()
+    calls = []
+    real = pt.upsert_rows
+    monkeypatch.setattr(pt, "upsert_rows", lambda df, replace_symbols=None: (
+        calls.append(sorted(replace_symbols)), real(df, replace_symbols))[1])
+
+    batch = {sym: _scored(["2024-06-10", "2024-07-02"], model="candidate-v3", prefix=sym.lower())
+             for sym in ("NVDA", "MSFT", "AMD")}
+    assert st.upsert_scored_many(batch) == sum(len(st.read_sentiment(s)) for s in batch)
+    assert calls == [["AMD", "MSFT", "NVDA"]]
+    for sym in ("NVDA", "MSFT", "AMD", "QUIET"):
+        _same(pt.read_symbol(sym), st.read_sentiment(sym))
+
+
+def test_concurrent_writers_do_not_lose_index_rows():
+    from concurrent.futures import ThreadPoolExecutor
+
+    st.write_scored("SEED", _scored(["2024-06-01"], prefix="s"))
+    pt.migrate_from_per_symbol()
+    syms = [f"S{i:02d}" for i in range(12)]
+    with ThreadPoolExecutor(6) as pool:
+        list(pool.map(lambda s: pt.upsert_rows(_scored(["2024-06-02"], prefix=s).assign(symbol=s)), syms))
+    assert pt.covered_symbols() == sorted(syms + ["SEED"])
+    assert set(pt.load_index()["symbol"]) == set(syms) | {"SEED"}
+    assert len(pt.read_window(syms)) == len(syms)
+
+
+def test_rebuild_index_recovers_the_index_files():
+    _seed()
+    pt.migrate_from_per_symbol()
+    before = pt.load_index().sort_values(["symbol", "partition"]).reset_index(drop=True)
+    total = pt.rebuild_index()
+    after = pt.load_index().sort_values(["symbol", "partition"]).reset_index(drop=True)
+    _same(before, after)
+    assert total == int(before["rows"].sum())
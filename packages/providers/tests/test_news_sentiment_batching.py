@@ -0,0 +1,72 @@
+"""Batched sentiment scoring: token-budget batches and the persistent text-score cache.
+
+Nothing here loads a model -- the cache is exercised with a fake scorer, which is also
+what pins that a cached text never reaches the model a second time.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import ba2_common.config as cfg
+
+from ba2_providers.news import sentiment, store
+
+
+@pytest.fixture(autouse=True)
+def _tmp_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "COMMON_DIR", str(tmp_path / "common"))
+    monkeypatch.setattr(cfg, "CACHE_FOLDER", str(tmp_path / "common" / "cache"))
+    store.reset_cache()
+    yield
+    store.reset_cache()
+
+
+class _FakeScorer:
+    version = sentiment.model_version("finbert", 256)
+
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, texts):
+        self.seen.extend(texts)
+        pos = np.array([(len(t) % 7) / 10 for t in texts], dtype=np.float32)
+        neg = np.full(len(texts), 0.05, dtype=np.float32)
+        return pd.DataFrame({"pos": pos, "neu": 1 - pos - neg, "neg": neg, "score": pos - neg})
+
+
+def test_token_batches_respect_the_padded_budget():
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(8, 257, 2000)
+    batches = sentiment.token_batches(lengths, max_tokens=32 * 256, max_rows=256)
+    assert sorted(np.concatenate(batches).tolist()) == list(range(2000))
+    for b in batches:
+        assert len(b) <= 256 and (len(b) == 1 or len(b) * lengths[b].max() <= 32 * 256)
+    # Short rows share far fewer forward passes than fixed 32-row batches would need
+    assert len(batches) < 2000 / 32
+    assert len(sentiment.token_batches([300], max_tokens=100, max_rows=4)) == 1
+
+
+def test_cached_scoring_scores_each_text_once_and_keeps_alignment():
+    texts = ["Shares jump on record revenue", "", "Guidance cut", "Shares jump on record revenue",
+             None, "Guidance cut"]
+    fake = _FakeScorer()
+    first = sentiment.score_texts_cached(texts, "finbert", scorer=fake)
+    assert fake.seen == ["Shares jump on record revenue", "Guidance cut"]   # deduplicated
+    assert len(first) == len(texts)
+    assert first.loc[[1, 4], "neu"].tolist() == [1.0, 1.0]                  # blanks neutral
+    assert first.iloc[0].tolist() == first.iloc[3].tolist()
+
+    fake2 = _FakeScorer()
+    store.reset_cache()                                                     # a new process
+    again = sentiment.score_texts_cached(texts + ["New headline"], "finbert", scorer=fake2)
+    assert fake2.seen == ["New headline"]
+    pd.testing.assert_frame_equal(again.iloc[:len(texts)], first)
+
+
+def test_model_version_separates_truncation_lengths_and_resolves_hf_ids():
+    assert sentiment.model_version("finbert", 256) != sentiment.model_version("finbert", 512)
+    assert sentiment.model_key_for("ProsusAI/finbert") == "finbert"
+    assert sentiment.model_key_for("finbert-tone") == "finbert-tone"
+    assert sentiment.model_key_for("someone/else") is None
+    with pytest.raises(ValueError):
+        sentiment.model_version("nope")
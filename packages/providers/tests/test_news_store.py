@@ -8,6 +8,7 @@ uncovered symbol RAISES, a covered symbol with a quiet week returns EMPTY.
 Also pinned: raw text lives outside CACHE_FOLDER, so it never enters the sync manifest.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pandas as pd
@@ -195,3 +196,48 @@ def test_coverage_report_lists_symbols_and_models():
     assert rep.loc[0, "symbol"] == "NVDA"
     assert rep.loc[0, "articles"] == 2
     assert rep.loc[0, "models"] == "finbert-legacy"
+
+
+# --- text-score cache ------------------------------------------------------------------
+
+def _text_scores(texts, pos=0.7):
+    return pd.DataFrame({"text_hash": [st.text_hash(t) for t in texts], "pos": pos,
+                         "neu": 0.2, "neg": 0.1, "score": pos - 0.1})
+
+
+def test_text_scores_roundtrip_per_model_version_and_stay_out_of_coverage():
+    st.append_text_scores("finbert@main.L256", _text_scores(["a", "b"]))
+    st.append_text_scores("finbert@main.L512", _text_scores(["a"], pos=0.4))
+    got = st.read_text_scores("finbert@main.L256", [st.text_hash(t) for t in ("a", "b", "c")])
+    assert set(got.index) == {st.text_hash("a"), st.text_hash("b")}
+    assert st.read_text_scores("finbert@main.L512", [st.text_hash("a")])["pos"].iloc[0] == 0.4
+    assert st.covered_symbols() == [] and not st.store_exists()
+    with pytest.raises(ValueError):
+        st.text_scores_folder("../escape")
+
+
+def test_text_scores_pick_up_other_writers_and_survive_compaction(monkeypatch):
+    mv = "finbert@main.L256"
+    st.append_text_scores(mv, _text_scores(["a"]))
+    assert len(st.read_text_scores(mv, [st.text_hash("a"), st.text_hash("b")])) == 1
+    # Another process appends a part: the memoised table must see it without a reset
+    _text_scores(["b"]).to_parquet(os.path.join(st.text_scores_folder(mv), "part-other.parquet"))
+    assert len(st.read_text_scores(mv, [st.text_hash("a"), st.text_hash("b")])) == 2
+
+    monkeypatch.setattr(st, "_TEXT_SCORE_COMPACT_PARTS", 3)
+    for t in ("c", "d"):
+        st.append_text_scores(mv, _text_scores([t]))
+    assert len(os.listdir(st.text_scores_folder(mv))) == 1
+    hashes = [st.text_hash(t) for t in "abcd"]
+    assert sorted(st.read_text_scores(mv, hashes).index) == sorted(hashes)
+
+
+def test_concurrent_compactions_do_not_fail_the_writers():
+    mv = "finbert@main.L256"
+    for t in "abcdef":
+        st.append_text_scores(mv, _text_scores([t]))
+    with ThreadPoolExecutor(4) as pool:      # each removes only parts it has already merged
+        list(pool.map(lambda _: st.compact_text_scores(mv), range(8)))
+    hashes = [st.text_hash(t) for t in "abcdef"]
+    st.reset_cache()
+    assert sorted(st.read_text_scores(mv, hashes).index) == sorted(hashes)
@@ -628,3 +628,84 @@ def test_screen_universe_for_day_price_max_point_in_time():
     # 0 disables the filter entirely (the --max-stock-price 0 escape hatch).
     assert set(ms.screen_universe_for_day(df, "2024-02-29",
                                           {"price_max": 0, "max_stocks": 10000})) == {"AAA", "BBB"}
+
+
+def _bars(n=400, seed=0):
+    idx = pd.date_range("2022-06-01", periods=n, freq="B")
+    close = pd.Series(50 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n)), index=idx)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close,
+                         "Volume": np.full(n, 1e6)})
+
+
+_PART_UNIVERSE = [{"symbol": s, "marketCap": 5e9, "price": 30.0, "volume": 2e6, "sector": "Tech"}
+                  for s in ("AAA", "BBB", "CCC", "DDD")]
+
+
+def _build_partitioned(store, bars, rows=_PART_UNIVERSE, **kw):
+    with patch.object(ms, "_fetch_screener_rows", return_value=rows):
+        return ms.build_store_partitioned(
+            store, "x", "2023-06-01", "2023-09-30", market_cap_min=0, price_min=0, volume_min=0,
+            ohlcv_get=lambda sym, end: bars[sym], shares_get=lambda sym: 1e6,
+            fail_on_quality=False, **{"processes": 1, "fetch_workers": 1, **kw})
+
+
+def _sorted_store(store):
+    ms.clear_store_memo()
+    df = ms.load_store(store)
+    return df.sort_values(["date", "symbol"]).reset_index(drop=True)
+
+
+def test_partitioned_build_matches_one_shot_build_and_skips_unchanged(tmp_path):
+    bars = {s: _bars(seed=i) for i, s in enumerate(("AAA", "BBB", "CCC", "DDD"))}
+    with patch.object(ms, "_fetch_screener_rows", return_value=_PART_UNIVERSE):
+        ms.build_store(str(tmp_path / "ref"), "x", "2023-06-01", "2023-09-30", market_cap_min=0,
+                       price_min=0, volume_min=0, ohlcv_get=lambda sym, end: bars[sym],
+                       shares_get=lambda sym: 1e6, fail_on_quality=False)
+    store = str(tmp_path / "parts")
+    first = _build_partitioned(store, bars, processes=2)       # real spawn pool
+    assert first["partitions_built"] == 4 and first["months_written"] == 4
+    assert set(first["timings"]) == {"fetch_s", "compute_s", "write_s"}
+    pd.testing.assert_frame_equal(_sorted_store(store), _sorted_store(str(tmp_path / "ref")),
+                                  check_like=True)
+    man = ms.load_manifest(store)
+    assert set(man["partitions"]) == {"AAA", "BBB", "CCC", "DDD"}
+    assert man["partitions"]["AAA"]["timings"]["compute_s"] >= 0
+
+    again = _build_partitioned(store, bars)
+    assert (again["partitions_built"], again["partitions_skipped"], again["months_written"]) == (0, 4, 0)
+
+    # New bars for one symbol + one new symbol -> only those two are recomputed
+    bars["BBB"] = _bars(seed=99)
+    bars["EEE"] = _bars(seed=5)
+    rows = _PART_UNIVERSE + [{**_PART_UNIVERSE[0], "symbol": "EEE"}]
+    inc = _build_partitioned(store, bars, rows=rows)
+    assert (inc["partitions_built"], inc["partitions_skipped"]) == (2, 3)
+    df = _sorted_store(store)
+    assert set(df["symbol"]) == {"AAA", "BBB", "CCC", "DDD", "EEE"}
+    assert len(df) == df[["symbol", "date"]].drop_duplicates().shape[0]   # no stale duplicates
+
+    # Different build params invalidate every partition
+    assert _build_partitioned(store, bars, rows=rows, drop_days=3)["partitions_built"] == 5
+
+
+def test_partitioned_build_resumes_after_interruption(tmp_path):
+    bars = {s: _bars(seed=i) for i, s in enumerate(("AAA", "BBB", "CCC", "DDD"))}
+
+    def _interrupting(sym, end):
+        if sym == "CCC":
+            raise KeyboardInterrupt
+        return bars[sym]
+
+    store = str(tmp_path / "s")
+    with patch.object(ms, "_fetch_screener_rows", return_value=_PART_UNIVERSE), \
+            pytest.raises(KeyboardInterrupt):
+        ms.build_store_partitioned(store, "x", "2023-06-01", "2023-09-30", market_cap_min=0,
+                                   price_min=0, volume_min=0, ohlcv_get=_interrupting,
+                                   shares_get=lambda sym: 1e6,
+                                   processes=1, fetch_workers=1, fail_on_quality=False)
+    saved = set(ms.load_manifest(store)["partitions"])           # saved on the way out
+    assert "CCC" not in saved
+
+    resumed = _build_partitioned(store, bars)
+    assert (resumed["partitions_built"], resumed["partitions_skipped"]) == (4 - len(saved), len(saved))
+    assert set(_sorted_store(store)["symbol"]) == {"AAA", "BBB", "CCC", "DDD"}
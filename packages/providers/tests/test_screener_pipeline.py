@@ -0,0 +1,174 @@
+"""Pipelined StockScreener mode (``screener_pipeline=1``, ``ba2_providers.screener_pipeline``).
+
+Live quotes come from a stand-in for the per-chunk ``/quote`` fetch the batch mode also uses
+(called from worker threads); history and the screener provider are monkeypatched. Pinned: the
+pipelined screen returns exactly the batch screen's results; quote chunks really overlap under
+the concurrency cap; both modes share the quote chunk size and TTL cache; the ranked price-drop
+stage stops fetching once the top N are settled; and every screen reports per-stage timings.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+import ba2_providers
+import ba2_providers.StockScreener as S
+from ba2_providers import fmp_async, fmp_common
+from ba2_providers.screener_pipeline import run_chunk_pipeline
+
+N = 450
+
+
+def _quote(sym):
+    i = int(sym[1:])
+    return {"symbol": sym, "price": 80.0 + i % 25, "marketCap": (1000 - i) * 1e9,
+            "sharesFloat": 5e6 if i % 7 == 0 else 5e7}
+
+
+class QuoteStub:
+    """``StockScreener._fetch_quote_chunk`` look-alike (one FMP ``/quote`` call per chunk);
+    tracks calls, chunk sizes and peak in-flight."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.hits = 0
+        self.sizes = []
+        self.inflight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, chunk, api_key, label=""):
+        with self._lock:
+            self.hits += 1
+            self.sizes.append(len(chunk))
+            self.inflight += 1
+            self.peak = max(self.peak, self.inflight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            return {s: _quote(s) for s in chunk}
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+
+def _bars(sym):
+    # 21 complete sessions: avg ~1.02M, last 1.5M (RVOL ~1.47); every high is 100.
+    bars = [{"date": f"2026-01-{d:02d}", "high": 100.0, "low": 90.0, "close": 95.0, "volume": 1_000_000}
+            for d in range(1, 21)]
+    bars.append({"date": "2026-01-21", "high": 100.0, "low": 90.0, "close": 95.0, "volume": 1_500_000})
+    return bars
+
+
+@pytest.fixture
+def universe(monkeypatch):
+    history_calls = []
+
+    def fake_history_chunk(chunk, api_key, from_date, to_date):
+        history_calls.append(list(chunk))
+        return {s.upper(): _bars(s) for s in chunk}
+
+    class FakeProv:
+        def screen_stocks(self, filters, as_of=None):
+            return [{"symbol": f"S{i:03d}", "price": 50.0, "market_cap": 1e9, "volume": 1}
+                    for i in range(N)]
+
+    monkeypatch.setattr(ba2_providers, "get_provider", lambda *a, **k: FakeProv())
+    monkeypatch.setattr(S, "get_app_setting", lambda k: "key")
+    monkeypatch.setattr(S.StockScreener, "_fetch_history_chunk", staticmethod(fake_history_chunk))
+    monkeypatch.setattr(S.StockScreener, "_fetch_quotes_chunked", staticmethod(
+        lambda symbols, chunk_size=50, max_workers=5: {s: _quote(s) for s in symbols}))
+    fmp_async.reset_rate_buckets()
+    yield history_calls
+    fmp_async.reset_rate_buckets()
+
+
+SETTINGS = {"screener_relative_volume_min": 1.2, "screener_float_min": 10_000_000,
+            "screener_price_drop_pct": 15.0, "screener_price_drop_days": 1,
+            "screener_max_stocks": 10, "screener_sort_metric": "market_cap",
+            "screener_pipeline_concurrency": 4}
+
+
+def test_pipelined_screen_matches_batch_and_stops_early(universe, monkeypatch):
+    batch = S.StockScreener(dict(SETTINGS)).screen()
+    batch_history = len(universe)
+    universe.clear()
+
+    stub = QuoteStub()
+    monkeypatch.setattr(S.StockScreener, "_fetch_quote_chunk", staticmethod(stub))
+    piped = S.StockScreener({**SETTINGS, "screener_pipeline": 1}).screen()
+
+    assert [r["symbol"] for r in piped["results"]] == [r["symbol"] for r in batch["results"]]
+    assert len(piped["results"]) == 10
+    assert piped["results"] == batch["results"]
+    for key in ("dropped_rvol", "dropped_float", "dropped_volume_max"):
+        assert piped["stats"][key] == batch["stats"][key]
+    assert stub.hits == 9 and set(stub.sizes) == {50}  # 450 RVOL survivors, batch-mode chunks
+
+    # Both modes read bars for RVOL (N/5 chunks); after that the batch price-drop stage
+    # fetches every ranked name, the pipelined one only until the top 10 are settled.
+    bar_chunks = N // 5
+    assert batch_history - bar_chunks == 77  # float_min drops every 7th name: 385 ranked
+    assert len(universe) - bar_chunks <= 10  # 6 chunks settle the top 10, +window of 4
+    assert piped["stats"]["price_drop_skipped"] > 300
+
+    for key in ("screen_s", "enrich_s", "bars_s", "quote_fetch_s", "quote_first_chunk_s",
+                "rank_s", "price_drop_s", "history_fetch_s", "total_s"):
+        assert key in piped["timings"]
+    assert "total_s" in batch["timings"] and "quote_fetch_s" not in batch["timings"]
+
+
+def test_quote_chunks_overlap_under_the_concurrency_cap(universe, monkeypatch):
+    stub = QuoteStub(latency=0.2)
+    monkeypatch.setattr(S.StockScreener, "_fetch_quote_chunk", staticmethod(stub))
+    sc = S.StockScreener({**SETTINGS, "screener_pipeline": 1, "screener_pipeline_concurrency": 3,
+                          "screener_price_drop_pct": 0})
+    t0 = time.perf_counter()
+    out = sc.screen()
+    elapsed = time.perf_counter() - t0
+    assert stub.hits == 9 and stub.peak == 3
+    assert 0.55 < out["timings"]["quote_fetch_s"] < 0.95 and elapsed < 2.5  # 3 waves, not 9
+
+
+def test_pipelined_quotes_go_through_the_quote_cache(universe, monkeypatch):
+    """A repeat pipelined screen within the quote TTL is served from the same cache the batch
+    mode fills, instead of refetching every chunk."""
+    calls = []
+
+    class _Resp:
+        def __init__(self, chunk):
+            self._chunk = chunk
+
+        def json(self):
+            return [_quote(s) for s in self._chunk]
+
+    def fake_get(url, params=None, endpoint=None, timeout=None):
+        calls.append(url)
+        return _Resp(url.rsplit("/", 1)[1].split(","))
+
+    monkeypatch.setattr(fmp_common, "fmp_http_get", fake_get)
+    monkeypatch.setattr(fmp_common, "_LIVE_BULK_CACHES", {})
+    settings = {**SETTINGS, "screener_pipeline": 1, "screener_price_drop_pct": 0}
+    first = S.StockScreener(dict(settings)).screen()
+    assert len(calls) == 9
+    assert S.StockScreener(dict(settings)).screen()["results"] == first["results"]
+    assert len(calls) == 9
+
+
+def test_ordered_pipeline_feeds_chunks_in_order_and_stops():
+    seen, fetched = [], []
+
+    async def fetch(chunk):
+        fetched.append(chunk[0])
+        await asyncio.sleep(0.05 if chunk[0] == "c0" else 0.0)  # first chunk arrives last
+        return {chunk[0]: True}
+
+    def on_chunk(chunk, payload):
+        seen.append(chunk[0])
+
+    chunks = [[f"c{i}"] for i in range(10)]
+    stats = asyncio.run(run_chunk_pipeline(chunks, fetch, on_chunk, concurrency=3, ordered=True,
+                                           stop=lambda: len(seen) >= 4))
+    assert seen == ["c0", "c1", "c2", "c3"]
+    assert stats["chunks_handled"] == 4 and stats["chunks_skipped"] == 6
+    assert len(fetched) < 10  # nothing is issued past the window once stop() holds
@@ -0,0 +1,87 @@
+"""Point-in-time fundamentals panel (``ba2_providers.fundamentals.statement_panel``): built
+incrementally from the FMP statement history cache, and its as_of slice picks the same row as
+``FMPCompanyDetailsProvider._filter_statements_by_date(..., lookback_periods=1, as_of=...)``.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from ba2_providers.fundamentals import statement_panel as sp
+from ba2_providers.fundamentals.details.FMPCompanyDetailsProvider import FMPCompanyDetailsProvider
+
+
+def _rows(n, base_year=2023, shares=100.0):
+    # Newest fiscal first; each filed ~7 weeks after year end. One row has no usable date.
+    out = [{"date": f"{base_year - i}-12-31", "fillingDate": f"{base_year - i + 1}-02-15",
+            "eps": float(i + 1), "netIncome": 10.0 * (i + 1), "weightedAverageShsOut": shares}
+           for i in range(n)]
+    out.append({"eps": 99.0})
+    return out
+
+
+def _write(cache, ns, sym, payload, mtime=None):
+    path = os.path.join(cache, f"{ns}__{sym}.json")
+    with open(path, "w") as f:
+        json.dump(payload, f)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_build_is_incremental_and_tracks_deletions(tmp_path):
+    cache, panel = str(tmp_path / "cache"), str(tmp_path / "panel")
+    os.makedirs(cache)
+    for sym in ("AAA", "BBB"):
+        for ns, _cols in sp.PANEL_STATEMENTS.values():
+            _write(cache, ns, sym, _rows(3), mtime=1_700_000_000)
+
+    first = sp.build_panel(panel, cache_dir=cache)
+    assert first == {"symbols": 2, "rows": 18, "parsed": 6, "reused": 0}
+
+    again = sp.build_panel(panel, cache_dir=cache)
+    assert again["parsed"] == 0 and again["reused"] == 6 and again["rows"] == 18
+
+    # One refreshed file is re-parsed; a deleted one drops its rows (BBB is then uncovered).
+    _write(cache, "income_statement_annual", "AAA", _rows(4, shares=7.0), mtime=1_700_100_000)
+    os.remove(os.path.join(cache, "balance_sheet_annual__BBB.json"))
+    stats = sp.build_panel(panel, cache_dir=cache)
+    assert stats == {"symbols": 2, "rows": 16, "parsed": 1, "reused": 4}
+    loaded = sp.FundamentalsPanel.load(panel)
+    assert set(loaded.fetched_at) == {"AAA"}
+    inc = loaded.rows[(loaded.rows["symbol"] == "AAA") & (loaded.rows["statement"] == "income")]
+    assert inc["weighted_average_shares_outstanding"].tolist() == [7.0] * 4
+
+    # A partial build touches only the named symbols and keeps everyone else's rows.
+    _write(cache, "balance_sheet_annual", "BBB", _rows(2), mtime=1_700_200_000)
+    partial = sp.build_panel(panel, symbols=["bbb"], cache_dir=cache)
+    assert partial["parsed"] == 1 and partial["reused"] == 2 and partial["rows"] == 18
+    assert set(sp.FundamentalsPanel.load(panel).fetched_at) == {"AAA", "BBB"}
+    sp.clear_panel_memo()
+
+
+def test_as_of_slice_matches_provider_filter_and_covered_honours_freshness(tmp_path):
+    cache, panel = str(tmp_path / "cache"), str(tmp_path / "panel")
+    os.makedirs(cache)
+    payload = _rows(5)
+    for ns, _cols in sp.PANEL_STATEMENTS.values():
+        _write(cache, ns, "AAA", payload)
+    sp.build_panel(panel, cache_dir=cache)
+    loaded = sp.FundamentalsPanel.load(panel)
+    provider = object.__new__(FMPCompanyDetailsProvider)
+
+    for day in pd.date_range("2018-01-01", "2024-12-31", freq="17D"):
+        as_of = day.to_pydatetime().replace(tzinfo=timezone.utc)
+        picked = provider._filter_statements_by_date(payload, as_of, None, 1, as_of=as_of)
+        wide = loaded.as_of(as_of, ["aaa"])
+        if not picked:
+            assert wide.empty
+            continue
+        assert wide.loc["AAA", "eps"] == picked[0]["eps"]
+        assert wide.loc["AAA", "has_income"] and wide.loc["AAA", "has_cashflow"]
+
+    now = datetime.now(timezone.utc)
+    assert loaded.covered(["aaa", "ZZZ"], now) == ["aaa"]
+    assert loaded.covered(["AAA"], now + timedelta(days=sp.PANEL_MAX_AGE_DAYS + 1)) == []
+    sp.clear_panel_memo()
@@ -819,13 +819,19 @@ def _cmd_build_screener_metrics(args) -> int:
         return ms.fetch_historical_float(sym, api_key, _fund_start, args.end)
 
     os.makedirs(args.store, exist_ok=True)
-    summary = ms.build_store(
-        args.store, api_key, args.start, args.end,
+    common = dict(
         market_cap_min=args.market_cap_min, price_min=args.price_min, volume_min=args.volume_min,
         ohlcv_get=_ohlcv, mcap_get=_mcap, float_get=_float, shares_get=_shares,
         cadence_days=args.cadence_days, drop_days=args.drop_days,
-        max_lookback=getattr(args, "max_lookback", 30) or 30,
-        max_workers=getattr(args, "workers", 8) or 8)
+        max_lookback=getattr(args, "max_lookback", 30) or 30)
+    if getattr(args, "partitioned", False):
+        summary = ms.build_store_partitioned(
+            args.store, api_key, args.start, args.end, **common,
+            processes=getattr(args, "processes", None) or min(8, os.cpu_count() or 1),
+            fetch_workers=getattr(args, "workers", 8) or 8)
+    else:
+        summary = ms.build_store(args.store, api_key, args.start, args.end, **common,
+                                 max_workers=getattr(args, "workers", 8) or 8)
     print(f"build-screener-metrics: {summary}")
     return 0
 
@@ -3687,6 +3693,11 @@ def main(argv: "list | None" = None) -> int:
     bm.add_argument("--workers", type=int, default=8,
                     help="Parallel per-symbol fetch threads (default 8). Historical market-cap + "
                          "float fetches are disk-cached, so re-builds are fast regardless.")
+    bm.add_argument("--partitioned", action="store_true",
+                    help="Per-symbol partitions + manifest: computes in a process pool, resumes an "
+                         "interrupted build and only recomputes symbols whose inputs changed.")
+    bm.add_argument("--processes", type=int, default=None,
+                    help="Compute processes for --partitioned (default min(8, cpu count)).")
 
     rs = sub.add_parser("recompute-screener-drops",
                         help="CACHE-ONLY rebuild of an existing store's price-drop columns (no FMP).")
@@ -3702,7 +3713,8 @@ def main(argv: "list | None" = None) -> int:
     fo.add_argument("--start", required=True, help="ISO start date (>= 2024-01-18, Alpaca options-history floor).")
     fo.add_argument("--end", required=True, help="ISO end date.")
     fo.add_argument("--cache-db", default=_DEFAULT_OPTIONS_CACHE_DB,
-                    help=f"Path to the options-history SQLite cache (default {_DEFAULT_OPTIONS_CACHE_DB}).")
+                    help=f"Path to the options-history SQLite cache, or a columnar store "
+                         f"directory (default {_DEFAULT_OPTIONS_CACHE_DB}).")
     fo.add_argument("--feed", default="indicative", help="Option chain feed (default indicative).")
     fo.add_argument("--workers", type=int, default=None,
                     help="Parallel underlyings (ThreadPoolExecutor; default $OPTIONS_FETCH_WORKERS or 6). "
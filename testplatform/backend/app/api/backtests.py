@@ -7,7 +7,7 @@ Manages backtesting of trained models against historical data.
 import logging
 from datetime import datetime
 from typing import Any, List, Optional
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session, defer
 
@@ -809,6 +809,44 @@ async def get_backtest(
     return backtest.to_dict()
 
 
+@router.get("/{backtest_id}/curves")
+async def get_backtest_curves(
+    backtest_id: int,
+    width: int = Query(1200, ge=1, description="Chart width in pixels"),
+    start: Optional[str] = Query(None, description="Zoom range start (inclusive)"),
+    end: Optional[str] = Query(None, description="Zoom range end (inclusive)"),
+    method: str = Query("minmax", description="'minmax' (keeps every peak/trough) or 'lttb'"),
+    db: Session = Depends(get_db),
+):
+    """Equity/drawdown curves downsampled for a chart ``width`` pixels wide, optionally zoomed.
+
+    ``Backtest.to_dict()`` ships one fixed ~2000-point thinning of the whole run; zooming into a
+    dense 5min run needs the FULL curves resampled for the visible range. The min/max pyramids
+    behind this are built once per backtest (app.services.chart_downsample), so each zoom step
+    is a slice of precomputed levels rather than a pass over every point."""
+    from app.services.chart_downsample import METHODS, downsample_curves
+
+    backtest = db.query(Backtest).filter(Backtest.id == backtest_id).first()
+    if not backtest:
+        raise HTTPException(status_code=404, detail=f"Backtest {backtest_id} not found")
+    if method not in METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method '{method}', expected one of {list(METHODS)}")
+
+    key = (backtest.id, backtest.completed_at.isoformat() if backtest.completed_at else None)
+    try:
+        out = downsample_curves(key, backtest.equity_curve or [], backtest.drawdown_curve or [],
+                                width, start=start, end=end, method=method)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "equityCurve": out["equity"],
+        "drawdownCurve": out["drawdown"],
+        "totalPoints": out["total_points"],
+        "rangePoints": out["range_points"],
+        "returnedPoints": len(out["equity"]),
+    }
+
+
 @router.get("/{backtest_id}/yearly")
 async def get_backtest_yearly_breakdown(
     backtest_id: int,
@@ -903,10 +941,12 @@ class MonteCarloConfig(BaseModel):
 
 class ScheduleConfig(BaseModel):
     """Schedule-variant knobs (only read when ``enabled``): weekly entry-DAY sweep (Mon..Fri) and/or
-    a list of entry-TIME shifts."""
+    a list of entry-TIME shifts. ``batch`` runs all variants in one worker, sharing the data,
+    screening and recommendation work (each variant still gets its own Backtest row)."""
     enabled: bool = False
     day_variants: bool = True
     time_variants: List[str] = []
+    batch: bool = False
 
 
 class RobustnessRequest(BaseModel):
@@ -986,6 +1026,7 @@ async def launch_robustness(request: RobustnessRequest, db: Session = Depends(ge
             sc_cfg = {
                 "day_variants": request.schedule.day_variants,
                 "time_variants": request.schedule.time_variants,
+                "batch": request.schedule.batch,
             }
             run = RobustnessRun(backtest_id=bid, kind="schedule", params=sc_cfg, status="pending")
             db.add(run)
@@ -46,6 +46,8 @@ class BuildScreenerMetricsRequest(BaseModel):
     volume_min: Optional[float] = 0.0
     cadence_days: Optional[int] = 7          # scan cadence in days (default 7 = weekly)
     drop_days: Optional[int] = 1
+    partitioned: Optional[bool] = True       # per-symbol partitions + manifest (resumable, incremental)
+    processes: Optional[int] = None          # compute processes for the partitioned build
 
 
 class BuildOptionsRequest(BaseModel):
@@ -119,6 +121,8 @@ async def build_screener_metrics(req: BuildScreenerMetricsRequest):
             "volume_min": req.volume_min if req.volume_min is not None else 0.0,
             "cadence_days": req.cadence_days if req.cadence_days is not None else 7,
             "drop_days": req.drop_days if req.drop_days is not None else 1,
+            "partitioned": req.partitioned if req.partitioned is not None else True,
+            "processes": req.processes,
         },
         description=f"Build screener metric store {store} ({req.start}..{req.end})",
         timeout_seconds=24 * 3600,  # store builds can take many minutes
@@ -4,7 +4,7 @@ Updated for preview endpoint and Parquet export
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
 import logging
@@ -14,6 +14,7 @@ import pandas as pd
 from pathlib import Path
 import threading
 import concurrent.futures
+import json
 
 from app.models.database import get_db, SessionLocal
 from app.paths import DATASETS_DIR
@@ -24,6 +25,17 @@ from app.services.fundamentals import FundamentalsService
 from app.services.macro import MacroService
 from app.services.sentiment import SentimentService
 from app.services.indicators import IndicatorService
+from app.services.chart_downsample import METHODS as CHART_METHODS, downsample_dataset
+from app.services.dataset_store import (
+    dataset_columns,
+    dataset_file_name,
+    dataset_num_rows,
+    dataset_summary,
+    is_parquet,
+    iter_csv_chunks,
+    read_dataset,
+    write_dataset,
+)
 from app.services.dataset_handler import (
     add_time_features,
     apply_technical_indicators,
@@ -411,7 +423,7 @@ def _build_dataset_in_background(dataset_id: int, dataset_config: dict):
             logger.info(f"[Thread] Filtered {rows_filtered} warmup rows, {len(df)} rows remaining")
 
         # Save dataset
-        df.to_csv(file_path, index=False)
+        write_dataset(df, file_path)
         logger.info(f"[Thread] Saved dataset to {file_path} with {len(df.columns)} columns")
 
         # Update dataset record
@@ -519,7 +531,7 @@ def _regenerate_dataset_in_background(dataset_id: int, regen_config: dict):
                     db.commit()
                 return
 
-            df = pd.read_csv(existing_path)
+            df = read_dataset(existing_path)
             df['Date'] = pd.to_datetime(df['Date'])
             original_cols = set(df.columns)
             logger.info(f"[Thread] Loaded {len(df)} rows with {len(original_cols)} columns from existing dataset")
@@ -713,7 +725,7 @@ def _regenerate_dataset_in_background(dataset_id: int, regen_config: dict):
         # Save to file
         save_path = Path(file_path)
         save_path.parent.mkdir(exist_ok=True)
-        df.to_csv(save_path, index=False)
+        write_dataset(df, save_path)
         logger.info(f"[Thread] Saved regenerated dataset to {save_path} with {len(df.columns)} columns")
 
         # Update DB with success
@@ -793,7 +805,7 @@ async def create_dataset(
         # Datasets live under the test-bucket dir (app.paths), not the repo/CWD.
         datasets_dir = DATASETS_DIR
         datasets_dir.mkdir(parents=True, exist_ok=True)
-        file_path = datasets_dir / f"{dataset_create.name}.csv"
+        file_path = datasets_dir / dataset_file_name(dataset_create.name)
 
         # Create database record in BUILDING status first
         db_dataset = Dataset(
@@ -920,7 +932,7 @@ async def create_batch_datasets(
 
             datasets_dir = DATASETS_DIR
             datasets_dir.mkdir(parents=True, exist_ok=True)
-            file_path = datasets_dir / f"{dataset_name}.csv"
+            file_path = datasets_dir / dataset_file_name(dataset_name)
 
             db_dataset = Dataset(
                 name=dataset_name,
@@ -991,7 +1003,7 @@ async def check_compatibility_endpoint(request: dict, db: Session = Depends(get_
         file_path = Path(dataset.file_path)
         if not file_path.exists():
             raise HTTPException(status_code=404, detail=f"Dataset {ds_id} file not found")
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path, nrows=0)  # Only the columns are compared
         dataframes.append(df)
         dataset_names.append(dataset.name)
 
@@ -1108,6 +1120,10 @@ async def get_dataset_preview(
     columns: Optional[str] = Query(None, description="Comma-separated list of columns to include (default: all columns)"),
     max_rows: int = Query(2000, description="Maximum rows to return (0 for all, default: 2000)"),
     sample: bool = Query(True, description="Sample evenly if exceeding max_rows (default: True)"),
+    width: Optional[int] = Query(None, ge=1, description="Chart width in pixels: downsample for this width (overrides max_rows/sample)"),
+    start: Optional[str] = Query(None, description="Zoom range start (Date, inclusive); with width"),
+    end: Optional[str] = Query(None, description="Zoom range end (Date, inclusive); with width"),
+    method: str = Query("minmax", description="Downsampling method with width: 'minmax' or 'lttb'"),
     db: Session = Depends(get_db)
 ):
     """
@@ -1116,11 +1132,19 @@ async def get_dataset_preview(
     For large datasets, returns sampled data to improve chart performance.
     Returns all columns by default with max 2000 rows sampled evenly.
 
+    With ``width``, rows are instead chosen for a chart of that many pixels from
+    precomputed min/max pyramids (see app.services.chart_downsample): every peak and
+    trough of the numeric columns in the (optionally zoomed) range is kept.
+
     Args:
         dataset_id: Dataset ID
         columns: Comma-separated columns to include (default: all columns)
         max_rows: Maximum rows to return (default: 2000, 0 for all)
         sample: If True, sample evenly across dataset when exceeding max_rows
+        width: Chart width in pixels (enables downsampling)
+        start: Zoom range start on Date
+        end: Zoom range end on Date
+        method: 'minmax' or 'lttb'
         db: Database session
 
     Returns:
@@ -1143,41 +1167,61 @@ async def get_dataset_preview(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        # Determine which columns to load
+        # Determine which columns to load (in file order; unknown names are ignored
+        # unless none are known, in which case all columns are returned)
+        all_columns = dataset_columns(file_path)
+        usecols = None
         if columns:
-            usecols = [c.strip() for c in columns.split(',')]
-            # Read only specified columns
+            wanted = {c.strip() for c in columns.split(',')}
+            usecols = [c for c in all_columns if c in wanted] or None
+
+        if width is not None:
+            if method not in CHART_METHODS:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown method '{method}', expected one of {list(CHART_METHODS)}"
+                )
             try:
-                df = pd.read_csv(file_path, usecols=usecols)
-            except ValueError:
-                # Some columns don't exist, fall back to loading all then filter
-                df = pd.read_csv(file_path)
-                available_cols = [c for c in usecols if c in df.columns]
-                if available_cols:
-                    df = df[available_cols]
-        else:
-            # Default: load all columns
-            df = pd.read_csv(file_path)
-
-        # Sort by date to ensure chronological order
-        if 'Date' in df.columns:
-            df = df.sort_values('Date').reset_index(drop=True)
+                result = downsample_dataset(file_path, usecols, width, start=start, end=end, method=method)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            df = result['df']
+            data = json.loads(df.to_json(orient='records', date_format='iso'))
+            return {
+                "dataset_id": dataset_id,
+                "total_rows": result['total_rows'],
+                "range_rows": result['range_rows'],
+                "returned_rows": len(data),
+                "sampled": len(data) < result['range_rows'],
+                "columns": list(df.columns),
+                "data": data
+            }
 
-        total_rows = len(df)
+        total_rows = dataset_num_rows(file_path)
+        sampled = max_rows > 0 and total_rows > max_rows
+        if sampled and sample:
+            # Sample evenly across the dataset
+            step = total_rows // max_rows
+            rows = list(range(0, total_rows, step))[:max_rows]
+        elif sampled:
+            # Just take first max_rows
+            rows = list(range(max_rows))
+        else:
+            rows = None
 
-        # Sample if needed
-        if max_rows > 0 and total_rows > max_rows:
-            if sample:
-                # Sample evenly across the dataset
-                step = total_rows // max_rows
-                indices = list(range(0, total_rows, step))[:max_rows]
-                df = df.iloc[indices]
-            else:
-                # Just take first max_rows
-                df = df.head(max_rows)
+        date_sorted = is_parquet(file_path) and dataset_summary(file_path).get('date_sorted')
+        if 'Date' not in all_columns or date_sorted:
+            # Rows are already in chronological order: read only the selected rows
+            df = read_dataset(file_path, columns=usecols, rows=rows)
+        else:
+            # Sort by date to ensure chronological order before selecting rows
+            df = read_dataset(file_path, columns=usecols)
+            if 'Date' in df.columns:
+                df = df.sort_values('Date').reset_index(drop=True)
+            if rows is not None:
+                df = df.iloc[rows]
 
         # Use pandas to_json with proper NaN handling, then parse back
-        import json
         json_str = df.to_json(orient='records', date_format='iso')
         data = json.loads(json_str)
 
@@ -1185,7 +1229,7 @@ async def get_dataset_preview(
             "dataset_id": dataset_id,
             "total_rows": total_rows,
             "returned_rows": len(data),
-            "sampled": max_rows > 0 and total_rows > max_rows,
+            "sampled": sampled,
             "columns": list(df.columns),
             "data": data
         }
@@ -1241,7 +1285,7 @@ async def preview_prediction_targets(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         total_rows = len(df)
 
         # Parse request
@@ -1383,7 +1427,7 @@ async def calculate_indicators(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
 
         # Sort by date to ensure consistent ordering with target calculations
         if 'Date' in df.columns:
@@ -1405,11 +1449,14 @@ async def calculate_indicators(
         if target_timeframe and target_timeframe != dataset.timeframe:
             # Multi-timeframe calculation: resample, calculate, align back
             logger.info(f"Calculating indicators on {target_timeframe} timeframe (dataset is {dataset.timeframe})")
+            from app.services.mtf_store import get_mtf_store
             results = indicator_service.calculate_indicators_multi_timeframe(
                 df,
                 indicators,
                 target_timeframe,
-                source_timeframe=dataset.timeframe
+                source_timeframe=dataset.timeframe,
+                store=get_mtf_store(),
+                store_key=f"dataset_{dataset_id}"
             )
         else:
             # Same timeframe: calculate directly
@@ -1496,7 +1543,7 @@ async def calculate_prediction_targets_v2(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
 
         # Parse request
         targets = request_body.get('targets', [])
@@ -1508,10 +1555,13 @@ async def calculate_prediction_targets_v2(
             }
 
         # Calculate targets with dataset's timeframe for multi-timeframe support
+        from app.services.mtf_store import get_mtf_store
         target_service = PredictionTargetService()
         results = target_service.calculate_all_targets(
             df, targets,
-            dataset_timeframe=dataset.timeframe
+            dataset_timeframe=dataset.timeframe,
+            mtf_store=get_mtf_store(),
+            store_key=f"dataset_{dataset_id}"
         )
 
         return {
@@ -1561,27 +1611,26 @@ async def get_dataset_stats(dataset_id: int, db: Session = Depends(get_db)):
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        # Parquet datasets carry these statistics in their footer; CSV is read once
+        summary = dataset_summary(file_path)
+        col_info = summary['columns']
 
         # Basic counts
-        total_rows = len(df)
-        total_columns = len(df.columns)
+        total_rows = summary['rows']
+        total_columns = len(col_info)
 
         # Date range
-        date_column = 'Date' if 'Date' in df.columns else df.columns[0]
-        if date_column in df.columns:
-            df[date_column] = pd.to_datetime(df[date_column])
+        date_range = None
+        if summary['date_range']:
             date_range = {
-                "start": str(df[date_column].min()),
-                "end": str(df[date_column].max())
+                "start": str(pd.Timestamp(summary['date_range']['start'])),
+                "end": str(pd.Timestamp(summary['date_range']['end']))
             }
-        else:
-            date_range = None
 
         # Missing data percentage per column
         missing_data = {}
-        for col in df.columns:
-            missing_count = df[col].isna().sum()
+        for col, info in col_info.items():
+            missing_count = info['nulls']
             missing_pct = (missing_count / total_rows * 100) if total_rows > 0 else 0
             missing_data[col] = {
                 "count": int(missing_count),
@@ -1590,29 +1639,24 @@ async def get_dataset_stats(dataset_id: int, db: Session = Depends(get_db)):
 
         # Basic statistics for numeric columns
         numeric_stats = {}
-        numeric_columns = df.select_dtypes(include=['int64', 'float64']).columns
-
-        for col in numeric_columns:
-            col_data = df[col].dropna()
-            if len(col_data) > 0:
+        for col, info in col_info.items():
+            col_stats = info.get('stats')
+            if col_stats:
                 numeric_stats[col] = {
-                    "count": int(len(col_data)),
-                    "mean": round(float(col_data.mean()), 4),
-                    "std": round(float(col_data.std()), 4),
-                    "min": round(float(col_data.min()), 4),
-                    "max": round(float(col_data.max()), 4),
-                    "median": round(float(col_data.median()), 4)
+                    key: (col_stats[key] if key == 'count' or col_stats[key] is None
+                          else round(col_stats[key], 4))
+                    for key in ('count', 'mean', 'std', 'min', 'max', 'median')
                 }
 
         # Column types
-        column_types = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        column_types = {col: info['dtype'] for col, info in col_info.items()}
 
         return {
             "dataset_id": dataset_id,
             "total_rows": total_rows,
             "total_columns": total_columns,
             "date_range": date_range,
-            "columns": list(df.columns),
+            "columns": list(col_info),
             "column_types": column_types,
             "missing_data": missing_data,
             "numeric_statistics": numeric_stats
@@ -1666,7 +1710,8 @@ async def get_dataset_columns(dataset_id: int, db: Session = Depends(get_db)):
             )
 
         # Load dataset to get columns
-        df = pd.read_csv(file_path, nrows=5)  # Just need headers and dtypes
+        # Just need headers and dtypes: Parquet has them in the schema, CSV needs a few rows
+        df = read_dataset(file_path, nrows=0 if is_parquet(file_path) else 5)
 
         # Categorize columns
         price_cols = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close']
@@ -1797,6 +1842,14 @@ async def export_dataset(dataset_id: int, db: Session = Depends(get_db)):
 
         logger.info(f"Exporting dataset {dataset_id}: {file_path}")
 
+        if is_parquet(file_path):
+            # Convert batch by batch so large datasets are never held as one CSV string
+            return StreamingResponse(
+                iter_csv_chunks(file_path),
+                media_type="text/csv",
+                headers={"Content-Disposition": f"attachment; filename={dataset.name}.csv"}
+            )
+
         # Return the CSV file as a download
         return FileResponse(
             path=str(file_path),
@@ -1836,24 +1889,23 @@ async def export_dataset_parquet(dataset_id: int, db: Session = Depends(get_db))
                 detail=f"Dataset with ID {dataset_id} not found"
             )
 
-        # Check if CSV file exists
-        csv_path = Path(dataset.file_path)
-        if not csv_path.exists():
+        file_path = Path(dataset.file_path)
+        if not file_path.exists():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Dataset file not found: {csv_path}"
+                detail=f"Dataset file not found: {file_path}"
             )
 
-        logger.info(f"Exporting dataset {dataset_id} to Parquet: {csv_path}")
-
-        # Read CSV and convert to Parquet
-        df = pd.read_csv(csv_path)
+        logger.info(f"Exporting dataset {dataset_id} to Parquet: {file_path}")
 
-        # Create temporary Parquet file
-        parquet_path = csv_path.with_suffix('.parquet')
-        df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
-
-        logger.info(f"Created Parquet file: {parquet_path}")
+        if is_parquet(file_path):
+            # Already stored as Parquet: serve the file itself
+            parquet_path = file_path
+        else:
+            # Legacy CSV dataset: convert next to it
+            parquet_path = file_path.with_suffix('.parquet')
+            write_dataset(read_dataset(file_path), parquet_path)
+            logger.info(f"Created Parquet file: {parquet_path}")
 
         # Return the Parquet file as a download
         return FileResponse(
@@ -2180,8 +2232,8 @@ async def duplicate_dataset(
         # Save to new file
         datasets_dir = DATASETS_DIR
         datasets_dir.mkdir(parents=True, exist_ok=True)
-        file_path = datasets_dir / f"{new_name}.csv"
-        df.to_csv(file_path, index=False)
+        file_path = datasets_dir / dataset_file_name(new_name)
+        write_dataset(df, file_path)
 
         # Build new generation config
         new_gen_config = {
@@ -2544,7 +2596,7 @@ async def calculate_multi_timeframe_indicators(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         logger.info(f"Calculating multi-timeframe indicators for dataset {dataset_id}")
@@ -2633,7 +2685,7 @@ async def calculate_multi_timeframe_indicators(
             result_df = result_df.reset_index()
 
         # Save updated dataset
-        result_df.to_csv(file_path, index=False)
+        write_dataset(result_df, file_path)
 
         # Update dataset metadata
         indicator_config = dataset.technical_indicators or {}
@@ -2727,7 +2779,7 @@ async def calculate_fundamental_features(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         logger.info(f"Calculating fundamental features for dataset {dataset_id}, ticker: {dataset.ticker}")
@@ -2738,7 +2790,7 @@ async def calculate_fundamental_features(
         )
 
         # Save updated dataset
-        result_df.to_csv(file_path, index=False)
+        write_dataset(result_df, file_path)
 
         # Count added columns
         added_columns = [col for col in result_df.columns if col not in df.columns]
@@ -2852,7 +2904,7 @@ async def calculate_macro_features(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         logger.info(f"Calculating macro features for dataset {dataset_id}")
@@ -2868,7 +2920,7 @@ async def calculate_macro_features(
             result_df = macro_service.create_yield_curve_features(result_df)
 
         # Save updated dataset
-        result_df.to_csv(file_path, index=False)
+        write_dataset(result_df, file_path)
 
         # Count added columns
         added_columns = [col for col in result_df.columns if col not in df.columns]
@@ -2947,7 +2999,7 @@ async def calculate_sentiment_features(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         logger.info(f"Calculating sentiment features for dataset {dataset_id}, ticker: {dataset.ticker}")
@@ -2971,7 +3023,7 @@ async def calculate_sentiment_features(
         result_df = sentiment_service.create_sentiment_features(df, analyzed_articles)
 
         # Save updated dataset
-        result_df.to_csv(file_path, index=False)
+        write_dataset(result_df, file_path)
 
         # Count added columns
         added_columns = [col for col in result_df.columns if col not in df.columns]
@@ -3055,7 +3107,7 @@ async def analyze_news_for_dataset(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         start_date = df['Date'].min()
@@ -3146,11 +3198,14 @@ async def validate_dataset_compatibility(
     for dataset in datasets:
         file_path = Path(dataset.file_path)
         if file_path.exists():
-            df = pd.read_csv(file_path)
-            feature_sets.append(set(df.columns.tolist()))
-            total_rows += len(df)
+            ds_columns = dataset_columns(file_path)
+            feature_sets.append(set(ds_columns))
 
-            if 'Date' in df.columns:
+            if 'Date' not in ds_columns:
+                total_rows += dataset_num_rows(file_path)
+            else:
+                df = read_dataset(file_path, columns=['Date'])
+                total_rows += len(df)
                 df['Date'] = pd.to_datetime(df['Date'])
                 date_ranges.append({
                     'dataset_id': dataset.id,
@@ -3233,7 +3288,8 @@ async def combine_datasets_preview(
     for dataset in datasets:
         file_path = Path(dataset.file_path)
         if file_path.exists():
-            df = pd.read_csv(file_path)
+            ds_columns = dataset_columns(file_path)
+            df = read_dataset(file_path, columns=[c for c in ('Date', 'Close') if c in ds_columns])
             df['Date'] = pd.to_datetime(df['Date'])
 
             stats = {
@@ -3244,11 +3300,9 @@ async def combine_datasets_preview(
                 'rows': len(df),
                 'start_date': df['Date'].min().isoformat(),
                 'end_date': df['Date'].max().isoformat(),
-                'columns': len(df.columns)
+                'columns': len(ds_columns)
             }
 
-            # Add numeric column stats
-            numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
             if 'Close' in df.columns:
                 stats['price_range'] = {
                     'min': float(df['Close'].min()),
@@ -3464,7 +3518,7 @@ async def get_dataset_trends(
             )
 
         # Load dataset
-        df = pd.read_csv(dataset.file_path)
+        df = read_dataset(dataset.file_path)
 
         # Ensure we have required columns
         required_cols = ['Date', 'Open', 'High', 'Low', 'Close']
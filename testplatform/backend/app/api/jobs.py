@@ -79,6 +79,8 @@ class ParameterRanges(BaseModel):
     seqLenMin: Optional[int] = 24  # Minimum seq_len when optimizing
     seqLenMax: Optional[int] = 48  # Maximum seq_len when optimizing
     seqLenStep: Optional[int] = 12  # Step size for seq_len optimization
+    # Memory-map classification training windows under the job cache (removed when the job ends)
+    mmapWindows: Optional[bool] = False
     # Note: activationFunctions removed - not configurable on most tsai models
 
 
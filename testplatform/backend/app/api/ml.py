@@ -23,6 +23,7 @@ from app.services.darts_models import (
     ClassImbalanceConfig
 )
 from app.services.darts_training import DartsTrainingService, ModelEvaluator
+from app.services.dataset_store import read_dataset, write_dataset
 
 # Backwards compatibility aliases
 MLModelsService = DartsModelService
@@ -171,7 +172,7 @@ async def calculate_prediction_targets(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         # Default targets if not provided
@@ -193,7 +194,7 @@ async def calculate_prediction_targets(
         is_symmetric = target_service.verify_symmetry(result_df, targets)
 
         # Save updated dataset
-        result_df.to_csv(file_path, index=False)
+        write_dataset(result_df, file_path)
 
         # Count added columns
         added_columns = [col for col in result_df.columns if col not in df.columns]
@@ -257,7 +258,7 @@ async def preview_prediction_targets(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         # Default targets if not provided
@@ -337,7 +338,7 @@ async def generate_training_data(
     """
     Generate training-ready dataset with prediction targets and normalization.
 
-    Creates a separate file (*_training.csv) for ML training, preserving the original.
+    Creates a separate file (*_training.<ext>, same format as the dataset) for ML training, preserving the original.
     Also saves normalization parameters for live data processing.
 
     Args:
@@ -369,7 +370,7 @@ async def generate_training_data(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         # Default targets if not provided
@@ -414,8 +415,8 @@ async def generate_training_data(
             logger.info(f"Saved normalization params to {norm_path}")
 
         # Save training dataset
-        training_path = file_path.parent / f"{file_path.stem}_training.csv"
-        result_df.to_csv(training_path, index=False)
+        training_path = file_path.parent / f"{file_path.stem}_training{file_path.suffix}"
+        write_dataset(result_df, training_path)
         logger.info(f"Saved training data to {training_path}")
 
         # Update dataset with file paths
@@ -495,7 +496,7 @@ async def split_dataset(
                 detail=f"Dataset file not found: {file_path}"
             )
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         df['Date'] = pd.to_datetime(df['Date'])
 
         logger.info(f"Splitting dataset {dataset_id} with ratio {train_ratio}")
@@ -506,11 +507,11 @@ async def split_dataset(
         )
 
         # Save split files
-        train_path = file_path.parent / f"{file_path.stem}_train.csv"
-        test_path = file_path.parent / f"{file_path.stem}_test.csv"
+        train_path = file_path.parent / f"{file_path.stem}_train{file_path.suffix}"
+        test_path = file_path.parent / f"{file_path.stem}_test{file_path.suffix}"
 
-        train_df.to_csv(train_path, index=False)
-        test_df.to_csv(test_path, index=False)
+        write_dataset(train_df, train_path)
+        write_dataset(test_df, test_path)
 
         logger.info(f"Saved train set to {train_path}, test set to {test_path}")
 
@@ -16,6 +16,7 @@ import uuid
 from app.models.database import get_db
 from app.models.model import TrainedModel
 from app.models.dataset import Dataset
+from app.services.dataset_store import read_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -416,6 +417,87 @@ async def register_foundation_model(
     }
 
 
+class FoundationPrecomputeRequest(BaseModel):
+    """Forecast a universe ahead of time into the forecast cache."""
+    model_name: str = 'chronos-2'
+    symbols: Optional[List[str]] = None
+    universe: Optional[Dict[str, Any]] = None  # backtest universe shape (static | screener)
+    prediction_length: int = 1
+    context_length: Optional[int] = None
+    interval: str = '1d'
+    provider: str = 'fmp'
+    as_of: Optional[str] = None               # ISO (default now)
+    batch_size: int = 128
+
+
+@router.post("/foundation/precompute")
+async def precompute_foundation_forecasts(request: FoundationPrecomputeRequest):
+    """Enqueue a ``chronos_precompute`` task on the main queue. Returns {task_id}."""
+    from app.services.chronos_service import CHRONOS_MODELS
+    from app.services.task_queue import get_task_queue
+
+    if request.model_name not in CHRONOS_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown model: {request.model_name}. "
+                   f"Available: {list(CHRONOS_MODELS.keys())}"
+        )
+    if not request.symbols and not request.universe:
+        raise HTTPException(status_code=400, detail="symbols or universe is required")
+
+    payload = request.model_dump(exclude_none=True)
+    target = f"{len(request.symbols)} symbols" if request.symbols else \
+        f"{request.universe.get('mode', 'static')} universe"
+    task_id = get_task_queue().queue_task(
+        task_type="chronos_precompute",
+        name=f"Precompute {request.model_name} forecasts: {target}",
+        payload=payload,
+        description=f"Batched {request.model_name} forecasts (h={request.prediction_length}) for {target}",
+        timeout_seconds=6 * 3600,
+    )
+    logger.info(f"chronos precompute enqueued task {task_id}")
+    return {"task_id": task_id}
+
+
+@router.get("/foundation/forecasts")
+async def get_foundation_forecasts(
+    symbols: str,
+    model_name: str = 'chronos-2',
+    prediction_length: int = 1,
+    context_length: Optional[int] = None,
+    target_column: str = 'Close',
+    as_of: Optional[str] = None,
+):
+    """Latest precomputed forecasts for comma-separated ``symbols`` (no inference).
+
+    Serves what the ``chronos_precompute`` task stored with the same settings;
+    symbols without a cached forecast are listed under ``missing``.
+    """
+    from app.services.chronos_service import CHRONOS_MODELS, cached_forecasts
+
+    if model_name not in CHRONOS_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown model: {model_name}. "
+                   f"Available: {list(CHRONOS_MODELS.keys())}"
+        )
+    wanted = sorted({s.strip().upper() for s in symbols.split(',') if s.strip()})
+    found = cached_forecasts(wanted, prediction_length=prediction_length,
+                             target_column=target_column, model_name=model_name,
+                             context_length=context_length, as_of=as_of)
+    return {
+        "forecasts": {
+            sym: {
+                "context_end": f["context_end"].isoformat(),
+                "median": f["median"].tolist(),
+                "quantiles": f["quantiles"].tolist(),
+            }
+            for sym, f in found.items()
+        },
+        "missing": [s for s in wanted if s not in found],
+    }
+
+
 @router.get("/{model_id}/prediction-fields")
 async def get_prediction_fields(
     model_id: str,
@@ -636,9 +718,10 @@ async def run_model_predictions(
         dataset_path = Path(dataset.file_path)
         logger.info(f"Using original dataset: {dataset_path}")
 
-    # Load dataset CSV
+    # Load dataset file
     try:
-        df = pd.read_csv(dataset_path, parse_dates=['Date'])
+        df = read_dataset(dataset_path)
+        df['Date'] = pd.to_datetime(df['Date'])
         df = df.sort_values('Date').reset_index(drop=True)
         logger.info(f"Loaded dataset: {df.shape[0]} rows, {df.shape[1]} columns")
     except Exception as e:
@@ -9,6 +9,10 @@ import pandas as pd
 from typing import Optional, Dict, Any
 import logging
 
+from app.services.indicator_kernels import (
+    directional_movement, on_balance_volume, parabolic_sar, zigzag_confirmed,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -281,37 +285,7 @@ class TechnicalIndicators:
         if n < 2:
             return pd.Series([np.nan] * n, index=df.index)
 
-        sar = np.zeros(n)
-        af = af_start
-        is_uptrend = True
-        ep = high[0]
-        sar[0] = low[0]
-
-        for i in range(1, n):
-            if is_uptrend:
-                sar[i] = sar[i-1] + af * (ep - sar[i-1])
-                sar[i] = min(sar[i], low[i-1], low[i-2] if i >= 2 else low[i-1])
-                if low[i] < sar[i]:
-                    is_uptrend = False
-                    sar[i] = ep
-                    ep = low[i]
-                    af = af_start
-                else:
-                    if high[i] > ep:
-                        ep = high[i]
-                        af = min(af + af_start, af_max)
-            else:
-                sar[i] = sar[i-1] + af * (ep - sar[i-1])
-                sar[i] = max(sar[i], high[i-1], high[i-2] if i >= 2 else high[i-1])
-                if high[i] > sar[i]:
-                    is_uptrend = True
-                    sar[i] = ep
-                    ep = high[i]
-                    af = af_start
-                else:
-                    if low[i] < ep:
-                        ep = low[i]
-                        af = min(af + af_start, af_max)
+        sar = parabolic_sar(high, low, af_start, af_max)
 
         logger.debug(f"Calculated SAR({af_start},{af_max})")
         return pd.Series(sar, index=df.index)
@@ -330,21 +304,7 @@ class TechnicalIndicators:
         """
         import numpy as np
 
-        high = df['High'].values
-        low = df['Low'].values
-        close = df['Close'].values
-        n = len(high)
-
-        plus_dm = np.zeros(n)
-        minus_dm = np.zeros(n)
-        tr = np.zeros(n)
-
-        for i in range(1, n):
-            up_move = high[i] - high[i-1]
-            down_move = low[i-1] - low[i]
-            plus_dm[i] = up_move if up_move > down_move and up_move > 0 else 0
-            minus_dm[i] = down_move if down_move > up_move and down_move > 0 else 0
-            tr[i] = max(high[i] - low[i], abs(high[i] - close[i-1]), abs(low[i] - close[i-1]))
+        plus_dm, minus_dm, tr = directional_movement(df['High'].values, df['Low'].values, df['Close'].values)
 
         # Smooth with Wilder's method
         atr = pd.Series(tr).rolling(window=period).mean().values
@@ -375,22 +335,7 @@ class TechnicalIndicators:
         Returns:
             Series with OBV values
         """
-        import numpy as np
-
-        close = df['Close'].values
-        volume = df['Volume'].values
-        n = len(close)
-
-        obv = np.zeros(n)
-        obv[0] = volume[0]
-
-        for i in range(1, n):
-            if close[i] > close[i-1]:
-                obv[i] = obv[i-1] + volume[i]
-            elif close[i] < close[i-1]:
-                obv[i] = obv[i-1] - volume[i]
-            else:
-                obv[i] = obv[i-1]
+        obv = on_balance_volume(df['Close'].values, df['Volume'].values)
 
         logger.debug("Calculated OBV")
         return pd.Series(obv, index=df.index)
@@ -436,44 +381,10 @@ class TechnicalIndicators:
         low = df['Low'].values
         n = len(high)
 
-        zigzag = np.full(n, np.nan)
         if n < 2:
-            return pd.Series(zigzag, index=df.index)
-
-        direction = 0  # 1 = up, -1 = down
-        last_pivot_idx = 0
-        last_pivot_val = (high[0] + low[0]) / 2
-
-        for i in range(1, n):
-            if direction == 0:
-                if high[i] >= last_pivot_val * (1 + deviation_pct/100):
-                    direction = 1
-                    last_pivot_val = high[i]
-                    last_pivot_idx = i
-                elif low[i] <= last_pivot_val * (1 - deviation_pct/100):
-                    direction = -1
-                    last_pivot_val = low[i]
-                    last_pivot_idx = i
-            elif direction == 1:
-                if high[i] > last_pivot_val:
-                    last_pivot_val = high[i]
-                    last_pivot_idx = i
-                elif low[i] <= last_pivot_val * (1 - deviation_pct/100):
-                    zigzag[last_pivot_idx] = last_pivot_val
-                    direction = -1
-                    last_pivot_val = low[i]
-                    last_pivot_idx = i
-            else:  # direction == -1
-                if low[i] < last_pivot_val:
-                    last_pivot_val = low[i]
-                    last_pivot_idx = i
-                elif high[i] >= last_pivot_val * (1 + deviation_pct/100):
-                    zigzag[last_pivot_idx] = last_pivot_val
-                    direction = 1
-                    last_pivot_val = high[i]
-                    last_pivot_idx = i
-
-        zigzag[last_pivot_idx] = last_pivot_val
+            return pd.Series(np.full(n, np.nan), index=df.index)
+
+        zigzag = zigzag_confirmed(high, low, deviation_pct)
 
         logger.debug(f"Calculated ZigZag({deviation_pct}%)")
         return pd.Series(zigzag, index=df.index)
@@ -304,6 +304,7 @@ async def startup_event():
         handle_build_options,
         handle_prewarm,
     )
+    from app.services.chronos_precompute_handler import handle_chronos_precompute
     task_queue = get_task_queue()
     task_queue.register_handler('dataset_regeneration', handle_dataset_regeneration)
     task_queue.register_handler('news_batch_fetch', handle_news_batch_fetch)
@@ -312,7 +313,8 @@ async def startup_event():
     task_queue.register_handler('build_screener_metrics', handle_build_screener_metrics)
     task_queue.register_handler('build_options', handle_build_options)
     task_queue.register_handler('prewarm', handle_prewarm)
-    logger.info("Registered main task handlers: dataset_regeneration, news_batch_fetch, daily_backtest, strategy_optimization, build_screener_metrics, build_options, prewarm")
+    task_queue.register_handler('chronos_precompute', handle_chronos_precompute)
+    logger.info("Registered main task handlers: dataset_regeneration, news_batch_fetch, daily_backtest, strategy_optimization, build_screener_metrics, build_options, prewarm, chronos_precompute")
 
     # Initialize dedicated training queue (2 workers — keeps GPU from being overloaded)
     init_training_task_queue(max_workers=2)
@@ -334,6 +336,9 @@ async def startup_event():
     init_rerun_task_queue(max_workers=_rerun_workers)
     rerun_queue = get_rerun_task_queue()
     rerun_queue.register_handler('rerun_backtest', handle_rerun_backtest)
+    # Robustness schedule variants in batch mode: all variants of a parent in one worker.
+    from app.services.robustness_handler import BATCH_TASK_TYPE, handle_schedule_variant_batch
+    rerun_queue.register_handler(BATCH_TASK_TYPE, handle_schedule_variant_batch)
     logger.info(f"Re-run task queue initialized with {_rerun_workers} workers")
 
     # Initialize dedicated OHLCV queue (isolated, resizable, won't affect other task types)
@@ -11,10 +11,11 @@ single root is overridable via ``BA2_HOME`` (see ba2_common.config). The dirs
 are created on import so callers can write to them immediately.
 
 Layout (under ``TEST_DIR``):
-    datasets/            generated dataset CSVs                (DATASETS_DIR)
+    datasets/            generated datasets (Parquet / CSV)    (DATASETS_DIR)
     trained_models/      saved model artifacts                (MODELS_DIR)
     cache/jobs/          per-job cache                        (JOBS_CACHE_DIR)
     cache/news/          news content files                   (NEWS_CACHE_DIR)
+    cache/forecasts/     cached foundation-model forecasts    (FORECASTS_CACHE_DIR)
     news_exports/        exported news JSON                   (NEWS_EXPORTS_DIR)
 """
 from __future__ import annotations
@@ -35,9 +36,11 @@ MODELS_DIR = Path(os.getenv("BA2_MODELS_DIR", str(TEST_DIR / "trained_models")))
 JOBS_CACHE_DIR = Path(os.getenv("BA2_JOBS_CACHE_DIR", str(TEST_DIR / "cache" / "jobs")))
 NEWS_CACHE_DIR = Path(os.getenv("BA2_NEWS_CACHE_DIR", str(TEST_DIR / "cache" / "news")))
 NEWS_EXPORTS_DIR = Path(os.getenv("BA2_NEWS_EXPORTS_DIR", str(TEST_DIR / "news_exports")))
+FORECASTS_CACHE_DIR = Path(os.getenv("BA2_FORECASTS_CACHE_DIR", str(TEST_DIR / "cache" / "forecasts")))
 
 # Create the artifact dirs on import so first-run writes never fail.
-for _d in (DATASETS_DIR, MODELS_DIR, JOBS_CACHE_DIR, NEWS_CACHE_DIR, NEWS_EXPORTS_DIR):
+for _d in (DATASETS_DIR, MODELS_DIR, JOBS_CACHE_DIR, NEWS_CACHE_DIR, NEWS_EXPORTS_DIR,
+           FORECASTS_CACHE_DIR):
     try:
         _d.mkdir(parents=True, exist_ok=True)
     except OSError:
@@ -57,6 +57,8 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from ba2_common.core.interfaces.AccountInterface import AccountInterface
 from ba2_common.core.interfaces.OptionsAccountInterface import OptionsAccountInterface
 from ba2_common.core.models import TradingOrder, Transaction
@@ -74,6 +76,7 @@ from ba2_common.core.db import get_db, get_instance, add_instance, update_instan
 from ba2_common.core.trade_store import orders_where, transactions_where
 
 from .price_source import AsOfPriceSource
+from .option_greeks import bs_price_array
 from .options_provider import HistoricalOptionsProvider
 
 import logging
@@ -360,6 +363,22 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
                                "option_spread_min_tick. Defaults to 0.0 (exact no-op, "
                                "pre-2026-07-25 behaviour); the grid passes a real value.",
             },
+            "option_mark_model": {
+                "type": "str",
+                "required": False,
+                "description": "How an open option lot with NO premium bar on the marking day "
+                               "is valued: 'premium_close' (default, existing behaviour: "
+                               "intrinsic for defined-risk legs, else the entry premium) or "
+                               "'black_scholes' (all such lots priced in one vectorised "
+                               "Black-Scholes call at the current underlying close and each "
+                               "contract's last known IV, before those fall-backs).",
+            },
+            "option_mark_rate": {
+                "type": "float",
+                "required": False,
+                "description": "Risk-free rate used by the 'black_scholes' option mark. "
+                               "Default 0.0.",
+            },
             "option_spread_min_tick": {
                 "type": "float",
                 "required": False,
@@ -451,6 +470,11 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
         premium print in the sparse cache from swinging recorded equity/drawdown outside what the
         structure can actually be worth. The clamp is a MARK-TO-MARKET display bound ONLY — it
         never moves cash, so realized P&L at expiry is unchanged.
+
+        With ``option_mark_model="black_scholes"`` the lots lacking a premium bar are first
+        priced TOGETHER by the vectorised Black-Scholes engine (``_model_option_marks``) at the
+        current underlying close and each contract's last known IV, ahead of the intrinsic /
+        entry-premium fall-backs; the default ``"premium_close"`` leaves marking unchanged.
         """
         if self._options is None:
             return 0.0
@@ -470,9 +494,17 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
         # must NOT be clamped to 0 (the O_IC id=449 1-bar transient: leftover long value erased ->
         # equity dipped negative for one bar).
         group_has_short: Dict[Any, bool] = {}
-        for lot in self._option_positions.values():
-            if lot.qty == 0:
-                continue
+        held = [lot for lot in self._option_positions.values() if lot.qty != 0]
+        as_of = self._as_of_date()
+        marks: List[Optional[float]] = []
+        for lot in held:
+            bar = self._options.get_bar(lot.contract_symbol, as_of)
+            marks.append(bar["close"] if bar and bar.get("close") is not None else None)
+        if self._cfg.get("option_mark_model") == "black_scholes" and None in marks:
+            missing = [i for i, m in enumerate(marks) if m is None]
+            for i, px in zip(missing, self._model_option_marks([held[i] for i in missing], as_of)):
+                marks[i] = px
+        for lot, mark in zip(held, marks):
             gkey = contract_group.get(lot.contract_symbol)
             gb = group_bounds.get(gkey) if gkey is not None else None
             is_defined_risk = gb is not None and (
@@ -480,9 +512,8 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
                 or gb["strategy"] in self.DEFINED_RISK_SHORT_STRATEGIES
             )
 
-            bar = self._options.get_bar(lot.contract_symbol, self._as_of_date())
-            if bar and bar.get("close") is not None:
-                px = bar["close"]
+            if mark is not None:
+                px = mark
             elif is_defined_risk:
                 # (2a) NO premium bar for a defined-risk leg on this bar -> mark at INTRINSIC (not
                 # the stale entry premium / 0) so an open combo whose sparse cache lacks a bar this
@@ -525,6 +556,34 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
             total += mtm
         return total
 
+    def _model_option_marks(self, lots: List["_OptionLot"], as_of) -> List[Optional[float]]:
+        """Per-share Black-Scholes marks for ``lots``, priced in ONE vectorised call.
+
+        Each lot is valued at the current underlying close, its remaining time to expiry and
+        the IV of its most recent cached bar (the provider's ``get_latest_bar`` — the last
+        point-in-time vol the market showed for that contract). A lot whose terms, spot or IV
+        cannot be resolved — or that expires today — gets None, so the caller's existing
+        fall-backs apply to it unchanged.
+        """
+        n = len(lots)
+        spot, strike, years, sigma = (np.full(n, np.nan) for _ in range(4))
+        is_call = np.zeros(n, dtype=bool)
+        for i, lot in enumerate(lots):
+            k, s, right = self._lot_strike_spot_right(lot.contract_symbol)
+            o = self._lot_order(lot.contract_symbol)
+            expiry = getattr(o, "expiry", None) if o is not None else None
+            if k is None or s is None or right is None or expiry is None:
+                continue
+            last = self._options.get_latest_bar(lot.contract_symbol, as_of)
+            if not last or last.get("iv") is None:
+                continue
+            spot[i], strike[i], sigma[i] = s, k, float(last["iv"])
+            years[i] = (expiry - as_of).days / 365.0
+            is_call[i] = right == OptionRight.CALL
+        rate = float(self._cfg.get("option_mark_rate", 0.0) or 0.0)
+        px = bs_price_array(spot, strike, years, rate, sigma, is_call)
+        return [float(v) if np.isfinite(v) else None for v in px]
+
     def _leg_intrinsic(self, contract_symbol: str, group_bound: Dict[str, Any]) -> Optional[float]:
         """Per-share INTRINSIC value of an option leg at the current underlying close.
 
@@ -2363,8 +2422,9 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
     # reads degrade to empty/None so equity behaviour is unaffected. The two abstract
     # ORDER methods (``_submit_option_order_impl`` / ``close_option_position``) are stubs
     # here — they are implemented in Task 5 — but the class still instantiates (no abstract
-    # method left). ``get_iv_rank`` / ``submit_option_order`` are concrete in the base mixin
-    # and are NOT overridden.
+    # method left). ``submit_option_order`` is concrete in the base mixin and is NOT
+    # overridden; ``get_iv_rank`` reads the prebuilt IV surfaces when the provider has them
+    # (the mixin's OptionIVSnapshot rows are wall-clock and never recorded in a backtest).
     # ======================================================================
     def _as_of_date(self):
         """The simulated bar's calendar date (the provider's as-of clamp boundary)."""
@@ -2386,6 +2446,14 @@ class BacktestAccount(AccountInterface, OptionsAccountInterface):
         return None if self._options is None else self._options.get_atm_iv(
             underlying, self._as_of_date())
 
+    def get_iv_rank(self, underlying, lookback_days=252, min_samples=20):
+        """IV percentile as of the simulated bar, off the provider's IV surfaces (same
+        statistic as the mixin: share of trailing ATM samples strictly below today's)."""
+        surface = getattr(self._options, "iv_surface", None)
+        if surface is None:
+            return super().get_iv_rank(underlying, lookback_days, min_samples)
+        return surface.iv_percentile(underlying, self._as_of_date(), lookback_days, min_samples)
+
     def get_option_positions(self):
         """Held option positions, derived from OPENED transactions whose entry is an OPTION.
 
@@ -24,7 +24,7 @@ import logging
 import os
 import pathlib
 from datetime import date, datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from ba2_common.core.types import is_option_action
 
@@ -131,13 +131,15 @@ def strategy_uses_options(cfg: Dict[str, Any]) -> bool:
 _DEFAULT_OPTIONS_CACHE_FILENAME = "options_cache.sqlite"
 
 
-def default_options_cache_db() -> str:
+def default_options_cache_db(underlyings: Optional[Iterable[str]] = None) -> str:
     """Path to the offline options cache used when a strategy needs options but the payload
     did not pin ``options_cache_db``. ``BACKTEST_OPTIONS_CACHE_DB`` overrides the full path;
     else ``<BACKTEST_CACHE_DIR>/options_cache.sqlite`` when that env is set, otherwise the
     shared options cache dir under ba2_common (``~/Documents/ba2/common/options``) — never the
     repo/CWD. The directory is created on demand so the path is usable (the cache builder/reader
-    opens the sqlite there)."""
+    opens the sqlite there). In that shared dir the columnar store (``OPTIONS_STORE_DIR``, see
+    options_store.py) wins over the SQLite file once it holds every underlying of it, or, while
+    it is partial, when it holds every one of ``underlyings`` (the run's instruments)."""
     explicit = os.environ.get("BACKTEST_OPTIONS_CACHE_DB")
     if explicit:
         return explicit
@@ -151,11 +153,25 @@ def default_options_cache_db() -> str:
     # ``.../options/options_history.sqlite``). Previously this returned a sibling
     # ``options_cache.sqlite`` in the same dir, so a locally-built cache was never found by a
     # local optimize run — reconciled here to one canonical path.
-    from ba2_common.config import OPTIONS_CACHE_DB
+    from ba2_common.config import OPTIONS_CACHE_DB, OPTIONS_STORE_DIR
+    from .options_store import covers
+    if covers(OPTIONS_STORE_DIR, underlyings or ()):
+        return OPTIONS_STORE_DIR
     pathlib.Path(OPTIONS_CACHE_DB).parent.mkdir(parents=True, exist_ok=True)
     return OPTIONS_CACHE_DB
 
 
+def default_iv_surface_dir(options_cache_db: str) -> Optional[str]:
+    """The shared IV surfaces (``IV_SURFACE_DIR``) when they were built from
+    ``options_cache_db``, else None (IV rank then falls back to the account mixin)."""
+    from ba2_common.config import IV_SURFACE_DIR
+    from .iv_surface import built_source
+    source = built_source(IV_SURFACE_DIR)
+    if source is None or os.path.abspath(source) != os.path.abspath(options_cache_db):
+        return None
+    return IV_SURFACE_DIR
+
+
 # Payload keys the handler REQUIRES (validated fail-early, no defaults).
 # ``enabled_instruments`` is NOT in this list: it is either supplied directly (static
 # universe) or RESOLVED from the offline screener cache (screener universe) in
@@ -208,6 +224,10 @@ _SUPPORTED_EXPERTS = {
 }
 
 
+# How BacktestAccount marks a held option lot that has no premium bar on the marking day.
+_OPTION_MARK_MODELS = ("premium_close", "black_scholes")
+
+
 # Max indicator/lookback window (in trading BARS) each expert needs warmed up before the
 # first trading bar. The classic-RM ATR (~14) is the floor; FactorRanker's 12-1 month
 # momentum needs a full year. An expert may override via a ``BACKTEST_WARMUP_BARS`` class attr.
@@ -384,6 +404,12 @@ def _build_config(payload: Dict[str, Any]) -> Dict[str, Any]:
 
     enabled_instruments = _resolve_enabled_instruments(payload, start_date, end_date)
 
+    mark_model = payload.get("option_mark_model") or "premium_close"
+    if mark_model not in _OPTION_MARK_MODELS:
+        raise ValueError(
+            f"unsupported option_mark_model '{mark_model}'; supported: {list(_OPTION_MARK_MODELS)}"
+        )
+
     initial_capital = float(payload["initial_capital"])
     account_settings = {
         "starting_cash": initial_capital,
@@ -402,6 +428,10 @@ def _build_config(payload: Dict[str, Any]) -> Dict[str, Any]:
         # an option premium -- see BacktestAccount._option_half_spread.
         "option_spread_pct": float(payload.get("option_spread_pct") or 0.0),
         "option_spread_min_tick": float(payload.get("option_spread_min_tick") or 0.0),
+        # Optional (default "premium_close" = exact no-op): how a held option lot with no
+        # premium bar that day is marked -- see BacktestAccount._model_option_marks.
+        "option_mark_model": mark_model,
+        "option_mark_rate": float(payload.get("option_mark_rate") or 0.0),
     }
 
     # warmup_days: longest indicator/lookback window the experts need preloaded before
@@ -422,8 +452,11 @@ def _build_config(payload: Dict[str, Any]) -> Dict[str, Any]:
     options_cache_db = payload.get("options_cache_db")
     uses_options = strategy_uses_options(payload)
     if uses_options and not options_cache_db:
-        options_cache_db = default_options_cache_db()
+        options_cache_db = default_options_cache_db(enabled_instruments)
     validate_options_window(start_date, uses_options or bool(options_cache_db))
+    iv_surface_dir = payload.get("iv_surface_dir")
+    if options_cache_db and not iv_surface_dir:
+        iv_surface_dir = default_iv_surface_dir(options_cache_db)
 
     return {
         "backtest_id": payload["backtest_id"],
@@ -468,6 +501,9 @@ def _build_config(payload: Dict[str, Any]) -> Dict[str, Any]:
         # when the strategy's exit/RM rules name an option action; absent/None -> equity-only
         # (unchanged).
         "options_cache_db": options_cache_db,
+        # Prebuilt IV surfaces for the options cache (``tools/build_iv_surface.py``); None when
+        # not built -> get_iv_rank falls back to the account mixin.
+        "iv_surface_dir": iv_surface_dir,
         # Screener (universe.mode=='screener'): per-bar metric_store entry gate (point-in-time,
         # cached) — same mechanism the optimizer uses. None for static runs (engine gate no-op).
         "screener_runtime": _build_screener_runtime(payload),
@@ -587,6 +623,7 @@ def _build_regime_calendar(raw_ohlcv: Any, start_date: Any, end_date: Any):
 def run_daily_backtest(
     config: Dict[str, Any],
     progress_cb: Optional[Callable[[float, str], None]] = None,
+    shared: Any = None,
 ) -> Dict[str, Any]:
     """Run ONE daily multi-asset backtest synchronously, in-process, and return the
     results metric blob (the ``results.build_results`` shape).
@@ -608,6 +645,10 @@ def run_daily_backtest(
         progress_cb: optional ``callable(pct: float, msg: str)`` invoked once per bar
             (the handler wires pause/progress through it). Defaults to a no-op so a direct
             in-process call (the optimizer) needs no task queue.
+        shared: optional ``daily_engine.SharedRunState`` reused across runs that differ only
+            in ``run_schedule_override`` (the robustness schedule-variant batch): the screener
+            gate and expert recommendations are computed once for all of them. None (every
+            other caller) -> nothing is shared.
 
     Returns:
         The results dict (``build_results`` output): total_trades / win_rate / total_return /
@@ -681,7 +722,8 @@ def run_daily_backtest(
     if uses_options:
         from .options_provider import HistoricalOptionsProvider
 
-        options_provider = HistoricalOptionsProvider(options_cache_db)
+        options_provider = HistoricalOptionsProvider(
+            options_cache_db, iv_surface_dir=config.get("iv_surface_dir"))
     else:
         options_provider = None
 
@@ -765,6 +807,7 @@ def run_daily_backtest(
                 indicator_provider=indicator_provider,
                 regime_calendar=_build_regime_calendar(
                     raw_ohlcv, config["start_date"], config["end_date"]),
+                shared=shared,
             )
             engine.run()
 
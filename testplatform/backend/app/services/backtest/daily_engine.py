@@ -65,6 +65,32 @@ from ba2_common.logger import logger
 from app.services.backtest.seam_wiring import make_indicator_provider, make_atr_cache_indicator_provider
 
 
+# ---------------------------------------------------------------------------
+# Shared state across schedule variants
+# ---------------------------------------------------------------------------
+class SharedRunState:
+    """Run-invariant work shared by runs that differ ONLY in entry timing.
+
+    The robustness schedule-variant batch (``robustness_handler``) runs every weekday / entry-
+    time variant of one parent backtest back to back in one worker. Everything that does not
+    depend on the schedule or on account state is computed once and reused here:
+
+      * ``screened``        -- the screener entry gate's ``{scan_date: [symbols]}`` memo;
+      * ``recommendations`` -- ``analyze_as_of`` results keyed ``(expert_id, symbol, as_of)``
+        (``symbol`` is None for a basket expert's whole-bar call). Variants whose analysis
+        bars coincide (e.g. time shifts on a daily clock) analyse each (symbol, bar) once.
+        Bypass experts are never memoised: their rebalance reads the account.
+
+    Bars, the OHLCV memo and the regime calendar are already shared per worker process
+    (``price_source``, ``_REGIME_CALENDAR_MEMO``). Per-run state -- the trading DB, account,
+    experts, orders -- is never shared.
+    """
+
+    def __init__(self) -> None:
+        self.screened: Dict[str, List[str]] = {}
+        self.recommendations: Dict[Tuple[int, Optional[str], datetime], Any] = {}
+
+
 # ---------------------------------------------------------------------------
 # Clock + universe hooks
 # ---------------------------------------------------------------------------
@@ -391,6 +417,7 @@ class DailyBacktestEngine:
         progress_cb: Optional[Callable[[float, str], None]] = None,
         indicator_provider: Any = None,
         regime_calendar: Any = None,
+        shared: Optional[SharedRunState] = None,
     ) -> None:
         self.account = account
         self.experts = experts
@@ -412,6 +439,10 @@ class DailyBacktestEngine:
         # set only changes per scan date (weekly cadence), so it's computed once per scan date and
         # reused for every bar in that period (vs recomputing the full-store filter every 5min bar).
         self._screened_cache: Dict[str, List[str]] = {}
+        # Schedule-variant batch: memos shared with the sibling variant runs (see SharedRunState).
+        self._shared = shared
+        if shared is not None:
+            self._screened_cache = shared.screened
         # BYPASS-expert (FactorRanker/PremiumSeller) per-run manager cache. The portfolio manager
         # holds only run-CONSTANT state (the resolver expert/account instances + ids), so building
         # it ONCE per expert avoids an ExpertInstance DB query on every rebalance bar.
@@ -869,6 +900,19 @@ class DailyBacktestEngine:
             pass
         return self._entry_schedule(expert)
 
+    def _analyze_as_of(self, expert: Any, expert_id: int, symbol: Optional[str],
+                       as_of: datetime, ctx: BacktestContext) -> Any:
+        """``expert.analyze_as_of``, served from the shared variant memo when there is one.
+
+        Failures are not memoised (the caller's per-symbol/per-bar handling runs each time)."""
+        if self._shared is None:
+            return expert.analyze_as_of(as_of, ctx)
+        key = (expert_id, symbol, as_of)
+        memo = self._shared.recommendations
+        if key not in memo:
+            memo[key] = expert.analyze_as_of(as_of, ctx)
+        return memo[key]
+
     # -- per-expert, per-bar ------------------------------------------------
     def _run_expert_bar(
         self,
@@ -912,7 +956,7 @@ class DailyBacktestEngine:
                 subtype=self.config.get("subtype"),
             )
             try:
-                rec = expert.analyze_as_of(as_of, ctx)
+                rec = self._analyze_as_of(expert, expert_id, symbol, as_of, ctx)
             except Exception as e:  # noqa: BLE001 — one symbol must not abort the bar
                 # A hermetic cache miss (un-prewarmed data) must ABORT loudly, NOT be silently
                 # skipped per-symbol — otherwise a missing pre-warm degrades results invisibly.
@@ -1108,7 +1152,7 @@ class DailyBacktestEngine:
             subtype=self.config.get("subtype"),
         )
         try:
-            recs = expert.analyze_as_of(as_of, ctx)
+            recs = self._analyze_as_of(expert, expert_id, None, as_of, ctx)
         except Exception as e:  # noqa: BLE001 — the whole bar aborts (no per-symbol granularity
                                  # left at the gather step for a basket expert)
             from app.services.backtest.price_source import BacktestCacheMiss
@@ -1237,7 +1281,7 @@ class DailyBacktestEngine:
                 extra={"symbol": symbol},
             )
             try:
-                rec = expert.analyze_as_of(as_of, ctx)
+                rec = self._analyze_as_of(expert, expert_id, symbol, as_of, ctx)
             except Exception as e:  # noqa: BLE001 — one symbol must not abort the bar
                 # A hermetic cache miss (un-prewarmed data) must ABORT loudly, NOT be silently
                 # skipped per-symbol — otherwise a missing pre-warm degrades results invisibly.
@@ -38,7 +38,7 @@ from datetime import date, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 from ba2_common.core.types import OptionRight
 from .option_greeks import compute_iv_and_greeks
-from .options_cache import OptionsHistoryCache
+from .options_store import open_options_cache
 
 logger = logging.getLogger(__name__)
 
@@ -420,7 +420,7 @@ def build_cache(cache_db: str, underlyings: List[str], start: date, end: date,
             f"Alpaca options history starts {_OPTIONS_HISTORY_FLOOR.isoformat()}; pick a later --start")
     options_feed = _options_feed(feed)   # fail loud on a bad feed BEFORE any network/cred work
     key, secret = _alpaca_keys(api_key, api_secret)
-    cache = OptionsHistoryCache(cache_db)
+    cache = open_options_cache(cache_db, create=True)   # SQLite file, or a columnar store directory
 
     # DO NOT send `feed` on the BARS request (fixed 2026-07-25).
     #
@@ -553,6 +553,15 @@ def build_cache(cache_db: str, underlyings: List[str], start: date, end: date,
         with ThreadPoolExecutor(max_workers=workers) as ex:
             list(ex.map(_process, pending))
     logger.info(f"options fetch DONE: {stats}")
+    if hasattr(cache, "mark_built"):
+        # Record what the store now holds. The shared store only counts as built (the default
+        # path for every backtest) once it holds every underlying of the shared SQLite cache;
+        # until then default-path runs use it only when it holds their own underlyings.
+        from ba2_common.config import OPTIONS_CACHE_DB, OPTIONS_STORE_DIR
+        shared = _os.path.abspath(cache_db) == _os.path.abspath(OPTIONS_STORE_DIR)
+        cache.mark_built({k: stats[k] for k in ("chain_rows", "bar_rows", "symbols_failed")},
+                         source_db=OPTIONS_CACHE_DB if shared else None,
+                         complete=not stats["symbols_failed"])
     return stats
 
 
@@ -560,7 +569,9 @@ def main(argv=None) -> int:
     ap = argparse.ArgumentParser(prog="ba2-test fetch-options")
     ap.add_argument("--underlyings", required=True, help="comma list or @file")
     ap.add_argument("--start", required=True); ap.add_argument("--end", required=True)
-    ap.add_argument("--cache-db", required=True)
+    ap.add_argument("--cache-db", required=True,
+                    help="options-history SQLite file, or a columnar store directory "
+                         "(see options_store.py)")
     ap.add_argument("--feed", default="indicative",
                     help="options data feed the daily bars are fetched from — 'indicative' "
                          "(default, free; quote-derived prints) or 'opra' (trades; requires "
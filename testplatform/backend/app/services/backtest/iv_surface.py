@@ -0,0 +1,377 @@
+"""Implied-volatility surfaces per underlying and date, built once from the options cache.
+
+WHY (2026-10): strategies that pick strikes by delta or gate on IV rank rebuilt IV from raw
+chain rows on every bar (``get_atm_iv`` scans a snapshot and one bar history per contract),
+and every GA individual repeated the same work over the same dates. The surfaces only depend
+on the cached bars, so they are fitted ONCE per dataset and every worker reads them.
+
+FIT. For each (underlying, trading day) every cached bar with a computed iv (the per-bar
+Black-Scholes inversion in ``option_greeks.py``) becomes a point at log-moneyness
+``ln(strike / underlying close)`` and its DTE. Per expiry, the out-of-the-money side (calls at
+or above spot, puts at or below) is averaged per strike and interpolated linearly onto
+``MONEYNESS_GRID`` (flat beyond the quoted strikes); across expiries the smiles are
+interpolated in TOTAL VARIANCE (iv^2 * T) onto ``DTE_GRID`` (flat vol beyond the listed
+expiries). The cache holds no underlying price, so the build takes the underlying's daily
+closes (``tools/build_iv_surface.py`` reads them through the same OHLCV provider as
+fetch-options); a day without a close gets no surface.
+
+LAYOUT (one directory per underlying, swapped in whole like an options-store partition):
+    <root>/<UNDERLYING>/day.npy             int32 day numbers of the fitted dates (ascending)
+    <root>/<UNDERLYING>/iv.npy              float32 (dates, DTE_GRID, MONEYNESS_GRID)
+    <root>/<UNDERLYING>/atm.npy             float32 ATM (moneyness 0) ``ATM_DTE``-day iv per date
+    <root>/<UNDERLYING>/moneyness_grid.npy  / dte_grid.npy   the grids the file was built on
+    <root>/_built.json                      written after a full build (same marker as the store)
+Arrays are memory-mapped read-only, so GA workers share one page-cached copy.
+
+READ. ``IVSurfaceStore.iv`` interpolates any (moneyness, DTE) arrays on the latest surface on
+or before ``as_of`` (bilinear in moneyness, total variance in DTE). ``iv_percentile`` /
+``iv_rank`` and their ``*_series`` forms work on the ATM series over a trailing calendar
+window; ``iv_percentile`` is the statistic the live ``get_iv_rank`` reports (share of samples
+strictly below the current value), ``iv_rank`` is the classic (current - min) / (max - min).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .options_store import (
+    BUILT_MARKER, OptionsColumnarStore, _day, _days, _read_columns, _write_columns,
+    is_columnar_store,
+)
+
+SURFACE_VERSION = 1
+
+# log(strike / spot): +-40% in 5% steps.
+MONEYNESS_GRID = np.round(np.linspace(-0.40, 0.40, 17), 4)
+DTE_GRID = np.array([7, 14, 21, 30, 45, 60, 90, 120, 180, 270, 365], dtype=np.float64)
+# The ATM series behind IV rank: the surface at the money, ATM_DTE days out (the middle of
+# get_atm_iv's 20-45 DTE window).
+ATM_DTE = 30
+# An expiry needs at least this many distinct points before its smile is used.
+_MIN_POINTS_PER_EXPIRY = 3
+# A surface older than this (calendar days) is not used for an as_of lookup (data gap).
+_MAX_STALE_DAYS = 7
+
+_SURFACE_CACHE_MAX = int(os.getenv("BT_IV_SURFACE_CACHE_MAX", "500"))
+_WORKER_SURFACE_CACHE: "OrderedDict[Tuple[str, str], Optional[_Surface]]" = OrderedDict()
+
+
+def clear_worker_surface_cache() -> None:
+    """Drop every opened surface (test isolation / explicit reset)."""
+    _WORKER_SURFACE_CACHE.clear()
+
+
+# ---------------------------------------------------------------------------- fitting
+
+def fit_surface(moneyness: np.ndarray, dte: np.ndarray, iv: np.ndarray, is_call: np.ndarray,
+                moneyness_grid: np.ndarray = MONEYNESS_GRID,
+                dte_grid: np.ndarray = DTE_GRID) -> np.ndarray:
+    """One day's surface, shape ``(len(dte_grid), len(moneyness_grid))``; all-NaN when no
+    expiry has enough points (see module docstring for the fit)."""
+    out = np.full((len(dte_grid), len(moneyness_grid)), np.nan)
+    ok = np.isfinite(moneyness) & np.isfinite(iv) & (iv > 0) & (dte > 0)
+    otm = ok & np.where(is_call, moneyness >= 0, moneyness <= 0)
+    expiries, smiles = [], []
+    for t in np.unique(dte[ok]):
+        at = ok & (dte == t)
+        sel = at & otm
+        if np.count_nonzero(sel) < _MIN_POINTS_PER_EXPIRY:
+            sel = at
+        m, inverse = np.unique(moneyness[sel], return_inverse=True)
+        if len(m) < _MIN_POINTS_PER_EXPIRY:
+            continue
+        vol = np.bincount(inverse, weights=iv[sel]) / np.bincount(inverse)
+        smiles.append(np.interp(moneyness_grid, m, vol))
+        expiries.append(t)
+    if not smiles:
+        return out
+    years = np.asarray(expiries, dtype=np.float64) / 365.0
+    smile = np.vstack(smiles)
+    variance = smile * smile * years[:, None]
+    grid_years = np.asarray(dte_grid, dtype=np.float64) / 365.0
+    for j in range(len(moneyness_grid)):
+        w = np.interp(grid_years, years, variance[:, j])
+        col = np.sqrt(w / grid_years)
+        col[grid_years < years[0]] = smile[0, j]
+        col[grid_years > years[-1]] = smile[-1, j]
+        out[:, j] = col
+    return out
+
+
+def interpolate(surface: np.ndarray, moneyness_grid: np.ndarray, dte_grid: np.ndarray,
+                moneyness: Any, dte: Any) -> np.ndarray:
+    """IV at (moneyness, dte) points on one fitted surface: linear in moneyness, linear in
+    total variance across DTE, flat outside the grid."""
+    m = np.clip(np.asarray(moneyness, dtype=np.float64), moneyness_grid[0], moneyness_grid[-1])
+    d = np.clip(np.asarray(dte, dtype=np.float64), dte_grid[0], dte_grid[-1])
+    m, d = np.broadcast_arrays(m, d)
+    j = np.clip(np.searchsorted(moneyness_grid, m, side="right") - 1, 0, len(moneyness_grid) - 2)
+    i = np.clip(np.searchsorted(dte_grid, d, side="right") - 1, 0, len(dte_grid) - 2)
+    a = (m - moneyness_grid[j]) / (moneyness_grid[j + 1] - moneyness_grid[j])
+    b = (d - dte_grid[i]) / (dte_grid[i + 1] - dte_grid[i])
+    v0 = surface[i, j] * (1 - a) + surface[i, j + 1] * a
+    v1 = surface[i + 1, j] * (1 - a) + surface[i + 1, j + 1] * a
+    w = (1 - b) * v0 * v0 * dte_grid[i] + b * v1 * v1 * dte_grid[i + 1]
+    return np.sqrt(w / d)
+
+
+# ---------------------------------------------------------------------------- build
+
+def _iv_points(options_cache: Union[str, Path], underlying: str) -> Dict[str, np.ndarray]:
+    """Every cached bar of ``underlying`` with a computed iv: day, strike, expiry, is_call, iv."""
+    if is_columnar_store(options_cache):
+        cols = OptionsColumnarStore(options_cache).bar_columns(underlying, ["iv"])
+        day = np.asarray(cols["date"], dtype=np.int32)
+        expiry = np.asarray(cols["expiry"], dtype=np.int32)
+        is_call = np.asarray(cols["option_type"]) == b"call"
+        strike, iv = np.asarray(cols["strike"], dtype=np.float64), np.asarray(cols["iv"], dtype=np.float64)
+    else:
+        cx = sqlite3.connect(str(options_cache))
+        try:
+            rows = cx.execute(
+                "SELECT date, expiry, option_type, strike, iv FROM option_bar "
+                "WHERE underlying=? AND iv IS NOT NULL", (underlying,)).fetchall()
+        finally:
+            cx.close()
+        day = _days(r[0] for r in rows)
+        expiry = _days(r[1] for r in rows)
+        is_call = np.array([r[2] == "call" for r in rows], dtype=bool)
+        strike = np.array([r[3] for r in rows], dtype=np.float64)
+        iv = np.array([r[4] for r in rows], dtype=np.float64)
+    keep = ~np.isnan(iv)
+    return {"day": day[keep], "expiry": expiry[keep], "is_call": is_call[keep],
+            "strike": strike[keep], "iv": iv[keep]}
+
+
+def build_underlying_surfaces(points: Dict[str, np.ndarray], closes: Dict[str, float],
+                              moneyness_grid: np.ndarray = MONEYNESS_GRID,
+                              dte_grid: np.ndarray = DTE_GRID) -> Dict[str, np.ndarray]:
+    """Fit every day of one underlying. Returns the on-disk columns (see module docstring)."""
+    close_days = _days(closes)
+    close_vals = np.array(list(closes.values()), dtype=np.float64)
+    order = np.argsort(close_days)
+    close_days, close_vals = close_days[order], close_vals[order]
+
+    day = points["day"]
+    spot = np.full(len(day), np.nan)
+    if len(close_days):
+        pos = np.searchsorted(close_days, day).clip(0, len(close_days) - 1)
+        hit = close_days[pos] == day
+        spot[hit] = close_vals[pos[hit]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        moneyness = np.log(points["strike"] / spot)
+    dte = (points["expiry"] - day).astype(np.float64)
+    usable = np.isfinite(moneyness) & (spot > 0)
+
+    order = np.argsort(day[usable], kind="stable")
+    idx = np.flatnonzero(usable)[order]
+    days, starts = np.unique(day[idx], return_index=True)
+    bounds = np.append(starts, len(idx))
+    surfaces = np.full((len(days), len(dte_grid), len(moneyness_grid)), np.nan, dtype=np.float32)
+    atm = np.full(len(days), np.nan, dtype=np.float32)
+    for k in range(len(days)):
+        sel = idx[bounds[k]:bounds[k + 1]]
+        surface = fit_surface(moneyness[sel], dte[sel], points["iv"][sel], points["is_call"][sel],
+                              moneyness_grid, dte_grid)
+        surfaces[k] = surface
+        atm[k] = interpolate(surface, moneyness_grid, dte_grid, 0.0, ATM_DTE)
+    fitted = ~np.isnan(atm)
+    return {"day": days[fitted].astype(np.int32), "iv": surfaces[fitted], "atm": atm[fitted],
+            "moneyness_grid": np.asarray(moneyness_grid, dtype=np.float64),
+            "dte_grid": np.asarray(dte_grid, dtype=np.float64)}
+
+
+def build_iv_surfaces(options_cache: Union[str, Path], root: Union[str, Path],
+                      closes: Dict[str, Dict[str, float]],
+                      underlyings: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Fit and write surfaces for ``underlyings`` (default: every key of ``closes``).
+
+    ``closes`` maps underlying -> ``{date_iso: close}``. Returns ``{underlyings, dates,
+    skipped}``; only a build over every underlying in ``closes`` marks the root built.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    full = underlyings is None
+    stats: Dict[str, Any] = {"underlyings": 0, "dates": 0, "skipped": []}
+    for u in (sorted(closes) if full else list(underlyings)):
+        cols = build_underlying_surfaces(_iv_points(options_cache, u), closes.get(u) or {})
+        if not len(cols["day"]):
+            stats["skipped"].append(u)
+            continue
+        _write_columns(root / u, cols)
+        stats["underlyings"] += 1
+        stats["dates"] += int(len(cols["day"]))
+    _WORKER_SURFACE_CACHE.clear()
+    if full:
+        tmp = root / f".{BUILT_MARKER}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps({"version": SURFACE_VERSION,
+                                   "source": os.path.abspath(options_cache),
+                                   "source_mtime": _source_mtime(options_cache),
+                                   "atm_dte": ATM_DTE, **stats}))
+        os.replace(tmp, root / BUILT_MARKER)
+    return stats
+
+
+def _source_mtime(options_cache: Union[str, Path]) -> Optional[float]:
+    """When the options cache last changed: the SQLite file, or a columnar store's marker
+    (rewritten by every build into it). None when it does not exist."""
+    path = Path(options_cache)
+    if path.is_dir():
+        path = path / BUILT_MARKER
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def built_source(root: Union[str, Path]) -> Optional[str]:
+    """The options cache (absolute path) a finished build at ``root`` was fitted from; None
+    if not built, or if that cache changed since (refetched: the surfaces are stale)."""
+    marker = Path(root) / BUILT_MARKER
+    if not marker.exists():
+        return None
+    meta = json.loads(marker.read_text())
+    source = meta.get("source")
+    if source is None or meta.get("source_mtime") != _source_mtime(source):
+        return None
+    return source
+
+
+# ---------------------------------------------------------------------------- read side
+
+class _Surface:
+    """One underlying's memory-mapped surfaces plus its memoised rank/percentile series."""
+    __slots__ = ("day", "iv", "atm", "moneyness_grid", "dte_grid", "_series")
+
+    def __init__(self, cols: Dict[str, np.ndarray]):
+        self.day = cols["day"]
+        self.iv = cols["iv"]
+        self.atm = np.asarray(cols["atm"], dtype=np.float64)
+        self.moneyness_grid = np.asarray(cols["moneyness_grid"])
+        self.dte_grid = np.asarray(cols["dte_grid"])
+        self._series: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+
+    def index(self, as_of: Any) -> Optional[int]:
+        """Row of the latest surface on or before ``as_of`` (None if none or too stale)."""
+        day = _day(as_of)
+        k = int(np.searchsorted(self.day, day, side="right")) - 1
+        if k < 0 or day - int(self.day[k]) > _MAX_STALE_DAYS:
+            return None
+        return k
+
+    def series(self, lookback_days: int, min_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(percentile, rank) of the ATM iv at every date against its trailing window."""
+        key = (int(lookback_days), int(min_samples))
+        cached = self._series.get(key)
+        if cached is not None:
+            return cached
+        n = len(self.day)
+        starts = np.searchsorted(self.day, self.day - int(lookback_days), side="left")
+        pct, rank = np.full(n, np.nan), np.full(n, np.nan)
+        for k in range(n):
+            window = self.atm[starts[k]:k + 1]
+            window = window[~np.isnan(window)]
+            current = self.atm[k]
+            if np.isnan(current) or len(window) < min_samples:
+                continue
+            pct[k] = round(np.count_nonzero(window < current) / len(window) * 100, 2)
+            lo, hi = window.min(), window.max()
+            rank[k] = round((current - lo) / (hi - lo) * 100, 2) if hi > lo else 0.0
+        self._series[key] = (pct, rank)
+        return pct, rank
+
+
+class IVSurfaceStore:
+    """Read-only access to surfaces built by ``build_iv_surfaces`` under ``root``."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _surface(self, underlying: str) -> Optional[_Surface]:
+        key = (str(self.root), underlying)
+        if key in _WORKER_SURFACE_CACHE:
+            _WORKER_SURFACE_CACHE.move_to_end(key)
+            return _WORKER_SURFACE_CACHE[key]
+        path = self.root / underlying
+        surface = _Surface(_read_columns(path)) if (path / "day.npy").exists() else None
+        _WORKER_SURFACE_CACHE[key] = surface
+        while len(_WORKER_SURFACE_CACHE) > _SURFACE_CACHE_MAX:
+            _WORKER_SURFACE_CACHE.popitem(last=False)
+        return surface
+
+    def underlyings(self) -> list:
+        return sorted(p.parent.name for p in self.root.glob("*/day.npy"))
+
+    def iv(self, underlying: str, as_of: Any, moneyness: Any, dte: Any) -> np.ndarray:
+        """Interpolated iv at ``moneyness`` (log strike/spot) and ``dte`` arrays on the latest
+        surface on or before ``as_of``; NaN everywhere when there is none."""
+        s = self._surface(underlying)
+        k = s.index(as_of) if s is not None else None
+        if k is None:
+            return np.full(np.broadcast(np.asarray(moneyness), np.asarray(dte)).shape, np.nan)
+        return interpolate(np.asarray(s.iv[k], dtype=np.float64), s.moneyness_grid, s.dte_grid,
+                           moneyness, dte)
+
+    def iv_at_strikes(self, underlying: str, as_of: Any, spot: float, strikes: Any,
+                      dte: Any) -> np.ndarray:
+        """``iv`` for absolute strikes given the underlying's price."""
+        return self.iv(underlying, as_of, np.log(np.asarray(strikes, dtype=np.float64) / spot), dte)
+
+    def atm_iv(self, underlying: str, as_of: Any) -> Optional[float]:
+        """ATM ``ATM_DTE``-day iv on the latest surface on or before ``as_of``."""
+        s = self._surface(underlying)
+        k = s.index(as_of) if s is not None else None
+        return None if k is None else float(s.atm[k])
+
+    def _point(self, underlying: str, as_of: Any, lookback_days: int, min_samples: int,
+               which: int) -> Optional[float]:
+        s = self._surface(underlying)
+        k = s.index(as_of) if s is not None else None
+        if k is None:
+            return None
+        v = s.series(lookback_days, min_samples)[which][k]
+        return None if np.isnan(v) else float(v)
+
+    def iv_percentile(self, underlying: str, as_of: Any, lookback_days: int = 252,
+                      min_samples: int = 20) -> Optional[float]:
+        """Share (0-100) of the trailing ATM samples strictly below the current one -- the same
+        statistic as ``OptionsAccountInterface._iv_rank_from_series``. None when fewer than
+        ``min_samples`` samples or no current surface."""
+        return self._point(underlying, as_of, lookback_days, min_samples, 0)
+
+    def iv_rank(self, underlying: str, as_of: Any, lookback_days: int = 252,
+                min_samples: int = 20) -> Optional[float]:
+        """Classic IV rank (0-100): where the current ATM iv sits between the trailing min/max."""
+        return self._point(underlying, as_of, lookback_days, min_samples, 1)
+
+    def _frame(self, underlying: str, values: Sequence[float], start: Any, end: Any) -> pd.Series:
+        s = self._surface(underlying)
+        if s is None:
+            return pd.Series(dtype=np.float64)
+        out = pd.Series(np.asarray(values, dtype=np.float64),
+                        index=pd.to_datetime(np.asarray(s.day).astype("datetime64[D]")))
+        return out.loc[slice(pd.Timestamp(start) if start else None,
+                             pd.Timestamp(end) if end else None)]
+
+    def atm_series(self, underlying: str, start: Any = None, end: Any = None) -> pd.Series:
+        s = self._surface(underlying)
+        return self._frame(underlying, s.atm if s is not None else [], start, end)
+
+    def iv_percentile_series(self, underlying: str, lookback_days: int = 252,
+                             min_samples: int = 20, start: Any = None, end: Any = None) -> pd.Series:
+        s = self._surface(underlying)
+        values = s.series(lookback_days, min_samples)[0] if s is not None else []
+        return self._frame(underlying, values, start, end)
+
+    def iv_rank_series(self, underlying: str, lookback_days: int = 252, min_samples: int = 20,
+                       start: Any = None, end: Any = None) -> pd.Series:
+        s = self._surface(underlying)
+        values = s.series(lookback_days, min_samples)[1] if s is not None else []
+        return self._frame(underlying, values, start, end)
@@ -28,6 +28,7 @@ with the engine's:
 """
 from __future__ import annotations
 
+import os
 from typing import Any, Dict, List, Optional
 
 import numpy as np
@@ -132,26 +133,141 @@ def _annualized_return(initial: float, final: float, years: float) -> float:
     return ((final / initial) ** (1.0 / years) - 1.0) * 100.0
 
 
+# ---------------------------------------------------------------------------
+# Matrix engine
+# ---------------------------------------------------------------------------
+# Paths are generated and scored a BLOCK at a time: every block of ``_BLOCK_PATHS`` paths draws
+# from its own generator, ``SeedSequence(seed, spawn_key=(block,))``, as one (paths x trades)
+# index / noise matrix, and its equity, running peak and drawdown come from cumulative array
+# ops along the trade axis. Because the block -- not the chunk or the worker -- is the unit of
+# randomness, the output for a seed is bit-identical however the blocks are grouped into
+# memory chunks (``BT_MC_CHUNK_MB``) or spread over worker processes (``BT_MC_WORKERS``, only
+# used from ``_POOL_MIN_PATHS`` paths up; small runs never pay the pool start-up).
+_BLOCK_PATHS = 256
+_CHUNK_BYTES = int(float(os.getenv("BT_MC_CHUNK_MB", "256")) * 1024 * 1024)
+_POOL_WORKERS = int(os.getenv("BT_MC_WORKERS", "0"))
+_POOL_MIN_PATHS = 50_000
+# float64 (paths x trades) arrays alive at once while a chunk is scored (draws, path, peaks, dd).
+_ARRAYS_PER_PATH = 4
+
+METHODS = ("bootstrap", "shuffle", "jitter")
+_METRIC_KEYS = ("final_equity", "annualized_return", "max_drawdown", "calmar")
+
+
+def _paths_metrics(paths: np.ndarray, initial: float, years: float) -> Dict[str, np.ndarray]:
+    """``_path_metrics`` for every row of a (paths x points) equity matrix at once."""
+    final = paths[:, -1]
+    peaks = np.maximum.accumulate(paths, axis=1)
+    if initial > 0:
+        # peaks >= initial > 0 everywhere, so the guard below is moot and the deepest drawdown
+        # is just the smallest equity/peak ratio (one divide, no temporaries per element).
+        np.divide(paths, peaks, out=peaks)
+        max_drawdown = (peaks.min(axis=1) - 1.0) * 100.0
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = np.where(peaks > 0, (paths - peaks) / peaks * 100.0, 0.0)
+        max_drawdown = dd.min(axis=1)
+
+    if initial <= 0 or years <= 0:
+        annualized_return = np.zeros(len(final))
+    else:
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            annualized_return = np.where(
+                final > 0, ((final / initial) ** (1.0 / years) - 1.0) * 100.0, -100.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calmar = np.where(max_drawdown != 0, annualized_return / np.abs(max_drawdown), 0.0)
+    return {"final_equity": final, "annualized_return": annualized_return,
+            "max_drawdown": max_drawdown, "calmar": calmar}
+
+
+def _draw_block(method: str, arr: np.ndarray, rows: int, rng: np.random.Generator,
+                sigma_pct: float) -> np.ndarray:
+    """One block's resampled trade pcts, shape ``(rows, len(arr))``."""
+    n = arr.size
+    if method == "bootstrap":
+        return arr[rng.integers(0, n, size=(rows, n))] if n else np.empty((rows, 0))
+    if method == "shuffle":
+        return rng.permuted(np.broadcast_to(arr, (rows, n)), axis=1)
+    if method == "jitter":
+        return arr + rng.normal(0.0, sigma_pct, size=(rows, n)) if n else np.empty((rows, 0))
+    raise ValueError(f"unknown Monte Carlo method {method!r}; expected one of {METHODS}")
+
+
+def _simulate_blocks(method: str, arr: np.ndarray, initial: float, years: float, seed: int,
+                     sigma_pct: float, n_paths: int, first_block: int, last_block: int,
+                     chunk_bytes: int) -> Dict[str, np.ndarray]:
+    """Metrics for blocks ``[first_block, last_block)``, scored a memory chunk at a time."""
+    per_block = _BLOCK_PATHS * (arr.size + 1) * 8 * _ARRAYS_PER_PATH
+    blocks_per_chunk = max(1, int(chunk_bytes) // per_block)
+    out: Dict[str, List[np.ndarray]] = {k: [] for k in _METRIC_KEYS}
+    for chunk_start in range(first_block, last_block, blocks_per_chunk):
+        draws = []
+        for b in range(chunk_start, min(chunk_start + blocks_per_chunk, last_block)):
+            rows = min(_BLOCK_PATHS, n_paths - b * _BLOCK_PATHS)
+            rng = np.random.default_rng(np.random.SeedSequence(int(seed), spawn_key=(b,)))
+            draws.append(_draw_block(method, arr, rows, rng, sigma_pct))
+        sample = np.vstack(draws)
+        paths = np.empty((sample.shape[0], arr.size + 1))
+        paths[:, 0] = float(initial)
+        sample /= 100.0
+        sample += 1.0
+        np.cumprod(sample, axis=1, out=paths[:, 1:])
+        paths[:, 1:] *= float(initial)
+        for k, v in _paths_metrics(paths, initial, years).items():
+            out[k].append(v)
+    return {k: np.concatenate(v) if v else np.empty(0) for k, v in out.items()}
+
+
+def simulate_paths(method: str, pcts, initial: float, n_paths: int, seed: int,
+                   years: float = 3.0, bp_sigma: float = 0.0, *,
+                   workers: Optional[int] = None,
+                   chunk_bytes: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """All ``n_paths`` paths of one method as metric ARRAYS (``final_equity``,
+    ``annualized_return``, ``max_drawdown``, ``calmar``; one entry per path, path order).
+
+    ``bootstrap`` resamples the trades with replacement, ``shuffle`` permutes them, ``jitter``
+    adds gaussian noise of ``bp_sigma`` basis points to each. Bit-reproducible for a given
+    ``seed`` regardless of ``workers`` / ``chunk_bytes`` (see the engine notes above).
+    """
+    arr = np.asarray(list(pcts), dtype=float)
+    n_paths = int(n_paths)
+    sigma_pct = float(bp_sigma) / 100.0  # bp -> pct points
+    chunk_bytes = _CHUNK_BYTES if chunk_bytes is None else int(chunk_bytes)
+    workers = _POOL_WORKERS if workers is None else int(workers)
+    n_blocks = -(-n_paths // _BLOCK_PATHS)
+    if method not in METHODS:
+        raise ValueError(f"unknown Monte Carlo method {method!r}; expected one of {METHODS}")
+    if workers <= 1 or n_paths < _POOL_MIN_PATHS or n_blocks < 2:
+        return _simulate_blocks(method, arr, initial, years, seed, sigma_pct, n_paths,
+                                0, n_blocks, chunk_bytes)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(workers, n_blocks)
+    bounds = np.linspace(0, n_blocks, workers + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_simulate_blocks, method, arr, initial, years, seed, sigma_pct,
+                               n_paths, int(lo), int(hi), chunk_bytes)
+                   for lo, hi in zip(bounds[:-1], bounds[1:])]
+        parts = [f.result() for f in futures]
+    return {k: np.concatenate([p[k] for p in parts]) for k in _METRIC_KEYS}
+
+
+def _as_path_dicts(metrics: Dict[str, np.ndarray]) -> List[Dict[str, float]]:
+    return [dict(zip(_METRIC_KEYS, row)) for row in
+            zip(*(metrics[k].tolist() for k in _METRIC_KEYS))]
+
+
 # ---------------------------------------------------------------------------
 # Monte Carlo methods
 # ---------------------------------------------------------------------------
 def mc_bootstrap(pcts, initial: float, n_paths: int, seed: int, years: float = 3.0) -> List[Dict[str, float]]:
     """Bootstrap: per path, resample ``len(pcts)`` trades WITH replacement, compute path metrics.
 
-    Deterministic given ``seed`` (``np.random.default_rng(seed)``). Returns a list of the
-    per-path metric dicts from ``_path_metrics``.
+    Deterministic given ``seed`` (see ``simulate_paths``). Returns a list of the per-path metric
+    dicts from ``_path_metrics``.
     """
-    arr = np.asarray(list(pcts), dtype=float)
-    rng = np.random.default_rng(seed)
-    n = arr.size
-    out: List[Dict[str, float]] = []
-    for _ in range(int(n_paths)):
-        if n:
-            sample = arr[rng.integers(0, n, size=n)]
-        else:
-            sample = arr
-        out.append(_path_metrics(equity_path_from_trade_pcts(sample, initial), initial, years))
-    return out
+    return _as_path_dicts(simulate_paths("bootstrap", pcts, initial, n_paths, seed, years))
 
 
 def mc_shuffle(pcts, initial: float, n_paths: int, seed: int, years: float = 3.0) -> List[Dict[str, float]]:
@@ -160,13 +276,7 @@ def mc_shuffle(pcts, initial: float, n_paths: int, seed: int, years: float = 3.0
     Same trades in a different order -> identical compounded ``final_equity`` (commutative
     product) but a different, path-dependent ``max_drawdown``. Deterministic given ``seed``.
     """
-    arr = np.asarray(list(pcts), dtype=float)
-    rng = np.random.default_rng(seed)
-    out: List[Dict[str, float]] = []
-    for _ in range(int(n_paths)):
-        perm = rng.permutation(arr)
-        out.append(_path_metrics(equity_path_from_trade_pcts(perm, initial), initial, years))
-    return out
+    return _as_path_dicts(simulate_paths("shuffle", pcts, initial, n_paths, seed, years))
 
 
 def mc_jitter(pcts, initial: float, n_paths: int, seed: int, bp_sigma: float, years: float = 3.0) -> List[Dict[str, float]]:
@@ -175,14 +285,7 @@ def mc_jitter(pcts, initial: float, n_paths: int, seed: int, bp_sigma: float, ye
     ``bp_sigma`` is in basis points (1 bp = 0.01% = 0.01 in pct-point units). Deterministic given
     ``seed``. Models per-trade execution noise (was the edge inside the spread?).
     """
-    arr = np.asarray(list(pcts), dtype=float)
-    rng = np.random.default_rng(seed)
-    sigma_pct = float(bp_sigma) / 100.0  # bp -> pct points
-    out: List[Dict[str, float]] = []
-    for _ in range(int(n_paths)):
-        noisy = arr + rng.normal(0.0, sigma_pct, size=arr.size) if arr.size else arr
-        out.append(_path_metrics(equity_path_from_trade_pcts(noisy, initial), initial, years))
-    return out
+    return _as_path_dicts(simulate_paths("jitter", pcts, initial, n_paths, seed, years, bp_sigma))
 
 
 # ---------------------------------------------------------------------------
@@ -242,21 +345,29 @@ def summarize_paths(paths: List[Dict[str, Any]], target_annual: float, dd_limit:
     * ``prob_dd_breach`` — fraction with ``max_drawdown <= -dd_limit`` (max_drawdown is NEGATIVE;
       ``dd_limit`` is a POSITIVE pct, e.g. ``20`` -> breach when the path drew down past -20%).
     """
-    n = len(paths)
+    metrics = {key: np.asarray([float(p.get(key, 0.0)) for p in paths], dtype=float)
+               for key in _BAND_KEYS}
+    return summarize_metrics(metrics, target_annual, dd_limit)
+
+
+def summarize_metrics(metrics: Dict[str, np.ndarray], target_annual: float,
+                      dd_limit: float) -> Dict[str, Any]:
+    """``summarize_paths`` over metric ARRAYS (``simulate_paths`` output), without building a
+    dict per path."""
+    n = len(metrics["annualized_return"])
     bands: Dict[str, Dict[str, float]] = {}
     for key in _BAND_KEYS:
-        vals = np.asarray([float(p.get(key, 0.0)) for p in paths], dtype=float)
+        vals = np.asarray(metrics[key], dtype=float)
         if vals.size:
-            band = {name: float(np.percentile(vals, q)) for name, q in _PCTS}
+            qs = np.percentile(vals, [q for _, q in _PCTS])
+            band = {name: float(v) for (name, _), v in zip(_PCTS, qs)}
         else:
             band = {name: 0.0 for name, _ in _PCTS}
         bands[key] = band
 
     if n:
-        ann = np.asarray([float(p.get("annualized_return", 0.0)) for p in paths], dtype=float)
-        dd = np.asarray([float(p.get("max_drawdown", 0.0)) for p in paths], dtype=float)
-        prob_target = float(np.count_nonzero(ann >= target_annual) / n)
-        prob_breach = float(np.count_nonzero(dd <= -abs(dd_limit)) / n)
+        prob_target = float(np.count_nonzero(metrics["annualized_return"] >= target_annual) / n)
+        prob_breach = float(np.count_nonzero(metrics["max_drawdown"] <= -abs(dd_limit)) / n)
     else:
         prob_target = 0.0
         prob_breach = 0.0
@@ -349,11 +460,7 @@ def run_monte_carlo(trades: List[Dict[str, Any]], initial: float, years: float,
     dd_limit = float(cfg.get("dd_limit", 20.0))
     methods = cfg.get("methods") or []
 
-    method_runners = {
-        "bootstrap": lambda s: mc_bootstrap(pcts, initial, n_paths, s, years),
-        "shuffle": lambda s: mc_shuffle(pcts, initial, n_paths, s, years),
-        "jitter": lambda s: mc_jitter(pcts, initial, n_paths, s, float(cfg.get("jitter_bp") or 0.0), years),
-    }
+    jitter_bp = float(cfg.get("jitter_bp") or 0.0)
 
     # Yearly-bucketed consistency is only meaningful on the ORIGINAL trade ordering (resampled /
     # shuffled paths don't preserve the exit-date <-> equity mapping). Compute it once here as a
@@ -364,11 +471,10 @@ def run_monte_carlo(trades: List[Dict[str, Any]], initial: float, years: float,
 
     out_methods: Dict[str, Any] = {}
     for offset, name in enumerate(methods):
-        runner = method_runners.get(name)
-        if runner is None:
+        if name not in METHODS:
             continue
-        paths = runner(seed + offset)
-        summary = summarize_paths(paths, target_annual=target_annual, dd_limit=dd_limit)
+        metrics = simulate_paths(name, pcts, initial, n_paths, seed + offset, years, jitter_bp)
+        summary = summarize_metrics(metrics, target_annual=target_annual, dd_limit=dd_limit)
         if baseline_consistency is not None:
             summary["consistency"] = baseline_consistency
         out_methods[name] = summary
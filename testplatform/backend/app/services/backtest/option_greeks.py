@@ -10,11 +10,21 @@ compute IV/greeks ourselves instead of buying them from a vendor.
 Pure (no I/O, no DB). European-style Black-Scholes; equity options are American, so this is
 an approximation (mainly affects deep-ITM puts near ex-dividend) — acceptable for backtest
 strike selection / IV-rank gating, not for pricing early-exercise value.
+
+VECTORISED ENGINE (2026-10). The scalar functions price one contract per Python call, which is
+fine for a cache build but not for marking a whole option book (or a whole chain) on every bar.
+The ``*_array`` functions below take numpy arrays (or scalars, broadcast together) and price /
+differentiate / invert every contract at once with the SAME conventions as the scalar versions
+(theta per day, vega per vol point, NaN where the scalar returns None). Black-76 (options on a
+forward/future) is Black-Scholes-Merton with the carry equal to the rate, so the ``black76_*``
+entry points are thin wrappers over the same kernel.
 """
 from __future__ import annotations
 
 import math
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import numpy as np
 
 from ba2_common.core.types import OptionRight
 
@@ -134,3 +144,192 @@ def compute_iv_and_greeks(price: Optional[float], S: Optional[float], K: float,
     if g is not None:
         out.update(g)
     return out
+
+
+# ==========================================================================================
+# Vectorised engine
+# ==========================================================================================
+# Hart (1968) double-precision rational approximation of the standard normal CDF (as laid out
+# in West, "Better approximations to cumulative normal functions", 2005). Max absolute error vs
+# math.erf is ~2e-16, so array prices match the scalar path to float precision; numpy has no
+# erf of its own and scipy is not a dependency.
+_HART_NUM = (3.52624965998911e-02, 0.700383064443688, 6.37396220353165, 33.912866078383,
+             112.079291497871, 221.213596169931, 220.206867912376)
+_HART_DEN = (8.83883476483184e-02, 1.75566716318264, 16.064177579207, 86.7807322029461,
+             296.564248779674, 637.333633378831, 793.826512519948, 440.413735824752)
+_HART_SPLIT = 7.07106781186547  # 10 / sqrt(2): rational form below, continued fraction above
+
+# Vectorised IV solver: safeguarded Newton inside the same [_SIGMA_LO, _SIGMA_HI] bracket the
+# scalar bisection uses. Newton converges in a handful of steps for almost every contract; a
+# step that leaves the shrinking bracket (tiny vega far OTM) falls back to bisection.
+_ARRAY_PRICE_TOL = 1e-10
+_ARRAY_SIGMA_TOL = 1e-12
+_ARRAY_MAX_ITER = 100
+
+
+def norm_cdf_array(x: Any) -> np.ndarray:
+    """Standard normal CDF of an array (Hart's algorithm; see ``_HART_NUM``)."""
+    x = np.asarray(x, dtype=float)
+    a = np.abs(x)
+    e = np.exp(-0.5 * a * a)
+    num = np.zeros_like(a)
+    for c in _HART_NUM:
+        num = num * a + c
+    den = np.zeros_like(a)
+    for c in _HART_DEN:
+        den = den * a + c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail = e / (a + 1.0 / (a + 2.0 / (a + 3.0 / (a + 4.0 / (a + 0.65))))) / _SQRT_2PI
+    lower = np.where(a < _HART_SPLIT, e * num / den, tail)  # = N(-|x|)
+    lower = np.where(a > 37.0, 0.0, lower)
+    return np.where(x > 0, 1.0 - lower, lower)
+
+
+def _norm_pdf_array(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def _call_mask(option_type: Any) -> np.ndarray:
+    """Boolean is-call array from a bool array, one OptionRight/str, or a sequence of them
+    (``b"call"``/``b"put"`` byte strings, as stored by the columnar options store, too)."""
+    if isinstance(option_type, (str, OptionRight)):
+        return np.asarray(OptionRight(option_type) == OptionRight.CALL)
+    arr = np.asarray(option_type)
+    if arr.dtype == bool:
+        return arr
+    if arr.dtype.kind == "S":
+        return arr == b"call"
+    return np.array([OptionRight(v) == OptionRight.CALL for v in option_type], dtype=bool)
+
+
+def _inputs(S, K, T, r, sigma, option_type, q):
+    """Broadcast the pricing inputs together and flag the rows the formulas are defined for."""
+    S, K, T, r, sigma, q, is_call = np.broadcast_arrays(
+        np.asarray(S, dtype=float), np.asarray(K, dtype=float), np.asarray(T, dtype=float),
+        np.asarray(r, dtype=float), np.asarray(sigma, dtype=float), np.asarray(q, dtype=float),
+        _call_mask(option_type))
+    with np.errstate(invalid="ignore"):
+        ok = (S > 0) & (K > 0) & (T > 0) & (sigma > 0)
+    return S, K, T, r, sigma, q, is_call, ok
+
+
+def _price_kernel(S, K, T, r, sigma, q, is_call):
+    """Price + the pieces the Greeks reuse, for rows already known to be valid."""
+    sqrt_T = np.sqrt(T)
+    v = sigma * sqrt_T
+    d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / v
+    d2 = d1 - v
+    disc_q = np.exp(-q * T)
+    disc_r = np.exp(-r * T)
+    sign = np.where(is_call, 1.0, -1.0)
+    nd1 = norm_cdf_array(sign * d1)
+    nd2 = norm_cdf_array(sign * d2)
+    price = sign * (S * disc_q * nd1 - K * disc_r * nd2)
+    return price, d1, sqrt_T, disc_q, disc_r, sign, nd1, nd2
+
+
+def bs_price_array(S: Any, K: Any, T: Any, r: Any, sigma: Any, option_type: Any,
+                   q: Any = 0.0) -> np.ndarray:
+    """Vectorised :func:`bs_price`. NaN where inputs are degenerate (T<=0, sigma<=0, ...)."""
+    S, K, T, r, sigma, q, is_call, ok = _inputs(S, K, T, r, sigma, option_type, q)
+    out = np.full(S.shape, np.nan)
+    if ok.any():
+        out[ok] = _price_kernel(S[ok], K[ok], T[ok], r[ok], sigma[ok], q[ok], is_call[ok])[0]
+    return out
+
+
+def greeks_array(S: Any, K: Any, T: Any, r: Any, sigma: Any, option_type: Any,
+                 q: Any = 0.0) -> Dict[str, np.ndarray]:
+    """Vectorised :func:`greeks` (plus ``price``): arrays keyed price/delta/gamma/theta/vega.
+
+    Same quoting conventions as the scalar version — theta PER DAY, vega PER VOL POINT — with
+    NaN rows where the scalar returns None."""
+    S, K, T, r, sigma, q, is_call, ok = _inputs(S, K, T, r, sigma, option_type, q)
+    out = {k: np.full(S.shape, np.nan) for k in ("price", "delta", "gamma", "theta", "vega")}
+    if not ok.any():
+        return out
+    S, K, T, r, sigma, q, is_call = (a[ok] for a in (S, K, T, r, sigma, q, is_call))
+    price, d1, sqrt_T, disc_q, disc_r, sign, nd1, nd2 = _price_kernel(S, K, T, r, sigma, q, is_call)
+    pdf_d1 = _norm_pdf_array(d1)
+    out["price"][ok] = price
+    out["delta"][ok] = sign * disc_q * nd1
+    out["gamma"][ok] = disc_q * pdf_d1 / (S * sigma * sqrt_T)
+    out["vega"][ok] = S * disc_q * pdf_d1 * sqrt_T / 100.0
+    theta_annual = (-(S * disc_q * pdf_d1 * sigma) / (2 * sqrt_T)
+                    - sign * r * K * disc_r * nd2
+                    + sign * q * S * disc_q * nd1)
+    out["theta"][ok] = theta_annual / 365.0
+    return out
+
+
+def implied_volatility_array(price: Any, S: Any, K: Any, T: Any, r: Any, option_type: Any,
+                             q: Any = 0.0) -> np.ndarray:
+    """Vectorised :func:`implied_volatility`: solve sigma for every row at once.
+
+    NaN exactly where the scalar returns None — non-positive/missing price or inputs, T<=0, or
+    a price the [_SIGMA_LO, _SIGMA_HI] bracket cannot reproduce (e.g. below intrinsic). Solved
+    rows are accurate to ~1e-10 in price (tighter than the scalar bisection's 1e-6)."""
+    S, K, T, r, price, q, is_call, _ = _inputs(S, K, T, r, price, option_type, q)
+    out = np.full(S.shape, np.nan)
+    with np.errstate(invalid="ignore"):
+        ok = (price > 0) & (S > 0) & (K > 0) & (T > 0) & np.isfinite(r) & np.isfinite(q)
+    idx = np.flatnonzero(ok)
+    if idx.size == 0:
+        return out
+    p, S, K, T, r, q, is_call = (a.ravel()[idx] for a in (price, S, K, T, r, q, is_call))
+    lo = np.full(idx.size, _SIGMA_LO)
+    hi = np.full(idx.size, _SIGMA_HI)
+    f_lo = _price_kernel(S, K, T, r, lo, q, is_call)[0] - p
+    f_hi = _price_kernel(S, K, T, r, hi, q, is_call)[0] - p
+    bracketed = f_lo * f_hi <= 0
+    # Brenner-Subrahmanyam ATM guess, clipped into the bracket.
+    sigma = np.clip(np.sqrt(2 * np.pi / T) * p / S, _SIGMA_LO * 2, _SIGMA_HI / 2)
+    sigma = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, sigma))
+    active = np.flatnonzero(bracketed & (f_lo != 0) & (f_hi != 0))
+    for _ in range(_ARRAY_MAX_ITER):
+        if active.size == 0:
+            break
+        a = active
+        px, d1, sqrt_T, disc_q = _price_kernel(S[a], K[a], T[a], r[a], sigma[a], q[a], is_call[a])[:4]
+        f = px - p[a]
+        vega = S[a] * disc_q * _norm_pdf_array(d1) * sqrt_T
+        high = f > 0  # price rises with sigma: too expensive -> sigma is an upper bound
+        hi[a] = np.where(high, sigma[a], hi[a])
+        lo[a] = np.where(high, lo[a], sigma[a])
+        done = (np.abs(f) < _ARRAY_PRICE_TOL) | (hi[a] - lo[a] < _ARRAY_SIGMA_TOL)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = sigma[a] - f / vega
+        inside = np.isfinite(step) & (step >= lo[a]) & (step <= hi[a])
+        sigma[a] = np.where(done, sigma[a], np.where(inside, step, 0.5 * (lo[a] + hi[a])))
+        active = a[~done]
+    out.reshape(-1)[idx[bracketed]] = sigma[bracketed]
+    return out
+
+
+def compute_iv_and_greeks_array(price: Any, S: Any, K: Any, T: Any, r: Any, option_type: Any,
+                                q: Any = 0.0) -> Dict[str, np.ndarray]:
+    """Vectorised :func:`compute_iv_and_greeks`: arrays keyed iv/delta/gamma/theta/vega, NaN
+    wherever the IV could not be solved (missing price/underlying, expired, out of bounds)."""
+    iv = implied_volatility_array(price, S, K, T, r, option_type, q)
+    g = greeks_array(S, K, T, r, iv, option_type, q)
+    return {"iv": iv, "delta": g["delta"], "gamma": g["gamma"], "theta": g["theta"],
+            "vega": g["vega"]}
+
+
+def black76_price_array(F: Any, K: Any, T: Any, r: Any, sigma: Any,
+                        option_type: Any) -> np.ndarray:
+    """Black-76 price of options on a forward/future ``F`` (discounted at ``r``)."""
+    return bs_price_array(F, K, T, r, sigma, option_type, q=r)
+
+
+def black76_greeks_array(F: Any, K: Any, T: Any, r: Any, sigma: Any,
+                         option_type: Any) -> Dict[str, np.ndarray]:
+    """Black-76 price + Greeks (delta/gamma w.r.t. the forward), same conventions as
+    :func:`greeks_array`."""
+    return greeks_array(F, K, T, r, sigma, option_type, q=r)
+
+
+def black76_implied_volatility_array(price: Any, F: Any, K: Any, T: Any, r: Any,
+                                     option_type: Any) -> np.ndarray:
+    """Black-76 implied volatility of every row (NaN where unsolvable)."""
+    return implied_volatility_array(price, F, K, T, r, option_type, q=r)
@@ -24,17 +24,25 @@ back-to-back identical trials equally slow, ~460s each, against the real 2.6GB c
 process pool is long-lived across many different optimization jobs (see worker_server.py's
 module-level _POOL), so keys could otherwise accumulate across jobs touching different
 universes over the process's lifetime -- the default just needs to clear the realistic
-single-underlying ceiling with headroom for a few underlyings at once."""
+single-underlying ceiling with headroom for a few underlyings at once.
+
+COLUMNAR STORE (2026-10): when ``cache_db`` is a columnar store directory (options_store.py)
+instead of the SQLite file, none of the dict caches above are used: the store's month
+partitions are memory-mapped (one page-cached copy shared by every worker process) and
+get_chain / get_atm_iv select contracts with array masks over the snapshot, overlaying the
+as-of bars with one searchsorted per month -- only the returned contracts become objects."""
 from __future__ import annotations
 from bisect import bisect_right
 from collections import OrderedDict
 from datetime import date, timedelta
 import os
 import sqlite3
+import numpy as np
 from typing import Dict, List, Optional, Tuple
 from ba2_common.core.option_types import OptionContract, OptionQuote
 from ba2_common.core.types import OptionRight
-from .options_cache import OptionsHistoryCache
+from .options_store import OptionsColumnarStore, clear_worker_store_cache, open_options_cache
+from .iv_surface import IVSurfaceStore
 
 _CHAIN_CACHE_MAX = int(os.getenv("BT_OPTION_CHAIN_CACHE_MAX", "300"))
 # Must clear one underlying's full chain width (measured max 15882, MU) with headroom for a
@@ -76,6 +84,17 @@ def clear_worker_options_cache() -> None:
     _WORKER_CHAIN_CACHE.clear()
     _WORKER_BAR_CACHE.clear()
     _WORKER_ATM_IV_CACHE.clear()
+    clear_worker_store_cache()
+
+
+def _row_contract(r: dict) -> OptionContract:
+    """OptionContract from a columnar-store row (as-of overlay already applied)."""
+    return OptionContract(
+        symbol=r["occ_symbol"], underlying=r["underlying"],
+        option_type=OptionRight(r["option_type"]), strike=r["strike"],
+        expiry=date.fromisoformat(r["expiry"]), bid=r["bid"], ask=r["ask"], last=r["last"],
+        implied_volatility=r["iv"], delta=r["delta"], gamma=r["gamma"], theta=r["theta"],
+        vega=r["vega"], open_interest=r["open_interest"], volume=r["volume"])
 
 
 class _ChainHistory:
@@ -235,14 +254,40 @@ def _to_contract(r: dict, greeks_row: Optional[dict] = None) -> OptionContract:
         volume=(greeks_row.get("volume") if greeks_row is not None
                 and greeks_row.get("volume") is not None else r.get("volume")))
 
+def _in_delta_band(c: OptionContract, delta_min: Optional[float],
+                   delta_max: Optional[float]) -> bool:
+    if delta_min is None and delta_max is None:
+        return True
+    if c.delta is None:
+        return False
+    d = abs(c.delta)
+    return (delta_min is None or d >= delta_min) and (delta_max is None or d <= delta_max)
+
+
 class HistoricalOptionsProvider:
-    def __init__(self, cache_db: str):
-        self.cache = OptionsHistoryCache(cache_db)
+    def __init__(self, cache_db: str, iv_surface_dir: Optional[str] = None):
+        # SQLite OptionsHistoryCache, or the columnar store for a store directory
+        self.cache = open_options_cache(cache_db)
         self.db_path = self.cache.db_path
+        self._store: Optional[OptionsColumnarStore] = (
+            self.cache if isinstance(self.cache, OptionsColumnarStore) else None)
+        # Prebuilt IV surfaces (iv_surface.py) for IV rank / surface lookups; None = not built.
+        self.iv_surface: Optional[IVSurfaceStore] = (
+            IVSurfaceStore(iv_surface_dir) if iv_surface_dir else None)
 
     def get_chain(self, underlying: str, as_of: date, *, expiry_min: date, expiry_max: date,
                   option_type: Optional[OptionRight] = None, strike_min: Optional[float] = None,
-                  strike_max: Optional[float] = None) -> List[OptionContract]:
+                  strike_max: Optional[float] = None, delta_min: Optional[float] = None,
+                  delta_max: Optional[float] = None) -> List[OptionContract]:
+        """Contracts of the latest snapshot <= as_of within the filters, carrying as-of
+        greeks/quotes. ``delta_min``/``delta_max`` bound |delta| (after the bar overlay)."""
+        if self._store is not None:
+            sl = self._store.select(
+                underlying, as_of, expiry_min=expiry_min, expiry_max=expiry_max,
+                option_type=option_type.value if option_type is not None else None,
+                strike_min=strike_min, strike_max=strike_max,
+                abs_delta_min=delta_min, abs_delta_max=delta_max)
+            return [] if sl is None else [_row_contract(sl.row(i)) for i in range(len(sl))]
         hist = _chain_history(self.db_path, underlying)
         snap = hist.latest_as_of(as_of.isoformat())
         if snap is None:
@@ -260,10 +305,19 @@ class HistoricalOptionsProvider:
             if strike_max is not None and r["strike"] > strike_max:
                 continue
             greeks_row = _bar_history(self.db_path, r["occ_symbol"]).latest_on_or_before(as_of.isoformat())
-            out.append(_to_contract(r, greeks_row))
+            contract = _to_contract(r, greeks_row)
+            if _in_delta_band(contract, delta_min, delta_max):
+                out.append(contract)
         return out
 
     def get_quote(self, occ_symbol: str, as_of: date) -> Optional[OptionQuote]:
+        if self._store is not None:
+            bar = self._store.read_bar(occ_symbol, as_of.isoformat())
+            if bar is None:
+                return None
+            chain_row = self._store.chain_row(bar["underlying"], occ_symbol, as_of.isoformat())
+            bid, ask, last = _pit_quotes(chain_row, bar)
+            return OptionQuote(symbol=occ_symbol, bid=bid, ask=ask, last=last)
         bar = _bar_history(self.db_path, occ_symbol).by_date.get(as_of.isoformat())
         if bar is None:
             return None
@@ -278,8 +332,17 @@ class HistoricalOptionsProvider:
         return OptionQuote(symbol=occ_symbol, bid=bid, ask=ask, last=last)
 
     def get_bar(self, occ_symbol: str, as_of: date) -> Optional[dict]:
+        if self._store is not None:
+            return self._store.read_bar(occ_symbol, as_of.isoformat())
         return _bar_history(self.db_path, occ_symbol).by_date.get(as_of.isoformat())
 
+    def get_latest_bar(self, occ_symbol: str, as_of: date) -> Optional[dict]:
+        """The contract's most recent bar ON OR BEFORE ``as_of`` (its last known close/iv), or
+        None. Unlike ``get_bar`` this forward-fills across the sparse cache's missing days."""
+        if self._store is not None:
+            return self._store.latest_bar_on_or_before(occ_symbol, as_of.isoformat())
+        return _bar_history(self.db_path, occ_symbol).latest_on_or_before(as_of.isoformat())
+
     def get_atm_iv(self, underlying: str, as_of: date) -> Optional[float]:
         """NEAR-ATM implied volatility (0-1) for ``underlying`` as of ``as_of`` — feeds
         ``IVRankCondition``'s rolling history.
@@ -319,6 +382,18 @@ class HistoricalOptionsProvider:
 
     def _compute_atm_iv(self, underlying: str, as_of: date) -> Optional[float]:
         """Uncached body of get_atm_iv (see its docstring for the selection rule)."""
+        if self._store is not None:
+            sl = self._store.select(underlying, as_of, expiry_min=as_of + timedelta(days=20),
+                                    expiry_max=as_of + timedelta(days=45),
+                                    option_type=OptionRight.CALL.value)
+            if sl is None:
+                return None
+            ok = np.flatnonzero(~np.isnan(sl.delta) & ~np.isnan(sl.iv))
+            if not len(ok):
+                return None
+            # Same ordering as the scan below: (| |delta| - 0.5 |, expiry, strike)
+            order = np.lexsort((sl.strike[ok], sl.expiry[ok], np.abs(np.abs(sl.delta[ok]) - 0.5)))
+            return float(sl.iv[ok[order[0]]])
         hist = _chain_history(self.db_path, underlying)
         snap = hist.latest_as_of(as_of.isoformat())
         if snap is None:
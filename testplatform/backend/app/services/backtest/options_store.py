@@ -0,0 +1,711 @@
+"""Columnar, memory-mapped offline options store. Same content as the SQLite
+OptionsHistoryCache (contract metadata, chain snapshots, per-contract daily bars with computed
+iv/greeks), laid out so a backtest reads arrays instead of rows.
+
+WHY (2026-10): the SQLite cache is row-oriented, and options_provider.py materialised an
+underlying's WHOLE chain history -- plus one bar history per touched contract -- as Python
+lists of dicts in EVERY GA worker process (a wide get_chain on MU touched ~16k contract bar
+histories, each a dict of dicts). Option backtests were memory-bound (each worker held its
+own copy) and slow to start (every worker re-ran the same SQL and re-built the same dicts).
+
+LAYOUT (partitioned by underlying, then month):
+    <root>/<UNDERLYING>/meta.json                     months + snapshot dates (written LAST)
+    <root>/<UNDERLYING>/contracts/<col>.npy           occ_symbol, option_type, strike, expiry
+    <root>/<UNDERLYING>/chain/ym=YYYY-MM/<col>.npy    one row per (snapshot as_of, contract)
+    <root>/<UNDERLYING>/bars/ym=YYYY-MM/<col>.npy     one row per (contract, quote date)
+Every column is a plain ``.npy`` array opened with ``np.load(mmap_mode="r")``, so GA worker
+processes share one page-cached copy instead of each holding its own. Dates are int32 day
+numbers (days since 1970-01-01); SQL NULLs are NaN. Contracts are numbered by their row in
+``contracts/`` (append-only, so the numbers stay valid as partitions are rewritten). Bar
+partitions are sorted by ``key = contract << 16 | day`` -- "latest bar on or before as_of" for
+a whole set of contracts is ONE ``np.searchsorted`` per month partition.
+
+Selection (``select``) resolves the latest snapshot <= as_of, filters contracts by expiry /
+DTE / right / strike with array masks, overlays each survivor's as-of bar (same rules as
+options_provider._to_contract: bar greeks only when the bar's own iv computed, point-in-time
+quotes from the bar close, bar volume preferred) and can then filter by |delta| -- all
+vectorised. Only the contracts a caller keeps are turned into objects.
+
+Writes mirror OptionsHistoryCache (``write_chain_rows`` / ``write_bar_rows`` /
+``cached_underlyings``) so ``fetch_options.build_cache`` can target either; each write
+rewrites the touched month partitions (merge, INSERT-OR-REPLACE on the key) and swaps them
+into place. Build once, read-only at backtest time -- same contract as the SQLite cache.
+``convert_sqlite_cache`` migrates an existing cache (``tools/convert_options_cache.py``).
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .options_cache import OptionsCacheMiss
+
+STORE_VERSION = 1
+# Written by every fetch/conversion into a store: the underlyings it holds and whether it is
+# ``complete`` (holds every underlying of the SQLite cache it mirrors). A default-path backtest
+# only switches to the store when it is complete or holds every underlying the run needs (a
+# half-converted store would miss underlyings).
+BUILT_MARKER = "_built.json"
+_DAY_BITS = 16  # day numbers stay < 2**16 until 2149
+_UNDERLYING_RE = re.compile(r"^[A-Za-z0-9.^_\-]+$")
+_OCC_ROOT_RE = re.compile(r"^([A-Z0-9.]+?)\d{6}[CP]\d{8}$")
+
+_CHAIN_VALUE_COLS = ["bid", "ask", "last", "iv", "delta", "gamma", "theta", "vega",
+                     "open_interest", "volume"]
+_BAR_VALUE_COLS = ["open", "high", "low", "close", "volume", "iv", "delta", "gamma", "theta",
+                   "vega"]
+_GREEK_COLS = ["iv", "delta", "gamma", "theta", "vega"]
+
+# Opened underlyings per worker process, keyed (root, underlying). Each holds memory-mapped
+# columns only, so the cap bounds open mappings, not resident memory.
+_VIEW_CACHE_MAX = int(os.getenv("BT_OPTION_STORE_CACHE_MAX", "500"))
+_WORKER_VIEW_CACHE: "OrderedDict[Tuple[str, str], _UnderlyingView]" = OrderedDict()
+# OCC symbol -> underlying it is stored under, keyed (root, occ): quote/bar reads by contract
+# symbol resolve the partition without touching the filesystem after the first lookup.
+_OCC_UNDERLYING_MAX = int(os.getenv("BT_OPTION_OCC_CACHE_MAX", "200000"))
+_WORKER_OCC_UNDERLYING: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+
+
+def clear_worker_store_cache() -> None:
+    """Drop every opened underlying view (test isolation / explicit reset)."""
+    _WORKER_VIEW_CACHE.clear()
+    _WORKER_OCC_UNDERLYING.clear()
+
+
+def is_columnar_store(path: Union[str, Path]) -> bool:
+    """True for a columnar store directory: one carrying BUILT_MARKER. SQLite caches are
+    files (``.sqlite`` / ``.db``)."""
+    return (Path(path) / BUILT_MARKER).is_file()
+
+
+def built_meta(path: Union[str, Path]) -> Dict[str, Any]:
+    """The store's BUILT_MARKER contents ({} when there is none)."""
+    try:
+        return json.loads((Path(path) / BUILT_MARKER).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def is_built(path: Union[str, Path]) -> bool:
+    """True once the store at ``path`` holds every underlying of the cache it mirrors."""
+    meta = built_meta(path)
+    return bool(meta) and bool(meta.get("complete", True))
+
+
+def covers(path: Union[str, Path], underlyings: Iterable[str]) -> bool:
+    """True when the store at ``path`` is complete or holds every one of ``underlyings``."""
+    meta = built_meta(path)
+    if not meta:
+        return False
+    if meta.get("complete", True):
+        return True
+    wanted = {str(u).upper() for u in underlyings}
+    return bool(wanted) and wanted <= set(meta.get("underlyings") or ())
+
+
+def sqlite_underlyings(db_path: Union[str, Path]) -> set:
+    """Underlyings with a chain snapshot in an OptionsHistoryCache SQLite file (read-only)."""
+    cx = sqlite3.connect(f"file:{Path(db_path).resolve()}?mode=ro", uri=True)
+    try:
+        return {r[0] for r in cx.execute("SELECT DISTINCT underlying FROM option_chain")}
+    finally:
+        cx.close()
+
+
+def open_options_cache(path: Union[str, Path], create: bool = False):
+    """The store for ``path``: an ``OptionsColumnarStore`` for a columnar store directory,
+    else the SQLite ``OptionsHistoryCache``. With ``create`` (writers), a suffix-less path
+    that is not a file opens as a new columnar store."""
+    p = Path(path)
+    if is_columnar_store(p) or (create and p.suffix == "" and not p.is_file()):
+        return OptionsColumnarStore(path)
+    from .options_cache import OptionsHistoryCache
+    return OptionsHistoryCache(str(path))
+
+
+# ---------------------------------------------------------------------------- conversions
+
+def _days(values: Iterable[str]) -> np.ndarray:
+    """ISO dates -> int32 day numbers."""
+    return np.array([str(v)[:10] for v in values], dtype="datetime64[D]").astype(np.int32)
+
+
+def _day(value: Any) -> int:
+    """A date, datetime or ISO string -> day number."""
+    iso = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return int(np.datetime64(iso[:10], "D").astype(np.int64))
+
+
+def _iso(day: int) -> str:
+    return str(np.datetime64(int(day), "D"))
+
+
+def _month(day: int) -> str:
+    return str(np.datetime64(int(day), "D").astype("datetime64[M]"))
+
+
+def _months(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(str)
+
+
+def _floats(rows: Sequence[Dict[str, Any]], col: str) -> np.ndarray:
+    return np.array([np.nan if r.get(col) is None else r[col] for r in rows], dtype=np.float64)
+
+
+def _opt(v) -> Optional[float]:
+    v = float(v)
+    return None if v != v else v
+
+
+def _opt_int(v) -> Optional[int]:
+    v = float(v)
+    return None if v != v else int(v)
+
+
+# ---------------------------------------------------------------------------- file helpers
+
+def _write_columns(path: Path, columns: Dict[str, np.ndarray]) -> None:
+    """Write one partition (a directory of ``.npy`` columns) and swap it into place."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    for name, arr in columns.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+    old = None
+    if path.exists():
+        old = path.with_name(f".{path.name}.{os.getpid()}.old")
+        os.replace(path, old)
+    os.replace(tmp, path)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _read_columns(path: Path) -> Dict[str, np.ndarray]:
+    out = {}
+    for f in path.glob("*.npy"):
+        try:
+            out[f.stem] = np.load(f, mmap_mode="r")
+        except ValueError:  # zero-length arrays cannot be mapped
+            out[f.stem] = np.load(f)
+    return out
+
+
+class _UnderlyingView:
+    """One underlying's memory-mapped contracts + lazily opened month partitions."""
+    __slots__ = ("path", "meta", "contracts", "_occ_order", "_occ_sorted", "_parts", "_as_of")
+
+    def __init__(self, path: Path):
+        self.path = path
+        meta_path = path / "meta.json"
+        self.meta = json.loads(meta_path.read_text()) if meta_path.exists() else {
+            "version": STORE_VERSION, "chain_as_of": [], "chain_months": [], "bar_months": []}
+        cdir = path / "contracts"
+        self.contracts = _read_columns(cdir) if cdir.exists() else {
+            "occ_symbol": np.array([], dtype="S1"), "option_type": np.array([], dtype="S1"),
+            "strike": np.array([], dtype=np.float64), "expiry": np.array([], dtype=np.int32)}
+        self._occ_order = np.argsort(self.contracts["occ_symbol"], kind="stable")
+        self._occ_sorted = self.contracts["occ_symbol"][self._occ_order]
+        self._parts: Dict[Tuple[str, str], Dict[str, np.ndarray]] = {}
+        self._as_of = list(self.meta["chain_as_of"])
+
+    def part(self, kind: str, month: str) -> Dict[str, np.ndarray]:
+        key = (kind, month)
+        cols = self._parts.get(key)
+        if cols is None:
+            cols = _read_columns(self.path / kind / f"ym={month}")
+            self._parts[key] = cols
+        return cols
+
+    def contract_index(self, occ_symbols: Sequence[str]) -> np.ndarray:
+        """Contract numbers for OCC symbols (-1 where unknown)."""
+        want = np.array([s.encode() if isinstance(s, str) else s for s in occ_symbols], dtype="S")
+        if not len(self._occ_sorted) or not len(want):
+            return np.full(len(want), -1, dtype=np.int64)
+        pos = np.searchsorted(self._occ_sorted, want).clip(0, len(self._occ_sorted) - 1)
+        hit = self._occ_sorted[pos] == want
+        return np.where(hit, self._occ_order[pos], -1).astype(np.int64)
+
+    def latest_snapshot(self, day: int) -> Optional[str]:
+        i = bisect_right(self._as_of, _iso(day))
+        return self._as_of[i - 1] if i else None
+
+    def snapshot_rows(self, snap: str) -> Dict[str, np.ndarray]:
+        """Chain rows of one snapshot (contract + value columns)."""
+        part = self.part("chain", snap[:7])
+        d = _day(snap)
+        lo, hi = np.searchsorted(part["as_of"], [d, d + 1])
+        return {k: v[lo:hi] for k, v in part.items()}
+
+    def latest_bars(self, idx: np.ndarray, day: int) -> Dict[str, np.ndarray]:
+        """Each contract's latest bar with date <= day (NaN values / date -1 when none)."""
+        n = len(idx)
+        out: Dict[str, np.ndarray] = {c: np.full(n, np.nan) for c in _BAR_VALUE_COLS}
+        out["date"] = np.full(n, -1, dtype=np.int32)
+        todo = np.arange(n)
+        month = _month(day)
+        for m in reversed([m for m in self.meta["bar_months"] if m <= month]):
+            if not len(todo):
+                break
+            part = self.part("bars", m)
+            want = (idx[todo] << _DAY_BITS) | day
+            pos = np.searchsorted(part["key"], want, side="right") - 1
+            ok = pos >= 0
+            ok[ok] = part["contract"][pos[ok]] == idx[todo][ok]
+            hit, p = todo[ok], pos[ok]
+            for c in _BAR_VALUE_COLS:
+                out[c][hit] = part[c][p]
+            out["date"][hit] = part["date"][p]
+            todo = todo[~ok]
+        return out
+
+    def bar_on(self, idx: int, day: int) -> Optional[int]:
+        """Row of contract ``idx``'s bar dated exactly ``day`` in its month partition."""
+        month = _month(day)
+        if month not in self.meta["bar_months"]:
+            return None
+        keys = self.part("bars", month)["key"]
+        want = (int(idx) << _DAY_BITS) | int(day)
+        pos = int(np.searchsorted(keys, want))
+        return pos if pos < len(keys) and int(keys[pos]) == want else None
+
+
+class OptionChainSlice:
+    """Selected contracts of one chain snapshot, as parallel arrays (point-in-time overlay
+    applied). ``expiry`` / ``bar_date`` are day numbers; NaN marks a missing value."""
+    __slots__ = ("underlying", "snapshot", "occ_symbol", "option_type", "strike", "expiry",
+                 "bid", "ask", "last", "iv", "delta", "gamma", "theta", "vega",
+                 "open_interest", "volume", "volume_from_bar", "bar_date")
+
+    def __len__(self) -> int:
+        return len(self.occ_symbol)
+
+    def take(self, sel) -> "OptionChainSlice":
+        out = OptionChainSlice()
+        out.underlying, out.snapshot = self.underlying, self.snapshot
+        for name in self.__slots__[2:]:
+            setattr(out, name, getattr(self, name)[sel])
+        return out
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Row ``i`` as a chain-row dict (NaN -> None), the shape OptionsHistoryCache returns."""
+        vol = self.volume[i]
+        return {
+            "underlying": self.underlying, "as_of": self.snapshot,
+            "occ_symbol": self.occ_symbol[i].decode(),
+            "option_type": self.option_type[i].decode(), "strike": float(self.strike[i]),
+            "expiry": _iso(self.expiry[i]), "bid": _opt(self.bid[i]), "ask": _opt(self.ask[i]),
+            "last": _opt(self.last[i]), "iv": _opt(self.iv[i]), "delta": _opt(self.delta[i]),
+            "gamma": _opt(self.gamma[i]), "theta": _opt(self.theta[i]), "vega": _opt(self.vega[i]),
+            "open_interest": _opt_int(self.open_interest[i]),
+            "volume": _opt(vol) if self.volume_from_bar[i] else _opt_int(vol),
+        }
+
+
+class OptionsColumnarStore:
+    """Columnar options store rooted at ``root`` (see module docstring)."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Same attribute the SQLite cache exposes; worker memos key on it.
+        self.db_path = str(self.root)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ read side
+    def _view(self, underlying: str) -> _UnderlyingView:
+        key = (self.db_path, underlying)
+        view = _WORKER_VIEW_CACHE.get(key)
+        if view is not None:
+            _WORKER_VIEW_CACHE.move_to_end(key)
+            return view
+        view = _UnderlyingView(self.root / underlying)
+        _WORKER_VIEW_CACHE[key] = view
+        while len(_WORKER_VIEW_CACHE) > _VIEW_CACHE_MAX:
+            _WORKER_VIEW_CACHE.popitem(last=False)
+        return view
+
+    def row_counts(self, underlying: str) -> Tuple[int, int]:
+        """(chain rows, bar rows) stored for ``underlying``."""
+        view = self._view(underlying)
+        return (sum(len(view.part("chain", m)["contract"]) for m in view.meta["chain_months"]),
+                sum(len(view.part("bars", m)["contract"]) for m in view.meta["bar_months"]))
+
+    def bar_columns(self, underlying: str, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Every stored bar of ``underlying`` as flat arrays: ``date`` (day numbers), the
+        requested bar ``columns`` and the contract's ``strike`` / ``expiry`` / ``option_type``.
+        For whole-history scans (e.g. the IV surface build), not per-bar reads."""
+        view = self._view(underlying)
+        parts = [view.part("bars", m) for m in view.meta["bar_months"]]
+        contract = np.concatenate([p["contract"] for p in parts]) if parts else np.array([], dtype=np.int64)
+        out = {c: (np.concatenate([p[c] for p in parts]) if parts else np.array([], dtype=np.float64))
+               for c in ("date", *columns)}
+        out.update({c: view.contracts[c][contract] for c in ("strike", "expiry", "option_type")})
+        return out
+
+    def mark_built(self, stats: Dict[str, Any], source_db: Optional[str] = None,
+                   complete: bool = True) -> None:
+        """Record a fetch/conversion into the store (see BUILT_MARKER).
+
+        The marker lists every underlying the store now holds (read back from disk, so runs
+        that each added some underlyings accumulate). It is ``complete`` only when the caller
+        says so and the store holds every underlying of ``source_db`` (when that SQLite cache
+        exists).
+        """
+        held = sorted(self.cached_underlyings())
+        if source_db is not None and os.path.exists(source_db):
+            complete = complete and sqlite_underlyings(source_db) <= set(held)
+        meta = {"version": STORE_VERSION, **stats, "underlyings": held, "complete": bool(complete)}
+        if source_db is not None:
+            meta["source"] = os.path.abspath(source_db)
+        tmp = self.root / f".{BUILT_MARKER}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.root / BUILT_MARKER)
+
+    def underlyings(self) -> List[str]:
+        return sorted(p.parent.name for p in self.root.glob("*/meta.json"))
+
+    def cached_underlyings(self) -> set:
+        """Underlyings with at least one chain snapshot (the chain is written LAST per
+        underlying by fetch_options, so its presence means the bars finished)."""
+        return {u for u in self.underlyings() if self._view(u).meta["chain_as_of"]}
+
+    def latest_chain_as_of(self, underlying: str, on_or_before: str) -> Optional[str]:
+        return self._view(underlying).latest_snapshot(_day(on_or_before))
+
+    def select(self, underlying: str, as_of: Any, *, expiry_min: Any = None,
+               expiry_max: Any = None, dte_min: Optional[int] = None,
+               dte_max: Optional[int] = None, option_type: Optional[str] = None,
+               strike_min: Optional[float] = None, strike_max: Optional[float] = None,
+               abs_delta_min: Optional[float] = None, abs_delta_max: Optional[float] = None,
+               occ_symbols: Optional[Sequence[str]] = None) -> Optional[OptionChainSlice]:
+        """Contracts of the latest snapshot <= ``as_of`` passing every given filter, with
+        their as-of bar overlaid. None when no snapshot exists yet (distinct from an empty
+        selection). Expiry bounds and DTE (days from as_of to expiry) are inclusive;
+        ``option_type`` is "call"/"put"; the |delta| band applies to the overlaid delta."""
+        view = self._view(underlying)
+        day = _day(as_of)
+        snap = view.latest_snapshot(day)
+        if snap is None:
+            return None
+        rows = view.snapshot_rows(snap)
+        idx = rows["contract"].astype(np.int64)
+        expiry = view.contracts["expiry"][idx]
+        keep = np.ones(len(idx), dtype=bool)
+        if expiry_min is not None:
+            keep &= expiry >= _day(expiry_min)
+        if expiry_max is not None:
+            keep &= expiry <= _day(expiry_max)
+        if dte_min is not None:
+            keep &= expiry - day >= dte_min
+        if dte_max is not None:
+            keep &= expiry - day <= dte_max
+        if option_type is not None:
+            keep &= view.contracts["option_type"][idx] == option_type.encode()
+        strike = view.contracts["strike"][idx]
+        if strike_min is not None:
+            keep &= strike >= strike_min
+        if strike_max is not None:
+            keep &= strike <= strike_max
+        if occ_symbols is not None:
+            keep &= np.isin(idx, view.contract_index(occ_symbols))
+        sel = np.flatnonzero(keep)
+        # Contract-symbol order, the order the SQLite cache's primary key returns rows in
+        sel = sel[np.argsort(view.contracts["occ_symbol"][idx[sel]], kind="stable")]
+        idx = idx[sel]
+
+        out = OptionChainSlice()
+        out.underlying, out.snapshot = underlying, snap
+        out.occ_symbol = view.contracts["occ_symbol"][idx]
+        out.option_type = view.contracts["option_type"][idx]
+        out.strike, out.expiry = strike[sel], expiry[sel]
+        chain = {c: np.asarray(rows[c][sel], dtype=np.float64) for c in _CHAIN_VALUE_COLS}
+        bar = view.latest_bars(idx, day)
+        out.bar_date = bar["date"]
+        has_bar = bar["date"] >= 0
+        # Greeks from the bar only where the bar's OWN iv computed (options_provider._to_contract)
+        bar_greeks = ~np.isnan(bar["iv"])
+        for c in _GREEK_COLS:
+            setattr(out, c, np.where(bar_greeks, bar[c], chain[c]))
+        # Point-in-time quotes around the bar close (options_provider._pit_quotes)
+        pit = has_bar & ~np.isnan(bar["close"])
+        spread_known = ~np.isnan(chain["bid"]) & ~np.isnan(chain["ask"])
+        half = (chain["ask"] - chain["bid"]) / 2.0
+        out.last = np.where(pit, bar["close"], chain["last"])
+        out.bid = np.where(pit, np.where(spread_known, bar["close"] - half, np.nan), chain["bid"])
+        out.ask = np.where(pit, np.where(spread_known, bar["close"] + half, np.nan), chain["ask"])
+        out.open_interest = chain["open_interest"]
+        out.volume_from_bar = has_bar & ~np.isnan(bar["volume"])
+        out.volume = np.where(out.volume_from_bar, bar["volume"], chain["volume"])
+
+        if abs_delta_min is not None or abs_delta_max is not None:
+            ad = np.abs(out.delta)
+            band = ~np.isnan(ad)
+            if abs_delta_min is not None:
+                band &= ad >= abs_delta_min
+            if abs_delta_max is not None:
+                band &= ad <= abs_delta_max
+            out = out.take(band)
+        return out
+
+    def read_chain(self, underlying: str, as_of: str) -> List[Dict[str, Any]]:
+        """Raw chain rows of the snapshot dated exactly ``as_of`` (no bar overlay)."""
+        view = self._view(underlying)
+        if as_of not in view.meta["chain_as_of"]:
+            return []
+        rows = view.snapshot_rows(as_of)
+        out = []
+        for i, c in enumerate(rows["contract"]):
+            r = self._contract_fields(view, int(c))
+            r.update(underlying=underlying, as_of=as_of)
+            for col in _CHAIN_VALUE_COLS:
+                r[col] = _opt(rows[col][i])
+            r["open_interest"] = _opt_int(rows["open_interest"][i])
+            r["volume"] = _opt_int(rows["volume"][i])
+            out.append(r)
+        return out
+
+    def read_chain_or_miss(self, underlying: str, as_of: str) -> List[Dict[str, Any]]:
+        rows = self.read_chain(underlying, as_of)
+        if not rows:
+            raise OptionsCacheMiss(
+                f"No cached option chain for {underlying} @ {as_of}. Build it with "
+                f"`ba2-test fetch-options --underlyings {underlying} --start ... --end ...`.")
+        return rows
+
+    def chain_row(self, underlying: str, occ_symbol: str, on_or_before: str
+                  ) -> Optional[Dict[str, Any]]:
+        """The raw snapshot row for one contract at the latest snapshot <= on_or_before."""
+        view = self._view(underlying)
+        snap = view.latest_snapshot(_day(on_or_before))
+        if snap is None:
+            return None
+        idx = int(view.contract_index([occ_symbol])[0])
+        rows = view.snapshot_rows(snap)
+        pos = int(np.searchsorted(rows["contract"], idx))
+        if idx < 0 or pos >= len(rows["contract"]) or int(rows["contract"][pos]) != idx:
+            return None
+        r = self._contract_fields(view, idx)
+        r.update(underlying=underlying, as_of=snap)
+        for col in _CHAIN_VALUE_COLS:
+            r[col] = _opt(rows[col][pos])
+        r["open_interest"] = _opt_int(rows["open_interest"][pos])
+        r["volume"] = _opt_int(rows["volume"][pos])
+        return r
+
+    def underlying_of(self, occ_symbol: str) -> Optional[str]:
+        """The underlying an OCC symbol is stored under (its OCC root when that is a stored
+        underlying, else found by searching every underlying's contracts)."""
+        key = (self.db_path, occ_symbol)
+        if key in _WORKER_OCC_UNDERLYING:
+            _WORKER_OCC_UNDERLYING.move_to_end(key)
+            return _WORKER_OCC_UNDERLYING[key]
+        found = None
+        m = _OCC_ROOT_RE.match(occ_symbol)
+        candidates = self.underlyings()
+        if m and m.group(1) in candidates:
+            candidates = [m.group(1)] + [u for u in candidates if u != m.group(1)]
+        for u in candidates:
+            if self._view(u).contract_index([occ_symbol])[0] >= 0:
+                found = u
+                break
+        _WORKER_OCC_UNDERLYING[key] = found
+        while len(_WORKER_OCC_UNDERLYING) > _OCC_UNDERLYING_MAX:
+            _WORKER_OCC_UNDERLYING.popitem(last=False)
+        return found
+
+    def read_bar(self, occ_symbol: str, date: str) -> Optional[Dict[str, Any]]:
+        u = self.underlying_of(occ_symbol)
+        if u is None:
+            return None
+        view = self._view(u)
+        idx = int(view.contract_index([occ_symbol])[0])
+        day = _day(date)
+        pos = view.bar_on(idx, day)
+        return None if pos is None else self._bar_dict(view, u, idx, view.part("bars", _month(day)), pos)
+
+    def latest_bar_on_or_before(self, occ_symbol: str, on_or_before: str
+                                ) -> Optional[Dict[str, Any]]:
+        u = self.underlying_of(occ_symbol)
+        if u is None:
+            return None
+        view = self._view(u)
+        idx = int(view.contract_index([occ_symbol])[0])
+        bar = view.latest_bars(np.array([idx], dtype=np.int64), _day(on_or_before))
+        if bar["date"][0] < 0:
+            return None
+        r = self._contract_fields(view, idx)
+        r.update(underlying=u, date=_iso(bar["date"][0]))
+        r.update({c: _opt(bar[c][0]) for c in _BAR_VALUE_COLS})
+        return r
+
+    @staticmethod
+    def _contract_fields(view: _UnderlyingView, idx: int) -> Dict[str, Any]:
+        c = view.contracts
+        return {"occ_symbol": c["occ_symbol"][idx].decode(),
+                "option_type": c["option_type"][idx].decode(),
+                "strike": float(c["strike"][idx]), "expiry": _iso(c["expiry"][idx])}
+
+    def _bar_dict(self, view: _UnderlyingView, underlying: str, idx: int,
+                  part: Dict[str, np.ndarray], pos: int) -> Dict[str, Any]:
+        r = self._contract_fields(view, idx)
+        r.update(underlying=underlying, date=_iso(part["date"][pos]))
+        r.update({c: _opt(part[c][pos]) for c in _BAR_VALUE_COLS})
+        return r
+
+    # ------------------------------------------------------------------ write side
+    def write_chain_rows(self, underlying: str, as_of: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            self._write(underlying, chain=(as_of, rows), bars=None)
+
+    def write_bar_rows(self, rows: List[Dict[str, Any]]) -> None:
+        by_underlying: Dict[str, List[Dict[str, Any]]] = {}
+        for r in rows:
+            by_underlying.setdefault(r["underlying"], []).append(r)
+        with self._lock:
+            for u, urows in by_underlying.items():
+                self._write(u, chain=None, bars=urows)
+
+    def _write(self, underlying: str, chain: Optional[Tuple[str, List[Dict[str, Any]]]],
+               bars: Optional[List[Dict[str, Any]]]) -> None:
+        if not _UNDERLYING_RE.match(underlying or ""):
+            raise ValueError(f"Invalid underlying for the options store: {underlying!r}")
+        path = self.root / underlying
+        _WORKER_VIEW_CACHE.pop((self.db_path, underlying), None)
+        for key in [k for k, v in _WORKER_OCC_UNDERLYING.items() if k[0] == self.db_path and v is None]:
+            del _WORKER_OCC_UNDERLYING[key]  # a miss may now be stored
+        view = _UnderlyingView(path)
+        meta = dict(view.meta)
+
+        rows = chain[1] if chain is not None else bars
+        idx = self._register_contracts(path, view, rows)
+        if chain is not None:
+            as_of = chain[0][:10]
+            new = {"as_of": np.full(len(rows), _day(as_of), dtype=np.int32),
+                   "contract": idx.astype(np.int32)}
+            new.update({c: _floats(rows, c) for c in _CHAIN_VALUE_COLS})
+            month = as_of[:7]
+            self._merge_partition(path / "chain" / f"ym={month}", new, ("as_of", "contract"))
+            meta["chain_as_of"] = sorted(set(meta["chain_as_of"]) | {as_of})
+            meta["chain_months"] = sorted(set(meta["chain_months"]) | {month})
+        else:
+            days = _days(r["date"] for r in rows)
+            months = _months(days)
+            values = {c: _floats(rows, c) for c in _BAR_VALUE_COLS}
+            for month in np.unique(months):
+                m = months == month
+                new = {"contract": idx[m].astype(np.int32), "date": days[m]}
+                new.update({c: v[m] for c, v in values.items()})
+                self._merge_partition(path / "bars" / f"ym={month}", new, ("contract", "date"))
+            meta["bar_months"] = sorted(set(meta["bar_months"]) | set(np.unique(months).tolist()))
+        meta["version"] = STORE_VERSION
+        tmp = path / f".meta.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, path / "meta.json")
+        _WORKER_VIEW_CACHE.pop((self.db_path, underlying), None)
+
+    @staticmethod
+    def _register_contracts(path: Path, view: _UnderlyingView,
+                            rows: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Contract numbers for ``rows``, appending contracts not seen before."""
+        occs = [r["occ_symbol"] for r in rows]
+        idx = view.contract_index(occs) if len(view.contracts["occ_symbol"]) else \
+            np.full(len(occs), -1, dtype=np.int64)
+        missing = np.flatnonzero(idx < 0)
+        if len(missing):
+            n0 = len(view.contracts["occ_symbol"])
+            first: Dict[str, int] = {}  # new occ -> row that introduces it
+            for i in missing:
+                first.setdefault(occs[i], int(i))
+            number = {occ: n0 + k for k, occ in enumerate(first)}
+            idx[missing] = [number[occs[i]] for i in missing]
+            added = [rows[i] for i in first.values()]
+            cols = {
+                "occ_symbol": np.array([r["occ_symbol"] for r in added], dtype="S"),
+                "option_type": np.array([r["option_type"] for r in added], dtype="S"),
+                "strike": np.array([r["strike"] for r in added], dtype=np.float64),
+                "expiry": _days(r["expiry"] for r in added),
+            }
+            if n0:
+                width = max(view.contracts["occ_symbol"].dtype.itemsize, cols["occ_symbol"].dtype.itemsize)
+                tw = max(view.contracts["option_type"].dtype.itemsize, cols["option_type"].dtype.itemsize)
+                cols = {
+                    "occ_symbol": np.concatenate([view.contracts["occ_symbol"], cols["occ_symbol"]]).astype(f"S{width}"),
+                    "option_type": np.concatenate([view.contracts["option_type"], cols["option_type"]]).astype(f"S{tw}"),
+                    "strike": np.concatenate([view.contracts["strike"], cols["strike"]]),
+                    "expiry": np.concatenate([view.contracts["expiry"], cols["expiry"]]),
+                }
+            _write_columns(path / "contracts", cols)
+        return idx
+
+    @staticmethod
+    def _merge_partition(path: Path, new: Dict[str, np.ndarray], key: Tuple[str, str]) -> None:
+        """Merge ``new`` rows into a partition (new rows replace equal keys), sorted by key."""
+        if path.exists():
+            old = _read_columns(path)
+            merged = {c: np.concatenate([np.asarray(old[c]), new[c]]) for c in new}
+            del old  # release the mappings before the partition is swapped
+        else:
+            merged = new
+        a, b = merged[key[0]].astype(np.int64), merged[key[1]].astype(np.int64)
+        composite = (a << 32) | b
+        # Last occurrence of each key wins (INSERT OR REPLACE)
+        rev = composite[::-1]
+        _, first_rev = np.unique(rev, return_index=True)
+        keep = len(composite) - 1 - first_rev
+        keep = keep[np.argsort(composite[keep], kind="stable")]
+        merged = {c: v[keep] for c, v in merged.items()}
+        if "date" in merged:  # bar partition: searchable contract/day key
+            merged["key"] = (merged["contract"].astype(np.int64) << _DAY_BITS) | merged["date"]
+        _write_columns(path, merged)
+
+
+# ---------------------------------------------------------------------------- migration
+
+def convert_sqlite_cache(db_path: str, store_root: Union[str, Path],
+                         underlyings: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Copy an OptionsHistoryCache SQLite file into a columnar store, one underlying at a
+    time (bars first, chain last -- same completion marker the fetcher uses).
+
+    Returns per-run counts ``{underlyings, chain_rows, bar_rows}``. Every conversion records
+    the store (BUILT_MARKER); it is built (complete) once it holds every underlying of
+    ``db_path``, so partial conversions only serve the underlyings they copied.
+    """
+    store = OptionsColumnarStore(store_root)
+    cx = sqlite3.connect(db_path)
+    cx.row_factory = sqlite3.Row
+    stats = {"underlyings": 0, "chain_rows": 0, "bar_rows": 0}
+    full = underlyings is None
+    try:
+        if full:
+            underlyings = [r[0] for r in cx.execute(
+                "SELECT DISTINCT underlying FROM option_chain ORDER BY underlying")]
+        for u in underlyings:
+            bars = [dict(r) for r in cx.execute(
+                "SELECT * FROM option_bar WHERE underlying=? ORDER BY occ_symbol, date", (u,))]
+            if bars:
+                store.write_bar_rows(bars)
+            by_asof: Dict[str, List[Dict[str, Any]]] = {}
+            for r in cx.execute("SELECT * FROM option_chain WHERE underlying=? ORDER BY as_of", (u,)):
+                by_asof.setdefault(r["as_of"], []).append(dict(r))
+            for as_of, rows in by_asof.items():
+                store.write_chain_rows(u, as_of, rows)
+                stats["chain_rows"] += len(rows)
+            stats["bar_rows"] += len(bars)
+            stats["underlyings"] += 1
+    finally:
+        cx.close()
+    store.mark_built({"chain_rows": stats["chain_rows"], "bar_rows": stats["bar_rows"]},
+                     source_db=db_path)
+    return stats
@@ -840,6 +840,11 @@ class AsOfClampedOHLCVProvider:
             symbol, start_date=start_date, end_date=end_date, interval=interval, **kwargs
         )
 
+    def max_end_date(self):
+        """Latest bar time a caller may see (the as_of clock). The shared indicator series
+        cache clamps to this, so a series cached further ahead is never served past it."""
+        return self._ps.current()
+
     def __getattr__(self, name):  # delegate every other attribute/method to the inner provider
         return getattr(self._inner, name)
 
@@ -183,6 +183,9 @@ def _build_refine_drawdown_fn(account: Any, config: Dict[str, Any]) -> Optional[
         from app.services.backtest.options_provider import _chain_history
 
         as_of = dt.strftime("%Y-%m-%d") if hasattr(dt, "strftime") else str(dt)
+        if hasattr(cache, "chain_row"):  # columnar store: one searchsorted, no history load
+            row = cache.chain_row(underlying, contract, as_of)
+            return row.get("delta") if row else None
         hist = _chain_history(cache.db_path, underlying)
         snapshot = hist.latest_as_of(as_of)
         if snapshot is None:
@@ -24,6 +24,7 @@ from app.models.database import SessionLocal
 from app.models import Dataset, TrainedModel, Strategy as StrategyModel, Backtest as BacktestModel
 from app.services.strategy_executor import evaluate_condition_tree, ConfirmationTracker, reset_evaluation_stats, get_evaluation_stats, next_evaluation_bar
 from app.services.data_preparation import DataPreparationService
+from app.services.dataset_store import read_dataset
 from app.services.tsai_training import TSAITrainingService
 from app.services.job_handler import ffill_sparse_indicators
 from app.services.perf import perf_timer
@@ -1102,7 +1103,7 @@ def handle_backtest(task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         # Load prediction dataset
         try:
             with perf_timer(f"backtest.load_pred_csv ({pred_dataset.file_path})"):
-                pred_df = pd.read_csv(pred_dataset.file_path)
+                pred_df = read_dataset(pred_dataset.file_path)
                 if 'Date' in pred_df.columns:
                     pred_df['Date'] = pd.to_datetime(pred_df['Date'])
         except Exception as e:
@@ -1114,7 +1115,7 @@ def handle_backtest(task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         # Load execution dataset
         try:
             with perf_timer(f"backtest.load_exec_csv ({exec_dataset.file_path})"):
-                exec_df = pd.read_csv(exec_dataset.file_path)
+                exec_df = read_dataset(exec_dataset.file_path)
                 if 'Date' in exec_df.columns:
                     exec_df['Date'] = pd.to_datetime(exec_df['Date'])
         except Exception as e:
@@ -0,0 +1,381 @@
+"""
+Server-side downsampling for chart series.
+
+A line chart ``width`` pixels wide shows, per pixel column, little more than the lowest
+and the highest value drawn there -- so a multi-year 5m series (hundreds of thousands of
+bars) needs only a few points per pixel to draw the same picture. This module picks those
+points without scanning the series on every request.
+
+Per column, ``MinMaxPyramid`` stores for buckets of ``_MIN_BUCKET``, 2x, 4x, ... bars the
+position of the bucket's minimum and maximum. Level ``k+1`` is built from level ``k`` by
+pairing buckets, so the whole pyramid costs O(n) once and holds ~n/4 indices. A request
+for rows ``[lo, hi)`` at ``width`` pixels takes the coarsest level that still has at least
+``width`` buckets in the range (so 2-4 points per pixel) and returns its extrema, plus
+the exact extrema of the partial buckets at either edge and the range endpoints. Zooming
+in or out is a slice of precomputed arrays, and peaks and troughs are never dropped at
+any zoom.
+
+``method='lttb'`` instead returns ~``width`` points chosen by Largest-Triangle-Three-
+Buckets, run over the min/max candidates of the pyramid (MinMaxLTTB) rather than over
+every raw point.
+
+Rows are selected jointly: the indices chosen for every requested column are united, so
+all series in a response stay aligned on the same rows.
+
+Pyramids are built on first use and kept in a small in-process LRU keyed by the source
+(dataset file path + mtime/size, or backtest id + completion time).
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bars per bucket at the finest pyramid level (ranges finer than this are bucketed directly)
+_MIN_BUCKET = 8
+
+# Sources (datasets / backtests) whose pyramids are kept in memory
+_CACHE_ENTRIES = 16
+
+# MinMaxLTTB: min/max candidates per output point handed to LTTB
+_LTTB_CANDIDATE_RATIO = 4
+
+METHODS = ('minmax', 'lttb')
+
+
+def _bucket_extrema(values: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of the min and max of each ``size``-bar bucket (NaNs ignored; an
+    all-NaN bucket reports its first bar)."""
+    n = len(values)
+    nb = -(-n // size)
+    pad = nb * size - n
+    lo_v = np.where(np.isnan(values), np.inf, values)
+    hi_v = np.where(np.isnan(values), -np.inf, values)
+    if pad:
+        lo_v = np.concatenate((lo_v, np.full(pad, np.inf)))
+        hi_v = np.concatenate((hi_v, np.full(pad, -np.inf)))
+    base = np.arange(nb, dtype=np.int64) * size
+    imin = base + lo_v.reshape(nb, size).argmin(axis=1)
+    imax = base + hi_v.reshape(nb, size).argmax(axis=1)
+    return np.minimum(imin, n - 1), np.minimum(imax, n - 1)
+
+
+class MinMaxPyramid:
+    """Min/max bucket positions of one series at doubling bucket sizes."""
+
+    def __init__(self, values: Sequence[float]):
+        v = np.asarray(values, dtype=np.float64)
+        self.values = v
+        self.n = len(v)
+        self.sizes: List[int] = []
+        self.levels: List[Tuple[np.ndarray, np.ndarray]] = []
+        if self.n == 0:
+            return
+
+        lo_v = np.where(np.isnan(v), np.inf, v)
+        hi_v = np.where(np.isnan(v), -np.inf, v)
+        size = _MIN_BUCKET
+        imin, imax = _bucket_extrema(v, size)
+        while True:
+            self.sizes.append(size)
+            self.levels.append((imin, imax))
+            if len(imin) <= 1:
+                break
+            if len(imin) % 2:
+                imin, imax = np.append(imin, imin[-1]), np.append(imax, imax[-1])
+            a, b = imin[0::2], imin[1::2]
+            imin = np.where(lo_v[b] < lo_v[a], b, a)
+            a, b = imax[0::2], imax[1::2]
+            imax = np.where(hi_v[b] > hi_v[a], b, a)
+            size *= 2
+
+    def _direct(self, lo: int, hi: int, size: int) -> np.ndarray:
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        imin, imax = _bucket_extrema(self.values[lo:hi], max(1, size))
+        return np.concatenate((imin, imax)) + lo
+
+    def query(self, lo: int, hi: int, width: int) -> np.ndarray:
+        """Sorted row positions in ``[lo, hi)`` that draw the series at ``width`` pixels."""
+        lo, hi = max(0, int(lo)), min(self.n, int(hi))
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        span = hi - lo
+        if span <= 2 * width:
+            return np.arange(lo, hi, dtype=np.int64)
+
+        target = span // width                      # bars per pixel column
+        level = int(np.searchsorted(self.sizes, target, side='right')) - 1
+        if level < 0:
+            # Finer than the finest level: bucket the (short) range directly
+            picked = self._direct(lo, hi, -(-span // width))
+        else:
+            size = self.sizes[level]
+            imin, imax = self.levels[level]
+            b0, b1 = -(-lo // size), hi // size     # buckets entirely inside the range
+            picked = np.concatenate((
+                imin[b0:b1], imax[b0:b1],
+                self._direct(lo, min(hi, b0 * size), size),
+                self._direct(max(lo, b1 * size), hi, size),
+            ))
+        picked = np.concatenate((picked, [lo, hi - 1]))
+        return np.unique(picked)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, target: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets over points ``(x, y)``; returns positions into them.
+
+    Keeps the first and last point; all points when ``len(x) <= target``.
+    """
+    n = len(x)
+    if n <= target or target < 3:
+        return np.arange(n, dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    edges = (np.arange(target - 1, dtype=np.float64) * (n - 2) / (target - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    out = np.empty(target, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(target - 2):
+        s, e = edges[i], edges[i + 1]
+        ns, ne = e, (edges[i + 2] if i + 2 < len(edges) else n)
+        if ne <= ns:
+            ns, ne = n - 1, n
+        avg_x, avg_y = x[ns:ne].mean(), y[ns:ne].mean()
+        area = np.abs((x[a] - avg_x) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (avg_y - y[a]))
+        a = s + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def select_rows(pyramids: Sequence[MinMaxPyramid], lo: int, hi: int, width: int,
+                method: str = 'minmax') -> np.ndarray:
+    """Union of the rows each series needs to draw ``[lo, hi)`` at ``width`` pixels."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}' (expected one of {METHODS})")
+    width = max(1, int(width))
+    parts = []
+    for pyr in pyramids:
+        if method == 'minmax':
+            parts.append(pyr.query(lo, hi, width))
+        else:
+            cand = pyr.query(lo, hi, max(1, width * _LTTB_CANDIDATE_RATIO // 2))
+            keep = lttb_indices(cand.astype(np.float64), pyr.values[cand], width)
+            parts.append(cand[keep])
+    if not parts:
+        lo, hi = max(0, lo), max(lo, hi)
+        if hi - lo <= width:
+            return np.arange(lo, hi, dtype=np.int64)
+        return np.unique(np.linspace(lo, hi - 1, width).astype(np.int64))
+    return np.unique(np.concatenate(parts))
+
+
+# ---------------------------------------------------------------------------- sources
+
+class _SeriesSet:
+    """Per-source state: the time axis plus one pyramid per charted column."""
+
+    def __init__(self, n: int, dates: Optional[np.ndarray], order: Optional[np.ndarray]):
+        self.n = n
+        self.dates = dates          # int64 ns (UTC), in chart (chronological) order
+        self.order = order          # chart position -> source row, None when already sorted
+        self.tz = None
+        self.pyramids: Dict[str, Optional[MinMaxPyramid]] = {}   # None: not a numeric column
+        self.lock = threading.Lock()
+
+
+class ChartPyramidCache:
+    """LRU of per-source pyramids; each column's pyramid is built the first time it is charted."""
+
+    def __init__(self, max_entries: int = _CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, _SeriesSet]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _get(self, key, make: Callable[[], _SeriesSet]) -> _SeriesSet:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = make()
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _pyramid(self, entry: _SeriesSet, column: str,
+                 load: Callable[[str], Optional[np.ndarray]]) -> Optional[MinMaxPyramid]:
+        with entry.lock:
+            if column not in entry.pyramids:
+                values = load(column)
+                if values is not None and entry.order is not None:
+                    values = values[entry.order]
+                entry.pyramids[column] = None if values is None else MinMaxPyramid(values)
+                self.builds += values is not None
+            return entry.pyramids[column]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = ChartPyramidCache()
+
+
+def get_chart_cache() -> ChartPyramidCache:
+    return _cache
+
+
+def _dates_ns(dates: pd.Series) -> Tuple[np.ndarray, Any]:
+    """UTC epoch nanoseconds (NaT -> int64 min) and the original timezone."""
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        # CSV strings: offsets may change with DST, so parse to UTC
+        dates = pd.to_datetime(dates, errors='coerce', utc=True)
+    idx = pd.DatetimeIndex(dates).as_unit('ns')
+    return idx.asi8.copy(), idx.tz
+
+
+def _bound_ns(value: Optional[str], tz) -> Optional[int]:
+    if value is None or value == '':
+        return None
+    ts = pd.Timestamp(value)
+    if tz is not None:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts
+        ts = ts.tz_convert('UTC')
+    elif ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value)
+
+
+def _row_range(entry: _SeriesSet, start: Optional[str], end: Optional[str]) -> Tuple[int, int]:
+    lo, hi = 0, entry.n
+    if entry.dates is None or (not start and not end):
+        return lo, hi
+    s, e = _bound_ns(start, entry.tz), _bound_ns(end, entry.tz)
+    if s is not None:
+        lo = int(np.searchsorted(entry.dates, s, side='left'))
+    if e is not None:
+        hi = int(np.searchsorted(entry.dates, e, side='right'))
+    return lo, max(lo, hi)
+
+
+def _numeric(values) -> bool:
+    return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+
+def downsample_dataset(path, columns: Optional[Sequence[str]], width: int,
+                       start: Optional[str] = None, end: Optional[str] = None,
+                       method: str = 'minmax',
+                       cache: Optional[ChartPyramidCache] = None) -> Dict[str, Any]:
+    """
+    Rows of a dataset file needed to chart ``columns`` at ``width`` pixels.
+
+    Args:
+        path: Dataset file (Parquet or CSV, see dataset_store)
+        columns: Columns to return (default: all); numeric ones drive the row choice
+        width: Chart width in pixels
+        start, end: Optional zoom range on the ``Date`` column (inclusive)
+        method: ``'minmax'`` (every bucket's extremes) or ``'lttb'``
+        cache: Pyramid cache (default: the process-wide one)
+
+    Returns:
+        Dict with ``df`` (selected rows in date order), ``total_rows`` and ``range_rows``
+        (rows inside the zoom range)
+    """
+    from app.services.dataset_store import dataset_columns, dataset_num_rows, read_dataset
+
+    cache = cache or _cache
+    path = Path(path)
+    st = path.stat()
+    all_columns = dataset_columns(path)
+    columns = [c for c in (columns or all_columns) if c in all_columns]
+
+    def make() -> _SeriesSet:
+        if 'Date' not in all_columns:
+            return _SeriesSet(dataset_num_rows(path), None, None)
+        ns, tz = _dates_ns(read_dataset(path, columns=['Date'])['Date'])
+        order = None
+        if len(ns) > 1 and (np.diff(ns) < 0).any():
+            order = np.argsort(ns, kind='stable')
+            ns = ns[order]
+        entry = _SeriesSet(len(ns), ns, order)
+        entry.tz = tz
+        return entry
+
+    def load(col: str) -> Optional[np.ndarray]:
+        values = read_dataset(path, columns=[col])[col]
+        if not _numeric(values):
+            return None
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    entry = cache._get((str(path), st.st_mtime_ns, st.st_size), make)
+    pyramids = [p for p in (cache._pyramid(entry, c, load) for c in columns if c != 'Date')
+                if p is not None]
+    lo, hi = _row_range(entry, start, end)
+    chart_rows = select_rows(pyramids, lo, hi, width, method)
+    source_rows = chart_rows if entry.order is None else entry.order[chart_rows]
+
+    ascending = np.sort(source_rows)
+    df = read_dataset(path, columns=columns, rows=ascending)
+    if entry.order is not None:
+        # Back to chart (date) order
+        df = df.iloc[np.searchsorted(ascending, source_rows)].reset_index(drop=True)
+    return {'df': df, 'total_rows': entry.n, 'range_rows': hi - lo}
+
+
+def downsample_curves(key, equity: List[dict], drawdown: List[dict], width: int,
+                      start: Optional[str] = None, end: Optional[str] = None,
+                      method: str = 'minmax',
+                      cache: Optional[ChartPyramidCache] = None) -> Dict[str, Any]:
+    """
+    Backtest equity/drawdown curve points (``{"date", "equity"|"drawdown"}`` dicts, index
+    aligned) needed to chart them at ``width`` pixels, optionally zoomed to ``start``..``end``.
+
+    ``key`` identifies the curves' version (e.g. backtest id + completion time).
+    """
+    cache = cache or _cache
+    eq = equity or []
+    dd = drawdown or []
+    aligned = len(dd) == len(eq)
+
+    def make() -> _SeriesSet:
+        dates = None
+        tz = None
+        if eq:
+            ns, tz = _dates_ns(pd.Series([p.get('date') for p in eq]))
+            if not (ns == np.iinfo(np.int64).min).any() and not (np.diff(ns) < 0).any():
+                dates = ns
+        entry = _SeriesSet(len(eq), dates, None)
+        entry.tz = tz
+        return entry
+
+    entry = cache._get(('curves', key, len(eq), len(dd)), make)
+
+    def values(points, field):
+        return lambda _col: np.array(
+            [p.get(field) if isinstance(p.get(field), (int, float)) else np.nan for p in points],
+            dtype=np.float64)
+
+    pyramids = [cache._pyramid(entry, 'equity', values(eq, 'equity'))]
+    if aligned and dd:
+        pyramids.append(cache._pyramid(entry, 'drawdown', values(dd, 'drawdown')))
+    if (start or end) and entry.dates is None:
+        raise ValueError("Curve dates are not parseable timestamps; cannot zoom by date")
+    lo, hi = _row_range(entry, start, end)
+    rows = select_rows(pyramids, lo, hi, width, method).tolist()
+    return {
+        'equity': [eq[i] for i in rows],
+        'drawdown': [dd[i] for i in rows] if aligned else dd,
+        'total_points': len(eq),
+        'range_points': hi - lo,
+    }
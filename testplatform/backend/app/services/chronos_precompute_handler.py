@@ -0,0 +1,158 @@
+"""
+Chronos Forecast Precompute Handler
+
+Background task handler that forecasts a whole symbol universe with a Chronos
+model ahead of time and stores the results in the forecast cache
+(``chronos_service.ForecastCache``), so the forecasts API
+(``chronos_service.cached_forecasts``) serves the day's forecasts instead of
+paying model inference per symbol.
+
+OHLCV is loaded through the cached provider in a thread pool; inference runs
+as a few stacked ``forecast_batch`` calls.
+"""
+
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from app.services.task_queue import get_task_queue
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_universe_symbols(payload: Dict[str, Any], as_of: datetime) -> List[str]:
+    """Symbols to forecast for a precompute payload.
+
+    ``symbols`` (list or comma string) wins; otherwise ``universe`` in the
+    backtest shape: ``{"mode": "static", "symbols": [...]}`` or
+    ``{"mode": "screener", "screener_store"?, "screener_settings"}``, where the
+    screener universe is the point-in-time screened set as of ``as_of``.
+    """
+    symbols = payload.get('symbols')
+    universe = payload.get('universe') or {}
+    if symbols is None and universe.get('mode') == 'screener':
+        from ba2_providers.screener.metric_store import load_store, screen_universe_as_of
+        from app.services.backtest.daily_backtest_handler import _resolve_screener_store
+
+        store_df = load_store(_resolve_screener_store(universe))
+        symbols = screen_universe_as_of(store_df, as_of.strftime('%Y-%m-%d'),
+                                        universe.get('screener_settings') or {})
+    elif symbols is None:
+        symbols = universe.get('symbols') or []
+    if isinstance(symbols, str):
+        symbols = symbols.split(',')
+    return sorted({str(s).strip().upper() for s in symbols if str(s).strip()})
+
+
+def _default_lookback_days(interval: str, context_length: int) -> int:
+    """Calendar days that cover ``context_length`` bars (daily: ~252 bars/365 days)."""
+    if interval in ('1d', '1D', 'day'):
+        return int(math.ceil(context_length * 365 / 252)) + 10
+    return 60
+
+
+def handle_chronos_precompute(task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Background task handler that fills the forecast cache for a universe.
+
+    Args:
+        task_id: Task ID for progress tracking
+        payload: Dict with keys:
+            - symbols: list[str] or ``universe`` dict (see resolve_universe_symbols) (required)
+            - model_name: str (default 'chronos-2')
+            - prediction_length: int (default 1)
+            - context_length: int bars (default chronos_service.DEFAULT_CONTEXT_LENGTH)
+            - interval: str (default '1d')
+            - provider: str OHLCV provider (default 'fmp')
+            - as_of: ISO datetime the forecasts are made at (default now)
+            - lookback_days: calendar days of OHLCV to load (default covers the context)
+            - batch_size: series per inference call (default 128)
+            - workers: OHLCV loader threads (default 8)
+
+    Returns:
+        Summary dict with forecast/cached/skipped/failed counts and timings.
+    """
+    from app.services import chronos_service as cs
+
+    model_name = payload.get('model_name', 'chronos-2')
+    if model_name not in cs.CHRONOS_MODELS:
+        return {'status': 'failed', 'error': f"Unknown Chronos model: {model_name}"}
+    if payload.get('symbols') is None and not payload.get('universe'):
+        return {'status': 'failed', 'error': 'symbols or universe is required'}
+
+    try:
+        task_queue = get_task_queue()
+        prediction_length = int(payload.get('prediction_length', 1))
+        context_length = min(int(payload.get('context_length') or cs.DEFAULT_CONTEXT_LENGTH),
+                             cs.CHRONOS_MODELS[model_name]['max_context_length'])
+        interval = payload.get('interval', '1d')
+        as_of = payload.get('as_of')
+        as_of = datetime.fromisoformat(str(as_of)) if as_of else datetime.now(timezone.utc)
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=timezone.utc)
+        lookback_days = int(payload.get('lookback_days')
+                            or _default_lookback_days(interval, context_length))
+
+        symbols = resolve_universe_symbols(payload, as_of)
+        if not symbols:
+            return {'status': 'failed', 'error': 'universe resolved to no symbols'}
+        task_queue.update_progress(task_id, 0, f"Loading OHLCV for {len(symbols)} symbols...")
+
+        from app.api.datasets import get_ohlcv_provider
+        provider = get_ohlcv_provider(payload.get('provider', 'fmp'))
+        start = as_of - timedelta(days=lookback_days)
+
+        t0 = time.perf_counter()
+        series: Dict[str, Any] = {}
+        failed: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=max(1, int(payload.get('workers', 8)))) as ex:
+            futures = {
+                ex.submit(provider.get_ohlcv_data, sym, start_date=start, end_date=as_of,
+                          interval=interval): sym
+                for sym in symbols
+            }
+            for done, fut in enumerate(as_completed(futures), 1):
+                sym = futures[fut]
+                try:
+                    series[sym] = fut.result()
+                except Exception as e:  # noqa: BLE001 — one bad symbol must not abort
+                    failed[sym] = str(e)
+                if done % 25 == 0 or done == len(futures):
+                    task_queue.update_progress(task_id, 60 * done / len(futures),
+                                               f"Loaded {done}/{len(futures)} symbols")
+        load_seconds = time.perf_counter() - t0
+
+        task_queue.update_progress(task_id, 60, f"Forecasting {len(series)} series ({model_name})...")
+        t1 = time.perf_counter()
+        results = cs.forecast_batch(
+            series,
+            prediction_length=prediction_length,
+            model_name=model_name,
+            context_length=context_length,
+            batch_size=int(payload.get('batch_size', 128)),
+            cache=cs.get_forecast_cache(),
+        )
+        forecast_seconds = time.perf_counter() - t1
+
+        cached = sum(1 for r in results.values() if r['cached'])
+        summary = {
+            'symbols': len(symbols),
+            'forecast': len(results) - cached,
+            'cached': cached,
+            'skipped': sorted(set(series) - set(results)),
+            'failed': failed,
+            'model_name': model_name,
+            'prediction_length': prediction_length,
+            'context_length': context_length,
+            'load_seconds': round(load_seconds, 2),
+            'forecast_seconds': round(forecast_seconds, 2),
+        }
+        task_queue.update_progress(task_id, 100, f"Forecast {len(results)} symbols ({cached} cached)")
+        logger.info(f"chronos precompute task {task_id}: {summary}")
+        return {'status': 'completed', 'summary': summary}
+    except Exception as e:  # noqa: BLE001
+        logger.error(f"chronos precompute task {task_id} failed: {e}", exc_info=True)
+        return {'status': 'failed', 'error': str(e)}
@@ -8,10 +8,20 @@ inference with signal conversion for backtesting integration.
 Chronos-2 is a regression model that forecasts future values. This service
 converts those forecasts into probability signals compatible with the
 existing MLStrategy condition tree (model:prediction, model:probability).
+
+For a universe of symbols, ``forecast_batch`` left-pads each series' context
+into one stacked array and forecasts them together (one CPU forward pass per
+batch instead of one per symbol), reusing forecasts from ``ForecastCache``
+keyed by (symbol, context end, horizon, model). The ``chronos_precompute``
+task fills that cache for a configured universe ahead of the trading day, and
+``cached_forecasts`` (GET /api/models/foundation/forecasts) reads it back.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -288,6 +298,320 @@ def run_chronos_inference(
     return predictions
 
 
+# ============================================================================
+# Batched Multi-Series Forecasting
+# ============================================================================
+
+# Default context window for universe forecasts (bars). Long enough for the
+# models to see a year of daily bars, short enough that a few hundred series
+# stack into a small CPU batch.
+DEFAULT_CONTEXT_LENGTH = 512
+
+
+def stack_contexts(contexts: Sequence[np.ndarray], width: Optional[int] = None) -> np.ndarray:
+    """Left-pad context windows with NaN into one (batch, width) float32 array.
+
+    Each row keeps the most recent ``width`` values of its context (default: the
+    longest context). Chronos treats NaN as missing, so left padding lets series
+    of different lengths share one forward pass - the same padding the pipelines
+    apply internally to a list of tensors, done once here in numpy.
+    """
+    if not contexts:
+        return np.empty((0, width or 0), dtype=np.float32)
+    if width is None:
+        width = max(len(c) for c in contexts)
+    out = np.full((len(contexts), width), np.nan, dtype=np.float32)
+    for i, ctx in enumerate(contexts):
+        tail = np.asarray(ctx, dtype=np.float32)[-width:]
+        if len(tail):
+            out[i, width - len(tail):] = tail
+    return out
+
+
+def _forecast_array(forecast) -> np.ndarray:
+    """Pipeline output as a (batch, num_quantiles, prediction_length) array.
+
+    Bolt pipelines return one tensor; Chronos-2 returns a list with one
+    (n_variates, num_quantiles, prediction_length) tensor per series.
+    """
+    if isinstance(forecast, (list, tuple)):
+        return np.stack([np.asarray(f, dtype=np.float32).reshape(f.shape[-2:]) for f in forecast])
+    return np.asarray(forecast.numpy() if hasattr(forecast, 'numpy') else forecast, dtype=np.float32)
+
+
+def predict_stacked(
+    pipeline,
+    stacked: np.ndarray,
+    prediction_length: int,
+    model_name: str = 'chronos-2',
+) -> np.ndarray:
+    """Run one inference call over a stacked (batch, width) context array.
+
+    Returns:
+        np.ndarray of shape (batch, num_quantiles, prediction_length)
+    """
+    import torch
+
+    inputs = torch.from_numpy(np.ascontiguousarray(stacked, dtype=np.float32))
+    if CHRONOS_MODELS[model_name]['supports_covariates']:
+        inputs = inputs.unsqueeze(1)  # Chronos-2 takes (batch, n_variates, length)
+    with torch.no_grad():
+        forecast = pipeline.predict(inputs, prediction_length=prediction_length)
+    return _forecast_array(forecast)
+
+
+def forecast_cache_tag(model_name: str, target_column: str, context_length: int) -> str:
+    """Cache namespace for forecasts made with these settings."""
+    return f"{model_name}.{target_column}.c{int(context_length)}"
+
+
+class ForecastCache:
+    """Forecasts keyed by (symbol, context end, horizon, model).
+
+    Kept in memory and persisted as one small ``.npy`` file per forecast under
+    ``<tag>/h<horizon>/<SYMBOL>/<context end ns>.npy`` in ``FORECASTS_CACHE_DIR``,
+    so the daily precompute job and the API/backtests of other processes share
+    the same forecasts. A forecast is never rewritten once stored, so writers in
+    several processes only ever add files (atomic tmp+replace) and never drop
+    each other's entries; a lookup that misses in memory rescans the symbol's
+    directory for forecasts other processes have added since. Thread-safe.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        if root is None:
+            from app.paths import FORECASTS_CACHE_DIR
+            root = FORECASTS_CACHE_DIR
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int, str], Dict[int, np.ndarray]] = {}
+
+    def _dir(self, tag: str, horizon: int, symbol: str) -> Path:
+        return self.root / tag / f"h{int(horizon)}" / symbol
+
+    def _series(self, tag: str, horizon: int, symbol: str, refresh: bool = False) -> Dict[int, np.ndarray]:
+        """The in-memory entries for one symbol (keyed by context end in ns), loading
+        any files not seen yet on first use or when ``refresh`` is set (lock held)."""
+        key = (tag, int(horizon), symbol)
+        entries = self._entries.get(key)
+        if entries is None:
+            entries = self._entries[key] = {}
+        elif not refresh:
+            return entries
+        folder = self._dir(tag, horizon, symbol)
+        try:
+            names = os.listdir(folder)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext != '.npy' or not stem.lstrip('-').isdigit() or int(stem) in entries:
+                continue
+            try:
+                entries[int(stem)] = np.load(folder / name)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable forecast cache {folder / name}: {e}")
+        return entries
+
+    def get(self, symbol: str, context_end, horizon: int, tag: str) -> Optional[np.ndarray]:
+        """Cached (num_quantiles, horizon) quantile forecast, or None."""
+        end = pd.Timestamp(context_end).value
+        with self._lock:
+            hit = self._series(tag, horizon, symbol).get(end)
+            if hit is None:
+                hit = self._series(tag, horizon, symbol, refresh=True).get(end)
+            return hit
+
+    def latest(self, symbol: str, horizon: int, tag: str,
+               as_of=None) -> Optional[Tuple[pd.Timestamp, np.ndarray]]:
+        """The most recent cached (context_end, quantiles) at or before ``as_of``, or None."""
+        limit = pd.Timestamp(as_of).value if as_of is not None else None
+        with self._lock:
+            entries = self._series(tag, horizon, symbol, refresh=True)
+            ends = [e for e in entries if limit is None or e <= limit]
+            if not ends:
+                return None
+            end = max(ends)
+            return pd.Timestamp(end), entries[end]
+
+    def put_many(self, tag: str, horizon: int, forecasts: Dict[str, Tuple[Any, np.ndarray]]) -> None:
+        """Store ``{symbol: (context_end, quantiles)}``, one new file per forecast."""
+        with self._lock:
+            for symbol, (context_end, quantiles) in forecasts.items():
+                end = pd.Timestamp(context_end).value
+                quantiles = np.asarray(quantiles, dtype=np.float32)
+                self._series(tag, horizon, symbol)[end] = quantiles
+                self._write(self._dir(tag, horizon, symbol) / f"{end}.npy", quantiles)
+
+    @staticmethod
+    def _write(path: Path, quantiles: np.ndarray) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, 'wb') as fh:
+                np.save(fh, quantiles)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def clear(self) -> None:
+        """Drop the in-memory layer (files are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_forecast_cache: Optional[ForecastCache] = None
+
+
+def get_forecast_cache() -> ForecastCache:
+    """The process-wide forecast cache under ``FORECASTS_CACHE_DIR``."""
+    global _forecast_cache
+    if _forecast_cache is None:
+        _forecast_cache = ForecastCache()
+    return _forecast_cache
+
+
+def forecast_batch(
+    series: Dict[str, pd.DataFrame],
+    prediction_length: int = 1,
+    target_column: str = 'Close',
+    model_name: str = 'chronos-2',
+    context_length: Optional[int] = None,
+    min_context_length: int = 64,
+    batch_size: int = 128,
+    cache: Optional[ForecastCache] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Forecast many series from their last bar in a few stacked inference calls.
+
+    Each series' most recent ``context_length`` values (default
+    ``DEFAULT_CONTEXT_LENGTH``, capped at the model's max context) are left-padded
+    into (batch_size, width) arrays, so a universe of hundreds of symbols costs a
+    handful of forward passes instead of one per symbol. Forecasts found in
+    ``cache`` for the same (symbol, context end, horizon, model) are not
+    recomputed; new ones are written back.
+
+    Args:
+        series: symbol -> DataFrame with Date column and target_column
+        prediction_length: How many steps ahead to forecast
+        target_column: Column to forecast (default 'Close')
+        model_name: Chronos model variant to use
+        context_length: Bars of history fed to the model per series
+        min_context_length: Series with fewer valid values are skipped
+        batch_size: Series per inference call
+        cache: Forecast cache to read and fill (None = no caching)
+
+    Returns:
+        Dict mapping symbol -> {'context_end', 'current_price', 'quantiles'
+        (num_quantiles, prediction_length), 'median' (prediction_length,),
+        'probabilities' [p_down, p_up], 'cached'}. Skipped symbols are absent.
+    """
+    if model_name not in CHRONOS_MODELS:
+        raise ValueError(
+            f"Unknown Chronos model: {model_name}. "
+            f"Available: {list(CHRONOS_MODELS.keys())}"
+        )
+    max_context = CHRONOS_MODELS[model_name]['max_context_length']
+    context_length = min(int(context_length or DEFAULT_CONTEXT_LENGTH), max_context)
+    tag = forecast_cache_tag(model_name, target_column, context_length)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = []  # (symbol, context_end, current_price, context)
+    for symbol, df in series.items():
+        if df is None or df.empty or target_column not in df.columns or 'Date' not in df.columns:
+            continue
+        tail = df.iloc[-context_length:]
+        values = tail[target_column].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        if len(valid) < min_context_length:
+            continue
+        values = values[:valid[-1] + 1]  # context ends at the last valid bar
+        context_end = pd.Timestamp(tail['Date'].iloc[valid[-1]])
+        current = float(values[-1])
+        hit = cache.get(symbol, context_end, prediction_length, tag) if cache is not None else None
+        if hit is not None:
+            results[symbol] = _forecast_entry(context_end, current, hit, cached=True)
+        else:
+            pending.append((symbol, context_end, current, values))
+
+    if pending:
+        pipeline = get_pipeline(model_name)
+        # Similar lengths share a batch, so little of each stacked array is padding
+        pending.sort(key=lambda p: len(p[3]))
+        logger.info(
+            f"Chronos batch forecast: {len(pending)} series ({len(results)} cached), "
+            f"context<={context_length}, prediction_length={prediction_length}, "
+            f"{-(-len(pending) // batch_size)} inference call(s)"
+        )
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            quantiles = predict_stacked(
+                pipeline, stack_contexts([p[3] for p in chunk]), prediction_length, model_name,
+            )
+            fresh = {}
+            for (symbol, context_end, current, _), q in zip(chunk, quantiles):
+                results[symbol] = _forecast_entry(context_end, current, q, cached=False)
+                fresh[symbol] = (context_end, q)
+            if cache is not None:
+                cache.put_many(tag, prediction_length, fresh)
+    return results
+
+
+def cached_forecasts(
+    symbols: Sequence[str],
+    prediction_length: int = 1,
+    target_column: str = 'Close',
+    model_name: str = 'chronos-2',
+    context_length: Optional[int] = None,
+    as_of=None,
+    cache: Optional[ForecastCache] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Latest precomputed forecast per symbol, without running the model.
+
+    Reads what ``forecast_batch`` (e.g. the ``chronos_precompute`` task) stored
+    for the same settings: for each symbol, the forecast with the most recent
+    context end at or before ``as_of`` (default: the newest one).
+
+    Returns:
+        Dict mapping symbol -> {'context_end', 'quantiles' (num_quantiles,
+        prediction_length), 'median' (prediction_length,)}. Symbols with no
+        cached forecast are absent.
+    """
+    if model_name not in CHRONOS_MODELS:
+        raise ValueError(
+            f"Unknown Chronos model: {model_name}. "
+            f"Available: {list(CHRONOS_MODELS.keys())}"
+        )
+    max_context = CHRONOS_MODELS[model_name]['max_context_length']
+    context_length = min(int(context_length or DEFAULT_CONTEXT_LENGTH), max_context)
+    tag = forecast_cache_tag(model_name, target_column, context_length)
+    cache = cache if cache is not None else get_forecast_cache()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for symbol in symbols:
+        hit = cache.latest(symbol, prediction_length, tag, as_of)
+        if hit is not None:
+            context_end, quantiles = hit
+            results[symbol] = {
+                'context_end': context_end,
+                'quantiles': quantiles,
+                'median': quantiles[quantiles.shape[0] // 2],
+            }
+    return results
+
+
+def _forecast_entry(context_end: pd.Timestamp, current: float, quantiles: np.ndarray,
+                    cached: bool) -> Dict[str, Any]:
+    median = quantiles[quantiles.shape[0] // 2]
+    return {
+        'context_end': context_end,
+        'current_price': current,
+        'quantiles': quantiles,
+        'median': median,
+        'probabilities': forecast_to_probabilities(float(median[0]), current),
+        'cached': cached,
+    }
+
+
 # ============================================================================
 # Model Info / Status
 # ============================================================================
@@ -1152,7 +1152,9 @@ class PredictionTargetService:
         self,
         df: pd.DataFrame,
         targets_config: List[Dict[str, Any]],
-        dataset_timeframe: Optional[str] = None
+        dataset_timeframe: Optional[str] = None,
+        mtf_store: Optional[Any] = None,
+        store_key: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Calculate all target types and return with statistics.
@@ -1166,6 +1168,9 @@ class PredictionTargetService:
             targets_config: List of target configurations, each may have:
                 - timeframe: Optional[str] - Calculate target on this timeframe
             dataset_timeframe: Base timeframe of the dataset (e.g., '15m', '1h')
+            mtf_store: Optional MultiTimeframeStore; reuses its resampled bars and as-of
+                join instead of resampling/merging per target
+            store_key: Store grouping key (e.g. "dataset_12")
 
         Returns:
             List of calculated targets with data and stats
@@ -1183,13 +1188,18 @@ class PredictionTargetService:
             target_timeframe = config.get('timeframe')
             use_multi_timeframe = False
             working_df = df
+            mtf_view = None
 
             # Check if we need to calculate on a different timeframe
             if target_timeframe and dataset_timeframe and target_timeframe != dataset_timeframe:
                 try:
-                    working_df = resample_ohlcv_to_timeframe(
-                        df, target_timeframe, source_timeframe=dataset_timeframe
-                    )
+                    if mtf_store is not None:
+                        mtf_view = mtf_store.view(df, target_timeframe, dataset_timeframe, key=store_key)
+                        working_df = mtf_view.bars.copy()
+                    else:
+                        working_df = resample_ohlcv_to_timeframe(
+                            df, target_timeframe, source_timeframe=dataset_timeframe
+                        )
                     use_multi_timeframe = True
                     logger.info(f"Resampled to {target_timeframe} for {target_type} target: {len(df)} -> {len(working_df)} bars")
                 except ValueError as e:
@@ -1305,13 +1315,17 @@ class PredictionTargetService:
 
                 # If multi-timeframe, align result back to original timeframe
                 if use_multi_timeframe:
-                    # Build dataframe with the result for alignment
-                    higher_tf_data = working_df[['Date']].copy()
-                    higher_tf_data['_target'] = series.values
+                    if mtf_view is not None:
+                        # Precomputed as-of join from the store
+                        series = pd.Series(mtf_view.align(series.values), index=df.index)
+                    else:
+                        # Build dataframe with the result for alignment
+                        higher_tf_data = working_df[['Date']].copy()
+                        higher_tf_data['_target'] = series.values
 
-                    # Align back to original timeframe
-                    aligned = align_higher_timeframe_to_lower(df, higher_tf_data, ['_target'])
-                    series = pd.Series(aligned['_target'].values, index=df.index)
+                        # Align back to original timeframe
+                        aligned = align_higher_timeframe_to_lower(df, higher_tf_data, ['_target'])
+                        series = pd.Series(aligned['_target'].values, index=df.index)
 
                     # Add timeframe suffix to column name
                     col_name = f"{col_name}_{target_timeframe}"
@@ -3,8 +3,8 @@
 These mirror the headless ``ba2-test`` build commands (ba2test_launcher) but run as background
 tasks on the task queue so the React UI can drive them without blocking the request:
 
-  * ``build_screener_metrics`` — wraps ``ba2_providers.screener.metric_store.build_store``
-    (CLI ``_cmd_build_screener_metrics``).
+  * ``build_screener_metrics`` — wraps ``ba2_providers.screener.metric_store``'s partitioned
+    build (CLI ``_cmd_build_screener_metrics``).
   * ``build_options``         — wraps ``app.services.backtest.fetch_options.build_cache``
     (CLI ``_cmd_fetch_options``).
   * ``prewarm``               — wraps the per-symbol FMP-history disk-cache pre-warm
@@ -86,7 +86,14 @@ def _prewarm_fred(max_age_hours: float = 24.0) -> Dict[str, Any]:
         except Exception as e:  # noqa: BLE001 — one series must not abort the prewarm
             errors += 1
             logger.warning(f"prewarm FRED {sid} failed: {e}")
-    return {"refreshed": refreshed, "fresh": skipped, "errors": errors}
+    out: Dict[str, Any] = {"refreshed": refreshed, "fresh": skipped, "errors": errors}
+    try:
+        from ba2_providers.macro import macro_panel
+        out["panel"] = macro_panel.refresh_panel()["mode"]
+    except Exception as e:  # noqa: BLE001 — the series themselves are prewarmed either way
+        logger.warning(f"prewarm FRED macro panel failed: {e}")
+        out["panel"] = "error"
+    return out
 
 
 def handle_build_screener_metrics(task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -94,7 +101,9 @@ def handle_build_screener_metrics(task_id: str, payload: Dict[str, Any]) -> Dict
 
     Mirrors ``ba2test_launcher._cmd_build_screener_metrics``: derives a latest-filing-ish shares
     map from the FMP screener rows (marketCap / price), wires the as-of OHLCV cache accessor, and
-    calls ``metric_store.build_store``. Required payload keys: store, start, end, market_cap_min.
+    calls ``metric_store.build_store_partitioned`` (or the one-shot ``build_store`` with
+    ``partitioned: false``). Required payload keys: store, start, end, market_cap_min. Optional:
+    ``processes`` (compute pool size, default min(8, cpu count)).
     """
     # Default the store dir to the shared ba2_common screener store (trade bucket)
     # when omitted — nothing is cached inside the repo. Still overridable.
@@ -148,11 +157,7 @@ def handle_build_screener_metrics(task_id: str, payload: Dict[str, Any]) -> Dict
         def _shares(sym):
             return shares_by_sym.get(sym)
 
-        summary = ms.build_store(
-            payload["store"],
-            api_key,
-            payload["start"],
-            payload["end"],
+        kwargs = dict(
             market_cap_min=float(payload["market_cap_min"]),
             price_min=float(payload.get("price_min", 0.0)),
             volume_min=float(payload.get("volume_min", 0.0)),
@@ -161,6 +166,17 @@ def handle_build_screener_metrics(task_id: str, payload: Dict[str, Any]) -> Dict
             cadence_days=int(payload.get("cadence_days", 7)),
             drop_days=int(payload.get("drop_days", 1)),
         )
+        if payload.get("partitioned", True):
+            # Per-symbol partitions + manifest: resumes after a failed/killed task and only
+            # recomputes symbols whose bars/params changed (see build_store_partitioned).
+            summary = ms.build_store_partitioned(
+                payload["store"], api_key, payload["start"], payload["end"],
+                processes=int(payload.get("processes") or min(8, os.cpu_count() or 1)),
+                **kwargs,
+            )
+        else:
+            summary = ms.build_store(payload["store"], api_key, payload["start"], payload["end"],
+                                     **kwargs)
         logger.info(f"build-screener-metrics task {task_id}: {summary}")
         return {"status": "completed", "summary": summary}
     except Exception as e:  # noqa: BLE001 — surface as a failed task, don't crash the worker
@@ -7,7 +7,6 @@ Uses short-lived database sessions to prevent database locking.
 
 import logging
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable
 
 import pandas as pd
@@ -19,6 +18,7 @@ from app.services.fundamentals import FundamentalsService
 from app.services.macro import MacroService
 from app.services.sentiment import SentimentService
 from app.services.task_queue import get_task_queue
+from app.services.dataset_store import write_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -548,9 +548,7 @@ def handle_dataset_regeneration(task_id: str, payload: Dict[str, Any]) -> Dict[s
         update_dataset_progress(dataset_id, f"Saving dataset ({len(df)} rows, {len(df.columns)} columns)...", task_id)
 
         # Save to file
-        file_path_obj = Path(file_path)
-        file_path_obj.parent.mkdir(exist_ok=True)
-        df.to_csv(file_path_obj, index=False)
+        write_dataset(df, file_path)
         logger.info(f"[Task {task_id}] Saved dataset to {file_path} with {len(df.columns)} columns")
 
         task_queue.update_progress(task_id, 95.0, "Finalizing...")
@@ -0,0 +1,269 @@
+"""
+On-disk format for ML datasets.
+
+Datasets used to be CSV files that every consumer parsed in full -- the preview endpoint
+re-read a few hundred MB to chart 2000 sampled rows of three columns, and the stats
+endpoint recomputed per-column statistics on every page load. New datasets are written
+as Parquet instead:
+
+- typed columns (``Date`` stays a timestamp, numeric columns keep their dtype);
+- row groups of ``ROW_GROUP_ROWS`` rows with min/max statistics, so row ranges can be read
+  without decoding the rest of the file;
+- a JSON summary (row count, per-column dtype, null count and numeric stats, date range,
+  whether rows are in date order) stored in the file's key-value metadata, so stats and
+  column listings only read the footer.
+
+Files are dispatched on suffix: ``.parquet`` is read through pyarrow with column and
+row-group pruning, anything else is read with ``pd.read_csv`` as before, so existing CSV
+datasets keep working until converted (``convert_csv_dataset`` /
+``tools/convert_datasets_to_parquet.py``).
+
+The format of newly created datasets is ``BA2_DATASET_FORMAT`` (``parquet`` or ``csv``,
+default ``parquet``).
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMAT = os.environ.get("BA2_DATASET_FORMAT", "parquet").lower()
+
+# Rows per Parquet row group: small enough that a preview or head read touches only the
+# groups it needs, large enough that per-group overhead stays negligible.
+ROW_GROUP_ROWS = 50_000
+
+SUMMARY_KEY = b"ba2.dataset_summary"
+SUMMARY_VERSION = 1
+
+PathLike = Union[str, Path]
+
+
+def dataset_suffix() -> str:
+    """File suffix for newly created datasets."""
+    return ".csv" if DATASET_FORMAT == "csv" else ".parquet"
+
+
+def dataset_file_name(name: str) -> str:
+    """File name for a new dataset called ``name``."""
+    return f"{name}{dataset_suffix()}"
+
+
+def is_parquet(path: PathLike) -> bool:
+    return Path(path).suffix.lower() == ".parquet"
+
+
+# ---------------------------------------------------------------------------- summary
+
+def _typed_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse a string ``Date`` column (frames that came from a CSV) into timestamps.
+
+    Left as is when the strings do not parse to one datetime dtype (e.g. mixed UTC
+    offsets), so writing never changes the values.
+    """
+    if "Date" not in df.columns or pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        return df
+    try:
+        parsed = pd.to_datetime(df["Date"])
+    except (ValueError, TypeError):
+        return df
+    if not pd.api.types.is_datetime64_any_dtype(parsed):
+        return df
+    out = df.copy(deep=False)
+    out["Date"] = parsed
+    return out
+
+
+def compute_summary(df: pd.DataFrame) -> Dict[str, Any]:
+    """Per-column summary of a dataset frame (what the stats endpoint reports).
+
+    Numeric statistics cover ``int64``/``float64`` columns, NaNs excluded.
+    """
+    df = _typed_dates(df)
+    rows = len(df)
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col in df.columns:
+        s = df[col]
+        entry: Dict[str, Any] = {"dtype": str(s.dtype), "nulls": int(s.isna().sum())}
+        if str(s.dtype) in ("int64", "float64"):
+            vals = s.dropna()
+            if len(vals):
+                entry["stats"] = {
+                    "count": int(len(vals)),
+                    "mean": float(vals.mean()),
+                    "std": float(vals.std()) if len(vals) > 1 else None,
+                    "min": float(vals.min()),
+                    "max": float(vals.max()),
+                    "median": float(vals.median()),
+                }
+        columns[str(col)] = entry
+
+    summary: Dict[str, Any] = {"version": SUMMARY_VERSION, "rows": rows, "columns": columns,
+                               "date_range": None, "date_sorted": None}
+    if "Date" in df.columns and pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        dates = df["Date"]
+        if dates.notna().any():
+            summary["date_range"] = {"start": dates.min().isoformat(), "end": dates.max().isoformat()}
+        summary["date_sorted"] = bool(dates.is_monotonic_increasing)
+    return summary
+
+
+# ---------------------------------------------------------------------------- write
+
+def write_dataset(df: pd.DataFrame, path: PathLike) -> Path:
+    """Write a dataset frame to ``path`` (Parquet or CSV by suffix), atomically.
+
+    Parquet files get typed columns, ``ROW_GROUP_ROWS`` row groups and the summary from
+    ``compute_summary`` in their key-value metadata. The index is not stored.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        if is_parquet(path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            frame = _typed_dates(df)
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            meta = dict(table.schema.metadata or {})
+            meta[SUMMARY_KEY] = json.dumps(compute_summary(frame)).encode()
+            table = table.replace_schema_metadata(meta)
+            pq.write_table(table, tmp, row_group_size=ROW_GROUP_ROWS, compression="snappy",
+                           write_statistics=True)
+        else:
+            df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
+
+
+# ---------------------------------------------------------------------------- read
+
+def _parquet_file(path: PathLike):
+    import pyarrow.parquet as pq
+    return pq.ParquetFile(str(path))
+
+
+def dataset_columns(path: PathLike) -> List[str]:
+    """Column names, in file order, without reading any rows."""
+    if is_parquet(path):
+        return list(_parquet_file(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def dataset_num_rows(path: PathLike) -> int:
+    """Row count (footer only for Parquet; one column is parsed for CSV)."""
+    if is_parquet(path):
+        return int(_parquet_file(path).metadata.num_rows)
+    return len(pd.read_csv(path, usecols=[0]))
+
+
+def _check_columns(path: PathLike, columns: Sequence[str]) -> List[str]:
+    available = dataset_columns(path)
+    missing = [c for c in columns if c not in available]
+    if missing:
+        raise ValueError(f"Columns not in dataset {Path(path).name}: {missing}")
+    return list(columns)
+
+
+def read_dataset(
+    path: PathLike,
+    columns: Optional[Sequence[str]] = None,
+    nrows: Optional[int] = None,
+    rows: Optional[Sequence[int]] = None,
+) -> pd.DataFrame:
+    """
+    Load a dataset file, reading only what is asked for.
+
+    Args:
+        path: ``.parquet`` or CSV dataset file
+        columns: Columns to load (default: all); raises ValueError if any is missing
+        nrows: Load only the first ``nrows`` rows
+        rows: Load only these row positions (sorted ascending), returned in that order
+
+    Returns:
+        DataFrame with a fresh RangeIndex
+    """
+    if columns is not None:
+        columns = _check_columns(path, columns)
+    if not is_parquet(path):
+        usecols = list(columns) if columns is not None else None
+        if rows is not None:
+            wanted = np.asarray(rows, dtype=np.int64)
+            keep = set(wanted.tolist())
+            df = pd.read_csv(path, usecols=usecols, nrows=len(keep),
+                             skiprows=lambda i: i > 0 and (i - 1) not in keep)
+        else:
+            df = pd.read_csv(path, usecols=usecols, nrows=nrows)
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+    pf = _parquet_file(path)
+    cols = list(columns) if columns is not None else None
+    if nrows is not None:
+        rows = np.arange(min(int(nrows), pf.metadata.num_rows), dtype=np.int64)
+    if rows is None:
+        return pf.read(columns=cols).to_pandas().reset_index(drop=True)
+
+    wanted = np.asarray(rows, dtype=np.int64)
+    if len(wanted) == 0:
+        return pf.schema_arrow.empty_table().select(cols or pf.schema_arrow.names).to_pandas()
+    sizes = np.array([pf.metadata.row_group(i).num_rows for i in range(pf.num_row_groups)],
+                     dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    group_of = np.searchsorted(starts, wanted, side="right") - 1
+    groups = np.unique(group_of)
+    table = pf.read_row_groups(groups.tolist(), columns=cols)
+    # Position of each wanted row inside the concatenation of the groups just read
+    read_offsets = np.concatenate(([0], np.cumsum(sizes[groups])))
+    local = wanted - starts[group_of] + read_offsets[np.searchsorted(groups, group_of)]
+    return table.take(local).to_pandas().reset_index(drop=True)
+
+
+def iter_csv_chunks(path: PathLike, batch_rows: int = ROW_GROUP_ROWS) -> Iterator[bytes]:
+    """A Parquet dataset as CSV text, one batch at a time (for streamed downloads)."""
+    header = True
+    for batch in _parquet_file(path).iter_batches(batch_size=batch_rows):
+        yield batch.to_pandas().to_csv(index=False, header=header).encode()
+        header = False
+    if header:
+        yield (",".join(dataset_columns(path)) + "\n").encode()
+
+
+def dataset_summary(path: PathLike) -> Dict[str, Any]:
+    """Summary from the Parquet footer; computed from a full read for CSV (or for
+    Parquet files written without one)."""
+    if is_parquet(path):
+        meta = _parquet_file(path).schema_arrow.metadata or {}
+        raw = meta.get(SUMMARY_KEY)
+        if raw:
+            summary = json.loads(raw)
+            if summary.get("version") == SUMMARY_VERSION:
+                return summary
+    return compute_summary(read_dataset(path))
+
+
+# ---------------------------------------------------------------------------- conversion
+
+def convert_csv_dataset(csv_path: PathLike, remove_csv: bool = False) -> Path:
+    """Rewrite a CSV dataset as Parquet next to it; returns the new path.
+
+    Values round-trip exactly: the CSV is parsed as every reader parsed it before, and
+    only the ``Date`` column is given a timestamp type.
+    """
+    csv_path = Path(csv_path)
+    out = write_dataset(pd.read_csv(csv_path), csv_path.with_suffix(".parquet"))
+    if remove_csv:
+        csv_path.unlink()
+    logger.info(f"Converted dataset {csv_path.name} -> {out.name}")
+    return out
@@ -0,0 +1,376 @@
+"""
+Array kernels for path-dependent technical indicators.
+
+Shared by ``app.indicators.TechnicalIndicators`` and
+``app.services.indicators.IndicatorService``. Every kernel reproduces the original
+per-bar Python loop bit for bit (same float operations in the same order, same NaN
+behaviour) -- tests/test_indicator_kernels.py keeps the loop versions as references.
+
+How the state machines are split:
+
+* ZigZag: a trend segment only ends at the first bar whose low (high) crosses the
+  running extreme times the deviation factor. Each leg is first followed bar by bar
+  over native floats (most legs are short, where a few numpy calls per leg cost more
+  than the loop); once a leg outlives ``_ZIGZAG_SCALAR_BARS`` the rest is scanned in
+  chunks, where the running extreme is one ``np.fmax.accumulate`` /
+  ``np.fmin.accumulate`` and the crossing is one vectorised comparison. Chunks grow
+  geometrically while no pivot is found, keeping long quiet stretches cheap.
+* ADX directional movement / true range and OBV have no carried state beyond a
+  running sum, so they are plain element-wise expressions plus ``cumsum``.
+* Parabolic SAR feeds the clamped value back into the next bar's recurrence, which
+  cannot be reordered without changing the rounding. It stays a scalar loop, but
+  over native Python floats (``tolist()``) instead of per-element numpy indexing,
+  which removes the scalar-boxing overhead that dominated the old loop.
+
+Numpy releases the GIL inside these array calls, so builds that fan symbols out to
+threads overlap the ZigZag/ADX/OBV work.
+"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+# Bars of a ZigZag leg followed with the scalar loop before switching to chunks
+_ZIGZAG_SCALAR_BARS = 96
+# Initial/maximum number of bars examined per ZigZag chunk
+_ZIGZAG_MIN_CHUNK = 256
+_ZIGZAG_MAX_CHUNK = 8192
+
+
+def _py_max3(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Element-wise ``max(a, b, c)`` with Python's builtin semantics (first wins, NaN never replaces)."""
+    out = np.where(b > a, b, a)
+    return np.where(c > out, c, out)
+
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, af_start: float = 0.02, af_max: float = 0.2) -> np.ndarray:
+    """
+    Parabolic SAR values for every bar (requires at least 2 bars).
+
+    Args:
+        high: High prices
+        low: Low prices
+        af_start: Starting acceleration factor (also the AF increment)
+        af_max: Maximum acceleration factor
+
+    Returns:
+        float64 array of SAR values
+    """
+    highs = np.asarray(high, dtype=np.float64).tolist()
+    lows = np.asarray(low, dtype=np.float64).tolist()
+    n = len(highs)
+    sar = [0.0] * n
+
+    af = af_start
+    is_uptrend = True
+    ep = highs[0]
+    prev = sar[0] = lows[0]
+
+    for i in range(1, n):
+        cur = prev + af * (ep - prev)
+        if is_uptrend:
+            cur = min(cur, lows[i - 1], lows[i - 2] if i >= 2 else lows[i - 1])
+            if lows[i] < cur:
+                is_uptrend = False
+                cur = ep
+                ep = lows[i]
+                af = af_start
+            elif highs[i] > ep:
+                ep = highs[i]
+                af = min(af + af_start, af_max)
+        else:
+            cur = max(cur, highs[i - 1], highs[i - 2] if i >= 2 else highs[i - 1])
+            if highs[i] > cur:
+                is_uptrend = True
+                cur = ep
+                ep = highs[i]
+                af = af_start
+            elif lows[i] < ep:
+                ep = lows[i]
+                af = min(af + af_start, af_max)
+        sar[i] = prev = cur
+
+    return np.array(sar, dtype=np.float64)
+
+
+def _scan_extreme(ext: np.ndarray, trig_src: np.ndarray, start: int, value: float, idx: int,
+                  rising: bool, factor: float, inclusive: bool, extend_first: bool) -> Tuple[int, float, int]:
+    """
+    Follow a long ZigZag leg in chunks from bar ``start`` until it reverses.
+
+    The leg's extreme (``value`` at bar ``idx``, never NaN) is extended by ``ext``
+    (highs when ``rising``) and the leg reverses at the first bar whose ``trig_src``
+    crosses ``extreme * factor`` (``<``/``<=`` for a rising leg, ``>``/``>=``
+    otherwise, ``inclusive`` selecting the non-strict form). ``extend_first`` mirrors
+    loops that test for an extension before testing for a reversal on the same bar.
+
+    Returns:
+        (reversal bar or -1 when the data ends first, extreme value and its bar as
+        they stand just before the reversal bar)
+    """
+    n = len(ext)
+    accumulate = np.fmax.accumulate if rising else np.fmin.accumulate
+    chunk = _ZIGZAG_MIN_CHUNK
+    a = start
+    while a < n:
+        b = min(n, a + chunk)
+        seg = ext[a:b]
+        run = accumulate(np.concatenate(([value], seg)))
+        before = run[:-1]  # extreme in force when each bar of the chunk is evaluated
+        threshold = before * factor
+        src = trig_src[a:b]
+        if rising:
+            trig = (src <= threshold) if inclusive else (src < threshold)
+            if extend_first:
+                trig &= ~(seg > before)
+        else:
+            trig = (src >= threshold) if inclusive else (src > threshold)
+            if extend_first:
+                trig &= ~(seg < before)
+
+        stop = int(np.argmax(trig)) if trig.any() else len(seg)
+        # Bars that extended the extreme before the reversal (or chunk end)
+        moved = np.flatnonzero(run[1:stop + 1] != run[:stop])
+        if len(moved):
+            idx = a + int(moved[-1])
+            value = float(run[int(moved[-1]) + 1])
+        if stop < len(seg):
+            return a + stop, value, idx
+        a = b
+        chunk = min(chunk * 2, _ZIGZAG_MAX_CHUNK)
+    return -1, value, idx
+
+
+def zigzag_pivots(high: np.ndarray, low: np.ndarray, deviation: float, first_type: str,
+                  first_price: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Confirmed + final ZigZag pivots starting from a pivot at bar 0.
+
+    A high leg reverses when a low falls strictly below ``extreme * (1 - deviation)``;
+    a low leg reverses when a high rises strictly above ``extreme * (1 + deviation)``.
+    The reversal test runs before the extension test on each bar
+    (``IndicatorService.calculate_zigzag`` semantics).
+
+    Returns:
+        (pivot bar indices, pivot prices), both in bar order
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    high_list, low_list = high.tolist(), low.tolist()
+    down_factor = 1 - deviation
+    up_factor = 1 + deviation
+
+    idxs: List[int] = []
+    prices: List[float] = []
+    rising = first_type == 'high'
+    value, idx = float(first_price), 0
+    start = 1
+    while start < n:
+        reversal = -1
+        end = min(n, start + _ZIGZAG_SCALAR_BARS)
+        if rising:
+            for i in range(start, end):
+                if low_list[i] < value * down_factor:
+                    reversal = i
+                    break
+                if high_list[i] > value:
+                    value, idx = high_list[i], i
+        else:
+            for i in range(start, end):
+                if high_list[i] > value * up_factor:
+                    reversal = i
+                    break
+                if low_list[i] < value:
+                    value, idx = low_list[i], i
+        if reversal < 0:
+            if end == n or math.isnan(value):
+                # Data ended, or a NaN extreme that no comparison can ever move
+                break
+            reversal, value, idx = _scan_extreme(
+                high if rising else low, low if rising else high, end, value, idx,
+                rising=rising, factor=down_factor if rising else up_factor,
+                inclusive=False, extend_first=False,
+            )
+            if reversal < 0:
+                break
+        idxs.append(idx)
+        prices.append(value)
+        rising = not rising
+        value = high_list[reversal] if rising else low_list[reversal]
+        idx, start = reversal, reversal + 1
+    idxs.append(idx)
+    prices.append(value)
+    return np.array(idxs, dtype=np.int64), np.array(prices, dtype=np.float64)
+
+
+def interpolate_pivots(n: int, pivot_idx: np.ndarray, pivot_price: np.ndarray) -> np.ndarray:
+    """
+    Straight lines between consecutive pivots; NaN outside the first/last pivot.
+
+    Each bar is computed as ``start + t * (end - start)`` with
+    ``t = (bar - start_bar) / (end_bar - start_bar)``; a bar shared by two legs takes
+    the value of the later leg (t = 0).
+    """
+    out = np.full(n, np.nan)
+    out[pivot_idx] = pivot_price
+    if len(pivot_idx) < 2:
+        return out
+
+    bars = np.arange(pivot_idx[0], pivot_idx[-1] + 1)
+    leg = np.minimum(np.searchsorted(pivot_idx, bars, side='right') - 1, len(pivot_idx) - 2)
+    s_idx, e_idx = pivot_idx[leg], pivot_idx[leg + 1]
+    s_price, e_price = pivot_price[leg], pivot_price[leg + 1]
+    t = (bars - s_idx) / (e_idx - s_idx)
+    out[bars] = s_price + t * (e_price - s_price)
+    return out
+
+
+def zigzag_confirmed(high: np.ndarray, low: np.ndarray, deviation_pct: float) -> np.ndarray:
+    """
+    ZigZag pivot prices (NaN elsewhere) with ``TechnicalIndicators.calculate_zigzag`` semantics.
+
+    Starts undecided from the first bar's mid price, extends a leg before testing for
+    a reversal on each bar, uses non-strict reversal thresholds and always marks the
+    last (unconfirmed) pivot.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    zigzag = np.full(n, np.nan)
+    up_factor = 1 + deviation_pct / 100
+    down_factor = 1 - deviation_pct / 100
+
+    idx = 0
+    value = float((high[0] + low[0]) / 2)
+    # Undecided: the mid price stays fixed until the first move of deviation_pct
+    up_hit = high[1:] >= value * up_factor
+    down_hit = low[1:] <= value * down_factor
+    either = up_hit | down_hit
+    if not either.any():
+        zigzag[idx] = value
+        return zigzag
+    first = int(np.argmax(either))
+    idx = first + 1
+    rising = bool(up_hit[first])
+    high_list, low_list = high.tolist(), low.tolist()
+    value = high_list[idx] if rising else low_list[idx]
+
+    pivots: List[int] = []
+    prices: List[float] = []
+    start = idx + 1
+    while start < n:
+        reversal = -1
+        end = min(n, start + _ZIGZAG_SCALAR_BARS)
+        if rising:
+            for i in range(start, end):
+                if high_list[i] > value:
+                    value, idx = high_list[i], i
+                elif low_list[i] <= value * down_factor:
+                    reversal = i
+                    break
+        else:
+            for i in range(start, end):
+                if low_list[i] < value:
+                    value, idx = low_list[i], i
+                elif high_list[i] >= value * up_factor:
+                    reversal = i
+                    break
+        if reversal < 0:
+            if end == n or math.isnan(value):
+                break
+            reversal, value, idx = _scan_extreme(
+                high if rising else low, low if rising else high, end, value, idx,
+                rising=rising, factor=down_factor if rising else up_factor,
+                inclusive=True, extend_first=True,
+            )
+            if reversal < 0:
+                break
+        pivots.append(idx)
+        prices.append(value)
+        rising = not rising
+        value = high_list[reversal] if rising else low_list[reversal]
+        idx, start = reversal, reversal + 1
+
+    zigzag[pivots] = prices
+    zigzag[idx] = value
+    return zigzag
+
+
+def directional_movement(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    +DM, -DM and true range per bar (0 on the first bar).
+
+    Returns:
+        (plus_dm, minus_dm, true_range) float64 arrays
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(high)
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    tr = np.zeros(n)
+    if n < 2:
+        return plus_dm, minus_dm, tr
+
+    up_move = high[1:] - high[:-1]
+    down_move = low[:-1] - low[1:]
+    plus_dm[1:] = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm[1:] = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    tr[1:] = _py_max3(high[1:] - low[1:], np.abs(high[1:] - close[:-1]), np.abs(low[1:] - close[:-1]))
+    return plus_dm, minus_dm, tr
+
+
+def on_balance_volume(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """OBV seeded with the first bar's volume; unchanged on flat (or NaN) closes."""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if len(close) == 0:
+        return np.zeros(0)
+    signed = np.empty(len(close))
+    signed[0] = volume[0]
+    prev, cur, vol = close[:-1], close[1:], volume[1:]
+    signed[1:] = np.where(cur > prev, vol, np.where(cur < prev, -vol, 0.0))
+    return np.cumsum(signed)
+
+
+def wilder_rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder smoothing, seeded by the SMA of the first ``period`` changes.
+
+    Values before bar ``period - 1`` are NaN; a zero average loss gives 100.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    delta = np.diff(close, prepend=close[0])
+    gains = np.where(delta > 0, delta, 0)
+    losses = np.where(delta < 0, -delta, 0)
+
+    avg_gain = np.zeros(n)
+    avg_loss = np.zeros(n)
+    if n >= period:
+        avg_gain[period - 1] = np.mean(gains[1:period + 1])
+        avg_loss[period - 1] = np.mean(losses[1:period + 1])
+
+        # The smoothing recurrence is sequential; run it on native floats
+        gain_list, loss_list = gains.tolist(), losses.tolist()
+        g, lo = float(avg_gain[period - 1]), float(avg_loss[period - 1])
+        keep = period - 1
+        smoothed_gain, smoothed_loss = [], []
+        for i in range(period, n):
+            g = (g * keep + gain_list[i]) / period
+            lo = (lo * keep + loss_list[i]) / period
+            smoothed_gain.append(g)
+            smoothed_loss.append(lo)
+        avg_gain[period:] = smoothed_gain
+        avg_loss[period:] = smoothed_loss
+
+    rsi = np.full(n, np.nan)
+    if n >= period:
+        ag, al = avg_gain[period - 1:], avg_loss[period - 1:]
+        zero_loss = al == 0
+        rs = np.divide(ag, al, out=np.zeros_like(ag), where=~zero_loss)
+        rsi[period - 1:] = np.where(zero_loss, 100.0, 100.0 - (100.0 / (1.0 + rs)))
+    return rsi
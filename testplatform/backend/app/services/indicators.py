@@ -13,6 +13,10 @@ import pandas as pd
 from typing import Dict, Any, Optional
 import logging
 
+from app.services.indicator_kernels import (
+    interpolate_pivots, parabolic_sar, wilder_rsi, zigzag_pivots,
+)
+
 logger = logging.getLogger(__name__)
 
 # Timeframe to pandas resample offset mapping
@@ -169,38 +173,7 @@ class IndicatorService:
         if 'Close' not in df.columns:
             raise ValueError("DataFrame must have 'Close' column")
 
-        close = df['Close'].values
-        n = len(close)
-
-        # Calculate price changes
-        delta = np.diff(close, prepend=close[0])
-
-        # Separate gains and losses
-        gains = np.where(delta > 0, delta, 0)
-        losses = np.where(delta < 0, -delta, 0)
-
-        # Calculate smoothed averages using Wilder's method
-        avg_gain = np.zeros(n)
-        avg_loss = np.zeros(n)
-
-        # Initial SMA for first period
-        if n >= period:
-            avg_gain[period - 1] = np.mean(gains[1:period + 1])
-            avg_loss[period - 1] = np.mean(losses[1:period + 1])
-
-            # Subsequent values use exponential smoothing
-            for i in range(period, n):
-                avg_gain[i] = (avg_gain[i - 1] * (period - 1) + gains[i]) / period
-                avg_loss[i] = (avg_loss[i - 1] * (period - 1) + losses[i]) / period
-
-        # Calculate RS and RSI
-        rsi = np.full(n, np.nan)
-        for i in range(period - 1, n):
-            if avg_loss[i] == 0:
-                rsi[i] = 100.0
-            else:
-                rs = avg_gain[i] / avg_loss[i]
-                rsi[i] = 100.0 - (100.0 / (1.0 + rs))
+        rsi = wilder_rsi(df['Close'].values, period)
 
         return pd.Series(rsi, index=df.index, name=f'rsi_{period}')
 
@@ -280,52 +253,7 @@ class IndicatorService:
         if n < 2:
             return pd.Series(np.full(n, np.nan), index=df.index, name='sar')
 
-        sar = np.zeros(n)
-        af = af_start
-        is_uptrend = True
-
-        # Initialize
-        ep = high[0]  # Extreme point
-        sar[0] = low[0]
-
-        for i in range(1, n):
-            # Calculate SAR for current bar
-            sar[i] = sar[i - 1] + af * (ep - sar[i - 1])
-
-            if is_uptrend:
-                # In uptrend, SAR cannot be above prior two lows
-                sar[i] = min(sar[i], low[i - 1])
-                if i >= 2:
-                    sar[i] = min(sar[i], low[i - 2])
-
-                # Check for reversal
-                if low[i] < sar[i]:
-                    is_uptrend = False
-                    sar[i] = ep
-                    ep = low[i]
-                    af = af_start
-                else:
-                    # Update extreme point and AF
-                    if high[i] > ep:
-                        ep = high[i]
-                        af = min(af + af_start, af_max)
-            else:
-                # In downtrend, SAR cannot be below prior two highs
-                sar[i] = max(sar[i], high[i - 1])
-                if i >= 2:
-                    sar[i] = max(sar[i], high[i - 2])
-
-                # Check for reversal
-                if high[i] > sar[i]:
-                    is_uptrend = True
-                    sar[i] = ep
-                    ep = high[i]
-                    af = af_start
-                else:
-                    # Update extreme point and AF
-                    if low[i] < ep:
-                        ep = low[i]
-                        af = min(af + af_start, af_max)
+        sar = parabolic_sar(high, low, af_start, af_max)
 
         return pd.Series(sar, index=df.index, name=f'sar_{af_start}_{af_max}')
 
@@ -357,88 +285,28 @@ class IndicatorService:
         if n < 2:
             return pd.Series(np.full(n, np.nan), index=df.index, name='zigzag')
 
-        zigzag = np.full(n, np.nan)
-        pivots = []  # List of (index, price, type) where type is 'high' or 'low'
-
         deviation = deviation_pct / 100.0
 
-        # Find initial direction
-        first_high_idx = 0
-        first_low_idx = 0
-
-        # Start with first bar
-        last_pivot_type = None
-        last_pivot_idx = 0
-        last_pivot_price = (high[0] + low[0]) / 2
-
         # Determine initial trend by looking at first significant move
+        first_type, first_price = None, None
         for i in range(1, min(n, 20)):
             high_change = (high[i] - low[0]) / low[0]
             low_change = (high[0] - low[i]) / high[0]
 
             if high_change >= deviation:
-                last_pivot_type = 'low'
-                last_pivot_idx = 0
-                last_pivot_price = low[0]
-                pivots.append((0, low[0], 'low'))
+                first_type, first_price = 'low', low[0]
                 break
             elif low_change >= deviation:
-                last_pivot_type = 'high'
-                last_pivot_idx = 0
-                last_pivot_price = high[0]
-                pivots.append((0, high[0], 'high'))
+                first_type, first_price = 'high', high[0]
                 break
 
-        if last_pivot_type is None:
+        if first_type is None:
             # No significant move found, use first bar high
-            last_pivot_type = 'high'
-            last_pivot_idx = 0
-            last_pivot_price = high[0]
-            pivots.append((0, high[0], 'high'))
-
-        # Scan for pivots
-        for i in range(1, n):
-            if last_pivot_type == 'high':
-                # Looking for a low pivot
-                if low[i] < last_pivot_price * (1 - deviation):
-                    # Found significant low
-                    pivots.append((i, low[i], 'low'))
-                    last_pivot_type = 'low'
-                    last_pivot_idx = i
-                    last_pivot_price = low[i]
-                elif high[i] > last_pivot_price:
-                    # Extend the high pivot
-                    pivots[-1] = (i, high[i], 'high')
-                    last_pivot_idx = i
-                    last_pivot_price = high[i]
-            else:
-                # Looking for a high pivot
-                if high[i] > last_pivot_price * (1 + deviation):
-                    # Found significant high
-                    pivots.append((i, high[i], 'high'))
-                    last_pivot_type = 'high'
-                    last_pivot_idx = i
-                    last_pivot_price = high[i]
-                elif low[i] < last_pivot_price:
-                    # Extend the low pivot
-                    pivots[-1] = (i, low[i], 'low')
-                    last_pivot_idx = i
-                    last_pivot_price = low[i]
-
-        # Fill zigzag array at pivot points
-        for idx, price, _ in pivots:
-            zigzag[idx] = price
-
-        # Interpolate between pivots for visualization
-        zigzag_interp = np.copy(zigzag)
-        for i in range(len(pivots) - 1):
-            start_idx, start_price, _ = pivots[i]
-            end_idx, end_price, _ = pivots[i + 1]
-
-            if end_idx > start_idx:
-                for j in range(start_idx, end_idx + 1):
-                    t = (j - start_idx) / (end_idx - start_idx)
-                    zigzag_interp[j] = start_price + t * (end_price - start_price)
+            first_type, first_price = 'high', high[0]
+
+        # Scan for pivots, then interpolate between them for visualization
+        pivot_idx, pivot_price = zigzag_pivots(high, low, deviation, first_type, first_price)
+        zigzag_interp = interpolate_pivots(n, pivot_idx, pivot_price)
 
         return pd.Series(zigzag_interp, index=df.index, name=f'zigzag_{deviation_pct}')
 
@@ -845,7 +713,9 @@ class IndicatorService:
         df: pd.DataFrame,
         indicators: list,
         target_timeframe: str,
-        source_timeframe: Optional[str] = None
+        source_timeframe: Optional[str] = None,
+        store: Optional[Any] = None,
+        store_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Calculate indicators on a higher timeframe and align to base timeframe.
@@ -858,10 +728,26 @@ class IndicatorService:
             indicators: List of indicator configs
             target_timeframe: Timeframe to calculate indicators on (e.g., '1h')
             source_timeframe: Optional source timeframe of the data
+            store: Optional MultiTimeframeStore (app.services.mtf_store); when given the
+                resampled bars, as-of join and indicator columns are read from / saved to it
+                instead of being recomputed. Results are identical either way.
+            store_key: Store grouping key (e.g. "dataset_12")
 
         Returns:
             Dict with indicator names as keys and Series (aligned to df) as values
         """
+        if store is not None:
+            view = store.view(df, target_timeframe, source_timeframe, key=store_key)
+            if len(view) < 5:
+                logger.warning(f"Not enough data after resampling to {target_timeframe}: {len(view)} bars")
+                return {}
+            results = {}
+            for name, values in view.indicator_columns(indicators, self).items():
+                tf_name = f"{name}_{target_timeframe}"
+                results[tf_name] = pd.Series(view.align(values), index=df.index, name=tf_name)
+            logger.info(f"Calculated {len(results)} indicators on {target_timeframe} timeframe (store)")
+            return results
+
         # Resample to target timeframe
         resampled_df = resample_ohlcv_to_timeframe(df, target_timeframe, source_timeframe)
 
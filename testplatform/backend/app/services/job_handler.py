@@ -9,12 +9,14 @@ import logging
 import pandas as pd
 import numpy as np
 import os
+import shutil
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 from app.models.database import SessionLocal
 from app.models.dataset import Dataset
+from app.services.dataset_store import read_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,11 @@ def get_job_cache_dir(task_id: str) -> Path:
     return cache_dir
 
 
+def get_job_windows_dir(task_id: str) -> Path:
+    """Memory-mapped training windows for a job (parameterRanges.mmapWindows); removed when the job ends."""
+    return DATASET_CACHE_DIR / task_id / "windows"
+
+
 # RNN models that only support output_chunk_length=1
 RNN_MODELS = ['lstm', 'gru']
 
@@ -1126,7 +1133,7 @@ def load_dataset(
             logger.error(f"Dataset file not found: {file_path}")
             return None
 
-        df = pd.read_csv(file_path)
+        df = read_dataset(file_path)
         original_rows = len(df)
         logger.info(f"Loaded dataset {dataset_id}: {original_rows} rows, {len(df.columns)} columns")
 
@@ -1355,12 +1362,15 @@ def handle_training_job(task_id: str, payload: Dict[str, Any], dry_run: bool = F
 
                     # Prepare working_df for multi-timeframe (if applicable)
                     working_df = combined_df
+                    mtf_view = None
                     if use_multi_tf:
                         try:
-                            from app.services.indicators import resample_ohlcv_to_timeframe, align_higher_timeframe_to_lower
-                            working_df = resample_ohlcv_to_timeframe(
-                                combined_df, target_timeframe, source_timeframe=dataset_timeframe
+                            from app.services.mtf_store import get_mtf_store
+                            mtf_view = get_mtf_store().view(
+                                combined_df, target_timeframe, dataset_timeframe,
+                                key="datasets_" + "_".join(str(i) for i in dataset_ids)
                             )
+                            working_df = mtf_view.bars.copy()
                             logger.info(f"Resampled to {target_timeframe} for target: {len(combined_df)} -> {len(working_df)} bars")
                         except ValueError as e:
                             logger.warning(f"Cannot resample to {target_timeframe}: {e}. Using base timeframe.")
@@ -1383,10 +1393,7 @@ def handle_training_job(task_id: str, payload: Dict[str, Any], dry_run: bool = F
 
                             # Align back to original timeframe if multi-timeframe
                             if use_multi_tf:
-                                higher_tf_data = working_df[['Date']].copy()
-                                higher_tf_data['_target'] = target_series.values
-                                aligned = align_higher_timeframe_to_lower(combined_df, higher_tf_data, ['_target'])
-                                target_series = pd.Series(aligned['_target'].values, index=combined_df.index)
+                                target_series = pd.Series(mtf_view.align(target_series.values), index=combined_df.index)
                                 logger.info(f"Aligned {col_name} from {target_timeframe} to {dataset_timeframe}")
 
                             combined_df[col_name] = target_series
@@ -1727,6 +1734,8 @@ def handle_training_job(task_id: str, payload: Dict[str, Any], dry_run: bool = F
                     'status': 'failed',
                     'error': str(e)
                 }]
+            finally:
+                shutil.rmtree(get_job_windows_dir(task_id), ignore_errors=True)
         else:
             # Use darts for regression (unified optimization)
             update_job_progress(task_id, 25, f"Starting unified optimization across {len(selected_models)} model types...")
@@ -2258,9 +2267,13 @@ def train_classification_optimization(
     # Get normalization buffer from parameter ranges (default 35% if not specified for old configs)
     normalization_buffer = parameter_ranges.get('normalizationBuffer', 35) / 100.0  # Convert % to decimal
 
+    # Opt-in: memory-map the windowed feature arrays under the job's cache dir instead of
+    # holding one per (mode, seq_len) combination in RAM
+    windows_dir = str(get_job_windows_dir(task_id)) if parameter_ranges.get('mmapWindows') else None
+
     # Initialize services
     model_service = TSAIModelService()
-    training_service = TSAITrainingService(buffer_pct=normalization_buffer)
+    training_service = TSAITrainingService(buffer_pct=normalization_buffer, windows_dir=windows_dir)
 
     # Get genetic config - required parameters (no defaults)
     population_size = genetic_config.get('populationSize')
@@ -2335,15 +2348,20 @@ def train_classification_optimization(
                 # NOTE: Target column is already pre-shifted during dataset generation
                 # (e.g., directional target uses shift(-horizon) to look ahead)
                 # So we pass prediction_horizon=0 here to avoid double-shifting
-                X_train, X_test, y_train, y_test = training_service.prepare_data_split(
+                # Windowed datasets share one feature array per (mode, seq_len): the
+                # windows are strided views, so holding every combination costs rows,
+                # not rows x seq_len.
+                train_ds, test_ds = training_service.prepare_windowed_split(
                     full_df,
                     train_ratio=train_ratio,
                     target_column=target_column,
                     feature_columns=feature_columns,
                     seq_len=current_seq_len,
                     prediction_horizon=0,  # Target already pre-shifted
-                    prediction_mode=mode
+                    prediction_mode=mode,
+                    name="features"
                 )
+                X_train, X_test, y_train, y_test = train_ds.X, test_ds.X, train_ds.y, test_ds.y
                 c_out = 2 if mode == 'shift' else prediction_horizon
                 # Get the actual valid columns used after dropping zero-variance columns
                 valid_feature_columns = training_service.data_prep.get_valid_columns() if training_service.data_prep else feature_columns
@@ -2352,6 +2370,7 @@ def train_classification_optimization(
                 data_by_mode_and_seqlen[cache_key] = {
                     'X_train': X_train, 'X_test': X_test,
                     'y_train': y_train, 'y_test': y_test,
+                    'train_ds': train_ds, 'test_ds': test_ds,
                     'c_out': c_out,
                     'seq_len': current_seq_len,
                     'valid_feature_columns': valid_feature_columns,  # Store the actual columns used
@@ -2464,7 +2483,6 @@ def train_classification_optimization(
 
         X_train = mode_data['X_train']
         X_test = mode_data['X_test']
-        y_train = mode_data['y_train']
         y_test = mode_data['y_test']
         c_out = mode_data['c_out']
         actual_seq_len = mode_data['seq_len']
@@ -2524,8 +2542,8 @@ def train_classification_optimization(
             # Train
             result = training_service.train_model(
                 model,
-                (X_train, y_train),
-                val_data=(X_test, y_test),
+                mode_data['train_ds'],
+                val_data=mode_data['test_ds'],
                 epochs=training_epochs,
                 learning_rate=learning_rate,
                 loss_fn=loss_fn,
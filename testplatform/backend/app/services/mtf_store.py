@@ -0,0 +1,265 @@
+"""Persistent multi-timeframe feature store.
+
+Multi-timeframe features (indicators or targets computed on a higher timeframe and
+forward-filled onto the dataset's base bars) used to resample the base frame and
+``merge_asof`` the result back on every dataset build and every indicator/target request.
+This store keeps, per (key, source timeframe, target timeframe) and per exact base
+content, three columnar artifacts on disk:
+
+    bars.parquet            the resampled OHLCV bars (``resample_ohlcv_to_timeframe``)
+    asof_index.npy          int64 per base bar (in date order): row of the higher-timeframe
+                            bar it aligns to, -1 before the first one -- the precomputed
+                            as-of join, so alignment is one ``take``
+    ind_<sha>.parquet       the columns one indicator config produces on ``bars``
+
+Layout: ``<root>/<key>/<source>__<target>/<content fingerprint>/``. The fingerprint hashes
+the base Date/OHLCV arrays, so a regenerated dataset gets a fresh directory and the stale
+one is removed -- never a mix of old and new files. Artifacts are written tmp +
+``os.replace`` and the join index last, so a concurrent reader either sees a complete
+entry or rebuilds it. Values are identical to ``align_higher_timeframe_to_lower``
+(backward as-of on the resampled bar's Date label).
+
+Default root is ``<JOBS_CACHE_DIR>/mtf``, so the cache manager's "jobs" type sizes and
+clears it along with the other dataset-build caches.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicators import resample_ohlcv_to_timeframe
+
+logger = logging.getLogger(__name__)
+
+_OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+_INDEX_FILE = "asof_index.npy"
+_BARS_FILE = "bars.parquet"
+
+
+def _default_root() -> Path:
+    from app.paths import JOBS_CACHE_DIR
+    return Path(JOBS_CACHE_DIR) / "mtf"
+
+
+def _safe_name(key: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(key)) or "_"
+
+
+def asof_join_index(base_dates: Any, higher_dates: Any) -> np.ndarray:
+    """Row of the latest ``higher_dates`` entry at or before each base date (-1 if none).
+
+    ``base_dates`` is taken in date order -- the row order ``align_higher_timeframe_to_lower``
+    returns -- and ``higher_dates`` must be sorted (resampled bars are).
+    """
+    base = np.sort(pd.to_datetime(pd.Series(base_dates)).values, kind="stable")
+    higher = pd.to_datetime(pd.Series(higher_dates)).values
+    return np.searchsorted(higher, base, side="right").astype(np.int64) - 1
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of a base frame's Date + OHLCV columns (row order included)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.to_datetime(df["Date"]).values.astype("datetime64[ns]").view(np.int64).tobytes())
+    for col in _OHLCV_COLUMNS:
+        if col in df.columns:
+            h.update(col.encode())
+            h.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+def _config_key(config: Dict[str, Any]) -> str:
+    blob = json.dumps(config, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write(path: Path, write) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+class TimeframeView:
+    """Resampled bars of one base frame plus the as-of join back onto its rows."""
+
+    def __init__(self, bars: pd.DataFrame, asof_index: np.ndarray, path: Optional[Path] = None):
+        self.bars = bars
+        self.asof_index = asof_index
+        self.path = path
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    def align(self, values: Any) -> np.ndarray:
+        """Forward-fill per-higher-bar ``values`` onto the base rows (date order); NaN where
+        no higher bar has started yet -- the same result as ``merge_asof(direction='backward')``."""
+        values = np.asarray(values)
+        idx = self.asof_index
+        missing = idx < 0
+        if not missing.any():
+            return values[idx]
+        out = values[np.where(missing, 0, idx)].astype(np.float64)
+        out[missing] = np.nan
+        return out
+
+    def indicator_columns(self, indicators: List[Dict[str, Any]], service: Any) -> Dict[str, np.ndarray]:
+        """Indicator outputs on ``bars`` (name -> per-higher-bar array), computed once per config.
+
+        Each config's columns live in their own parquet file, so a request for a different
+        indicator set reuses the ones already built and only computes what is new.
+        """
+        results: Dict[str, np.ndarray] = {}
+        for config in indicators:
+            ckey = _config_key(config)
+            with self._lock:
+                cols = self._columns.get(ckey)
+                if cols is None:
+                    cols = self._read_columns(ckey)
+                if cols is None:
+                    computed = service.calculate_indicators(self.bars, [config])
+                    cols = {name: np.asarray(series.values) for name, series in computed.items()}
+                    self._write_columns(ckey, cols)
+                self._columns[ckey] = cols
+            results.update(cols)
+        return results
+
+    def _read_columns(self, ckey: str) -> Optional[Dict[str, np.ndarray]]:
+        if self.path is None:
+            return None
+        p = self.path / f"ind_{ckey}.parquet"
+        if not p.exists():
+            return None
+        try:
+            table = pd.read_parquet(p)
+        except Exception as e:
+            logger.warning(f"Unreadable multi-timeframe indicator file {p}: {e}")
+            return None
+        if len(table) != len(self.bars):
+            return None
+        return {name: table[name].to_numpy() for name in table.columns}
+
+    def _write_columns(self, ckey: str, cols: Dict[str, np.ndarray]) -> None:
+        if self.path is None or not cols:
+            return
+        try:
+            frame = pd.DataFrame(cols)
+            _atomic_write(self.path / f"ind_{ckey}.parquet", lambda t: frame.to_parquet(t, index=False))
+        except Exception as e:
+            logger.warning(f"Could not persist multi-timeframe indicators to {self.path}: {e}")
+
+
+class MultiTimeframeStore:
+    """Disk-backed (plus small in-process LRU) store of :class:`TimeframeView` entries."""
+
+    def __init__(self, root: Optional[os.PathLike] = None, max_memory_entries: int = 16):
+        self.root = Path(root) if root is not None else _default_root()
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[tuple, TimeframeView]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_loads = 0
+        self.builds = 0
+
+    def view(
+        self,
+        df: pd.DataFrame,
+        target_timeframe: str,
+        source_timeframe: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> TimeframeView:
+        """Resampled ``target_timeframe`` bars of ``df`` with the as-of join onto ``df``.
+
+        ``key`` groups entries on disk (a dataset id or symbol); only the newest content of
+        a key is kept. Without one the content fingerprint is the key. Raises ``ValueError``
+        exactly as ``resample_ohlcv_to_timeframe`` does.
+        """
+        fp = frame_fingerprint(df)
+        key = _safe_name(key if key is not None else fp)
+        pair = f"{_safe_name(source_timeframe or 'base')}__{_safe_name(target_timeframe)}"
+        mem_key = (key, pair, fp)
+
+        with self._lock:
+            cached = self._memory.get(mem_key)
+            if cached is not None:
+                self._memory.move_to_end(mem_key)
+                self.hits += 1
+                return cached
+
+        path = self.root / key / pair / fp
+        view = self._load(path)
+        if view is not None:
+            self.disk_loads += 1
+        else:
+            bars = resample_ohlcv_to_timeframe(df, target_timeframe, source_timeframe)
+            view = TimeframeView(bars, asof_join_index(df["Date"], bars["Date"]), path)
+            self._save(view)
+            self.builds += 1
+
+        with self._lock:
+            self._memory[mem_key] = view
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+        return view
+
+    def clear(self) -> None:
+        """Drop the in-process entries (disk artifacts stay)."""
+        with self._lock:
+            self._memory.clear()
+
+    def _load(self, path: Path) -> Optional[TimeframeView]:
+        index_file = path / _INDEX_FILE
+        if not index_file.exists():
+            return None
+        try:
+            bars = pd.read_parquet(path / _BARS_FILE)
+            asof_index = np.load(index_file)
+        except Exception as e:
+            logger.warning(f"Unreadable multi-timeframe entry {path}, rebuilding: {e}")
+            return None
+        return TimeframeView(bars, asof_index, path)
+
+    def _save(self, view: TimeframeView) -> None:
+        path = view.path
+        try:
+            # A key keeps only its newest content: older fingerprints are stale datasets.
+            if path.parent.exists():
+                for old in path.parent.iterdir():
+                    if old.is_dir() and old.name != path.name:
+                        shutil.rmtree(old, ignore_errors=True)
+            path.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path / _BARS_FILE, lambda t: view.bars.to_parquet(t, index=False))
+
+            def _write_index(tmp: Path) -> None:
+                with open(tmp, "wb") as fh:
+                    np.save(fh, view.asof_index)
+            _atomic_write(path / _INDEX_FILE, _write_index)  # last: marks the entry complete
+        except Exception as e:
+            logger.warning(f"Could not persist multi-timeframe entry {path}: {e}")
+
+
+_default_store: Optional[MultiTimeframeStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_mtf_store() -> MultiTimeframeStore:
+    """Process-wide store under the jobs cache dir."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = MultiTimeframeStore()
+        return _default_store
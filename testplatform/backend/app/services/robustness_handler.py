@@ -16,7 +16,12 @@ Two behaviours, both keyed off a ``RobustnessRun`` row:
     ``is_saved=False``, ``optimization_id=None``) whose ``strategy_params`` carry the overridden
     ``runScheduleOverride`` so the standard ``rerun_backtest`` handler reconstructs+runs it. Each is
     queued on ``get_rerun_task_queue()`` and its id recorded in ``RobustnessRun.variant_backtest_ids``.
-    The PARENT row is NEVER mutated (variants are copies).
+    The PARENT row is NEVER mutated (variants are copies). With ``params['batch']`` the variant
+    rows are created the same way but ONE ``robustness_schedule_batch`` task is queued instead:
+    ``run_schedule_variant_batch`` runs every variant back to back in one worker, sharing the
+    run-invariant work (bars, screener gate, expert recommendations -- see
+    ``daily_engine.SharedRunState``); only entry timing and the account simulation fork. Each
+    variant row still gets its own results, so the collector below is unchanged.
 
   * ``collect_schedule_results(run_id)`` — callable lazily on GET or as a task: once every variant
     row is terminal (completed/failed), snapshot each variant's headline metrics into
@@ -31,7 +36,7 @@ from __future__ import annotations
 
 import copy
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from app.models.backtest import Backtest, RobustnessRun
 from app.models.database import SessionLocal
@@ -50,6 +55,9 @@ _DEFAULT_TIME = "09:30"  # first regular-session bar; matches _run_schedule_over
 
 _TERMINAL = ("completed", "failed")
 
+# Task type of the one-worker schedule-variant batch (runs on the re-run pool, like the variants).
+BATCH_TASK_TYPE = "robustness_schedule_batch"
+
 
 # ---------------------------------------------------------------------------
 # Year derivation
@@ -240,13 +248,21 @@ def launch_schedule_variants(robustness_run_id: int) -> List[int]:
 
             # Queue each variant on the dedicated re-run pool (the rerun_backtest handler rebuilds
             # its config from the row — reading the overridden runScheduleOverride — and runs it).
+            # Batch mode queues ONE task that runs them all in one worker (shared prefix).
             queue = get_rerun_task_queue()
-            for vid in created_ids:
+            if (run.params or {}).get("batch"):
                 queue.queue_task(
-                    task_type="rerun_backtest",
-                    name=f"RBST variant #{vid}",
-                    payload={"backtest_id": vid},
+                    task_type=BATCH_TASK_TYPE,
+                    name=f"RBST variant batch for backtest #{bt.id}",
+                    payload={"robustness_run_id": run.id},
                 )
+            else:
+                for vid in created_ids:
+                    queue.queue_task(
+                        task_type="rerun_backtest",
+                        name=f"RBST variant #{vid}",
+                        payload={"backtest_id": vid},
+                    )
             logger.info(
                 f"robustness schedule run {run.id}: launched {len(created_ids)} variants "
                 f"of backtest {bt.id}"
@@ -270,6 +286,101 @@ def launch_schedule_variants(robustness_run_id: int) -> List[int]:
         db.close()
 
 
+def run_schedule_variant_batch(
+    robustness_run_id: int,
+    progress_cb: Optional[Callable[[float, str], None]] = None,
+) -> List[int]:
+    """Run every still-pending variant row of a schedule run IN THIS WORKER, one after another,
+    sharing one ``SharedRunState``. Returns the ids of the variants that completed.
+
+    Each variant is rebuilt from its own row (``build_rerun_config``, exactly like the per-variant
+    ``rerun_backtest`` path) and its results persisted onto that row; a failing variant is marked
+    failed and the batch moves on. A pause fails the current and the remaining variants. Finishes
+    by running the collector, so the run completes as soon as the batch does.
+    """
+    from app.services.backtest.daily_backtest_handler import (
+        _Paused,
+        _fail,
+        _persist_results,
+        run_daily_backtest,
+    )
+    from app.services.backtest.daily_engine import SharedRunState
+    from app.services.backtest.rerun_handler import build_rerun_config
+
+    progress = progress_cb or (lambda pct, msg: None)
+    db = SessionLocal()
+    completed: List[int] = []
+    try:
+        run = db.query(RobustnessRun).filter(RobustnessRun.id == robustness_run_id).first()
+        if run is None:
+            logger.warning(f"robustness batch: run {robustness_run_id} not found")
+            return []
+        variant_ids = list(run.variant_backtest_ids or [])
+        shared = SharedRunState()
+        paused: Optional[str] = None
+        for i, vid in enumerate(variant_ids):
+            bt = db.query(Backtest).filter(Backtest.id == vid).first()
+            if bt is None or bt.status in _TERMINAL:
+                continue
+            if paused is not None:
+                _fail(db, bt, f"paused: {paused}")
+                continue
+            bt.status = "running"
+            bt.started_at = datetime.now()
+            bt.error_message = None
+            db.commit()
+
+            def _variant_progress(pct: float, msg: str, _i: int = i, _name: str = bt.name) -> None:
+                progress((_i + pct / 100.0) / len(variant_ids) * 100.0, f"{_name}: {msg}")
+
+            try:
+                config = build_rerun_config(db, bt)
+                results = run_daily_backtest(config, progress_cb=_variant_progress, shared=shared)
+                _persist_results(db, bt, results)
+                bt.status = "completed"
+                bt.completed_at = datetime.now()
+                db.commit()
+                completed.append(vid)
+            except _Paused as e:
+                paused = str(e)
+                db.rollback()
+                _fail(db, db.query(Backtest).filter(Backtest.id == vid).first(), f"paused: {e}")
+            except Exception as e:  # noqa: BLE001 — one variant must not sink its siblings
+                logger.error(f"robustness batch variant {vid} failed: {e}", exc_info=True)
+                db.rollback()
+                row = db.query(Backtest).filter(Backtest.id == vid).first()
+                if row is not None:
+                    _fail(db, row, str(e))
+        logger.info(
+            f"robustness schedule run {robustness_run_id}: batch ran {len(variant_ids)} variants "
+            f"in one worker ({len(completed)} completed, "
+            f"{len(shared.recommendations)} shared recommendations)"
+        )
+    finally:
+        db.close()
+    collect_schedule_results(robustness_run_id)
+    return completed
+
+
+def handle_schedule_variant_batch(task_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Task handler (``BATCH_TASK_TYPE``): ``run_schedule_variant_batch`` for
+    ``payload['robustness_run_id']`` with pause/progress wired through the re-run queue."""
+    from app.services.backtest.daily_backtest_handler import _Paused
+
+    run_id = payload.get("robustness_run_id")
+    if run_id is None:
+        return {"status": "failed", "error": "payload.robustness_run_id is required"}
+    tq = get_rerun_task_queue()
+
+    def progress(pct: float, msg: str) -> None:
+        if tq.is_task_paused(task_id):
+            raise _Paused(msg)
+        tq.update_progress(task_id, pct, msg)
+
+    completed = run_schedule_variant_batch(int(run_id), progress)
+    return {"status": "completed", "robustness_run_id": run_id, "completed_backtest_ids": completed}
+
+
 # ---------------------------------------------------------------------------
 # Collector
 # ---------------------------------------------------------------------------
@@ -0,0 +1,150 @@
+"""
+Closed-form rolling least-squares line fits.
+
+Fits ``y = intercept + slope * x`` over every trailing window of a series, where ``x`` is
+the bar's position inside its window (0 .. window-1, as ``np.arange(window)`` in the old
+per-window slope helpers). Instead of calling a Python function per window
+(``rolling().apply``), every statistic comes from differences of cumulative sums:
+
+    n, sum(x), sum(x*x)          integer cumsums over the valid (non-NaN) bars -- exact
+    sum(y), sum(y*y), sum(x*y)   float cumsums of y minus a local offset
+
+so a window costs O(1) regardless of its length, and several window lengths share one
+pass over the data.
+
+Precision: plain prefix sums over a long 5m series grow large enough that subtracting
+them cancels most significant digits. The series is therefore processed in blocks of
+``_BLOCK_BARS`` (at least 4x the longest window) with sums restarted at each block's
+first needed bar and y centred on the block mean, keeping every difference well
+conditioned. Each block costs a few numpy calls; total work stays O(n) per window.
+
+NaN handling: a NaN bar is left out of its windows and the remaining bars keep their
+positions. A window with fewer than ``min_periods`` valid bars yields NaN (default
+``min_periods`` = window, i.e. any NaN in the window gives NaN -- the behaviour of
+``rolling(window).apply``). Undefined statistics (``r2`` of a flat window, ``resid_std``
+with fewer than 3 bars) are NaN.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+# Bars per block of restarted cumulative sums (raised to 4x the longest window)
+_BLOCK_BARS = 1024
+
+
+@dataclass
+class RollingOLS:
+    """Per-bar fit over the window ending at that bar (NaN where the window is not valid)."""
+    window: int
+    slope: np.ndarray
+    intercept: np.ndarray   # fitted value at the window's first bar (x = 0)
+    r2: np.ndarray
+    resid_std: np.ndarray   # sqrt(SSE / (nobs - 2))
+    mean: np.ndarray        # mean of the window's valid y values
+    nobs: np.ndarray        # valid bars in the window
+
+    @property
+    def endpoint(self) -> np.ndarray:
+        """Fitted value at the window's last bar (the current bar)."""
+        return self.intercept + self.slope * (self.window - 1)
+
+
+def rolling_ols(
+    values: Union[np.ndarray, Iterable[float]],
+    windows: Union[int, Iterable[int]],
+    min_periods: Optional[int] = None,
+) -> Dict[int, RollingOLS]:
+    """
+    Rolling OLS of ``values`` against bar position for one or more window lengths.
+
+    Args:
+        values: 1-D series (NaN allowed)
+        windows: Window length or lengths (each >= 2)
+        min_periods: Minimum valid bars per window (>= 2; capped at each window;
+            default: the window length)
+
+    Returns:
+        Dict window -> RollingOLS, arrays aligned with ``values``
+    """
+    y = np.asarray(values, dtype=np.float64)
+    if y.ndim != 1:
+        raise ValueError("rolling_ols expects a 1-D series")
+    wins = sorted({int(w) for w in ([windows] if np.isscalar(windows) else windows)})
+    if not wins or wins[0] < 2:
+        raise ValueError(f"Window lengths must be >= 2, got {wins}")
+    if min_periods is not None and min_periods < 2:
+        raise ValueError(f"min_periods must be >= 2, got {min_periods}")
+
+    n = len(y)
+    out = {}
+    for w in wins:
+        out[w] = RollingOLS(
+            window=w,
+            slope=np.full(n, np.nan), intercept=np.full(n, np.nan), r2=np.full(n, np.nan),
+            resid_std=np.full(n, np.nan), mean=np.full(n, np.nan), nobs=np.zeros(n, dtype=np.int64),
+        )
+    if n == 0:
+        return out
+
+    max_w = wins[-1]
+    block = max(_BLOCK_BARS, 4 * max_w)
+    valid_all = ~np.isnan(y)
+
+    for b0 in range(0, n, block):
+        b1 = min(n, b0 + block)
+        lo = max(0, b0 - max_w + 1)
+        seg = y[lo:b1]
+        valid = valid_all[lo:b1]
+        offset = float(seg[valid].mean()) if valid.any() else 0.0
+        yc = np.where(valid, seg - offset, 0.0)
+        pos = np.arange(len(seg), dtype=np.int64)
+        m = valid.astype(np.int64)
+
+        def _prefix(a):
+            return np.concatenate(([0], np.cumsum(a)))
+
+        c_n, c_x, c_xx = _prefix(m), _prefix(pos * m), _prefix(pos * pos * m)
+        c_y, c_yy, c_xy = _prefix(yc), _prefix(yc * yc), _prefix(pos * yc)
+
+        for w in wins:
+            first = max(b0, w - 1)            # first bar with a full window
+            if first >= b1:
+                continue
+            end = np.arange(first, b1, dtype=np.int64) - lo + 1   # exclusive prefix index
+            start = end - w                                        # local position of x = 0
+
+            nobs = c_n[end] - c_n[start]
+            sx = c_x[end] - c_x[start]
+            sxx = c_xx[end] - c_xx[start]
+            # Shift x to window coordinates exactly (integers), then go to float
+            sx_r = sx - nobs * start
+            sxx_r = sxx - 2 * start * sx + nobs * start * start
+            sy = c_y[end] - c_y[start]
+            syy = c_yy[end] - c_yy[start]
+            sxy_r = (c_xy[end] - c_xy[start]) - start * sy
+
+            need = w if min_periods is None else min(min_periods, w)
+            ok = nobs >= need
+            with np.errstate(divide="ignore", invalid="ignore"):
+                nf = nobs.astype(np.float64)
+                mean_x = sx_r / nf
+                mean_y = sy / nf
+                vxx = sxx_r - sx_r * mean_x
+                vyy = np.maximum(syy - sy * mean_y, 0.0)
+                vxy = sxy_r - sx_r * mean_y
+                slope = vxy / vxx
+                sse = np.maximum(vyy - slope * vxy, 0.0)
+                r2 = np.where(vyy > 0, (vxy * vxy) / (vxx * vyy), np.nan)
+                resid_std = np.where(nobs > 2, np.sqrt(sse / (nf - 2)), np.nan)
+
+            res = out[w]
+            sl = slice(first, b1)
+            res.nobs[sl] = nobs
+            res.slope[sl] = np.where(ok, slope, np.nan)
+            res.intercept[sl] = np.where(ok, mean_y + offset - slope * mean_x, np.nan)
+            res.r2[sl] = np.where(ok, np.minimum(r2, 1.0), np.nan)
+            res.resid_std[sl] = np.where(ok, resid_std, np.nan)
+            res.mean[sl] = np.where(ok, mean_y + offset, np.nan)
+    return out
@@ -61,16 +61,23 @@ class SentimentService:
     # Default financial sentiment model
     DEFAULT_MODEL = 'ProsusAI/finbert'
 
-    def __init__(self, model_name: str = None, use_cache: bool = True):
+    # Truncation length, as the original per-article pipeline used
+    MAX_LENGTH = 512
+
+    def __init__(self, model_name: str = None, use_cache: bool = True, batch_size: int = 32):
         """
         Initialize SentimentService.
 
         Args:
             model_name: Hugging Face model name for sentiment analysis
             use_cache: Whether to use news caching (default: True)
+            batch_size: Texts per forward pass at full length (shorter texts are packed
+                into larger batches under the same token budget)
         """
         self.model_name = model_name or self.DEFAULT_MODEL
+        self.batch_size = batch_size
         self._pipeline = None
+        self._scorer = None
         self._initialized = False
         self.use_cache = use_cache and CACHE_AVAILABLE
         self._cache_service = None
@@ -93,6 +100,22 @@ class SentimentService:
             self._initialized = True
             return
 
+        try:
+            # Models in the shared registry go through its batched scorer, whose scores are
+            # cached by text hash (shared with the news store's scoring); anything else
+            # uses a plain transformers pipeline.
+            from ba2_providers.news import sentiment as news_sentiment
+
+            key = news_sentiment.model_key_for(self.model_name)
+            if key is not None:
+                self._scorer = news_sentiment.Scorer(
+                    key, batch_size=self.batch_size, max_length=self.MAX_LENGTH)
+                self._initialized = True
+                logger.info(f"Sentiment scoring via shared batched scorer ({key})")
+                return
+        except ImportError:
+            pass
+
         try:
             logger.info(f"Loading sentiment model: {self.model_name}")
             self._pipeline = pipeline(
@@ -118,30 +141,75 @@ class SentimentService:
         Returns:
             Dictionary with sentiment label, score, and probabilities
         """
+        return self.analyze_texts([text])[0]
+
+    def analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze sentiment of many texts in batches.
+
+        Registry models are scored through the persistent text-score cache, so a text
+        already scored by the same model version (in any dataset build, backtest or news
+        store re-score) is not run through the model again.
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            One result per text, in order, shaped like ``analyze_text``
+        """
         self._initialize_pipeline()
+        if not texts:
+            return []
+
+        if self._scorer is not None:
+            try:
+                from ba2_providers.news import sentiment as news_sentiment
+
+                probs = news_sentiment.score_texts_cached(
+                    texts, self._scorer.model, max_length=self.MAX_LENGTH, scorer=self._scorer)
+                return [self._from_probs(p, u, n)
+                        for p, u, n in probs[['pos', 'neu', 'neg']].itertuples(index=False)]
+            except Exception as e:
+                logger.error(f"Sentiment analysis error: {e}")
+                return [self._fallback_sentiment(t) for t in texts]
 
         if self._pipeline is None:
             # Fallback: simple keyword-based sentiment
-            return self._fallback_sentiment(text)
+            return [self._fallback_sentiment(t) for t in texts]
 
         try:
-            result = self._pipeline(text)[0]
+            results = self._pipeline(list(texts), batch_size=self.batch_size)
+        except Exception as e:
+            logger.error(f"Sentiment analysis error: {e}")
+            return [self._fallback_sentiment(t) for t in texts]
 
+        out = []
+        for result in results:
             # Map FinBERT labels to standard format
             label = result['label'].lower()
             score = result['score']
-
-            return {
+            out.append({
                 'label': label,
                 'score': score,
                 'positive_prob': score if label == 'positive' else 0.0,
                 'neutral_prob': score if label == 'neutral' else 0.0,
                 'negative_prob': score if label == 'negative' else 0.0
-            }
+            })
+        return out
 
-        except Exception as e:
-            logger.error(f"Sentiment analysis error: {e}")
-            return self._fallback_sentiment(text)
+    @staticmethod
+    def _from_probs(pos: float, neu: float, neg: float) -> Dict[str, Any]:
+        """Top-label result from a probability triple (same shape as the pipeline's)."""
+        label, score = max((('positive', pos), ('neutral', neu), ('negative', neg)),
+                           key=lambda kv: kv[1])
+        score = float(score)
+        return {
+            'label': label,
+            'score': score,
+            'positive_prob': score if label == 'positive' else 0.0,
+            'neutral_prob': score if label == 'neutral' else 0.0,
+            'negative_prob': score if label == 'negative' else 0.0
+        }
 
     def _fallback_sentiment(self, text: str) -> Dict[str, Any]:
         """
@@ -189,10 +257,10 @@ class SentimentService:
         Returns:
             List of articles with sentiment added
         """
-        results = []
-        analyzed_count = 0
+        results: List[Optional[Dict[str, Any]]] = []
         cached_count = 0
         sentiment_updates = []  # Collect updates for batch processing
+        pending = []  # (position in results, article, text) still to analyze
 
         for i, article in enumerate(articles):
             url = article.get('url', '')
@@ -234,32 +302,39 @@ class SentimentService:
             logger.debug(f"[Article {i+1}/{len(articles)}] Title: {title}")
             logger.debug(f"[Article {i+1}/{len(articles)}] Content preview: {content[:200]}...")
 
-            sentiment = self.analyze_text(text)
-
-            # Debug log: sentiment result
-            logger.debug(
-                f"[Article {i+1}/{len(articles)}] Sentiment: {sentiment['label']} "
-                f"(score={sentiment['score']:.3f}, pos={sentiment['positive_prob']:.3f}, "
-                f"neu={sentiment['neutral_prob']:.3f}, neg={sentiment['negative_prob']:.3f})"
-            )
-
-            result = {
-                **article,
-                'sentiment': sentiment['label'],
-                'sentiment_score': sentiment['score'],
-                'positive_prob': sentiment['positive_prob'],
-                'neutral_prob': sentiment['neutral_prob'],
-                'negative_prob': sentiment['negative_prob']
-            }
-            results.append(result)
-            analyzed_count += 1
-
-            # Collect cache update for batch processing
-            if self.use_cache and self._cache_service and url:
-                sentiment_updates.append((url, sentiment))
+            results.append(None)
+            pending.append((i, article, text))
+
+        # Score everything that missed the caches together (batched forward passes rather
+        # than one per article), in chunks so progress is still reported.
+        step = max(1, self.batch_size * 8)
+        for start in range(0, len(pending), step):
+            chunk = pending[start:start + step]
+            sentiments = self.analyze_texts([text for _, _, text in chunk])
+            for (i, article, _), sentiment in zip(chunk, sentiments):
+                # Debug log: sentiment result
+                logger.debug(
+                    f"[Article {i+1}/{len(articles)}] Sentiment: {sentiment['label']} "
+                    f"(score={sentiment['score']:.3f}, pos={sentiment['positive_prob']:.3f}, "
+                    f"neu={sentiment['neutral_prob']:.3f}, neg={sentiment['negative_prob']:.3f})"
+                )
+                results[i] = {
+                    **article,
+                    'sentiment': sentiment['label'],
+                    'sentiment_score': sentiment['score'],
+                    'positive_prob': sentiment['positive_prob'],
+                    'neutral_prob': sentiment['neutral_prob'],
+                    'negative_prob': sentiment['negative_prob']
+                }
+
+                # Collect cache update for batch processing
+                url = article.get('url', '')
+                if self.use_cache and self._cache_service and url:
+                    sentiment_updates.append((url, sentiment))
 
-            if progress_callback and ((i + 1) % 10 == 0 or i + 1 == len(articles)):
-                progress_callback(i + 1, len(articles))
+            if progress_callback:
+                progress_callback(cached_count + start + len(chunk), len(articles))
+        analyzed_count = len(pending)
 
         # Batch update sentiment in cache (reduces DB lock contention)
         if sentiment_updates and self._cache_service:
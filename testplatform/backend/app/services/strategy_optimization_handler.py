@@ -1738,6 +1738,7 @@ def _build_daily_trial_config(
     from app.services.backtest.daily_backtest_handler import (
         strategy_uses_options,
         default_options_cache_db,
+        default_iv_surface_dir,
         validate_options_window,
     )
 
@@ -1749,8 +1750,13 @@ def _build_daily_trial_config(
     if not options_cache_db and strategy_uses_options(
         {"exit_rules": decoded.get("exit_rules"), "entry_action": entry_action}
     ):
-        options_cache_db = default_options_cache_db()
+        options_cache_db = default_options_cache_db(backtest_cfg.get("enabled_instruments"))
     validate_options_window(backtest_cfg["start_date"], bool(options_cache_db))
+    # Same IV-surface resolution as the single run, so IV-rank gates read the prebuilt surface
+    # (not the account's snapshot fallback) for every individual too.
+    iv_surface_dir = backtest_cfg.get("iv_surface_dir")
+    if options_cache_db and not iv_surface_dir:
+        iv_surface_dir = default_iv_surface_dir(options_cache_db)
 
     # BYPASS-expert screener wiring: a bypass expert (e.g. FactorRanker) builds its DYNAMIC
     # universe from the fast metric_store by reading ``universe_source`` / ``screener_store`` /
@@ -1913,6 +1919,8 @@ def _build_daily_trial_config(
         # option exit rule (and its option_delta/option_dte genes) can fetch a chain. None for an
         # equity-only trial (byte-identical to the prior behaviour).
         "options_cache_db": options_cache_db,
+        # Prebuilt IV surfaces for that cache (None -> IV rank falls back to the account mixin).
+        "iv_surface_dir": iv_surface_dir,
         # SCREENER seam: the per-individual effective screener settings + store path the engine
         # uses to gate entries to the per-day screened universe. None for non-screener runs.
         "screener_runtime": screener_runtime,
@@ -1928,6 +1936,7 @@ def _run_ml_trial_backtest(
     requested with a real model/datasets present.
     """
     from app.services.backtest_handler import run_backtest, _empty_results
+    from app.services.dataset_store import read_dataset
     import pandas as pd
 
     db = SessionLocal()
@@ -1945,8 +1954,8 @@ def _run_ml_trial_backtest(
         ).first()
         if not (model and pred and exe):
             return _empty_results(float(backtest_cfg.get("initial_capital", 10000.0)))
-        pred_df = pd.read_csv(pred.file_path)
-        exec_df = pd.read_csv(exe.file_path)
+        pred_df = read_dataset(pred.file_path)
+        exec_df = read_dataset(exe.file_path)
         for df in (pred_df, exec_df):
             if "Date" in df.columns:
                 df["Date"] = pd.to_datetime(df["Date"])
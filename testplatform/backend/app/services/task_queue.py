@@ -887,7 +887,7 @@ def get_rerun_task_queue() -> TaskQueueService:
     if _rerun_task_queue is None:
         _rerun_task_queue = TaskQueueService(
             max_workers=2,
-            task_types=['rerun_backtest'],
+            task_types=['rerun_backtest', 'robustness_schedule_batch'],
             name="RerunTaskQueue",
         )
     return _rerun_task_queue
@@ -900,7 +900,7 @@ def init_rerun_task_queue(max_workers: int = 2):
     global _rerun_task_queue
     _rerun_task_queue = TaskQueueService(
         max_workers=max(1, int(max_workers)),
-        task_types=['rerun_backtest'],
+        task_types=['rerun_backtest', 'robustness_schedule_batch'],
         name="RerunTaskQueue",
     )
     if os.getenv('PYTEST_CURRENT_TEST') is None:
@@ -25,6 +25,8 @@ from typing import Dict, List, Any, Optional, Literal
 from enum import Enum
 import logging
 
+from app.services.rolling_ols import rolling_ols
+
 logger = logging.getLogger(__name__)
 
 
@@ -183,50 +185,29 @@ class TrendTargetService:
         df: pd.DataFrame,
         lookback_period: int = 20
     ) -> pd.DataFrame:
-        """Detect trends using linear regression slope."""
-        result_df = df.copy()
-
-        def calc_slope(series):
-            if len(series) < 2 or series.isna().all():
-                return 0.0
-            y = series.values
-            x = np.arange(len(y))
-
-            # Remove NaN values
-            mask = ~np.isnan(y)
-            if mask.sum() < 2:
-                return 0.0
+        """Detect trends using linear regression slope.
 
-            x_clean = x[mask]
-            y_clean = y[mask]
-
-            # Calculate slope using least squares
-            n = len(x_clean)
-            slope = (n * np.sum(x_clean * y_clean) - np.sum(x_clean) * np.sum(y_clean)) / \
-                    (n * np.sum(x_clean ** 2) - np.sum(x_clean) ** 2)
-
-            # Normalize by price level
-            return slope / np.mean(y_clean) * 100
+        The slope is normalised by the window's mean price (% per bar), from
+        ``rolling_ols`` (closed form, O(n)); a window containing a NaN gives NaN.
+        """
+        result_df = df.copy()
 
-        # Calculate rolling slope
-        result_df['_slope'] = result_df['Close'].rolling(window=lookback_period).apply(calc_slope, raw=False)
+        if lookback_period < 2:
+            slope = np.zeros(len(result_df))  # a single-bar window has no slope
+        else:
+            fit = rolling_ols(result_df['Close'].to_numpy(dtype=np.float64), lookback_period)[lookback_period]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = fit.slope / fit.mean * 100
 
         # Trend strength is absolute slope
-        result_df['trend_strength'] = result_df['_slope'].abs()
-
-        # Classify based on slope
-        def classify_slope_trend(slope):
-            if pd.isna(slope):
-                return TrendType.SIDEWAYS.value
-            if slope > 0.1:  # Positive slope
-                return TrendType.UPTREND.value
-            elif slope < -0.1:  # Negative slope
-                return TrendType.DOWNTREND.value
-            else:
-                return TrendType.SIDEWAYS.value
-
-        result_df['trend_current'] = result_df['_slope'].apply(classify_slope_trend)
-        result_df = result_df.drop(columns=['_slope'])
+        result_df['trend_strength'] = np.abs(slope)
+
+        # Classify based on slope (NaN -> sideways)
+        result_df['trend_current'] = np.select(
+            [slope > 0.1, slope < -0.1],
+            [TrendType.UPTREND.value, TrendType.DOWNTREND.value],
+            default=TrendType.SIDEWAYS.value
+        ).astype(object)
 
         return result_df
 
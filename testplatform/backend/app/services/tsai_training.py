@@ -23,6 +23,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import json
 
 from app.services.data_preparation import DataPreparationService
+from app.services.windowed_dataset import SlidingWindowDataset, joint_arrays, memmap_features
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,8 @@ class TSAITrainingService(ITrainingService):
     Scaler parameters are saved with the model for inference.
     """
 
-    def __init__(self, models_dir: str = None, normalize: bool = True, buffer_pct: float = 0.35):
+    def __init__(self, models_dir: str = None, normalize: bool = True, buffer_pct: float = 0.35,
+                 windows_dir: Optional[str] = None):
         """Initialize TSAITrainingService.
 
         Args:
@@ -68,6 +70,8 @@ class TSAITrainingService(ITrainingService):
                 test-bucket models dir (app.paths.MODELS_DIR) — not the repo/CWD.
             normalize: Whether to apply per-feature normalization (required for MiniRocket)
             buffer_pct: Extra room above/below observed min/max for price normalization (default 35%)
+            windows_dir: Optional directory for memory-mapped feature arrays backing the
+                windowed datasets (prepare_windowed_split); None keeps them in RAM
         """
         if models_dir is None:
             from app.paths import MODELS_DIR
@@ -78,6 +82,7 @@ class TSAITrainingService(ITrainingService):
         self.normalize = normalize
         self.buffer_pct = buffer_pct
         self.data_prep = None  # DataPreparationService instance, fitted on training data
+        self.windows_dir = Path(windows_dir) if windows_dir else None
 
     def prepare_data(
         self,
@@ -116,6 +121,27 @@ class TSAITrainingService(ITrainingService):
         if not TSAI_AVAILABLE:
             raise RuntimeError("tsai library not available")
 
+        X_data, y_data = self._feature_arrays(df, target_column, feature_columns, fit_scaler)
+
+        # Create sliding window sequences with prediction horizon
+        if prediction_mode == 'multistep':
+            if prediction_horizon < 1:
+                raise ValueError("Multi-step mode requires prediction_horizon >= 1")
+            X, y = self._create_sequences_multistep(X_data, y_data, seq_len, prediction_horizon)
+        else:
+            X, y = self._create_sequences(X_data, y_data, seq_len, prediction_horizon)
+
+        logger.info(f"Prepared data: X shape {X.shape}, y shape {y.shape}, horizon={prediction_horizon}, mode={prediction_mode}, normalized={self.normalize}")
+        return X, y
+
+    def _feature_arrays(
+        self,
+        df: pd.DataFrame,
+        target_column: str,
+        feature_columns: List[str],
+        fit_scaler: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Normalized float32 feature rows (n_rows, n_features) and int64 targets of ``df``."""
         # Extract target
         y_data = df[target_column].values.astype(np.int64)
 
@@ -141,17 +167,7 @@ class TSAITrainingService(ITrainingService):
             X_data = df_normalized[valid_cols].values.astype(np.float32)
         else:
             X_data = df[feature_columns].values.astype(np.float32)
-
-        # Create sliding window sequences with prediction horizon
-        if prediction_mode == 'multistep':
-            if prediction_horizon < 1:
-                raise ValueError("Multi-step mode requires prediction_horizon >= 1")
-            X, y = self._create_sequences_multistep(X_data, y_data, seq_len, prediction_horizon)
-        else:
-            X, y = self._create_sequences(X_data, y_data, seq_len, prediction_horizon)
-
-        logger.info(f"Prepared data: X shape {X.shape}, y shape {y.shape}, horizon={prediction_horizon}, mode={prediction_mode}, normalized={self.normalize}")
-        return X, y
+        return X_data, y_data
 
     def prepare_data_split(
         self,
@@ -195,26 +211,67 @@ class TSAITrainingService(ITrainingService):
             _ = self.data_prep.fit_transform(df, feature_columns, method="minmax_buffered")
             logger.info(f"Fitted normalization on full dataset ({len(df)} samples) before split")
 
-        # Split DataFrame
-        split_idx = int(len(df) * train_ratio)
-        df_train = df.iloc[:split_idx]
-        df_test = df.iloc[split_idx:]
-
-        # Prepare train data (scaler already fitted on full data)
-        X_train, y_train = self.prepare_data(
-            df_train, target_column, feature_columns, timeframe, seq_len,
-            prediction_horizon, prediction_mode, fit_scaler=False
-        )
-
-        # Prepare test data (use same fitted scaler)
-        X_test, y_test = self.prepare_data(
-            df_test, target_column, feature_columns, timeframe, seq_len,
-            prediction_horizon, prediction_mode, fit_scaler=False
+        train_ds, test_ds = self._windowed_split(
+            df, train_ratio, target_column, feature_columns, seq_len, prediction_horizon, prediction_mode
         )
+        X_train, X_test, y_train, y_test = train_ds.X, test_ds.X, train_ds.y, test_ds.y
 
         logger.info(f"Split data: train={len(X_train)}, test={len(X_test)}, horizon={prediction_horizon}, mode={prediction_mode}")
         return X_train, X_test, y_train, y_test
 
+    def prepare_windowed_split(
+        self,
+        df: pd.DataFrame,
+        train_ratio: float,
+        target_column: str,
+        feature_columns: List[str],
+        seq_len: int = 24,
+        prediction_horizon: int = 0,
+        prediction_mode: str = 'shift',
+        name: Optional[str] = None
+    ) -> Tuple[SlidingWindowDataset, SlidingWindowDataset]:
+        """
+        Like prepare_data_split, but returns train/test SlidingWindowDatasets.
+
+        Both share one normalized feature array (memory-mapped under ``windows_dir`` when
+        set, as ``<name>.npy``); windows are strided views, so memory grows with the
+        number of rows, not rows x seq_len. Pass both to train_model / assess_model.
+        """
+        if not TSAI_AVAILABLE:
+            raise RuntimeError("tsai library not available")
+
+        if self.normalize:
+            self.data_prep = DataPreparationService(buffer_pct=self.buffer_pct)
+            _ = self.data_prep.fit_transform(df, feature_columns, method="minmax_buffered")
+            logger.info(f"Fitted normalization on full dataset ({len(df)} samples) before split")
+
+        train_ds, test_ds = self._windowed_split(
+            df, train_ratio, target_column, feature_columns, seq_len, prediction_horizon,
+            prediction_mode, name=name
+        )
+        logger.info(f"Windowed split: train={len(train_ds)}, test={len(test_ds)}, horizon={prediction_horizon}, mode={prediction_mode}")
+        return train_ds, test_ds
+
+    def _windowed_split(
+        self, df: pd.DataFrame, train_ratio: float, target_column: str,
+        feature_columns: List[str], seq_len: int, prediction_horizon: int,
+        prediction_mode: str, name: Optional[str] = None
+    ) -> Tuple[SlidingWindowDataset, SlidingWindowDataset]:
+        """Train/test windows over one feature array (scaler must already be fitted).
+
+        Same samples as windowing df.iloc[:split] and df.iloc[split:] separately.
+        """
+        if prediction_mode == 'multistep' and prediction_horizon < 1:
+            raise ValueError("Multi-step mode requires prediction_horizon >= 1")
+        X_data, y_data = self._feature_arrays(df, target_column, feature_columns, fit_scaler=False)
+        if self.windows_dir is not None:
+            fname = f"{name or f'windows_{id(self)}'}_{prediction_mode}_{seq_len}.npy"
+            X_data = memmap_features(X_data, self.windows_dir / fname)
+        split_idx = int(len(df) * train_ratio)
+        return SlidingWindowDataset.split(
+            X_data, y_data, split_idx, seq_len, prediction_horizon, prediction_mode
+        )
+
     def prepare_multi_dataset_split(
         self, dataframes: List[pd.DataFrame], train_ratio: float,
         target_column: str, feature_columns: List[str],
@@ -285,36 +342,17 @@ class TSAITrainingService(ITrainingService):
             prediction_horizon: How many bars ahead to predict (0 = predict at end of sequence)
 
         Returns:
-            X_seq: Sequences of shape (n_samples, n_features, seq_len)
+            X_seq: Sequences of shape (n_samples, n_features, seq_len) -- a read-only
+                strided view over X, not a copy
             y_seq: Targets of shape (n_samples,)
 
         Example with seq_len=24, prediction_horizon=3:
             Input: Bars T-23 to T (24 bars)
             Target: Class label at bar T+3
         """
-        # Account for prediction_horizon when calculating valid samples
-        # We need seq_len bars for input, plus prediction_horizon bars for the target
-        n_samples = len(X) - seq_len - prediction_horizon + 1
-
-        if n_samples <= 0:
-            raise ValueError(
-                f"Not enough data: need at least {seq_len + prediction_horizon} rows, got {len(X)}"
-            )
-
-        n_features = X.shape[1]
-
-        # Shape: (samples, features, seq_len) for tsai
-        X_seq = np.zeros((n_samples, n_features, seq_len), dtype=np.float32)
-        y_seq = np.zeros(n_samples, dtype=np.int64)
-
-        for i in range(n_samples):
-            # Transpose to get (features, seq_len)
-            X_seq[i] = X[i:i+seq_len].T
-            # Target is prediction_horizon bars AFTER the end of the input sequence
-            # End of sequence is at index i+seq_len-1, so target is at i+seq_len-1+prediction_horizon
-            y_seq[i] = y[i + seq_len - 1 + prediction_horizon]
-
-        return X_seq, y_seq
+        # Windows are strided views over X (no per-window copy); see windowed_dataset
+        ds = SlidingWindowDataset(np.asarray(X, dtype=np.float32), y, seq_len, prediction_horizon)
+        return ds.X, ds.y
 
     def _create_sequences_multistep(
         self,
@@ -332,30 +370,17 @@ class TSAITrainingService(ITrainingService):
             prediction_horizon: Number of future steps to predict
 
         Returns:
-            X_seq: Sequences of shape (n_samples, n_features, seq_len)
+            X_seq: Sequences of shape (n_samples, n_features, seq_len) -- a read-only
+                strided view over X, not a copy
             y_seq: Multi-step targets of shape (n_samples, prediction_horizon)
 
         Example with seq_len=24, prediction_horizon=3:
             Input: Bars T-23 to T (24 bars)
             Targets: [y[T+1], y[T+2], y[T+3]] - class labels at each future step
         """
-        n_samples = len(X) - seq_len - prediction_horizon + 1
-
-        if n_samples <= 0:
-            raise ValueError(
-                f"Not enough data: need at least {seq_len + prediction_horizon} rows, got {len(X)}"
-            )
-
-        n_features = X.shape[1]
-        X_seq = np.zeros((n_samples, n_features, seq_len), dtype=np.float32)
-        y_seq = np.zeros((n_samples, prediction_horizon), dtype=np.float32)
-
-        for i in range(n_samples):
-            X_seq[i] = X[i:i+seq_len].T
-            for h in range(prediction_horizon):
-                y_seq[i, h] = y[i + seq_len + h]
-
-        return X_seq, y_seq
+        ds = SlidingWindowDataset(np.asarray(X, dtype=np.float32), y, seq_len, prediction_horizon,
+                                  mode='multistep')
+        return ds.X, ds.y
 
     def get_loss_function(
         self,
@@ -438,8 +463,8 @@ class TSAITrainingService(ITrainingService):
 
         Args:
             model: tsai model architecture (nn.Module)
-            train_data: Tuple of (X_train, y_train)
-            val_data: Optional tuple of (X_val, y_val)
+            train_data: Tuple of (X_train, y_train), or a SlidingWindowDataset
+            val_data: Optional tuple of (X_val, y_val), or the matching SlidingWindowDataset
             epochs: Number of training epochs
             batch_size: Batch size
             learning_rate: Learning rate
@@ -456,10 +481,15 @@ class TSAITrainingService(ITrainingService):
             return {'status': 'failed', 'error': 'tsai not available'}
 
         try:
-            X_train, y_train = train_data
-
+            if isinstance(train_data, SlidingWindowDataset):
+                # Windowed datasets: the dataloaders index the shared strided window view
+                # through `splits`, so only the batches in flight are ever materialised.
+                X_all, y_all, splits = joint_arrays(
+                    train_data, val_data if isinstance(val_data, SlidingWindowDataset) else None
+                )
             # Combine train and val for dataloaders
-            if val_data is not None:
+            elif val_data is not None:
+                X_train, y_train = train_data
                 X_val, y_val = val_data
                 X_all = np.concatenate([X_train, X_val])
                 y_all = np.concatenate([y_train, y_val])
@@ -467,6 +497,7 @@ class TSAITrainingService(ITrainingService):
                 splits = (list(range(len(X_train))),
                          list(range(len(X_train), len(X_all))))
             else:
+                X_train, y_train = train_data
                 X_all, y_all = X_train, y_train
                 # 80/20 split if no validation provided
                 split_idx = int(len(X_all) * 0.8)
@@ -597,7 +628,10 @@ class TSAITrainingService(ITrainingService):
             return {'error': 'tsai not available'}
 
         try:
-            X_test, y_test = test_data
+            if isinstance(test_data, SlidingWindowDataset):
+                X_test, y_test = test_data, test_data.y
+            else:
+                X_test, y_test = test_data
             learner = kwargs.get('learner')
 
             # Always use direct inference to avoid batch size issues with learner.get_X_preds
@@ -605,20 +639,13 @@ class TSAITrainingService(ITrainingService):
             if learner is not None:
                 model = learner.model
 
-            model.eval()
-            with torch.no_grad():
-                X_tensor = torch.tensor(X_test, dtype=torch.float32)
-                if DEVICE:
-                    X_tensor = X_tensor.to(DEVICE)
-                    model = model.to(DEVICE)
-                outputs = model(X_tensor)
-
-                if prediction_mode == 'multistep':
-                    # Multi-step: sigmoid for each output
-                    probs = torch.sigmoid(outputs).cpu().numpy()
-                else:
-                    # Shift: softmax for binary classification
-                    probs = torch.softmax(outputs, dim=1)[:, 1].cpu().numpy()
+            outputs = self._infer(model, X_test)
+            if prediction_mode == 'multistep':
+                # Multi-step: sigmoid for each output
+                probs = torch.sigmoid(outputs).numpy()
+            else:
+                # Shift: softmax for binary classification
+                probs = torch.softmax(outputs, dim=1)[:, 1].numpy()
 
             # Check for NaN in predictions (can happen with exploding gradients)
             if np.isnan(probs).any():
@@ -745,21 +772,35 @@ class TSAITrainingService(ITrainingService):
         if learner is not None:
             model = learner.model
 
+        outputs = self._infer(model, X)
+        if prediction_mode == 'multistep':
+            # Multi-label: sigmoid for each output
+            probs = torch.sigmoid(outputs).numpy()
+        else:
+            # Classification: softmax to get probabilities for all classes
+            probs = torch.softmax(outputs, dim=1).numpy()
+        return probs
+
+    def _infer(self, model: Any, X: Any, batch_size: int = 4096) -> Any:
+        """Raw model outputs (CPU tensor) for X -- an array, strided window view or
+        SlidingWindowDataset -- fed in chunks so only one chunk is ever materialised."""
         model.eval()
+        if DEVICE:
+            model = model.to(DEVICE)
+        outputs = []
         with torch.no_grad():
-            X_tensor = torch.tensor(X, dtype=torch.float32)
-            if DEVICE:
-                X_tensor = X_tensor.to(DEVICE)
-                model = model.to(DEVICE)
-            outputs = model(X_tensor)
-
-            if prediction_mode == 'multistep':
-                # Multi-label: sigmoid for each output
-                probs = torch.sigmoid(outputs).cpu().numpy()
-            else:
-                # Classification: softmax to get probabilities for all classes
-                probs = torch.softmax(outputs, dim=1).cpu().numpy()
-        return probs
+            for lo in range(0, len(X), batch_size):
+                if isinstance(X, SlidingWindowDataset):
+                    chunk = X[np.arange(lo, min(lo + batch_size, len(X)))][0]
+                else:
+                    chunk = np.ascontiguousarray(X[lo:lo + batch_size])
+                X_tensor = torch.tensor(chunk, dtype=torch.float32)
+                if DEVICE:
+                    X_tensor = X_tensor.to(DEVICE)
+                outputs.append(model(X_tensor).cpu())
+        if not outputs:  # empty input: let the model define the output shape
+            return model(torch.zeros((0,) + tuple(X.shape[1:]), dtype=torch.float32)).cpu()
+        return torch.cat(outputs)
 
     def save_model(self, learner: Any, name: str, metadata: Dict = None) -> str:
         """
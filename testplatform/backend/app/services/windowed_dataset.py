@@ -0,0 +1,250 @@
+"""
+Sliding-window datasets over one contiguous feature array.
+
+Sequence models take samples shaped ``(n_features, seq_len)``: the ``seq_len`` rows ending
+at bar T, transposed. Materialising every window copies each row ``seq_len`` times, so a
+training set costs ``n_rows * n_features * seq_len`` floats before the first batch. Here
+every window is a view instead: ``np.lib.stride_tricks.sliding_window_view`` over the
+``(n_rows, n_features)`` feature array already has shape ``(n_windows, n_features,
+seq_len)`` with element ``[i, f, k] == features[i + k, f]``, so the sample axis costs no
+memory. Only a batch that is actually fed to a model is gathered into a contiguous copy.
+
+A dataset is that window view plus ``indices``: the window starts that are valid samples.
+Windows that would span a train/test split or a boundary between concatenated datasets
+are simply left out of ``indices`` -- train and test windows of one frame share one
+feature array, and tsai dataloaders can index the shared view with ``splits``.
+
+Feature arrays can be backed by a ``.npy`` file opened with ``mmap_mode='r'``, so the OS
+pages rows in on demand and peak RSS is bounded by the batches in flight.
+
+Targets follow ``TSAITrainingService`` conventions: ``'shift'`` takes the label
+``horizon`` bars after the window's last bar; ``'multistep'`` takes the ``horizon``
+labels right after it (as float32).
+"""
+
+import os
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ShuffledIndexSampler:
+    """Yields batches of sample positions; a new permutation every pass.
+
+    The permutation for pass ``k`` is drawn from ``seed + k``, so an interrupted run that
+    resumes at pass ``k`` sees the same batches it would have.
+    """
+
+    def __init__(self, n_samples: int, batch_size: int, shuffle: bool = True,
+                 seed: Optional[int] = None, drop_last: bool = False):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        self.n_samples = int(n_samples)
+        self.batch_size = int(batch_size)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.n_samples // self.batch_size
+        return -(-self.n_samples // self.batch_size)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        if self.shuffle:
+            seed = None if self.seed is None else self.seed + self.epoch
+            order = np.random.default_rng(seed).permutation(self.n_samples)
+        else:
+            order = np.arange(self.n_samples)
+        self.epoch += 1
+        stop = len(self) * self.batch_size if self.drop_last else self.n_samples
+        for lo in range(0, stop, self.batch_size):
+            yield order[lo:lo + self.batch_size]
+
+
+class SlidingWindowDataset:
+    """Zero-copy ``(features, seq_len)`` windows with their targets."""
+
+    def __init__(
+        self,
+        features: np.ndarray,
+        targets: np.ndarray,
+        seq_len: int,
+        horizon: int = 0,
+        mode: str = 'shift',
+        indices: Optional[np.ndarray] = None,
+    ):
+        """
+        Args:
+            features: ``(n_rows, n_features)`` array (ndarray or np.memmap), not copied
+            targets: ``(n_rows,)`` per-row labels
+            seq_len: Window length
+            horizon: Bars after the window's last bar to the (last) target
+            mode: ``'shift'`` (single target) or ``'multistep'`` (targets T+1..T+horizon)
+            indices: Window starts to use as samples (default: every window that has a target)
+        """
+        if features.ndim != 2:
+            raise ValueError(f"features must be 2-D (n_rows, n_features), got shape {features.shape}")
+        if mode == 'multistep' and horizon < 1:
+            raise ValueError("Multi-step mode requires prediction_horizon >= 1")
+        n_windows = len(features) - seq_len - horizon + 1
+        if n_windows <= 0:
+            raise ValueError(
+                f"Not enough data: need at least {seq_len + horizon} rows, got {len(features)}"
+            )
+        self.features = features
+        self.seq_len = int(seq_len)
+        self.horizon = int(horizon)
+        self.mode = mode
+
+        self.windows = np.lib.stride_tricks.sliding_window_view(features, seq_len, axis=0)[:n_windows]
+        targets = np.asarray(targets)
+        if mode == 'multistep':
+            # Row i: y[i+seq_len .. i+seq_len+horizon-1]; small (horizon per sample), so copied
+            self.labels = np.lib.stride_tricks.sliding_window_view(
+                targets[seq_len:], horizon)[:n_windows].astype(np.float32)
+        else:
+            offset = seq_len - 1 + horizon
+            self.labels = targets[offset:offset + n_windows].astype(np.int64, copy=False)
+
+        if indices is None:
+            self.indices = np.arange(n_windows, dtype=np.int64)
+        else:
+            self.indices = np.asarray(indices, dtype=np.int64)
+            if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= n_windows):
+                raise IndexError("window index out of range")
+
+    # ------------------------------------------------------------------ construction
+    @classmethod
+    def split(
+        cls,
+        features: np.ndarray,
+        targets: np.ndarray,
+        split_row: int,
+        seq_len: int,
+        horizon: int = 0,
+        mode: str = 'shift',
+    ) -> Tuple['SlidingWindowDataset', 'SlidingWindowDataset']:
+        """Train/test datasets over one feature array, split at row ``split_row``.
+
+        Same samples as windowing ``features[:split_row]`` and ``features[split_row:]``
+        separately: no window reads rows from both sides.
+        """
+        need = seq_len + horizon
+        for rows in (split_row, len(features) - split_row):
+            if rows < need:
+                raise ValueError(f"Not enough data: need at least {need} rows, got {rows}")
+        full = cls(features, targets, seq_len, horizon, mode)
+        train_end = split_row - need + 1            # last train window's target row is split_row - 1
+        n_windows = len(full.windows)
+        train = full.subset(np.arange(0, train_end, dtype=np.int64))
+        test = full.subset(np.arange(split_row, n_windows, dtype=np.int64))
+        return train, test
+
+    @classmethod
+    def concat(cls, parts: Sequence[Tuple[np.ndarray, np.ndarray]], seq_len: int, horizon: int = 0,
+               mode: str = 'shift', backing_file: Optional[str] = None) -> 'SlidingWindowDataset':
+        """One dataset over several ``(features, targets)`` frames, never windowing across
+        a frame boundary. Copies the feature rows once (not once per window)."""
+        features = np.concatenate([np.asarray(f) for f, _ in parts], axis=0)
+        targets = np.concatenate([np.asarray(t) for _, t in parts], axis=0)
+        if backing_file is not None:
+            features = memmap_features(features, backing_file)
+        span = seq_len + horizon
+        starts, row = [], 0
+        for f, _ in parts:
+            n = len(f) - span + 1
+            if n > 0:
+                starts.append(np.arange(row, row + n, dtype=np.int64))
+            row += len(f)
+        if not starts:
+            raise ValueError(f"Not enough data: need at least {span} rows per dataset")
+        return cls(features, targets, seq_len, horizon, mode, indices=np.concatenate(starts))
+
+    def subset(self, indices: np.ndarray) -> 'SlidingWindowDataset':
+        """Dataset over the same feature array restricted to window starts ``indices``."""
+        out = object.__new__(SlidingWindowDataset)
+        out.__dict__.update(self.__dict__)
+        out.indices = np.asarray(indices, dtype=np.int64)
+        return out
+
+    # ------------------------------------------------------------------ access
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (len(self.indices), self.windows.shape[1], self.seq_len)
+
+    def _contiguous_range(self) -> Optional[slice]:
+        idx = self.indices
+        if len(idx) == 0:
+            return slice(0, 0)
+        if idx[-1] - idx[0] + 1 == len(idx) and (len(idx) < 2 or bool(np.all(np.diff(idx) == 1))):
+            return slice(int(idx[0]), int(idx[-1]) + 1)
+        return None
+
+    @property
+    def X(self) -> np.ndarray:
+        """Samples as ``(n, n_features, seq_len)``: a read-only view when the indices are
+        one consecutive run (the usual case), otherwise a gathered copy."""
+        rng = self._contiguous_range()
+        return self.windows[rng] if rng is not None else self.windows[self.indices]
+
+    @property
+    def y(self) -> np.ndarray:
+        rng = self._contiguous_range()
+        return self.labels[rng] if rng is not None else self.labels[self.indices]
+
+    def __getitem__(self, item) -> Tuple[np.ndarray, np.ndarray]:
+        """``ds[i]`` -> one (window, target); ``ds[array]`` -> a contiguous batch copy."""
+        starts = self.indices[item]
+        if np.ndim(starts) == 0:
+            return self.windows[starts], self.labels[starts]
+        return np.ascontiguousarray(self.windows[starts]), self.labels[starts]
+
+    def batches(self, batch_size: int, shuffle: bool = False, seed: Optional[int] = None,
+                drop_last: bool = False,
+                sampler: Optional[ShuffledIndexSampler] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Lazily gathered ``(X_batch, y_batch)`` pairs; only one batch is materialised at a time.
+
+        Pass a long-lived ``sampler`` to get a fresh permutation per epoch.
+        """
+        if sampler is None:
+            sampler = ShuffledIndexSampler(len(self), batch_size, shuffle=shuffle, seed=seed,
+                                           drop_last=drop_last)
+        for positions in sampler:
+            yield self[positions]
+
+
+def memmap_features(features: np.ndarray, path: str) -> np.ndarray:
+    """Write ``features`` to ``path`` (.npy, atomically) and return it memory-mapped read-only."""
+    path = str(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as fh:
+        np.save(fh, np.ascontiguousarray(features))
+    os.replace(tmp, path)
+    return np.load(path, mmap_mode='r')
+
+
+def joint_arrays(train: SlidingWindowDataset, val: Optional[SlidingWindowDataset] = None,
+                 val_fraction: float = 0.2) -> Tuple[np.ndarray, np.ndarray, Tuple[List[int], List[int]]]:
+    """``(X_all, y_all, splits)`` for index-based dataloaders (tsai ``get_ts_dls``).
+
+    When ``val`` shares ``train``'s feature array (``SlidingWindowDataset.split``) the
+    shared window view is returned as is and the splits select each side -- nothing is
+    copied. Otherwise the two are stacked (one copy). Without ``val`` the last
+    ``val_fraction`` of the training samples validate, as before.
+    """
+    if val is None:
+        cut = int(len(train) * (1 - val_fraction))
+        return train.windows, train.labels, (train.indices[:cut].tolist(), train.indices[cut:].tolist())
+    if val.features is train.features and (val.seq_len, val.horizon, val.mode) == \
+            (train.seq_len, train.horizon, train.mode):
+        return train.windows, train.labels, (train.indices.tolist(), val.indices.tolist())
+    X_all = np.concatenate([train.X, val.X])
+    y_all = np.concatenate([train.y, val.y])
+    n = len(train)
+    return X_all, y_all, (list(range(n)), list(range(n, len(X_all))))
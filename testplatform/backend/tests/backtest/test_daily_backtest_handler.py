@@ -120,6 +120,10 @@ def test_build_config_assembles_account_settings():
         # BacktestAccount._option_half_spread for why options cannot share spread_bps.
         "option_spread_pct": 0.0,
         "option_spread_min_tick": 0.0,
+        # Held lots without a premium bar keep the entry/last-close mark unless the payload
+        # opts into the Black-Scholes model mark (2026-10).
+        "option_mark_model": "premium_close",
+        "option_mark_rate": 0.0,
     }
     assert cfg["enabled_instruments"] == ["AAPL"]
     assert cfg["initial_capital"] == 100_000.0
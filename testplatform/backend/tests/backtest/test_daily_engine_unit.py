@@ -289,3 +289,28 @@ def test_recommendation_to_expert_recommendation_skips_hold_and_skip():
         assert isinstance(rec_id, int) and rec_id > 0
     finally:
         ctx.__exit__(None, None, None)
+
+
+def test_shared_run_state_serves_recommendations_across_runs():
+    """Schedule-variant batch: a second run over the same bars re-uses the first run's
+    ``analyze_as_of`` results from the shared memo instead of asking the expert again."""
+    from app.services.backtest.daily_engine import SharedRunState
+
+    shared = SharedRunState()
+    seen = []
+    for _variant in range(2):
+        # Same account/expert ids each time (variants rebuild their parent's expert) -- but a
+        # fresh trading DB, account and expert instance per run.
+        engine, account, expert, ctx, ps = _build_run(account_id=11, expert_id=11)
+        try:
+            engine._indicator_provider = None
+            engine._shared = shared
+            engine._screened_cache = shared.screened
+            engine.run()
+            seen.append(list(expert.seen_as_of))
+            assert len(account.get_balance_history()) == len(BARS)
+        finally:
+            ctx.__exit__(None, None, None)
+    assert seen[0] == [d for (d, *_rest) in BARS]
+    assert seen[1] == []
+    assert len(shared.recommendations) == len(BARS)
@@ -0,0 +1,216 @@
+"""IV surfaces: fitted once from the options cache, interpolated on lookup, and the ATM series
+behind IV rank/percentile -- the same numbers from the SQLite cache and the columnar store."""
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.backtest import iv_surface as ivs
+
+_START = date(2024, 3, 1)
+_DAYS = 30
+_EXPIRIES = (date(2024, 4, 19), date(2024, 5, 17), date(2024, 7, 19), date(2024, 12, 20))
+
+
+def _level(k: int) -> float:
+    return 0.20 + 0.01 * ((k * 7) % 11)      # day k's ATM vol, not monotone
+
+
+def _smile(level, m):
+    return level - 0.15 * m                  # linear skew in log-moneyness, flat in DTE
+
+
+def _closes():
+    return {(_START + timedelta(days=k)).isoformat(): 100.0 + k for k in range(_DAYS)}
+
+
+def _seed(tmp_path):
+    from app.services.backtest.options_cache import OptionsHistoryCache
+
+    db = str(tmp_path / "opt.sqlite")
+    cache = OptionsHistoryCache(db)
+    bars, chain = [], []
+    for k, (iso, spot) in enumerate(_closes().items()):
+        for exp in _EXPIRIES:
+            for strike in np.arange(60.0, 161.0, 5.0):
+                for right in ("call", "put"):
+                    occ = f"XYZ{exp:%y%m%d}{right[0].upper()}{int(strike * 1000):08d}"
+                    iv = _smile(_level(k), np.log(strike / spot))
+                    bars.append({"occ_symbol": occ, "date": iso, "open": 1, "high": 1, "low": 1,
+                                 "close": 1, "volume": 10, "underlying": "XYZ",
+                                 "option_type": right, "strike": float(strike),
+                                 "expiry": exp.isoformat(), "iv": iv})
+                    if k == 0:
+                        chain.append({"occ_symbol": occ, "option_type": right,
+                                      "strike": float(strike), "expiry": exp.isoformat(),
+                                      "bid": 0.95, "ask": 1.05, "last": 1.0, "iv": iv})
+    cache.write_bar_rows(bars)
+    cache.write_chain_rows("XYZ", _START.isoformat(), chain)
+    return db
+
+
+@pytest.fixture
+def built(tmp_path):
+    ivs.clear_worker_surface_cache()
+    db = _seed(tmp_path)
+    root = tmp_path / "surf"
+    stats = ivs.build_iv_surfaces(db, root, {"XYZ": _closes(), "NOPE": {}})
+    yield db, root, stats
+    ivs.clear_worker_surface_cache()
+
+
+def test_build_and_lookup_recovers_the_smile(built):
+    db, root, stats = built
+    assert stats == {"underlyings": 1, "dates": _DAYS, "skipped": ["NOPE"]}
+    assert ivs.built_source(root) == db
+    store = ivs.IVSurfaceStore(root)
+    assert store.underlyings() == ["XYZ"]
+
+    m = np.array([-0.3, -0.12, 0.0, 0.07, 0.2])     # inside the quoted strikes
+    for k in (0, 9, _DAYS - 1):
+        as_of = _START + timedelta(days=k)
+        for dte in (10, 30, 100):
+            np.testing.assert_allclose(store.iv("XYZ", as_of, m, dte), _smile(_level(k), m), atol=1e-6)
+        assert store.atm_iv("XYZ", as_of) == pytest.approx(_level(k), abs=1e-6)
+    spot = 100.0 + 9
+    np.testing.assert_allclose(
+        store.iv_at_strikes("XYZ", _START + timedelta(days=9), spot, [90.0, 120.0], 45),
+        _smile(_level(9), np.log(np.array([90.0, 120.0]) / spot)), atol=1e-6)
+
+    # as_of before the first surface / past the staleness window / unknown underlying
+    assert np.isnan(store.iv("XYZ", _START - timedelta(days=1), m, 30)).all()
+    assert store.atm_iv("XYZ", _START + timedelta(days=_DAYS + 10)) is None
+    assert store.atm_iv("NOPE", _START) is None
+
+
+
+def test_marker_matches_relative_sources_and_goes_stale_on_refetch(tmp_path, monkeypatch):
+    import ba2_common.config as cfg
+    from app.services.backtest.daily_backtest_handler import default_iv_surface_dir
+
+    db = _seed(tmp_path)
+    monkeypatch.setattr(cfg, "IV_SURFACE_DIR", str(tmp_path / "surf"))
+    monkeypatch.chdir(tmp_path)
+    ivs.build_iv_surfaces("opt.sqlite", cfg.IV_SURFACE_DIR, {"XYZ": _closes()})
+    ivs.clear_worker_surface_cache()
+    assert ivs.built_source(cfg.IV_SURFACE_DIR) == db
+    assert default_iv_surface_dir(db) == cfg.IV_SURFACE_DIR
+
+    stamp = os.path.getmtime(db) + 5
+    os.utime(db, (stamp, stamp))                 # the options cache was refetched
+    assert ivs.built_source(cfg.IV_SURFACE_DIR) is None
+    assert default_iv_surface_dir(db) is None
+
+def test_rank_and_percentile_match_brute_force(built):
+    _, root, _ = built
+    store = ivs.IVSurfaceStore(root)
+    levels = [_level(k) for k in range(_DAYS)]
+    lookback, min_samples = 10, 5
+    pct = store.iv_percentile_series("XYZ", lookback, min_samples)
+    rank = store.iv_rank_series("XYZ", lookback, min_samples)
+    assert len(pct) == len(rank) == _DAYS
+    for k in range(_DAYS):
+        window = np.array(levels[max(0, k - lookback):k + 1], dtype=np.float32)
+        cur = window[-1]
+        as_of = _START + timedelta(days=k)
+        if len(window) < min_samples:
+            assert np.isnan(pct.iloc[k]) and store.iv_percentile("XYZ", as_of, lookback, min_samples) is None
+            continue
+        want_pct = round((window < cur).sum() / len(window) * 100, 2)
+        want_rank = round((cur - window.min()) / (window.max() - window.min()) * 100, 2)
+        assert pct.iloc[k] == pytest.approx(want_pct)
+        assert rank.iloc[k] == pytest.approx(want_rank, abs=0.01)
+        assert store.iv_percentile("XYZ", as_of, lookback, min_samples) == pytest.approx(want_pct)
+        assert store.iv_rank("XYZ", as_of, lookback, min_samples) == pytest.approx(want_rank, abs=0.01)
+    assert len(store.atm_series("XYZ", start="2024-03-10", end="2024-03-12")) == 3
+
+
+def test_columnar_store_builds_the_same_surfaces(built, tmp_path):
+    from app.services.backtest.options_store import convert_sqlite_cache
+
+    db, root, _ = built
+    convert_sqlite_cache(db, tmp_path / "store")
+    ivs.build_iv_surfaces(tmp_path / "store", tmp_path / "surf2", {"XYZ": _closes()})
+    a, b = ivs.IVSurfaceStore(root), ivs.IVSurfaceStore(tmp_path / "surf2")
+    for k in (0, 17):
+        as_of = _START + timedelta(days=k)
+        np.testing.assert_array_equal(a.iv("XYZ", as_of, [-0.2, 0.1], [20, 200]),
+                                      b.iv("XYZ", as_of, [-0.2, 0.1], [20, 200]))
+
+
+def test_account_iv_rank_reads_the_surface(built):
+    from app.services.backtest.backtest_account import BacktestAccount
+    from app.services.backtest.backtest_db import backtest_trading_db, seed_account_definition
+    from app.services.backtest.options_provider import HistoricalOptionsProvider
+    from app.services.backtest.price_source import AsOfPriceSource
+    from app.services.backtest.seam_wiring import wire_backtest_seams
+
+    db, root, _ = built
+    cfg = {"starting_cash": 10_000.0, "commission_per_trade": 0.0, "slippage_bps": 0.0,
+           "fill_model": "next_bar_open"}
+    wire_backtest_seams()
+    with backtest_trading_db("ivsurface"):
+        seed_account_definition(1, cfg)
+        ps = AsOfPriceSource(ohlcv_provider=None)
+        ps.load_bars("XYZ", [{"Date": datetime(2024, 3, 1) + timedelta(days=k), "Open": 1, "High": 1,
+                              "Low": 1, "Close": 1, "Volume": 1} for k in range(_DAYS)])
+        acct = BacktestAccount(1, ps, cfg,
+                               options_provider=HistoricalOptionsProvider(db, iv_surface_dir=str(root)))
+        ps.set_clock(datetime(2024, 3, 25))
+        assert acct.get_iv_rank("XYZ", lookback_days=20, min_samples=5) == \
+            ivs.IVSurfaceStore(root).iv_percentile("XYZ", date(2024, 3, 25), 20, 5)
+        assert acct.get_iv_rank("XYZ", lookback_days=20, min_samples=5) is not None
+
+
+def test_single_run_and_ga_trial_gate_iv_rank_on_the_same_surface(built, monkeypatch):
+    """The GA trial config must resolve the same ``iv_surface_dir`` as the single run, or the
+    same genome's IVRankCondition reads the surface in one and the account fallback in the other."""
+    import ba2_common.config as cfg_mod
+    from ba2_common.core.TradeConditions import IVRankCondition
+    from app.services import strategy_optimization_handler as SO
+    from app.services.backtest import daily_backtest_handler as DH
+    from app.services.backtest.backtest_account import BacktestAccount
+    from app.services.backtest.backtest_db import backtest_trading_db, seed_account_definition
+    from app.services.backtest.options_provider import HistoricalOptionsProvider
+    from app.services.backtest.price_source import AsOfPriceSource
+    from app.services.backtest.seam_wiring import wire_backtest_seams
+
+    db, root, _ = built
+    monkeypatch.setattr(cfg_mod, "IV_SURFACE_DIR", str(root))
+    single = DH._build_config({
+        "backtest_id": 1, "name": "iv", "enabled_instruments": ["XYZ"], "experts": ["FMPEarningsDrift"],
+        "start_date": "2024-03-01", "end_date": "2024-03-30", "initial_capital": 10_000.0,
+        "commission": 0.0, "slippage": 0.0, "fill_model": "next_bar_open", "seed": 1,
+        "options_cache_db": db})
+    backtest_cfg = {
+        "backtest_id": 1, "start_date": "2024-03-01", "end_date": "2024-03-30",
+        "enabled_instruments": ["XYZ"], "experts": [{"class": "FMPEarningsDrift", "settings": {}}],
+        "initial_capital": 10_000.0, "account_settings": {"starting_cash": 10_000.0},
+        "warmup_days": 0, "seed": 1, "options_cache_db": db}
+    decoded = {"tp": 5.0, "sl": 5.0, "expert_overrides": {}, "buy_tree": None, "sell_tree": None,
+               "exit_rules": []}
+    trial = SO._build_daily_trial_config(backtest_cfg, decoded, SO._build_hoisted_state(backtest_cfg))
+    assert single["iv_surface_dir"] == trial["iv_surface_dir"] == str(root)
+
+    acct_cfg = {"starting_cash": 10_000.0, "commission_per_trade": 0.0, "slippage_bps": 0.0,
+                "fill_model": "next_bar_open"}
+    wire_backtest_seams()
+    ranks = []
+    for run_cfg in (single, trial):
+        with backtest_trading_db("ivparity"):
+            seed_account_definition(1, acct_cfg)
+            ps = AsOfPriceSource(ohlcv_provider=None)
+            ps.load_bars("XYZ", [{"Date": datetime(2024, 3, 1) + timedelta(days=k), "Open": 1, "High": 1,
+                                  "Low": 1, "Close": 1, "Volume": 1} for k in range(_DAYS)])
+            # As run_daily_backtest builds the provider from the assembled config.
+            provider = HistoricalOptionsProvider(run_cfg["options_cache_db"],
+                                                 iv_surface_dir=run_cfg.get("iv_surface_dir"))
+            acct = BacktestAccount(1, ps, acct_cfg, options_provider=provider)
+            ps.set_clock(datetime(2024, 3, 25))
+            cond = IVRankCondition(acct, "XYZ", None, ">=", 0.0)
+            assert cond.evaluate()
+            ranks.append(cond.calculated_value)
+    assert ranks[0] == ranks[1] is not None
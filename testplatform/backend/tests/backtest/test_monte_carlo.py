@@ -160,7 +160,6 @@ def test_blown_up_path_scores_minus_100_so_the_left_tail_is_not_understated():
     Scoring a ruined path 0.0 (the old behaviour) makes it look BREAKEVEN and drags the low
     percentile bands upward -- understating precisely the left tail MC is run to measure."""
     from app.services.backtest.monte_carlo import _annualized_return, _path_metrics
-    import numpy as np
 
     assert _annualized_return(100_000.0, 0.0, 3.0) == -100.0
     assert _annualized_return(100_000.0, -500.0, 3.0) == -100.0
@@ -173,3 +172,49 @@ def test_blown_up_path_scores_minus_100_so_the_left_tail_is_not_understated():
     # ...and it must sort below a path that merely halved.
     halved = _path_metrics(np.array([100_000.0, 70_000.0, 50_000.0]), 100_000.0, 3.0)
     assert wiped["annualized_return"] < halved["annualized_return"] < 0
+
+
+def test_matrix_paths_match_the_per_path_metrics():
+    """Each row of the matrix engine scores exactly like _path_metrics on that row's path,
+    including a path that blows up (a -100% trade)."""
+    from app.services.backtest.monte_carlo import _path_metrics, _paths_metrics
+
+    rng = np.random.default_rng(3)
+    sample = np.vstack([rng.normal(0.5, 4.0, size=(40, 25)), np.r_[5.0, -100.0, np.zeros(23)]])
+    paths = np.hstack([np.full((41, 1), 10_000.0), 10_000.0 * np.cumprod(1 + sample / 100.0, axis=1)])
+    got = _paths_metrics(paths, 10_000.0, 2.5)
+    for i in range(len(paths)):
+        want = _path_metrics(paths[i], 10_000.0, 2.5)
+        for k, v in want.items():
+            assert abs(got[k][i] - v) <= 1e-9 * max(1.0, abs(v)), (i, k)
+    assert got["annualized_return"][-1] == -100.0
+
+
+def test_simulate_paths_is_bit_reproducible_across_chunks_and_workers():
+    from app.services.backtest.monte_carlo import METHODS, _POOL_MIN_PATHS, simulate_paths
+    import pytest
+
+    pcts = list(np.random.default_rng(0).normal(0.3, 3.0, 30))
+    for method in METHODS:
+        whole = simulate_paths(method, pcts, 10_000.0, _POOL_MIN_PATHS, seed=11, years=2.0,
+                               bp_sigma=5.0, workers=0)
+        chunked = simulate_paths(method, pcts, 10_000.0, _POOL_MIN_PATHS, seed=11, years=2.0,
+                                 bp_sigma=5.0, workers=0, chunk_bytes=1)
+        pooled = simulate_paths(method, pcts, 10_000.0, _POOL_MIN_PATHS, seed=11, years=2.0,
+                                bp_sigma=5.0, workers=2)
+        for k, v in whole.items():
+            assert len(v) == _POOL_MIN_PATHS
+            assert np.array_equal(v, chunked[k]) and np.array_equal(v, pooled[k]), (method, k)
+        other = simulate_paths(method, pcts, 10_000.0, 1000, seed=12, years=2.0, bp_sigma=5.0)
+        assert not np.array_equal(other["max_drawdown"], whole["max_drawdown"][:1000])
+    with pytest.raises(ValueError, match="unknown Monte Carlo method"):
+        simulate_paths("antithetic", pcts, 10_000.0, 10, seed=1)
+
+
+def test_empty_trade_list_gives_flat_paths():
+    from app.services.backtest.monte_carlo import simulate_paths
+
+    for method in ("bootstrap", "shuffle", "jitter"):
+        out = simulate_paths(method, [], 10_000.0, 5, seed=1, bp_sigma=5.0)
+        assert out["final_equity"].tolist() == [10_000.0] * 5
+        assert out["max_drawdown"].tolist() == [0.0] * 5
@@ -0,0 +1,159 @@
+"""Vectorised Black-Scholes/Black-76 engine: same numbers as the scalar path, whole arrays at once,
+and the batch model mark for held option lots that have no premium bar on the marking day."""
+from __future__ import annotations
+
+import math
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from app.services.backtest import option_greeks as og
+from ba2_common.core.types import OptionRight, OrderDirection
+
+
+def _book(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(50, 150, n), rng.uniform(40, 160, n), rng.uniform(0.01, 1.5, n),
+            rng.uniform(0.05, 1.5, n), rng.random(n) < 0.5)
+
+
+def test_arrays_match_scalar_price_and_greeks():
+    S, K, T, sigma, call = _book()
+    r, q = 0.04, 0.01
+    g = og.greeks_array(S, K, T, r, sigma, call, q)
+    np.testing.assert_array_equal(g["price"], og.bs_price_array(S, K, T, r, sigma, call, q))
+    for i in range(0, len(S), 97):
+        right = OptionRight.CALL if call[i] else OptionRight.PUT
+        assert g["price"][i] == pytest.approx(og.bs_price(S[i], K[i], T[i], r, sigma[i], right, q),
+                                              abs=1e-12)
+        ref = og.greeks(S[i], K[i], T[i], r, sigma[i], right, q)
+        for k in ("delta", "gamma", "theta", "vega"):
+            assert g[k][i] == pytest.approx(ref[k], abs=1e-12)
+
+    # Degenerate rows are NaN (the scalar returns None); option_type accepts several spellings
+    out = og.bs_price_array(100, 100, [0.5, 0.0, 0.5, 0.5], 0.0, [0.2, 0.2, 0.0, 0.2],
+                            [b"call", b"call", b"put", b"put"])
+    assert np.isfinite(out[[0, 3]]).all() and np.isnan(out[[1, 2]]).all()
+    assert og.bs_price_array(100, 100, 0.5, 0.0, 0.2, OptionRight.PUT) == pytest.approx(out[3])
+    assert og.norm_cdf_array([0.0, 40.0, -40.0]).tolist() == [0.5, 1.0, 0.0]
+    assert og.norm_cdf_array(1.3) == pytest.approx(0.5 * math.erfc(-1.3 / math.sqrt(2)), abs=1e-15)
+
+
+def test_implied_volatility_array_round_trips():
+    S, K, T, sigma, call = _book(seed=1)
+    price = og.bs_price_array(S, K, T, 0.03, sigma, call)
+    iv = og.implied_volatility_array(price, S, K, T, 0.03, call)
+    vega = og.greeks_array(S, K, T, 0.03, sigma, call)["vega"]
+    informative = vega > 1e-3                       # price actually moves with sigma
+    np.testing.assert_allclose(iv[informative], sigma[informative], atol=1e-8)
+    np.testing.assert_allclose(og.bs_price_array(S, K, T, 0.03, iv, call)[np.isfinite(iv)],
+                               price[np.isfinite(iv)], atol=1e-8)
+    for i in np.flatnonzero(informative)[:40]:
+        right = OptionRight.CALL if call[i] else OptionRight.PUT
+        assert iv[i] == pytest.approx(og.implied_volatility(price[i], S[i], K[i], T[i], 0.03, right),
+                                      abs=1e-5)
+
+    # Unsolvable rows: no price, non-positive price, expired, below intrinsic
+    bad = og.implied_volatility_array([np.nan, -1.0, 2.0, 5.0], [100, 100, 100, 120], 100,
+                                      [0.5, 0.5, 0.0, 0.5], 0.0, "call")
+    assert np.isnan(bad).all()
+    both = og.compute_iv_and_greeks_array([7.0, np.nan], 100, 100, 0.5, 0.0, ["call", "put"])
+    assert np.isfinite(both["delta"][0]) and np.isnan(both["delta"][1])
+
+
+def test_black76_is_bsm_on_the_forward():
+    F, K, T, r = 105.0, np.array([90.0, 100.0, 110.0]), 0.75, 0.05
+    c = og.black76_price_array(F, K, T, r, 0.3, "call")
+    p = og.black76_price_array(F, K, T, r, 0.3, "put")
+    np.testing.assert_allclose(c - p, math.exp(-r * T) * (F - K), atol=1e-12)   # put-call parity
+    np.testing.assert_allclose(og.black76_implied_volatility_array(c, F, K, T, r, "call"), 0.3,
+                               atol=1e-9)
+    d = og.black76_greeks_array(F, K, T, r, 0.3, "call")["delta"]
+    assert ((d > 0) & (d < math.exp(-r * T))).all()
+
+
+# ---------------------------------------------------------------------------
+# BacktestAccount: model marks for lots without a premium bar
+# ---------------------------------------------------------------------------
+_PUT = "AAPL240315P00175000"
+_CALL = "AAPL240315C00190000"
+_BARS = [
+    {"Date": datetime(2024, 3, d), "Open": 180, "High": 181, "Low": 179, "Close": c, "Volume": 1000}
+    for d, c in ((5, 180), (6, 180), (8, 172))
+]
+
+
+def _account(tmp_path, mark_model):
+    from ba2_common.core.option_types import OptionLeg
+    from app.services.backtest.backtest_account import BacktestAccount
+    from app.services.backtest.backtest_db import backtest_trading_db, seed_account_definition
+    from app.services.backtest.options_cache import OptionsHistoryCache
+    from app.services.backtest.options_provider import HistoricalOptionsProvider
+    from app.services.backtest.price_source import AsOfPriceSource
+    from app.services.backtest.seam_wiring import wire_backtest_seams
+
+    cfg = {"starting_cash": 50_000.0, "commission_per_trade": 0.0, "slippage_bps": 0.0,
+           "fill_model": "next_bar_open", "option_mark_model": mark_model, "option_mark_rate": 0.02}
+    db = str(tmp_path / "opt.sqlite")
+    cache = OptionsHistoryCache(db)
+    rows, bars = [], []
+    for occ, right, k, px, iv in ((_PUT, "put", 175.0, 2.0, 0.32), (_CALL, "call", 190.0, 1.0, None)):
+        rows.append({"occ_symbol": occ, "option_type": right, "strike": k, "expiry": "2024-03-15",
+                     "bid": px - 0.05, "ask": px + 0.05, "last": px, "iv": 0.3})
+        bars.append({"occ_symbol": occ, "date": "2024-03-06", "open": px, "high": px, "low": px,
+                     "close": px, "volume": 500, "underlying": "AAPL", "option_type": right,
+                     "strike": k, "expiry": "2024-03-15", "iv": iv})
+    cache.write_chain_rows("AAPL", "2024-03-01", rows)
+    cache.write_bar_rows(bars)
+
+    wire_backtest_seams()
+    ctx = backtest_trading_db("mtmmodel")
+    ctx.__enter__()
+    seed_account_definition(1, cfg)
+    ps = AsOfPriceSource(ohlcv_provider=None)
+    ps.load_bars("AAPL", _BARS)
+    ps.set_clock(datetime(2024, 3, 5))
+    acct = BacktestAccount(1, ps, cfg, options_provider=HistoricalOptionsProvider(db))
+    wire_backtest_seams().register_account(1, acct)
+    for occ, side, right, k in ((_PUT, OrderDirection.SELL, OptionRight.PUT, 175.0),
+                                (_CALL, OrderDirection.BUY, OptionRight.CALL, 190.0)):
+        intent = "sell_to_open" if side == OrderDirection.SELL else "buy_to_open"
+        leg = OptionLeg(contract_symbol=occ, side=side, position_intent=intent, option_type=right,
+                        strike=k, expiry=date(2024, 3, 15), underlying="AAPL")
+        acct.submit_option_order(legs=[leg], quantity=1, order_type="market",
+                                 option_strategy="single")
+    acct.refresh_orders()
+    acct.refresh_transactions()
+    return acct, ps, ctx
+
+
+@pytest.mark.parametrize("mark_model", ["premium_close", "black_scholes"])
+def test_lots_without_a_bar_are_model_marked(tmp_path, mark_model):
+    acct, ps, ctx = _account(tmp_path, mark_model)
+    try:
+        assert {l.contract_symbol: l.qty for l in acct._option_positions.values()} == \
+            {_PUT: -1.0, _CALL: 1.0}
+        assert acct._option_positions_mtm() == pytest.approx(-200.0 + 100.0)   # entry-day closes
+
+        ps.set_clock(datetime(2024, 3, 8))          # no premium bars; spot fell 180 -> 172
+        mtm = acct._option_positions_mtm()
+        if mark_model == "premium_close":
+            assert mtm == pytest.approx(-200.0 + 100.0)                       # entry premiums
+        else:
+            put = og.bs_price(172.0, 175.0, 7 / 365.0, 0.02, 0.32, OptionRight.PUT)
+            # the call's last bar carries no IV -> it keeps the entry-premium fall-back
+            assert mtm == pytest.approx(-100.0 * put + 100.0)
+            assert put > 3.0
+    finally:
+        ctx.__exit__(None, None, None)
+
+
+def test_unknown_mark_model_is_rejected():
+    from app.services.backtest.daily_backtest_handler import _build_config
+
+    payload = {"experts": ["FMPRating"], "start_date": "2024-01-02", "end_date": "2024-02-01",
+               "initial_capital": 1000, "commission": 0, "slippage": 0, "fill_model": "next_bar_open",
+               "seed": 1, "enabled_instruments": ["AAPL"], "option_mark_model": "binomial"}
+    with pytest.raises(ValueError, match="option_mark_model"):
+        _build_config(payload)
@@ -0,0 +1,176 @@
+# backend/tests/backtest/test_options_store.py
+"""Columnar options store: same answers as the SQLite cache, memory-mapped, vectorised selection."""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import app.services.backtest.options_provider as op
+from app.services.backtest import options_store
+from app.services.backtest.options_cache import OptionsCacheMiss, OptionsHistoryCache
+from app.services.backtest.options_provider import HistoricalOptionsProvider
+from app.services.backtest.options_store import OptionsColumnarStore, convert_sqlite_cache
+from ba2_common.core.types import OptionRight
+
+
+def _occ(u, exp, right, strike):
+    return f"{u}{exp.strftime('%y%m%d')}{right[0].upper()}{int(strike * 1000):08d}"
+
+
+def _seed(db, seed=0):
+    """Two underlyings, two snapshots, sparse bars over three months (some with no iv)."""
+    rng = np.random.default_rng(seed)
+    c = OptionsHistoryCache(db)
+    for u, spot in (("AAPL", 180.0), ("MSFT", 400.0)):
+        expiries = [date(2024, 3, 15), date(2024, 4, 19), date(2024, 5, 17)]
+        contracts = [(e, right, spot + k * 5) for e in expiries for right in ("call", "put")
+                     for k in range(-4, 5)]
+        for snap in ("2024-02-20", "2024-04-02"):
+            rows = []
+            for e, right, k in contracts:
+                if snap == "2024-04-02" and e < date(2024, 4, 2):
+                    continue
+                bid = None if k == spot + 20 else round(float(rng.uniform(1, 5)), 2)
+                rows.append({"occ_symbol": _occ(u, e, right, k), "option_type": right,
+                             "strike": k, "expiry": e.isoformat(), "bid": bid,
+                             "ask": None if bid is None else bid + 0.1, "last": bid,
+                             "iv": 0.3, "delta": float(rng.uniform(-1, 1)), "gamma": 0.01,
+                             "theta": -0.02, "vega": 0.1, "open_interest": 100, "volume": None})
+            c.write_chain_rows(u, snap, rows)
+        bars = []
+        for e, right, k in contracts:
+            d = date(2024, 2, 20)
+            while d < min(e, date(2024, 5, 10)):
+                if rng.random() < 0.35:
+                    iv = None if rng.random() < 0.2 else float(rng.uniform(0.2, 0.6))
+                    close = round(float(rng.uniform(0.5, 9)), 2)
+                    bars.append({"occ_symbol": _occ(u, e, right, k), "date": d.isoformat(),
+                                 "open": close, "high": close + 0.2, "low": close - 0.2,
+                                 "close": close, "volume": float(rng.integers(1, 500)),
+                                 "underlying": u, "option_type": right, "strike": k,
+                                 "expiry": e.isoformat(), "iv": iv,
+                                 "delta": None if iv is None else float(rng.uniform(-1, 1)),
+                                 "gamma": None if iv is None else 0.02,
+                                 "theta": None if iv is None else -0.05,
+                                 "vega": None if iv is None else 0.2})
+                d += timedelta(days=1)
+        c.write_bar_rows(bars)
+    return c
+
+
+@pytest.fixture
+def caches(tmp_path):
+    op.clear_worker_options_cache()
+    db = str(tmp_path / "opt.sqlite")
+    _seed(db)
+    stats = convert_sqlite_cache(db, tmp_path / "store")
+    yield db, str(tmp_path / "store"), stats
+    op.clear_worker_options_cache()
+
+
+def test_store_answers_match_sqlite(caches):
+    db, store_dir, stats = caches
+    assert stats["underlyings"] == 2 and options_store.is_built(store_dir)
+    sq, col = HistoricalOptionsProvider(db), HistoricalOptionsProvider(store_dir)
+    assert col._store is not None and sq._store is None
+
+    for d in (date(2024, 2, 19), date(2024, 2, 21), date(2024, 3, 9), date(2024, 3, 15),
+              date(2024, 4, 2), date(2024, 4, 30), date(2024, 6, 1)):
+        for u in ("AAPL", "MSFT", "NVDA"):
+            for kw in (dict(expiry_min=date(2024, 1, 1), expiry_max=date(2024, 12, 31)),
+                       dict(expiry_min=d + timedelta(days=20), expiry_max=d + timedelta(days=60),
+                            option_type=OptionRight.PUT, strike_min=175, strike_max=400)):
+                a = sq.get_chain(u, d, **kw)
+                b = col.get_chain(u, d, **kw)
+                assert sorted(a, key=lambda c: c.symbol) == b
+            assert sq.get_atm_iv(u, d) == col.get_atm_iv(u, d)
+        for occ in ("AAPL240419C00180000", "MSFT240517P00390000", "NOPE240419C00001000"):
+            assert sq.get_bar(occ, d) == col.get_bar(occ, d)
+            assert sq.get_quote(occ, d) == col.get_quote(occ, d)
+
+    # Raw cache-level reads mirror OptionsHistoryCache too
+    raw_sq, raw_col = OptionsHistoryCache(db), col.cache
+    assert sorted(raw_sq.read_chain("AAPL", "2024-04-02"), key=lambda r: r["occ_symbol"]) == \
+        [{k: r[k] for k in raw_sq.read_chain("AAPL", "2024-04-02")[0]}
+         for r in raw_col.read_chain("AAPL", "2024-04-02")]
+    assert raw_col.latest_chain_as_of("AAPL", "2024-03-30") == "2024-02-20"
+    assert raw_sq.latest_bar_on_or_before("AAPL240517C00170000", "2024-04-10") == \
+        raw_col.latest_bar_on_or_before("AAPL240517C00170000", "2024-04-10")
+    assert raw_col.cached_underlyings() == {"AAPL", "MSFT"}
+    with pytest.raises(OptionsCacheMiss):
+        raw_col.read_chain_or_miss("AAPL", "2024-03-01")
+
+
+def test_vectorised_selection_by_dte_and_delta(caches):
+    _, store_dir, _ = caches
+    store = OptionsColumnarStore(store_dir)
+    as_of = date(2024, 3, 20)
+    sl = store.select("AAPL", as_of, dte_min=20, dte_max=40, option_type="call",
+                      abs_delta_min=0.3, abs_delta_max=0.6)
+    days = (sl.expiry - np.datetime64(as_of, "D").astype(np.int64))
+    assert len(sl) and ((days >= 20) & (days <= 40)).all()
+    assert ((np.abs(sl.delta) >= 0.3) & (np.abs(sl.delta) <= 0.6)).all()
+    assert set(sl.option_type.tolist()) == {b"call"}
+
+    prov = HistoricalOptionsProvider(store_dir)
+    chain = prov.get_chain("AAPL", as_of, expiry_min=as_of + timedelta(days=20),
+                           expiry_max=as_of + timedelta(days=40), option_type=OptionRight.CALL,
+                           delta_min=0.3, delta_max=0.6)
+    assert [c.symbol for c in chain] == [s.decode() for s in sl.occ_symbol]
+    assert store.select("AAPL", date(2024, 1, 2)) is None
+
+    # Partitions are memory-mapped, not loaded
+    view = options_store._WORKER_VIEW_CACHE[(store.db_path, "AAPL")]
+    assert isinstance(view.part("bars", "2024-03")["close"], np.memmap)
+    assert sorted(p.name for p in (store.root / "AAPL" / "bars").iterdir()) == \
+        ["ym=2024-02", "ym=2024-03", "ym=2024-04", "ym=2024-05"]
+
+
+def test_writes_replace_rows_and_add_contracts(tmp_path):
+    store = OptionsColumnarStore(tmp_path / "s")
+    bar = {"occ_symbol": "AAPL240315C00180000", "date": "2024-03-05", "open": 2.1, "high": 2.4,
+           "low": 2.0, "close": 2.3, "volume": 120.0, "underlying": "AAPL", "option_type": "call",
+           "strike": 180.0, "expiry": "2024-03-15"}
+    store.write_bar_rows([bar])
+    assert store.read_bar(bar["occ_symbol"], "2024-03-05")["close"] == 2.3
+    store.write_bar_rows([{**bar, "close": 2.5},
+                          {**bar, "occ_symbol": "AAPL240315P00175000", "option_type": "put",
+                           "strike": 175.0, "date": "2024-02-28"}])
+    assert store.read_bar(bar["occ_symbol"], "2024-03-05")["close"] == 2.5
+    assert store.row_counts("AAPL") == (0, 2)
+    assert store.latest_bar_on_or_before("AAPL240315P00175000", "2024-03-10")["date"] == "2024-02-28"
+    assert store.cached_underlyings() == set()
+    store.write_chain_rows("AAPL", "2024-03-01", [{**bar, "bid": 2.0, "ask": 2.2, "last": 2.1}])
+    assert store.cached_underlyings() == {"AAPL"}
+    with pytest.raises(ValueError):
+        store.write_bar_rows([{**bar, "underlying": "../x"}])
+
+
+def test_partial_store_serves_only_the_underlyings_it_holds(tmp_path, monkeypatch):
+    import ba2_common.config as cfg
+    from app.services.backtest.daily_backtest_handler import default_options_cache_db
+
+    db, store_dir = str(tmp_path / "opt.sqlite"), str(tmp_path / "store")
+    _seed(db)
+    monkeypatch.delenv("BACKTEST_OPTIONS_CACHE_DB", raising=False)
+    monkeypatch.delenv("BACKTEST_CACHE_DIR", raising=False)
+    monkeypatch.setattr(cfg, "OPTIONS_CACHE_DB", db)
+    monkeypatch.setattr(cfg, "OPTIONS_STORE_DIR", store_dir)
+    assert not options_store.is_columnar_store(store_dir)   # not even created yet
+    assert default_options_cache_db(["AAPL"]) == db
+
+    convert_sqlite_cache(db, store_dir, ["AAPL"])
+    assert options_store.is_columnar_store(store_dir) and not options_store.is_built(store_dir)
+    assert options_store.built_meta(store_dir)["underlyings"] == ["AAPL"]
+    assert default_options_cache_db(["aapl"]) == store_dir
+    assert default_options_cache_db(["AAPL", "MSFT"]) == db
+    assert default_options_cache_db() == db
+
+    # A fetch that adds the rest (here: written straight into the store) completes it.
+    store = OptionsColumnarStore(store_dir)
+    store.write_chain_rows("MSFT", "2024-02-20", OptionsHistoryCache(db).read_chain("MSFT", "2024-02-20"))
+    store.mark_built({}, source_db=db, complete=False)       # a failed symbol keeps it partial
+    assert not options_store.is_built(store_dir)
+    store.mark_built({}, source_db=db)
+    assert options_store.built_meta(store_dir)["underlyings"] == ["AAPL", "MSFT"]
+    assert options_store.is_built(store_dir) and default_options_cache_db() == store_dir
@@ -0,0 +1,166 @@
+"""Min/max pyramids and MinMaxLTTB for chart previews: extremes kept at every zoom, built once."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.chart_downsample import (
+    ChartPyramidCache, MinMaxPyramid, downsample_curves, downsample_dataset, lttb_indices,
+    select_rows,
+)
+from app.services.dataset_store import write_dataset
+
+
+def _walk(n, seed=0):
+    return 100 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+
+
+@pytest.mark.parametrize("lo,hi,width", [(0, 100_000, 800), (12_345, 67_891, 500),
+                                         (99_000, 100_000, 300), (5, 9_000, 1000),
+                                         (0, 5_000, 1000), (0, 900, 500)])
+def test_query_keeps_every_buckets_extremes(lo, hi, width):
+    y = _walk(100_000)
+    y[[70, 40_000]] = np.nan
+    pyr = MinMaxPyramid(y)
+    got = pyr.query(lo, hi, width)
+    assert (np.diff(got) > 0).all() and got[0] == lo and got[-1] == hi - 1
+    span = hi - lo
+    if span <= 2 * width:
+        assert len(got) == span
+        return
+    assert len(got) <= 4 * width + 6
+
+    # Brute force: the bucket grid the query must honour (a pyramid level, or direct buckets)
+    fitting = [size for size in pyr.sizes if size <= span // width]
+    if fitting:
+        size = fitting[-1]
+        edges = sorted({lo, hi} | set(range(-(-lo // size) * size, hi, size)))
+    else:
+        size = -(-span // width)
+        edges = list(range(lo, hi, size)) + [hi]
+    picked = set(got.tolist())
+    for a, b in zip(edges[:-1], edges[1:]):
+        vals = y[a:b]
+        if not np.isnan(vals).all():
+            assert a + np.nanargmin(vals) in picked and a + np.nanargmax(vals) in picked
+    assert lo + np.nanargmax(y[lo:hi]) in picked and lo + np.nanargmin(y[lo:hi]) in picked
+
+
+def _ref_lttb(x, y, target):
+    """Straight transcription of the reference LTTB (Steinarsson 2013)."""
+    n = len(x)
+    every = (n - 2) / (target - 2)
+    out, a = [0], 0
+    for i in range(target - 2):
+        avg_s, avg_e = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, n)
+        if avg_s >= avg_e:
+            avg_s, avg_e = n - 1, n
+        ax, ay = np.mean(x[avg_s:avg_e]), np.mean(y[avg_s:avg_e])
+        s, e = int(i * every) + 1, int((i + 1) * every) + 1
+        areas = [abs((x[a] - ax) * (y[j] - y[a]) - (x[a] - x[j]) * (ay - y[a])) for j in range(s, e)]
+        a = s + int(np.argmax(areas))
+        out.append(a)
+    return out + [n - 1]
+
+
+def test_lttb_matches_reference_on_irregular_x():
+    rng = np.random.default_rng(3)
+    x = np.cumsum(rng.integers(1, 5, 5000)).astype(float)
+    y = _walk(5000, seed=3)
+    assert lttb_indices(x, y, 300).tolist() == _ref_lttb(x, y, 300)
+    assert lttb_indices(x, y, 6000).tolist() == list(range(5000))
+
+    pyr = MinMaxPyramid(_walk(200_000, seed=4))
+    rows = select_rows([pyr], 0, 200_000, 400, method='lttb')
+    assert len(rows) == 400 and rows[0] == 0 and rows[-1] == 199_999
+    with pytest.raises(ValueError):
+        select_rows([pyr], 0, 10, 5, method='nope')
+
+
+def _dataset(n=60_000):
+    close = _walk(n, seed=7)
+    return pd.DataFrame({
+        'Date': pd.date_range('2022-01-03 09:30', periods=n, freq='5min', tz='America/New_York'),
+        'Close': close, 'RSI_14': np.abs(np.sin(np.arange(n) / 50)) * 100,
+        'label': np.where(np.arange(n) % 2, 'a', 'b'),
+    })
+
+
+def test_dataset_zoom_served_from_one_build(tmp_path):
+    df = _dataset()
+    path = write_dataset(df, tmp_path / 'ds.parquet')
+    cache = ChartPyramidCache()
+
+    full = downsample_dataset(path, ['Date', 'Close', 'label'], 600, cache=cache)
+    out = full['df']
+    assert full['total_rows'] == full['range_rows'] == len(df)
+    assert list(out.columns) == ['Date', 'Close', 'label'] and len(out) <= 4 * 600 + 6
+    assert out['Date'].is_monotonic_increasing
+    assert out['Close'].max() == df['Close'].max() and out['Close'].min() == df['Close'].min()
+    assert cache.builds == 1                                     # 'label' is not numeric
+
+    zoom = downsample_dataset(path, ['Date', 'Close', 'label'], 600,
+                              start='2022-02-01', end='2022-02-10 16:00', method='lttb', cache=cache)
+    inside = df[(df['Date'] >= pd.Timestamp('2022-02-01', tz='America/New_York'))
+                & (df['Date'] <= pd.Timestamp('2022-02-10 16:00', tz='America/New_York'))]
+    assert zoom['range_rows'] == len(inside) and len(zoom['df']) == 600
+    assert zoom['df']['Date'].iloc[0] == inside['Date'].iloc[0]
+    assert zoom['df']['Date'].iloc[-1] == inside['Date'].iloc[-1]
+    assert cache.builds == 1                                     # zoom reused the pyramid
+
+
+def test_unsorted_csv_dataset_is_charted_in_date_order(tmp_path):
+    df = _dataset(5000)
+    shuffled = df.sample(frac=1.0, random_state=1).reset_index(drop=True)
+    path = write_dataset(shuffled, tmp_path / 'ds.csv')
+    out = downsample_dataset(path, ['Date', 'Close'], 200, cache=ChartPyramidCache())['df']
+    dates = pd.to_datetime(out['Date'], utc=True)
+    assert dates.is_monotonic_increasing
+    assert out['Close'].max() == pd.read_csv(path)['Close'].max()   # same parse as the CSV reader
+
+
+def test_curves_keep_trough_and_stay_aligned():
+    n = 50_000
+    dates = pd.date_range('2021-01-04', periods=n, freq='5min')
+    eq = [{'date': d.isoformat(), 'equity': 1e5 + v} for d, v in zip(dates, _walk(n, seed=9) * 10)]
+    dd = [{'date': p['date'], 'drawdown': -(i % 11) * 0.3} for i, p in enumerate(eq)]
+    dd[31_337]['drawdown'] = -52.0
+    cache = ChartPyramidCache()
+
+    out = downsample_curves((1, 'done'), eq, dd, 500, cache=cache)
+    assert out['total_points'] == n and len(out['equity']) <= 2 * (4 * 500 + 6)   # two series
+    assert min(p['drawdown'] for p in out['drawdown']) == -52.0
+    assert all(a['date'] == b['date'] for a, b in zip(out['equity'], out['drawdown']))
+
+    zoom = downsample_curves((1, 'done'), eq, dd, 500, start=dates[1000].isoformat(),
+                             end=dates[1999].isoformat(), cache=cache)
+    assert zoom['range_points'] == 1000 and zoom['equity'][0] is eq[1000]
+    assert zoom['equity'][-1] is eq[1999] and cache.builds == 2
+
+    with pytest.raises(ValueError):
+        downsample_curves((2, None), [{'date': 'x', 'equity': 1.0}] * 10, [], 5, start='2021-01-01',
+                          cache=cache)
+
+
+def test_preview_endpoint_with_width(tmp_path):
+    from app.api.datasets import get_dataset_preview
+
+    path = write_dataset(_dataset(20_000), tmp_path / 'ds.parquet')
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+        id=3, name='ds', file_path=str(path))
+    res = asyncio.get_event_loop().run_until_complete(get_dataset_preview(
+        3, columns='Date,Close', max_rows=2000, sample=True, width=300, start=None, end=None,
+        method='minmax', db=db))
+    assert res['total_rows'] == 20_000 and res['sampled'] and res['columns'] == ['Date', 'Close']
+    assert res['returned_rows'] == len(res['data']) <= 4 * 300 + 6
+
+    from fastapi import HTTPException
+    with pytest.raises(HTTPException) as exc:
+        asyncio.get_event_loop().run_until_complete(get_dataset_preview(
+            3, columns='Date,Close', max_rows=2000, sample=True, width=300, start='not-a-date',
+            end=None, method='minmax', db=db))
+    assert exc.value.status_code == 400
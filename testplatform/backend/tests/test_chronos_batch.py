@@ -0,0 +1,165 @@
+"""Batched multi-series Chronos forecasts: stacked contexts, forecast cache, precompute task."""
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import chronos_service as cs
+from app.services.chronos_service import ForecastCache, forecast_batch, stack_contexts
+
+
+def _series(n, seed=0, start='2023-01-02'):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Date': pd.bdate_range(start, periods=n),
+        'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n))),
+    })
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Replace inference with a deterministic forecast: quantile q of series i = last + q."""
+    calls = []
+
+    def predict(pipeline, stacked, prediction_length, model_name='chronos-2'):
+        calls.append(stacked.copy())
+        last = stacked[:, -1].astype(np.float32)
+        q = np.arange(9, dtype=np.float32) - 4
+        return np.repeat((last[:, None] + q[None, :])[:, :, None], prediction_length, axis=2)
+
+    monkeypatch.setattr(cs, 'get_pipeline', lambda name: object())
+    monkeypatch.setattr(cs, 'predict_stacked', predict)
+    return calls
+
+
+def test_stack_contexts_left_pads_and_truncates():
+    out = stack_contexts([np.arange(5.0), np.arange(2.0), np.array([])])
+    assert out.shape == (3, 5) and out.dtype == np.float32
+    assert out[0].tolist() == [0, 1, 2, 3, 4]
+    assert np.isnan(out[1, :3]).all() and out[1, 3:].tolist() == [0, 1]
+    assert np.isnan(out[2]).all()
+    assert stack_contexts([np.arange(10.0)], width=4)[0].tolist() == [6, 7, 8, 9]
+
+
+def test_forecast_batch_stacks_series_and_reuses_cache(tmp_path, fake_model):
+    series = {f'S{i:03d}': _series(300 + i, seed=i) for i in range(150)}
+    series['SHORT'] = _series(20)
+    series['GAP'] = _series(300)
+    series['GAP'].loc[295:, 'Close'] = np.nan
+    cache = ForecastCache(tmp_path)
+
+    out = forecast_batch(series, prediction_length=3, model_name='chronos-bolt-small',
+                         context_length=256, batch_size=64, cache=cache)
+    assert len(fake_model) == 3                          # 151 series -> 3 stacked calls
+    assert all(a.shape[1] <= 256 for a in fake_model)
+    assert 'SHORT' not in out and len(out) == 151
+    gap = out['GAP']
+    assert gap['context_end'] == series['GAP']['Date'].iloc[294]   # last valid bar
+    assert gap['current_price'] == pytest.approx(series['GAP']['Close'].iloc[294])
+    s = out['S007']
+    assert s['quantiles'].shape == (9, 3) and s['median'][0] == pytest.approx(s['current_price'], rel=1e-6)
+    assert s['context_end'] == series['S007']['Date'].iloc[-1] and not s['cached']
+    assert s['probabilities'][1] == pytest.approx(0.5, abs=1e-4)
+
+    # Same context end: served from memory; a new process reads the files
+    for c in (cache, ForecastCache(tmp_path)):
+        again = forecast_batch(series, prediction_length=3, model_name='chronos-bolt-small',
+                               context_length=256, batch_size=64, cache=c)
+        assert len(fake_model) == 3 and all(r['cached'] for r in again.values())
+        np.testing.assert_allclose(again['S007']['quantiles'], s['quantiles'])
+
+    # One new bar -> only that symbol is forecast again; other horizons/contexts are separate
+    series['S001'] = _series(302, seed=1)
+    forecast_batch(series, prediction_length=3, model_name='chronos-bolt-small',
+                   context_length=256, cache=cache)
+    assert len(fake_model) == 4 and fake_model[-1].shape[0] == 1
+    forecast_batch({'S002': series['S002']}, prediction_length=5, model_name='chronos-bolt-small',
+                   context_length=256, cache=cache)
+    assert len(fake_model) == 5
+
+
+def test_precompute_task_fills_cache(tmp_path, monkeypatch, fake_model):
+    from app.services import chronos_precompute_handler as handler
+
+    data = {'AAA': _series(400, seed=1), 'BBB': _series(400, seed=2)}
+
+    class Provider:
+        def get_ohlcv_data(self, symbol, start_date=None, end_date=None, interval='1d'):
+            if symbol not in data:
+                raise KeyError(symbol)
+            return data[symbol]
+
+    import app.api.datasets as datasets
+    monkeypatch.setattr(datasets, 'get_ohlcv_provider', lambda name: Provider())
+    monkeypatch.setattr(handler, 'get_task_queue', lambda: MagicMock())
+    monkeypatch.setattr(cs, '_forecast_cache', ForecastCache(tmp_path))
+
+    payload = {'universe': {'mode': 'static', 'symbols': ['aaa', 'BBB', 'ZZZ']},
+               'model_name': 'chronos-bolt-tiny', 'as_of': '2024-06-28'}
+    res = handler.handle_chronos_precompute('t1', payload)
+    assert res['status'] == 'completed', res
+    summary = res['summary']
+    assert (summary['symbols'], summary['forecast'], summary['cached']) == (3, 2, 0)
+    assert list(summary['failed']) == ['ZZZ'] and len(fake_model) == 1
+
+    res = handler.handle_chronos_precompute('t2', payload)
+    assert (res['summary']['forecast'], res['summary']['cached']) == (0, 2)
+    assert len(list(tmp_path.rglob('*.npy'))) == 2
+
+    # The API serves the precomputed forecasts without running the model
+    from app.api.models import get_foundation_forecasts
+    got = asyncio.run(get_foundation_forecasts('aaa,BBB,ZZZ', model_name='chronos-bolt-tiny'))
+    assert sorted(got['forecasts']) == ['AAA', 'BBB'] and got['missing'] == ['ZZZ']
+    assert got['forecasts']['AAA']['context_end'] == data['AAA']['Date'].iloc[-1].isoformat()
+    assert len(got['forecasts']['AAA']['median']) == 1 and len(fake_model) == 1
+
+    assert handler.handle_chronos_precompute('t3', {'model_name': 'chronos-2'})['status'] == 'failed'
+    assert handler.handle_chronos_precompute('t4', {'symbols': ['A'], 'model_name': 'x'})['status'] == 'failed'
+
+
+def test_forecast_cache_sees_other_writers(tmp_path):
+    """Two caches on one directory (two processes): neither loses the other's entries,
+    and each sees forecasts the other stored after its own first read."""
+    a, b = ForecastCache(tmp_path), ForecastCache(tmp_path)
+    day = pd.bdate_range('2024-06-03', periods=40)
+    q = lambda k: np.full((9, 1), float(k), dtype=np.float32)
+
+    assert a.get('AAA', day[0], 1, 'tag') is None               # a has read the symbol
+    b.put_many('tag', 1, {'AAA': (day[0], q(0))})
+    np.testing.assert_array_equal(a.get('AAA', day[0], 1, 'tag'), q(0))
+
+    def write(cache, offset):
+        for k in range(offset, len(day), 2):
+            cache.put_many('tag', 1, {'AAA': (day[k], q(k))})
+
+    threads = [threading.Thread(target=write, args=(c, i)) for i, c in enumerate((a, b))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for c in (a, b, ForecastCache(tmp_path)):
+        for k in range(len(day)):
+            np.testing.assert_array_equal(c.get('AAA', day[k], 1, 'tag'), q(k))
+    end, latest = a.latest('AAA', 1, 'tag', as_of=day[20] + pd.Timedelta(hours=12))
+    assert end == day[20] and latest[0, 0] == 20
+    assert a.latest('AAA', 1, 'tag', as_of=day[0] - pd.Timedelta(days=1)) is None
+    assert cs.cached_forecasts(['AAA', 'BBB'], model_name='chronos-2', context_length=1,
+                               cache=ForecastCache(tmp_path)) == {}
+
+
+def test_predict_stacked_feeds_one_tensor():
+    torch = pytest.importorskip('torch')
+    seen = []
+
+    class Pipeline:
+        def predict(self, inputs, prediction_length=1):
+            seen.append(tuple(inputs.shape))
+            return torch.zeros((inputs.shape[0], 9, prediction_length))
+
+    stacked = stack_contexts([np.arange(30.0), np.arange(50.0)])
+    assert cs.predict_stacked(Pipeline(), stacked, 2, 'chronos-bolt-small').shape == (2, 9, 2)
+    assert cs.predict_stacked(Pipeline(), stacked, 2, 'chronos-2').shape == (2, 9, 2)
+    assert seen == [(2, 50), (2, 1, 50)]
@@ -0,0 +1,180 @@
+"""Parquet dataset files: pruned reads, footer summaries, and unchanged endpoint output."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import dataset_store
+from app.services.dataset_store import (
+    convert_csv_dataset, dataset_columns, dataset_num_rows, dataset_summary,
+    iter_csv_chunks, read_dataset, write_dataset,
+)
+
+
+def _frame(n=1200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    df = pd.DataFrame({
+        'Date': pd.date_range('2024-01-02 09:30', periods=n, freq='5min', tz='America/New_York'),
+        'Open': close, 'High': close + 0.3, 'Low': close - 0.3, 'Close': close,
+        'Volume': rng.integers(100, 10_000, n),
+        'RSI_14': np.where(np.arange(n) < 14, np.nan, rng.uniform(0, 100, n)),
+        'news_label': rng.choice(['pos', 'neg', 'flat'], n),
+        'price_up_5': rng.integers(0, 2, n).astype(bool),
+    })
+    return df
+
+
+def _db_for(path):
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(
+        id=1, name='ds', file_path=str(path))
+    return db
+
+
+@pytest.fixture
+def small_row_groups(monkeypatch):
+    monkeypatch.setattr(dataset_store, 'ROW_GROUP_ROWS', 100)
+
+
+def test_parquet_round_trip_and_pruned_reads(tmp_path, small_row_groups):
+    df = _frame()
+    path = write_dataset(df, tmp_path / 'ds.parquet')
+    assert not list(tmp_path.glob('.*.tmp'))
+
+    back = read_dataset(path)
+    pd.testing.assert_frame_equal(back, df)
+    assert dataset_columns(path) == list(df.columns) and dataset_num_rows(path) == len(df)
+
+    pd.testing.assert_frame_equal(read_dataset(path, columns=['Close', 'Date']), df[['Close', 'Date']])
+    pd.testing.assert_frame_equal(read_dataset(path, nrows=150), df.head(150))
+    rows = [0, 99, 100, 101, 555, 1199]               # spans row-group boundaries
+    pd.testing.assert_frame_equal(read_dataset(path, columns=['RSI_14'], rows=rows),
+                                  df[['RSI_14']].iloc[rows].reset_index(drop=True))
+    assert list(read_dataset(path, nrows=0).columns) == list(df.columns)
+    with pytest.raises(ValueError, match='nope'):
+        read_dataset(path, columns=['Close', 'nope'])
+
+
+def test_csv_reads_match_parquet_reads(tmp_path):
+    df = _frame(300)
+    csv = write_dataset(df, tmp_path / 'ds.csv')
+    pq = convert_csv_dataset(csv)
+    assert pq.suffix == '.parquet' and csv.exists()
+
+    from_csv = pd.read_csv(csv)
+    pd.testing.assert_frame_equal(read_dataset(pq).drop(columns='Date'), from_csv.drop(columns='Date'))
+    assert (read_dataset(pq)['Date'] == pd.to_datetime(from_csv['Date'])).all()
+    rows = [3, 7, 250]
+    pd.testing.assert_frame_equal(read_dataset(csv, columns=['Close'], rows=rows),
+                                  from_csv[['Close']].iloc[rows].reset_index(drop=True))
+    assert dataset_num_rows(csv) == 300 and dataset_columns(csv) == list(df.columns)
+
+
+def _old_stats(path):
+    """The stats endpoint's original computation over the parsed CSV."""
+    df = pd.read_csv(path)
+    df['Date'] = pd.to_datetime(df['Date'])
+    stats = {}
+    for col in df.select_dtypes(include=['int64', 'float64']).columns:
+        d = df[col].dropna()
+        stats[col] = {k: round(float(getattr(d, k)()), 4) for k in ('mean', 'std', 'min', 'max', 'median')}
+        stats[col]['count'] = int(len(d))
+    return {
+        'rows': len(df), 'columns': list(df.columns),
+        'column_types': {c: str(t) for c, t in df.dtypes.items()},
+        'missing': {c: int(df[c].isna().sum()) for c in df.columns},
+        'date_range': {'start': str(df['Date'].min()), 'end': str(df['Date'].max())},
+        'numeric': stats,
+    }
+
+
+def test_stats_endpoint_reads_summary_from_footer(tmp_path, monkeypatch):
+    from app.api.datasets import get_dataset_stats
+
+    df = _frame(500)
+    csv = write_dataset(df, tmp_path / 'ds.csv')
+    pq = convert_csv_dataset(csv)
+    expected = _old_stats(csv)
+
+    csv_got = asyncio.get_event_loop().run_until_complete(get_dataset_stats(1, _db_for(csv)))
+
+    # The Parquet path must not touch the data pages
+    import app.api.datasets as dsmod
+    no_read = lambda *a, **k: pytest.fail('full read')
+    monkeypatch.setattr(dataset_store, 'read_dataset', no_read)
+    monkeypatch.setattr(dsmod, 'read_dataset', no_read)
+    got = asyncio.get_event_loop().run_until_complete(get_dataset_stats(1, _db_for(pq)))
+    assert got == csv_got
+    assert got['total_rows'] == expected['rows'] and got['columns'] == expected['columns']
+    assert got['column_types'] == expected['column_types']
+    assert {c: v['count'] for c, v in got['missing_data'].items()} == expected['missing']
+    assert got['date_range'] == expected['date_range']
+    assert got['numeric_statistics'] == expected['numeric']
+    assert dataset_summary(pq)['date_sorted'] is True
+
+
+def test_preview_samples_rows_without_full_read(tmp_path, small_row_groups):
+    from app.api.datasets import get_dataset_preview
+
+    df = _frame(1000)
+    csv = write_dataset(df, tmp_path / 'ds.csv')
+    pq = convert_csv_dataset(csv)
+    for kwargs in (dict(columns='Date,Close,nope', max_rows=90, sample=True),
+                   dict(columns=None, max_rows=50, sample=False),
+                   dict(columns='Close', max_rows=0, sample=True)):
+        kwargs.update(width=None, start=None, end=None, method='minmax')
+        a = asyncio.get_event_loop().run_until_complete(get_dataset_preview(1, db=_db_for(csv), **kwargs))
+        b = asyncio.get_event_loop().run_until_complete(get_dataset_preview(1, db=_db_for(pq), **kwargs))
+        assert (a['total_rows'], a['returned_rows'], a['sampled'], a['columns']) == \
+               (b['total_rows'], b['returned_rows'], b['sampled'], b['columns'])
+        for ra, rb in zip(a['data'], b['data']):
+            if 'Date' in ra:
+                assert pd.Timestamp(ra.pop('Date')) == pd.Timestamp(rb.pop('Date'))
+            assert ra == rb
+
+
+def test_export_streams_csv_for_parquet_datasets(tmp_path, small_row_groups):
+    df = _frame(250)
+    pq = write_dataset(df, tmp_path / 'ds.parquet')
+    text = b''.join(iter_csv_chunks(pq, batch_rows=64)).decode()
+    assert text.count('\n') == 251 and text.splitlines()[0] == ','.join(df.columns)
+    empty = write_dataset(df.head(0), tmp_path / 'empty.parquet')
+    assert b''.join(iter_csv_chunks(empty)).decode().strip() == ','.join(df.columns)
+
+
+def test_feature_endpoints_persist_the_computed_frame(tmp_path, monkeypatch):
+    import app.api.datasets as dsmod
+
+    df = _frame(300)
+    pq = write_dataset(df, tmp_path / 'ds.parquet')
+    db = _db_for(pq)
+    db.query.return_value.filter.return_value.first.return_value.ticker = 'AAPL'
+    db.query.return_value.filter.return_value.first.return_value.fundamentals_config = None
+
+    def add_fundamentals(frame, ticker, metrics):
+        return frame.assign(**{f'last_{m}': 1.0 for m in metrics})
+    monkeypatch.setattr(dsmod.FundamentalsService, 'create_fundamental_features',
+                        staticmethod(add_fundamentals))
+    out = asyncio.get_event_loop().run_until_complete(
+        dsmod.calculate_fundamental_features(1, metrics=['eps'], db=db))
+    assert out['features_added'] == ['last_eps']
+    back = read_dataset(pq)
+    assert list(back.columns) == list(df.columns) + ['last_eps'] and len(back) == len(df)
+
+    class FakeMacro:
+        MACRO_INDICATORS = {'VIX': None}
+
+        def integrate_macro_with_ohlc(self, frame, indicators):
+            return frame.assign(macro_vix=20.0)
+
+        def create_yield_curve_features(self, frame):
+            return frame.assign(yc_spread=0.5)
+    monkeypatch.setattr(dsmod, 'MacroService', FakeMacro)
+    out = asyncio.get_event_loop().run_until_complete(
+        dsmod.calculate_macro_features(1, indicators=None, include_yield_curve=True, db=db))
+    assert out['features_added'] == ['macro_vix', 'yc_spread']
+    assert list(read_dataset(pq).columns)[-3:] == ['last_eps', 'macro_vix', 'yc_spread']
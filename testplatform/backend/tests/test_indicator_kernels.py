@@ -0,0 +1,303 @@
+"""
+Bit-for-bit parity of the numpy indicator kernels with the original per-bar loops.
+
+The ``_ref_*`` functions below are the loop implementations that
+``TechnicalIndicators`` / ``IndicatorService`` used before
+``app.services.indicator_kernels`` replaced them; they are kept here verbatim as the
+parity reference.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators import TechnicalIndicators
+from app.services.indicators import IndicatorService
+from app.services import indicator_kernels as kernels
+
+
+# ---------------------------------------------------------------------------
+# Reference loops
+# ---------------------------------------------------------------------------
+
+def _ref_sar(high, low, af_start, af_max):
+    n = len(high)
+    sar = np.zeros(n)
+    af = af_start
+    is_uptrend = True
+    ep = high[0]
+    sar[0] = low[0]
+    for i in range(1, n):
+        sar[i] = sar[i - 1] + af * (ep - sar[i - 1])
+        if is_uptrend:
+            sar[i] = min(sar[i], low[i - 1])
+            if i >= 2:
+                sar[i] = min(sar[i], low[i - 2])
+            if low[i] < sar[i]:
+                is_uptrend = False
+                sar[i] = ep
+                ep = low[i]
+                af = af_start
+            else:
+                if high[i] > ep:
+                    ep = high[i]
+                    af = min(af + af_start, af_max)
+        else:
+            sar[i] = max(sar[i], high[i - 1])
+            if i >= 2:
+                sar[i] = max(sar[i], high[i - 2])
+            if high[i] > sar[i]:
+                is_uptrend = True
+                sar[i] = ep
+                ep = high[i]
+                af = af_start
+            else:
+                if low[i] < ep:
+                    ep = low[i]
+                    af = min(af + af_start, af_max)
+    return sar
+
+
+def _ref_service_zigzag(high, low, deviation_pct):
+    n = len(high)
+    zigzag = np.full(n, np.nan)
+    pivots = []
+    deviation = deviation_pct / 100.0
+    last_pivot_type = None
+    last_pivot_price = (high[0] + low[0]) / 2
+    for i in range(1, min(n, 20)):
+        high_change = (high[i] - low[0]) / low[0]
+        low_change = (high[0] - low[i]) / high[0]
+        if high_change >= deviation:
+            last_pivot_type = 'low'
+            last_pivot_price = low[0]
+            pivots.append((0, low[0], 'low'))
+            break
+        elif low_change >= deviation:
+            last_pivot_type = 'high'
+            last_pivot_price = high[0]
+            pivots.append((0, high[0], 'high'))
+            break
+    if last_pivot_type is None:
+        last_pivot_type = 'high'
+        last_pivot_price = high[0]
+        pivots.append((0, high[0], 'high'))
+    for i in range(1, n):
+        if last_pivot_type == 'high':
+            if low[i] < last_pivot_price * (1 - deviation):
+                pivots.append((i, low[i], 'low'))
+                last_pivot_type = 'low'
+                last_pivot_price = low[i]
+            elif high[i] > last_pivot_price:
+                pivots[-1] = (i, high[i], 'high')
+                last_pivot_price = high[i]
+        else:
+            if high[i] > last_pivot_price * (1 + deviation):
+                pivots.append((i, high[i], 'high'))
+                last_pivot_type = 'high'
+                last_pivot_price = high[i]
+            elif low[i] < last_pivot_price:
+                pivots[-1] = (i, low[i], 'low')
+                last_pivot_price = low[i]
+    for idx, price, _ in pivots:
+        zigzag[idx] = price
+    zigzag_interp = np.copy(zigzag)
+    for i in range(len(pivots) - 1):
+        start_idx, start_price, _ = pivots[i]
+        end_idx, end_price, _ = pivots[i + 1]
+        if end_idx > start_idx:
+            for j in range(start_idx, end_idx + 1):
+                t = (j - start_idx) / (end_idx - start_idx)
+                zigzag_interp[j] = start_price + t * (end_price - start_price)
+    return zigzag_interp
+
+
+def _ref_technical_zigzag(high, low, deviation_pct):
+    n = len(high)
+    zigzag = np.full(n, np.nan)
+    direction = 0
+    last_pivot_idx = 0
+    last_pivot_val = (high[0] + low[0]) / 2
+    for i in range(1, n):
+        if direction == 0:
+            if high[i] >= last_pivot_val * (1 + deviation_pct/100):
+                direction = 1
+                last_pivot_val = high[i]
+                last_pivot_idx = i
+            elif low[i] <= last_pivot_val * (1 - deviation_pct/100):
+                direction = -1
+                last_pivot_val = low[i]
+                last_pivot_idx = i
+        elif direction == 1:
+            if high[i] > last_pivot_val:
+                last_pivot_val = high[i]
+                last_pivot_idx = i
+            elif low[i] <= last_pivot_val * (1 - deviation_pct/100):
+                zigzag[last_pivot_idx] = last_pivot_val
+                direction = -1
+                last_pivot_val = low[i]
+                last_pivot_idx = i
+        else:
+            if low[i] < last_pivot_val:
+                last_pivot_val = low[i]
+                last_pivot_idx = i
+            elif high[i] >= last_pivot_val * (1 + deviation_pct/100):
+                zigzag[last_pivot_idx] = last_pivot_val
+                direction = 1
+                last_pivot_val = high[i]
+                last_pivot_idx = i
+    zigzag[last_pivot_idx] = last_pivot_val
+    return zigzag
+
+
+def _ref_directional_movement(high, low, close):
+    n = len(high)
+    plus_dm = np.zeros(n)
+    minus_dm = np.zeros(n)
+    tr = np.zeros(n)
+    for i in range(1, n):
+        up_move = high[i] - high[i-1]
+        down_move = low[i-1] - low[i]
+        plus_dm[i] = up_move if up_move > down_move and up_move > 0 else 0
+        minus_dm[i] = down_move if down_move > up_move and down_move > 0 else 0
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i-1]), abs(low[i] - close[i-1]))
+    return plus_dm, minus_dm, tr
+
+
+def _ref_obv(close, volume):
+    n = len(close)
+    obv = np.zeros(n)
+    obv[0] = volume[0]
+    for i in range(1, n):
+        if close[i] > close[i-1]:
+            obv[i] = obv[i-1] + volume[i]
+        elif close[i] < close[i-1]:
+            obv[i] = obv[i-1] - volume[i]
+        else:
+            obv[i] = obv[i-1]
+    return obv
+
+
+def _ref_rsi(close, period):
+    n = len(close)
+    delta = np.diff(close, prepend=close[0])
+    gains = np.where(delta > 0, delta, 0)
+    losses = np.where(delta < 0, -delta, 0)
+    avg_gain = np.zeros(n)
+    avg_loss = np.zeros(n)
+    if n >= period:
+        avg_gain[period - 1] = np.mean(gains[1:period + 1])
+        avg_loss[period - 1] = np.mean(losses[1:period + 1])
+        for i in range(period, n):
+            avg_gain[i] = (avg_gain[i - 1] * (period - 1) + gains[i]) / period
+            avg_loss[i] = (avg_loss[i - 1] * (period - 1) + losses[i]) / period
+    rsi = np.full(n, np.nan)
+    for i in range(period - 1, n):
+        if avg_loss[i] == 0:
+            rsi[i] = 100.0
+        else:
+            rs = avg_gain[i] / avg_loss[i]
+            rsi[i] = 100.0 - (100.0 / (1.0 + rs))
+    return rsi
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _assert_bitwise(actual, expected):
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    assert actual.shape == expected.shape
+    nan = np.isnan(expected)
+    assert np.array_equal(np.isnan(actual), nan)
+    assert np.array_equal(actual[~nan].view(np.uint64), expected[~nan].view(np.uint64))
+
+
+def _ohlcv(n, seed, vol=0.01, flat_every=0, nan_at=()):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    if flat_every:
+        close[::flat_every] = np.roll(close, 1)[::flat_every]
+    spread = np.abs(rng.normal(0, vol, n)) * close
+    high = close + spread
+    low = close - spread * rng.uniform(0.2, 1.0, n)
+    volume = rng.integers(1_000, 100_000, n)
+    for i in nan_at:
+        high[i] = low[i] = close[i] = np.nan
+    return pd.DataFrame({'Open': close, 'High': high, 'Low': low, 'Close': close, 'Volume': volume})
+
+
+CASES = [
+    dict(n=2, seed=0),
+    dict(n=25, seed=1),
+    dict(n=3_000, seed=2),
+    dict(n=3_000, seed=3, vol=0.03),
+    dict(n=3_000, seed=4, vol=0.002, flat_every=3),
+    dict(n=1_500, seed=5, nan_at=(10, 11, 700)),
+]
+
+
+@pytest.fixture(params=CASES, ids=lambda c: f"n{c['n']}-s{c['seed']}")
+def bars(request):
+    return _ohlcv(**request.param)
+
+
+# ---------------------------------------------------------------------------
+# Parity
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("af_start,af_max", [(0.02, 0.2), (0.01, 0.1), (0.05, 0.5)])
+def test_sar_parity(bars, af_start, af_max):
+    expected = _ref_sar(bars['High'].values, bars['Low'].values, af_start, af_max)
+    _assert_bitwise(IndicatorService().calculate_sar(bars, af_start, af_max).values, expected)
+    _assert_bitwise(TechnicalIndicators.calculate_sar(bars, af_start, af_max).values, expected)
+
+
+@pytest.mark.parametrize("deviation_pct", [0.5, 2.0, 5.0, 15.0])
+def test_service_zigzag_parity(bars, deviation_pct):
+    expected = _ref_service_zigzag(bars['High'].values, bars['Low'].values, deviation_pct)
+    _assert_bitwise(IndicatorService().calculate_zigzag(bars, deviation_pct).values, expected)
+
+
+@pytest.mark.parametrize("deviation_pct", [0.5, 2.0, 5.0, 15.0])
+def test_technical_zigzag_parity(bars, deviation_pct):
+    expected = _ref_technical_zigzag(bars['High'].values, bars['Low'].values, deviation_pct)
+    _assert_bitwise(TechnicalIndicators.calculate_zigzag(bars, deviation_pct).values, expected)
+
+
+def test_directional_movement_parity(bars):
+    expected = _ref_directional_movement(bars['High'].values, bars['Low'].values, bars['Close'].values)
+    for actual, ref in zip(kernels.directional_movement(bars['High'].values, bars['Low'].values,
+                                                        bars['Close'].values), expected):
+        _assert_bitwise(actual, ref)
+
+
+def test_obv_parity(bars):
+    expected = _ref_obv(bars['Close'].values, bars['Volume'].values)
+    _assert_bitwise(TechnicalIndicators.calculate_obv(bars).values, expected)
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_rsi_parity(bars, period):
+    expected = _ref_rsi(bars['Close'].values, period)
+    _assert_bitwise(IndicatorService().calculate_rsi(bars, period).values, expected)
+
+
+def test_zigzag_chunk_boundaries(monkeypatch):
+    """Pivots straddling chunk edges still match when every leg goes through tiny chunks."""
+    monkeypatch.setattr(kernels, "_ZIGZAG_SCALAR_BARS", 1)
+    monkeypatch.setattr(kernels, "_ZIGZAG_MIN_CHUNK", 1)
+    monkeypatch.setattr(kernels, "_ZIGZAG_MAX_CHUNK", 3)
+    bars = _ohlcv(800, seed=11, vol=0.02)
+    high, low = bars['High'].values, bars['Low'].values
+    _assert_bitwise(TechnicalIndicators.calculate_zigzag(bars, 3.0).values,
+                    _ref_technical_zigzag(high, low, 3.0))
+    _assert_bitwise(IndicatorService().calculate_zigzag(bars, 3.0).values,
+                    _ref_service_zigzag(high, low, 3.0))
+
+
+def test_interpolate_pivots_single_pivot():
+    out = kernels.interpolate_pivots(5, np.array([2]), np.array([7.5]))
+    assert np.isnan(out[[0, 1, 3, 4]]).all()
+    assert out[2] == 7.5
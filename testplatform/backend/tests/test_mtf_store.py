@@ -0,0 +1,103 @@
+"""Multi-timeframe feature store: same values as resample + merge_asof, reused from disk."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.indicators import IndicatorService, align_higher_timeframe_to_lower
+from app.services.mtf_store import MultiTimeframeStore, asof_join_index
+
+INDICATORS = [
+    {'type': 'rsi', 'period': 14},
+    {'type': 'macd', 'fast': 12, 'slow': 26, 'signal': 9},
+    {'type': 'zigzag', 'deviation_pct': 2.0},
+    {'type': 'donchian_breakout', 'period': 10},
+]
+
+
+def _bars(n=2000, freq='15min', tz=None, seed=3):
+    rng = np.random.default_rng(seed)
+    prices = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    dates = pd.date_range('2024-01-01 09:30', periods=n, freq=freq, tz=tz)
+    return pd.DataFrame({
+        'Date': dates, 'Open': prices, 'High': prices + 0.5, 'Low': prices - 0.5,
+        'Close': prices, 'Volume': rng.integers(100, 1000, n).astype(float),
+    })
+
+
+def _assert_same(got, expected):
+    assert list(got) == list(expected)
+    for name in expected:
+        np.testing.assert_array_equal(got[name].values, expected[name].values, err_msg=name)
+        assert got[name].index.equals(expected[name].index)
+
+
+@pytest.mark.parametrize("source,target,freq,tz", [
+    ('15m', '1h', '15min', None),
+    ('15m', '4h', '15min', 'UTC'),
+    ('1h', '1d', '1h', 'America/New_York'),
+])
+def test_store_matches_resample_and_merge_asof(tmp_path, source, target, freq, tz):
+    df = _bars(freq=freq, tz=tz)
+    service = IndicatorService()
+    expected = service.calculate_indicators_multi_timeframe(df, INDICATORS, target, source_timeframe=source)
+
+    store = MultiTimeframeStore(root=tmp_path)
+    got = service.calculate_indicators_multi_timeframe(
+        df, INDICATORS, target, source_timeframe=source, store=store, store_key='dataset_1')
+    _assert_same(got, expected)
+
+    # A fresh process (new store on the same root) reads everything back from disk
+    calls = []
+    class CountingService(IndicatorService):
+        def calculate_indicators(self, frame, indicators):
+            calls.append(indicators)
+            return super().calculate_indicators(frame, indicators)
+
+    reloaded = MultiTimeframeStore(root=tmp_path)
+    again = CountingService().calculate_indicators_multi_timeframe(
+        df, INDICATORS, target, source_timeframe=source, store=reloaded, store_key='dataset_1')
+    _assert_same(again, expected)
+    assert reloaded.disk_loads == 1 and reloaded.builds == 0 and calls == []
+
+
+def test_asof_join_index_matches_merge_asof():
+    higher = pd.DataFrame({'Date': pd.date_range('2024-01-01 10:00', periods=5, freq='1h'),
+                           'v': np.arange(5, dtype=float)})
+    lower = pd.DataFrame({'Date': pd.date_range('2024-01-01 09:00', periods=30, freq='10min')})
+    idx = asof_join_index(lower['Date'], higher['Date'])
+    assert (idx[:6] == -1).all()
+    expected = align_higher_timeframe_to_lower(lower, higher, ['v'])['v'].values
+
+    from app.services.mtf_store import TimeframeView
+    np.testing.assert_array_equal(TimeframeView(higher, idx).align(higher['v'].values), expected)
+
+
+def test_new_content_replaces_stale_entry(tmp_path):
+    store = MultiTimeframeStore(root=tmp_path)
+    df = _bars(500)
+    first = store.view(df, '1h', '15m', key='dataset_7')
+    assert store.view(df, '1h', '15m', key='dataset_7') is first and store.hits == 1
+
+    changed = df.copy()
+    changed.loc[len(changed) - 1, 'Close'] += 1.0        # regenerated dataset
+    second = store.view(changed, '1h', '15m', key='dataset_7')
+    assert second is not first and store.builds == 2
+    entries = list((tmp_path / 'dataset_7' / '15m__1h').iterdir())
+    assert entries == [second.path]
+
+    with pytest.raises(ValueError):
+        store.view(df, '5m', '15m', key='dataset_7')
+
+
+def test_targets_through_store_match_direct_path(tmp_path):
+    from app.services.darts_models import PredictionTargetService
+
+    df = _bars(800)
+    targets = [{'type': 'trend_reversal', 'indicator': 'rsi', 'indicatorParams': {'period': 14},
+                'threshold': 30, 'direction': 'bullish', 'timeframe': '1h'}]
+    service = PredictionTargetService()
+    expected = service.calculate_all_targets(df, targets, dataset_timeframe='15m')
+    got = service.calculate_all_targets(df, targets, dataset_timeframe='15m',
+                                        mtf_store=MultiTimeframeStore(root=tmp_path), store_key='ds')
+    assert got[0]['columnName'] == expected[0]['columnName']
+    assert got[0]['data'] == expected[0]['data']
@@ -291,6 +291,61 @@ def test_collect_schedule_results_snapshots_when_terminal(patch_session, Session
     s.close()
 
 
+def test_batch_launch_queues_one_task_and_runs_variants_sharing_state(
+        patch_session, Session, stub_queue, monkeypatch):
+    from app.services import robustness_handler as H
+    from app.services.backtest import daily_backtest_handler as DH
+    from app.services.backtest import rerun_handler as RH
+
+    s = Session()
+    bt = _make_parent(s, trades=[{"pnl_pct": 5.0, "exit_time": "2022-01-15T00:00:00"}])
+    run = _make_run(s, bt.id, "schedule", {"day_variants": True, "time_variants": ["12:30"],
+                                           "batch": True})
+    run_id = run.id
+    s.close()
+
+    H.launch_schedule_variants(run_id)
+    # Batch mode: the 6 variant rows exist, but ONE task runs them all.
+    assert [c["task_type"] for c in stub_queue.calls] == [H.BATCH_TASK_TYPE]
+    assert stub_queue.calls[0]["payload"] == {"robustness_run_id": run_id}
+
+    s = Session()
+    variant_ids = list(s.query(RobustnessRun).get(run_id).variant_backtest_ids)
+    s.close()
+    assert len(variant_ids) == 6
+
+    seen = []
+    monkeypatch.setattr(RH, "build_rerun_config", lambda db, row: {"backtest_id": row.id})
+
+    def _fake_run(config, progress_cb=None, shared=None):
+        seen.append((config["backtest_id"], shared))
+        if config["backtest_id"] == variant_ids[1]:
+            raise RuntimeError("boom")
+        return {"annualized_return": 1.0}
+
+    def _fake_persist(db, row, results):
+        row.annualized_return = results["annualized_return"]
+        row.max_drawdown = -1.0
+
+    monkeypatch.setattr(DH, "run_daily_backtest", _fake_run)
+    monkeypatch.setattr(DH, "_persist_results", _fake_persist)
+
+    completed = H.run_schedule_variant_batch(run_id)
+
+    # Every variant ran, in order, against ONE shared state; the failure did not stop the batch.
+    assert [vid for vid, _ in seen] == variant_ids
+    assert len({id(shared) for _, shared in seen}) == 1 and seen[0][1] is not None
+    assert completed == [v for v in variant_ids if v != variant_ids[1]]
+    s = Session()
+    statuses = {v.id: v.status for v in s.query(Backtest).filter(Backtest.id.in_(variant_ids))}
+    assert statuses[variant_ids[1]] == "failed"
+    assert sum(1 for st in statuses.values() if st == "completed") == 5
+    run = s.query(RobustnessRun).get(run_id)
+    assert run.status == "completed"
+    assert len(run.results["schedule_summary"]) == 6
+    s.close()
+
+
 # ---------------------------------------------------------------------------
 # Shared reconstruction helper
 # ---------------------------------------------------------------------------
@@ -0,0 +1,97 @@
+"""Closed-form rolling OLS vs per-window least squares, and the linreg trend target parity."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.rolling_ols import rolling_ols
+from app.services.trend_targets import TrendTargetService
+
+
+def _ref_fit(y, w, min_periods):
+    """Per-window numpy least squares (positions 0..w-1, NaNs dropped)."""
+    n = len(y)
+    out = {k: np.full(n, np.nan) for k in ("slope", "intercept", "r2", "resid_std")}
+    for t in range(w - 1, n):
+        win = y[t - w + 1:t + 1]
+        x = np.arange(w, dtype=float)
+        m = ~np.isnan(win)
+        if m.sum() < min_periods:
+            continue
+        xs, ys = x[m], win[m]
+        slope, intercept = np.polyfit(xs, ys, 1)
+        resid = ys - (intercept + slope * xs)
+        sst = ((ys - ys.mean()) ** 2).sum()
+        out["slope"][t], out["intercept"][t] = slope, intercept
+        out["r2"][t] = 1 - (resid ** 2).sum() / sst if sst > 0 else np.nan
+        out["resid_std"][t] = np.sqrt((resid ** 2).sum() / (len(xs) - 2)) if len(xs) > 2 else np.nan
+    return out
+
+
+def _prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 150 + np.cumsum(rng.normal(0, 0.3, n))
+
+
+def test_matches_per_window_least_squares_for_several_windows():
+    y = _prices(3000)
+    fits = rolling_ols(y, [5, 20, 77])
+    for w, fit in fits.items():
+        ref = _ref_fit(y, w, w)
+        for k in ("slope", "intercept", "r2", "resid_std"):
+            np.testing.assert_allclose(getattr(fit, k), ref[k], rtol=1e-7, atol=1e-9, err_msg=f"{k} w={w}")
+        np.testing.assert_allclose(fit.endpoint[w - 1:], (ref["intercept"] + ref["slope"] * (w - 1))[w - 1:])
+
+
+def test_long_series_stays_precise_across_blocks():
+    # Far beyond one block, on a drifting level: restarted sums must keep full precision
+    y = 1e4 + np.cumsum(np.random.default_rng(1).normal(0, 1.0, 200_000))
+    fit = rolling_ols(y, 50)[50]
+    for t in (49, 1023, 1024, 1072, 1073, 123_456, 199_999):
+        win = y[t - 49:t + 1]
+        slope, intercept = np.polyfit(np.arange(50.0), win, 1)
+        assert fit.slope[t] == pytest.approx(slope, rel=1e-8, abs=1e-10)
+        assert fit.intercept[t] == pytest.approx(intercept, rel=1e-10)
+
+
+def test_nan_handling_and_min_periods():
+    y = _prices(300, seed=2)
+    y[[10, 11, 150, 299]] = np.nan
+    strict = rolling_ols(y, 20)[20]
+    assert np.isnan(strict.slope[10:31]).all() and np.isnan(strict.slope[299])
+    assert not np.isnan(strict.slope[31])
+
+    loose = rolling_ols(y, 20, min_periods=15)[20]
+    ref = _ref_fit(y, 20, 15)
+    np.testing.assert_allclose(loose.slope, ref["slope"], rtol=1e-7, atol=1e-10)
+    assert loose.nobs[30] == 19
+
+    flat = rolling_ols(np.ones(10), 4)[4]
+    assert (flat.slope[3:] == 0).all() and np.isnan(flat.r2[3:]).all()
+
+    with pytest.raises(ValueError):
+        rolling_ols(y, 1)
+
+
+def _ref_linreg_slope(close, lookback):
+    def calc_slope(series):
+        y = series.values
+        x = np.arange(len(y))
+        n = len(x)
+        slope = (n * np.sum(x * y) - np.sum(x) * np.sum(y)) / (n * np.sum(x ** 2) - np.sum(x) ** 2)
+        return slope / np.mean(y) * 100
+    return close.rolling(window=lookback).apply(calc_slope, raw=False)
+
+
+def test_linreg_trend_target_unchanged():
+    close = _prices(2000, seed=4)
+    close[500] = np.nan
+    df = pd.DataFrame({'Date': pd.date_range('2024-01-01', periods=2000, freq='5min'),
+                       'Open': close, 'High': close + 0.2, 'Low': close - 0.2, 'Close': close})
+    out = TrendTargetService().calculate_trend_targets(df, method='linear_regression', lookback_period=20)
+
+    slope = _ref_linreg_slope(df['Close'], 20)
+    np.testing.assert_allclose(out['trend_strength'].values, slope.abs().values, rtol=1e-7, atol=1e-12)
+    expected = np.where(slope > 0.1, 'uptrend', np.where(slope < -0.1, 'downtrend', 'sideways'))
+    # Labels may only disagree where the slope sits on a threshold to rounding
+    differ = out['trend_current'].values != expected
+    assert np.all(np.abs(np.abs(slope.values[differ]) - 0.1) < 1e-9)
@@ -0,0 +1,74 @@
+"""SentimentService scores articles in batches through the shared text-score cache."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import ba2_common.config as cfg
+from ba2_providers.news import sentiment as news_sentiment
+from ba2_providers.news import store
+
+from app.services.sentiment import SentimentService
+
+
+@pytest.fixture(autouse=True)
+def _tmp_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cfg, "COMMON_DIR", str(tmp_path / "common"))
+    monkeypatch.setattr(cfg, "CACHE_FOLDER", str(tmp_path / "common" / "cache"))
+    store.reset_cache()
+    yield
+    store.reset_cache()
+
+
+class _FakeScorer:
+    """Stands in for a loaded ``news.sentiment.Scorer`` (no model download)."""
+    model = "finbert"
+    version = news_sentiment.model_version("finbert", SentimentService.MAX_LENGTH)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        neg = np.array([0.8 if "cut" in t else 0.1 for t in texts], dtype=np.float32)
+        pos = (0.9 - neg).astype(np.float32)
+        return pd.DataFrame({"pos": pos, "neu": 1 - pos - neg, "neg": neg, "score": pos - neg})
+
+
+def _service(scorer):
+    svc = SentimentService(use_cache=False, batch_size=4)
+    svc._initialized = True
+    svc._scorer = scorer
+    return svc
+
+
+def _articles(n):
+    return [{"title": f"Headline {i}" + (" guidance cut" if i % 3 == 0 else ""),
+             "summary": "", "content": "", "url": f"u{i}"} for i in range(n)]
+
+
+def test_articles_are_scored_in_batches_and_cached_across_services():
+    fake = _FakeScorer()
+    progress = []
+    out = _service(fake).analyze_news_articles(_articles(50),
+                                               progress_callback=lambda d, t: progress.append((d, t)))
+    assert len(fake.calls) == 2 and sum(map(len, fake.calls)) == 50   # 2 chunks, not 50 calls
+    assert progress[-1] == (50, 50)
+    assert [a["url"] for a in out] == [f"u{i}" for i in range(50)]
+    assert out[0]["sentiment"] == "negative" and out[0]["negative_prob"] == pytest.approx(0.8)
+    assert out[1]["sentiment"] == "positive" and out[1]["neutral_prob"] == 0.0
+
+    # A later dataset build / backtest (new service, new process memo) reuses the scores
+    store.reset_cache()
+    fake2 = _FakeScorer()
+    again = _service(fake2).analyze_news_articles(_articles(52))
+    assert fake2.calls == [["Headline 50. ", "Headline 51 guidance cut. "]]
+    assert [a["sentiment"] for a in again[:50]] == [a["sentiment"] for a in out]
+
+
+def test_already_scored_articles_are_passed_through():
+    fake = _FakeScorer()
+    arts = _articles(3)
+    arts[1].update(sentiment="neutral", sentiment_score=0.7)
+    out = _service(fake).analyze_news_articles(arts)
+    assert out[1] is arts[1] and sum(map(len, fake.calls)) == 2
+    assert _service(fake).analyze_text("Margins cut") == _service(fake).analyze_texts(["Margins cut"])[0]
@@ -0,0 +1,126 @@
+"""Strided sliding-window datasets: same samples as the per-window copy loop, no copies."""
+import numpy as np
+import pytest
+
+from app.services.windowed_dataset import (
+    ShuffledIndexSampler, SlidingWindowDataset, joint_arrays, memmap_features,
+)
+
+
+def _ref_windows(X, y, seq_len, horizon, mode='shift'):
+    """The original TSAITrainingService._create_sequences(_multistep) loops."""
+    n = len(X) - seq_len - horizon + 1
+    X_seq = np.zeros((n, X.shape[1], seq_len), dtype=np.float32)
+    y_seq = np.zeros((n, horizon), dtype=np.float32) if mode == 'multistep' else np.zeros(n, dtype=np.int64)
+    for i in range(n):
+        X_seq[i] = X[i:i + seq_len].T
+        if mode == 'multistep':
+            for h in range(horizon):
+                y_seq[i, h] = y[i + seq_len + h]
+        else:
+            y_seq[i] = y[i + seq_len - 1 + horizon]
+    return X_seq, y_seq
+
+
+def _data(n=300, f=4, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, f)).astype(np.float32), rng.integers(0, 2, n).astype(np.int64)
+
+
+@pytest.mark.parametrize("mode,horizon", [('shift', 0), ('shift', 3), ('multistep', 1), ('multistep', 4)])
+def test_windows_match_copy_loop_without_copying(mode, horizon):
+    X, y = _data()
+    ds = SlidingWindowDataset(X, y, seq_len=24, horizon=horizon, mode=mode)
+    ref_X, ref_y = _ref_windows(X, y, 24, horizon, mode)
+
+    np.testing.assert_array_equal(ds.X, ref_X)
+    np.testing.assert_array_equal(ds.y, ref_y)
+    assert ds.y.dtype == ref_y.dtype and ds.shape == ref_X.shape
+    assert np.shares_memory(ds.X, X) and not ds.X.flags.writeable
+
+
+def test_split_matches_separately_windowed_halves():
+    X, y = _data(400)
+    train, test = SlidingWindowDataset.split(X, y, split_row=280, seq_len=20, horizon=2)
+    for part, rows in ((train, slice(0, 280)), (test, slice(280, None))):
+        ref_X, ref_y = _ref_windows(X[rows], y[rows], 20, 2)
+        np.testing.assert_array_equal(part.X, ref_X)
+        np.testing.assert_array_equal(part.y, ref_y)
+        assert np.shares_memory(part.X, X)
+
+    # Dataloaders get the single shared view plus index splits -- nothing stacked
+    X_all, y_all, (tr, va) = joint_arrays(train, test)
+    assert np.shares_memory(X_all, X)
+    np.testing.assert_array_equal(X_all[va], test.X)
+    np.testing.assert_array_equal(y_all[tr], train.y)
+
+    with pytest.raises(ValueError, match="Not enough data"):
+        SlidingWindowDataset.split(X, y, split_row=390, seq_len=20, horizon=2)
+
+
+def test_concat_never_windows_across_datasets(tmp_path):
+    a, b = _data(100, seed=1), _data(60, seed=2)
+    ds = SlidingWindowDataset.concat([a, b], seq_len=10, horizon=1,
+                                     backing_file=str(tmp_path / 'feat.npy'))
+    assert isinstance(ds.features, np.memmap)
+    ref = [_ref_windows(*a, 10, 1), _ref_windows(*b, 10, 1)]
+    np.testing.assert_array_equal(ds.X, np.concatenate([r[0] for r in ref]))
+    np.testing.assert_array_equal(ds.y, np.concatenate([r[1] for r in ref]))
+    assert len(ds) == (100 - 10) + (60 - 10)
+
+
+def test_batches_and_sampler():
+    X, y = _data(130)
+    ds = SlidingWindowDataset(X, y, seq_len=10)
+    sampler = ShuffledIndexSampler(len(ds), batch_size=32, seed=7)
+    first = [b.copy() for b in sampler]
+    second = [b.copy() for b in sampler]
+    assert len(first) == len(sampler) == 4
+    assert sorted(np.concatenate(first)) == list(range(len(ds)))
+    assert any((a != b).any() for a, b in zip(first, second))      # reshuffled per epoch
+    resumed = ShuffledIndexSampler(len(ds), batch_size=32, seed=7)
+    resumed.epoch = 1
+    assert all((a == b).all() for a, b in zip(resumed, second))    # reproducible by epoch
+
+    seen = 0
+    for xb, yb in ds.batches(32, shuffle=True, seed=1, drop_last=True):
+        assert xb.shape == (32, 4, 10) and xb.flags.c_contiguous and yb.shape == (32,)
+        seen += len(xb)
+    assert seen == 96
+
+    x0, y0 = ds[5]
+    np.testing.assert_array_equal(x0, X[5:15].T)
+    assert y0 == y[14]
+
+
+def test_memmap_backing(tmp_path):
+    X, y = _data(200)
+    mm = memmap_features(X, str(tmp_path / 'sub' / 'x.npy'))
+    ds = SlidingWindowDataset(mm, y, seq_len=16)
+    np.testing.assert_array_equal(ds.X, _ref_windows(X, y, 16, 0)[0])
+
+
+def test_training_service_memmaps_windows_under_windows_dir(tmp_path):
+    import pandas as pd
+    from app.services.tsai_training import TSAITrainingService
+
+    X, y = _data(120, f=3)
+    df = pd.DataFrame(X, columns=['a', 'b', 'c']).assign(target=y)
+    args = (df, 0.75, 'target', ['a', 'b', 'c'], 12, 0, 'shift')
+    in_ram = TSAITrainingService(models_dir=str(tmp_path / 'm'), normalize=False)._windowed_split(*args)
+    svc = TSAITrainingService(models_dir=str(tmp_path / 'm'), normalize=False, windows_dir=str(tmp_path / 'w'))
+    train_ds, test_ds = svc._windowed_split(*args, name='features')
+    assert isinstance(train_ds.features, np.memmap) and test_ds.features is train_ds.features
+    assert (tmp_path / 'w' / 'features_shift_12.npy').exists()
+    np.testing.assert_array_equal(train_ds.X, in_ram[0].X)
+    np.testing.assert_array_equal(test_ds.y, in_ram[1].y)
+
+
+def test_mmap_windows_flag_survives_the_job_payload():
+    from app.api.jobs import ParameterRanges
+    from app.services.job_handler import DATASET_CACHE_DIR, get_job_windows_dir
+
+    ranges = ParameterRanges(layersMin=1, layersMax=2, layerSizeMin=64, layerSizeMax=128,
+                             learningRateMin=0.001, learningRateMax=0.01, mmapWindows=True)
+    assert ranges.dict()['mmapWindows'] is True
+    assert get_job_windows_dir('job-1').parent == DATASET_CACHE_DIR / 'job-1'
@@ -0,0 +1,333 @@
+"""
+Tests for PennyMomentumTrader's event-driven monitor (monitoring_mode="event").
+
+Covers (offline — the price stream is a local ReplayPriceFeed, broker and
+OHLCV are mocked):
+1. Trigger bands: exact edges from price / percent conditions, band_pct edges
+   for signal conditions, fired take-profit tiers ignored, trailing watermark.
+2. TriggerBook coalescing + LatencyTracker summary + feed subscription filter.
+3. Phase 5 in event mode: one quote fetch (the start sweep), then only ticks
+   that leave a symbol's band are evaluated — entry and take-profit fire from
+   the tick price, in-band ticks cost nothing, tick-to-order latency recorded
+   when each order is placed.
+4. A price stream that dies after start-up is reopened, or the monitor falls
+   back to polling once reconnects are used up.
+"""
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from ba2_trade_platform.core.db import get_instance
+from ba2_trade_platform.core.models import MarketAnalysis
+from ba2_trade_platform.core.types import MarketAnalysisStatus
+
+from ba2_experts.PennyMomentumTrader import PennyMomentumTrader
+from ba2_experts.PennyMomentumTrader import monitoring as penny_monitoring
+from ba2_experts.PennyMomentumTrader.price_events import (
+    LatencyTracker,
+    PriceTick,
+    ReplayPriceFeed,
+    TriggerBook,
+    condition_price_levels,
+    crosses_band,
+    trigger_band,
+)
+from ba2_experts.PennyMomentumTrader.settings import SETTINGS_DEFINITIONS
+from tests.factories import (
+    create_account_definition,
+    create_expert_instance,
+    create_market_analysis,
+)
+
+
+# ===========================================================================
+# 1. Trigger bands
+# ===========================================================================
+
+class TestTriggerBand:
+    def test_price_and_percent_levels(self):
+        conds = {"any": [{"type": "price_below", "value": 0.9},
+                         {"all": [{"type": "percent_above_entry", "percent": 20},
+                                  {"type": "time_after", "time": "10:00"}]}]}
+        levels, signals = condition_price_levels(conds, entry_price=1.0)
+        assert levels == pytest.approx([0.9, 1.2])
+        assert signals is False  # time conditions are left to the heartbeat
+
+    def test_percent_levels_need_entry_price(self):
+        levels, _ = condition_price_levels({"type": "percent_below_entry", "percent": 10}, None)
+        assert levels == []
+
+    def test_open_position_band_skips_fired_tiers(self):
+        info = {
+            "status": "triggered",
+            "exit_conditions": {
+                "stop_loss": {"any": [{"type": "percent_below_entry", "percent": 10}]},
+                "take_profit": [
+                    {"id": "t1", "condition": {"type": "percent_above_entry", "percent": 10}},
+                    {"id": "t2", "condition": {"type": "percent_above_entry", "percent": 30}},
+                ],
+            },
+            "triggered_tp_tier_ids": ["t1"],
+        }
+        assert trigger_band(info, 1.0, 1.15, 1.0) == pytest.approx((0.9, 1.3))
+
+    def test_signal_conditions_add_band_pct_edges(self):
+        info = {"status": "watching", "entry_conditions": {"all": [
+            {"type": "price_above", "value": 2.5},
+            {"type": "price_above_vwap", "timeframe": "1m"},
+        ]}}
+        assert trigger_band(info, None, 2.0, 2.0) == pytest.approx((1.96, 2.04))
+
+    def test_trailing_watermark_is_an_edge(self):
+        info = {"status": "triggered", "trail_active": True, "high_watermark": 1.5,
+                "exit_conditions": {"stop_loss": {"any": [{"type": "price_below", "value": 1.38}]}}}
+        assert trigger_band(info, 1.0, 1.45, 1.0) == pytest.approx((1.38, 1.5))
+
+    def test_no_last_price_means_evaluate(self):
+        info = {"status": "watching", "entry_conditions": {"type": "price_above", "value": 1}}
+        band = trigger_band(info, None, None, 1.0)
+        assert band is None
+        assert crosses_band(band, 0.5)
+
+    def test_crosses_band_edges_inclusive(self):
+        assert not crosses_band((0.9, 1.2), 1.0)
+        assert crosses_band((0.9, 1.2), 1.2)
+        assert crosses_band((0.9, 1.2), 0.9)
+        assert not crosses_band((0.9, 1.2), None)
+
+
+# ===========================================================================
+# 2. TriggerBook / LatencyTracker / feeds
+# ===========================================================================
+
+class TestEventPlumbing:
+    def test_book_coalesces_to_latest_tick_per_symbol(self):
+        book = TriggerBook(1.0)
+        info = {"status": "watching", "last_price": 1.0,
+                "entry_conditions": {"type": "price_above", "value": 1.1}}
+        book.update("AAA", info)
+        ticks = [PriceTick("AAA", 1.2, 0.0), PriceTick("AAA", 1.05, 1.0), PriceTick("ZZZ", 9.0, 1.0)]
+        assert book.due(ticks) == {}  # latest AAA tick is back inside the band
+        assert set(book.due(ticks[:1])) == {"AAA"}
+
+    def test_closed_symbol_leaves_the_book(self):
+        book = TriggerBook(1.0)
+        book.update("AAA", {"status": "watching", "last_price": 1.0})
+        book.update("AAA", {"status": "closed"})
+        assert "AAA" not in book.bands
+
+    def test_latency_summary(self):
+        lat = LatencyTracker()
+        assert lat.summary() == {"count": 0}
+        for s in (0.010, 0.020, 0.030, 0.200):
+            lat.record(s)
+        summary = lat.summary()
+        assert summary["count"] == 4
+        assert summary["p50_ms"] == pytest.approx(30.0)
+        assert summary["max_ms"] == pytest.approx(200.0)
+
+    def test_replay_feed_only_emits_subscribed_symbols(self):
+        feed = ReplayPriceFeed([("AAA", 1.0), ("BBB", 2.0), ("AAA", 0.0)], batch=10)
+        feed.subscribe(["AAA"])
+        ticks = feed.poll(timeout=0)
+        assert [(t.symbol, t.price) for t in ticks] == [("AAA", 1.0)]
+        assert feed.exhausted
+
+    def test_settings_defaults(self):
+        assert SETTINGS_DEFINITIONS["monitoring_mode"]["default"] == "poll"
+        assert SETTINGS_DEFINITIONS["event_heartbeat_seconds"]["default"] < 15 * 60
+
+
+# ===========================================================================
+# 3. Phase 5 in event mode
+# ===========================================================================
+
+class _EventStub(PennyMomentumTrader):
+    """PennyMomentumTrader with __init__ bypassed, a replay feed and canned quotes."""
+
+    def __init__(self, instance, settings, live_prices, feed):
+        import threading
+        self.instance = instance
+        self.logger = MagicMock()
+        self._settings = settings
+        self._trade_mgr = MagicMock()
+        self._live_prices = live_prices
+        self._stop_event = threading.Event()
+        self.feed = feed
+        self.quote_calls = 0
+
+    def get_setting_with_interface_default(self, key, log_warning=True):
+        return self._settings[key]
+
+    def _get_live_prices(self, symbols):
+        self.quote_calls += 1
+        return {s: self._live_prices.get(s) for s in symbols}
+
+    def _open_price_feed(self):
+        return self.feed
+
+    def _is_market_open(self):
+        return not self.feed.exhausted
+
+
+_SETTINGS = {
+    "monitoring_mode": "event",
+    "event_trigger_band_pct": 1.0,
+    "event_heartbeat_seconds": 3600,
+    "monitoring_interval_seconds": 60,
+    "market_timezone": "US/Eastern",
+    "vendor_ohlcv": ["fmp"],
+    "max_entry_age_days": 3,
+    "trailing_stop_pct": 8.0,
+    "entry_rvol_decay_threshold": 0.0,
+    "max_already_moved_pct": 0.0,
+    "entry_limit_slippage_pct": 3.0,
+    "exit_update_interval_ticks": 0,
+}
+
+
+def _monitored():
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return {
+        "AAA": {"status": "watching", "qty": 100, "strategy": "swing",
+                "prev_close_date": today, "peak_rvol_date": today,
+                "entry_conditions": {"all": [{"type": "price_above", "value": 2.0}]}},
+        "BBB": {"status": "triggered", "strategy": "swing", "exit_conditions": {
+            "stop_loss": {"any": [{"type": "price_below", "value": 0.9}]},
+            "take_profit": [{"id": "t1", "exit_pct": 100.0,
+                             "condition": {"type": "percent_above_entry", "percent": 20}}],
+        }},
+    }
+
+
+@pytest.fixture
+def penny_scan(monkeypatch):
+    """A running PENNY_SCAN analysis watching AAA (entry >= 2.0) and holding BBB (TP +20%)."""
+    import ba2_providers
+    ohlcv = MagicMock()
+    ohlcv.get_ohlcv_data.return_value = None  # sweeps see no OHLCV price -> nothing fires
+    monkeypatch.setattr(ba2_providers, "get_provider", lambda *a, **k: ohlcv)
+
+    acct = create_account_definition()
+    inst = create_expert_instance(account_id=acct.id, expert="PennyMomentumTrader")
+    ma = create_market_analysis(symbol="PENNY_SCAN", expert_instance_id=inst.id,
+                                status=MarketAnalysisStatus.RUNNING,
+                                state={"monitored_symbols": _monitored()})
+    return inst, ma
+
+
+def _trade_mgr(stub):
+    stub._trade_mgr.get_open_positions.return_value = [
+        {"symbol": "BBB", "qty": 100, "entry_price": 1.0, "transaction_id": 1}]
+    stub._trade_mgr.execute_entry.return_value = "ord-1"
+    stub._trade_mgr.execute_exit.return_value = True
+
+
+def test_phase_5_event_mode_evaluates_only_band_crossings(penny_scan):
+    inst, ma = penny_scan
+    feed = ReplayPriceFeed([("BBB", 1.05), ("AAA", 1.97), ("ZZZ", 5.0), ("BBB", 1.10),
+                            ("AAA", 2.05), ("BBB", 1.25)])
+    stub = _EventStub(inst, dict(_SETTINGS), {"AAA": 1.95, "BBB": 1.02}, feed)
+    _trade_mgr(stub)
+
+    stub._phase_5_monitor(ma)
+
+    assert stub.quote_calls == 1  # the start sweep only; ticks are the live price afterwards
+    stub._trade_mgr.execute_entry.assert_called_once()
+    assert stub._trade_mgr.execute_entry.call_args.kwargs["symbol"] == "AAA"
+    stub._trade_mgr.execute_exit.assert_called_once()
+    assert stub._trade_mgr.execute_exit.call_args.args[0] == "BBB"
+
+    state = get_instance(MarketAnalysis, ma.id).state
+    assert state["monitored_symbols"]["AAA"]["status"] == "triggered"
+    assert state["monitored_symbols"]["BBB"]["status"] == "closed"
+    stats = state["event_monitor"]
+    assert stats["sweeps"] == 1
+    assert stats["ticks"] == 5  # ZZZ was never subscribed
+    assert stats["evaluations"] == 2 + 2  # sweep (AAA, BBB) + the two band crossings
+    assert stats["tick_to_order"]["count"] == 2
+
+
+def test_tick_to_order_is_measured_when_each_order_is_placed(penny_scan, monkeypatch):
+    """Two orders from one batch: the first one's latency must not include the time
+    spent placing the second."""
+    trackers = []
+
+    class _Tracker(LatencyTracker):
+        def __init__(self):
+            super().__init__()
+            trackers.append(self)
+
+    monkeypatch.setattr(penny_monitoring, "LatencyTracker", _Tracker)
+    inst, ma = penny_scan
+    feed = ReplayPriceFeed([("AAA", 2.05), ("BBB", 1.25)], batch=10)
+    stub = _EventStub(inst, dict(_SETTINGS), {"AAA": 1.95, "BBB": 1.02}, feed)
+    _trade_mgr(stub)
+    stub._trade_mgr.execute_exit.side_effect = lambda *a, **k: time.sleep(0.3) or True
+
+    stub._phase_5_monitor(ma)
+
+    entry, exit_ = trackers[0].samples                # AAA is evaluated (and ordered) first
+    assert entry < 0.25 <= 0.3 <= exit_
+
+
+# ===========================================================================
+# 4. Dead price streams
+# ===========================================================================
+
+class _DeadFeed(ReplayPriceFeed):
+    """A stream whose thread has died: never delivers, never exhausts."""
+
+    def __init__(self):
+        super().__init__([("AAA", 2.05)])
+
+    @property
+    def alive(self):
+        return False
+
+
+class _ReopenStub(_EventStub):
+    """Hands out ``feeds`` one per ``_open_price_feed`` call (None once they run out)."""
+
+    def __init__(self, instance, settings, live_prices, feeds):
+        super().__init__(instance, settings, live_prices, None)
+        self.feeds = list(feeds)
+
+    def _open_price_feed(self):
+        self.feed = self.feeds.pop(0) if self.feeds else None
+        return self.feed
+
+    def _is_market_open(self):
+        if self.feed is None:                     # polling after the fallback: one sweep
+            return self.quote_calls == 0
+        return not self.feed.exhausted
+
+
+def test_dead_stream_is_reopened(penny_scan):
+    inst, ma = penny_scan
+    stub = _ReopenStub(inst, dict(_SETTINGS), {"AAA": 1.95, "BBB": 1.02},
+                       [_DeadFeed(), ReplayPriceFeed([("AAA", 2.05)])])
+    _trade_mgr(stub)
+
+    stub._phase_5_monitor(ma)
+
+    stub._trade_mgr.execute_entry.assert_called_once()
+    stats = get_instance(MarketAnalysis, ma.id).state["event_monitor"]
+    assert stats["reconnects"] == 1 and "fallback" not in stats
+    assert any("reconnected" in str(c) for c in stub.logger.warning.call_args_list)
+
+
+def test_dead_stream_falls_back_to_polling(penny_scan):
+    inst, ma = penny_scan
+    settings = {**_SETTINGS, "monitoring_interval_seconds": 0}
+    stub = _ReopenStub(inst, settings, {"AAA": 2.05, "BBB": 1.02}, [_DeadFeed()])
+    _trade_mgr(stub)
+
+    stub._phase_5_monitor(ma)
+
+    assert stub.quote_calls == 1                      # the polling sweep
+    state = get_instance(MarketAnalysis, ma.id).state
+    assert state["event_monitor"]["fallback"] == "polling"
+    assert any("falling back to polling" in str(c) for c in stub.logger.warning.call_args_list)
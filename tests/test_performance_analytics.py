@@ -0,0 +1,172 @@
+"""Tests for the precomputed performance analytics buckets (core/PerformanceAnalytics.py)."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from ba2_trade_platform.core.db import add_instance, delete_instance, get_db, update_instance
+from ba2_trade_platform.core.models import PerformanceDailyBucket, Transaction
+from ba2_trade_platform.core.types import OrderDirection, TransactionStatus
+from ba2_trade_platform.core.PerformanceAnalytics import (
+    SCOPE_ACCOUNT, SCOPE_EXPERT, SCOPE_SYMBOL, PerformanceStats,
+    check_performance_parity, get_equity_series, get_monthly_pnl, get_range_stats,
+    get_total_stats, rebuild_performance_analytics, sync_performance_analytics,
+)
+from ba2_trade_platform.ui.components.performance_charts import calculate_sharpe_ratio
+from tests.factories import create_account_definition, create_expert_instance
+
+
+def _closed(symbol, open_price, close_price, close_date, expert_id=None,
+            side=OrderDirection.BUY, quantity=10.0, held_days=2):
+    txn = Transaction(
+        symbol=symbol, quantity=quantity, side=side, status=TransactionStatus.CLOSED,
+        open_price=open_price, close_price=close_price,
+        open_date=close_date - timedelta(days=held_days), close_date=close_date,
+        expert_id=expert_id,
+    )
+    add_instance(txn, expunge_after_flush=True)
+    return txn
+
+
+@pytest.fixture
+def experts():
+    acct = create_account_definition()
+    return acct.id, create_expert_instance(acct.id).id, create_expert_instance(acct.id).id
+
+
+def test_range_stats_combine_daily_buckets(experts):
+    account_id, e1, e2 = experts
+    _closed("AAPL", 100, 110, datetime(2026, 3, 2, 15, tzinfo=timezone.utc), expert_id=e1)   # +100
+    _closed("AAPL", 100, 95, datetime(2026, 3, 3, 15, tzinfo=timezone.utc), expert_id=e1)    # -50
+    _closed("MSFT", 50, 60, datetime(2026, 3, 3, 16, tzinfo=timezone.utc), expert_id=e2)     # +100
+    _closed("TSLA", 20, 10, datetime(2026, 3, 4, 16, tzinfo=timezone.utc), expert_id=e2,
+            side=OrderDirection.SELL)                                     # +100 (short)
+
+    assert sync_performance_analytics() == 4
+
+    by_expert = get_range_stats(SCOPE_EXPERT)
+    m1 = by_expert[str(e1)].to_metrics()
+    assert m1['total_transactions'] == 2
+    assert m1['total_pnl'] == pytest.approx(50)
+    assert (m1['wins'], m1['losses']) == (1, 1)
+    assert m1['profit_factor'] == pytest.approx(2.0)
+    assert m1['largest_win'] == pytest.approx(100)
+    assert m1['largest_loss'] == pytest.approx(-50)
+    assert m1['avg_duration_days'] == pytest.approx(2)
+
+    # Date range restricted to one day combines only that day's bucket
+    day = get_range_stats(SCOPE_EXPERT, start=date(2026, 3, 3), end=date(2026, 3, 3))
+    assert day[str(e1)].total_pnl == pytest.approx(-50)
+    assert day[str(e2)].total_pnl == pytest.approx(100)
+
+    assert get_range_stats(SCOPE_ACCOUNT)[str(account_id)].total_pnl == pytest.approx(250)
+    assert get_range_stats(SCOPE_SYMBOL, keys=["AAPL"])["AAPL"].trades == 2
+    assert get_total_stats(SCOPE_EXPERT, keys=[str(e2)]).wins == 2
+
+
+def test_sync_is_incremental(experts):
+    _, e1, _ = experts
+    _closed("AAPL", 100, 110, datetime(2026, 3, 2, 15, tzinfo=timezone.utc), expert_id=e1)
+    assert sync_performance_analytics() == 1
+    assert sync_performance_analytics() == 0
+
+    _closed("AAPL", 100, 120, datetime(2026, 3, 2, 18, tzinfo=timezone.utc), expert_id=e1)
+    assert sync_performance_analytics() == 1
+
+    # Same-day closes are merged into the existing bucket, not duplicated
+    with get_db() as session:
+        rows = session.query(PerformanceDailyBucket).filter(
+            PerformanceDailyBucket.scope == SCOPE_EXPERT).all()
+    assert len(rows) == 1
+    assert rows[0].trades == 2
+    assert rows[0].total_pnl == pytest.approx(300)
+
+
+def test_open_transactions_are_not_folded(experts):
+    _, e1, _ = experts
+    txn = _closed("AAPL", 100, 110, datetime(2026, 3, 2, 15, tzinfo=timezone.utc), expert_id=e1)
+    txn.status = TransactionStatus.OPENED
+    update_instance(txn)
+    assert sync_performance_analytics() == 0
+
+    txn.status = TransactionStatus.CLOSED
+    update_instance(txn)
+    assert sync_performance_analytics() == 1
+
+
+def test_edited_and_deleted_transactions_are_refolded(experts):
+    """A close-price/close-date correction or a deletion after the fold reaches the buckets
+    on the next sync, including the per-day extrema, without a rebuild."""
+    _, e1, _ = experts
+    day1 = datetime(2026, 3, 2, 15, tzinfo=timezone.utc)
+    big = _closed("AAPL", 100, 130, day1, expert_id=e1)          # +300
+    _closed("AAPL", 100, 110, day1, expert_id=e1)                # +100
+    moved = _closed("MSFT", 50, 40, day1, expert_id=e1)          # -100
+    assert sync_performance_analytics() == 3
+    assert get_total_stats(SCOPE_EXPERT).largest_win == pytest.approx(300)
+    assert sync_performance_analytics() == 0
+
+    big.close_price = 105                                        # corrected fill: +50
+    update_instance(big)
+    moved.close_date = datetime(2026, 3, 5, 15, tzinfo=timezone.utc)
+    update_instance(moved)
+    assert sync_performance_analytics() == 3                     # day 1 refolded + the move
+    m = get_range_stats(SCOPE_EXPERT, end=date(2026, 3, 2))[str(e1)]
+    assert (m.trades, m.total_pnl, m.largest_win, m.largest_loss) == (2, pytest.approx(150),
+                                                                      pytest.approx(100), None)
+    assert get_range_stats(SCOPE_SYMBOL, start=date(2026, 3, 5))["MSFT"].total_pnl == pytest.approx(-100)
+    assert check_performance_parity() == []
+
+    delete_instance(big)
+    assert sync_performance_analytics() == 1
+    assert get_total_stats(SCOPE_EXPERT).total_pnl == pytest.approx(0)
+    assert check_performance_parity() == []
+
+
+def test_monthly_and_equity_series(experts):
+    _, e1, _ = experts
+    _closed("AAPL", 100, 110, datetime(2026, 1, 10, tzinfo=timezone.utc), expert_id=e1)   # +100
+    _closed("AAPL", 100, 70, datetime(2026, 1, 20, tzinfo=timezone.utc), expert_id=e1)    # -300
+    _closed("AAPL", 100, 150, datetime(2026, 2, 5, tzinfo=timezone.utc), expert_id=e1)    # +500
+    sync_performance_analytics()
+
+    monthly = get_monthly_pnl(SCOPE_EXPERT)
+    assert monthly["2026-01"][str(e1)] == {'pnl': pytest.approx(-200), 'count': 2}
+    assert monthly["2026-02"][str(e1)]['pnl'] == pytest.approx(500)
+
+    equity = get_equity_series(SCOPE_EXPERT)
+    assert [value for _, value in equity['points']] == pytest.approx([100, -200, 300])
+    assert equity['max_drawdown'] == pytest.approx(300)
+    assert equity['final_pnl'] == pytest.approx(300)
+
+
+def test_sharpe_from_moments_matches_direct_calculation():
+    returns = [((i * 37) % 11 - 5) / 100 for i in range(40)]
+    stats = PerformanceStats(return_count=len(returns), return_sum=sum(returns),
+                             return_sumsq=sum(r * r for r in returns))
+    assert stats.sharpe_ratio == pytest.approx(calculate_sharpe_ratio(returns))
+
+    few = PerformanceStats(return_count=5, return_sum=0.1, return_sumsq=0.01)
+    assert few.sharpe_ratio is None
+
+
+def test_rebuild_and_parity_check(experts):
+    _, e1, e2 = experts
+    for i in range(12):
+        _closed("NVDA" if i % 2 else "AMD", 100, 100 + (i % 5) - 2,
+                datetime(2026, 4, 1 + i, 15, tzinfo=timezone.utc), expert_id=e1 if i % 3 else e2)
+    _closed("SPY", 400, 410, datetime(2026, 4, 20, tzinfo=timezone.utc), expert_id=None)
+    sync_performance_analytics()
+    assert check_performance_parity() == []
+
+    # A bucket that drifted from the transactions is reported, and a rebuild fixes it
+    with get_db() as session:
+        bucket = session.query(PerformanceDailyBucket).filter(
+            PerformanceDailyBucket.scope == SCOPE_SYMBOL).first()
+        bucket.total_pnl += 1000
+        session.add(bucket)
+        session.commit()
+    assert check_performance_parity()
+
+    assert rebuild_performance_analytics() == 13
+    assert check_performance_parity() == []
+    assert get_range_stats(SCOPE_EXPERT)[""].total_pnl == pytest.approx(100)
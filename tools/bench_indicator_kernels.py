@@ -0,0 +1,69 @@
+"""Wall-clock micro-benchmark: per-bar indicator loops vs app.services.indicator_kernels.
+
+Times the original Python loops (kept as the parity references in
+testplatform/backend/tests/test_indicator_kernels.py) against the numpy kernels that
+TechnicalIndicators / IndicatorService now call, on a random-walk OHLCV series.
+
+Wall-clock, so it is a TOOL, not a pytest assertion -- the parity test asserts
+bit-for-bit equality, this just prints the speedups.
+
+Usage:  cd testplatform/backend && python ../../tools/bench_indicator_kernels.py [n_bars]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def _best(fn, repeat: int = 5) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return min(samples)
+
+
+def main() -> int:
+    from app.services import indicator_kernels as k
+    from tests.test_indicator_kernels import (
+        _ohlcv, _ref_directional_movement, _ref_obv, _ref_rsi, _ref_sar,
+        _ref_service_zigzag, _ref_technical_zigzag,
+    )
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = _ohlcv(n, seed=7)
+    high, low, close, volume = (df[c].values for c in ("High", "Low", "Close", "Volume"))
+
+    # IndicatorService zigzag with the default first pivot (high at bar 0)
+    def kernel_service_zigzag():
+        idx, price = k.zigzag_pivots(high, low, 0.05, 'high', float(high[0]))
+        return k.interpolate_pivots(n, idx, price)
+
+    cases = [
+        ("SAR", lambda: _ref_sar(high, low, 0.02, 0.2), lambda: k.parabolic_sar(high, low, 0.02, 0.2)),
+        ("ZigZag (service)", lambda: _ref_service_zigzag(high, low, 5.0), kernel_service_zigzag),
+        ("ZigZag (confirmed)", lambda: _ref_technical_zigzag(high, low, 5.0),
+         lambda: k.zigzag_confirmed(high, low, 5.0)),
+        ("ADX DM/TR", lambda: _ref_directional_movement(high, low, close),
+         lambda: k.directional_movement(high, low, close)),
+        ("OBV", lambda: _ref_obv(close, volume), lambda: k.on_balance_volume(close, volume)),
+        ("RSI", lambda: _ref_rsi(close, 14), lambda: k.wilder_rsi(close, 14)),
+    ]
+
+    print(f"indicator kernels vs per-bar loops ({n:,} bars, best of 5):")
+    for name, loop, kernel in cases:
+        t_loop, t_kernel = _best(loop), _best(kernel)
+        print(f"  {name:<20} loop {t_loop * 1000:9.2f} ms   kernel {t_kernel * 1000:8.2f} ms   "
+              f"x{t_loop / t_kernel:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
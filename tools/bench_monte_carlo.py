@@ -0,0 +1,97 @@
+"""Throughput benchmark: robustness Monte Carlo in paths per second.
+
+Compares, on the same synthetic trade list:
+
+  * per-path -- one equity path + ``_path_metrics`` per resample in a Python loop (how
+                ``mc_bootstrap`` / ``mc_shuffle`` / ``mc_jitter`` worked before the matrix
+                engine); run on ``--per-path-n`` paths and reported as a rate;
+  * matrix   -- ``monte_carlo.simulate_paths`` in this process, chunked by ``BT_MC_CHUNK_MB``;
+  * pooled   -- the same with ``--workers`` processes (only when ``--workers`` > 1).
+
+It also checks the matrix and pooled runs are bit-identical for the seed. Wall-clock, so it
+is a TOOL, not a pytest assertion.
+
+Usage:
+    cd testplatform/backend && python ../../tools/bench_monte_carlo.py \\
+        [--trades 2000] [--paths 20000] [--workers 4] [--method bootstrap]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def _per_path(method: str, pcts, initial: float, n_paths: int, seed: int, years: float,
+              bp_sigma: float) -> None:
+    import numpy as np
+    from app.services.backtest.monte_carlo import _path_metrics, equity_path_from_trade_pcts
+
+    rng = np.random.default_rng(seed)
+    for _ in range(n_paths):
+        if method == "bootstrap":
+            sample = pcts[rng.integers(0, pcts.size, size=pcts.size)]
+        elif method == "shuffle":
+            sample = rng.permutation(pcts)
+        else:
+            sample = pcts + rng.normal(0.0, bp_sigma / 100.0, size=pcts.size)
+        _path_metrics(equity_path_from_trade_pcts(sample, initial), initial, years)
+
+
+def _rate(label: str, fn, n: int) -> float:
+    t = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t
+    print(f"  {label:<10} {n:>9,} paths  {dt:8.2f}s  {n / dt:12,.0f} paths/s")
+    return n / dt
+
+
+def main() -> int:
+    import numpy as np
+    from app.services.backtest.monte_carlo import METHODS, simulate_paths
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--trades", type=int, default=2000)
+    ap.add_argument("--paths", type=int, default=20000)
+    ap.add_argument("--per-path-n", type=int, default=1000,
+                    help="Paths for the (slow) per-path loop; rate is extrapolated")
+    ap.add_argument("--workers", type=int, default=0)
+    ap.add_argument("--method", default="bootstrap", choices=METHODS)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    pcts = np.random.default_rng(0).normal(0.2, 3.0, args.trades)
+    initial, years, bp = 100_000.0, 3.0, 5.0
+    print(f"{args.method}: {args.trades:,} trades")
+    base = _rate("per-path", lambda: _per_path(args.method, pcts, initial, args.per_path_n,
+                                                args.seed, years, bp), args.per_path_n)
+    out = {}
+
+    def _matrix():
+        out["matrix"] = simulate_paths(args.method, pcts, initial, args.paths, args.seed, years,
+                                       bp, workers=0)
+
+    fast = _rate("matrix", _matrix, args.paths)
+    print(f"  matrix speed-up vs per-path: {fast / base:.1f}x")
+    if args.workers > 1:
+        def _pooled():
+            out["pooled"] = simulate_paths(args.method, pcts, initial, args.paths, args.seed,
+                                           years, bp, workers=args.workers)
+
+        _rate("pooled", _pooled, args.paths)
+        if args.paths < 50_000:
+            print("  (pool only engages from 50,000 paths; the pooled run stayed in-process)")
+        same = all(np.array_equal(out["matrix"][k], out["pooled"][k]) for k in out["matrix"])
+        print(f"  pooled == matrix (bit-identical): {same}")
+        if not same:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
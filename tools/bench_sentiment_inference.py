@@ -0,0 +1,116 @@
+"""Throughput benchmark: sentiment scoring in headlines per second.
+
+Compares, on the same texts and the same CPU model:
+
+  * per-text      -- one forward pass per headline (how the ML platform's SentimentService
+                     scored before it batched);
+  * fixed batches -- ``--batch-size`` rows per pass, length-sorted (the previous
+                     ``score_texts``);
+  * token budget  -- ``news.sentiment.token_batches``: batches packed up to
+                     ``batch-size x max-length`` padded tokens (the current default);
+  * cached        -- ``score_texts_cached`` on texts already in the text-score cache.
+
+Wall-clock, so it is a TOOL, not a pytest assertion. Needs torch + transformers and the
+model weights (downloaded on first use). The cache pass writes to a temporary cache root,
+never the real one.
+
+Usage:
+    python tools/bench_sentiment_inference.py [--model finbert] [--n 2000] [--threads 4]
+    python tools/bench_sentiment_inference.py --symbol NVDA      # real headlines (master only)
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+for _pkg in ("common", "providers"):
+    _p = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "packages", _pkg))
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+_SUBJECTS = ["Apple", "Nvidia", "Exxon", "Pfizer", "JPMorgan", "Tesla", "Walmart", "Boeing"]
+_EVENTS = [
+    "shares jump after record quarterly revenue beats estimates",
+    "cuts full-year guidance as margins shrink",
+    "announces $10 billion buyback program",
+    "faces regulatory probe over accounting practices",
+    "to acquire rival in all-stock deal, analysts see cost synergies",
+    "reports quarterly results broadly in line with expectations; management reiterates outlook "
+    "for the rest of the fiscal year amid a mixed demand environment across regions",
+]
+
+
+def _synthetic(n: int) -> list:
+    return [f"{_SUBJECTS[i % len(_SUBJECTS)]} {_EVENTS[(i * 7) % len(_EVENTS)]} ({i})"
+            for i in range(n)]
+
+
+def _store_texts(symbol: str, n: int) -> list:
+    from ba2_providers.news import store
+
+    raw = store.read_raw(symbol).sort_values("published_at").tail(n)
+    return [f"{(r.title or '').strip()}. {(r.summary or '').strip()}" for r in raw.itertuples()]
+
+
+def _rate(label: str, fn, n: int) -> float:
+    t = time.perf_counter()
+    fn()
+    dt = time.perf_counter() - t
+    print(f"  {label:<16} {n:>7,} texts  {dt:8.2f}s  {n / dt:9.1f} headlines/s")
+    return n / dt
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--model", default="finbert")
+    ap.add_argument("--n", type=int, default=2000, help="Headlines to score")
+    ap.add_argument("--per-text-n", type=int, default=200,
+                    help="Headlines for the (slow) per-text pass; rate is extrapolated")
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--max-length", type=int, default=256)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--symbol", default=None, help="Use this symbol's raw news instead of synthetic")
+    args = ap.parse_args()
+
+    import ba2_common.config as cfg
+    from ba2_providers.news import sentiment, store
+
+    texts = _store_texts(args.symbol, args.n) if args.symbol else _synthetic(args.n)
+    n = len(texts)
+    common = dict(batch_size=args.batch_size, max_length=args.max_length, threads=args.threads)
+
+    scorer = sentiment.Scorer(args.model, **common).load()      # load time is not measured
+    print(f"{args.model}: {n:,} headlines, batch {args.batch_size}, max_length {args.max_length}")
+    budget = scorer.max_batch_tokens
+    try:
+        # Same loaded weights throughout; only the batching knobs change between passes
+        scorer.max_batch_rows, scorer.max_batch_tokens = 1, 10 ** 9
+        sample = texts[:args.per_text_n]
+        base = _rate("per-text", lambda: scorer(sample), len(sample))
+
+        scorer.max_batch_rows = args.batch_size
+        r_fixed = _rate("fixed batches", lambda: scorer(texts), n)
+
+        scorer.max_batch_rows, scorer.max_batch_tokens = 256, budget
+        r_dyn = _rate("token budget", lambda: scorer(texts), n)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg.CACHE_FOLDER = tmp
+            store.reset_cache()
+            sentiment.score_texts_cached(texts, args.model, max_length=args.max_length, scorer=scorer)
+            store.reset_cache()                                 # cold process: read from disk
+            r_cache = _rate("cached", lambda: sentiment.score_texts_cached(
+                texts, args.model, max_length=args.max_length, scorer=scorer), n)
+    finally:
+        scorer.close()
+
+    print(f"speedup vs per-text: fixed {r_fixed / base:.1f}x, token budget {r_dyn / base:.1f}x, "
+          f"cached {r_cache / base:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Build (or refresh) the point-in-time fundamentals panel from the FMP statement cache
+(see ba2_providers.fundamentals.statement_panel).
+
+Run after a backtest or ``ba2-test`` prefetch has filled ``CACHE_FOLDER/fmp_history`` with the
+annual income / balance / cash-flow histories. Re-runs are incremental: only cache files whose
+mtime changed are re-parsed. Point FactorRanker's ``fundamentals_panel`` setting at the output
+dir to read value / quality column-wise from it.
+
+Usage:  cd testplatform/backend && python ../../tools/build_fundamentals_panel.py \\
+            [--cache DIR] [--out DIR] [SYMBOL ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def main() -> int:
+    from ba2_common.config import FUNDAMENTALS_PANEL_DIR
+    from ba2_providers.fmp_common import _fmp_history_cache_dir
+    from ba2_providers.fundamentals.statement_panel import build_panel
+
+    default_cache = _fmp_history_cache_dir()
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("symbols", nargs="*", help="Only refresh these symbols (default: every cached symbol)")
+    ap.add_argument("--cache", default=default_cache,
+                    help=f"fmp_history statement cache dir (default {default_cache})")
+    ap.add_argument("--out", default=FUNDAMENTALS_PANEL_DIR,
+                    help=f"Panel directory (default {FUNDAMENTALS_PANEL_DIR})")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    stats = build_panel(args.out, symbols=args.symbols or None, cache_dir=args.cache)
+    if not stats["rows"]:
+        print(f"no annual statements cached in {args.cache}")
+        return 1
+    print(f"{stats['symbols']} symbols, {stats['rows']:,} statement rows ({stats['parsed']} files parsed, "
+          f"{stats['reused']} reused) in {time.perf_counter() - t0:.1f}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
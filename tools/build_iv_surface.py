@@ -0,0 +1,60 @@
+"""Fit the per-underlying IV surfaces from the options cache (see app.services.backtest.iv_surface).
+
+Run once per options dataset, after ``ba2-test fetch-options`` (and, if used, after
+``convert_options_cache.py``). Each underlying's daily closes come from the same cached OHLCV
+provider fetch-options uses. A full build (no UNDERLYING arguments) marks the surface dir
+built, and from then on backtests over that cache read IV rank from it.
+
+Usage:  cd testplatform/backend && python ../../tools/build_iv_surface.py \\
+            [--cache PATH] [--out DIR] [UNDERLYING ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def main() -> int:
+    from ba2_common.config import IV_SURFACE_DIR
+    from app.services.backtest.daily_backtest_handler import default_options_cache_db
+
+    default_cache = default_options_cache_db()
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("underlyings", nargs="*", help="Only these underlyings (default: all cached)")
+    ap.add_argument("--cache", default=default_cache,
+                    help=f"Options cache: SQLite file or columnar store (default {default_cache})")
+    ap.add_argument("--out", default=IV_SURFACE_DIR, help=f"Surface directory (default {IV_SURFACE_DIR})")
+    args = ap.parse_args()
+
+    from ba2_providers import get_provider
+    from app.services.backtest.fetch_options import (
+        _OPTIONS_HISTORY_FLOOR, fetch_underlying_close_series,
+    )
+    from app.services.backtest.iv_surface import build_iv_surfaces
+    from app.services.backtest.options_store import open_options_cache
+
+    wanted = [u.upper() for u in args.underlyings] or sorted(open_options_cache(args.cache).cached_underlyings())
+    if not wanted:
+        print(f"no cached underlyings in {args.cache}")
+        return 1
+    ohlcv = get_provider("ohlcv", "fmp")
+    t0 = time.perf_counter()
+    closes = {u: fetch_underlying_close_series(ohlcv, u, _OPTIONS_HISTORY_FLOOR, date.today())
+              for u in wanted}
+    stats = build_iv_surfaces(args.cache, args.out, closes,
+                              underlyings=wanted if args.underlyings else None)
+    print(f"fitted {stats['dates']} surfaces for {stats['underlyings']} underlyings in "
+          f"{time.perf_counter() - t0:.1f}s -> {args.out}"
+          + (f"; skipped (no iv or closes): {', '.join(stats['skipped'])}" if stats["skipped"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Convert existing CSV ML datasets to the Parquet dataset format.
+
+New datasets are written as Parquet (app.services.dataset_store); datasets created before
+that are still CSV and are read through the slow full-parse path. This rewrites each
+READY dataset whose file is a CSV as ``<name>.parquet`` next to it (typed columns,
+row-group statistics, summary metadata), points ``Dataset.file_path`` at the new file,
+and -- only with ``--delete-csv`` -- removes the CSV.
+
+Values round-trip exactly: the CSV is parsed exactly as every reader parsed it before,
+and the conversion is verified column by column before the DB row is updated.
+
+Usage:  cd testplatform/backend && python ../../tools/convert_datasets_to_parquet.py \\
+            [--check] [--delete-csv] [dataset_id ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def _same(csv_df, pq_df) -> bool:
+    import pandas as pd
+
+    if list(csv_df.columns) != list(pq_df.columns) or len(csv_df) != len(pq_df):
+        return False
+    for col in csv_df.columns:
+        a, b = csv_df[col], pq_df[col]
+        if col == "Date" and pd.api.types.is_datetime64_any_dtype(b):
+            a = pd.to_datetime(a)
+        if not a.equals(b):
+            return False
+    return True
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("dataset_ids", nargs="*", type=int, help="Only these datasets (default: all)")
+    ap.add_argument("--check", action="store_true", help="List what would be converted")
+    ap.add_argument("--delete-csv", action="store_true", help="Remove each CSV once converted")
+    args = ap.parse_args()
+
+    from pathlib import Path
+
+    import pandas as pd
+
+    import app.models  # noqa: F401
+    from app.models.database import SessionLocal
+    from app.models.dataset import Dataset, DatasetStatus
+    from app.services.dataset_store import convert_csv_dataset, is_parquet, read_dataset
+
+    db = SessionLocal()
+    converted = failed = 0
+    try:
+        q = db.query(Dataset).filter(Dataset.status == DatasetStatus.READY.value)
+        if args.dataset_ids:
+            q = q.filter(Dataset.id.in_(args.dataset_ids))
+        for ds in q.order_by(Dataset.id):
+            if not ds.file_path or is_parquet(ds.file_path):
+                continue
+            csv_path = Path(ds.file_path)
+            if not csv_path.exists():
+                print(f"  #{ds.id} {ds.name}: file missing ({csv_path}), skipped")
+                continue
+            size_mb = csv_path.stat().st_size / 1e6
+            if args.check:
+                print(f"  #{ds.id} {ds.name}: {csv_path.name} ({size_mb:.1f} MB)")
+                continue
+
+            out = convert_csv_dataset(csv_path)
+            if not _same(pd.read_csv(csv_path), read_dataset(out)):
+                out.unlink()
+                failed += 1
+                print(f"  #{ds.id} {ds.name}: round-trip mismatch, kept CSV")
+                continue
+            ds.file_path = str(out)
+            db.commit()
+            if args.delete_csv:
+                csv_path.unlink()
+            converted += 1
+            print(f"  #{ds.id} {ds.name}: {size_mb:.1f} MB -> {out.stat().st_size / 1e6:.1f} MB")
+    finally:
+        db.close()
+
+    if not args.check:
+        print(f"converted {converted}, failed {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Convert the SQLite options-history cache to the columnar options store.
+
+Backtests read options through ``HistoricalOptionsProvider``; given a columnar store directory
+(app.services.backtest.options_store) it memory-maps month partitions instead of loading each
+underlying's chain/bar history from SQLite into every worker. This copies an existing cache
+underlying by underlying, checks row counts against the source, and records the store. Once it
+holds every underlying of the SQLite cache it is built, and from then on the default options
+path (``default_options_cache_db``) resolves to the store; a partial conversion only serves runs
+whose underlyings it holds.
+
+Usage:  cd testplatform/backend && python ../../tools/convert_options_cache.py \\
+            [--cache-db PATH] [--store DIR] [--check] [UNDERLYING ...]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "testplatform", "backend"))
+if _BACKEND not in sys.path:
+    sys.path.insert(0, _BACKEND)
+
+
+def main() -> int:
+    from ba2_common.config import OPTIONS_CACHE_DB, OPTIONS_STORE_DIR
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("underlyings", nargs="*", help="Only these underlyings (default: all)")
+    ap.add_argument("--cache-db", default=OPTIONS_CACHE_DB, help=f"SQLite cache (default {OPTIONS_CACHE_DB})")
+    ap.add_argument("--store", default=OPTIONS_STORE_DIR, help=f"Store directory (default {OPTIONS_STORE_DIR})")
+    ap.add_argument("--check", action="store_true", help="Only list what would be converted")
+    args = ap.parse_args()
+
+    if not os.path.isfile(args.cache_db):
+        print(f"no SQLite cache at {args.cache_db}")
+        return 1
+    cx = sqlite3.connect(args.cache_db)
+    try:
+        counts = {u: (c, b) for u, c, b in cx.execute(
+            "SELECT c.underlying, c.n, COALESCE(b.n, 0) FROM "
+            "(SELECT underlying, COUNT(*) AS n FROM option_chain GROUP BY underlying) c "
+            "LEFT JOIN (SELECT underlying, COUNT(*) AS n FROM option_bar GROUP BY underlying) b "
+            "ON b.underlying = c.underlying")}
+    finally:
+        cx.close()
+    wanted = [u.upper() for u in args.underlyings] or sorted(counts)
+    if args.check:
+        for u in wanted:
+            c, b = counts.get(u, (0, 0))
+            print(f"  {u}: {c} chain rows, {b} bar rows")
+        return 0
+
+    from app.services.backtest.options_store import OptionsColumnarStore, convert_sqlite_cache
+
+    t0 = time.perf_counter()
+    stats = convert_sqlite_cache(args.cache_db, args.store, wanted if args.underlyings else None)
+    store = OptionsColumnarStore(args.store)
+    bad = 0
+    for u in wanted:
+        got = store.row_counts(u)
+        if got != counts.get(u, (0, 0)):
+            bad += 1
+            print(f"  {u}: row-count mismatch store={got} sqlite={counts.get(u)}")
+    print(f"converted {stats['underlyings']} underlyings ({stats['chain_rows']} chain rows, "
+          f"{stats['bar_rows']} bar rows) in {time.perf_counter() - t0:.1f}s -> {args.store}"
+          + (f"; {bad} mismatched" if bad else ""))
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
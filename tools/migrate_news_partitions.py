@@ -0,0 +1,57 @@
+"""Migrate the scored news tier from one parquet per symbol to the date-partitioned layout.
+
+The per-symbol files stay where they are and remain the source of truth for single-symbol
+reads. This builds ``<CACHE_FOLDER>/news/_partitions`` (one parquet per month, plus a
+symbol/date index and a dedup key index) so universe and window queries
+(``store.read_sentiment_many``) read one file per month instead of one per symbol. See
+``ba2_providers/news/partitioned.py``.
+
+Idempotent: every migrated symbol's partitioned rows are replaced from its file, so a re-run
+(after a crash, or over new symbols) converges. Once the layout exists, ``store.write_scored``
+keeps it in step with every later write.
+
+Usage:
+    python tools/migrate_news_partitions.py                  # every covered symbol
+    python tools/migrate_news_partitions.py --symbols NVDA MSFT
+    python tools/migrate_news_partitions.py --rebuild-index  # recover the index files only
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                                "packages", "common"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                                "packages", "providers"))
+
+from ba2_providers.news import partitioned, store  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--symbols", nargs="*", default=None)
+    ap.add_argument("--batch-symbols", type=int, default=200,
+                    help="Symbols loaded per partition rewrite (bounds memory)")
+    ap.add_argument("--rebuild-index", action="store_true",
+                    help="Only recompute _index/_keys from the partition files")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    if args.rebuild_index:
+        rows = partitioned.rebuild_index()
+        print(f"index rebuilt: {rows:,} rows in {time.perf_counter() - t0:.1f}s")
+        return 0
+    if not store.store_exists():
+        print(f"no per-symbol scored news under {store.scored_folder()}")
+        return 1
+    stats = partitioned.migrate_from_per_symbol(
+        [s.upper() for s in args.symbols] if args.symbols else None, args.batch_symbols)
+    print(f"{stats['symbols']} symbols, {stats['rows']:,} rows -> {stats['partitions']} monthly "
+          f"partitions in {time.perf_counter() - t0:.1f}s ({partitioned.partitioned_folder()})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
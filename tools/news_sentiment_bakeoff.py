@@ -170,15 +170,9 @@ def main():
 
     # The migrated legacy column, evaluated on the SAME sampled articles. Joined on
     # url_hash so the comparison is article-for-article, not window-for-window.
-    legacy = []
-    for sym in symbols:
-        if not store.has_coverage(sym):
-            continue
-        s = store.read_sentiment(sym, model=LEGACY_MODEL)
-        if len(s):
-            legacy.append(s.assign(symbol=sym))
-    if legacy:
-        lg = pd.concat(legacy, ignore_index=True)
+    covered = [sym for sym in symbols if store.has_coverage(sym)]
+    lg = store.read_sentiment_many(covered, model=LEGACY_MODEL) if covered else pd.DataFrame()
+    if len(lg):
         lg["sent"] = lg["pos"].astype(float) - lg["neg"].astype(float)
         lg = lg.merge(sample[["url_hash", "symbol"]], on=["url_hash", "symbol"], how="inner")
         per, summ = evaluate(daily_aggregate(lg), returns)
@@ -12,11 +12,15 @@ The files land under ``CACHE_FOLDER/fred/`` and are therefore picked up by
 ``cache_sync.build_manifest`` automatically -- remote GA workers receive them with the
 rest of the cache, no extra wiring.
 
+After the series, the aligned daily macro panel (``macro_panel``, under ``MACRO_PANEL_DIR``)
+is brought up to date: incrementally when the new observations all postdate it.
+
 Usage:
     python tools/refresh_fred_cache.py                  # refresh all series
     python tools/refresh_fred_cache.py --series VIXCLS UNRATE
     python tools/refresh_fred_cache.py --max-age-hours 24   # skip fresh files
     python tools/refresh_fred_cache.py --check              # report age, fetch nothing
+    python tools/refresh_fred_cache.py --no-panel           # series only, leave the panel
 """
 import argparse
 import json
@@ -29,7 +33,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
                                 "packages", "providers"))
 
-from ba2_providers.macro import fred_series  # noqa: E402
+from ba2_providers.macro import fred_series, macro_panel  # noqa: E402
 
 
 def _api_key() -> str:
@@ -58,6 +62,8 @@ def main() -> None:
                     help="Skip series whose cached file is younger than this")
     ap.add_argument("--check", action="store_true",
                     help="Report cache state and exit without fetching")
+    ap.add_argument("--no-panel", action="store_true",
+                    help="Do not refresh the macro panel after the series")
     args = ap.parse_args()
 
     series = [s.upper() for s in (args.series or fred_series.SERIES_SPEC)]
@@ -97,6 +103,10 @@ def main() -> None:
             failed += 1
 
     print(f"\nrefreshed={refreshed} skipped={skipped} failed={failed}")
+    if not args.no_panel:
+        stats = macro_panel.refresh_panel()
+        print(f"panel: {stats['mode']} (+{stats['days_added']:,} days, through {stats['end']}, "
+              f"{stats['parts']} part(s))")
     if failed:
         raise SystemExit(1)
 
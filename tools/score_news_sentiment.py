@@ -5,6 +5,9 @@ new model sits ALONGSIDE ``finbert-legacy`` rather than replacing it -- that coe
 is what makes the bake-off (tools/evaluate_news_sentiment.py) a like-for-like comparison
 on identical articles.
 
+Texts already scored by the same model version (by any earlier run, or by the ML
+platform's dataset builds) come from the text-score cache instead of the model.
+
 MEMORY. One model resident at a time, one symbol streamed at a time. Peak is set by
 batch size x sequence length, not by the weights, and both are capped low because this is
 expected to run while a GA grid holds most of the machine's RAM. Defaults are deliberately
@@ -30,6 +33,9 @@ import pandas as pd  # noqa: E402
 
 from ba2_providers.news import sentiment, store  # noqa: E402
 
+# Scored frames held before one batched write; they are small (no article text).
+WRITE_BATCH_SYMBOLS = 100
+
 
 def build_text(row) -> str:
     """Headline plus the best body we have.
@@ -83,15 +89,20 @@ def main():
         print(f"\n=== {model}  ({sentiment.MODELS[model]['hf']})")
         t0 = time.time()
         total = 0
+        # Loaded on the first cache miss and kept for every symbol of this model.
+        scorer = sentiment.Scorer(model, batch_size=args.batch_size,
+                                  max_length=args.max_length, threads=args.threads)
+        # Written per batch: upsert_scored_many rewrites each month partition once per batch
+        # instead of once per symbol.
+        pending = {}
         for sym in symbols:
             raw = store.read_raw(sym)
             if args.limit:
                 raw = raw.sort_values("published_at").tail(args.limit)
             texts = [build_text(r) for r in raw.itertuples()]
 
-            scores = sentiment.score_texts(
-                texts, model=model, batch_size=args.batch_size,
-                max_length=args.max_length, threads=args.threads)
+            scores = sentiment.score_texts_cached(texts, model, max_length=args.max_length,
+                                                 scorer=scorer)
 
             out = pd.DataFrame({
                 "url_hash": raw["url_hash"].values,
@@ -103,12 +114,18 @@ def main():
                 "neu": scores["neu"].values,
                 "neg": scores["neg"].values,
             })
-            store.upsert_scored(sym, out)
+            pending[sym] = out
+            if len(pending) >= WRITE_BATCH_SYMBOLS:
+                store.upsert_scored_many(pending)
+                pending = {}
             total += len(out)
             print(f"  {sym:<6} {len(out):>6,} rows  "
                   f"mean_score={out['score'].mean():+.3f}  "
                   f"pos%={100 * (out['score'] > 0.2).mean():4.1f}  "
                   f"neg%={100 * (out['score'] < -0.2).mean():4.1f}")
+        if pending:
+            store.upsert_scored_many(pending)
+        scorer.close()
         dt = time.time() - t0
         print(f"  -> {total:,} rows in {dt / 60:.1f} min ({total / max(1, dt):.0f} rows/s)")
 